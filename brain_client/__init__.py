@@ -0,0 +1,18 @@
+"""
+Brain Client
+Modules shared by generation_two and the generation_one / stone_age scripts
+
+- brain_session: pooled, self-authenticating session for the WorldQuant Brain API
+- field_registry: data-field tables parsed once per cache file and shared through snapshots
+- result_cache: simulation results keyed by canonical expression + settings
+- bandit_engine: NumPy-backed UCB1 / Thompson / LinUCB bandits with batched selection
+
+Import the submodule you need (from brain_client.brain_session import
+BrainSession); nothing is imported eagerly here.
+
+The generator requirements.txt files install it (`../../brain_client`); for
+development use `pip install -e brain_client` from the repository root.
+Anything run from the repository root finds it without installing.
+"""
+
+__version__ = "1.0.0"
@@ -0,0 +1,428 @@
+"""
+Vectorized Bandit Engine
+NumPy-backed multi-armed bandits shared by the template generators
+
+Arms are rows in preallocated arrays (looked up through an ArmRegistry), so
+scoring thousands of (operator, field, settings) arms is a handful of array
+operations instead of a Python loop. Every bandit supports:
+- Batched selection: select(k) returns k distinct arms, e.g. to fill free slots
+- Decay: discount past observations so stale rewards fade
+- Snapshot/restore: save and reload the full state as a .npz file
+
+Algorithms:
+- UCB1Bandit: mean reward + exploration bonus
+- ThompsonBandit: Beta posterior sampling (rewards mapped onto [0, 1])
+- LinUCBBandit: disjoint LinUCB over a context feature vector
+"""
+
+import json
+import os
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+ArmKey = Hashable
+
+
+class ArmRegistry:
+    """Maps arm keys to row indices"""
+
+    def __init__(self):
+        self.keys: List[ArmKey] = []
+        self.index: Dict[ArmKey, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: ArmKey) -> bool:
+        return key in self.index
+
+    def add(self, key: ArmKey) -> int:
+        idx = self.index.get(key)
+        if idx is None:
+            idx = len(self.keys)
+            self.index[key] = idx
+            self.keys.append(key)
+        return idx
+
+
+class VectorBandit:
+    """Base class: arm registry plus pull/reward arrays"""
+
+    # Arrays saved by snapshot(); subclasses extend this
+    STATE_ARRAYS = ('pulls', 'reward_sum', 'reward_sq_sum')
+
+    def __init__(self, capacity: int = 64, seed: Optional[int] = None):
+        """
+        Args:
+            capacity: Initial number of arm rows (grows automatically)
+            seed: Random seed for tie-breaking and sampling
+        """
+        self.registry = ArmRegistry()
+        self.rng = np.random.default_rng(seed)
+        self.total_pulls = 0.0
+        self._capacity = 0
+        self.pulls = np.zeros(0)
+        self.reward_sum = np.zeros(0)
+        self.reward_sq_sum = np.zeros(0)
+        self._grow(max(1, capacity))
+
+    # ----- Arm management -----
+
+    @property
+    def n_arms(self) -> int:
+        return len(self.registry)
+
+    @property
+    def keys(self) -> List[ArmKey]:
+        return list(self.registry.keys)
+
+    def __contains__(self, key: ArmKey) -> bool:
+        return key in self.registry
+
+    def _grow(self, capacity: int):
+        """Resize every state array to hold `capacity` arms"""
+        old = self._capacity
+        for name in self.STATE_ARRAYS:
+            array = getattr(self, name)
+            grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:old] = array[:old]
+            setattr(self, name, grown)
+        self._capacity = capacity
+        self._init_rows(old, capacity)
+
+    def _init_rows(self, start: int, stop: int):
+        """Initialise new rows (priors); subclasses override"""
+
+    def add_arms(self, keys: Iterable[ArmKey]) -> np.ndarray:
+        """Register arms (existing keys are kept) and return their indices"""
+        indices = [self.registry.add(key) for key in keys]
+        if len(self.registry) > self._capacity:
+            self._grow(max(len(self.registry), self._capacity * 2))
+        return np.asarray(indices, dtype=np.intp)
+
+    def add_arm(self, key: ArmKey) -> int:
+        return int(self.add_arms([key])[0])
+
+    def indices(self, keys: Optional[Iterable[ArmKey]] = None) -> np.ndarray:
+        """Indices for keys (registering unknown ones); None means all arms"""
+        if keys is None:
+            return np.arange(self.n_arms, dtype=np.intp)
+        return self.add_arms(keys)
+
+    # ----- Statistics -----
+
+    def means(self, idx: Optional[np.ndarray] = None) -> np.ndarray:
+        """Average reward per arm (0 for unpulled arms)"""
+        idx = self.indices() if idx is None else idx
+        pulls = self.pulls[idx]
+        return np.divide(self.reward_sum[idx], pulls, out=np.zeros(len(idx)), where=pulls > 0)
+
+    def stds(self, idx: Optional[np.ndarray] = None) -> np.ndarray:
+        """Reward standard deviation per arm (population std, 0 for unpulled arms)"""
+        idx = self.indices() if idx is None else idx
+        pulls = self.pulls[idx]
+        mean = self.means(idx)
+        second = np.divide(self.reward_sq_sum[idx], pulls, out=np.zeros(len(idx)), where=pulls > 0)
+        return np.sqrt(np.maximum(second - mean ** 2, 0.0))
+
+    def stats(self, key: ArmKey) -> Dict:
+        """Statistics for one arm"""
+        if key not in self.registry:
+            return {'pulls': 0, 'avg_reward': 0.0, 'std': 0.0}
+        idx = np.asarray([self.registry.index[key]])
+        return {
+            'pulls': float(self.pulls[idx][0]),
+            'avg_reward': float(self.means(idx)[0]),
+            'std': float(self.stds(idx)[0]),
+        }
+
+    # ----- Learning -----
+
+    def update(self, keys: Union[ArmKey, Sequence[ArmKey]], rewards: Union[float, Sequence[float]],
+               contexts: Optional[np.ndarray] = None):
+        """
+        Record rewards for one or more arms
+
+        Args:
+            keys: An arm key or a list of keys (may repeat); tuples are single keys
+            rewards: A reward or one reward per key
+            contexts: Context vectors (LinUCB only)
+        """
+        if isinstance(keys, (list, np.ndarray)):
+            keys = list(keys)
+        else:
+            keys = [keys]
+        rewards = np.broadcast_to(np.asarray(rewards, dtype=float), (len(keys),))
+        idx = self.add_arms(keys)
+        np.add.at(self.pulls, idx, 1.0)
+        np.add.at(self.reward_sum, idx, rewards)
+        np.add.at(self.reward_sq_sum, idx, rewards ** 2)
+        self.total_pulls += len(keys)
+        self._update_extra(idx, rewards, contexts)
+
+    def _update_extra(self, idx: np.ndarray, rewards: np.ndarray, contexts: Optional[np.ndarray]):
+        """Algorithm-specific update; subclasses override"""
+
+    def decay(self, factor: float):
+        """
+        Discount all past observations
+
+        Args:
+            factor: Multiplier in (0, 1]; e.g. 0.99 halves the weight of old data every ~70 calls
+        """
+        n = self.n_arms
+        for name in ('pulls', 'reward_sum', 'reward_sq_sum'):
+            getattr(self, name)[:n] *= factor
+        self.total_pulls *= factor
+        self._decay_extra(factor)
+
+    def _decay_extra(self, factor: float):
+        """Algorithm-specific decay; subclasses override"""
+
+    # ----- Selection -----
+
+    def scores(self, idx: np.ndarray, context: Optional[np.ndarray] = None) -> np.ndarray:
+        """Selection score per arm; subclasses implement"""
+        raise NotImplementedError
+
+    def select(self, k: int = 1, candidates: Optional[Sequence[ArmKey]] = None,
+               context: Optional[np.ndarray] = None) -> List[ArmKey]:
+        """
+        Choose up to k distinct arms with the highest scores
+
+        Args:
+            k: Number of arms
+            candidates: Arm keys to choose from (default: all registered arms)
+            context: Context vector(s) for contextual bandits
+
+        Returns:
+            Arm keys, best first
+        """
+        idx = self.indices(candidates)
+        if len(idx) == 0 or k <= 0:
+            return []
+        scores = self.scores(idx, context)
+        # Random tie-breaking (e.g. between unexplored arms)
+        order_keys = (self.rng.random(len(idx)), -scores)
+        if k >= len(idx):
+            order = np.lexsort(order_keys)
+        else:
+            top = np.argpartition(-scores, k - 1)[:k]
+            threshold = scores[top].min()
+            tied = np.flatnonzero(scores >= threshold)
+            order = tied[np.lexsort((self.rng.random(len(tied)), -scores[tied]))][:k]
+        keys = self.registry.keys
+        return [keys[i] for i in idx[order[:k]]]
+
+    def select_one(self, candidates: Optional[Sequence[ArmKey]] = None,
+                   context: Optional[np.ndarray] = None) -> Optional[ArmKey]:
+        selected = self.select(1, candidates, context)
+        return selected[0] if selected else None
+
+    # ----- Persistence -----
+
+    def _config(self) -> Dict:
+        return {}
+
+    def snapshot(self, path: str, metadata: Optional[Dict] = None):
+        """
+        Save state to a .npz file (written atomically)
+
+        Args:
+            path: Target file (".npz" is appended by NumPy if missing)
+            metadata: Extra JSON-serialisable data stored alongside (e.g. arm settings)
+        """
+        if not path.endswith('.npz'):
+            path += '.npz'
+        n = self.n_arms
+        header = {
+            'class': type(self).__name__,
+            'keys': self.registry.keys,
+            'total_pulls': self.total_pulls,
+            'config': self._config(),
+            'metadata': metadata or {},
+        }
+        arrays = {name: getattr(self, name)[:n] for name in self.STATE_ARRAYS}
+        tmp_path = path[:-4] + '.tmp.npz'
+        np.savez(tmp_path, header=np.asarray(json.dumps(header, default=str)), **arrays)
+        os.replace(tmp_path, path)
+
+    def restore(self, path: str) -> Dict:
+        """
+        Load state saved by snapshot()
+
+        Returns:
+            The metadata stored with the snapshot
+        """
+        if not path.endswith('.npz'):
+            path += '.npz'
+        with np.load(path, allow_pickle=False) as data:
+            header = json.loads(str(data['header']))
+            if header['class'] != type(self).__name__:
+                raise ValueError(f"Snapshot is a {header['class']}, not a {type(self).__name__}")
+            keys = [tuple(k) if isinstance(k, list) else k for k in header['keys']]
+            self.registry = ArmRegistry()
+            self._capacity = 0
+            for name in self.STATE_ARRAYS:
+                setattr(self, name, np.zeros((0,) + getattr(self, name).shape[1:]))
+            self._grow(max(1, len(keys)))
+            self.add_arms(keys)
+            for name in self.STATE_ARRAYS:
+                getattr(self, name)[:len(keys)] = data[name]
+        self.total_pulls = header['total_pulls']
+        self._after_restore()
+        return header.get('metadata', {})
+
+    def _after_restore(self):
+        """Rebuild derived state after restore(); subclasses override"""
+
+
+class UCB1Bandit(VectorBandit):
+    """UCB1: mean reward + c * sqrt(ln(total pulls) / arm pulls); unpulled arms first"""
+
+    def __init__(self, exploration: float = 2 ** 0.5, capacity: int = 64, seed: Optional[int] = None):
+        """
+        Args:
+            exploration: Bonus coefficient c (sqrt(2) is classic UCB1)
+        """
+        self.exploration = exploration
+        super().__init__(capacity, seed)
+
+    def _config(self) -> Dict:
+        return {'exploration': self.exploration}
+
+    def scores(self, idx: np.ndarray, context: Optional[np.ndarray] = None) -> np.ndarray:
+        pulls = self.pulls[idx]
+        log_total = np.log(max(self.total_pulls, 1.0))
+        bonus = self.exploration * np.sqrt(np.divide(log_total, pulls, out=np.zeros(len(idx)), where=pulls > 0))
+        return np.where(pulls > 0, self.means(idx) + bonus, np.inf)
+
+
+class ThompsonBandit(VectorBandit):
+    """Thompson sampling with a Beta posterior per arm"""
+
+    STATE_ARRAYS = VectorBandit.STATE_ARRAYS + ('alpha', 'beta')
+
+    def __init__(self, reward_range: Sequence[float] = (0.0, 1.0), prior: Sequence[float] = (1.0, 1.0),
+                 capacity: int = 64, seed: Optional[int] = None):
+        """
+        Args:
+            reward_range: Rewards are clipped to this range and mapped onto [0, 1]
+            prior: Beta prior (alpha, beta) for new arms
+        """
+        self.reward_range = (float(reward_range[0]), float(reward_range[1]))
+        self.prior = (float(prior[0]), float(prior[1]))
+        self.alpha = np.zeros(0)
+        self.beta = np.zeros(0)
+        super().__init__(capacity, seed)
+
+    def _config(self) -> Dict:
+        return {'reward_range': self.reward_range, 'prior': self.prior}
+
+    def _init_rows(self, start: int, stop: int):
+        self.alpha[start:stop] = self.prior[0]
+        self.beta[start:stop] = self.prior[1]
+
+    def normalize(self, rewards: np.ndarray) -> np.ndarray:
+        low, high = self.reward_range
+        return np.clip((rewards - low) / (high - low), 0.0, 1.0)
+
+    def _update_extra(self, idx: np.ndarray, rewards: np.ndarray, contexts: Optional[np.ndarray]):
+        normalized = self.normalize(rewards)
+        np.add.at(self.alpha, idx, normalized)
+        np.add.at(self.beta, idx, 1.0 - normalized)
+
+    def _decay_extra(self, factor: float):
+        n = self.n_arms
+        self.alpha[:n] = self.prior[0] + (self.alpha[:n] - self.prior[0]) * factor
+        self.beta[:n] = self.prior[1] + (self.beta[:n] - self.prior[1]) * factor
+
+    def scores(self, idx: np.ndarray, context: Optional[np.ndarray] = None) -> np.ndarray:
+        return self.rng.beta(self.alpha[idx], self.beta[idx])
+
+    def expected(self, idx: Optional[np.ndarray] = None) -> np.ndarray:
+        """Posterior mean per arm"""
+        idx = self.indices() if idx is None else idx
+        return self.alpha[idx] / (self.alpha[idx] + self.beta[idx])
+
+    def stats(self, key: ArmKey) -> Dict:
+        stats = super().stats(key)
+        if key in self.registry:
+            i = self.registry.index[key]
+            a, b = self.alpha[i], self.beta[i]
+            stats.update({'alpha': float(a), 'beta': float(b), 'expected_value': float(a / (a + b)),
+                          'variance': float(a * b / ((a + b) ** 2 * (a + b + 1)))})
+        return stats
+
+
+class LinUCBBandit(VectorBandit):
+    """Disjoint LinUCB: per-arm ridge regression on context features plus a confidence bonus"""
+
+    STATE_ARRAYS = VectorBandit.STATE_ARRAYS + ('A', 'b')
+
+    def __init__(self, n_features: int, alpha: float = 1.0, capacity: int = 64, seed: Optional[int] = None):
+        """
+        Args:
+            n_features: Context vector length
+            alpha: Confidence bonus coefficient
+        """
+        self.n_features = n_features
+        self.alpha = alpha
+        self.A = np.zeros((0, n_features, n_features))
+        self.b = np.zeros((0, n_features))
+        self.A_inv = np.zeros((0, n_features, n_features))
+        super().__init__(capacity, seed)
+
+    def _config(self) -> Dict:
+        return {'n_features': self.n_features, 'alpha': self.alpha}
+
+    def _grow(self, capacity: int):
+        super()._grow(capacity)
+        old = min(len(self.A_inv), capacity)
+        grown = np.zeros((capacity, self.n_features, self.n_features))
+        grown[:old] = self.A_inv[:old]
+        grown[old:] = np.eye(self.n_features)
+        self.A_inv = grown
+
+    def _init_rows(self, start: int, stop: int):
+        self.A[start:stop] = np.eye(self.n_features)
+
+    def _contexts_for(self, count: int, context: Optional[np.ndarray]) -> np.ndarray:
+        if context is None:
+            raise ValueError("LinUCBBandit needs a context vector")
+        context = np.asarray(context, dtype=float)
+        if context.ndim == 1:
+            context = np.broadcast_to(context, (count, self.n_features))
+        if context.shape != (count, self.n_features):
+            raise ValueError(f"Context must have shape ({self.n_features},) or ({count}, {self.n_features})")
+        return context
+
+    def _update_extra(self, idx: np.ndarray, rewards: np.ndarray, contexts: Optional[np.ndarray]):
+        x = self._contexts_for(len(idx), contexts)
+        for i, reward, xi in zip(idx, rewards, x):
+            self.A[i] += np.outer(xi, xi)
+            self.b[i] += reward * xi
+            # Sherman-Morrison rank-one update of the inverse
+            Ax = self.A_inv[i] @ xi
+            self.A_inv[i] -= np.outer(Ax, Ax) / (1.0 + xi @ Ax)
+
+    def _decay_extra(self, factor: float):
+        n = self.n_arms
+        eye = np.eye(self.n_features)
+        self.A[:n] = eye + (self.A[:n] - eye) * factor
+        self.b[:n] *= factor
+        self._after_restore()
+
+    def _after_restore(self):
+        n = self.n_arms
+        if n:
+            self.A_inv[:n] = np.linalg.inv(self.A[:n])
+
+    def scores(self, idx: np.ndarray, context: Optional[np.ndarray] = None) -> np.ndarray:
+        x = self._contexts_for(len(idx), context)
+        A_inv = self.A_inv[idx]
+        theta = np.einsum('nij,nj->ni', A_inv, self.b[idx])
+        mean = np.einsum('ni,ni->n', theta, x)
+        bonus = self.alpha * np.sqrt(np.maximum(np.einsum('ni,nij,nj->n', x, A_inv, x), 0.0))
+        return mean + bonus
@@ -0,0 +1,344 @@
+"""
+Brain Session
+Pooled, self-authenticating HTTP session for the WorldQuant Brain API
+
+BrainSession is a drop-in requests.Session: existing sess.get/post calls keep
+working, but the session
+- keeps connections alive in a pool sized for the caller's concurrency
+  (requests' default keeps 10 per host, so 8 simulation threads plus
+  monitoring threads keep re-opening TLS connections),
+- retries connection failures, which are safe to retry for any method,
+- logs in once for a burst of 401s: threads that hit an expired session wait
+  for a single re-login and then replay their request,
+- re-logs in shortly before the token expiry reported at login,
+- records latency per endpoint (method + path template, ids collapsed),
+- optionally speaks HTTP/2 through httpx when it is installed.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.auth import HTTPBasicAuth
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+try:
+    import httpx  # Optional: HTTP/2 transport (pip install httpx[http2])
+except ImportError:
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+API_BASE = 'https://api.worldquantbrain.com'
+
+_ID_SEGMENT = re.compile(r'[a-z][a-z_-]*')
+
+# Connection-specific headers are not allowed on HTTP/2 streams
+_HOP_BY_HOP = {'connection', 'keep-alive', 'proxy-connection', 'transfer-encoding', 'upgrade'}
+
+
+def load_credentials(path: str) -> Tuple[str, str]:
+    """
+    Read (username, password) from a credential file
+
+    Accepts a JSON array ["user", "password"], a JSON object with
+    username/password (or email/password), or two plain lines.
+    """
+    with open(path, 'r') as f:
+        content = f.read().strip()
+    if content.startswith('[') or content.startswith('{'):
+        data = json.loads(content)
+        if isinstance(data, dict):
+            username = data.get('username') or data.get('email')
+            password = data.get('password')
+        elif len(data) == 2:
+            username, password = data
+        else:
+            raise ValueError("JSON credentials must have exactly 2 elements: [username, password]")
+    else:
+        lines = [line.strip() for line in content.splitlines() if line.strip()]
+        if len(lines) < 2:
+            raise ValueError("Credential file must have at least 2 lines")
+        username, password = lines[0], lines[1]
+    if not username or not password:
+        raise ValueError(f"No username/password in {path}")
+    return username, password
+
+
+def endpoint_key(method: str, url: str) -> str:
+    """'GET /simulations/:id' for 'GET https://.../simulations/3Jq9e?x=1'"""
+    parts = [segment if segment == 'self' or _ID_SEGMENT.fullmatch(segment) else ':id'
+             for segment in urlsplit(url).path.split('/') if segment]
+    return f"{method.upper()} /{'/'.join(parts)}"
+
+
+class EndpointStats:
+    """Latency counters for one endpoint"""
+
+    __slots__ = ('count', 'errors', 'total', 'max', 'recent')
+
+    def __init__(self, window: int = 512):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent: Deque[float] = deque(maxlen=window)
+
+    def add(self, seconds: float, error: bool):
+        self.count += 1
+        self.errors += int(error)
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def to_dict(self) -> Dict:
+        ordered = sorted(self.recent)
+
+        def quantile(q: float) -> float:
+            return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'avg_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'p50_ms': quantile(0.5) * 1000,
+            'p95_ms': quantile(0.95) * 1000,
+            'max_ms': self.max * 1000,
+        }
+
+
+class HTTP2Adapter(BaseAdapter):
+    """requests transport adapter backed by an httpx HTTP/2 client"""
+
+    def __init__(self, pool_size: int = 16, verify: Union[bool, str] = True):
+        super().__init__()
+        if httpx is None:
+            raise ImportError("HTTP/2 needs httpx: pip install 'httpx[http2]'")
+        self.client = httpx.Client(
+            http2=True,
+            verify=verify,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            timeout = httpx.Timeout(read, connect=connect)
+        try:
+            headers = {k: v for k, v in request.headers.items() if k.lower() not in _HOP_BY_HOP}
+            reply = self.client.request(request.method, request.url, headers=headers,
+                                        content=request.body, timeout=timeout)
+        except httpx.ConnectTimeout as e:
+            raise requests.exceptions.ConnectTimeout(e, request=request)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.ReadTimeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e, request=request)
+
+        response = requests.Response()
+        response.status_code = reply.status_code
+        response.headers = CaseInsensitiveDict(reply.headers.multi_items())
+        response.reason = reply.reason_phrase
+        response.url = request.url
+        response.request = request
+        response.encoding = reply.encoding
+        response._content = reply.content
+        response.connection = self
+        # requests only copies cookies from urllib3 responses; BrainSession reads these instead
+        for cookie in reply.cookies.jar:
+            response.cookies.set_cookie(cookie)
+        # Cookies live in the requests session; stop httpx replaying its own copies
+        self.client.cookies.clear()
+        return response
+
+    def close(self):
+        self.client.close()
+
+
+class BrainSession(requests.Session):
+    """
+    requests.Session with a sized keep-alive pool, single-flight re-login and
+    per-endpoint latency metrics
+    """
+
+    def __init__(self, credentials_path: Optional[str] = None,
+                 credentials: Optional[Tuple[str, str]] = None,
+                 api_base: str = API_BASE, pool_size: int = 16, connect_retries: int = 3,
+                 http2: bool = False, refresh_margin: float = 300.0,
+                 default_timeout: Optional[float] = None):
+        """
+        Args:
+            credentials_path: Credential file (see load_credentials)
+            credentials: (username, password), instead of a file
+            api_base: API root; login posts to {api_base}/authentication
+            pool_size: Keep-alive connections kept per host (>= concurrent threads)
+            connect_retries: Retries for failed connection attempts
+            http2: Use HTTP/2 via httpx for the API host if httpx is installed
+            refresh_margin: Re-login this many seconds before the token expires
+            default_timeout: Timeout for requests that do not pass one
+        """
+        super().__init__()
+        self.api_base = api_base.rstrip('/')
+        self.pool_size = pool_size
+        self.refresh_margin = refresh_margin
+        self.default_timeout = default_timeout
+        self.credentials = credentials
+        if credentials is None and credentials_path:
+            self.credentials = load_credentials(credentials_path)
+
+        # Only connection attempts are retried: a request that never reached the
+        # server cannot have started a simulation, so this is safe for POST too
+        retry = Retry(total=connect_retries, connect=connect_retries, read=0, status=0, other=0,
+                      backoff_factor=0.3, allowed_methods=None, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_size, max_retries=retry)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+        self.http2 = False
+        if http2:
+            if httpx is None:
+                logger.warning("HTTP/2 requested but httpx is not installed; using HTTP/1.1 keep-alive")
+            else:
+                self.mount(self.api_base, HTTP2Adapter(pool_size))
+                self.http2 = True
+
+        self._auth_lock = threading.Lock()
+        self._auth_generation = 0  # Bumped by every login
+        self._expires_at: Optional[float] = None
+        self._stats_lock = threading.Lock()
+        self._endpoint_stats: Dict[str, EndpointStats] = {}
+        self.login_count = 0
+
+    @property
+    def auth_url(self) -> str:
+        return f"{self.api_base}/authentication"
+
+    def login(self) -> requests.Response:
+        """Authenticate now (raises on failure)"""
+        with self._auth_lock:
+            return self._login()
+
+    def _login(self) -> requests.Response:
+        """Post credentials to /authentication (caller holds _auth_lock)"""
+        if not self.credentials:
+            raise ValueError("BrainSession has no credentials to log in with")
+        response = self._timed('POST', self.auth_url, auth=HTTPBasicAuth(*self.credentials),
+                               timeout=self.default_timeout or 30)
+        if response.status_code != 201:
+            raise requests.exceptions.HTTPError(
+                f"Authentication failed: {response.status_code} {response.text[:200]}", response=response)
+        self._auth_generation += 1
+        self.login_count += 1
+        self._expires_at = None
+        try:
+            expiry = response.json().get('token', {}).get('expiry')
+            if expiry:
+                self._expires_at = time.time() + float(expiry)
+        except (ValueError, AttributeError):
+            pass
+        logger.info("Authenticated with WorldQuant Brain")
+        return response
+
+    def refresh(self, seen_generation: Optional[int] = None) -> bool:
+        """
+        Re-login unless another thread already did since seen_generation
+
+        Concurrent callers that saw the same expired session share one login.
+        Returns True if a login happened or was already done by another thread.
+        """
+        with self._auth_lock:
+            if seen_generation is not None and self._auth_generation != seen_generation:
+                return True
+            logger.info("🔐 Session expired - re-authenticating")
+            self._login()
+            return True
+
+    def _absorb_cookies(self, response: requests.Response):
+        if self.http2 and response.cookies:
+            self.cookies.update(response.cookies)
+
+    def request(self, method, url, *args, **kwargs):
+        """requests.Session.request plus metrics, expiry refresh and one replay after a 401"""
+        if self.default_timeout is not None:
+            kwargs.setdefault('timeout', self.default_timeout)
+        is_auth = url.startswith(self.auth_url)
+        generation = self._auth_generation
+        if (not is_auth and self.credentials and self._expires_at is not None
+                and time.time() > self._expires_at - self.refresh_margin):
+            try:
+                self.refresh(generation)
+            except requests.exceptions.RequestException as e:
+                # Fall back to re-login on the first 401 rather than retrying every request
+                logger.warning(f"Early re-authentication failed: {e}")
+                self._expires_at = None
+            generation = self._auth_generation
+
+        response = self._timed(method, url, *args, **kwargs)
+        if response.status_code == 401 and self.credentials and not is_auth:
+            try:
+                self.refresh(generation)
+            except requests.exceptions.RequestException as e:
+                # Callers see the 401, as they would without the session layer
+                logger.error(f"Re-authentication failed: {e}")
+                return response
+            response = self._timed(method, url, *args, **kwargs)
+        return response
+
+    def _timed(self, method, url, *args, **kwargs) -> requests.Response:
+        started = time.perf_counter()
+        error = True
+        try:
+            response = super().request(method, url, *args, **kwargs)
+            self._absorb_cookies(response)
+            error = response.status_code >= 400
+            return response
+        finally:
+            self._record(endpoint_key(method, url), time.perf_counter() - started, error)
+
+    def _record(self, key: str, seconds: float, error: bool):
+        with self._stats_lock:
+            stats = self._endpoint_stats.get(key)
+            if stats is None:
+                stats = self._endpoint_stats[key] = EndpointStats()
+            stats.add(seconds, error)
+
+    def get_endpoint_stats(self) -> Dict[str, Dict]:
+        """Latency per endpoint, busiest first"""
+        with self._stats_lock:
+            items = [(key, stats.to_dict()) for key, stats in self._endpoint_stats.items()]
+        return dict(sorted(items, key=lambda item: item[1]['count'], reverse=True))
+
+    def log_endpoint_stats(self, level: int = logging.INFO):
+        for key, stats in self.get_endpoint_stats().items():
+            logger.log(level, f"{key}: {stats['count']} calls, {stats['errors']} errors, "
+                              f"avg {stats['avg_ms']:.0f}ms, p95 {stats['p95_ms']:.0f}ms, "
+                              f"max {stats['max_ms']:.0f}ms")
+
+
+_shared_sessions: Dict[Tuple, BrainSession] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_session(credentials_path: Optional[str] = None, api_base: str = API_BASE,
+                       **options) -> BrainSession:
+    """
+    Process-wide BrainSession per (API root, credential file)
+
+    Tools running in one process share one pool and one login. Options only
+    apply when the session is first created.
+    """
+    key = (api_base.rstrip('/'), os.path.abspath(credentials_path) if credentials_path else None)
+    with _shared_lock:
+        session = _shared_sessions.get(key)
+        if session is None:
+            session = BrainSession(credentials_path, api_base=api_base, **options)
+            _shared_sessions[key] = session
+        return session
@@ -0,0 +1,621 @@
+"""
+Data Field Registry
+Loads each region/delay/universe field list once into compact records with
+interned strings, indexes them by type, dataset, category, usage and coverage,
+and shares the parsed table across processes through a memory-mapped snapshot.
+
+The JSON caches written by the fetchers (data_fields_cache_*.json) stay the
+source of truth; a snapshot next to them is rebuilt whenever its source file
+changes, so a second process maps the columns instead of re-parsing JSON.
+"""
+
+import json
+import logging
+import os
+import random
+import sys
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b'FIELDREG'
+SNAPSHOT_VERSION = 1
+_ALIGN = 8
+
+# String-valued columns (codes into the table's string pool) and numeric columns
+_STRING_COLUMNS = ('id', 'type', 'dataset_id', 'dataset_name', 'category_id', 'category_name',
+                   'region', 'universe', 'description')
+_NUMERIC_COLUMNS = {
+    'delay': np.int32,
+    'user_count': np.int64,
+    'alpha_count': np.int64,
+    'coverage': np.float32,
+    'pyramid_multiplier': np.float32,
+}
+_MISSING = -1  # string code / integer value for a key the field dict did not have
+
+
+def _intern(value) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else None
+
+
+def _nested_id(value) -> Tuple[Optional[str], Optional[str]]:
+    """dataset/category come back from the API as {'id', 'name'} (or a bare id)"""
+    if isinstance(value, dict):
+        return _intern(value.get('id')), _intern(value.get('name'))
+    return _intern(value), None
+
+
+_MISSING_KEY = object()
+
+
+def _number(value, cast):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return cast(value)
+
+
+class FieldRecord:
+    """
+    One data field.
+
+    Read access mirrors the API dict (field['id'], field.get('userCount', 0),
+    field.get('dataset', {}).get('id')), so code written against the raw JSON
+    keeps working; keys the registry does not keep are simply absent.
+    """
+
+    __slots__ = ('id', 'type', 'dataset_id', 'dataset_name', 'category_id', 'category_name',
+                 'region', 'universe', 'description', 'delay', 'user_count', 'alpha_count',
+                 'coverage', 'pyramid_multiplier')
+
+    # API key -> attribute
+    _KEYS = {
+        'id': 'id',
+        'type': 'type',
+        'region': 'region',
+        'universe': 'universe',
+        'delay': 'delay',
+        'description': 'description',
+        'userCount': 'user_count',
+        'alphaCount': 'alpha_count',
+        'coverage': 'coverage',
+        'pyramidMultiplier': 'pyramid_multiplier',
+    }
+
+    def __init__(self, id: str, type: Optional[str] = None, dataset_id: Optional[str] = None,
+                 dataset_name: Optional[str] = None, category_id: Optional[str] = None,
+                 category_name: Optional[str] = None, region: Optional[str] = None,
+                 universe: Optional[str] = None, description: Optional[str] = None,
+                 delay: Optional[int] = None, user_count: Optional[int] = None,
+                 alpha_count: Optional[int] = None, coverage: Optional[float] = None,
+                 pyramid_multiplier: Optional[float] = None):
+        self.id = id
+        self.type = type
+        self.dataset_id = dataset_id
+        self.dataset_name = dataset_name
+        self.category_id = category_id
+        self.category_name = category_name
+        self.region = region
+        self.universe = universe
+        self.description = description
+        self.delay = delay
+        self.user_count = user_count
+        self.alpha_count = alpha_count
+        self.coverage = coverage
+        self.pyramid_multiplier = pyramid_multiplier
+
+    @classmethod
+    def from_dict(cls, field: Dict) -> 'FieldRecord':
+        """Build a record from an API field dict, interning the repeated strings"""
+        dataset_id, dataset_name = _nested_id(field.get('dataset'))
+        category_id, category_name = _nested_id(field.get('category'))
+        delay = field.get('delay')
+        return cls(
+            id=sys.intern(str(field['id'])),
+            type=_intern(field.get('type')),
+            dataset_id=dataset_id,
+            dataset_name=dataset_name,
+            category_id=category_id,
+            category_name=category_name,
+            region=_intern(field.get('region')),
+            universe=_intern(field.get('universe')),
+            description=field.get('description') if isinstance(field.get('description'), str) else None,
+            delay=int(delay) if isinstance(delay, (int, float)) else None,
+            user_count=_number(field.get('userCount'), int),
+            alpha_count=_number(field.get('alphaCount'), int),
+            coverage=_number(field.get('coverage'), float),
+            pyramid_multiplier=_number(field.get('pyramidMultiplier'), float),
+        )
+
+    @property
+    def usage(self) -> int:
+        """userCount + alphaCount, the score the generators sort by"""
+        return (self.user_count or 0) + (self.alpha_count or 0)
+
+    def get(self, key: str, default=None):
+        if key == 'dataset':
+            if self.dataset_id is None:
+                return default
+            return {'id': self.dataset_id, 'name': self.dataset_name}
+        if key == 'category':
+            if self.category_id is None:
+                return default
+            return {'id': self.category_id, 'name': self.category_name}
+        attr = self._KEYS.get(key)
+        if attr is None:
+            return default
+        value = getattr(self, attr)
+        return default if value is None else value
+
+    def __getitem__(self, key: str):
+        value = self.get(key, _MISSING_KEY)
+        if value is _MISSING_KEY:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING_KEY) is not _MISSING_KEY
+
+    def keys(self) -> List[str]:
+        return [key for key in ('id', 'type', 'dataset', 'category', *list(self._KEYS)[2:]) if key in self]
+
+    def to_dict(self) -> Dict:
+        """Plain dict with the API key names"""
+        return {key: self[key] for key in self.keys()}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, FieldRecord):
+            return NotImplemented
+        return all(getattr(self, attr) == getattr(other, attr) for attr in self.__slots__)
+
+    def __hash__(self) -> int:
+        return hash((self.id, self.region, self.delay, self.universe))
+
+    def __repr__(self) -> str:
+        return f"FieldRecord(id={self.id!r}, type={self.type!r}, region={self.region!r}, delay={self.delay!r})"
+
+
+class FieldTable:
+    """
+    Columnar field list for one region/delay/universe with its indexes.
+
+    Columns are numpy arrays (memory-mapped when loaded from a snapshot);
+    FieldRecord objects are built once on first use and shared by every caller.
+    Methods that return lists return fresh lists, so callers may sort or
+    filter them in place.
+    """
+
+    def __init__(self, region: str, delay: int, universe: Optional[str],
+                 strings: List[str], columns: Dict[str, np.ndarray]):
+        self.region = region
+        self.delay = delay
+        self.universe = universe
+        self.strings = strings
+        self.columns = columns
+        self._lock = threading.Lock()
+        self._records: Optional[List[FieldRecord]] = None
+
+        ids = columns['id']
+        self._row_of: Dict[str, int] = {strings[code]: row for row, code in enumerate(ids.tolist())}
+        self._by_type = self._group('type')
+        self._by_dataset = self._group('dataset_id')
+        self._by_category = self._group('category_id')
+
+        usage = columns['user_count'].clip(min=0) + columns['alpha_count'].clip(min=0)
+        # Stable, so ties keep file order exactly as list.sort(key=usage) would
+        self._usage = usage
+        self._usage_order = np.argsort(usage, kind='stable')
+        coverage = np.nan_to_num(columns['coverage'].astype(np.float64), nan=-1.0)
+        self._coverage_order = np.argsort(-coverage, kind='stable')
+
+    def _group(self, column: str) -> Dict[str, np.ndarray]:
+        codes = self.columns[column]
+        if not len(codes):
+            return {}
+        order = np.argsort(codes, kind='stable')
+        values, starts = np.unique(codes[order], return_index=True)
+        groups = {}
+        for code, rows in zip(values.tolist(), np.split(order, starts[1:])):
+            if code != _MISSING:
+                groups[self.strings[code]] = rows
+        return groups
+
+    # --- construction -------------------------------------------------
+
+    @classmethod
+    def from_fields(cls, region: str, delay: int, universe: Optional[str],
+                    fields: Iterable[Dict]) -> 'FieldTable':
+        """Build a table from API field dicts; a repeated id keeps its first entry"""
+        pool: Dict[str, int] = {}
+        strings: List[str] = []
+
+        def code(value: Optional[str]) -> int:
+            if value is None:
+                return _MISSING
+            index = pool.get(value)
+            if index is None:
+                index = pool[value] = len(strings)
+                strings.append(value)
+            return index
+
+        string_cols = {name: [] for name in _STRING_COLUMNS}
+        numeric_cols = {name: [] for name in _NUMERIC_COLUMNS}
+        seen = set()
+        for field in fields:
+            if not isinstance(field, (dict, FieldRecord)) or field.get('id') is None:
+                continue
+            record = field if isinstance(field, FieldRecord) else FieldRecord.from_dict(field)
+            if record.id in seen:
+                continue
+            seen.add(record.id)
+            for name in _STRING_COLUMNS:
+                string_cols[name].append(code(getattr(record, name)))
+            for name in ('delay', 'user_count', 'alpha_count'):
+                value = getattr(record, name)
+                numeric_cols[name].append(_MISSING if value is None else value)
+            for name in ('coverage', 'pyramid_multiplier'):
+                value = getattr(record, name)
+                numeric_cols[name].append(np.nan if value is None else value)
+
+        columns = {name: np.asarray(values, dtype=np.int32) for name, values in string_cols.items()}
+        columns.update({name: np.asarray(values, dtype=_NUMERIC_COLUMNS[name])
+                        for name, values in numeric_cols.items()})
+        return cls(region, delay, universe, strings, columns)
+
+    # --- snapshot ------------------------------------------------------
+
+    def save(self, path: str, source: Optional[Dict] = None):
+        """
+        Write the table as one snapshot file: a JSON header followed by
+        8-byte aligned column arrays and the UTF-8 string pool.
+        """
+        encoded = [value.encode('utf-8') for value in self.strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        if encoded:
+            np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        blobs = [(name, np.ascontiguousarray(array)) for name, array in self.columns.items()]
+        blobs.append(('_string_offsets', offsets))
+        blobs.append(('_string_data', np.frombuffer(b''.join(encoded), dtype=np.uint8)))
+
+        layout, position = {}, 0
+        for name, array in blobs:
+            layout[name] = {'dtype': array.dtype.str, 'offset': position, 'length': int(len(array))}
+            position += -(-array.nbytes // _ALIGN) * _ALIGN
+        header = json.dumps({
+            'version': SNAPSHOT_VERSION,
+            'region': self.region,
+            'delay': self.delay,
+            'universe': self.universe,
+            'source': source or {},
+            'columns': layout,
+        }).encode('utf-8')
+        header += b' ' * (-(len(SNAPSHOT_MAGIC) + 8 + len(header)) % _ALIGN)
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(np.uint64(len(header)).tobytes())
+            f.write(header)
+            for name, array in blobs:
+                data = array.tobytes()
+                f.write(data)
+                f.write(b'\0' * (-len(data) % _ALIGN))
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def read_header(path: str) -> Optional[Dict]:
+        """Snapshot header, or None if the file is not a readable snapshot"""
+        try:
+            with open(path, 'rb') as f:
+                if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                    return None
+                size = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+                header = json.loads(f.read(size))
+            header['_data_offset'] = len(SNAPSHOT_MAGIC) + 8 + size
+            return header if header.get('version') == SNAPSHOT_VERSION else None
+        except (OSError, ValueError, IndexError):
+            return None
+
+    @classmethod
+    def load(cls, path: str, header: Optional[Dict] = None) -> 'FieldTable':
+        """Map a snapshot; the columns are read-only views onto the shared file"""
+        header = header or cls.read_header(path)
+        if header is None:
+            raise ValueError(f"Not a field registry snapshot: {path}")
+        mapped = np.memmap(path, dtype=np.uint8, mode='r')
+        base = header['_data_offset']
+        arrays = {}
+        for name, spec in header['columns'].items():
+            dtype = np.dtype(spec['dtype'])
+            start = base + spec['offset']
+            arrays[name] = mapped[start:start + spec['length'] * dtype.itemsize].view(dtype)
+        offsets = arrays.pop('_string_offsets').tolist()
+        data = arrays.pop('_string_data').tobytes()
+        strings = [sys.intern(data[offsets[i]:offsets[i + 1]].decode('utf-8'))
+                   for i in range(len(offsets) - 1)]
+        return cls(header['region'], header['delay'], header['universe'], strings, arrays)
+
+    # --- records -------------------------------------------------------
+
+    def _build_records(self) -> List[FieldRecord]:
+        strings = self.strings
+        cols = {name: self.columns[name].tolist() for name in self.columns}
+        records = []
+        for row in range(len(cols['id'])):
+            values = {}
+            for name in _STRING_COLUMNS:
+                code = cols[name][row]
+                values[name] = None if code == _MISSING else strings[code]
+            for name in ('delay', 'user_count', 'alpha_count'):
+                value = cols[name][row]
+                values[name] = None if value == _MISSING else int(value)
+            for name in ('coverage', 'pyramid_multiplier'):
+                value = cols[name][row]
+                values[name] = None if value != value else float(value)
+            records.append(FieldRecord(**values))
+        return records
+
+    @property
+    def record_list(self) -> List[FieldRecord]:
+        """Shared record list in file order (do not mutate; use records())"""
+        if self._records is None:
+            with self._lock:
+                if self._records is None:
+                    self._records = self._build_records()
+        return self._records
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def __contains__(self, field_id: str) -> bool:
+        return field_id in self._row_of
+
+    def __iter__(self):
+        return iter(self.record_list)
+
+    def get(self, field_id: str) -> Optional[FieldRecord]:
+        row = self._row_of.get(field_id)
+        return None if row is None else self.record_list[row]
+
+    def field_type(self, field_id: str, default: Optional[str] = None) -> Optional[str]:
+        row = self._row_of.get(field_id)
+        if row is None:
+            return default
+        code = int(self.columns['type'][row])
+        return default if code == _MISSING else self.strings[code]
+
+    def _rows(self, type: Union[str, Iterable[str], None] = None,
+              dataset: Optional[str] = None, category: Optional[str] = None) -> Optional[np.ndarray]:
+        """Rows matching the filters in file order, or None for every row"""
+        rows = None
+        if type is not None:
+            types = [type] if isinstance(type, str) else list(type)
+            parts = [self._by_type[t] for t in types if t in self._by_type]
+            rows = np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+        for index, key in ((self._by_dataset, dataset), (self._by_category, category)):
+            if key is not None:
+                matched = index.get(key, np.empty(0, dtype=np.int64))
+                rows = matched if rows is None else np.intersect1d(rows, matched, assume_unique=True)
+        return rows
+
+    def records(self, type: Union[str, Iterable[str], None] = None,
+                dataset: Optional[str] = None, category: Optional[str] = None) -> List[FieldRecord]:
+        """Fields in file order, optionally filtered by type(s), dataset id and category id"""
+        rows = self._rows(type, dataset, category)
+        if rows is None:
+            return list(self.record_list)
+        record_list = self.record_list
+        return [record_list[row] for row in rows.tolist()]
+
+    def dicts(self, type: Union[str, Iterable[str], None] = None,
+              dataset: Optional[str] = None, category: Optional[str] = None) -> List[Dict]:
+        """records() as plain API-style dicts (safe to mutate or json.dump)"""
+        return [record.to_dict() for record in self.records(type, dataset, category)]
+
+    def ids(self, type: Union[str, Iterable[str], None] = None,
+            dataset: Optional[str] = None, category: Optional[str] = None) -> List[str]:
+        return [record.id for record in self.records(type, dataset, category)]
+
+    def by_usage(self, type: Union[str, Iterable[str], None] = None,
+                 dataset: Optional[str] = None, descending: bool = False) -> List[FieldRecord]:
+        """Fields ordered by userCount + alphaCount (least used first), ties in file order"""
+        rows = self._rows(type, dataset)
+        order = self._usage_order
+        if rows is not None:
+            selected = np.zeros(len(self), dtype=bool)
+            selected[rows] = True
+            order = order[selected[order]]
+        if descending:
+            # Stable on ties, like list.sort(key=..., reverse=True)
+            order = order[np.argsort(-self._usage[order], kind='stable')]
+        record_list = self.record_list
+        return [record_list[row] for row in order.tolist()]
+
+    def by_coverage(self, min_coverage: float = 0.0,
+                    type: Union[str, Iterable[str], None] = None) -> List[FieldRecord]:
+        """Fields with coverage >= min_coverage, best covered first"""
+        coverage = self.columns['coverage']
+        rows = self._rows(type)
+        order = self._coverage_order
+        keep = coverage[order] >= min_coverage
+        if rows is not None:
+            selected = np.zeros(len(self), dtype=bool)
+            selected[rows] = True
+            keep &= selected[order]
+        record_list = self.record_list
+        return [record_list[row] for row in order[keep].tolist()]
+
+    def sample(self, k: int, type: Union[str, Iterable[str], None] = None,
+               dataset: Optional[str] = None, rng: Optional[random.Random] = None) -> List[FieldRecord]:
+        """Up to k distinct fields drawn uniformly from the filtered set"""
+        rows = self._rows(type, dataset)
+        population = len(self) if rows is None else len(rows)
+        picks = (rng or random).sample(range(population), min(k, population))
+        record_list = self.record_list
+        if rows is None:
+            return [record_list[i] for i in picks]
+        return [record_list[int(rows[i])] for i in picks]
+
+    def types(self) -> Dict[str, int]:
+        return {name: len(rows) for name, rows in self._by_type.items()}
+
+    def datasets(self) -> Dict[str, int]:
+        return {name: len(rows) for name, rows in self._by_dataset.items()}
+
+    def categories(self) -> Dict[str, int]:
+        return {name: len(rows) for name, rows in self._by_category.items()}
+
+
+class FieldRegistry:
+    """
+    Process-wide field tables keyed by (region, delay, universe).
+
+    A table is parsed from its JSON cache once; later lookups only stat the
+    source file to notice a refetch.  Pass universe=None to take every field
+    in the file, or a universe to keep only the fields whose region, delay
+    and universe all match.
+    """
+
+    def __init__(self, cache_dir: str = '.', pattern: str = 'data_fields_cache_{region}_{delay}.json',
+                 snapshot_dir: Optional[str] = None, use_snapshots: bool = True):
+        """
+        Args:
+            cache_dir: Directory holding the JSON field caches
+            pattern: Cache file name; may use {region}, {delay} and {universe}
+            snapshot_dir: Where snapshots go (default: <cache_dir>/field_registry)
+            use_snapshots: Read and write memory-mapped snapshots
+        """
+        self.cache_dir = cache_dir
+        self.pattern = pattern
+        self.snapshot_dir = snapshot_dir or os.path.join(cache_dir, 'field_registry')
+        self.use_snapshots = use_snapshots
+        self._tables: Dict[Tuple[str, int, Optional[str]], Tuple[Optional[tuple], FieldTable]] = {}
+        self._lock = threading.RLock()
+        self.stats = {'hits': 0, 'json_loads': 0, 'snapshot_loads': 0, 'snapshot_writes': 0, 'registered': 0}
+
+    def source_path(self, region: str, delay: int, universe: Optional[str] = None) -> str:
+        return os.path.join(self.cache_dir, self.pattern.format(region=region, delay=delay, universe=universe))
+
+    def _snapshot_path(self, region: str, delay: int, universe: Optional[str]) -> str:
+        source = os.path.splitext(os.path.basename(self.source_path(region, delay, universe)))[0]
+        return os.path.join(self.snapshot_dir, f"{source}__{universe or 'all'}.fields")
+
+    @staticmethod
+    def _stat(path: str) -> Optional[tuple]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def table(self, region: str, delay: int = 1, universe: Optional[str] = None) -> Optional[FieldTable]:
+        """The table for region/delay/universe, or None if there is no cache file for it"""
+        key = (region, int(delay), universe)
+        source = self.source_path(region, delay, universe)
+        stamp = self._stat(source)
+        with self._lock:
+            cached = self._tables.get(key)
+            if cached is not None and cached[0] == stamp:
+                self.stats['hits'] += 1
+                return cached[1]
+            if stamp is None:
+                return None
+            table = self._load(key, source, stamp)
+            self._tables[key] = (stamp, table)
+            return table
+
+    def _load(self, key: tuple, source: str, stamp: tuple) -> FieldTable:
+        region, delay, universe = key
+        snapshot = self._snapshot_path(region, delay, universe)
+        if self.use_snapshots:
+            header = FieldTable.read_header(snapshot)
+            if header is not None and header.get('source') == {'mtime_ns': stamp[0], 'size': stamp[1]}:
+                try:
+                    table = FieldTable.load(snapshot, header)
+                    self.stats['snapshot_loads'] += 1
+                    logger.debug(f"Mapped field snapshot {snapshot} ({len(table)} fields)")
+                    return table
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Ignoring unreadable field snapshot {snapshot}: {e}")
+
+        if universe is not None and '{universe}' not in self.pattern:
+            # Every universe shares one file: parse it once and filter the records
+            fields = self.table(region, delay).record_list
+        else:
+            with open(source, 'r', encoding='utf-8') as f:
+                fields = json.load(f)
+            self.stats['json_loads'] += 1
+        if universe is not None:
+            fields = [field for field in fields
+                      if field.get('region') == region and field.get('universe') == universe
+                      and field.get('delay') == delay]
+        table = FieldTable.from_fields(region, delay, universe, fields)
+        logger.info(f"Loaded {len(table)} data fields for {region} delay={delay}"
+                    f"{f' universe={universe}' if universe else ''} into the field registry")
+        self._write_snapshot(table, snapshot, stamp)
+        return table
+
+    def _write_snapshot(self, table: FieldTable, snapshot: str, stamp: Optional[tuple]):
+        if not self.use_snapshots or stamp is None:
+            return
+        try:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            table.save(snapshot, source={'mtime_ns': stamp[0], 'size': stamp[1]})
+            self.stats['snapshot_writes'] += 1
+        except OSError as e:
+            logger.warning(f"Could not write field snapshot {snapshot}: {e}")
+
+    def register(self, region: str, delay: int, universe: Optional[str], fields: Iterable[Dict]) -> FieldTable:
+        """Install freshly fetched fields (call after writing the JSON cache)"""
+        table = FieldTable.from_fields(region, int(delay), universe, fields)
+        stamp = self._stat(self.source_path(region, delay, universe))
+        with self._lock:
+            self._tables[(region, int(delay), universe)] = (stamp, table)
+            self.stats['registered'] += 1
+        if stamp is not None:
+            self._write_snapshot(table, self._snapshot_path(region, delay, universe), stamp)
+        return table
+
+    def invalidate(self, region: Optional[str] = None, delay: Optional[int] = None):
+        """Drop loaded tables (all, or those for region and optionally delay)"""
+        with self._lock:
+            for key in list(self._tables):
+                if (region is None or key[0] == region) and (delay is None or key[1] == int(delay)):
+                    del self._tables[key]
+
+    def loaded(self) -> List[FieldTable]:
+        with self._lock:
+            return [table for _, table in self._tables.values()]
+
+    def field_type(self, field_id: str, regions: Iterable[str], delay: int = 0,
+                   universe: Optional[str] = None, default: Optional[str] = None) -> Optional[str]:
+        """Type of field_id from the first of regions whose table has it"""
+        for region in regions:
+            table = self.table(region, delay, universe)
+            if table is not None and field_id in table:
+                return table.field_type(field_id, default)
+        return default
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            tables = {f"{region}_{delay}_{universe or 'all'}": len(table)
+                      for (region, delay, universe), (_, table) in self._tables.items()}
+        return {**self.stats, 'tables': tables, 'fields': sum(tables.values())}
+
+
+_registries: Dict[Tuple[str, str, Optional[str]], FieldRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_field_registry(cache_dir: str = '.', pattern: str = 'data_fields_cache_{region}_{delay}.json',
+                       snapshot_dir: Optional[str] = None) -> FieldRegistry:
+    """Shared registry for a cache directory, so every generator in the process reuses one set of tables"""
+    key = (os.path.abspath(cache_dir), pattern, snapshot_dir)
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = _registries[key] = FieldRegistry(cache_dir, pattern, snapshot_dir)
+        return registry
@@ -0,0 +1,358 @@
+"""
+Result Cache
+Simulation results keyed by canonical expression + result-relevant settings
+
+Generators keep proposing expressions that differ from an earlier one only in
+spacing, the argument order of a commutative operator or how a number is
+written ("add(a, b)" / "add(b,a)", "ts_mean(x, 20.0)" / "ts_mean(x,20)"), and
+each of them used to cost a full simulation. The expression is parsed and
+re-rendered in a canonical form, hashed together with the settings that change
+a backtest, and a result stored under that hash is returned instead of
+submitting again.
+
+- canonicalize_expression: normal form (whitespace, numbers, commutative order)
+- settings_fingerprint: the result-relevant part of a settings dict/dataclass
+- result_key: stable hash of both
+- is_cacheable: whether a reported status/message is a property of the expression
+- ResultCache: thread-safe get/put with an append-only JSONL file and hit stats
+
+Only COMPLETE results and FAILED results the expression itself caused (unknown
+variable, syntax error, bad arguments...) belong in the cache. ERROR, WARNING,
+other failures, transport errors and timeouts can go away on a resubmit and
+are never stored.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, is_dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Operators whose positional arguments can be reordered without changing the result
+COMMUTATIVE_FUNCTIONS = frozenset({'add', 'multiply', 'max', 'min'})
+COMMUTATIVE_INFIX = frozenset({'+', '*'})
+
+# Settings that change a backtest; display-only keys (visualization) are ignored
+RESULT_SETTINGS = ('instrumentType', 'region', 'universe', 'delay', 'decay', 'neutralization',
+                   'truncation', 'pasteurization', 'unitHandling', 'nanHandling', 'maxTrade',
+                   'language', 'testPeriod', 'startDate', 'endDate')
+
+_TOKEN = re.compile(r'''\s*(?:
+    (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+  | (?P<name>[A-Za-z_]\w*)
+  | (?P<string>"[^"]*"|'[^']*')
+  | (?P<op>&&|\|\||==|!=|<=|>=|[-+*/<>!?:=(),;])
+)''', re.VERBOSE)
+
+# FAILED messages caused by the expression itself; these fail again on every resubmit
+DETERMINISTIC_FAILURE = re.compile(
+    r'unknown (?:variable|operator|function|field)|unexpected (?:token|character|end|symbol)|syntax|parse|parsing|invalid (?:input|argument|field|number)'
+    r'|incompatible unit|undefined|does not support|not (?:a valid|supported)|compil|expects? \d+|got \d+ input',
+    re.IGNORECASE)
+
+# Binary precedence levels, loosest first (the ternary sits below all of them)
+_BINARY_LEVELS = (('||',), ('&&',), ('==', '!=', '<', '>', '<=', '>='), ('+', '-'), ('*', '/'))
+
+
+def format_number(text: str) -> str:
+    """Normalize a numeric literal: 20.0 -> 20, .50 -> 0.5, 1e3 -> 1000"""
+    value = float(text)
+    if value.is_integer() and abs(value) < 1e16:
+        return str(int(value))
+    return repr(value)
+
+
+def _tokenize(expression: str) -> List[Tuple[str, str]]:
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Unexpected character at {position}: {expression[position:position + 10]!r}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent FASTEXPR parser that renders its canonical form directly"""
+
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        self.tokens = tokens
+        self.index = 0
+
+    def peek(self, offset: int = 0) -> Tuple[Optional[str], Optional[str]]:
+        index = self.index + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def take(self, value: Optional[str] = None) -> str:
+        kind, text = self.peek()
+        if kind is None or (value is not None and text != value):
+            raise ValueError(f"Expected {value or 'token'}, got {text!r}")
+        self.index += 1
+        return text
+
+    def at(self, *values: str) -> bool:
+        kind, text = self.peek()
+        return kind == 'op' and text in values
+
+    def program(self) -> str:
+        statements = []
+        while self.peek()[0] is not None:
+            if self.at(';'):
+                self.take()
+                continue
+            statements.append(self.statement())
+            if self.peek()[0] is not None:
+                self.take(';')
+        return ';'.join(statements)
+
+    def statement(self) -> str:
+        if self.peek()[0] == 'name' and self.peek(1) == ('op', '='):
+            name = self.take()
+            self.take('=')
+            return f"{name}={self.ternary()}"
+        return self.ternary()
+
+    def ternary(self) -> str:
+        condition = self.binary(0)
+        if not self.at('?'):
+            return condition
+        self.take()
+        when_true = self.ternary()
+        self.take(':')
+        return f"({condition}?{when_true}:{self.ternary()})"
+
+    def binary(self, level: int) -> str:
+        if level == len(_BINARY_LEVELS):
+            return self.unary()
+        operands = [self.binary(level + 1)]
+        operators = []
+        while self.at(*_BINARY_LEVELS[level]):
+            operators.append(self.take())
+            operands.append(self.binary(level + 1))
+        # Left-associative fold; a run of one commutative operator becomes one sorted group
+        terms, run = operands[:1], None
+        for operator, operand in zip(operators, operands[1:]):
+            if operator in COMMUTATIVE_INFIX and run in (None, operator):
+                terms.append(operand)
+                run = operator
+                continue
+            left = self._group(terms, run)
+            if operator in COMMUTATIVE_INFIX:
+                terms, run = [left, operand], operator
+            else:
+                terms, run = [f"({left}{operator}{operand})"], None
+        return self._group(terms, run)
+
+    @staticmethod
+    def _group(terms: List[str], operator: Optional[str]) -> str:
+        return terms[0] if operator is None else f"({operator.join(sorted(terms))})"
+
+    def unary(self) -> str:
+        if self.at('-', '+', '!'):
+            operator = self.take()
+            operand = self.unary()
+            if operator == '+':
+                return operand
+            if operator == '-' and re.fullmatch(r'-?[\d.]+(?:e[-+]?\d+)?', operand):
+                return format_number('-' + operand if not operand.startswith('-') else operand[1:])
+            return f"({operator}{operand})"
+        return self.primary()
+
+    def primary(self) -> str:
+        kind, text = self.peek()
+        if kind == 'number':
+            self.take()
+            return format_number(text)
+        if kind == 'string':
+            self.take()
+            return text
+        if kind == 'name':
+            self.take()
+            if self.at('('):
+                return self.call(text)
+            return text
+        if self.at('('):
+            self.take()
+            inner = self.ternary()
+            self.take(')')
+            return inner
+        raise ValueError(f"Unexpected token {text!r}")
+
+    def call(self, name: str) -> str:
+        self.take('(')
+        positional, keywords = [], []
+        while not self.at(')'):
+            if self.peek()[0] == 'name' and self.peek(1) == ('op', '='):
+                keyword = self.take()
+                self.take('=')
+                keywords.append(f"{keyword}={self.ternary()}")
+            else:
+                positional.append(self.ternary())
+            if not self.at(')'):
+                self.take(',')
+        self.take(')')
+        if name in COMMUTATIVE_FUNCTIONS:
+            positional = sorted(positional)
+        return f"{name}({','.join(positional + sorted(keywords))})"
+
+
+def canonicalize_expression(expression: str) -> str:
+    """
+    Canonical form of a FASTEXPR expression
+
+    Whitespace and redundant parentheses are dropped, numeric literals are
+    normalized, and the operands of +, *, add, multiply, max and min are sorted,
+    so "add(b, a) * 2.0" and "2*add(a,b)" compare equal. Expressions the parser
+    does not understand fall back to whitespace normalization.
+    """
+    try:
+        return _Parser(_tokenize(expression)).program()
+    except ValueError:
+        return re.sub(r'(?<![\w.])\s+|\s+(?![\w.])', '', expression.strip())
+
+
+def settings_fingerprint(settings: Any) -> Dict:
+    """Result-relevant settings from a settings dict, dataclass or simulation payload"""
+    if is_dataclass(settings):
+        settings = asdict(settings)
+    settings = settings.get('settings', settings) if isinstance(settings, dict) else {}
+    fingerprint = {}
+    for name in RESULT_SETTINGS:
+        value = settings.get(name)
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            value = 'ON' if value else 'OFF'
+        elif isinstance(value, (int, float)):
+            value = format_number(str(value))
+        else:
+            value = str(value).strip().upper()
+        fingerprint[name] = value
+    return fingerprint
+
+
+def result_key(expression: str, settings: Any) -> str:
+    """Stable hash of (canonical expression, result-relevant settings)"""
+    payload = canonicalize_expression(expression) + '\n' + json.dumps(settings_fingerprint(settings), sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def is_cacheable(status: Optional[str], message: Any = '') -> bool:
+    """
+    Whether a platform-reported result can stand in for a future simulation
+
+    COMPLETE always can; FAILED only when the message says the expression is at
+    fault (DETERMINISTIC_FAILURE). ERROR and anything else may succeed on retry.
+    """
+    status = str(status or '').upper()
+    if status == 'COMPLETE':
+        return True
+    if status != 'FAILED':
+        return False
+    if not isinstance(message, str):
+        message = json.dumps(message, default=str)
+    return bool(DETERMINISTIC_FAILURE.search(message or ''))
+
+
+class ResultCache:
+    """Simulation results keyed by result_key, cached on disk"""
+
+    def __init__(self, path: Optional[str] = 'simulation_cache.jsonl'):
+        """
+        Args:
+            path: JSONL file the cache is loaded from and appended to (None keeps it in memory)
+        """
+        self.path = path
+        self._results: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.loaded = 0
+        if path:
+            self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line from an interrupted write
+                self._results[entry['key']] = entry['result']
+        self.loaded = len(self._results)
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._results
+
+    def get(self, expression: str, settings: Any) -> Optional[Dict]:
+        """Stored result for an equivalent expression under the same settings, or None"""
+        key = result_key(expression, settings)
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return copy.deepcopy(result)
+
+    def lookup(self, key: str) -> Optional[Dict]:
+        """Stored result by key, without counting a hit or miss"""
+        with self._lock:
+            result = self._results.get(key)
+        return copy.deepcopy(result) if result is not None else None
+
+    def put(self, expression: str, settings: Any, result: Dict,
+            status: Optional[str] = 'COMPLETE', message: Any = '') -> Optional[str]:
+        """
+        Store a platform-reported result; returns its key
+
+        status/message are what the platform reported. Results is_cacheable
+        rejects are not stored and None is returned.
+        """
+        if not is_cacheable(status, message):
+            return None
+        key = result_key(expression, settings)
+        with self._lock:
+            if self.path:
+                entry = {'key': key, 'expression': expression, 'canonical': canonicalize_expression(expression),
+                         'settings': settings_fingerprint(settings), 'result': result, 'stored_at': time.time()}
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry, default=str) + '\n')
+            self._results[key] = copy.deepcopy(result)
+            self.stores += 1
+        return key
+
+    def get_stats(self) -> Dict:
+        """Cache size and this run's hit counts"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._results),
+            'loaded': self.loaded,
+            'hits': self.hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def log_stats(self, level: int = logging.INFO):
+        stats = self.get_stats()
+        logger.log(level, f"Result cache: {stats['hits']} hits / {stats['hits'] + stats['misses']} lookups "
+                          f"({stats['hit_rate']:.0%}) - {stats['hits']} simulations skipped, "
+                          f"{stats['stores']} new results, {stats['entries']} cached")
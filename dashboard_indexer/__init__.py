@@ -0,0 +1,16 @@
+"""
+Dashboard Indexer
+Background log tailing and results indexing shared by the generation_one web
+dashboards
+
+- log_indexer: DashboardIndexer (log ring buffers, results index, server-sent
+  event fan-out) and in_serving_process (Flask debug-reloader guard)
+
+Import the submodule (from dashboard_indexer.log_indexer import
+DashboardIndexer); nothing is imported eagerly here.
+
+The dashboards' requirements.txt files install it (`../../dashboard_indexer`);
+for development use `pip install -e dashboard_indexer` from the repository root.
+"""
+
+__version__ = "1.0.0"
@@ -0,0 +1,325 @@
+"""
+Background log and results indexer for the web dashboard.
+
+Log files are followed by byte offset and the most recent lines are kept in a
+ring buffer, so API handlers never re-read whole files. Result files are
+tracked by mtime/size and only new or changed files are parsed.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+import logging
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class LogTail:
+    """Follows a single log file by byte offset."""
+
+    def __init__(self, path: str, max_lines: int = 2000, backfill_bytes: int = 256 * 1024,
+                 read_chunk_bytes: int = 4 * 1024 * 1024):
+        """
+        Args:
+            path: Log file to follow
+            max_lines: Size of the in-memory ring buffer
+            backfill_bytes: How much of an existing file to read on first open
+            read_chunk_bytes: Maximum bytes read per chunk while catching up
+        """
+        self.path = path
+        self.lines: Deque[str] = deque(maxlen=max_lines)
+        self.total_lines = 0
+        self.mtime: Optional[float] = None
+        self._backfill_bytes = backfill_bytes
+        self._read_chunk_bytes = read_chunk_bytes
+        self._offset = 0
+        self._inode: Optional[int] = None
+        self._partial = b""
+        self._lock = threading.Lock()
+
+    def exists(self) -> bool:
+        return self.mtime is not None
+
+    def poll(self) -> List[str]:
+        """Read lines appended since the last poll and return them."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            self.mtime = None
+            return []
+
+        skip_first_line = False
+        if self._inode is None:
+            # First open: only backfill the tail of a (possibly huge) existing file
+            self._offset = max(0, st.st_size - self._backfill_bytes)
+            skip_first_line = self._offset > 0
+        elif st.st_ino != self._inode or st.st_size < self._offset:
+            # Rotated or truncated: start over from the beginning of the new file
+            self._offset = 0
+            self._partial = b""
+        self._inode = st.st_ino
+        self.mtime = st.st_mtime
+
+        if st.st_size == self._offset:
+            return []
+
+        new_lines: List[str] = []
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self._offset)
+                while True:
+                    chunk = f.read(self._read_chunk_bytes)
+                    if not chunk:
+                        break
+                    self._offset += len(chunk)
+                    data = self._partial + chunk
+                    parts = data.split(b"\n")
+                    self._partial = parts.pop()
+                    if skip_first_line and parts:
+                        parts = parts[1:]
+                        skip_first_line = False
+                    new_lines.extend(p.decode('utf-8', errors='ignore').rstrip("\r") for p in parts)
+                    # Only the newest lines can ever be served, so drop the rest while catching up
+                    if len(new_lines) > self.lines.maxlen:
+                        new_lines = new_lines[-self.lines.maxlen:]
+        except OSError as e:
+            logger.warning(f"Could not read {self.path}: {e}")
+            return []
+
+        with self._lock:
+            self.lines.extend(new_lines)
+            self.total_lines += len(new_lines)
+        return new_lines
+
+    def tail(self, n: int) -> List[str]:
+        """Return the last n lines from the ring buffer."""
+        with self._lock:
+            if n >= len(self.lines):
+                return list(self.lines)
+            return list(self.lines)[-n:]
+
+
+class ResultsIndex:
+    """Incremental statistics over the JSON files in a results directory."""
+
+    def __init__(self, results_dir: str):
+        self.results_dir = results_dir
+        # file name -> (mtime, size, successful); successful is None if the file failed to parse
+        self._files: Dict[str, Tuple[float, int, Optional[bool]]] = {}
+        self._lock = threading.Lock()
+
+    def poll(self) -> bool:
+        """Scan the directory, parsing only new or changed files. Returns True if anything changed."""
+        if not os.path.isdir(self.results_dir):
+            changed = bool(self._files)
+            with self._lock:
+                self._files = {}
+            return changed
+
+        seen = {}
+        changed = False
+        try:
+            with os.scandir(self.results_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith('.json') or not entry.is_file():
+                        continue
+                    st = entry.stat()
+                    previous = self._files.get(entry.name)
+                    if previous and previous[0] == st.st_mtime and previous[1] == st.st_size:
+                        seen[entry.name] = previous
+                        continue
+                    seen[entry.name] = (st.st_mtime, st.st_size, self._is_successful(entry.path))
+                    changed = True
+        except OSError as e:
+            logger.warning(f"Could not scan {self.results_dir}: {e}")
+            return False
+
+        if len(seen) != len(self._files):
+            changed = True
+        with self._lock:
+            self._files = seen
+        return changed
+
+    @staticmethod
+    def _is_successful(path: str) -> Optional[bool]:
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            return bool(data and len(data) > 0)
+        except Exception:
+            return None
+
+    def stats(self) -> Dict:
+        """Aggregate statistics in the same shape as AlphaDashboard.get_statistics."""
+        cutoff = (datetime.now() - timedelta(hours=24)).timestamp()
+        stats = {
+            "total_alphas_generated": 0,
+            "successful_alphas": 0,
+            "failed_alphas": 0,
+            "last_24h_generated": 0,
+            "last_24h_successful": 0
+        }
+        with self._lock:
+            files = list(self._files.values())
+        stats["total_alphas_generated"] = len(files)
+        for mtime, _, successful in files:
+            if successful:
+                stats["successful_alphas"] += 1
+            elif successful is None:
+                stats["failed_alphas"] += 1
+            if mtime > cutoff:
+                stats["last_24h_generated"] += 1
+                if successful:
+                    stats["last_24h_successful"] += 1
+        return stats
+
+
+def in_serving_process(debug: bool) -> bool:
+    """
+    False in the watcher process of Flask's debug reloader
+
+    With debug=True, app.run() re-runs the script in a child process (marked by
+    WERKZEUG_RUN_MAIN) and only that child serves requests, so only it should
+    start an indexer.
+    """
+    return not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'
+
+
+class DashboardIndexer:
+    """
+    Background thread that tails log files and indexes result files.
+
+    Subscribers (e.g. server-sent-event streams) receive ("log", {...}) and
+    ("statistics", {...}) events as new data arrives.
+    """
+
+    def __init__(self, log_files: Dict[str, str], results_dir: Optional[str] = None,
+                 max_lines: int = 2000, log_interval: float = 1.0, results_interval: float = 5.0):
+        """
+        Args:
+            log_files: Mapping of stream name -> log file path
+            results_dir: Directory of result JSON files (optional)
+            max_lines: Ring buffer size per log file
+            log_interval: Seconds between log polls
+            results_interval: Seconds between results directory scans
+        """
+        self.tails = {name: LogTail(path, max_lines=max_lines) for name, path in log_files.items()}
+        self.results = ResultsIndex(results_dir) if results_dir else None
+        self.log_interval = log_interval
+        self.results_interval = results_interval
+        self._subscribers: List[queue.Queue] = []
+        self._subscribers_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._last_results_scan = 0.0
+
+    def start(self):
+        """Prime the indexes and start the background thread (idempotent, safe from request threads)."""
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self.poll_once(force_results=True)
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="dashboard-indexer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        while not self._stop.wait(self.log_interval):
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.warning(f"Indexer poll failed: {e}")
+
+    def poll_once(self, force_results: bool = False):
+        """Poll all log files, and the results directory if its interval has elapsed."""
+        for name, log_tail in self.tails.items():
+            new_lines = log_tail.poll()
+            if new_lines:
+                self._publish("log", {"stream": name, "lines": new_lines})
+
+        now = time.monotonic()
+        if self.results and (force_results or now - self._last_results_scan >= self.results_interval):
+            self._last_results_scan = now
+            if self.results.poll():
+                self._publish("statistics", self.results.stats())
+
+    def tail(self, name: str, n: int) -> Optional[List[str]]:
+        """Last n lines of a stream, or None if its log file does not exist."""
+        log_tail = self.tails.get(name)
+        if log_tail is None or not log_tail.exists():
+            return None
+        return log_tail.tail(n)
+
+    def mtime(self, name: str) -> Optional[float]:
+        log_tail = self.tails.get(name)
+        return log_tail.mtime if log_tail else None
+
+    def stats(self) -> Dict:
+        if self.results is None:
+            return ResultsIndex("").stats()
+        return self.results.stats()
+
+    def subscribe(self, max_pending: int = 1000) -> queue.Queue:
+        """Register a subscriber queue; events are dropped for subscribers that fall behind."""
+        q: queue.Queue = queue.Queue(maxsize=max_pending)
+        with self._subscribers_lock:
+            self._subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q: queue.Queue):
+        with self._subscribers_lock:
+            if q in self._subscribers:
+                self._subscribers.remove(q)
+
+    def _publish(self, event: str, payload: Dict):
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            try:
+                q.put_nowait((event, payload))
+            except queue.Full:
+                pass
+
+    def event_stream(self, snapshot: Callable[[], Dict], status: Optional[Callable[[], Dict]] = None,
+                     status_interval: float = 30.0, keepalive: float = 15.0):
+        """
+        Generator of server-sent-event frames.
+
+        Starts with a "snapshot" event, then forwards indexer events, emits a
+        "status" event every status_interval seconds (if a status callable is
+        given) and sends a comment line as keep-alive when idle.
+        """
+        q = self.subscribe()
+        try:
+            yield self.format_event("snapshot", snapshot())
+            next_status = time.monotonic() + status_interval
+            while True:
+                timeout = keepalive
+                if status is not None:
+                    timeout = max(0.0, min(keepalive, next_status - time.monotonic()))
+                try:
+                    event, payload = q.get(timeout=timeout)
+                    yield self.format_event(event, payload)
+                except queue.Empty:
+                    if status is None or time.monotonic() < next_status:
+                        yield ": keep-alive\n\n"
+                if status is not None and time.monotonic() >= next_status:
+                    next_status = time.monotonic() + status_interval
+                    yield self.format_event("status", status())
+        finally:
+            self.unsubscribe(q)
+
+    @staticmethod
+    def format_event(event: str, payload: Dict) -> str:
+        return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
@@ -0,0 +1,228 @@
+"""
+Broadcast load test for the agent hub WebSocket layer.
+
+Connects thousands of simulated clients (a small share of them slow) to a
+WebSocketManager and measures how long broadcasts take to reach the fast
+clients, compared with the old sequential send loop.  Also times liveness
+expiry with the timer wheel against a full scan of every agent.
+
+Run from the agent-hub directory:
+    python load_test.py --clients 5000 --slow-fraction 0.01
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from src.broadcast import TimerWheel
+from src.websocket_manager import WebSocketManager
+
+
+class SimulatedClient:
+    """Stands in for a FastAPI WebSocket; records when each message arrives"""
+
+    def __init__(self, delay: float = 0.0, batch: bool = False):
+        self.delay = delay
+        self.query_params = {"batch": "1"} if batch else {}
+        self.received = {}
+        self.frames = 0
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, frame: str):
+        if self.closed:
+            raise RuntimeError("connection closed")
+        # Every send yields, like a real socket write
+        await asyncio.sleep(self.delay)
+        self.frames += 1
+        arrived = time.perf_counter()
+        message = json.loads(frame)
+        for item in message["messages"] if message.get("type") == "batch" else [message]:
+            if "seq" in item:
+                self.received[item["seq"]] = arrived
+
+    async def close(self):
+        self.closed = True
+
+
+def _latencies(clients, sent_at):
+    """Per-message delivery latency (ms) over the given clients"""
+    latencies = []
+    for client in clients:
+        for seq, arrived in client.received.items():
+            latencies.append((arrived - sent_at[seq]) * 1000)
+    return latencies
+
+
+def _percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def legacy_broadcast(clients, message):
+    """The previous behaviour: serialize and await every client in turn"""
+    for client in clients:
+        await client.send_text(json.dumps(message))
+
+
+async def run_legacy(args, fast, slow):
+    clients = fast + slow
+    random.Random(0).shuffle(clients)
+    sent_at = {}
+    started = time.perf_counter()
+    for seq in range(args.legacy_messages):
+        sent_at[seq] = time.perf_counter()
+        await legacy_broadcast(clients, {"type": "workflow_update", "seq": seq, "payload": "x" * args.payload})
+    elapsed = time.perf_counter() - started
+    latencies = _latencies(fast, sent_at)
+    return {
+        "messages": args.legacy_messages,
+        "broadcast_ms": elapsed * 1000 / args.legacy_messages,
+        "fast_p50_ms": _percentile(latencies, 0.5),
+        "fast_p99_ms": _percentile(latencies, 0.99),
+    }
+
+
+async def run_fanout(args, fast, slow):
+    manager = WebSocketManager(max_queue=args.max_queue, slow_consumer_policy=args.policy)
+    clients = fast + slow
+    random.Random(0).shuffle(clients)
+    for index, client in enumerate(clients):
+        await manager.connect(client, f"client-{index}")
+    await asyncio.sleep(0.1)
+
+    sent_at = {}
+    enqueue_time = 0.0
+    started = time.perf_counter()
+    for seq in range(args.messages):
+        sent_at[seq] = time.perf_counter()
+        await manager.broadcast_to_clients({"type": "workflow_update", "seq": seq, "payload": "x" * args.payload})
+        enqueue_time += time.perf_counter() - sent_at[seq]
+        # Let the drain tasks run between bursts
+        await asyncio.sleep(args.interval)
+
+    deadline = time.perf_counter() + 30
+    while time.perf_counter() < deadline and any(len(client.received) < args.messages for client in fast):
+        await asyncio.sleep(0.01)
+    delivered = time.perf_counter() - started
+    latencies = _latencies(fast, sent_at)
+    stats = manager.get_delivery_stats()
+    result = {
+        "messages": args.messages,
+        "broadcast_ms": enqueue_time * 1000 / args.messages,
+        "fast_p50_ms": _percentile(latencies, 0.5),
+        "fast_p99_ms": _percentile(latencies, 0.99),
+        "fast_complete": sum(len(client.received) == args.messages for client in fast),
+        "frames_per_fast_client": statistics.mean(client.frames for client in fast) - 1,
+        "delivered_s": delivered,
+        "connections_left": len(manager.active_connections),
+        **stats,
+    }
+    for client_id in list(manager.senders):
+        manager.disconnect(client_id)
+    return result
+
+
+def run_liveness(agents: int, heartbeats: int, seconds: int):
+    """Timer wheel vs. a full scan, over a simulated stretch of heartbeats"""
+    rng = random.Random(0)
+    clock = [0.0]
+    wheel = TimerWheel(300, tick=1.0, slots=512, clock=lambda: clock[0])
+    last_heartbeat = {}
+    now = datetime(2024, 1, 1)
+    for agent in range(agents):
+        wheel.touch(agent)
+        last_heartbeat[agent] = now
+
+    wheel_time = scan_time = 0.0
+    wheel_expired = scan_expired = 0
+    for second in range(1, seconds + 1):
+        clock[0] = float(second)
+        now_dt = now + timedelta(seconds=second)
+        # A share of agents (never the last tenth) heartbeat each second
+        for agent in rng.sample(range(agents - agents // 10), heartbeats):
+            wheel.touch(agent)
+            last_heartbeat[agent] = now_dt
+
+        began = time.perf_counter()
+        wheel_expired += len(wheel.advance())
+        wheel_time += time.perf_counter() - began
+
+        began = time.perf_counter()
+        inactive = [agent for agent, seen in last_heartbeat.items() if now_dt - seen > timedelta(minutes=5)]
+        for agent in inactive:
+            del last_heartbeat[agent]
+        scan_expired += len(inactive)
+        scan_time += time.perf_counter() - began
+    return {
+        "agents": agents,
+        "seconds": seconds,
+        "wheel_ms_per_tick": wheel_time * 1000 / seconds,
+        "scan_ms_per_tick": scan_time * 1000 / seconds,
+        "wheel_expired": wheel_expired,
+        "scan_expired": scan_expired,
+    }
+
+
+async def main_async(args):
+    print(f"{args.clients:,} clients, {args.slow_fraction:.0%} slow ({args.slow_delay * 1000:.0f}ms per send)")
+    slow_count = int(args.clients * args.slow_fraction)
+
+    def population():
+        fast = [SimulatedClient(batch=args.batch) for _ in range(args.clients - slow_count)]
+        slow = [SimulatedClient(delay=args.slow_delay, batch=args.batch) for _ in range(slow_count)]
+        return fast, slow
+
+    if args.legacy_messages:
+        legacy = await run_legacy(args, *population())
+        print(f"  sequential: {legacy['broadcast_ms']:.0f}ms per broadcast, "
+              f"fast clients p50 {legacy['fast_p50_ms']:.0f}ms p99 {legacy['fast_p99_ms']:.0f}ms")
+
+    fanout = await run_fanout(args, *population())
+    print(f"  fan-out:    {fanout['broadcast_ms']:.1f}ms per broadcast (enqueue), "
+          f"fast clients p50 {fanout['fast_p50_ms']:.1f}ms p99 {fanout['fast_p99_ms']:.1f}ms")
+    print(f"              {fanout['fast_complete']:,}/{args.clients - slow_count:,} fast clients got all "
+          f"{fanout['messages']} messages; dropped {fanout['dropped_messages']:,}, "
+          f"slow consumers disconnected {fanout['slow_consumer_disconnects']:,}, "
+          f"{fanout['frames_per_fast_client']:.0f} frames per fast client")
+
+    liveness = run_liveness(args.clients, args.clients // 10, 900)
+    print(f"  liveness:   wheel {liveness['wheel_ms_per_tick']:.3f}ms/tick, "
+          f"full scan {liveness['scan_ms_per_tick']:.3f}ms/tick "
+          f"({liveness['wheel_expired']}/{liveness['scan_expired']} expired)")
+    return {"legacy": legacy if args.legacy_messages else None, "fanout": fanout, "liveness": liveness}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Agent hub broadcast load test")
+    parser.add_argument("--clients", type=int, default=5000)
+    parser.add_argument("--slow-fraction", type=float, default=0.01)
+    parser.add_argument("--slow-delay", type=float, default=0.25, help="Seconds per send for slow clients")
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--legacy-messages", type=int, default=2, help="0 skips the sequential baseline")
+    parser.add_argument("--interval", type=float, default=0.005, help="Seconds between broadcasts")
+    parser.add_argument("--payload", type=int, default=200, help="Payload bytes per message")
+    parser.add_argument("--max-queue", type=int, default=64)
+    parser.add_argument("--policy", default="drop_oldest", choices=["drop_oldest", "drop_newest", "disconnect"])
+    parser.add_argument("--batch", action="store_true", help="Clients opt in to batched frames")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    results = asyncio.run(main_async(args))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,24 +9,31 @@ import asyncio
 from .models import Agent, Message, Workflow, AlphaResult, SystemEvent
 from .schemas import AgentCreate, MessageCreate, WorkflowCreate
 from .websocket_manager import WebSocketManager
+from .broadcast import TimerWheel
 import os
 
 logger = logging.getLogger(__name__)
 
 class AgentManager:
-    def __init__(self):
+    INACTIVE_AFTER = timedelta(minutes=5)
+    REMOVE_AFTER = timedelta(hours=1)
+
+    def __init__(self, websocket_manager: Optional[WebSocketManager] = None):
         self.active_agents: Dict[str, dict] = {}
         self.websocket_agents: Dict[str, Any] = {}
+        self.websocket_manager = websocket_manager
         self.total_messages = 0
         self.alpha_generator_url = None
         self.n8n_url = None
+        # Liveness deadlines: only agents that are due get looked at
+        self.inactivity_timers = TimerWheel(self.INACTIVE_AFTER.total_seconds(), tick=1.0, slots=512)
+        self.removal_timers = TimerWheel(self.REMOVE_AFTER.total_seconds(), tick=10.0, slots=512)
         
     async def start(self):
         """Initialize the agent manager"""
         logger.info("Starting Agent Manager...")
         # Start background tasks
         asyncio.create_task(self._monitor_agents())
-        asyncio.create_task(self._cleanup_inactive_agents())
         
     async def stop(self):
         """Stop the agent manager"""
@@ -52,6 +59,7 @@ class AgentManager:
                 "last_heartbeat": datetime.utcnow(),
                 "status": "active"
             }
+            self._arm_timers(agent.id)
             
             # Log system event
             await self._log_system_event("agent_register", agent.id, {
@@ -95,6 +103,8 @@ class AgentManager:
             # Remove from active agents
             if agent_id in self.active_agents:
                 del self.active_agents[agent_id]
+            self.inactivity_timers.remove(agent_id)
+            self.removal_timers.remove(agent_id)
             
             # Remove from websocket agents
             if agent_id in self.websocket_agents:
@@ -132,14 +142,19 @@ class AgentManager:
             
             # Send via WebSocket if agent is connected
             if message_data.recipient_id in self.websocket_agents:
-                websocket = self.websocket_agents[message_data.recipient_id]
-                await websocket.send_text(json.dumps({
+                outgoing = {
                     "type": "message",
                     "message_id": message.id,
                     "sender_id": message_data.sender_id,
                     "payload": message_data.payload,
                     "timestamp": datetime.utcnow().isoformat()
-                }))
+                }
+                if self.websocket_manager is not None:
+                    # Goes through the connection's send queue, in order with everything else
+                    await self.websocket_manager.send_personal_message(message_data.recipient_id, outgoing)
+                else:
+                    websocket = self.websocket_agents[message_data.recipient_id]
+                    await websocket.send_text(json.dumps(outgoing))
             
             self.total_messages += 1
             logger.info(f"Message sent from {message_data.sender_id} to {message_data.recipient_id}")
@@ -166,8 +181,23 @@ class AgentManager:
     async def register_websocket_agent(self, agent_id: str, websocket):
         """Register an agent's WebSocket connection"""
         self.websocket_agents[agent_id] = websocket
+        self.record_heartbeat(agent_id)
         logger.info(f"WebSocket agent registered: {agent_id}")
     
+    def record_heartbeat(self, agent_id: str):
+        """Note that an agent is alive (any traffic from it counts)"""
+        agent_info = self.active_agents.get(agent_id)
+        if agent_info is not None:
+            agent_info["last_heartbeat"] = datetime.utcnow()
+            if agent_info["status"] == "inactive":
+                agent_info["status"] = "active"
+                logger.info(f"Agent {agent_id} is active again")
+            self._arm_timers(agent_id)
+    
+    def _arm_timers(self, agent_id: str):
+        self.inactivity_timers.touch(agent_id)
+        self.removal_timers.touch(agent_id)
+    
     async def unregister_websocket_agent(self, agent_id: str):
         """Unregister an agent's WebSocket connection"""
         if agent_id in self.websocket_agents:
@@ -335,52 +365,28 @@ class AgentManager:
             return []
     
     # Background tasks
+    def check_liveness(self, now: Optional[float] = None):
+        """Expire agents whose heartbeat deadlines have passed"""
+        for agent_id in self.inactivity_timers.advance(now):
+            agent_info = self.active_agents.get(agent_id)
+            if agent_info is not None:
+                agent_info["status"] = "inactive"
+                logger.warning(f"Agent {agent_id} appears to be inactive")
+        for agent_id in self.removal_timers.advance(now):
+            if self.active_agents.pop(agent_id, None) is not None:
+                logger.info(f"Removed inactive agent: {agent_id}")
+    
     async def _monitor_agents(self):
         """Monitor agent health"""
         while True:
             try:
-                current_time = datetime.utcnow()
-                inactive_agents = []
-                
-                for agent_id, agent_info in self.active_agents.items():
-                    last_heartbeat = agent_info["last_heartbeat"]
-                    if current_time - last_heartbeat > timedelta(minutes=5):
-                        inactive_agents.append(agent_id)
-                        logger.warning(f"Agent {agent_id} appears to be inactive")
-                
-                # Mark inactive agents
-                for agent_id in inactive_agents:
-                    self.active_agents[agent_id]["status"] = "inactive"
-                
-                await asyncio.sleep(60)  # Check every minute
+                self.check_liveness()
+                await asyncio.sleep(self.inactivity_timers.tick)
                 
             except Exception as e:
                 logger.error(f"Error in agent monitoring: {e}")
                 await asyncio.sleep(60)
     
-    async def _cleanup_inactive_agents(self):
-        """Clean up inactive agents"""
-        while True:
-            try:
-                current_time = datetime.utcnow()
-                agents_to_remove = []
-                
-                for agent_id, agent_info in self.active_agents.items():
-                    last_heartbeat = agent_info["last_heartbeat"]
-                    if current_time - last_heartbeat > timedelta(hours=1):
-                        agents_to_remove.append(agent_id)
-                
-                # Remove inactive agents
-                for agent_id in agents_to_remove:
-                    del self.active_agents[agent_id]
-                    logger.info(f"Removed inactive agent: {agent_id}")
-                
-                await asyncio.sleep(300)  # Check every 5 minutes
-                
-            except Exception as e:
-                logger.error(f"Error in cleanup: {e}")
-                await asyncio.sleep(300)
-    
     async def _log_system_event(self, event_type: str, agent_id: str, payload: dict, db: AsyncSession):
         """Log a system event"""
         try:
@@ -0,0 +1,220 @@
+"""
+Fan-out primitives for the WebSocket layer.
+
+A broadcast is serialized once and the frame is pushed into a bounded send
+queue per connection; each connection drains its own queue in its own task,
+so one slow client never stalls delivery to the others.  Liveness deadlines
+live in a hashed timer wheel, so expiring idle peers costs work proportional
+to the peers that are due rather than a scan over everyone.
+"""
+
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Set
+import asyncio
+import logging
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class SlowConsumerPolicy(str, Enum):
+    """What to do when a connection's send queue is full"""
+    DROP_OLDEST = "drop_oldest"   # discard the oldest queued frame to make room
+    DROP_NEWEST = "drop_newest"   # discard the frame being enqueued
+    DISCONNECT = "disconnect"     # close the connection
+
+
+class ClientSender:
+    """Bounded send queue for one connection, drained by its own task"""
+
+    def __init__(self, client_id: str, websocket: Any, metadata: Optional[dict] = None,
+                 max_queue: int = 256, policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP_OLDEST,
+                 batch: bool = False, batch_max_messages: int = 64, batch_max_bytes: int = 64 * 1024,
+                 small_message_bytes: int = 4096,
+                 on_close: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            client_id: Connection id (used in logs and the close callback)
+            websocket: Anything with an async send_text()
+            metadata: Connection metadata dict; last_activity/message_count are kept current
+            max_queue: Frames queued before the slow-consumer policy applies
+            policy: SlowConsumerPolicy for a full queue
+            batch: Coalesce queued small frames into one {"type": "batch"} frame
+            batch_max_messages: Most frames coalesced into one batch
+            batch_max_bytes: Largest batch frame built
+            small_message_bytes: Frames larger than this are always sent on their own
+            on_close: Called with client_id once the sender shuts down on its own
+        """
+        self.client_id = client_id
+        self.websocket = websocket
+        self.metadata = metadata if metadata is not None else {}
+        self.max_queue = max_queue
+        self.policy = SlowConsumerPolicy(policy)
+        self.batch = batch
+        self.batch_max_messages = batch_max_messages
+        self.batch_max_bytes = batch_max_bytes
+        self.small_message_bytes = small_message_bytes
+        self.on_close = on_close
+
+        self.queue: Deque[str] = deque()
+        self.closed = False
+        self.close_reason: Optional[str] = None
+        self.dropped = 0
+        self.sent_frames = 0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the drain task"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._drain())
+
+    def enqueue(self, frame: str) -> bool:
+        """Queue a serialized frame; returns False if it was not queued"""
+        if self.closed:
+            return False
+        if len(self.queue) >= self.max_queue:
+            if self.policy == SlowConsumerPolicy.DISCONNECT:
+                logger.warning(f"Send queue full for {self.client_id}; disconnecting slow consumer")
+                self.close(notify=True, reason="slow_consumer")
+                return False
+            self.dropped += 1
+            if self.policy == SlowConsumerPolicy.DROP_NEWEST:
+                return False
+            self.queue.popleft()
+        self.queue.append(frame)
+        self._wakeup.set()
+        return True
+
+    def close(self, notify: bool = False, reason: str = "closed"):
+        """Stop the drain task; queued frames are discarded"""
+        if self.closed:
+            return
+        self.closed = True
+        self.close_reason = reason
+        self.queue.clear()
+        self._wakeup.set()
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+        if notify and self.on_close is not None:
+            self.on_close(self.client_id)
+
+    def _next_frame(self) -> str:
+        """Pop the next frame, coalescing queued small frames when batching"""
+        frame = self.queue.popleft()
+        if not self.batch or not self.queue or len(frame) > self.small_message_bytes:
+            return frame
+        frames = [frame]
+        size = len(frame)
+        while (self.queue and len(frames) < self.batch_max_messages
+               and len(self.queue[0]) <= self.small_message_bytes
+               and size + len(self.queue[0]) < self.batch_max_bytes):
+            frame = self.queue.popleft()
+            frames.append(frame)
+            size += len(frame) + 1
+        if len(frames) == 1:
+            return frames[0]
+        # Frames are already JSON, so the batch is built without re-serializing
+        return '{"type": "batch", "messages": [' + ', '.join(frames) + ']}'
+
+    async def _drain(self):
+        """Send queued frames until closed"""
+        try:
+            while not self.closed:
+                if not self.queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                queued = len(self.queue)
+                frame = self._next_frame()
+                messages = queued - len(self.queue)
+                await self.websocket.send_text(frame)
+                self.sent_frames += 1
+                self.metadata["last_activity"] = datetime.utcnow()
+                self.metadata["message_count"] = self.metadata.get("message_count", 0) + messages
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Error sending message to {self.client_id}: {e}")
+            self.close(notify=True, reason="send_error")
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel of keyed deadlines.
+
+    A touch that pushes a deadline later only records it; the entry is moved
+    to its proper slot lazily when its old slot comes round, so frequent
+    heartbeats stay O(1).  advance() visits only the slots whose time has passed.
+    """
+
+    def __init__(self, timeout: float, tick: float = 1.0, slots: int = 512,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            timeout: Seconds without a touch before a key expires
+            tick: Slot width in seconds (expiry resolution)
+            slots: Number of slots; deadlines beyond one revolution wait extra rounds
+            clock: Monotonic time source
+        """
+        self.timeout = timeout
+        self.tick = tick
+        self.clock = clock
+        self.slots: List[Set[Hashable]] = [set() for _ in range(slots)]
+        self.deadlines: Dict[Hashable, float] = {}
+        self._slot_of: Dict[Hashable, int] = {}
+        self._current = int(clock() / tick)
+
+    def __len__(self) -> int:
+        return len(self.deadlines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.deadlines
+
+    def _place(self, key: Hashable, deadline: float):
+        index = max(int(deadline / self.tick), self._current) % len(self.slots)
+        self.slots[index].add(key)
+        self._slot_of[key] = index
+
+    def touch(self, key: Hashable, timeout: Optional[float] = None):
+        """(Re)arm key to expire timeout seconds from now"""
+        deadline = self.clock() + (self.timeout if timeout is None else timeout)
+        previous = self.deadlines.get(key)
+        if previous is None:
+            self._place(key, deadline)
+        elif deadline < previous:
+            # The old slot may come round too late for an earlier deadline
+            self.slots[self._slot_of[key]].discard(key)
+            self._place(key, deadline)
+        self.deadlines[key] = deadline
+
+    def remove(self, key: Hashable):
+        """Forget key"""
+        if self.deadlines.pop(key, None) is not None:
+            self.slots[self._slot_of.pop(key)].discard(key)
+
+    def advance(self, now: Optional[float] = None) -> List[Hashable]:
+        """Move the wheel to now and return the keys that expired"""
+        now = self.clock() if now is None else now
+        target = int(now / self.tick)
+        expired = []
+        # A full revolution visits every slot; more steps than that add nothing
+        steps = min(target - self._current, len(self.slots) - 1)
+        for tick in range(target - steps, target + 1):
+            index = tick % len(self.slots)
+            slot = self.slots[index]
+            for key in list(slot):
+                deadline = self.deadlines[key]
+                if deadline <= now:
+                    slot.discard(key)
+                    del self.deadlines[key]
+                    del self._slot_of[key]
+                    expired.append(key)
+                elif int(deadline / self.tick) % len(self.slots) != index:
+                    # Touched since it was placed: move it to its new slot
+                    slot.discard(key)
+                    self._place(key, deadline)
+        self._current = target
+        return expired
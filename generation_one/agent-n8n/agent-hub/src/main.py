@@ -21,8 +21,12 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Global variables
-websocket_manager = WebSocketManager()
-agent_manager = AgentManager()
+websocket_manager = WebSocketManager(
+    max_queue=int(os.getenv("WS_MAX_QUEUE", "256")),
+    slow_consumer_policy=os.getenv("WS_SLOW_CONSUMER_POLICY", "drop_oldest"),
+    batch_messages=os.getenv("WS_BATCH_MESSAGES", "false").lower() == "true"
+)
+agent_manager = AgentManager(websocket_manager)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -150,6 +154,7 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
         while True:
             data = await websocket.receive_text()
             message = json.loads(data)
+            agent_manager.record_heartbeat(client_id)
             
             # Handle different message types
             if message.get("type") == "agent_register":
@@ -160,11 +165,11 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
                 await websocket_manager.broadcast_to_agents(message)
             
             # Echo back for testing
-            await websocket.send_text(json.dumps({
+            await websocket_manager.send_personal_message(client_id, {
                 "type": "ack",
                 "message": "Message received",
                 "timestamp": datetime.utcnow().isoformat()
-            }))
+            })
             
     except WebSocketDisconnect:
         websocket_manager.disconnect(client_id)
@@ -203,6 +208,7 @@ async def get_metrics():
     return {
         "active_agents": len(agent_manager.active_agents),
         "websocket_connections": len(websocket_manager.active_connections),
+        "websocket_dropped_messages": websocket_manager.get_delivery_stats()["dropped_messages"],
         "total_messages": agent_manager.total_messages,
         "system_uptime": datetime.utcnow().isoformat()
     }
@@ -4,23 +4,51 @@ import json
 import logging
 from datetime import datetime
 import asyncio
+from .broadcast import ClientSender, SlowConsumerPolicy
 
 logger = logging.getLogger(__name__)
 
 class WebSocketManager:
-    def __init__(self):
+    def __init__(self, max_queue: int = 256,
+                 slow_consumer_policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP_OLDEST,
+                 batch_messages: bool = False):
+        """
+        Args:
+            max_queue: Frames buffered per connection before the slow-consumer policy applies
+            slow_consumer_policy: drop_oldest, drop_newest or disconnect
+            batch_messages: Coalesce queued small messages for every connection
+                (clients can also opt in with ?batch=1)
+        """
         self.active_connections: Dict[str, WebSocket] = {}
         self.connection_metadata: Dict[str, dict] = {}
+        self.senders: Dict[str, ClientSender] = {}
+        self.max_queue = max_queue
+        self.slow_consumer_policy = SlowConsumerPolicy(slow_consumer_policy)
+        self.batch_messages = batch_messages
+        self.dropped_messages = 0
+        self.slow_consumer_disconnects = 0
         
-    async def connect(self, websocket: WebSocket, client_id: str):
+    async def connect(self, websocket: WebSocket, client_id: str, batch: Optional[bool] = None):
         """Connect a new WebSocket client"""
         await websocket.accept()
-        self.active_connections[client_id] = websocket
-        self.connection_metadata[client_id] = {
+        if client_id in self.senders:
+            # Reconnect under the same id: retire the old sender first
+            self.disconnect(client_id)
+        if batch is None:
+            query_params = getattr(websocket, "query_params", None) or {}
+            batch = self.batch_messages or query_params.get("batch") in ("1", "true")
+        metadata = {
             "connected_at": datetime.utcnow(),
             "last_activity": datetime.utcnow(),
             "message_count": 0
         }
+        sender = ClientSender(client_id, websocket, metadata, max_queue=self.max_queue,
+                              policy=self.slow_consumer_policy, batch=batch,
+                              on_close=self._on_sender_closed)
+        self.active_connections[client_id] = websocket
+        self.connection_metadata[client_id] = metadata
+        self.senders[client_id] = sender
+        sender.start()
         logger.info(f"WebSocket client {client_id} connected. Total connections: {len(self.active_connections)}")
         
         # Send welcome message
@@ -32,57 +60,60 @@ class WebSocketManager:
     
     def disconnect(self, client_id: str):
         """Disconnect a WebSocket client"""
+        sender = self.senders.pop(client_id, None)
+        if sender is not None:
+            self.dropped_messages += sender.dropped
+            sender.close()
         if client_id in self.active_connections:
             del self.active_connections[client_id]
         if client_id in self.connection_metadata:
             del self.connection_metadata[client_id]
         logger.info(f"WebSocket client {client_id} disconnected. Total connections: {len(self.active_connections)}")
     
+    def _on_sender_closed(self, client_id: str):
+        """A sender gave up (send error or slow consumer): drop the connection"""
+        sender = self.senders.get(client_id)
+        if sender is None:
+            return
+        if sender.close_reason == "slow_consumer":
+            self.slow_consumer_disconnects += 1
+        websocket = self.active_connections.get(client_id)
+        self.disconnect(client_id)
+        if websocket is not None:
+            asyncio.get_running_loop().create_task(self._close_quietly(websocket))
+    
+    async def _close_quietly(self, websocket: WebSocket):
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+    
+    def _enqueue(self, client_id: str, frame: str) -> bool:
+        sender = self.senders.get(client_id)
+        return sender is not None and sender.enqueue(frame)
+    
     async def send_personal_message(self, client_id: str, message: dict):
-        """Send a message to a specific client"""
-        if client_id in self.active_connections:
-            try:
-                await self.active_connections[client_id].send_text(json.dumps(message))
-                self.connection_metadata[client_id]["last_activity"] = datetime.utcnow()
-                self.connection_metadata[client_id]["message_count"] += 1
-            except Exception as e:
-                logger.error(f"Error sending message to {client_id}: {e}")
-                self.disconnect(client_id)
+        """Queue a message for a specific client"""
+        if client_id in self.senders:
+            self._enqueue(client_id, json.dumps(message))
+    
+    def broadcast(self, message: dict, exclude_client: Optional[str] = None) -> int:
+        """Serialize once and queue the frame for every connection; returns how many accepted it"""
+        frame = json.dumps(message)
+        queued = 0
+        # Senders may disconnect (and leave the dict) while we enqueue
+        for client_id in list(self.senders):
+            if client_id != exclude_client and self._enqueue(client_id, frame):
+                queued += 1
+        return queued
     
     async def broadcast_to_agents(self, message: dict):
         """Broadcast message to all agent connections"""
-        disconnected_clients = []
-        
-        for client_id, websocket in self.active_connections.items():
-            try:
-                await websocket.send_text(json.dumps(message))
-                self.connection_metadata[client_id]["last_activity"] = datetime.utcnow()
-                self.connection_metadata[client_id]["message_count"] += 1
-            except Exception as e:
-                logger.error(f"Error broadcasting to {client_id}: {e}")
-                disconnected_clients.append(client_id)
-        
-        # Clean up disconnected clients
-        for client_id in disconnected_clients:
-            self.disconnect(client_id)
+        self.broadcast(message)
     
     async def broadcast_to_clients(self, message: dict, exclude_client: Optional[str] = None):
         """Broadcast message to all clients except the excluded one"""
-        disconnected_clients = []
-        
-        for client_id, websocket in self.active_connections.items():
-            if client_id != exclude_client:
-                try:
-                    await websocket.send_text(json.dumps(message))
-                    self.connection_metadata[client_id]["last_activity"] = datetime.utcnow()
-                    self.connection_metadata[client_id]["message_count"] += 1
-                except Exception as e:
-                    logger.error(f"Error broadcasting to {client_id}: {e}")
-                    disconnected_clients.append(client_id)
-        
-        # Clean up disconnected clients
-        for client_id in disconnected_clients:
-            self.disconnect(client_id)
+        self.broadcast(message, exclude_client)
     
     def get_connection_info(self, client_id: str) -> Optional[dict]:
         """Get connection information for a client"""
@@ -102,21 +133,10 @@ class WebSocketManager:
     
     async def ping_all_connections(self):
         """Ping all connections to check if they're still alive"""
-        disconnected_clients = []
-        
-        for client_id, websocket in self.active_connections.items():
-            try:
-                await websocket.send_text(json.dumps({
-                    "type": "ping",
-                    "timestamp": datetime.utcnow().isoformat()
-                }))
-            except Exception as e:
-                logger.error(f"Error pinging {client_id}: {e}")
-                disconnected_clients.append(client_id)
-        
-        # Clean up disconnected clients
-        for client_id in disconnected_clients:
-            self.disconnect(client_id)
+        self.broadcast({
+            "type": "ping",
+            "timestamp": datetime.utcnow().isoformat()
+        })
     
     async def start_heartbeat(self, interval: int = 30):
         """Start heartbeat mechanism to keep connections alive"""
@@ -128,9 +148,18 @@ class WebSocketManager:
             except Exception as e:
                 logger.error(f"Error in heartbeat: {e}")
     
+    def get_delivery_stats(self) -> dict:
+        """Send queue totals across all connections"""
+        return {
+            "queued_messages": sum(len(sender.queue) for sender in self.senders.values()),
+            "dropped_messages": self.dropped_messages + sum(sender.dropped for sender in self.senders.values()),
+            "slow_consumer_disconnects": self.slow_consumer_disconnects
+        }
+    
     def get_stats(self) -> dict:
         """Get WebSocket manager statistics"""
         return {
             "total_connections": len(self.active_connections),
+            **self.get_delivery_stats(),
             "connections_info": self.get_all_connections_info()
         } 
\ No newline at end of file
@@ -22,7 +22,7 @@ class AlphaGeneratorAgent:
     def __init__(self):
         self.agent_id = "alpha_generator"
         self.agent_hub_url = os.getenv("AGENT_HUB_URL", "http://agent-hub:8000")
-        self.websocket_url = f"ws://agent-hub:8000/ws/{self.agent_id}"
+        self.websocket_url = f"ws://agent-hub:8000/ws/{self.agent_id}?batch=1"
         self.generator = None
         self.websocket = None
         self.running = False
@@ -134,7 +134,10 @@ class AlphaGeneratorAgent:
         """Process a received message"""
         message_type = message.get("type")
         
-        if message_type == "message":
+        if message_type == "batch":
+            for batched in message.get("messages", []):
+                await self.process_message(batched)
+        elif message_type == "message":
             await self.handle_agent_message(message)
         elif message_type == "ping":
             await self.send_pong()
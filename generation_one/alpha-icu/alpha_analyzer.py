@@ -5,10 +5,13 @@ Extracts successful alphas based on performance metrics and checks.
 
 import json
 import logging
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+from dataclasses import dataclass, fields
 from enum import Enum
 
+import numpy as np
+import pandas as pd
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -48,6 +51,41 @@ class AlphaMetrics:
     date_created: str
     status: str
 
+# Column layout of the metrics frame (one column per AlphaMetrics field)
+METRIC_COLUMNS = [f.name for f in fields(AlphaMetrics)]
+
+# Frame column -> key in the alpha's "is" block
+_IS_NUMERIC_FIELDS = {
+    "sharpe": "sharpe",
+    "fitness": "fitness",
+    "returns": "returns",
+    "turnover": "turnover",
+    "drawdown": "drawdown",
+    "margin": "margin",
+    "pnl": "pnl",
+    "long_count": "longCount",
+    "short_count": "shortCount",
+}
+
+# Frame column -> check result it counts
+_CHECK_COUNT_COLUMNS = {
+    "checks_passed": CheckResult.PASS.value,
+    "checks_failed": CheckResult.FAIL.value,
+    "checks_warning": CheckResult.WARNING.value,
+    "checks_pending": CheckResult.PENDING.value,
+}
+
+# Frame column -> (check name, list key, only count PASS results)
+_MATCH_CHECKS = {
+    "pyramid_matches": ('MATCHES_PYRAMID', 'pyramids', True),
+    "theme_matches": ('MATCHES_THEMES', 'themes', False),
+    "competition_matches": ('MATCHES_COMPETITION', 'competitions', False),
+}
+_MATCH_CHECKS_BY_NAME = {name: (column, key, require_pass)
+                         for column, (name, key, require_pass) in _MATCH_CHECKS.items()}
+
+_SORT_COLUMNS = ('sharpe', 'fitness', 'returns', 'pnl')
+
 class AlphaAnalyzer:
     """Analyzes and filters alphas based on success criteria"""
     
@@ -176,6 +214,128 @@ class AlphaAnalyzer:
             logger.error(f"Error extracting metrics for alpha {alpha_data.get('id', 'unknown')}: {e}")
             raise
     
+    def alphas_to_frame(self, alphas: List[Dict]) -> pd.DataFrame:
+        """
+        Normalize raw alpha JSON into a columnar metrics frame
+        
+        The frame has one row per alpha and one column per AlphaMetrics field,
+        so threshold checks, joins and ranking can run as vectorized expressions.
+        
+        Args:
+            alphas: List of raw alpha data from API
+            
+        Returns:
+            DataFrame with METRIC_COLUMNS
+        """
+        if not alphas:
+            return pd.DataFrame(columns=METRIC_COLUMNS)
+        
+        settings = [a.get('settings') or {} for a in alphas]
+        is_data = [a.get('is') or {} for a in alphas]
+        
+        frame = pd.DataFrame({
+            "alpha_id": [a.get('id', '') for a in alphas],
+            "code": [(a.get('regular') or {}).get('code', '') for a in alphas],
+            "region": [s.get('region', '') for s in settings],
+            "universe": [s.get('universe', '') for s in settings],
+            "delay": [s.get('delay', 0) for s in settings],
+            "neutralization": [s.get('neutralization', '') for s in settings],
+        })
+        for column, key in _IS_NUMERIC_FIELDS.items():
+            frame[column] = pd.to_numeric(pd.Series([d.get(key) for d in is_data]), errors='coerce').fillna(0)
+        frame["delay"] = pd.to_numeric(frame["delay"], errors='coerce').fillna(0).astype('int64')
+        # pnl stays float64: the API can report fractional PnL
+        for column in ("long_count", "short_count"):
+            frame[column] = frame[column].astype('int64')
+        
+        # Single pass over all checks: result codes per alpha row plus match lists
+        check_rows: List[int] = []
+        check_results: List[str] = []
+        matches = {column: [[] for _ in alphas] for column in _MATCH_CHECKS}
+        for row, d in enumerate(is_data):
+            seen = set()
+            for check in d.get('checks') or []:
+                result = check.get('result', '')
+                check_rows.append(row)
+                check_results.append(result)
+                match = _MATCH_CHECKS_BY_NAME.get(check.get('name'))
+                if match and match[0] not in seen and (not match[2] or result == CheckResult.PASS.value):
+                    seen.add(match[0])
+                    matches[match[0]][row] = [item.get('name', '') for item in check.get(match[1], [])]
+        
+        rows_array = np.asarray(check_rows, dtype=np.int64)
+        results_array = np.asarray(check_results, dtype=object)
+        for column, result in _CHECK_COUNT_COLUMNS.items():
+            frame[column] = np.bincount(rows_array[results_array == result], minlength=len(alphas))
+        for column, values in matches.items():
+            frame[column] = values
+        
+        frame["date_created"] = [a.get('dateCreated', '') for a in alphas]
+        frame["status"] = [a.get('status', '') for a in alphas]
+        return frame[METRIC_COLUMNS]
+    
+    def evaluate_frame(self, frame: pd.DataFrame,
+                       max_correlations: Optional[Dict[str, Optional[float]]] = None) -> pd.DataFrame:
+        """
+        Apply the success criteria to a metrics frame
+        
+        Same rules as is_successful_alpha, evaluated for every row at once.
+        
+        Args:
+            frame: Metrics frame from alphas_to_frame
+            max_correlations: Maximum production correlation per alpha ID (if available)
+            
+        Returns:
+            Copy of the frame with max_correlation, per-criterion failure flags and is_successful
+        """
+        frame = frame.copy()
+        if max_correlations:
+            correlation = pd.to_numeric(frame["alpha_id"].map(max_correlations), errors='coerce')
+        else:
+            correlation = pd.Series(np.nan, index=frame.index)
+        
+        frame["max_correlation"] = correlation
+        frame["fail_correlation"] = correlation.notna() & (correlation > self.max_prod_correlation)
+        frame["fail_checks"] = frame["checks_failed"] > 0
+        frame["fail_sharpe"] = frame["sharpe"] < self.min_sharpe
+        frame["fail_margin"] = frame["margin"] < self.min_margin
+        frame["is_successful"] = ~(frame["fail_correlation"] | frame["fail_checks"]
+                                   | frame["fail_sharpe"] | frame["fail_margin"])
+        return frame
+    
+    def failure_reasons(self, evaluated: pd.DataFrame) -> pd.Series:
+        """
+        Build the failure reason text for unsuccessful rows of an evaluated frame
+        
+        Args:
+            evaluated: Frame returned by evaluate_frame
+            
+        Returns:
+            Series of comma separated reasons, indexed like the unsuccessful rows
+        """
+        failed = evaluated[~evaluated["is_successful"]]
+        parts = pd.DataFrame(index=failed.index)
+        parts["correlation"] = failed["max_correlation"].map(
+            lambda c: f"Production correlation {c:.3f} exceeds maximum {self.max_prod_correlation} (CANNOT BE SUBMITTED)"
+        ).where(failed["fail_correlation"])
+        parts["checks"] = failed["checks_failed"].map(
+            lambda n: f"Has {n} FAILED checks (rejecting)").where(failed["fail_checks"])
+        parts["sharpe"] = failed["sharpe"].map(
+            lambda s: f"Sharpe ratio {s:.2f} below minimum {self.min_sharpe}").where(failed["fail_sharpe"])
+        parts["margin"] = failed["margin"].map(
+            lambda m: f"Margin {m:.6f} below minimum {self.min_margin} (8 bps)").where(failed["fail_margin"])
+        return parts.apply(lambda row: ', '.join(row.dropna()), axis=1) if len(parts) else pd.Series(dtype=object)
+    
+    @staticmethod
+    def frame_to_metrics(frame: pd.DataFrame) -> List[AlphaMetrics]:
+        """Convert rows of a metrics frame back into AlphaMetrics objects"""
+        return [AlphaMetrics(**record) for record in frame[METRIC_COLUMNS].to_dict('records')]
+    
+    @staticmethod
+    def metrics_to_frame(metrics: List[AlphaMetrics]) -> pd.DataFrame:
+        """Convert AlphaMetrics objects into a metrics frame"""
+        return pd.DataFrame([vars(m) for m in metrics], columns=METRIC_COLUMNS)
+    
     def is_successful_alpha(self, metrics: AlphaMetrics, max_correlation: Optional[float] = None) -> Tuple[bool, List[str]]:
         """
         Determine if an alpha meets success criteria based on API response status
@@ -225,54 +385,47 @@ class AlphaAnalyzer:
         Returns:
             Tuple of (successful_alphas, unsuccessful_alphas)
         """
-        successful = []
-        unsuccessful = []
-        
-        for alpha_data in alphas:
-            try:
-                metrics = self.extract_alpha_metrics(alpha_data)
-                is_successful, reasons = self.is_successful_alpha(metrics)
-                
-                if is_successful:
-                    successful.append(metrics)
-                    logger.info(f"Alpha {metrics.alpha_id} is SUCCESSFUL")
-                else:
-                    unsuccessful.append(metrics)
-                    logger.info(f"Alpha {metrics.alpha_id} is UNSUCCESSFUL: {', '.join(reasons)}")
-                    
-            except Exception as e:
-                logger.error(f"Error processing alpha {alpha_data.get('id', 'unknown')}: {e}")
-                continue
+        evaluated = self.evaluate_frame(self.alphas_to_frame(alphas))
+        successful_frame = evaluated[evaluated["is_successful"]]
+        unsuccessful_frame = evaluated[~evaluated["is_successful"]]
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            for alpha_id in successful_frame["alpha_id"]:
+                logger.debug(f"Alpha {alpha_id} is SUCCESSFUL")
+            reasons = self.failure_reasons(evaluated)
+            for alpha_id, reason in zip(unsuccessful_frame["alpha_id"], reasons):
+                logger.debug(f"Alpha {alpha_id} is UNSUCCESSFUL: {reason}")
+        
+        successful = self.frame_to_metrics(successful_frame)
+        unsuccessful = self.frame_to_metrics(unsuccessful_frame)
         
         logger.info(f"Filtered {len(successful)} successful alphas out of {len(alphas)} total")
         return successful, unsuccessful
     
-    def get_top_performers(self, successful_alphas: List[AlphaMetrics], 
+    def get_top_performers(self, successful_alphas: Union[List[AlphaMetrics], pd.DataFrame], 
                           top_n: int = 10, 
                           sort_by: str = 'sharpe') -> List[AlphaMetrics]:
         """
         Get top performing alphas
         
         Args:
-            successful_alphas: List of successful alpha metrics
+            successful_alphas: List of successful alpha metrics, or a metrics frame
             top_n: Number of top performers to return
             sort_by: Metric to sort by ('sharpe', 'fitness', 'returns', 'pnl')
             
         Returns:
             List of top performing alphas
         """
-        if sort_by == 'sharpe':
-            sorted_alphas = sorted(successful_alphas, key=lambda x: x.sharpe, reverse=True)
-        elif sort_by == 'fitness':
-            sorted_alphas = sorted(successful_alphas, key=lambda x: x.fitness, reverse=True)
-        elif sort_by == 'returns':
-            sorted_alphas = sorted(successful_alphas, key=lambda x: x.returns, reverse=True)
-        elif sort_by == 'pnl':
-            sorted_alphas = sorted(successful_alphas, key=lambda x: x.pnl, reverse=True)
-        else:
+        if sort_by not in _SORT_COLUMNS:
             raise ValueError(f"Invalid sort_by parameter: {sort_by}")
         
-        return sorted_alphas[:top_n]
+        frame = successful_alphas
+        if not isinstance(frame, pd.DataFrame):
+            frame = self.metrics_to_frame(successful_alphas)
+        
+        # nlargest keeps the first occurrence on ties, matching a stable descending sort
+        top = frame.nlargest(top_n, sort_by, keep='first')
+        return self.frame_to_metrics(top)
     
     def generate_summary_report(self, successful_alphas: List[AlphaMetrics], 
                                unsuccessful_alphas: List[AlphaMetrics]) -> Dict:
@@ -286,36 +439,44 @@ class AlphaAnalyzer:
         Returns:
             Dictionary containing summary statistics
         """
-        total_alphas = len(successful_alphas) + len(unsuccessful_alphas)
-        success_rate = len(successful_alphas) / total_alphas if total_alphas > 0 else 0
+        return self.generate_summary_report_frame(
+            self.metrics_to_frame(successful_alphas),
+            unsuccessful_count=len(unsuccessful_alphas)
+        )
+    
+    def generate_summary_report_frame(self, successful: pd.DataFrame, unsuccessful_count: int) -> Dict:
+        """
+        Generate the summary report from a frame of successful alphas
+        
+        Args:
+            successful: Metrics frame containing only successful alphas
+            unsuccessful_count: Number of unsuccessful alphas
+            
+        Returns:
+            Dictionary containing summary statistics
+        """
+        successful_count = len(successful)
+        total_alphas = successful_count + unsuccessful_count
+        success_rate = successful_count / total_alphas if total_alphas > 0 else 0
         
         # Calculate averages for successful alphas
-        if successful_alphas:
-            avg_sharpe = sum(a.sharpe for a in successful_alphas) / len(successful_alphas)
-            avg_fitness = sum(a.fitness for a in successful_alphas) / len(successful_alphas)
-            avg_returns = sum(a.returns for a in successful_alphas) / len(successful_alphas)
-            avg_turnover = sum(a.turnover for a in successful_alphas) / len(successful_alphas)
-            avg_drawdown = sum(a.drawdown for a in successful_alphas) / len(successful_alphas)
-            avg_margin = sum(a.margin for a in successful_alphas) / len(successful_alphas)
-            total_pnl = sum(a.pnl for a in successful_alphas)
+        if successful_count:
+            averages = successful[["sharpe", "fitness", "returns", "turnover", "drawdown", "margin"]].mean()
+            avg_sharpe, avg_fitness, avg_returns, avg_turnover, avg_drawdown, avg_margin = (
+                float(v) for v in averages)
+            total_pnl = successful["pnl"].sum().item()
         else:
             avg_sharpe = avg_fitness = avg_returns = avg_turnover = avg_drawdown = avg_margin = 0
             total_pnl = 0
         
-        # Region distribution
-        region_dist = {}
-        for alpha in successful_alphas:
-            region_dist[alpha.region] = region_dist.get(alpha.region, 0) + 1
-        
-        # Universe distribution
-        universe_dist = {}
-        for alpha in successful_alphas:
-            universe_dist[alpha.universe] = universe_dist.get(alpha.universe, 0) + 1
+        # Region and universe distributions (first-seen order)
+        region_dist = {k: int(v) for k, v in successful.groupby("region", sort=False).size().items()}
+        universe_dist = {k: int(v) for k, v in successful.groupby("universe", sort=False).size().items()}
         
         return {
             "total_alphas": total_alphas,
-            "successful_alphas": len(successful_alphas),
-            "unsuccessful_alphas": len(unsuccessful_alphas),
+            "successful_alphas": successful_count,
+            "unsuccessful_alphas": unsuccessful_count,
             "success_rate": success_rate,
             "average_metrics": {
                 "sharpe": avg_sharpe,
@@ -6,10 +6,14 @@ Fetches alphas from the WorldQuant Brain API with authentication and filtering.
 import requests
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
 
+from alpha_store import AlphaStore, normalize_timestamp
+from brain_client.brain_session import BrainSession
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -20,8 +24,9 @@ class AlphaFetcher:
     def __init__(self, credential_file: str = "credential.txt"):
         """Initialize the AlphaFetcher with credentials"""
         self.base_url = "https://api.worldquantbrain.com"
-        self.session = requests.Session()
         self.credentials = self._load_credentials(credential_file)
+        # Pool sized for concurrent page fetches; an expired session is renewed once for all workers
+        self.session = BrainSession(credentials=self.credentials, api_base=self.base_url, pool_size=16)
         self._authenticate()
     
     def _load_credentials(self, credential_file: str) -> Tuple[str, str]:
@@ -45,21 +50,8 @@ class AlphaFetcher:
     def _authenticate(self):
         """Authenticate with WorldQuant Brain API"""
         try:
-            from requests.auth import HTTPBasicAuth
-            
-            auth_url = f"{self.base_url}/authentication"
-            
-            response = self.session.post(
-                auth_url,
-                auth=HTTPBasicAuth(self.credentials[0], self.credentials[1])
-            )
-            
-            if response.status_code == 201:
-                logger.info("Successfully authenticated with WorldQuant Brain API")
-            else:
-                logger.error(f"Authentication failed: {response.status_code}")
-                response.raise_for_status()
-            
+            self.session.login()
+            logger.info("Successfully authenticated with WorldQuant Brain API")
         except requests.exceptions.RequestException as e:
             logger.error(f"Authentication failed: {e}")
             raise
@@ -81,7 +73,7 @@ class AlphaFetcher:
         Args:
             limit: Number of alphas to fetch per request
             offset: Starting offset for pagination
-            status: Alpha status filter (e.g., "UNSUBMITTED,IS_FAIL")
+            status: Alpha status filter (e.g., "UNSUBMITTED,IS_FAIL"), empty for all statuses
             date_from: Start date filter (ISO format)
             date_to: End date filter (ISO format)
             order: Sort order (e.g., "-dateCreated")
@@ -98,10 +90,11 @@ class AlphaFetcher:
             params = {
                 "limit": limit,
                 "offset": offset,
-                "status": status.replace(",", "\x1F"),  # Use unit separator instead of comma
                 "order": order,
                 "hidden": str(hidden).lower()
             }
+            if status:
+                params["status"] = status.replace(",", "\x1F")  # Use unit separator instead of comma
             
             # Add date filters if provided
             if date_from:
@@ -131,6 +124,32 @@ class AlphaFetcher:
             logger.error(f"Failed to fetch alphas: {e}")
             raise
     
+    def _fetch_page_with_retry(self, offset: int, limit: int, max_retries: int = 5, **filters) -> Dict:
+        """
+        Fetch a single page, backing off when the API rate limits us
+
+        Args:
+            offset: Starting offset for the page
+            limit: Page size
+            max_retries: Maximum number of retries on 429 responses
+            **filters: Filters forwarded to fetch_alphas
+
+        Returns:
+            Dictionary containing alpha data and pagination info
+        """
+        for attempt in range(max_retries + 1):
+            try:
+                return self.fetch_alphas(limit=limit, offset=offset, **filters)
+            except requests.exceptions.HTTPError as e:
+                response = e.response
+                if response is None or response.status_code != 429 or attempt == max_retries:
+                    raise
+                retry_after = float(response.headers.get('Retry-After', 1.0))
+                wait_time = retry_after * (2 ** attempt)
+                logger.warning(f"Rate limited at offset {offset} (attempt {attempt + 1}), waiting {wait_time:.1f} seconds...")
+                time.sleep(wait_time)
+        return {}
+
     def fetch_all_alphas(self, 
                         status: str = "UNSUBMITTED,IS_FAIL",
                         date_from: Optional[str] = None,
@@ -138,10 +157,17 @@ class AlphaFetcher:
                         max_alphas: Optional[int] = None,
                         min_sharpe: Optional[float] = None,
                         min_fitness: Optional[float] = None,
-                        min_margin: Optional[float] = None) -> List[Dict]:
+                        min_margin: Optional[float] = None,
+                        order: str = "-dateCreated",
+                        max_workers: int = 8,
+                        strict: bool = False) -> List[Dict]:
         """
         Fetch all alphas with pagination
         
+        The first page is fetched on its own to learn the total count; the
+        remaining pages are then fetched concurrently. If the API does not
+        report a count, pages are walked sequentially.
+        
         Args:
             status: Alpha status filter
             date_from: Start date filter (ISO format)
@@ -150,65 +176,172 @@ class AlphaFetcher:
             min_sharpe: Minimum Sharpe ratio filter
             min_fitness: Minimum fitness filter
             min_margin: Minimum margin filter
+            order: Sort order (e.g., "-dateCreated")
+            max_workers: Number of concurrent page requests (1 for sequential)
+            strict: Raise on the first page that cannot be fetched instead of
+                logging it and returning the pages that did arrive
             
         Returns:
             List of all alpha dictionaries
         """
-        all_alphas = []
-        offset = 0
         batch_size = 100  # Default batch size
+        filters = {
+            "status": status,
+            "date_from": date_from,
+            "date_to": date_to,
+            "order": order,
+            "min_sharpe": min_sharpe,
+            "min_fitness": min_fitness,
+            "min_margin": min_margin
+        }
+        
+        first_limit = min(batch_size, max_alphas) if max_alphas else batch_size
+        try:
+            first_page = self._fetch_page_with_retry(0, first_limit, **filters)
+        except Exception as e:
+            logger.error(f"Error fetching alphas at offset 0: {e}")
+            if strict:
+                raise
+            return []
+        
+        all_alphas = list(first_page.get('results', []))
+        total_count = first_page.get('count')
+        if not all_alphas or not first_page.get('next'):
+            logger.info(f"Total alphas fetched: {len(all_alphas)}")
+            return all_alphas[:max_alphas] if max_alphas else all_alphas
         
+        if total_count is None or max_workers <= 1:
+            all_alphas.extend(self._fetch_pages_sequential(len(all_alphas), batch_size, max_alphas, all_alphas,
+                                                           filters, strict))
+        else:
+            target = min(total_count, max_alphas) if max_alphas else total_count
+            offsets = list(range(len(all_alphas), target, batch_size))
+            logger.info(f"Fetching {target} alphas in {len(offsets) + 1} pages with {max_workers} workers...")
+            
+            def fetch_page(offset: int) -> List[Dict]:
+                limit = min(batch_size, target - offset)
+                try:
+                    return self._fetch_page_with_retry(offset, limit, **filters).get('results', [])
+                except Exception as e:
+                    logger.error(f"Error fetching alphas at offset {offset}: {e}")
+                    if strict:
+                        raise
+                    return []
+            
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # map() preserves page order, so the result keeps the requested sort order
+                for results in executor.map(fetch_page, offsets):
+                    all_alphas.extend(results)
+        
+        if max_alphas:
+            all_alphas = all_alphas[:max_alphas]
+        
+        logger.info(f"Total alphas fetched: {len(all_alphas)}")
+        return all_alphas
+    
+    def _fetch_pages_sequential(self, offset: int, batch_size: int, max_alphas: Optional[int],
+                                fetched: List[Dict], filters: Dict, strict: bool = False) -> List[Dict]:
+        """Walk the remaining pages one after another (used when the total count is unknown)"""
+        alphas = []
         while True:
             try:
-                # Calculate how many alphas we still need
-                remaining_needed = None
+                current_limit = batch_size
                 if max_alphas:
-                    remaining_needed = max_alphas - len(all_alphas)
+                    remaining_needed = max_alphas - len(fetched) - len(alphas)
                     if remaining_needed <= 0:
                         break
-                    # Use smaller batch size if we need fewer alphas
                     current_limit = min(batch_size, remaining_needed)
-                else:
-                    current_limit = batch_size
-                
-                data = self.fetch_alphas(
-                    limit=current_limit,
-                    offset=offset,
-                    status=status,
-                    date_from=date_from,
-                    date_to=date_to,
-                    min_sharpe=min_sharpe,
-                    min_fitness=min_fitness,
-                    min_margin=min_margin
-                )
                 
+                data = self._fetch_page_with_retry(offset, current_limit, **filters)
                 results = data.get('results', [])
                 if not results:
                     break
                 
-                all_alphas.extend(results)
-                logger.info(f"Fetched {len(all_alphas)} alphas so far...")
-                
-                # Check if we've reached the maximum
-                if max_alphas and len(all_alphas) >= max_alphas:
-                    all_alphas = all_alphas[:max_alphas]
-                    break
+                alphas.extend(results)
+                logger.info(f"Fetched {len(fetched) + len(alphas)} alphas so far...")
                 
-                # Check if there are more pages
                 if not data.get('next'):
                     break
-                
                 offset += current_limit
                 
-                # Add a small delay to be respectful to the API
-                time.sleep(0.1)
-                
             except Exception as e:
                 logger.error(f"Error fetching alphas at offset {offset}: {e}")
+                if strict:
+                    raise
                 break
+        return alphas
+    
+    def sync_alphas(self, store: AlphaStore, status: Optional[str] = None,
+                    full_resync: bool = False, max_workers: int = 8) -> int:
+        """
+        Synchronize the local alpha store with the API
         
-        logger.info(f"Total alphas fetched: {len(all_alphas)}")
-        return all_alphas
+        An incremental sync walks alphas newest-modified first and stops at the
+        store's high-water mark. A full resync (or a sync into an empty store)
+        re-downloads everything with concurrent page fetches.
+        
+        Nothing is written until every page has arrived: if any page fails the
+        sync raises and the store (and its high-water mark) is left unchanged,
+        so the missing pages are picked up by the next sync.
+        
+        Args:
+            store: Local AlphaStore to update
+            status: Status filter (None mirrors all statuses)
+            full_resync: Discard the store and download the whole history
+            max_workers: Number of concurrent page requests for full resyncs
+            
+        Returns:
+            Number of alphas written to the store
+            
+        Raises:
+            Exception: If a page could not be fetched
+        """
+        high_water_mark = None if full_resync else store.get_high_water_mark()
+        
+        if high_water_mark is None:
+            logger.info("Running full alpha resync...")
+            alphas = self.fetch_all_alphas(status=status, order="-dateModified", max_workers=max_workers, strict=True)
+            if full_resync:
+                store.clear()
+            written = store.upsert_alphas(alphas)
+            logger.info(f"Full resync stored {written} alphas")
+            return written
+        
+        logger.info(f"Running incremental alpha sync from high-water mark {high_water_mark}...")
+        # Alphas sharing the mark's timestamp may arrive after the last sync, so the
+        # mark itself is walked again; the ones already stored are skipped by id
+        stored_at_mark = store.ids_modified_at(high_water_mark)
+        batch_size = 100
+        offset = 0
+        pending: Dict[str, Dict] = {}
+        while True:
+            try:
+                data = self._fetch_page_with_retry(offset, batch_size, status=status, order="-dateModified")
+            except Exception as e:
+                logger.error(f"Error syncing alphas at offset {offset}, aborting sync without writing: {e}")
+                raise
+            
+            results = data.get('results', [])
+            # Pages are sorted newest-modified first, so the walk ends at the first older alpha
+            reached_older = False
+            for alpha in results:
+                modified = normalize_timestamp(alpha.get('dateModified') or alpha.get('dateCreated'))
+                if modified and modified < high_water_mark:
+                    reached_older = True
+                    continue
+                if modified == high_water_mark and alpha.get('id') in stored_at_mark:
+                    continue
+                # A page boundary can shift while walking; the id keeps one copy
+                pending[alpha.get('id')] = alpha
+            
+            if reached_older or not data.get('next'):
+                break
+            offset += batch_size
+        
+        # One write at the end: a partial walk must not advance the high-water mark
+        written = store.upsert_alphas(pending.values())
+        logger.info(f"Incremental sync stored {written} new or modified alphas")
+        return written
     
     def get_correlation_data(self, alpha_id: str, max_retries: int = 10) -> Dict:
         """
@@ -0,0 +1,215 @@
+"""
+Alpha Store for Alpha ICU
+Keeps a local SQLite mirror of the account's alphas so repeated analyses only
+pull records created or modified since the last sync.
+"""
+
+import json
+import sqlite3
+import threading
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def normalize_timestamp(value: Optional[str]) -> str:
+    """
+    Normalize an API timestamp to a sortable UTC ISO string
+
+    The API returns local offsets (e.g. "2025-09-13T21:32:26-04:00"), which do not
+    compare correctly as plain strings across DST changes.
+
+    Args:
+        value: Timestamp string from the API
+
+    Returns:
+        UTC ISO timestamp, or an empty string if the value cannot be parsed
+    """
+    if not value:
+        return ""
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return ""
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+
+
+class AlphaStore:
+    """SQLite-backed local table of alphas keyed by alpha ID"""
+
+    def __init__(self, db_path: str = "alpha_icu_alphas.db"):
+        """
+        Initialize the alpha store
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_database()
+
+    def _init_database(self):
+        """Create tables and indexes"""
+        with self._lock:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS alphas (
+                    id TEXT PRIMARY KEY,
+                    date_created TEXT,
+                    date_modified TEXT,
+                    status TEXT,
+                    region TEXT,
+                    sharpe REAL,
+                    fitness REAL,
+                    margin REAL,
+                    payload TEXT NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_alphas_modified ON alphas(date_modified)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_alphas_created ON alphas(date_created)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_alphas_status ON alphas(status)")
+            self._conn.commit()
+
+    def upsert_alphas(self, alphas: Iterable[Dict]) -> int:
+        """
+        Insert or replace alphas in the store
+
+        Args:
+            alphas: Raw alpha dictionaries from the API
+
+        Returns:
+            Number of rows written
+        """
+        rows = []
+        for alpha in alphas:
+            alpha_id = alpha.get('id')
+            if not alpha_id:
+                continue
+            is_data = alpha.get('is') or {}
+            rows.append((
+                alpha_id,
+                normalize_timestamp(alpha.get('dateCreated')),
+                normalize_timestamp(alpha.get('dateModified') or alpha.get('dateCreated')),
+                alpha.get('status', ''),
+                (alpha.get('settings') or {}).get('region', ''),
+                is_data.get('sharpe'),
+                is_data.get('fitness'),
+                is_data.get('margin'),
+                json.dumps(alpha)
+            ))
+
+        if not rows:
+            return 0
+
+        with self._lock:
+            self._conn.executemany("""
+                INSERT OR REPLACE INTO alphas
+                (id, date_created, date_modified, status, region, sharpe, fitness, margin, payload)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            self._conn.commit()
+        return len(rows)
+
+    def get_high_water_mark(self) -> Optional[str]:
+        """
+        Get the newest modification timestamp stored so far
+
+        Returns:
+            UTC ISO timestamp, or None if the store is empty
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(date_modified) FROM alphas").fetchone()
+        return row[0] if row and row[0] else None
+
+    def ids_modified_at(self, timestamp: str) -> set:
+        """
+        IDs of the stored alphas whose modification timestamp equals timestamp
+
+        Args:
+            timestamp: Normalized UTC ISO timestamp (e.g. the high-water mark)
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT id FROM alphas WHERE date_modified = ?", (timestamp,)).fetchall()
+        return {row[0] for row in rows}
+
+    def count(self) -> int:
+        """Return the number of stored alphas"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM alphas").fetchone()[0]
+
+    def clear(self):
+        """Remove all stored alphas (used before a full resync)"""
+        with self._lock:
+            self._conn.execute("DELETE FROM alphas")
+            self._conn.commit()
+
+    def query_alphas(self,
+                     status: Optional[str] = None,
+                     date_from: Optional[str] = None,
+                     date_to: Optional[str] = None,
+                     min_sharpe: Optional[float] = None,
+                     min_fitness: Optional[float] = None,
+                     min_margin: Optional[float] = None,
+                     limit: Optional[int] = None) -> List[Dict]:
+        """
+        Query stored alphas with the same filters the API supports
+
+        Args:
+            status: Comma separated status filter (e.g., "UNSUBMITTED,IS_FAIL")
+            date_from: Start date filter on dateCreated (ISO format)
+            date_to: End date filter on dateCreated (ISO format)
+            min_sharpe: Minimum Sharpe ratio filter
+            min_fitness: Minimum fitness filter
+            min_margin: Minimum margin filter
+            limit: Maximum number of alphas to return
+
+        Returns:
+            List of raw alpha dictionaries, newest first
+        """
+        clauses = []
+        params: List = []
+
+        if status:
+            statuses = [s.strip() for s in status.split(",") if s.strip()]
+            clauses.append(f"status IN ({','.join('?' * len(statuses))})")
+            params.extend(statuses)
+        if date_from:
+            clauses.append("date_created >= ?")
+            params.append(normalize_timestamp(date_from))
+        if date_to:
+            clauses.append("date_created < ?")
+            params.append(normalize_timestamp(date_to))
+        if min_sharpe is not None:
+            clauses.append("sharpe > ?")
+            params.append(min_sharpe)
+        if min_fitness is not None:
+            clauses.append("fitness > ?")
+            params.append(min_fitness)
+        if min_margin is not None:
+            clauses.append("margin > ?")
+            params.append(min_margin)
+
+        sql = "SELECT payload FROM alphas"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY date_created DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark for AlphaAnalyzer - compares the per-alpha path (extract_alpha_metrics +
+is_successful_alpha) with the columnar frame path on synthetic alpha payloads.
+"""
+
+import argparse
+import random
+import time
+from typing import Dict, List
+
+from alpha_analyzer import AlphaAnalyzer
+
+REGIONS = ["USA", "EUR", "ASI", "CHN", "GLB"]
+UNIVERSES = ["TOP3000", "TOP1000", "TOP500", "TOP2500"]
+CHECK_NAMES = ["LOW_SHARPE", "LOW_FITNESS", "LOW_TURNOVER", "HIGH_TURNOVER", "CONCENTRATED_WEIGHT"]
+CHECK_RESULTS = ["PASS", "PASS", "PASS", "WARNING", "FAIL", "PENDING"]
+
+
+def make_synthetic_alphas(count: int, seed: int = 42) -> List[Dict]:
+    """Generate synthetic alpha payloads shaped like /users/self/alphas results"""
+    rng = random.Random(seed)
+    alphas = []
+    for i in range(count):
+        checks = [
+            {"name": name, "result": rng.choice(CHECK_RESULTS), "limit": 1.0, "value": rng.random()}
+            for name in rng.sample(CHECK_NAMES, rng.randint(2, len(CHECK_NAMES)))
+        ]
+        if rng.random() < 0.2:
+            checks.append({"name": "MATCHES_PYRAMID", "result": "PASS",
+                           "pyramids": [{"name": f"{rng.choice(REGIONS)}/D1/PV"}]})
+        if rng.random() < 0.1:
+            checks.append({"name": "MATCHES_THEMES", "result": "PENDING",
+                           "themes": [{"name": "Theme A"}, {"name": "Theme B"}]})
+        alphas.append({
+            "id": f"SYN{i:07d}",
+            "settings": {
+                "region": rng.choice(REGIONS),
+                "universe": rng.choice(UNIVERSES),
+                "delay": rng.choice([0, 1]),
+                "neutralization": "INDUSTRY",
+            },
+            "regular": {"code": f"rank(ts_delta(close, {rng.randint(1, 60)}))"},
+            "dateCreated": "2025-09-13T21:32:25-04:00",
+            "status": "UNSUBMITTED",
+            "is": {
+                "pnl": rng.randint(-5_000_000, 15_000_000),
+                "longCount": rng.randint(0, 1500),
+                "shortCount": rng.randint(0, 1500),
+                "turnover": rng.uniform(0.0, 0.9),
+                "returns": rng.uniform(-0.1, 0.3),
+                "drawdown": rng.uniform(0.0, 0.5),
+                "margin": rng.uniform(0.0, 0.002),
+                "sharpe": rng.uniform(-1.0, 3.5),
+                "fitness": rng.uniform(-0.5, 2.5),
+                "checks": checks,
+            },
+        })
+    return alphas
+
+
+def run_per_alpha(analyzer: AlphaAnalyzer, alphas: List[Dict], top_n: int) -> Dict:
+    """Per-alpha reference path: one dataclass and one rule check per alpha"""
+    successful, unsuccessful = [], []
+    for alpha_data in alphas:
+        metrics = analyzer.extract_alpha_metrics(alpha_data)
+        ok, _ = analyzer.is_successful_alpha(metrics)
+        (successful if ok else unsuccessful).append(metrics)
+    top = sorted(successful, key=lambda a: a.sharpe, reverse=True)[:top_n]
+    region_dist = {}
+    for alpha in successful:
+        region_dist[alpha.region] = region_dist.get(alpha.region, 0) + 1
+    return {"successful": successful, "top": top, "region_distribution": region_dist}
+
+
+def run_frame(analyzer: AlphaAnalyzer, frame, top_n: int) -> Dict:
+    """Columnar path: evaluate and rank an already-normalized frame with vectorized expressions"""
+    evaluated = analyzer.evaluate_frame(frame)
+    successful_frame = evaluated[evaluated["is_successful"]]
+    report = analyzer.generate_summary_report_frame(
+        successful_frame, unsuccessful_count=int((~evaluated["is_successful"]).sum()))
+    top = analyzer.get_top_performers(successful_frame, top_n, 'sharpe')
+    return {"successful_ids": successful_frame["alpha_id"].tolist(), "top": top, "report": report}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AlphaAnalyzer on synthetic alphas")
+    parser.add_argument("--alphas", type=int, default=100_000, help="Number of synthetic alphas")
+    parser.add_argument("--top-n", type=int, default=10, help="Number of top performers to rank")
+    parser.add_argument("--queries", type=int, default=5, help="Number of threshold re-scorings to time")
+    args = parser.parse_args()
+
+    alphas = make_synthetic_alphas(args.alphas)
+    # Interactive analysis re-scores the same history under different thresholds
+    analyzers = [AlphaAnalyzer(min_sharpe=1.0 + 0.1 * i, min_margin=0.0005, max_prod_correlation=0.7)
+                 for i in range(args.queries)]
+
+    start = time.perf_counter()
+    references = [run_per_alpha(analyzer, alphas, args.top_n) for analyzer in analyzers]
+    per_alpha_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    frame = analyzers[0].alphas_to_frame(alphas)
+    normalize_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = [run_frame(analyzer, frame, args.top_n) for analyzer in analyzers]
+    query_time = time.perf_counter() - start
+
+    for reference, columnar in zip(references, results):
+        assert columnar["successful_ids"] == [a.alpha_id for a in reference["successful"]], "successful sets differ"
+        assert [a.alpha_id for a in columnar["top"]] == [a.alpha_id for a in reference["top"]], "top performers differ"
+        assert columnar["report"]["region_distribution"] == reference["region_distribution"], "reports differ"
+
+    print(f"Alphas: {len(alphas)}, queries: {args.queries}")
+    print(f"Per-alpha path:      {per_alpha_time:.3f}s total, {per_alpha_time / args.queries * 1000:.1f} ms/query")
+    print(f"Columnar normalize:  {normalize_time:.3f}s (once)")
+    print(f"Columnar queries:    {query_time:.3f}s total, {query_time / args.queries * 1000:.1f} ms/query")
+    print(f"Speedup (end to end): {per_alpha_time / (normalize_time + query_time):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
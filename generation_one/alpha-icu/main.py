@@ -11,7 +11,10 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import os
 
+import pandas as pd
+
 from alpha_fetcher import AlphaFetcher
+from alpha_store import AlphaStore
 from alpha_analyzer import AlphaAnalyzer, AlphaMetrics
 from correlation_checker import CorrelationChecker, CorrelationAnalysis
 
@@ -29,14 +32,21 @@ logger = logging.getLogger(__name__)
 class AlphaICU:
     """Main orchestrator for Alpha ICU system"""
     
-    def __init__(self, credential_file: str = "credential.txt"):
+    def __init__(self, credential_file: str = "credential.txt", store_path: Optional[str] = None,
+                 full_resync: bool = False):
         """
         Initialize Alpha ICU system
         
         Args:
             credential_file: Path to credential file
+            store_path: Path to a local SQLite alpha store; when set, alphas are synced
+                incrementally into it instead of re-downloaded on every run
+            full_resync: Discard the local store and re-download the whole history
         """
         self.credential_file = credential_file
+        self.store_path = store_path
+        self.full_resync = full_resync
+        self.store = None
         self.fetcher = None
         self.analyzer = None
         self.correlation_checker = None
@@ -53,6 +63,11 @@ class AlphaICU:
             self.fetcher = AlphaFetcher(self.credential_file)
             logger.info("✓ Alpha Fetcher initialized")
             
+            # Initialize local alpha store (optional)
+            if self.store_path:
+                self.store = AlphaStore(self.store_path)
+                logger.info(f"✓ Alpha Store initialized ({self.store.count()} alphas cached)")
+            
             # Initialize analyzer with success criteria
             self.analyzer = AlphaAnalyzer(
                 min_sharpe=1.2,  # New requirement: Sharpe > 1.2
@@ -110,28 +125,19 @@ class AlphaICU:
             
             # Step 2: Pre-filter alphas for basic criteria (avoid unnecessary correlation checks)
             logger.info("Step 2: Pre-filtering alphas for basic success criteria...")
-            candidate_alphas = []
-            for alpha_data in alphas:
-                try:
-                    metrics = self.analyzer.extract_alpha_metrics(alpha_data)
-                    # Check basic criteria without correlation
-                    is_successful, reasons = self.analyzer.is_successful_alpha(metrics, None)
-                    if is_successful:
-                        candidate_alphas.append((alpha_data, metrics))
-                        logger.info(f"Alpha {metrics.alpha_id} passed basic criteria")
-                    else:
-                        logger.info(f"Alpha {metrics.alpha_id} failed basic criteria: {', '.join(reasons)}")
-                except Exception as e:
-                    logger.error(f"Error processing alpha {alpha_data.get('id', 'unknown')}: {e}")
-                    continue
+            basic = self.analyzer.evaluate_frame(self.analyzer.alphas_to_frame(alphas))
+            for alpha_id, reason in zip(basic.loc[~basic["is_successful"], "alpha_id"],
+                                        self.analyzer.failure_reasons(basic)):
+                logger.info(f"Alpha {alpha_id} failed basic criteria: {reason}")
+            candidate_frame = basic.loc[basic["is_successful"]]
             
-            logger.info(f"Pre-filtered to {len(candidate_alphas)} candidate alphas out of {len(alphas)} total")
+            logger.info(f"Pre-filtered to {len(candidate_frame)} candidate alphas out of {len(alphas)} total")
             
             # Step 3: Check correlations only for candidate alphas (if requested)
             correlation_results = {}
-            if check_correlations and candidate_alphas:
+            if check_correlations and len(candidate_frame):
                 logger.info("Step 3: Checking correlations for candidate alphas...")
-                candidate_metrics = [metrics for _, metrics in candidate_alphas]
+                candidate_metrics = self.analyzer.frame_to_metrics(candidate_frame)
                 correlation_results = self._check_correlations(candidate_metrics)
             elif check_correlations:
                 logger.info("Step 3: No candidate alphas to check correlations for")
@@ -140,9 +146,8 @@ class AlphaICU:
             
             # Step 4: Final filtering with correlation constraints
             logger.info("Step 4: Final filtering with correlation constraints...")
-            if candidate_alphas:
-                candidate_alpha_data = [alpha_data for alpha_data, _ in candidate_alphas]
-                successful_alphas, unsuccessful_alphas = self._filter_alphas_with_correlations(candidate_alpha_data, correlation_results)
+            if len(candidate_frame):
+                successful_alphas, unsuccessful_alphas = self._filter_alphas_with_correlations(candidate_frame, correlation_results)
             else:
                 successful_alphas, unsuccessful_alphas = [], []
             
@@ -194,6 +199,23 @@ class AlphaICU:
             # TODO: Fix date parameter format for WorldQuant Brain API
             logger.info(f"Fetching alphas with status filter: {status_filter}")
             
+            if self.store is not None:
+                # Pull only new/modified alphas, then filter the local table
+                try:
+                    self.fetcher.sync_alphas(self.store, full_resync=self.full_resync)
+                    self.full_resync = False
+                except Exception as e:
+                    logger.warning(f"Alpha sync failed, using the local store as it was: {e}")
+                alphas = self.store.query_alphas(
+                    status=status_filter,
+                    limit=max_alphas,
+                    min_sharpe=1.2,
+                    min_fitness=1.0,
+                    min_margin=0.0005
+                )
+                logger.info(f"Loaded {len(alphas)} alphas from local store")
+                return alphas
+            
             # Fetch alphas with performance filters
             alphas = self.fetcher.fetch_all_alphas(
                 status=status_filter,
@@ -212,47 +234,35 @@ class AlphaICU:
             logger.error(f"Error fetching alphas: {e}")
             raise
     
-    def _filter_alphas_with_correlations(self, alphas: List[Dict], correlation_results: Dict) -> Tuple[List[AlphaMetrics], List[AlphaMetrics]]:
+    def _filter_alphas_with_correlations(self, candidate_frame: pd.DataFrame, correlation_results: Dict) -> Tuple[List[AlphaMetrics], List[AlphaMetrics]]:
         """
         Filter alphas with correlation constraints applied
         
         Args:
-            alphas: List of raw alpha data
+            candidate_frame: Metrics frame of candidate alphas
             correlation_results: Correlation analysis results
             
         Returns:
             Tuple of (successful_alphas, unsuccessful_alphas)
         """
-        successful = []
-        unsuccessful = []
-        
-        # Get correlation analyses if available
+        # Join max correlation per alpha from the correlation analyses (if available)
         correlation_analyses = correlation_results.get("analyses", {})
+        max_correlations = {alpha_id: analysis.get("max_correlation")
+                            for alpha_id, analysis in correlation_analyses.items()}
         
-        for alpha_data in alphas:
-            try:
-                metrics = self.analyzer.extract_alpha_metrics(alpha_data)
-                
-                # Get max correlation for this alpha if available
-                max_correlation = None
-                if metrics.alpha_id in correlation_analyses:
-                    max_correlation = correlation_analyses[metrics.alpha_id].get("max_correlation")
-                
-                # Check success criteria including correlation constraint
-                is_successful, reasons = self.analyzer.is_successful_alpha(metrics, max_correlation)
-                
-                if is_successful:
-                    successful.append(metrics)
-                    logger.info(f"Alpha {metrics.alpha_id} is SUCCESSFUL")
-                else:
-                    unsuccessful.append(metrics)
-                    logger.info(f"Alpha {metrics.alpha_id} is UNSUCCESSFUL: {', '.join(reasons)}")
-                    
-            except Exception as e:
-                logger.error(f"Error processing alpha {alpha_data.get('id', 'unknown')}: {e}")
-                continue
+        evaluated = self.analyzer.evaluate_frame(candidate_frame, max_correlations)
+        successful_frame = evaluated.loc[evaluated["is_successful"]]
+        unsuccessful_frame = evaluated.loc[~evaluated["is_successful"]]
+        
+        for alpha_id in successful_frame["alpha_id"]:
+            logger.info(f"Alpha {alpha_id} is SUCCESSFUL")
+        for alpha_id, reason in zip(unsuccessful_frame["alpha_id"], self.analyzer.failure_reasons(evaluated)):
+            logger.info(f"Alpha {alpha_id} is UNSUCCESSFUL: {reason}")
+        
+        successful = self.analyzer.frame_to_metrics(successful_frame)
+        unsuccessful = self.analyzer.frame_to_metrics(unsuccessful_frame)
         
-        logger.info(f"Filtered {len(successful)} successful alphas out of {len(alphas)} total")
+        logger.info(f"Filtered {len(successful)} successful alphas out of {len(candidate_frame)} total")
         return successful, unsuccessful
     
     def _check_correlations(self, alpha_metrics: List[AlphaMetrics]) -> Dict:
@@ -414,12 +424,14 @@ def main():
     parser.add_argument("--sort-by", choices=['sharpe', 'fitness', 'returns', 'pnl'], 
                        default='sharpe', help="Sort metric for top performers")
     parser.add_argument("--credential-file", default="credential.txt", help="Credential file path")
+    parser.add_argument("--sync-db", help="Local SQLite alpha store for incremental sync (e.g. alpha_icu_alphas.db)")
+    parser.add_argument("--full-resync", action="store_true", help="Re-download the whole alpha history into --sync-db")
     
     args = parser.parse_args()
     
     try:
         # Initialize Alpha ICU
-        alpha_icu = AlphaICU(args.credential_file)
+        alpha_icu = AlphaICU(args.credential_file, store_path=args.sync_db, full_resync=args.full_resync)
         
         # Run full analysis
         results = alpha_icu.run_full_analysis(
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+Coverage Tracker for the Enhanced Multi-Threaded Atom Tester
+- Dense integer index for every (region, data field, operator combination)
+- Roaring-style compressed completion bitmap (sorted arrays for sparse chunks, bitmaps for dense ones)
+- Incremental persistence: append-only journal of new completions plus periodic snapshots
+- Untested combinations iterated straight from the bitmap (amortized O(1) per combination)
+- Results appended to a columnar log (one .npz segment per flush) instead of rewriting a JSON list
+"""
+
+import json
+import os
+import glob
+import logging
+from typing import List, Dict, Tuple, Optional, Iterator, Iterable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CHUNK_BITS = 16
+CHUNK_SIZE = 1 << CHUNK_BITS
+ARRAY_LIMIT = 4096  # Above this many members a chunk is cheaper as a 8KB bitmap
+
+_ARRAY, _BITMAP, _FULL = 0, 1, 2
+
+
+class CompletionBitmap:
+    """Compressed set of non-negative integers, split into 2^16-wide chunks like a roaring bitmap"""
+
+    MAGIC = b'ATCB1'
+
+    def __init__(self):
+        # chunk key -> uint16 sorted array (sparse) or uint8[8192] little-endian bitmap (dense)
+        self._chunks: Dict[int, np.ndarray] = {}
+        self._cardinality: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return sum(self._cardinality.values())
+
+    def __contains__(self, index: int) -> bool:
+        chunk = self._chunks.get(index >> CHUNK_BITS)
+        if chunk is None:
+            return False
+        low = index & (CHUNK_SIZE - 1)
+        if chunk.dtype == np.uint16:
+            position = np.searchsorted(chunk, low)
+            return position < len(chunk) and chunk[position] == low
+        return bool(chunk[low >> 3] >> (low & 7) & 1)
+
+    def add(self, index: int) -> bool:
+        """Add one index, returning True if it was not already present"""
+        return self.update(np.array([index], dtype=np.int64)) == 1
+
+    def update(self, indices: Iterable[int]) -> int:
+        """Add many indices at once, returning how many were new"""
+        indices = np.sort(np.asarray(indices, dtype=np.int64).ravel())
+        if len(indices) > 1:
+            indices = indices[np.r_[True, indices[1:] != indices[:-1]]]
+        if len(indices) and indices[0] < 0:
+            raise ValueError("Bitmap indices must be non-negative")
+        added = 0
+        keys = indices >> CHUNK_BITS
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else []
+        for start, end in zip(starts, list(starts[1:]) + [len(indices)]):
+            key = int(keys[start])
+            lows = (indices[start:end] & (CHUNK_SIZE - 1)).astype(np.uint16)
+            before = self._cardinality.get(key, 0)
+            members = np.union1d(self._positions(key), lows) if before else lows
+            self._store(key, members)
+            added += self._cardinality[key] - before
+        return added
+
+    def _positions(self, key: int) -> np.ndarray:
+        """Members of one chunk as a sorted uint16 array"""
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            return np.empty(0, dtype=np.uint16)
+        if chunk.dtype == np.uint16:
+            return chunk
+        return np.flatnonzero(np.unpackbits(chunk, bitorder='little')).astype(np.uint16)
+
+    def _store(self, key: int, members: np.ndarray):
+        """Keep a chunk in whichever container is smaller"""
+        self._cardinality[key] = len(members)
+        if len(members) <= ARRAY_LIMIT:
+            self._chunks[key] = members.astype(np.uint16, copy=False)
+        else:
+            bits = np.zeros(CHUNK_SIZE, dtype=bool)
+            bits[members] = True
+            self._chunks[key] = np.packbits(bits, bitorder='little')
+
+    def missing(self, start: int, stop: int) -> Iterator[np.ndarray]:
+        """
+        Yield the indices in [start, stop) that are not set, one array per chunk
+
+        Full chunks are skipped without being touched and empty chunks yield a plain
+        arange, so walking the untested space costs O(1) per returned index.
+        """
+        for key in range(start >> CHUNK_BITS, ((stop - 1) >> CHUNK_BITS) + 1 if stop > start else 0):
+            base = key << CHUNK_BITS
+            lo, hi = max(start, base) - base, min(stop, base + CHUNK_SIZE) - base
+            cardinality = self._cardinality.get(key, 0)
+            if cardinality == CHUNK_SIZE:
+                continue
+            if not cardinality:
+                yield np.arange(base + lo, base + hi, dtype=np.int64)
+                continue
+            chunk = self._chunks[key]
+            if chunk.dtype == np.uint16:
+                unset = np.ones(hi - lo, dtype=bool)
+                inside = chunk[(chunk >= lo) & (chunk < hi)].astype(np.int64) - lo
+                unset[inside] = False
+            else:
+                unset = ~np.unpackbits(chunk, bitorder='little')[lo:hi].astype(bool)
+            found = np.flatnonzero(unset)
+            if len(found):
+                yield found + (base + lo)
+
+    def to_array(self) -> np.ndarray:
+        """All members, ascending"""
+        parts = [self._positions(key).astype(np.int64) + (key << CHUNK_BITS) for key in sorted(self._chunks)]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def to_bytes(self) -> bytes:
+        """Serialize: magic, chunk count, then (key, kind, cardinality, payload) per chunk"""
+        parts = [self.MAGIC, np.array([len(self._chunks)], dtype='<u4').tobytes()]
+        for key in sorted(self._chunks):
+            chunk, cardinality = self._chunks[key], self._cardinality[key]
+            kind = _FULL if cardinality == CHUNK_SIZE else (_ARRAY if chunk.dtype == np.uint16 else _BITMAP)
+            parts.append(np.array([key, kind, cardinality], dtype='<u4').tobytes())
+            if kind != _FULL:
+                parts.append(chunk.astype('<u2' if kind == _ARRAY else np.uint8).tobytes())
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'CompletionBitmap':
+        bitmap = cls()
+        if not data.startswith(cls.MAGIC):
+            raise ValueError("Not a completion bitmap")
+        offset = len(cls.MAGIC)
+        count = int(np.frombuffer(data, dtype='<u4', count=1, offset=offset)[0])
+        offset += 4
+        for _ in range(count):
+            key, kind, cardinality = (int(v) for v in np.frombuffer(data, dtype='<u4', count=3, offset=offset))
+            offset += 12
+            if kind == _FULL:
+                chunk = np.full(CHUNK_SIZE // 8, 0xFF, dtype=np.uint8)
+            elif kind == _ARRAY:
+                chunk = np.frombuffer(data, dtype='<u2', count=cardinality, offset=offset).astype(np.uint16)
+                offset += 2 * cardinality
+            else:
+                chunk = np.frombuffer(data, dtype=np.uint8, count=CHUNK_SIZE // 8, offset=offset).copy()
+                offset += CHUNK_SIZE // 8
+            bitmap._chunks[key] = chunk
+            bitmap._cardinality[key] = cardinality
+        return bitmap
+
+
+class CombinationSpace:
+    """
+    Dense numbering of every (region, data field, operator combination)
+
+    Regions occupy consecutive blocks; inside a region the index is
+    field_position * len(combinations) + combination_position.
+    """
+
+    def __init__(self, fields_by_region: Dict[str, List[str]], combination_ids: List[str]):
+        self.regions = sorted(fields_by_region)
+        self.fields = {region: list(dict.fromkeys(fields_by_region[region])) for region in self.regions}
+        self.combinations = list(dict.fromkeys(combination_ids))
+        self._field_position = {region: {field: i for i, field in enumerate(fields)}
+                                for region, fields in self.fields.items()}
+        self._combination_position = {cid: i for i, cid in enumerate(self.combinations)}
+        self.offsets = {}
+        total = 0
+        for region in self.regions:
+            self.offsets[region] = total
+            total += len(self.fields[region]) * len(self.combinations)
+        self.total = total
+        self._starts = np.array([self.offsets[region] for region in self.regions], dtype=np.int64)
+
+    def index(self, region: str, field_id: str, combination_id: str) -> Optional[int]:
+        """Index of a combination, or None if it is outside the space"""
+        try:
+            return (self.offsets[region] + self._field_position[region][field_id] * len(self.combinations)
+                    + self._combination_position[combination_id])
+        except KeyError:
+            return None
+
+    def key(self, index: int) -> Tuple[str, str, str]:
+        """(region, field_id, combination_id) for an index"""
+        region = self.regions[int(np.searchsorted(self._starts, index, side='right')) - 1]
+        field_position, combination_position = divmod(index - self.offsets[region], len(self.combinations))
+        return region, self.fields[region][field_position], self.combinations[combination_position]
+
+    def task_id(self, index: int) -> str:
+        """The "<region>_<field>_<combination>" id used by earlier progress files"""
+        return '_'.join(self.key(index))
+
+    def region_range(self, region: str) -> Tuple[int, int]:
+        start = self.offsets.get(region, 0)
+        return start, start + len(self.fields.get(region, ())) * len(self.combinations)
+
+    def parse_task_id(self, task_id: str) -> Optional[int]:
+        """Index for a legacy task id (field ids may themselves contain underscores)"""
+        region, _, rest = task_id.partition('_')
+        for combination_id in self.combinations:
+            if rest.endswith('_' + combination_id):
+                index = self.index(region, rest[:-len(combination_id) - 1], combination_id)
+                if index is not None:
+                    return index
+        return None
+
+    def signature(self) -> Dict:
+        return {'regions': [[region, self.fields[region]] for region in self.regions],
+                'combinations': self.combinations}
+
+    @classmethod
+    def from_signature(cls, signature: Dict) -> 'CombinationSpace':
+        return cls({region: fields for region, fields in signature['regions']}, signature['combinations'])
+
+    def translate(self, indices: np.ndarray, target: 'CombinationSpace') -> np.ndarray:
+        """Map indices of this space onto target, dropping ones target does not contain"""
+        if not len(indices) or not self.combinations:
+            return np.empty(0, dtype=np.int64)
+        combination_map = np.array([-1 if target._combination_position.get(cid) is None
+                                    else target._combination_position[cid] for cid in self.combinations],
+                                   dtype=np.int64)
+        translated = []
+        for region in self.regions:
+            start, stop = self.region_range(region)
+            inside = indices[(indices >= start) & (indices < stop)] - start
+            if not len(inside) or region not in target.offsets:
+                continue
+            positions = target._field_position[region]
+            field_map = np.array([positions.get(field, -1) for field in self.fields[region]], dtype=np.int64)
+            field_positions, combination_positions = np.divmod(inside, len(self.combinations))
+            new_fields, new_combinations = field_map[field_positions], combination_map[combination_positions]
+            keep = (new_fields >= 0) & (new_combinations >= 0)
+            translated.append(target.offsets[region] + new_fields[keep] * len(target.combinations)
+                              + new_combinations[keep])
+        return np.sort(np.concatenate(translated)) if translated else np.empty(0, dtype=np.int64)
+
+
+class CoverageTracker:
+    """
+    Persistent completion state for a CombinationSpace
+
+    Files in `directory`:
+    - coverage_space.json: the space the indices refer to
+    - coverage.bitmap: snapshot of the completion bitmap
+    - coverage.journal: little-endian uint64 indices completed since the snapshot
+    """
+
+    def __init__(self, directory: str, space: CombinationSpace, snapshot_every: int = 100_000):
+        self.directory = directory
+        self.space = space
+        self.snapshot_every = snapshot_every
+        self.bitmap = CompletionBitmap()
+        self._pending: List[int] = []
+        self._journal_entries = 0
+        os.makedirs(directory, exist_ok=True)
+        self._space_file = os.path.join(directory, 'coverage_space.json')
+        self._snapshot_file = os.path.join(directory, 'coverage.bitmap')
+        self._journal_file = os.path.join(directory, 'coverage.journal')
+
+    def load(self) -> int:
+        """Load snapshot + journal, remapping onto the current space if it changed; returns completed count"""
+        if os.path.exists(self._snapshot_file):
+            with open(self._snapshot_file, 'rb') as f:
+                self.bitmap = CompletionBitmap.from_bytes(f.read())
+        if os.path.exists(self._journal_file):
+            with open(self._journal_file, 'rb') as f:
+                data = f.read()
+            journal = np.frombuffer(data[:len(data) // 8 * 8], dtype='<u8').astype(np.int64)
+            self.bitmap.update(journal)
+            self._journal_entries = len(journal)
+
+        saved = None
+        if os.path.exists(self._space_file):
+            with open(self._space_file, 'r', encoding='utf-8') as f:
+                saved = CombinationSpace.from_signature(json.load(f))
+        if saved is None or saved.signature() != self.space.signature():
+            if saved is not None and len(self.bitmap):
+                logger.info("🔄 Data fields or operator combinations changed, remapping coverage")
+                remapped = CompletionBitmap()
+                remapped.update(saved.translate(self.bitmap.to_array(), self.space))
+                self.bitmap = remapped
+            self.checkpoint()
+        elif self._journal_entries >= self.snapshot_every:
+            self.checkpoint()
+        return len(self.bitmap)
+
+    def clear(self):
+        """Forget all completions"""
+        self.bitmap = CompletionBitmap()
+        self._pending = []
+        self.checkpoint()
+
+    def mark_completed(self, index: int):
+        if self.bitmap.add(index):
+            self._pending.append(index)
+
+    def is_completed(self, index: int) -> bool:
+        return index in self.bitmap
+
+    @property
+    def completed(self) -> int:
+        return len(self.bitmap)
+
+    def import_task_ids(self, task_ids: Iterable[str]) -> int:
+        """Migrate a legacy completed_combinations list; returns how many ids were recognised"""
+        indices = [index for index in (self.space.parse_task_id(task_id) for task_id in task_ids)
+                   if index is not None]
+        self.bitmap.update(indices)
+        self.checkpoint()
+        return len(indices)
+
+    def iter_untested(self, regions: Optional[List[str]] = None) -> Iterator[int]:
+        """Indices not yet completed, in index order, optionally limited to some regions"""
+        for region in (regions if regions is not None else self.space.regions):
+            start, stop = self.space.region_range(region)
+            for block in self.bitmap.missing(start, stop):
+                yield from block.tolist()
+
+    def flush(self):
+        """Append new completions to the journal, snapshotting once the journal grows large"""
+        if self._pending:
+            with open(self._journal_file, 'ab') as f:
+                f.write(np.asarray(self._pending, dtype='<u8').tobytes())
+            self._journal_entries += len(self._pending)
+            self._pending = []
+        if self._journal_entries >= self.snapshot_every:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Write space + bitmap snapshot atomically and truncate the journal"""
+        _write_atomic(self._space_file, json.dumps(self.space.signature()).encode('utf-8'))
+        _write_atomic(self._snapshot_file, self.bitmap.to_bytes())
+        open(self._journal_file, 'wb').close()
+        self._journal_entries = 0
+        self._pending = []
+
+
+class ResultLog:
+    """
+    Append-only columnar log of atom test results
+
+    Each flush writes one .npz segment holding the buffered results column by
+    column: floats (NaN for None), ints, and strings as a UTF-8 buffer plus
+    offsets and a null mask. Nested fields are stored as JSON strings.
+    """
+
+    FLOAT_COLUMNS = ['sharpe_ratio', 'fitness', 'returns', 'max_drawdown', 'turnover', 'hit_ratio',
+                     'prod_correlation', 'execution_time']
+    INT_COLUMNS = ['coverage_index', 'delay']
+    STRING_COLUMNS = ['atom_id', 'expression', 'data_field_id', 'data_field_name', 'dataset_id', 'dataset_name',
+                      'region', 'universe', 'neutralization', 'status', 'color_status', 'error_message',
+                      'test_timestamp']
+    JSON_COLUMNS = ['operator_combination', 'pnl_data', 'submission_checks']
+    # AtomTestResult field order, used when rebuilding records
+    RECORD_ORDER = ['atom_id', 'expression', 'data_field_id', 'data_field_name', 'dataset_id', 'dataset_name',
+                    'region', 'universe', 'delay', 'neutralization', 'operator_combination', 'status',
+                    'sharpe_ratio', 'fitness', 'returns', 'max_drawdown', 'turnover', 'hit_ratio', 'pnl_data',
+                    'submission_checks', 'color_status', 'prod_correlation', 'error_message', 'test_timestamp',
+                    'execution_time']
+
+    def __init__(self, directory: str, max_segments: int = 64):
+        self.directory = directory
+        self.max_segments = max_segments
+        self._buffer: List[Dict] = []
+        os.makedirs(directory, exist_ok=True)
+
+    def _segments(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.directory, 'results-*.npz')))
+
+    def append(self, result: Dict, coverage_index: int = -1):
+        """Buffer one result dict (as produced by dataclasses.asdict)"""
+        self._buffer.append(dict(result, coverage_index=coverage_index))
+
+    def flush(self) -> int:
+        """Write buffered results as a new segment; returns rows written"""
+        if not self._buffer:
+            return 0
+        rows, self._buffer = self._buffer, []
+        self._write_segment(rows)
+        if len(self._segments()) > self.max_segments:
+            self.compact()
+        return len(rows)
+
+    def _write_segment(self, rows: List[Dict]):
+        """Write rows column by column as the next numbered segment"""
+        arrays = {}
+        for name in self.FLOAT_COLUMNS:
+            arrays[name] = np.array([np.nan if r.get(name) is None else float(r[name]) for r in rows])
+        for name in self.INT_COLUMNS:
+            arrays[name] = np.array([int(r.get(name) or 0) for r in rows], dtype=np.int64)
+        for name in self.STRING_COLUMNS + self.JSON_COLUMNS:
+            values = [r.get(name) for r in rows]
+            if name in self.JSON_COLUMNS:
+                values = [None if v is None else json.dumps(v) for v in values]
+            encoded = [b'' if v is None else str(v).encode('utf-8') for v in values]
+            arrays[f'{name}__offsets'] = np.cumsum([0] + [len(v) for v in encoded], dtype=np.int64)
+            arrays[f'{name}__bytes'] = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+            arrays[f'{name}__null'] = np.array([v is None for v in values], dtype=bool)
+
+        segments = self._segments()
+        number = int(os.path.basename(segments[-1])[len('results-'):-len('.npz')]) + 1 if segments else 0
+        path = os.path.join(self.directory, f'results-{number:08d}.npz')
+        tmp_path = path + '.tmp.npz'
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+    def read(self, columns: Optional[List[str]] = None) -> Dict[str, object]:
+        """Columns across all segments: numpy arrays for numbers, lists for strings (None kept)"""
+        names = columns or self.INT_COLUMNS + self.FLOAT_COLUMNS + self.STRING_COLUMNS + self.JSON_COLUMNS
+        result = {name: [] for name in names}
+        for path in self._segments():
+            with np.load(path) as arrays:
+                for name in names:
+                    if name in arrays.files:
+                        result[name].append(arrays[name])
+                        continue
+                    offsets, null = arrays[f'{name}__offsets'].tolist(), arrays[f'{name}__null']
+                    buffer = arrays[f'{name}__bytes'].tobytes()
+                    values = [None if missing else buffer[start:end].decode('utf-8')
+                              for start, end, missing in zip(offsets[:-1], offsets[1:], null.tolist())]
+                    if name in self.JSON_COLUMNS:
+                        values = [None if v is None else json.loads(v) for v in values]
+                    result[name].append(values)
+        for name in names:
+            if name in self.FLOAT_COLUMNS or name in self.INT_COLUMNS:
+                dtype = np.float64 if name in self.FLOAT_COLUMNS else np.int64
+                result[name] = np.concatenate(result[name]) if result[name] else np.empty(0, dtype=dtype)
+            else:
+                result[name] = [v for part in result[name] for v in part]
+        return result
+
+    def records(self, include_index: bool = False) -> List[Dict]:
+        """Every logged result as a dict (None restored for missing numbers)"""
+        columns = self.read()
+        names = self.RECORD_ORDER + (['coverage_index'] if include_index else [])
+        records = []
+        for i in range(len(columns['coverage_index'])):
+            record = {}
+            for name in names:
+                value = columns[name][i]
+                if name in self.FLOAT_COLUMNS:
+                    value = None if np.isnan(value) else float(value)
+                elif name in self.INT_COLUMNS:
+                    value = int(value)
+                record[name] = value
+            records.append(record)
+        return records
+
+    def __len__(self) -> int:
+        total = len(self._buffer)
+        for path in self._segments():
+            with np.load(path) as arrays:
+                total += len(arrays['coverage_index'])
+        return total
+
+    def compact(self):
+        """Merge all segments into one"""
+        segments = self._segments()
+        if len(segments) < 2:
+            return
+        self._write_segment(self.records(include_index=True))
+        for path in segments:
+            os.remove(path)
+
+    def clear(self):
+        for path in self._segments():
+            os.remove(path)
+        self._buffer = []
+
+
+def _write_atomic(path: str, data: bytes):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
@@ -4,7 +4,7 @@ Enhanced Multi-Threaded Atom Tester with Operator Combinations
 - 8-thread management system similar to consultant-templates-ollama
 - Operator stacking combinations (0, 1, 2, 3 operators)
 - Ollama for intelligent operator combination generation
-- Progress saving and resume functionality
+- Progress saving and resume functionality (compressed coverage bitmap + columnar results log)
 - Quality checks and submission validation
 - Region-based testing (ASI, CHN, EUR, GLB, USA)
 """
@@ -16,11 +16,11 @@ import os
 import random
 import time
 import logging
-from typing import List, Dict, Tuple, Optional, Set
+from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass, asdict
 from requests.auth import HTTPBasicAuth
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed, Future
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
 import numpy as np
 from datetime import datetime
 import threading
@@ -31,6 +31,7 @@ from collections import defaultdict, Counter
 import statistics
 import ollama
 from itertools import combinations, product
+from coverage_tracker import CombinationSpace, CoverageTracker, ResultLog
 
 # Configure logging with Unicode handling
 class SafeStreamHandler(logging.StreamHandler):
@@ -125,7 +126,6 @@ class ProgressState:
     """Progress state for resuming operations"""
     current_region: str
     current_data_field_index: int
-    completed_combinations: Set[str]
     completed_tests: int
     total_tests: int
     start_time: float
@@ -406,7 +406,10 @@ class EnhancedMultiThreadedAtomTester:
     def __init__(self, credential_file: str = "credential.txt"):
         """Initialize the enhanced atom tester"""
         self.credential_file = credential_file
-        self.results: List[AtomTestResult] = []
+        # Results go to the ResultLog; only the figures the summary prints are kept in memory
+        self.status_counts: Counter = Counter()
+        self.color_counts: Counter = Counter()
+        self.best_result: Optional[AtomTestResult] = None
         self.operator_combinations: List[OperatorCombination] = []
         self.data_fields = {}
         self.regions = ['ASI', 'CHN', 'EUR', 'GLB', 'USA']  # Start with ASI as requested
@@ -418,6 +421,12 @@ class EnhancedMultiThreadedAtomTester:
         self.results_file = "enhanced_atom_results.json"
         self.progress_state: Optional[ProgressState] = None
         
+        # Completed combinations live in a compressed bitmap, results in an append-only columnar log
+        self.coverage_dir = "atom_coverage"
+        self.coverage: Optional[CoverageTracker] = None
+        self.result_log = ResultLog(os.path.join(self.coverage_dir, "results"))
+        self._legacy_completed: List[str] = []
+        
         # Load credentials and setup session
         self._load_credentials()
         
@@ -906,12 +915,15 @@ class EnhancedMultiThreadedAtomTester:
         return {'success': False, 'error': 'Simulation timeout'}
     
     def _save_progress(self):
-        """Save current progress to file"""
+        """Save current progress to file (new completions are appended to the coverage journal)"""
         try:
+            if self.coverage:
+                self.coverage.flush()
+            
             progress_data = {
                 'current_region': self.progress_state.current_region if self.progress_state else 'ASI',
                 'current_data_field_index': self.progress_state.current_data_field_index if self.progress_state else 0,
-                'completed_combinations': list(self.progress_state.completed_combinations) if self.progress_state else [],
+                'coverage_dir': self.coverage_dir,
                 'completed_tests': self.progress_state.completed_tests if self.progress_state else 0,
                 'total_tests': self.progress_state.total_tests if self.progress_state else 0,
                 'start_time': self.progress_state.start_time if self.progress_state else time.time(),
@@ -938,12 +950,15 @@ class EnhancedMultiThreadedAtomTester:
             self.progress_state = ProgressState(
                 current_region=progress_data.get('current_region', 'ASI'),
                 current_data_field_index=progress_data.get('current_data_field_index', 0),
-                completed_combinations=set(progress_data.get('completed_combinations', [])),
                 completed_tests=progress_data.get('completed_tests', 0),
                 total_tests=progress_data.get('total_tests', 0),
                 start_time=progress_data.get('start_time', time.time()),
                 last_save_time=progress_data.get('last_save_time', time.time())
             )
+            self.coverage_dir = progress_data.get('coverage_dir', self.coverage_dir)
+            self.result_log = ResultLog(os.path.join(self.coverage_dir, "results"))
+            # Progress files from before the coverage bitmap list every completed task id
+            self._legacy_completed = progress_data.get('completed_combinations', [])
             
             logger.info(f"📁 Loaded progress: {self.progress_state.completed_tests}/{self.progress_state.total_tests} tests completed")
             return True
@@ -953,23 +968,46 @@ class EnhancedMultiThreadedAtomTester:
             return False
     
     def _save_results(self):
-        """Save results to JSON file"""
+        """Append buffered results to the columnar results log"""
         try:
-            # Convert results to serializable format
-            serializable_results = []
-            for result in self.results:
-                result_dict = asdict(result)
-                # Convert operator combination to dict
-                result_dict['operator_combination'] = asdict(result.operator_combination)
-                serializable_results.append(result_dict)
+            written = self.result_log.flush()
+            if written:
+                logger.info(f"💾 {written} results appended to {self.result_log.directory}")
             
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to save results: {e}")
+    
+    def _export_results(self):
+        """Write every logged result (all sessions) to the JSON results file"""
+        try:
             with open(self.results_file, 'w', encoding='utf-8') as f:
-                json.dump(serializable_results, f, indent=2)
+                json.dump(self.result_log.records(), f, indent=2)
             
             logger.info(f"💾 Results saved to {self.results_file}")
             
         except Exception as e:
-            logger.warning(f"⚠️ Failed to save results: {e}")
+            logger.warning(f"⚠️ Failed to export results: {e}")
+    
+    def _setup_coverage(self, resume: bool):
+        """Number every (region, field, combination) and load or reset its completion bitmap"""
+        space = CombinationSpace(
+            {region: [field['id'] for field in fields] for region, fields in self.data_fields.items()},
+            [combination.combination_id for combination in self.operator_combinations]
+        )
+        self.coverage = CoverageTracker(self.coverage_dir, space)
+        
+        if not resume:
+            self.coverage.clear()
+            self.result_log.clear()
+            return
+        
+        completed = self.coverage.load()
+        if self._legacy_completed:
+            migrated = self.coverage.import_task_ids(self._legacy_completed)
+            logger.info(f"🔄 Migrated {migrated}/{len(self._legacy_completed)} completed combinations to the coverage bitmap")
+            self._legacy_completed = []
+            completed = self.coverage.completed
+        logger.info(f"📁 Coverage: {completed}/{space.total} combinations completed")
     
     def run_multi_threaded_atom_tests(self, max_workers: int = 8, resume: bool = False):
         """Run multi-threaded atom tests with operator combinations"""
@@ -977,56 +1015,45 @@ class EnhancedMultiThreadedAtomTester:
         logger.info(f"🔧 Using {max_workers} workers for parallel processing")
         
         # Load progress if resuming
-        if resume and self._load_progress():
+        resumed = resume and self._load_progress()
+        if resumed:
             logger.info("📁 Resuming from previous progress")
         else:
             # Initialize progress state
             self.progress_state = ProgressState(
                 current_region='ASI',
                 current_data_field_index=0,
-                completed_combinations=set(),
                 completed_tests=0,
                 total_tests=0,
                 start_time=time.time(),
                 last_save_time=time.time()
             )
         
+        self._setup_coverage(resumed)
+        space = self.coverage.space
+        
         # Calculate total tests
-        total_tests = 0
-        for region in self.regions:
-            if region in self.data_fields:
-                total_tests += len(self.data_fields[region]) * len(self.operator_combinations)
+        regions = [region for region in self.regions if region in self.data_fields]
+        total_tests = sum(len(space.fields[region]) * len(space.combinations) for region in regions)
         
         self.progress_state.total_tests = total_tests
         logger.info(f"🎯 Total tests planned: {total_tests}")
         
-        # Create test tasks
-        test_tasks = []
-        for region in self.regions:
-            if region not in self.data_fields:
-                continue
-                
-            for data_field in self.data_fields[region]:
-                for operator_combination in self.operator_combinations:
-                    # Skip if already completed
-                    task_id = f"{region}_{data_field['id']}_{operator_combination.combination_id}"
-                    if task_id in self.progress_state.completed_combinations:
-                        continue
-                    
-                    test_tasks.append({
-                        'region': region,
-                        'data_field': data_field,
-                        'operator_combination': operator_combination,
-                        'task_id': task_id
-                    })
+        # Untested combinations come straight off the bitmap; only a bounded window is in flight
+        fields_by_id = {region: {field['id']: field for field in self.data_fields[region]} for region in regions}
+        combinations_by_id = {combination.combination_id: combination for combination in self.operator_combinations}
+        untested = self.coverage.iter_untested(regions)
         
-        logger.info(f"📋 Created {len(test_tasks)} test tasks")
-        
-        # Run tests with ThreadPoolExecutor
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            future_to_task = {}
-            for task in test_tasks:
+        def submit_next(executor) -> Optional[Tuple[Future, Dict]]:
+            for index in untested:
+                region, field_id, combination_id = space.key(index)
+                task = {
+                    'region': region,
+                    'data_field': fields_by_id[region][field_id],
+                    'operator_combination': combinations_by_id[combination_id],
+                    'task_id': f"{region}_{field_id}_{combination_id}",
+                    'index': index
+                }
                 future = executor.submit(
                     self._test_single_atom,
                     task['data_field'],
@@ -1035,57 +1062,82 @@ class EnhancedMultiThreadedAtomTester:
                     'TOP3000',  # Default universe
                     'INDUSTRY'  # Default neutralization
                 )
-                future_to_task[future] = task
+                return future, task
+            return None
+        
+        logger.info(f"📋 {total_tests - self.coverage.completed} test tasks remaining")
+        
+        # Run tests with ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_task = {}
+            for _ in range(max_workers * 2):
+                submitted = submit_next(executor)
+                if submitted is None:
+                    break
+                future_to_task[submitted[0]] = submitted[1]
             
-            # Process completed tasks
-            for future in as_completed(future_to_task):
-                task = future_to_task[future]
-                try:
-                    result = future.result()
-                    self.results.append(result)
-                    
-                    # Update progress
-                    self.progress_state.completed_combinations.add(task['task_id'])
-                    self.progress_state.completed_tests += 1
-                    
-                    # Log result
-                    status_emoji = "✅" if result.status == "success" else "❌"
-                    sharpe_str = f"{result.sharpe_ratio:.3f}" if result.sharpe_ratio is not None else "N/A"
-                    color_str = result.color_status if result.color_status is not None else "N/A"
-                    logger.info(f"{status_emoji} {result.region} | {result.data_field_name[:30]}... | {result.operator_combination.combination_id} | Sharpe: {sharpe_str} | Color: {color_str}")
-                    
-                    # Save progress every 10 tests
-                    if self.progress_state.completed_tests % 10 == 0:
-                        self._save_progress()
-                        self._save_results()
-                    
-                except Exception as e:
-                    logger.error(f"❌ Task failed: {e}")
+            # Process completed tasks, topping the window back up as they finish
+            while future_to_task:
+                done, _ = wait(future_to_task, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = future_to_task.pop(future)
+                    submitted = submit_next(executor)
+                    if submitted is not None:
+                        future_to_task[submitted[0]] = submitted[1]
+                    try:
+                        result = future.result()
+                        self._record_summary(result)
+                        self.result_log.append(asdict(result), task['index'])
+                        
+                        # Update progress
+                        self.coverage.mark_completed(task['index'])
+                        self.progress_state.current_region = task['region']
+                        self.progress_state.completed_tests += 1
+                        
+                        # Log result
+                        status_emoji = "✅" if result.status == "success" else "❌"
+                        sharpe_str = f"{result.sharpe_ratio:.3f}" if result.sharpe_ratio is not None else "N/A"
+                        color_str = result.color_status if result.color_status is not None else "N/A"
+                        logger.info(f"{status_emoji} {result.region} | {result.data_field_name[:30]}... | {result.operator_combination.combination_id} | Sharpe: {sharpe_str} | Color: {color_str}")
+                        
+                        # Save progress every 10 tests
+                        if self.progress_state.completed_tests % 10 == 0:
+                            self._save_progress()
+                            self._save_results()
+                        
+                    except Exception as e:
+                        logger.error(f"❌ Task failed: {e}")
         
         # Final save
         self._save_progress()
         self._save_results()
+        self._export_results()
         
         # Print summary
         self._print_summary()
     
+    def _record_summary(self, result: AtomTestResult):
+        """Fold one result into the running summary counts"""
+        self.status_counts[result.status] += 1
+        self.color_counts[result.color_status] += 1
+        if result.status == "success" and result.sharpe_ratio is not None and (
+                self.best_result is None or result.sharpe_ratio > self.best_result.sharpe_ratio):
+            self.best_result = result
+    
     def _print_summary(self):
         """Print testing summary"""
         logger.info("🎉 Multi-threaded atom testing completed!")
-        logger.info(f"📊 Total tests: {len(self.results)}")
+        logger.info(f"📊 Total tests: {sum(self.status_counts.values())}")
         
         # Count by status
-        status_counts = Counter(result.status for result in self.results)
-        logger.info(f"📈 Status breakdown: {dict(status_counts)}")
+        logger.info(f"📈 Status breakdown: {dict(self.status_counts)}")
         
         # Count by color
-        color_counts = Counter(result.color_status for result in self.results)
-        logger.info(f"🎨 Color breakdown: {dict(color_counts)}")
+        logger.info(f"🎨 Color breakdown: {dict(self.color_counts)}")
         
         # Best results
-        successful_results = [r for r in self.results if r.status == "success" and r.sharpe_ratio is not None]
-        if successful_results:
-            best_sharpe = max(successful_results, key=lambda x: x.sharpe_ratio)
+        if self.best_result is not None:
+            best_sharpe = self.best_result
             logger.info(f"🏆 Best Sharpe: {best_sharpe.sharpe_ratio:.3f} ({best_sharpe.data_field_name})")
         
         logger.info(f"💾 Results saved to: {self.results_file}")
@@ -16,6 +16,8 @@ import pickle
 from datetime import datetime, timedelta
 import math
 
+from brain_client.bandit_engine import UCB1Bandit
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -67,65 +69,99 @@ class AlphaResult:
 
 
 class MultiArmBandit:
-    """Multi-arm bandit for optimizing simulation settings."""
+    """Multi-arm bandit for optimizing simulation settings (arrays in bandit_engine)."""
     
     def __init__(self, exploration_rate: float = 0.1, learning_rate: float = 0.01):
         self.exploration_rate = exploration_rate
         self.learning_rate = learning_rate
-        self.arms = {}  # Settings -> (reward_sum, count, avg_reward)
-        self.total_pulls = 0
+        self.engine = UCB1Bandit()  # Only the reward arrays are used; selection is epsilon-greedy
+        self.settings = {}  # Settings key -> SimulationSettings
+    
+    @property
+    def total_pulls(self) -> int:
+        return int(self.engine.total_pulls)
+    
+    @property
+    def arms(self) -> Dict[str, Dict]:
+        """Settings key -> {'reward_sum', 'count', 'avg_reward', 'settings'}"""
+        keys = self.engine.keys
+        idx = self.engine.indices(keys)
+        means = self.engine.means(idx)
+        return {
+            key: {'reward_sum': float(self.engine.reward_sum[i]), 'count': int(self.engine.pulls[i]),
+                  'avg_reward': float(mean), 'settings': self.settings[key]}
+            for key, i, mean in zip(keys, idx, means)
+        }
+    
+    @arms.setter
+    def arms(self, arms: Dict[str, Dict]):
+        """Replace all arms (e.g. `bandit.arms = {}` to reset)"""
+        self.engine = UCB1Bandit()
+        self.settings = {}
+        for key, arm in arms.items():
+            self.settings[key] = arm['settings']
+            idx = self.engine.add_arm(key)
+            self.engine.pulls[idx] = arm.get('count', 0)
+            self.engine.reward_sum[idx] = arm.get('reward_sum', 0)
+            self.engine.total_pulls += arm.get('count', 0)
         
     def add_arm(self, settings: SimulationSettings):
         """Add a new arm (settings configuration)."""
         key = self._settings_to_key(settings)
-        if key not in self.arms:
-            self.arms[key] = {'reward_sum': 0, 'count': 0, 'avg_reward': 0, 'settings': settings}
+        if key not in self.settings:
+            self.settings[key] = settings
+            self.engine.add_arm(key)
     
     def select_arm(self) -> SimulationSettings:
         """Select an arm using epsilon-greedy strategy."""
-        if random.random() < self.exploration_rate:
-            # Exploration: select random arm
-            key = random.choice(list(self.arms.keys()))
-            return self.arms[key]['settings']
-        else:
-            # Exploitation: select best arm
-            best_key = max(self.arms.keys(), 
-                          key=lambda k: self.arms[k]['avg_reward'] if self.arms[k]['count'] > 0 else 0)
-            return self.arms[best_key]['settings']
+        return self.select_arms(1)[0]
+    
+    def select_arms(self, n: int) -> List[SimulationSettings]:
+        """Select arms for n simulations at once (independent epsilon-greedy draws)."""
+        keys = self.engine.keys
+        explore = np.array([random.random() < self.exploration_rate for _ in range(n)], dtype=bool)
+        # Exploitation: best arm (unpulled arms count as 0); exploration: random arm
+        best = int(np.argmax(self.engine.means()))
+        choices = [random.randrange(len(keys)) if e else best for e in explore]
+        return [self.settings[keys[c]] for c in choices]
     
     def update_reward(self, settings: SimulationSettings, reward: float):
         """Update the reward for an arm."""
         key = self._settings_to_key(settings)
-        if key in self.arms:
-            arm = self.arms[key]
-            arm['count'] += 1
-            arm['reward_sum'] += reward
-            arm['avg_reward'] = arm['reward_sum'] / arm['count']
-            self.total_pulls += 1
+        if key in self.settings:
+            self.engine.update(key, reward)
     
     def get_best_arm(self) -> Tuple[SimulationSettings, float]:
         """Get the best performing arm."""
-        if not self.arms:
+        if not self.settings:
             return None, 0
         
-        best_key = max(self.arms.keys(), 
-                      key=lambda k: self.arms[k]['avg_reward'] if self.arms[k]['count'] > 0 else 0)
-        return self.arms[best_key]['settings'], self.arms[best_key]['avg_reward']
+        means = self.engine.means()
+        best = int(np.argmax(means))
+        return self.settings[self.engine.keys[best]], float(means[best])
     
     def _settings_to_key(self, settings: SimulationSettings) -> str:
         """Convert settings to a unique key."""
         return f"{settings.region}_{settings.universe}_{settings.instrumentType}_{settings.neutralization}_{settings.truncation}"
     
     def save_state(self, filename: str):
-        """Save bandit state to file."""
-        with open(filename, 'wb') as f:
-            pickle.dump(self.arms, f)
+        """Save bandit state to a .npz snapshot (settings stored as metadata)."""
+        self.engine.snapshot(filename, metadata={
+            'settings': {key: asdict(settings) for key, settings in self.settings.items()}
+        })
     
     def load_state(self, filename: str):
-        """Load bandit state from file."""
+        """Load bandit state from file (a legacy pickle next to it is migrated)."""
         if os.path.exists(filename):
-            with open(filename, 'rb') as f:
+            metadata = self.engine.restore(filename)
+            self.settings = {key: SimulationSettings(**values)
+                             for key, values in metadata.get('settings', {}).items()}
+            return
+        legacy = os.path.splitext(filename)[0] + '.pkl'
+        if os.path.exists(legacy):
+            with open(legacy, 'rb') as f:
                 self.arms = pickle.load(f)
+            logger.info(f"Migrated legacy bandit state {legacy} ({len(self.settings)} arms)")
 
 class GeneticAlgorithm:
     """Genetic algorithm for evolving alpha expressions."""
@@ -488,19 +524,19 @@ class AdaptiveAlphaMiner:
             max_trade_options = ["ON", "OFF"]  # Enable max trade for ASI and CHN
         
         for delay in delays:
-        for neutralization in neutralizations:
-            for truncation in truncations:
+            for neutralization in neutralizations:
+                for truncation in truncations:
                     for max_trade in max_trade_options:
-                settings = SimulationSettings(
+                        settings = SimulationSettings(
                             region=region,
                             universe=universe,
-                    instrumentType="EQUITY",
+                            instrumentType="EQUITY",
                             delay=delay,
-                    neutralization=neutralization,
-                    truncation=truncation,
-                    maxTrade=max_trade
-                )
-                self.bandit.add_arm(settings)
+                            neutralization=neutralization,
+                            truncation=truncation,
+                            maxTrade=max_trade
+                        )
+                        self.bandit.add_arm(settings)
         
         logger.info(f"Initialized {len(self.bandit.arms)} settings variations for universe {universe} in region {region}")
         
@@ -678,19 +714,19 @@ JSON:"""
                             generated_expressions = []
                         
                         # Validate and add expressions
-                    field_ids = [field_id for field_id, _ in selected_fields]
+                        field_ids = [field_id for field_id, _ in selected_fields]
                         for expr in generated_expressions:
                             if isinstance(expr, str) and expr.strip():
                                 expr = expr.strip()
                                 # Validate that it contains at least one of our selected fields
                                 if any(field_id in expr for field_id in field_ids):
-                        # Additional validation - check for basic syntax
+                                    # Additional validation - check for basic syntax
                                     if '(' in expr and ')' in expr:
                                         expressions.append(expr)
                                         logger.info(f"Generated expression: {expr}")
-                        else:
+                                    else:
                                         logger.warning(f"Generated expression has invalid syntax: {expr}")
-                    else:
+                                else:
                                     logger.warning(f"Generated expression doesn't contain selected fields: {expr}")
                         
                         # If we got valid expressions, continue to next iteration
@@ -741,11 +777,11 @@ JSON:"""
                             logger.warning(f"Failed to fix JSON: {fix_error}")
                     
                     # If JSON parsing failed or no valid expressions, use fallback
-                        field_id, _ = random.choice(selected_fields)
-                        operator_name, _ = random.choice(selected_operators)
-                        fallback_expr = f"{operator_name}({field_id}, {lookback})"
-                        expressions.append(fallback_expr)
-                        logger.info(f"Using fallback expression {i+1}: {fallback_expr}")
+                    field_id, _ = random.choice(selected_fields)
+                    operator_name, _ = random.choice(selected_operators)
+                    fallback_expr = f"{operator_name}({field_id}, {lookback})"
+                    expressions.append(fallback_expr)
+                    logger.info(f"Using fallback expression {i+1}: {fallback_expr}")
                 else:
                     # Fallback if Ollama fails
                     field_id, _ = random.choice(selected_fields)
@@ -1099,9 +1135,8 @@ JSON:"""
         
         # Group expressions by settings for multi-simulate
         settings_groups = {}
-        for expression in expressions:
-            # Select settings using bandit
-            settings = self.bandit.select_arm()
+        # Select settings for the whole batch using bandit
+        for expression, settings in zip(expressions, self.bandit.select_arms(len(expressions))):
             settings_key = self.bandit._settings_to_key(settings)
             
             if settings_key not in settings_groups:
@@ -1291,7 +1326,7 @@ JSON:"""
     
     def save_state(self):
         """Save current state."""
-        self.bandit.save_state('bandit_state.pkl')
+        self.bandit.save_state('bandit_state.npz')
         
         state = {
             'best_alpha': asdict(self.best_alpha) if self.best_alpha else None,
@@ -1311,7 +1346,7 @@ JSON:"""
     def load_state(self):
         """Load saved state."""
         try:
-            self.bandit.load_state('bandit_state.pkl')
+            self.bandit.load_state('bandit_state.npz')
             
             if os.path.exists('adaptive_miner_state.json'):
                 with open('adaptive_miner_state.json', 'r') as f:
@@ -112,7 +112,7 @@ function Build-Images {
     
     # Build main image
     Write-Status "Building main image..."
-    docker build -t "${Username}/${ImageName}:${Version}" .
+    docker build --build-context brain_client=../../brain_client --build-context dashboard_indexer=../../dashboard_indexer -t "${Username}/${ImageName}:${Version}" .
     if ($LASTEXITCODE -ne 0) {
         Write-Error "Failed to build main image"
         exit 1
@@ -9,12 +9,15 @@ import json
 import time
 import argparse
 import logging
+import threading
 from datetime import datetime
-from flask import Flask, render_template_string, jsonify, request
+from flask import Flask, render_template_string, jsonify, request, Response, stream_with_context
 from flask_cors import CORS
 import psutil
 import GPUtil
 
+from dashboard_indexer.log_indexer import DashboardIndexer, in_serving_process
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -22,6 +25,22 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)
 
+LOG_FILES = {
+    'logs/alpha_orchestrator.log': 'logs/alpha_orchestrator.log',
+    'logs/integrated_alpha_miner.log': 'logs/integrated_alpha_miner.log',
+    'logs/adaptive_alpha_miner.log': 'logs/adaptive_alpha_miner.log',
+    'logs/alpha_generator_ollama.log': 'logs/alpha_generator_ollama.log'
+}
+
+# Tails the log files in the background so requests are served from memory;
+# started in main() or by the first request, never at import
+log_indexer = DashboardIndexer(LOG_FILES, max_lines=200)
+
+# Status involves psutil sampling and Ollama calls; share one snapshot between clients
+STATUS_TTL = 10.0
+_status_cache = {'time': 0.0, 'value': None}
+_status_lock = threading.Lock()
+
 # HTML template for the dashboard
 DASHBOARD_TEMPLATE = """
 <!DOCTYPE html>
@@ -231,11 +250,11 @@ DASHBOARD_TEMPLATE = """
                     <h3>Mining Performance</h3>
                     <div class="metric">
                         <span class="metric-label">Total Adaptive Alphas</span>
-                        <span class="metric-value">{{ mining_stats.total_adaptive_alphas }}</span>
+                        <span class="metric-value" id="totalAdaptiveAlphas">{{ mining_stats.total_adaptive_alphas }}</span>
                     </div>
                     <div class="metric">
                         <span class="metric-label">Total Generator Alphas</span>
-                        <span class="metric-value">{{ mining_stats.total_generator_alphas }}</span>
+                        <span class="metric-value" id="totalGeneratorAlphas">{{ mining_stats.total_generator_alphas }}</span>
                     </div>
                     <div class="metric">
                         <span class="metric-label">Best Sharpe Ratio</span>
@@ -247,7 +266,7 @@ DASHBOARD_TEMPLATE = """
                     </div>
                     <div class="metric">
                         <span class="metric-label">Mining Cycle</span>
-                        <span class="metric-value">{{ mining_stats.current_cycle }}/{{ mining_stats.total_cycles }}</span>
+                        <span class="metric-value" id="miningCycle">{{ mining_stats.current_cycle }}/{{ mining_stats.total_cycles }}</span>
                     </div>
                     <div class="progress-bar">
                         <div class="progress-fill" style="width: {{ (mining_stats.current_cycle / mining_stats.total_cycles * 100) if mining_stats.total_cycles > 0 else 0 }}%"></div>
@@ -314,20 +333,47 @@ DASHBOARD_TEMPLATE = """
 
             <div class="logs-section">
                 <h3>📋 Recent Activity Logs</h3>
-                <div class="log-entry">{{ recent_logs }}</div>
+                <div class="log-entry" id="recentLogs">{{ recent_logs }}</div>
             </div>
 
             <div class="refresh-info">
-                Auto-refreshing every 30 seconds | Last updated: {{ system_status.last_update }}
+                Live updates | Last updated: <span id="lastUpdate">{{ system_status.last_update }}</span>
             </div>
         </div>
     </div>
 
     <script>
-        // Auto-refresh the page every 30 seconds
-        setTimeout(function() {
-            location.reload();
-        }, 30000);
+        const MAX_LOG_LINES = 20;
+        const logElement = document.getElementById('recentLogs');
+        let logLines = logElement.textContent.split('\\n').filter(line => line.trim());
+        
+        function markUpdated() {
+            document.getElementById('lastUpdate').textContent = new Date().toLocaleString();
+        }
+        
+        if (window.EventSource) {
+            // Live updates over server-sent events (EventSource reconnects automatically)
+            const source = new EventSource('/api/stream');
+            source.addEventListener('log', event => {
+                const data = JSON.parse(event.data);
+                const lines = data.lines.filter(line => line.trim()).map(line => `[${data.stream}] ${line.trim()}`);
+                logLines = lines.reverse().concat(logLines).slice(0, MAX_LOG_LINES);
+                logElement.textContent = logLines.join('\\n');
+                markUpdated();
+            });
+            source.addEventListener('status', event => {
+                const stats = JSON.parse(event.data).mining_stats;
+                document.getElementById('totalAdaptiveAlphas').textContent = stats.total_adaptive_alphas;
+                document.getElementById('totalGeneratorAlphas').textContent = stats.total_generator_alphas;
+                document.getElementById('miningCycle').textContent = `${stats.current_cycle}/${stats.total_cycles}`;
+                markUpdated();
+            });
+        } else {
+            // Fall back to reloading the page on browsers without server-sent events
+            setTimeout(function() {
+                location.reload();
+            }, 30000);
+        }
     </script>
 </body>
 </html>
@@ -353,7 +399,7 @@ def get_system_metrics():
                     'memory_total': gpu.memoryTotal,
                     'utilization': gpu.load * 100,
                     'temperature': gpu.temperature
-                                    })
+                })
         except Exception as e:
             gpu_count = 0
             gpu_info = []
@@ -380,14 +426,14 @@ def get_ollama_status():
         import requests
         response = requests.get('http://localhost:11434/api/tags', timeout=5)
         return response.status_code == 200
-                    except:
+    except:
         return False
 
 def get_orchestrator_status():
     """Check if alpha orchestrator is running."""
     try:
         return os.path.exists('orchestrator_state.json')
-                        except:
+    except:
         return False
 
 def get_mining_stats():
@@ -404,7 +450,7 @@ def get_mining_stats():
                     'current_cycle': state.get('current_cycle', 0),
                     'total_cycles': state.get('total_cycles', 0)
                 }
-        except Exception as e:
+    except Exception as e:
         pass
     
     return {
@@ -431,10 +477,10 @@ def get_ollama_info():
                 'available_models': models,
                 'last_update': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             }
-        except Exception as e:
+    except Exception as e:
         pass
-            
-            return {
+    
+    return {
         'current_model': 'Unknown',
         'model_loaded': False,
         'available_models': [],
@@ -442,25 +488,15 @@ def get_ollama_info():
     }
 
 def get_recent_logs():
-    """Get recent logs from various log files."""
-    log_files = [
-        'logs/alpha_orchestrator.log',
-        'logs/integrated_alpha_miner.log',
-        'logs/adaptive_alpha_miner.log',
-        'logs/alpha_generator_ollama.log'
-    ]
+    """Get recent logs from the tailed log files."""
+    log_indexer.start()
     
     recent_logs = []
-    for log_file in log_files:
-        if os.path.exists(log_file):
-            try:
-                with open(log_file, 'r') as f:
-                    lines = f.readlines()
-                    # Get last 10 lines
-                    recent_lines = lines[-10:] if len(lines) > 10 else lines
-                    recent_logs.extend([f"[{log_file}] {line.strip()}" for line in recent_lines])
-            except Exception as e:
-                recent_logs.append(f"[{log_file}] Error reading log: {str(e)}")
+    for log_file in LOG_FILES:
+        # Last 10 lines per file, served from the indexer's ring buffer
+        recent_lines = log_indexer.tail(log_file, 10)
+        if recent_lines:
+            recent_logs.extend([f"[{log_file}] {line.strip()}" for line in recent_lines])
     
     # Sort by timestamp if available
     recent_logs.sort(reverse=True)
@@ -468,6 +504,23 @@ def get_recent_logs():
     # Return last 20 log entries
     return '\n'.join(recent_logs[-20:]) if recent_logs else "No recent logs available"
 
+def get_status_snapshot(force: bool = False):
+    """Get the status payload served by /api/status (cached for STATUS_TTL seconds)."""
+    with _status_lock:
+        if force or _status_cache['value'] is None or time.time() - _status_cache['time'] >= STATUS_TTL:
+            _status_cache['value'] = {
+                'timestamp': datetime.now().isoformat(),
+                'system_status': {
+                    'orchestrator_online': get_orchestrator_status(),
+                    'ollama_online': get_ollama_status()
+                },
+                'mining_stats': get_mining_stats(),
+                'system_metrics': get_system_metrics(),
+                'ollama_info': get_ollama_info()
+            }
+            _status_cache['time'] = time.time()
+        return _status_cache['value']
+
 @app.route('/')
 def dashboard():
     """Main dashboard page."""
@@ -491,16 +544,23 @@ def dashboard():
 @app.route('/api/status')
 def api_status():
     """API endpoint for system status."""
-    return jsonify({
-        'timestamp': datetime.now().isoformat(),
-        'system_status': {
-            'orchestrator_online': get_orchestrator_status(),
-            'ollama_online': get_ollama_status()
-        },
-        'mining_stats': get_mining_stats(),
-        'system_metrics': get_system_metrics(),
-        'ollama_info': get_ollama_info()
-    })
+    return jsonify(get_status_snapshot())
+
+@app.route('/api/stream')
+def api_stream():
+    """Server-sent events: a status snapshot, then log lines and periodic status as they arrive."""
+    log_indexer.start()
+    response = Response(
+        stream_with_context(log_indexer.event_stream(
+            get_status_snapshot,
+            status=get_status_snapshot,
+            status_interval=30.0
+        )),
+        mimetype='text/event-stream'
+    )
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 def main():
     """Main function to run the web dashboard."""
@@ -515,7 +575,10 @@ def main():
     print(f"📊 Dashboard will be available at: http://{args.host}:{args.port}")
     print(f"🔧 Debug mode: {'Enabled' if args.debug else 'Disabled'}")
     
-    app.run(host=args.host, port=args.port, debug=args.debug)
+    # The debug reloader's watcher process never serves requests: only the child tails the logs
+    if in_serving_process(args.debug):
+        log_indexer.start()
+    app.run(host=args.host, port=args.port, debug=args.debug, threaded=True)
 
 if __name__ == '__main__':
     main()
@@ -5,11 +5,14 @@ import os
 import re
 from time import sleep
 from requests.auth import HTTPBasicAuth
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 import time
 import logging
 from itertools import product
 from credential_manager import CredentialManager
+from alpha_queue import AlphaWorkQueue, DEFAULT_QUEUE_PATH, MINE_QUEUE
+from parameter_search import AdaptiveParameterSearch, canonicalize_expression
+from brain_client.result_cache import ResultCache
 
 # Configure logging at the top of the file
 logging.basicConfig(
@@ -28,6 +31,8 @@ class AlphaExpressionMiner:
         self.credentials_path = credentials_path  # Store for reauth
         self.credential_manager = CredentialManager()
         self.sess = self.setup_auth(credentials_path)
+        # Results of earlier runs, so equivalent (expression, settings) pairs are not simulated again
+        self.result_cache = ResultCache()
         
         # Define the simulation parameter choices based on the API schema
         self.simulation_choices = {
@@ -88,52 +93,24 @@ class AlphaExpressionMiner:
         else:
             raise Exception("Authentication failed - cannot proceed without valid credentials")
 
-    def remove_alpha_from_hopeful(self, expression: str, hopeful_file: str = "hopeful_alphas.json") -> bool:
-        """Remove a mined alpha from hopeful_alphas.json."""
+    def remove_alpha_from_hopeful(self, expression: str, queue_path: str = DEFAULT_QUEUE_PATH) -> bool:
+        """Ack a mined alpha in the hopeful mine queue."""
         try:
-            if not os.path.exists(hopeful_file):
-                logger.warning(f"Hopeful alphas file {hopeful_file} not found")
-                return False
-            
-            # Create backup before modifying
-            backup_file = f"{hopeful_file}.backup.{int(time.time())}"
-            import shutil
-            shutil.copy2(hopeful_file, backup_file)
-            logger.debug(f"Created backup: {backup_file}")
-            
-            with open(hopeful_file, 'r') as f:
-                hopeful_alphas = json.load(f)
-            
-            # Find and remove the alpha with matching expression
-            original_count = len(hopeful_alphas)
-            removed_alphas = []
-            remaining_alphas = []
-            
-            for alpha in hopeful_alphas:
-                if alpha.get('expression') == expression:
-                    removed_alphas.append(alpha)
-                else:
-                    remaining_alphas.append(alpha)
-            
-            removed_count = len(removed_alphas)
+            work_queue = AlphaWorkQueue(queue_path)
+            try:
+                removed_count = work_queue.ack_key(MINE_QUEUE, expression)
+            finally:
+                work_queue.close()
             
             if removed_count > 0:
-                # Save the updated file
-                with open(hopeful_file, 'w') as f:
-                    json.dump(remaining_alphas, f, indent=2)
-                logger.info(f"Removed {removed_count} alpha(s) with expression '{expression}' from {hopeful_file}")
-                logger.debug(f"Remaining alphas in file: {len(remaining_alphas)}")
+                logger.info(f"Removed {removed_count} alpha(s) with expression '{expression}' from {MINE_QUEUE}")
                 return True
             else:
-                logger.info(f"No matching alpha found in {hopeful_file} for expression: {expression}")
-                logger.debug(f"Available expressions: {[alpha.get('expression', 'N/A') for alpha in hopeful_alphas[:5]]}")
+                logger.info(f"No pending alpha found in {MINE_QUEUE} for expression: {expression}")
                 return False
                 
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON in {hopeful_file}: {e}")
-            return False
         except Exception as e:
-            logger.error(f"Error removing alpha from {hopeful_file}: {e}")
+            logger.error(f"Error removing alpha from {MINE_QUEUE}: {e}")
             return False
 
     def parse_expression(self, expression: str) -> List[Dict]:
@@ -274,11 +251,16 @@ class AlphaExpressionMiner:
             
             param_values.append(values)
         
-        # Generate all combinations
+        # Generate all combinations, skipping ones equivalent to an earlier variation
+        seen = set()
         for value_combination in product(*param_values):
             new_expr = expression
             for param, value in zip(parameters, value_combination):
                 new_expr = new_expr[:param['start']] + value + new_expr[param['end']:]
+            canonical = canonicalize_expression(new_expr)
+            if canonical in seen:
+                continue
+            seen.add(canonical)
             variations.append(new_expr)
             logger.debug(f"Generated variation: {new_expr}")
         
@@ -483,6 +465,7 @@ class AlphaExpressionMiner:
         logger.info(f"Maximum concurrent simulations: {max_concurrent}")
         
         all_results = []
+        cached_results = []  # Answered from the result cache without simulating
         progress_urls = []
         alpha_mapping = {}  # Map progress URLs to alpha expressions and configs
         
@@ -494,6 +477,12 @@ class AlphaExpressionMiner:
             logger.info(f"Submitting alpha {alpha_idx + 1}/{len(alpha_expressions)} with {len(simulation_configs)} configurations")
             
             for config_idx, config in enumerate(simulation_configs):
+                cached = self._cached_result(alpha, config, f"config_{config_idx}")
+                if cached is not None:
+                    if cached['result'] is not None:
+                        cached_results.append(cached)
+                    continue
+                
                 # Check concurrent limit BEFORE submitting
                 if len(progress_urls) >= max_concurrent:
                     logger.info(f"At concurrent limit ({max_concurrent}), waiting for simulations to complete...")
@@ -651,7 +640,8 @@ class AlphaExpressionMiner:
                                             sleep(wait_time)
                                         else:
                                             logger.warning(f"Max retries reached ({max_retries}), giving up on {len(simulation_queue)} remaining simulations")
-                                            logger.warning(f"Failed simulations: {[f'alpha {sim['alpha_idx']+1}, config {sim['config_idx']+1}' for sim in simulation_queue]}")
+                                            failed = [f"alpha {sim['alpha_idx']+1}, config {sim['config_idx']+1}" for sim in simulation_queue]
+                                            logger.warning(f"Failed simulations: {failed}")
                                 
                                 # Clear the queue after processing
                                 simulation_queue.clear()
@@ -697,11 +687,17 @@ class AlphaExpressionMiner:
             all_results = self._monitor_pool_progress(progress_urls, alpha_mapping)
             logger.info(f"All simulations completed with {len(all_results)} successful results")
         
-        logger.info(f"Multi-simulate batch complete: {len(all_results)} successful simulations")
+        all_results = cached_results + all_results
+        logger.info(f"Multi-simulate batch complete: {len(all_results)} successful simulations ({len(cached_results)} from cache)")
+        self.result_cache.log_stats()
         return all_results
 
-    def _monitor_pool_progress(self, progress_urls: List[str], alpha_mapping: Dict[str, Dict]) -> List[Dict]:
-        """Monitor progress for a pool of simulations and return completed ones."""
+    def _monitor_pool_progress(self, progress_urls: List[str], alpha_mapping: Dict[str, Dict],
+                               failed_urls: Optional[List[str]] = None) -> List[Dict]:
+        """Monitor progress for a pool of simulations and return completed ones.
+        
+        URLs that finished without a result (failed, cancelled, errors) are appended to failed_urls if given.
+        """
         results = []
         max_wait_time = 600  # 10 minutes maximum wait time for this batch
         start_time = time.time()
@@ -796,6 +792,9 @@ class AlphaExpressionMiner:
                             "progress_url": progress_url
                         }
                         results.append(result_entry)
+                        if progress_url in alpha_mapping:
+                            self.result_cache.put(alpha_expression, config, {'status': status, 'result': sim_result},
+                                                  status=status)
                         completed_urls.append(progress_url)
                         
                         logger.info(f"Added to results: {len(results)} total completed simulations")
@@ -807,6 +806,10 @@ class AlphaExpressionMiner:
                         logger.error(f"=== FAILURE === Simulation failed for alpha: {alpha_expression} with config {config_id}")
                         logger.error(f"Status: {status}, Progress URL: {progress_url}")
                         logger.error(f"Full error response: {sim_result}")
+                        if progress_url in alpha_mapping:
+                            self.result_cache.put(alpha_expression, alpha_info.get('config', {}),
+                                                  {'status': status, 'result': sim_result},
+                                                  status=status, message=sim_result.get('message', ''))
                         completed_urls.append(progress_url)
                     
                     # Handle simulation limits
@@ -842,6 +845,10 @@ class AlphaExpressionMiner:
                     logger.error(f"Traceback: {traceback.format_exc()}")
                     completed_urls.append(progress_url)
             
+            if failed_urls is not None:
+                result_urls = {result['progress_url'] for result in results}
+                failed_urls.extend(url for url in completed_urls if url not in result_urls)
+            
             # Log completion summary for this cycle
             if completed_urls:
                 logger.info(f"=== CYCLE SUMMARY === Completed {len(completed_urls)} simulations in this cycle")
@@ -877,6 +884,151 @@ class AlphaExpressionMiner:
         logger.info(f"=== FINAL SUMMARY === Returning {len(results)} results")
         return results
 
+    def test_alpha_pairs(self, pairs: List[Tuple[str, Dict]], max_concurrent: int = 10) -> List[Optional[Dict]]:
+        """Simulate specific (expression, configuration) pairs.
+        
+        Unlike test_alpha_batch this does not cross every expression with every
+        configuration. Each completed result carries the alpha's in-sample metrics
+        under 'metrics'. Returns one entry per pair, in order (None if it failed).
+        """
+        entries: List[Optional[Dict]] = [None] * len(pairs)
+        url_to_pair: Dict[str, int] = {}
+        alpha_mapping: Dict[str, Dict] = {}
+        pending: List[str] = []
+        queue = list(range(len(pairs)))
+        idle_cycles = 0
+        limit_waits = 0
+        
+        def collect(results: List[Dict], failed: List[str]):
+            for result in results:
+                url = result['progress_url']
+                if url in url_to_pair:
+                    result['metrics'] = self.fetch_alpha_metrics(result['result'].get('alpha'))
+                    entries[url_to_pair[url]] = result
+            for url in [result['progress_url'] for result in results] + failed:
+                if url in pending:
+                    pending.remove(url)
+        
+        while queue or pending:
+            # Fill free slots
+            while queue and len(pending) < max_concurrent:
+                index = queue[0]
+                expression, config = pairs[index]
+                cached = self._cached_result(expression, config, f"pair_{index}")
+                if cached is not None:
+                    queue.pop(0)
+                    if cached['result'] is not None:
+                        cached['metrics'] = self.fetch_alpha_metrics(cached['result'].get('alpha'))
+                        entries[index] = cached
+                    continue
+                simulation_data = config.copy()
+                simulation_data['regular'] = expression
+                try:
+                    response = self.sess.post('https://api.worldquantbrain.com/simulations', json=simulation_data)
+                    if response.status_code == 401:
+                        logger.info("Session expired, re-authenticating...")
+                        self.sess = self.setup_auth(self.credentials_path)
+                        response = self.sess.post('https://api.worldquantbrain.com/simulations', json=simulation_data)
+                except Exception as e:
+                    logger.error(f"Error submitting {expression}: {e}")
+                    queue.pop(0)
+                    continue
+                
+                if response.status_code != 201:
+                    if "CONCURRENT_SIMULATION_LIMIT_EXCEEDED" in response.text and limit_waits < 5:
+                        if pending:
+                            break  # Retry once one of ours finishes
+                        limit_waits += 1  # Slots are taken by other processes
+                        logger.info("Concurrent simulation limit reached, waiting 30 seconds...")
+                        sleep(30)
+                        continue
+                    logger.error(f"Simulation API error for {expression}: {response.text}")
+                    queue.pop(0)
+                    continue
+                
+                queue.pop(0)
+                limit_waits = 0
+                progress_url = response.headers.get('Location')
+                if not progress_url:
+                    logger.error(f"No Location header in response for {expression}")
+                    continue
+                url_to_pair[progress_url] = index
+                alpha_mapping[progress_url] = {'alpha': expression, 'config': config, 'config_id': f"pair_{index}"}
+                pending.append(progress_url)
+                sleep(0.5)
+            
+            if not pending:
+                continue
+            failed: List[str] = []
+            results = self._monitor_pool_progress(pending, {url: alpha_mapping[url] for url in pending}, failed)
+            collect(results, failed)
+            idle_cycles = 0 if results or failed else idle_cycles + 1
+            if idle_cycles >= 3:
+                logger.warning(f"Giving up on {len(pending)} simulations that did not finish")
+                pending.clear()
+        
+        self.result_cache.log_stats()
+        return entries
+
+    def _cached_result(self, expression: str, config: Dict, config_id: str) -> Optional[Dict]:
+        """Result entry for an equivalent expression already simulated under config, or None.
+        
+        A cached failure comes back with result None so callers skip it without resubmitting.
+        """
+        stored = self.result_cache.get(expression, config)
+        if stored is None:
+            return None
+        logger.info(f"=== CACHED === {stored['status']} result reused for '{expression}' with {config_id}")
+        return {
+            "expression": expression,
+            "config": config,
+            "config_id": config_id,
+            "result": stored['result'] if stored['status'] in ("COMPLETE", "WARNING") else None,
+            "progress_url": None
+        }
+
+    def fetch_alpha_metrics(self, alpha_id: Optional[str]) -> Dict:
+        """In-sample metrics ('is' block) of a simulated alpha, or {} if unavailable."""
+        if not alpha_id:
+            return {}
+        try:
+            response = self.sess.get(f'https://api.worldquantbrain.com/alphas/{alpha_id}')
+            if response.status_code == 200:
+                return response.json().get('is', {}) or {}
+            logger.warning(f"Failed to fetch alpha {alpha_id}: HTTP {response.status_code}")
+        except Exception as e:
+            logger.warning(f"Failed to fetch alpha {alpha_id}: {e}")
+        return {}
+
+    def search_variations(self, expression: str, parameters: List[Dict], config_filename: str = "simulation_configs.json",
+                          target_region: str = None, max_concurrent: int = 10, budget: Optional[int] = None) -> List[Dict]:
+        """Budget-aware search over parameter values x simulation configurations.
+        
+        Replaces the full grid (every variation with every configuration) with
+        AdaptiveParameterSearch; see parameter_search.py. Returns the completed
+        simulation results, like test_alpha_batch.
+        """
+        simulation_configs = self.generate_simulation_configurations(target_region=target_region)
+        self.save_configurations_to_file(simulation_configs, config_filename)
+        search = AdaptiveParameterSearch(expression, parameters, simulation_configs,
+                                         budget=budget, batch_size=max_concurrent)
+        
+        results = []
+        
+        def evaluate(pairs: List[Tuple[str, Dict]]) -> List[Optional[float]]:
+            entries = self.test_alpha_pairs(pairs, max_concurrent=max_concurrent)
+            results.extend(entry for entry in entries if entry is not None)
+            return [entry['metrics'].get('sharpe') if entry else None for entry in entries]
+        
+        outcome = search.run(evaluate)
+        logger.info(f"Search finished: {outcome.simulations} simulations instead of {outcome.grid_size} "
+                    f"({outcome.duplicates_skipped} duplicates skipped, {len(outcome.pruned_levels)} values pruned, "
+                    f"{outcome.failed} failed)")
+        if outcome.best_expression:
+            logger.info(f"Best Sharpe {outcome.best_sharpe}: {outcome.best_expression} "
+                        f"with {outcome.best_config['settings']}")
+        return results
+
     def test_alpha(self, alpha_expression: str) -> Dict:
         """Test a single alpha expression (legacy method for backward compatibility)."""
         logger.info(f"Testing single alpha: {alpha_expression}")
@@ -908,6 +1060,104 @@ class AlphaExpressionMiner:
         logger.info(f"Successfully tested original expression with {len(results)} configurations")
         return results
 
+def dequeue_mined_alpha(miner: AlphaExpressionMiner, expression: str):
+    """Remove a mined alpha from the mine queue (standalone runs only)"""
+    logger.info("Mining completed, removing alpha from the mine queue")
+    if miner.remove_alpha_from_hopeful(expression):
+        logger.info(f"Successfully removed alpha '{expression}' from the mine queue")
+    else:
+        logger.warning(f"Could not remove alpha '{expression}' from the mine queue (may not exist or is leased)")
+
+def mine_expression(miner: AlphaExpressionMiner, expression: str, output_file: str = 'mined_expressions.json',
+                    config_filename: str = 'simulation_configs.json', target_region: str = None,
+                    max_concurrent: int = 10, skip_parameter_traverse: bool = False,
+                    auto_mode: bool = True, full_grid: bool = False,
+                    budget: Optional[int] = None, dequeue: bool = True) -> List[Dict]:
+    """
+    Mine one expression with an already-authenticated miner.
+
+    Used by the CLI and by long-lived orchestrator workers, which keep the
+    miner (session and caches) warm between expressions. By default the
+    parameter x configuration space is searched adaptively within a
+    simulation budget; full_grid simulates every combination as before.
+    With dequeue=False the expression is left in the mine queue: the
+    orchestrator holds a lease on it and acks or nacks the job itself.
+
+    Returns:
+        Simulation results that were written to output_file
+    """
+    # Parse expression and get parameters
+    parameters = miner.parse_expression(expression)
+    
+    # Check if we should skip parameter traversal
+    if skip_parameter_traverse or not parameters:
+        if not parameters:
+            logger.info("No parameters found in expression - skipping parameter traversal")
+        else:
+            logger.info("User chose to skip parameter traversal")
+        
+        # Test only the original expression with different configurations
+        logger.info(f"Testing original expression with different simulation configurations")
+        if full_grid:
+            results = miner.test_original_expression_with_configs(expression, config_filename=config_filename, target_region=target_region, max_concurrent=max_concurrent)
+        else:
+            results = miner.search_variations(expression, [], config_filename=config_filename, target_region=target_region,
+                                              max_concurrent=max_concurrent, budget=budget)
+        logger.info(f"Successfully tested original expression with {len(results)} configurations")
+        
+        # Save results
+        logger.info(f"Saving {len(results)} results to {output_file}")
+        with open(output_file, 'w') as f:
+            json.dump(results, f, indent=2)
+        
+        if dequeue:
+            dequeue_mined_alpha(miner, expression)
+        
+        logger.info("Mining complete")
+        return results
+    
+    # Get parameter selection (automated or interactive)
+    if auto_mode:
+        # In auto mode, select all parameters
+        selected_params = parameters
+        logger.info(f"Auto mode: selected all {len(selected_params)} parameters")
+    else:
+        # Get user selection for parameters to vary
+        selected_params = miner.get_user_parameter_selection(parameters)
+    
+    if not selected_params:
+        logger.info("No parameters selected for variation")
+        if dequeue:
+            dequeue_mined_alpha(miner, expression)
+        return []
+    
+    # Get ranges and steps for selected parameters
+    selected_params = miner.get_parameter_ranges(selected_params, auto_mode=auto_mode)
+    
+    if full_grid:
+        # Generate variations
+        variations = miner.generate_variations(expression, selected_params)
+        
+        # Test variations using multi_simulate with different configurations
+        logger.info(f"Testing {len(variations)} variations using multi_simulate with different configs")
+        results = miner.test_alpha_batch(variations, config_filename=config_filename, target_region=target_region, max_concurrent=max_concurrent)
+    else:
+        logger.info("Searching parameter values x simulation configurations within the simulation budget")
+        results = miner.search_variations(expression, selected_params, config_filename=config_filename,
+                                          target_region=target_region, max_concurrent=max_concurrent, budget=budget)
+    logger.info(f"Successfully tested {len(results)} variations")
+    
+    # Save results
+    logger.info(f"Saving {len(results)} results to {output_file}")
+    with open(output_file, 'w') as f:
+        json.dump(results, f, indent=2)
+    
+    if dequeue:
+        dequeue_mined_alpha(miner, expression)
+    
+    logger.info("Mining complete")
+    return results
+
 def main():
     parser = argparse.ArgumentParser(description='Mine alpha expression variations')
     parser.add_argument('--credentials', type=str, default='./cookie.txt',
@@ -935,6 +1185,12 @@ def main():
                       help='Skip parameter traversal and only test the original expression with different configs')
     parser.add_argument('--change-configs-only', action='store_true',
                       help='Only change simulation configurations without varying parameters (implies --skip-parameter-traverse)')
+    parser.add_argument('--full-grid', action='store_true',
+                      help='Simulate every variation with every configuration instead of the adaptive search')
+    parser.add_argument('--budget', type=int, default=None,
+                      help='Maximum simulations for the adaptive search (default: 300)')
+    parser.add_argument('--no-dequeue', action='store_true',
+                      help='Leave the expression in the mine queue (the orchestrator holds its lease)')
     
     args = parser.parse_args()
     
@@ -957,88 +1213,15 @@ def main():
         logger.info("Parameter traversal: SKIPPED")
     if args.change_configs_only:
         logger.info("Mode: CHANGE CONFIGS ONLY")
+    logger.info("Search: FULL GRID" if args.full_grid else f"Search: ADAPTIVE (budget: {args.budget or 'auto'})")
     
     miner = AlphaExpressionMiner(args.credentials)
     
-    # Parse expression and get parameters
-    parameters = miner.parse_expression(args.expression)
-    
-    # Check if we should skip parameter traversal
-    if args.skip_parameter_traverse or not parameters:
-        if not parameters:
-            logger.info("No parameters found in expression - skipping parameter traversal")
-        else:
-            logger.info("User chose to skip parameter traversal")
-        
-        # Test only the original expression with different configurations
-        logger.info(f"Testing original expression with different simulation configurations")
-        results = miner.test_original_expression_with_configs(args.expression, config_filename=args.save_configs, target_region=args.region, max_concurrent=args.max_concurrent)
-        logger.info(f"Successfully tested original expression with {len(results)} configurations")
-        
-        # Save results
-        output_file = args.output_file if hasattr(args, 'output_file') else args.output
-        logger.info(f"Saving {len(results)} results to {output_file}")
-        with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2)
-        
-        # Remove the mined alpha from hopeful_alphas.json after completion
-        logger.info("Mining completed, removing alpha from hopeful_alphas.json")
-        removed = miner.remove_alpha_from_hopeful(args.expression)
-        if removed:
-            logger.info(f"Successfully removed alpha '{args.expression}' from hopeful_alphas.json")
-        else:
-            logger.warning(f"Could not remove alpha '{args.expression}' from hopeful_alphas.json (may not exist)")
-        
-        logger.info("Mining complete")
-        return
-    
-    # Get parameter selection (automated or interactive)
-    if args.auto_mode:
-        # In auto mode, select all parameters
-        selected_params = parameters
-        logger.info(f"Auto mode: selected all {len(selected_params)} parameters")
-    else:
-        # Get user selection for parameters to vary
-        selected_params = miner.get_user_parameter_selection(parameters)
-    
-    if not selected_params:
-        logger.info("No parameters selected for variation")
-        # Still remove the alpha from hopeful_alphas.json even if no parameters found
-        logger.info("Mining completed (no parameters to vary), removing alpha from hopeful_alphas.json")
-        removed = miner.remove_alpha_from_hopeful(args.expression)
-        if removed:
-            logger.info(f"Successfully removed alpha '{args.expression}' from hopeful_alphas.json")
-        else:
-            logger.warning(f"Could not remove alpha '{args.expression}' from hopeful_alphas.json (may not exist)")
-        return
-    
-    # Get ranges and steps for selected parameters
-    selected_params = miner.get_parameter_ranges(selected_params, auto_mode=args.auto_mode)
-    
-    # Generate variations
-    variations = miner.generate_variations(args.expression, selected_params)
-    
-    # Test variations using multi_simulate with different configurations
-    logger.info(f"Testing {len(variations)} variations using multi_simulate with different configs")
-    results = miner.test_alpha_batch(variations, config_filename=args.save_configs, target_region=args.region, max_concurrent=args.max_concurrent)
-    logger.info(f"Successfully tested {len(results)} variations")
-    
-    # Save results
     output_file = args.output_file if hasattr(args, 'output_file') else args.output
-    logger.info(f"Saving {len(results)} results to {output_file}")
-    with open(output_file, 'w') as f:
-        json.dump(results, f, indent=2)
-    
-    # Always remove the mined alpha from hopeful_alphas.json after completion
-    # This prevents the same alpha from being processed again
-    logger.info("Mining completed, removing alpha from hopeful_alphas.json")
-    removed = miner.remove_alpha_from_hopeful(args.expression)
-    if removed:
-        logger.info(f"Successfully removed alpha '{args.expression}' from hopeful_alphas.json")
-    else:
-        logger.warning(f"Could not remove alpha '{args.expression}' from hopeful_alphas.json (may not exist)")
-    
-    logger.info("Mining complete")
+    mine_expression(miner, args.expression, output_file=output_file, config_filename=args.save_configs,
+                    target_region=args.region, max_concurrent=args.max_concurrent,
+                    skip_parameter_traverse=args.skip_parameter_traverse, auto_mode=args.auto_mode,
+                    full_grid=args.full_grid, budget=args.budget, dequeue=not args.no_dequeue)
 
 if __name__ == "__main__":
     main()
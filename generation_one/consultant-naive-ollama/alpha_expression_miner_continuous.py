@@ -6,6 +6,7 @@ import logging
 import argparse
 import os
 from alpha_expression_miner import AlphaExpressionMiner
+from alpha_queue import AlphaWorkQueue, MINE_QUEUE, import_hopeful_json
 
 logging.basicConfig(
     level=logging.INFO,
@@ -24,19 +25,16 @@ class ContinuousAlphaExpressionMiner:
         self.ollama_url = ollama_url
         self.mining_interval = mining_interval * 3600  # Convert hours to seconds
         self.hopeful_alphas_file = 'hopeful_alphas.json'
+        self.work_queue = AlphaWorkQueue()
+        # Mining a single expression can run for a long time
+        self.lease_seconds = 6 * 3600
         
     def get_hopeful_alphas(self):
-        """Read alphas from hopeful_alphas.json"""
+        """Lease the next pending alpha from the mine queue (one at a time, so no lease outlives its job)"""
         try:
-            if os.path.exists(self.hopeful_alphas_file):
-                with open(self.hopeful_alphas_file, 'r') as f:
-                    data = json.load(f)
-                    return data.get('alphas', [])
-            else:
-                logger.warning(f"File {self.hopeful_alphas_file} not found")
-                return []
+            return self.work_queue.dequeue(MINE_QUEUE, visibility_timeout=self.lease_seconds, max_jobs=1)
         except Exception as e:
-            logger.error(f"Error reading {self.hopeful_alphas_file}: {e}")
+            logger.error(f"Error reading {MINE_QUEUE}: {e}")
             return []
     
     def mine_alpha_expression(self, expression):
@@ -58,25 +56,8 @@ class ContinuousAlphaExpressionMiner:
             # Get ranges and steps for selected parameters
             selected_params = self.miner.get_parameter_ranges(selected_params, auto_mode=True)
             
-            # Generate variations
-            variations = self.miner.generate_variations(expression, selected_params)
-            logger.info(f"Generated {len(variations)} variations")
-            
-            # Test variations
-            results = []
-            total = len(variations)
-            for i, var in enumerate(variations, 1):
-                logger.info(f"Testing variation {i}/{total}: {var}")
-                result = self.miner.test_alpha(var)
-                if result["status"] == "success":
-                    logger.info(f"Successful test for: {var}")
-                    results.append({
-                        "expression": var,
-                        "result": result["result"]
-                    })
-                else:
-                    logger.error(f"Failed to test variation: {var}")
-                    logger.error(f"Error: {result['message']}")
+            # Search variations x configurations within the simulation budget
+            results = self.miner.search_variations(expression, selected_params)
             
             # Save results
             if results:
@@ -86,14 +67,6 @@ class ContinuousAlphaExpressionMiner:
                 with open(output_file, 'w') as f:
                     json.dump(results, f, indent=2)
             
-            # Remove the mined alpha from hopeful_alphas.json
-            logger.info("Mining completed, removing alpha from hopeful_alphas.json")
-            removed = self.miner.remove_alpha_from_hopeful(expression)
-            if removed:
-                logger.info(f"Successfully removed alpha '{expression}' from hopeful_alphas.json")
-            else:
-                logger.warning(f"Could not remove alpha '{expression}' from hopeful_alphas.json")
-            
             return True
             
         except Exception as e:
@@ -106,30 +79,38 @@ class ContinuousAlphaExpressionMiner:
         
         while True:
             try:
-                # Get hopeful alphas
-                hopeful_alphas = self.get_hopeful_alphas()
+                import_hopeful_json(self.work_queue, self.hopeful_alphas_file)
+                pending = self.work_queue.size(MINE_QUEUE, ready_only=True)
                 
-                if not hopeful_alphas:
+                if not pending:
                     logger.info("No hopeful alphas found, waiting for next cycle...")
                     time.sleep(self.mining_interval)
                     continue
                 
-                logger.info(f"Found {len(hopeful_alphas)} hopeful alphas to mine")
+                logger.info(f"Found {pending} hopeful alphas to mine")
                 
-                # Process each alpha
-                for alpha in hopeful_alphas:
+                # Lease and process one alpha at a time; mined alphas are acked, failures are retried later
+                while True:
+                    hopeful_alphas = self.get_hopeful_alphas()
+                    if not hopeful_alphas:
+                        break
+                    job = hopeful_alphas[0]
+                    expression = job.payload.get('expression', '')
                     try:
-                        success = self.mine_alpha_expression(alpha)
-                        if success:
-                            logger.info(f"Successfully mined alpha: {alpha}")
+                        success = self.mine_alpha_expression(expression) if expression else False
+                        if success or not expression:
+                            logger.info(f"Successfully mined alpha: {expression}")
+                            self.work_queue.ack(job)
                         else:
-                            logger.warning(f"Failed to mine alpha: {alpha}")
+                            logger.warning(f"Failed to mine alpha: {expression}")
+                            self.work_queue.nack(job, delay=self.mining_interval)
                         
                         # Small delay between alphas
                         time.sleep(10)
                         
                     except Exception as e:
-                        logger.error(f"Error processing alpha {alpha}: {e}")
+                        logger.error(f"Error processing alpha {expression}: {e}")
+                        self.work_queue.nack(job, delay=self.mining_interval, error=str(e))
                         continue
                 
                 logger.info(f"Mining cycle completed, waiting {self.mining_interval/3600} hours before next cycle...")
@@ -14,6 +14,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import random
 from pydantic import BaseModel
 from credential_manager import CredentialManager
+from alpha_queue import AlphaWorkQueue, enqueue_hopeful_alpha
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -75,6 +76,8 @@ class AlphaGenerator:
         self.results = []
         self.pending_results = {}
         self.retry_queue = RetryQueue(self)
+        # Durable hand-off of promising alphas to the miner and submitter
+        self.work_queue = AlphaWorkQueue()
         # Reduce concurrent workers to prevent VRAM issues
         self.executor = ThreadPoolExecutor(max_workers=max_concurrent)  # For concurrent simulations
         self.vram_cleanup_interval = 5  # Cleanup every 5 operations for larger batches
@@ -962,19 +965,7 @@ Return as JSON with expressions array.
             return {"status": "error", "message": str(e)}
 
     def log_hopeful_alpha(self, expression: str, alpha_data: Dict) -> None:
-        """Log promising alphas to a JSON file."""
-        log_file = 'hopeful_alphas.json'
-        
-        # Load existing data
-        existing_data = []
-        if os.path.exists(log_file):
-            try:
-                with open(log_file, 'r') as f:
-                    existing_data = json.load(f)
-            except json.JSONDecodeError:
-                print(f"Warning: Could not parse {log_file}, starting fresh")
-        
-        # Add new alpha with timestamp
+        """Hand a promising alpha to the miner and submitter through the work queue."""
         entry = {
             "expression": expression,  # Store just the expression string
             "timestamp": int(time.time()),
@@ -987,13 +978,16 @@ Return as JSON with expressions array.
             "checks": alpha_data.get("is", {}).get("checks", [])
         }
         
-        existing_data.append(entry)
-        
-        # Save updated data
-        with open(log_file, 'w') as f:
-            json.dump(existing_data, f, indent=2)
+        try:
+            job_ids = enqueue_hopeful_alpha(self.work_queue, entry)
+        except Exception as e:
+            logger.error(f"Failed to enqueue promising alpha {expression}: {e}")
+            return
         
-        print(f"Logged promising alpha to {log_file}")
+        if any(job_ids.values()):
+            print(f"Queued promising alpha in {self.work_queue.db_path}")
+        else:
+            print(f"Promising alpha already queued: {expression}")
 
     def get_results(self) -> List[Dict]:
         """Get all processed results including retried alphas."""
@@ -15,6 +15,8 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import queue
 from dataclasses import dataclass
 from credential_manager import CredentialManager
+from alpha_queue import AlphaWorkQueue, MINE_QUEUE, import_hopeful_json
+from worker_pool import WorkerPool, WorkerResult, init_miner, run_mine_job, init_submitter, run_submit_job
 
 # Configure logging
 logging.basicConfig(
@@ -272,6 +274,22 @@ class AlphaOrchestrator:
         self.generator_process = None
         self.miner_process = None
         
+        # Durable hand-off queue shared with the generator, miner and submitter
+        self.work_queue = AlphaWorkQueue()
+        # An adaptive parameter search runs many rounds of simulations, so a mine job
+        # gets hours; its queue lease stays short and is renewed while the job runs
+        self.mining_timeout = 4 * 3600
+        self.mine_lease_seconds = 600
+        self.submission_timeout = 600
+        
+        # Miner and submitter run in long-lived worker processes that keep their
+        # session and caches warm; set to False to launch a subprocess per cycle
+        self.use_persistent_workers = True
+        self.workers = WorkerPool()
+        self.workers.register('miner', init_miner, run_mine_job, (credentials_path,), max_jobs=500)
+        self.workers.register('submitter', init_submitter, run_submit_job, (credentials_path,))
+        self.cycle_latencies = {'miner': [], 'submitter': []}
+        
         # Model fleet management
         self.model_fleet_manager = ModelFleetManager(ollama_url)
         self.vram_monitoring_active = False
@@ -599,58 +617,59 @@ class AlphaOrchestrator:
         return True
 
     def run_alpha_expression_miner(self, promising_alpha_file: str = "hopeful_alphas.json"):
-        """Run alpha expression miner on promising alphas."""
+        """Run alpha expression miner on promising alphas leased from the mine queue."""
         logger.info("Starting alpha expression miner on promising alphas...")
         
-        if not os.path.exists(promising_alpha_file):
-            logger.warning(f"Promising alphas file {promising_alpha_file} not found. Skipping mining.")
+        # Migrate anything still written to the legacy JSON file
+        import_hopeful_json(self.work_queue, promising_alpha_file)
+        
+        pending = self.work_queue.size(MINE_QUEUE, ready_only=True)
+        if not pending:
+            logger.info("No promising alphas found. Skipping mining.")
             return
         
-        try:
-            with open(promising_alpha_file, 'r') as f:
-                promising_alphas = json.load(f)
+        logger.info(f"Found {pending} promising alphas to mine")
+        
+        # Lease one alpha at a time; a crash mid-run leaves the lease to expire and the alpha is retried
+        i = 0
+        while self.running:
+            jobs = self.work_queue.dequeue(MINE_QUEUE, visibility_timeout=self.mine_lease_seconds)
+            if not jobs:
+                break
+            job = jobs[0]
+            i += 1
+            expression = job.payload.get('expression', '')
+            if not expression:
+                self.work_queue.ack(job)
+                continue
             
-            if not promising_alphas:
-                logger.info("No promising alphas found. Skipping mining.")
-                return
+            logger.info(f"Mining alpha {i} (attempt {job.attempts}): {expression[:100]}...")
             
-            logger.info(f"Found {len(promising_alphas)} promising alphas to mine")
+            with self.work_queue.keep_leased(job, self.mine_lease_seconds):
+                result = self._run_cycle(
+                    'miner',
+                    [sys.executable, 'alpha_expression_miner.py',
+                     '--expression', expression,
+                     '--auto-mode',  # Run in automated mode
+                     '--no-dequeue',  # The job is acked/nacked here, under our lease
+                     '--output-file', f'mining_results_{i}.json'],
+                    timeout=self.mining_timeout,
+                    expression=expression,
+                    output_file=f'mining_results_{i}.json'
+                )
             
-            # Run alpha expression miner for each promising alpha
-            # Note: The miner will automatically remove successfully mined alphas from hopeful_alphas.json
-            for i, alpha_data in enumerate(promising_alphas, 1):
-                expression = alpha_data.get('expression', '')
-                if not expression:
-                    continue
-                
-                logger.info(f"Mining alpha {i}/{len(promising_alphas)}: {expression[:100]}...")
-                
-                # Run the alpha expression miner as a subprocess
-                try:
-                    result = subprocess.run([
-                        sys.executable, 'alpha_expression_miner.py',
-                        '--expression', expression,
-                        '--auto-mode',  # Run in automated mode
-                        '--output-file', f'mining_results_{i}.json'
-                    ], capture_output=True, text=True, timeout=40)
-                    
-                    if result.returncode == 0:
-                        logger.info(f"Successfully mined alpha {i}")
-                        # The alpha will be automatically removed from hopeful_alphas.json by the miner
-                    else:
-                        logger.error(f"Failed to mine alpha {i}: {result.stderr}")
-                        # Failed alphas remain in hopeful_alphas.json for retry
-                        
-                except subprocess.TimeoutExpired:
-                    logger.error(f"Mining alpha {i} timed out")
-                except Exception as e:
-                    logger.error(f"Error mining alpha {i}: {e}")
-                
-                # Small delay between mining operations
-                time.sleep(5)
-                
-        except Exception as e:
-            logger.error(f"Error running alpha expression miner: {e}")
+            if result.ok:
+                logger.info(f"Successfully mined alpha {i}")
+                self.work_queue.ack(job)
+            else:
+                logger.error(f"Failed to mine alpha {i}: {result.error}")
+                # Failed alphas go back to the queue for retry
+                self.work_queue.nack(job, delay=300, error=(result.error or '')[-500:])
+            
+            # Small delay between mining operations
+            time.sleep(5)
+        
+        logger.info(f"Mine queue stats: {self.work_queue.stats(MINE_QUEUE).get(MINE_QUEUE, {})}")
 
     def run_alpha_submitter(self, batch_size: int = 10):
         """Run alpha submitter with daily rate limiting."""
@@ -659,26 +678,57 @@ class AlphaOrchestrator:
         if not self.can_submit_today():
             return
         
-        try:
-            # Run the alpha submitter as a subprocess
-            result = subprocess.run([
-                sys.executable, 'improved_alpha_submitter.py',
-                '--batch-size', str(batch_size),
-                '--auto-mode'  # Run in automated mode
-            ], capture_output=True, text=True, timeout=600)
-            
-            if result.returncode == 0:
-                logger.info("Successfully completed alpha submission")
-                # Update submission date
-                self.last_submission_date = datetime.now().date().isoformat()
-                self.save_submission_history()
-            else:
-                logger.error(f"Alpha submission failed: {result.stderr}")
-                
-        except subprocess.TimeoutExpired:
-            logger.error("Alpha submission timed out")
-        except Exception as e:
-            logger.error(f"Error running alpha submitter: {e}")
+        result = self._run_cycle(
+            'submitter',
+            [sys.executable, 'improved_alpha_submitter.py',
+             '--batch-size', str(batch_size),
+             '--auto-mode'],  # Run in automated mode
+            timeout=self.submission_timeout,
+            batch_size=batch_size
+        )
+        
+        if result.ok:
+            logger.info("Successfully completed alpha submission")
+            # Update submission date
+            self.last_submission_date = datetime.now().date().isoformat()
+            self.save_submission_history()
+        else:
+            logger.error(f"Alpha submission failed: {result.error}")
+
+    def _run_cycle(self, role: str, command: List[str], timeout: float, **job_kwargs) -> WorkerResult:
+        """
+        Run one miner/submitter cycle on the persistent worker, or as a fresh
+        subprocess when persistent workers are disabled, and record its latency.
+        """
+        if self.use_persistent_workers:
+            result = self.workers.run(role, timeout=timeout, **job_kwargs)
+        else:
+            start = time.perf_counter()
+            try:
+                completed = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+                result = WorkerResult(completed.returncode == 0,
+                                      error=None if completed.returncode == 0 else completed.stderr)
+            except subprocess.TimeoutExpired:
+                result = WorkerResult(False, error=f"{role} timed out after {timeout}s")
+            except Exception as e:
+                result = WorkerResult(False, error=str(e))
+            result.latency = time.perf_counter() - start
+        
+        latencies = self.cycle_latencies[role]
+        latencies.append(result.latency)
+        del latencies[:-200]
+        mode = "worker" if self.use_persistent_workers else "subprocess"
+        logger.info(f"{role} cycle latency: {result.latency:.2f}s ({mode}, job {result.seconds:.2f}s)")
+        return result
+
+    def get_worker_stats(self) -> Dict:
+        """Per-role worker health and cycle latency."""
+        stats = self.workers.stats() if self.use_persistent_workers else {}
+        for role, latencies in self.cycle_latencies.items():
+            entry = stats.setdefault(role, {})
+            entry['cycles'] = len(latencies)
+            entry['mean_cycle_latency'] = round(sum(latencies) / len(latencies), 3) if latencies else None
+        return stats
 
     def run_alpha_generator(self, batch_size: int = 10, sleep_time: int = 30):
         """Run the main alpha generator with Ollama."""
@@ -738,22 +788,13 @@ class AlphaOrchestrator:
         
         while self.running:
             try:
-                # Check if hopeful_alphas.json exists and has content
-                if os.path.exists("hopeful_alphas.json"):
-                    try:
-                        with open("hopeful_alphas.json", 'r') as f:
-                            alphas = json.load(f)
-                            if alphas and len(alphas) > 0:
-                                logger.info(f"Found {len(alphas)} alphas to mine")
-                                self.run_alpha_expression_miner()
-                            else:
-                                logger.info("No alphas found in hopeful_alphas.json")
-                    except json.JSONDecodeError:
-                        logger.warning("hopeful_alphas.json is not valid JSON, waiting for valid data...")
-                    except Exception as e:
-                        logger.error(f"Error reading hopeful_alphas.json: {e}")
+                import_hopeful_json(self.work_queue)
+                pending = self.work_queue.size(MINE_QUEUE, ready_only=True)
+                if pending > 0:
+                    logger.info(f"Found {pending} alphas to mine")
+                    self.run_alpha_expression_miner()
                 else:
-                    logger.info("hopeful_alphas.json not found yet, waiting for alpha generator to create promising alphas...")
+                    logger.info("Mine queue is empty, waiting for alpha generator to queue promising alphas...")
                 
                 # Wait before next check
                 time.sleep(check_interval)
@@ -824,6 +865,9 @@ class AlphaOrchestrator:
             except subprocess.TimeoutExpired:
                 logger.warning("Force killing alpha miner process...")
                 self.miner_process.kill()
+        
+        # Stop persistent miner/submitter workers (restarted on their next job)
+        self.workers.stop_all()
 
     def daily_workflow(self):
         """Run the complete daily workflow."""
@@ -920,6 +964,8 @@ def main():
                       help='Ollama model to use (default: deepseek-r1:8b)')
     parser.add_argument('--log-timeout', type=int, default=40,
                       help='Log inactivity timeout in seconds before reset (default: 300)')
+    parser.add_argument('--subprocess-workers', action='store_true',
+                      help='Launch a fresh subprocess per miner/submitter cycle instead of persistent workers')
     
     args = parser.parse_args()
     
@@ -928,6 +974,7 @@ def main():
         orchestrator.max_concurrent_simulations = args.max_concurrent
         orchestrator.restart_interval = args.restart_interval * 60  # Convert minutes to seconds
         orchestrator.log_inactivity_timeout = args.log_timeout
+        orchestrator.use_persistent_workers = not args.subprocess_workers
         
         # Update the model fleet to use the specified model
         if args.ollama_model:
@@ -945,8 +992,11 @@ def main():
             orchestrator.continuous_mining(args.mining_interval)
         elif args.mode == 'miner':
             orchestrator.run_alpha_expression_miner()
+            logger.info(f"Worker stats: {orchestrator.get_worker_stats()}")
+            orchestrator.workers.stop_all()
         elif args.mode == 'submitter':
             orchestrator.run_alpha_submitter(args.batch_size)
+            orchestrator.workers.stop_all()
         elif args.mode == 'generator':
             orchestrator.run_alpha_generator(args.batch_size)
         elif args.mode == 'fleet-status':
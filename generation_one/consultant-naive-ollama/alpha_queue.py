@@ -0,0 +1,459 @@
+"""
+Durable work queue for handing alphas between the generator, miner and submitter.
+
+Replaces hopeful_alphas.json as the inter-process hand-off. Jobs live in a
+SQLite database (WAL mode) so several processes can produce and consume at the
+same time. Consumers lease jobs for a visibility timeout and ack them when
+done; a job whose lease expires becomes visible again (at-least-once
+delivery), and after max_attempts deliveries it is moved to the dead-letter
+state instead of being retried forever.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_PATH = os.environ.get('ALPHA_QUEUE_DB', 'alpha_queue.db')
+LEGACY_HOPEFUL_FILE = 'hopeful_alphas.json'
+
+# Hopeful alphas are fanned out to both consumers
+MINE_QUEUE = 'hopeful_mine'
+SUBMIT_QUEUE = 'hopeful_submit'
+
+COUNTERS = ('enqueued', 'duplicates', 'delivered', 'redelivered', 'acked', 'nacked', 'dead_lettered')
+
+
+@dataclass
+class Job:
+    """A leased job. The lease token must be presented to ack/nack it."""
+    id: int
+    queue: str
+    payload: Dict
+    attempts: int
+    lease_token: str
+    dedupe_key: Optional[str] = None
+
+
+class AlphaWorkQueue:
+    """SQLite-backed queue with leases, acks and visibility timeouts"""
+
+    def __init__(self, db_path: str = DEFAULT_QUEUE_PATH, max_attempts: int = 5):
+        """
+        Args:
+            db_path: Path to the SQLite database shared by all processes
+            max_attempts: Deliveries before a job is moved to the dead-letter state
+        """
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        # Transactions are managed explicitly (BEGIN IMMEDIATE) so leases are atomic across processes
+        self._conn = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=30000")
+        self._init_database()
+
+    def _init_database(self):
+        with self._lock:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    queue TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    dedupe_key TEXT,
+                    status TEXT NOT NULL DEFAULT 'ready',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    visible_at REAL NOT NULL,
+                    lease_token TEXT,
+                    lease_owner TEXT,
+                    enqueued_at REAL NOT NULL,
+                    last_error TEXT
+                )
+            """)
+            # Dequeue walks this index in visibility order, so it never scans dead letters
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_dequeue ON jobs(queue, status, visible_at, id)")
+            # A key can only be pending once per queue; it may be enqueued again after it is acked
+            self._conn.execute("""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_pending_key ON jobs(queue, dedupe_key)
+                WHERE dedupe_key IS NOT NULL AND status IN ('ready', 'leased')
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS counters (
+                    queue TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    value INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (queue, name)
+                )
+            """)
+
+    def _bump(self, queue: str, name: str, amount: int = 1):
+        """Increment a counter (caller holds the transaction)"""
+        if amount:
+            self._conn.execute("""
+                INSERT INTO counters (queue, name, value) VALUES (?, ?, ?)
+                ON CONFLICT(queue, name) DO UPDATE SET value = value + excluded.value
+            """, (queue, name, amount))
+
+    def _transaction(self):
+        return _Transaction(self._conn, self._lock)
+
+    def enqueue(self, queue: str, payload: Dict, dedupe_key: Optional[str] = None, delay: float = 0) -> Optional[int]:
+        """
+        Add a job to a queue
+
+        Args:
+            queue: Queue name
+            payload: JSON-serializable job data
+            dedupe_key: Skip the job if the same key is already pending in this queue
+            delay: Seconds before the job becomes visible
+
+        Returns:
+            Job id, or None if it was a duplicate
+        """
+        ids = self.enqueue_many(queue, [(payload, dedupe_key)], delay=delay)
+        return ids[0] if ids else None
+
+    def enqueue_many(self, queue: str, items: Iterable, delay: float = 0) -> List[int]:
+        """
+        Add several jobs in one transaction
+
+        Args:
+            queue: Queue name
+            items: (payload, dedupe_key) tuples
+            delay: Seconds before the jobs become visible
+
+        Returns:
+            Ids of the jobs that were added (duplicates are skipped)
+        """
+        now = time.time()
+        ids = []
+        duplicates = 0
+        with self._transaction():
+            for payload, dedupe_key in items:
+                cursor = self._conn.execute("""
+                    INSERT OR IGNORE INTO jobs (queue, payload, dedupe_key, visible_at, enqueued_at)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (queue, json.dumps(payload), dedupe_key, now + delay, now))
+                if cursor.rowcount:
+                    ids.append(cursor.lastrowid)
+                else:
+                    duplicates += 1
+            self._bump(queue, 'enqueued', len(ids))
+            self._bump(queue, 'duplicates', duplicates)
+        return ids
+
+    def dequeue(self, queue: str, visibility_timeout: float = 600, max_jobs: int = 1) -> List[Job]:
+        """
+        Lease up to max_jobs visible jobs
+
+        Jobs whose lease expired are delivered again. A job that has already
+        been delivered max_attempts times is moved to the dead-letter state.
+
+        Args:
+            queue: Queue name
+            visibility_timeout: Seconds the jobs stay hidden from other consumers
+            max_jobs: Maximum number of jobs to lease
+
+        Returns:
+            Leased jobs, oldest first
+        """
+        now = time.time()
+        jobs: List[Job] = []
+        with self._transaction():
+            while len(jobs) < max_jobs:
+                rows = self._conn.execute("""
+                    SELECT id, payload, attempts, status, dedupe_key FROM jobs
+                    WHERE queue = ? AND status IN ('ready', 'leased') AND visible_at <= ?
+                    ORDER BY visible_at, id LIMIT ?
+                """, (queue, now, max_jobs - len(jobs))).fetchall()
+                if not rows:
+                    break
+                for job_id, payload, attempts, status, dedupe_key in rows:
+                    if status == 'leased':
+                        self._bump(queue, 'redelivered')
+                    if attempts >= self.max_attempts:
+                        self._conn.execute(
+                            "UPDATE jobs SET status = 'dead', lease_token = NULL WHERE id = ?", (job_id,))
+                        self._bump(queue, 'dead_lettered')
+                        logger.warning(f"Job {job_id} in {queue} exceeded {self.max_attempts} attempts, moved to dead letters")
+                        continue
+                    token = uuid.uuid4().hex
+                    self._conn.execute("""
+                        UPDATE jobs SET status = 'leased', attempts = attempts + 1, visible_at = ?,
+                            lease_token = ?, lease_owner = ?
+                        WHERE id = ?
+                    """, (now + visibility_timeout, token, self.owner, job_id))
+                    jobs.append(Job(job_id, queue, json.loads(payload), attempts + 1, token, dedupe_key))
+            self._bump(queue, 'delivered', len(jobs))
+        return jobs
+
+    def ack(self, job: Job) -> bool:
+        """
+        Mark a leased job as done and delete it
+
+        Returns:
+            False if the lease was lost (expired and re-leased, or already acked)
+        """
+        with self._transaction():
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE id = ? AND lease_token = ?", (job.id, job.lease_token))
+            self._bump(job.queue, 'acked', cursor.rowcount)
+        return cursor.rowcount > 0
+
+    def ack_key(self, queue: str, dedupe_key: str) -> int:
+        """
+        Ack the ready (not leased) jobs with a given key
+
+        Used by standalone tools that did the work without holding a lease.
+        A leased job belongs to its consumer, which acks or nacks it itself.
+
+        Returns:
+            Number of jobs removed
+        """
+        with self._transaction():
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE queue = ? AND dedupe_key = ? AND status = 'ready'",
+                (queue, dedupe_key))
+            self._bump(queue, 'acked', cursor.rowcount)
+        return cursor.rowcount
+
+    def nack(self, job: Job, delay: float = 0, error: Optional[str] = None) -> bool:
+        """
+        Release a leased job so it can be retried
+
+        Args:
+            job: The leased job
+            delay: Seconds before the job becomes visible again
+            error: Optional failure reason stored with the job
+
+        Returns:
+            False if the lease was lost
+        """
+        with self._transaction():
+            cursor = self._conn.execute("""
+                UPDATE jobs SET status = 'ready', visible_at = ?, lease_token = NULL, lease_owner = NULL,
+                    last_error = COALESCE(?, last_error)
+                WHERE id = ? AND lease_token = ?
+            """, (time.time() + delay, error, job.id, job.lease_token))
+            self._bump(job.queue, 'nacked', cursor.rowcount)
+        return cursor.rowcount > 0
+
+    def extend_lease(self, job: Job, visibility_timeout: float) -> bool:
+        """Push back the visibility timeout of a job that is still being worked on"""
+        with self._transaction():
+            cursor = self._conn.execute(
+                "UPDATE jobs SET visible_at = ? WHERE id = ? AND lease_token = ?",
+                (time.time() + visibility_timeout, job.id, job.lease_token))
+        return cursor.rowcount > 0
+
+    @contextmanager
+    def keep_leased(self, job: Job, visibility_timeout: float, interval: Optional[float] = None):
+        """
+        Renew a job's lease in the background while the block runs
+
+        Lets a short visibility timeout (quick redelivery after a crash) cover a
+        job that runs much longer than it.
+
+        Args:
+            job: The leased job
+            visibility_timeout: Lease length set on every renewal
+            interval: Seconds between renewals (default: a third of the lease)
+        """
+        stop = threading.Event()
+        interval = interval or visibility_timeout / 3
+
+        def renew():
+            while not stop.wait(interval):
+                try:
+                    if not self.extend_lease(job, visibility_timeout):
+                        logger.warning(f"Lost the lease on job {job.id} in {job.queue}")
+                        return
+                except Exception as e:
+                    logger.warning(f"Failed to renew lease on job {job.id} in {job.queue}: {e}")
+
+        thread = threading.Thread(target=renew, name=f"lease-{job.queue}-{job.id}", daemon=True)
+        thread.start()
+        try:
+            yield job
+        finally:
+            stop.set()
+            thread.join()
+
+    def size(self, queue: str, ready_only: bool = False) -> int:
+        """
+        Number of pending (ready or leased) jobs in a queue
+
+        Args:
+            queue: Queue name
+            ready_only: Count only jobs a dequeue would deliver now (not leased or delayed)
+        """
+        query = "SELECT COUNT(*) FROM jobs WHERE queue = ? AND status IN ('ready', 'leased')"
+        params = (queue,)
+        if ready_only:
+            query += " AND visible_at <= ?"
+            params = (queue, time.time())
+        with self._lock:
+            return self._conn.execute(query, params).fetchone()[0]
+
+    def peek(self, queue: str, limit: int = 100) -> List[Dict]:
+        """Payloads of pending jobs without leasing them"""
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT payload FROM jobs WHERE queue = ? AND status IN ('ready', 'leased')
+                ORDER BY id LIMIT ?
+            """, (queue, limit)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def stats(self, queue: Optional[str] = None) -> Dict:
+        """
+        Queue depths and throughput counters
+
+        Returns:
+            {queue: {"ready": n, "leased": n, "dead": n, "oldest_ready_age": s, "enqueued": n, ...}}
+        """
+        now = time.time()
+        where, params = ("WHERE queue = ?", (queue,)) if queue else ("", ())
+        stats: Dict[str, Dict] = {}
+        with self._lock:
+            for name, status, count, oldest in self._conn.execute(f"""
+                SELECT queue, status, COUNT(*), MIN(enqueued_at) FROM jobs {where} GROUP BY queue, status
+            """, params):
+                entry = stats.setdefault(name, {'ready': 0, 'leased': 0, 'dead': 0, 'oldest_ready_age': 0.0})
+                entry[status] = count
+                if status == 'ready':
+                    entry['oldest_ready_age'] = round(now - oldest, 1)
+            for name, counter, value in self._conn.execute(
+                    f"SELECT queue, name, value FROM counters {where}", params):
+                entry = stats.setdefault(name, {'ready': 0, 'leased': 0, 'dead': 0, 'oldest_ready_age': 0.0})
+                entry[counter] = value
+        for entry in stats.values():
+            for counter in COUNTERS:
+                entry.setdefault(counter, 0)
+        return stats
+
+    def purge_dead(self, queue: str) -> int:
+        """Delete dead-lettered jobs from a queue"""
+        with self._transaction():
+            cursor = self._conn.execute("DELETE FROM jobs WHERE queue = ? AND status = 'dead'", (queue,))
+        return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT/ROLLBACK under the connection lock"""
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.Lock):
+        self._conn = conn
+        self._lock = lock
+
+    def __enter__(self):
+        self._lock.acquire()
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except Exception:
+            self._lock.release()
+            raise
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._lock.release()
+        return False
+
+
+def hopeful_job_keys(alpha: Dict) -> Dict[str, Optional[str]]:
+    """Dedupe keys of a hopeful alpha in the mine and submit queues"""
+    expression = alpha.get('expression')
+    alpha_id = alpha.get('alpha_id')
+    return {
+        MINE_QUEUE: expression,
+        SUBMIT_QUEUE: alpha_id if alpha_id and alpha_id != 'unknown' else expression,
+    }
+
+
+def enqueue_hopeful_alpha(work_queue: AlphaWorkQueue, alpha: Dict) -> Dict[str, Optional[int]]:
+    """Fan a hopeful alpha out to the mine and submit queues"""
+    return {queue: work_queue.enqueue(queue, alpha, dedupe_key=key)
+            for queue, key in hopeful_job_keys(alpha).items()}
+
+
+def import_hopeful_json(work_queue: AlphaWorkQueue, json_path: str = LEGACY_HOPEFUL_FILE,
+                        archive: bool = True) -> int:
+    """
+    Import an existing hopeful_alphas.json file into the mine and submit queues
+
+    Args:
+        work_queue: Target queue
+        json_path: Legacy JSON file (a list of alphas, or {"alphas": [...]})
+        archive: Rename the file afterwards so it is not imported twice
+
+    Returns:
+        Number of alphas read from the file
+    """
+    if not os.path.exists(json_path):
+        return 0
+    try:
+        with open(json_path, 'r') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.error(f"Could not import {json_path}: {e}")
+        return 0
+
+    alphas = data.get('alphas', []) if isinstance(data, dict) else data
+    alphas = [a for a in alphas if isinstance(a, dict) and a.get('expression')]
+    for queue in (MINE_QUEUE, SUBMIT_QUEUE):
+        work_queue.enqueue_many(queue, [(a, hopeful_job_keys(a)[queue]) for a in alphas])
+
+    if archive:
+        archived = f"{json_path}.imported.{int(time.time())}"
+        os.replace(json_path, archived)
+        logger.info(f"Imported {len(alphas)} alphas from {json_path} (archived as {archived})")
+    else:
+        logger.info(f"Imported {len(alphas)} alphas from {json_path}")
+    return len(alphas)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Inspect and maintain the alpha work queue')
+    parser.add_argument('--db', type=str, default=DEFAULT_QUEUE_PATH,
+                        help=f'Queue database (default: {DEFAULT_QUEUE_PATH})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('stats', help='Show queue depths and counters')
+    import_parser = subparsers.add_parser('import', help='Import a legacy hopeful_alphas.json file')
+    import_parser.add_argument('path', nargs='?', default=LEGACY_HOPEFUL_FILE)
+    import_parser.add_argument('--keep', action='store_true', help='Do not archive the imported file')
+    purge_parser = subparsers.add_parser('purge-dead', help='Delete dead-lettered jobs')
+    purge_parser.add_argument('queue', choices=[MINE_QUEUE, SUBMIT_QUEUE])
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    work_queue = AlphaWorkQueue(args.db)
+    if args.command == 'stats':
+        print(json.dumps(work_queue.stats(), indent=2))
+    elif args.command == 'import':
+        import_hopeful_json(work_queue, args.path, archive=not args.keep)
+    elif args.command == 'purge-dead':
+        print(f"Purged {work_queue.purge_dead(args.queue)} dead jobs from {args.queue}")
+    work_queue.close()
+
+
+if __name__ == "__main__":
+    main()
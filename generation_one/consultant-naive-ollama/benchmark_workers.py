@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark for orchestrator cycle latency - compares launching a fresh Python
+subprocess per cycle (the previous behavior) with a persistent worker.
+
+Only the fixed per-cycle overhead is measured: interpreter start-up and module
+imports. Authentication and data-field cache loading are paid on top of this by
+every subprocess cycle but only once by a persistent worker.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+from worker_pool import PersistentWorker
+
+MODULES = ["alpha_expression_miner", "improved_alpha_submitter"]
+
+
+def init_imports(modules):
+    """Worker state: import the same modules a miner/submitter cycle needs"""
+    for module in modules:
+        __import__(module)
+    return None
+
+
+def noop_job(state) -> bool:
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark subprocess-per-cycle vs persistent worker latency")
+    parser.add_argument("--cycles", type=int, default=10, help="Number of cycles to time for each mode")
+    args = parser.parse_args()
+
+    cold = []
+    for _ in range(args.cycles):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {', '.join(MODULES)}"], check=True,
+                       capture_output=True)
+        cold.append(time.perf_counter() - start)
+
+    worker = PersistentWorker("benchmark", init_imports, noop_job, (MODULES,))
+    start = time.perf_counter()
+    worker.start()
+    warm_start = time.perf_counter() - start
+    warm = [worker.run(timeout=30).latency for _ in range(args.cycles)]
+    worker.stop()
+
+    print(f"Cycles: {args.cycles}, modules: {', '.join(MODULES)}")
+    print(f"Subprocess per cycle:  median {statistics.median(cold) * 1000:.1f} ms/cycle")
+    print(f"Persistent worker:     {warm_start * 1000:.1f} ms start-up (once), "
+          f"median {statistics.median(warm) * 1000:.2f} ms/cycle")
+    print(f"Per-cycle overhead saved: {(statistics.median(cold) - statistics.median(warm)) * 1000:.1f} ms "
+          f"(plus re-authentication, which this benchmark does not include)")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import argparse
 from datetime import datetime, timedelta
 from credential_manager import CredentialManager
+from alpha_queue import AlphaWorkQueue, SUBMIT_QUEUE, import_hopeful_json
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -19,6 +20,9 @@ class ImprovedAlphaSubmitter:
         self.sess = self.setup_auth(credentials_path)
         # Set longer timeout for all requests
         self.sess.timeout = (30, 300)  # (connect_timeout, read_timeout)
+        self.work_queue = AlphaWorkQueue()
+        # Lease long enough to cover submission monitoring plus the pacing sleeps
+        self.lease_seconds = 3600
 
     def setup_auth(self, credentials_path: str = None) -> requests.Session:
         """Set up authentication with WorldQuant Brain using cookie-based auth."""
@@ -45,19 +49,13 @@ class ImprovedAlphaSubmitter:
             raise Exception("Authentication failed - cannot proceed without valid credentials")
 
     def check_hopeful_alphas_count(self, min_count: int = 50) -> bool:
-        """Check if there are enough hopeful alphas to start submission."""
-        hopeful_file = 'hopeful_alphas.json'
-        
-        if not os.path.exists(hopeful_file):
-            logger.info(f"Hopeful alphas file {hopeful_file} not found")
-            return False
+        """Check if there are enough hopeful alphas queued to start submission."""
+        # Pick up anything still written to the legacy JSON file
+        import_hopeful_json(self.work_queue)
         
         try:
-            with open(hopeful_file, 'r') as f:
-                hopeful_alphas = json.load(f)
-            
-            count = len(hopeful_alphas)
-            logger.info(f"Found {count} hopeful alphas in {hopeful_file}")
+            count = self.work_queue.size(SUBMIT_QUEUE, ready_only=True)
+            logger.info(f"Found {count} hopeful alphas in {SUBMIT_QUEUE}")
             
             if count >= min_count:
                 logger.info(f"Sufficient hopeful alphas ({count} >= {min_count}), proceeding with submission")
@@ -67,18 +65,14 @@ class ImprovedAlphaSubmitter:
                 return False
                 
         except Exception as e:
-            logger.error(f"Error reading hopeful alphas file: {str(e)}")
+            logger.error(f"Error reading hopeful alphas queue: {str(e)}")
             return False
 
     def load_hopeful_alphas(self) -> List[Dict]:
-        """Load hopeful alphas from JSON file."""
-        hopeful_file = 'hopeful_alphas.json'
-        
+        """Return the hopeful alphas pending in the submit queue without leasing them."""
         try:
-            with open(hopeful_file, 'r') as f:
-                hopeful_alphas = json.load(f)
-            
-            logger.info(f"Loaded {len(hopeful_alphas)} hopeful alphas from {hopeful_file}")
+            hopeful_alphas = self.work_queue.peek(SUBMIT_QUEUE, limit=10000)
+            logger.info(f"Loaded {len(hopeful_alphas)} hopeful alphas from {SUBMIT_QUEUE}")
             return hopeful_alphas
             
         except Exception as e:
@@ -317,37 +311,40 @@ class ImprovedAlphaSubmitter:
         return False
 
     def submit_hopeful_alphas(self, batch_size: int = 3) -> None:
-        """Submit hopeful alphas from JSON file with improved error handling."""
+        """Submit hopeful alphas leased from the submit queue with improved error handling."""
         logger.info(f"Starting hopeful alphas submission with batch size {batch_size}")
         
-        # Load hopeful alphas
-        hopeful_alphas = self.load_hopeful_alphas()
-        if not hopeful_alphas:
+        if self.work_queue.size(SUBMIT_QUEUE, ready_only=True) == 0:
             logger.info("No hopeful alphas to process")
             return
         
-        # Filter out alphas with FAIL checks
-        valid_alphas = [alpha for alpha in hopeful_alphas if not self.has_fail_checks(alpha)]
-        logger.info(f"Found {len(valid_alphas)} valid alphas after filtering FAILs")
-        
-        if not valid_alphas:
-            logger.info("No valid alphas to submit")
-            return
-        
-        # Submit valid alphas in batches
+        # Submit queued alphas in batches; each alpha is acked once handled and
+        # released for a later retry if its submission fails
         total_submitted = 0
         consecutive_failures = 0
         max_consecutive_failures = 3
+        batch_number = 0
         
-        for i in range(0, len(valid_alphas), batch_size):
-            batch = valid_alphas[i:i+batch_size]
-            logger.info(f"Processing batch {i//batch_size + 1}/{(len(valid_alphas)-1)//batch_size + 1} ({len(batch)} alphas)")
+        while True:
+            batch = self.work_queue.dequeue(SUBMIT_QUEUE, visibility_timeout=self.lease_seconds, max_jobs=batch_size)
+            if not batch:
+                break
+            batch_number += 1
+            logger.info(f"Processing batch {batch_number} ({len(batch)} alphas, "
+                       f"{self.work_queue.size(SUBMIT_QUEUE, ready_only=True)} more ready)")
             
             batch_successes = 0
-            for alpha in batch:
+            for job in batch:
+                alpha = job.payload
                 alpha_id = alpha.get("alpha_id")
-                if not alpha_id:
+                if not alpha_id or alpha_id == "unknown":
                     logger.warning("Alpha missing alpha_id, skipping")
+                    self.work_queue.ack(job)
+                    continue
+                
+                if self.has_fail_checks(alpha):
+                    logger.info(f"Alpha {alpha_id} has FAIL checks, dropping from queue")
+                    self.work_queue.ack(job)
                     continue
                 
                 expression = alpha.get("expression", "Unknown")
@@ -357,11 +354,14 @@ class ImprovedAlphaSubmitter:
                 logger.info(f"Expression: {expression}")
                 logger.info(f"Metrics: {metrics}")
                 
+                self.work_queue.extend_lease(job, self.lease_seconds)
                 if self.submit_alpha(alpha_id):
+                    self.work_queue.ack(job)
                     batch_successes += 1
                     total_submitted += 1
                     consecutive_failures = 0
                 else:
+                    self.work_queue.nack(job, delay=3600, error="submission failed")
                     consecutive_failures += 1
                 
                 # Wait between submissions to avoid rate limiting
@@ -377,37 +377,13 @@ class ImprovedAlphaSubmitter:
             else:
                 consecutive_failures = 0
             
-            # Wait between batches
-            if i + batch_size < len(valid_alphas):
+            # Wait between batches (leased or delayed jobs cannot be dequeued yet, so they don't count)
+            if self.work_queue.size(SUBMIT_QUEUE, ready_only=True) > 0:
                 logger.info(f"Waiting 120 seconds before next batch...")
                 time.sleep(120)
         
         logger.info(f"Hopeful alphas submission complete. Total alphas submitted: {total_submitted}")
-        
-        # Clean up hopeful_alphas.json after successful submission
-        if total_submitted > 0:
-            self.cleanup_hopeful_alphas()
-
-    def cleanup_hopeful_alphas(self):
-        """Clean up hopeful_alphas.json after successful submission."""
-        hopeful_file = 'hopeful_alphas.json'
-        backup_file = f'hopeful_alphas_backup_{int(time.time())}.json'
-        
-        try:
-            # Create backup
-            if os.path.exists(hopeful_file):
-                import shutil
-                shutil.copy2(hopeful_file, backup_file)
-                logger.info(f"Created backup: {backup_file}")
-            
-            # Clear the file
-            with open(hopeful_file, 'w') as f:
-                json.dump([], f)
-            
-            logger.info(f"Cleared {hopeful_file} after successful submission")
-            
-        except Exception as e:
-            logger.error(f"Error cleaning up hopeful alphas file: {str(e)}")
+        logger.info(f"Submit queue stats: {self.work_queue.stats(SUBMIT_QUEUE).get(SUBMIT_QUEUE, {})}")
 
     def batch_submit(self, batch_size: int = 3) -> None:
         """Submit alphas in batches with improved error handling."""
@@ -500,7 +476,7 @@ def main():
     parser.add_argument('--min-hopeful-count', type=int, default=50,
                       help='Minimum count of hopeful alphas required to start submission (default: 50)')
     parser.add_argument('--use-hopeful-file', action='store_true',
-                      help='Use hopeful_alphas.json file instead of fetching from API')
+                      help='Submit hopeful alphas from the work queue instead of fetching from API')
     
     args = parser.parse_args()
     
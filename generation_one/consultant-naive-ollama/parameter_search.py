@@ -0,0 +1,442 @@
+"""
+Budget-aware search over alpha parameter values x simulation settings.
+
+The miner used to simulate the full Cartesian product of every parameter range
+with every simulation configuration. AdaptiveParameterSearch treats that space
+as an optimization problem instead: candidates are proposed in batches by a
+cheap additive surrogate (a Sharpe effect per parameter value and per settings
+value, plus an exploration bonus for rarely tried values), values that are
+confidently worse than the best value of the same factor are pruned, and variations that
+are identical after canonicalization are simulated once. The search stops when
+the simulation budget is spent or the best Sharpe stops improving.
+
+The grid itself is never materialized: it easily reaches hundreds of millions
+of candidates. Because the surrogate is additive, the best open candidate can be
+drawn lazily from the per-factor scores, best first.
+"""
+
+import heapq
+import json
+import math
+import re
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Same numeric-literal rule as AlphaExpressionMiner.parse_expression
+NUMBER_PATTERN = re.compile(r'(?<=[,()\s])(-?\d*\.?\d+)(?![a-zA-Z])')
+
+
+def format_number(value: float, is_integer: bool) -> str:
+    """Render a parameter value the way generate_variations writes it"""
+    if is_integer:
+        return str(int(round(value)))
+    return f"{value:.10f}".rstrip('0').rstrip('.')
+
+
+def parameter_values(param: Dict) -> List[str]:
+    """Values swept for one parameter (min..max by step, plus the original value)"""
+    values = []
+    current = param['min']
+    while current <= param['max']:
+        value = format_number(current, param['is_integer'])
+        if value not in values:
+            values.append(value)
+        current += param['step']
+    original = str(int(param['value'])) if param['is_integer'] else format_number(param['value'], False)
+    if original not in values:
+        values.append(original)
+    return values
+
+
+# Simulations per expression when no budget is given
+DEFAULT_BUDGET = 300
+
+# A candidate: one level index per parameter, then the configuration index
+Candidate = Tuple[int, ...]
+
+
+def canonicalize_expression(expression: str) -> str:
+    """
+    Canonical form used to detect equivalent variations.
+
+    Whitespace that does not separate two words is dropped and numeric literals
+    are normalized, so "ts_mean(x, 5.0)" and "ts_mean(x,5)" compare equal.
+    """
+    expression = re.sub(r'(?<![\w.])\s+|\s+(?![\w.])', '', expression.strip())
+
+    def normalize(match):
+        number = float(match.group())
+        return str(int(number)) if number.is_integer() else repr(number)
+    return NUMBER_PATTERN.sub(normalize, expression)
+
+
+def settings_key(config: Dict) -> str:
+    """Stable identity of a simulation configuration"""
+    return json.dumps(config.get('settings', config), sort_keys=True)
+
+
+def substitute(expression: str, parameters: List[Dict], values: Tuple[str, ...]) -> str:
+    """Write values into the parameter positions of expression"""
+    for param, value in sorted(zip(parameters, values), key=lambda pair: pair[0]['start'], reverse=True):
+        expression = expression[:param['start']] + value + expression[param['end']:]
+    return expression
+
+
+@dataclass
+class SearchResult:
+    """Outcome of one adaptive search"""
+    best_expression: Optional[str] = None
+    best_config: Optional[Dict] = None
+    best_sharpe: Optional[float] = None
+    simulations: int = 0
+    failed: int = 0
+    space_size: int = 0  # Candidates once repeated configurations are dropped
+    grid_size: int = 0
+    duplicates_skipped: int = 0  # Equivalent candidates found (repeated configurations and canonical duplicates)
+    rounds: int = 0
+    pruned_levels: List[str] = field(default_factory=list)
+    history: List[Tuple[str, Dict, Optional[float]]] = field(default_factory=list)
+
+
+class AdaptiveParameterSearch:
+    """
+    Batched surrogate-guided search over (parameter values, simulation config).
+
+    Every candidate is described by one level per factor: one factor per varied
+    parameter and one per settings key that differs between configurations. The
+    surrogate predicts Sharpe as an overall mean plus a shrunk effect per
+    factor level (fitted by backfitting); effects of untried numeric values are
+    interpolated from their neighbours. Each round simulates the batch with the
+    highest prediction + exploration bonus.
+
+    Candidates are generated on demand and only the simulated ones are stored,
+    so building a search costs the size of the factors, not of their product.
+    """
+
+    def __init__(self, expression: str, parameters: List[Dict], configs: List[Dict],
+                 budget: Optional[int] = None, batch_size: int = 10,
+                 exploration: float = 1.0, prune_margin: float = 0.5, min_observations: int = 2,
+                 patience: int = 5, shrinkage: float = 1.0, local_share: float = 0.5):
+        """
+        Args:
+            expression: Base alpha expression
+            parameters: Parsed parameters with 'min', 'max', 'step' (see get_parameter_ranges)
+            configs: Simulation configurations to choose from
+            budget: Maximum simulations (default: DEFAULT_BUDGET)
+            batch_size: Simulations proposed per round (the concurrency limit is a good value)
+            exploration: Weight of the bonus for rarely simulated factor levels
+            prune_margin: Sharpe gap at which a clearly worse parameter/settings value is dropped
+            min_observations: Simulations of a level needed before it can be pruned
+            patience: Rounds without a better Sharpe (after the best candidate's neighbours
+                      are exhausted) before stopping
+            shrinkage: Pseudo-count pulling level effects towards zero
+            local_share: Share of each batch spent on neighbours of the best candidate
+                         (one factor changed), which catches interactions the additive model misses
+        """
+        self.expression = expression
+        self.parameters = sorted(parameters, key=lambda p: p['start'])
+        self.batch_size = max(1, batch_size)
+        self.exploration = exploration
+        self.prune_margin = prune_margin
+        self.min_observations = min_observations
+        self.patience = patience
+        self.shrinkage = shrinkage
+        self.local_share = local_share
+        self.result = SearchResult()
+
+        # Parameter values, in numeric order so neighbouring levels are neighbouring lookbacks
+        self.value_grid = [sorted(parameter_values(p), key=float) for p in self.parameters]
+
+        # Configurations, deduplicated by settings
+        self.configs: List[Dict] = []
+        seen = set()
+        for config in configs:
+            key = settings_key(config)
+            if key not in seen:
+                seen.add(key)
+                self.configs.append(config)
+
+        variations = math.prod(len(values) for values in self.value_grid)
+        self.result.grid_size = variations * len(configs)
+        self.result.space_size = variations * len(self.configs)
+        self.result.duplicates_skipped = self.result.grid_size - self.result.space_size
+        self.budget = min(budget or DEFAULT_BUDGET, self.result.space_size)
+
+        self._build_factors()
+        # The first batch starts from the expression as given, on the first configuration
+        self._seed: Candidate = tuple(self._original_level(p) for p in range(len(self.parameters))) + (0,)
+        self.evaluated: Set[Candidate] = set()
+        self.pruned = [np.zeros(len(levels), dtype=bool) for levels in self.factor_levels]
+        # Canonical variation -> the parameter levels that stand for it; later equivalents are skipped
+        self._canonical: Dict[str, Candidate] = {}
+        self._duplicates: Set[Candidate] = set()
+        self._observed: List[Candidate] = []
+        self._rows: List[np.ndarray] = []
+        self._scores: List[float] = []
+        self._neighbours_left = 0
+
+    # ------------------------------------------------------------ space
+
+    def _build_factors(self):
+        """Levels of every factor, and the settings levels of every configuration"""
+        self.factor_names: List[str] = []
+        self.factor_levels: List[List[str]] = []
+        self.factor_numeric: List[Optional[np.ndarray]] = []
+        for param, values in zip(self.parameters, self.value_grid):
+            self.factor_names.append(f"param@{param['start']}")
+            self.factor_levels.append(values)
+            self.factor_numeric.append(np.array([float(v) for v in values]))
+
+        settings = [config.get('settings', {}) for config in self.configs]
+        columns = []
+        for name in sorted({key for s in settings for key in s}):
+            rendered = [json.dumps(s.get(name)) for s in settings]
+            levels = list(dict.fromkeys(rendered))
+            if len(levels) < 2:
+                continue
+            position = {value: i for i, value in enumerate(levels)}
+            self.factor_names.append(name)
+            self.factor_levels.append(levels)
+            self.factor_numeric.append(None)
+            columns.append(np.array([position[value] for value in rendered], dtype=np.int64))
+
+        self.config_levels = (np.stack(columns, axis=1) if columns
+                              else np.zeros((len(self.configs), 0), dtype=np.int64))
+
+    def _original_level(self, p: int) -> int:
+        """Level of the value the expression was written with"""
+        param = self.parameters[p]
+        original = str(int(param['value'])) if param['is_integer'] else format_number(param['value'], False)
+        return self.value_grid[p].index(original)
+
+    def _row(self, candidate: Candidate) -> np.ndarray:
+        """Level of every factor for one candidate"""
+        return np.concatenate([np.asarray(candidate[:-1], dtype=np.int64), self.config_levels[candidate[-1]]])
+
+    def variation(self, candidate: Candidate) -> str:
+        values = tuple(self.value_grid[p][level] for p, level in enumerate(candidate[:-1]))
+        return substitute(self.expression, self.parameters, values)
+
+    def candidate(self, candidate: Candidate) -> Tuple[str, Dict]:
+        return self.variation(candidate), self.configs[candidate[-1]]
+
+    def _is_duplicate(self, candidate: Candidate) -> bool:
+        """Whether the candidate's variation is equivalent to one already in the search"""
+        values = candidate[:-1]
+        if values in self._duplicates:
+            return True
+        owner = self._canonical.setdefault(canonicalize_expression(self.variation(candidate)), values)
+        if owner == values:
+            return False
+        self._duplicates.add(values)
+        self.result.duplicates_skipped += len(self.configs)
+        return True
+
+    def _is_open(self, candidate: Candidate, taken: Set[Candidate]) -> bool:
+        if candidate in taken or candidate in self.evaluated:
+            return False
+        if any(self.pruned[f][level] for f, level in enumerate(self._row(candidate))):
+            return False
+        return not self._is_duplicate(candidate)
+
+    def _neighbours(self, incumbent: Candidate) -> List[Candidate]:
+        """Candidates one factor away: one parameter value or one setting changed"""
+        neighbours = []
+        for p, values in enumerate(self.value_grid):
+            for level in range(len(values)):
+                if level != incumbent[p]:
+                    neighbours.append(incumbent[:p] + (level,) + incumbent[p + 1:])
+        differing = (self.config_levels != self.config_levels[incumbent[-1]]).sum(axis=1)
+        for config in np.flatnonzero(differing == 1):
+            neighbours.append(incumbent[:-1] + (int(config),))
+        return neighbours
+
+    def _best_open(self, level_scores: List[np.ndarray], taken: Set[Candidate]) -> Optional[Candidate]:
+        """
+        Open candidate with the highest summed level score.
+
+        Each parameter is one dimension and the configuration another (scored by
+        its settings levels). Combinations are walked best first with a heap over
+        the per-dimension rankings, so only candidates that beat the answer are
+        ever looked at.
+        """
+        n_params = len(self.parameters)
+        config_scores = np.zeros(len(self.configs))
+        for j in range(self.config_levels.shape[1]):
+            config_scores += level_scores[n_params + j][self.config_levels[:, j]]
+        dimensions = level_scores[:n_params] + [config_scores]
+        orders = []
+        for scores in dimensions:
+            order = np.argsort(-scores, kind='stable')
+            orders.append(order[np.isfinite(scores[order])])
+        if any(len(order) == 0 for order in orders):
+            return None
+
+        def total(position):
+            return sum(dimensions[d][orders[d][i]] for d, i in enumerate(position))
+
+        start = (0,) * len(orders)
+        heap = [(-total(start), start, 0)]
+        while heap:
+            _, position, first = heapq.heappop(heap)
+            candidate = tuple(int(orders[d][i]) for d, i in enumerate(position))
+            if self._is_open(candidate, taken):
+                return candidate
+            # Each combination is generated once: only advance dimensions at or after the last one advanced
+            for d in range(first, len(position)):
+                if position[d] + 1 < len(orders[d]):
+                    successor = position[:d] + (position[d] + 1,) + position[d + 1:]
+                    heapq.heappush(heap, (-total(successor), successor, d))
+        return None
+
+    # ------------------------------------------------------------ surrogate
+
+    def _fit(self):
+        """Overall mean, level effects and residual spread from the observations so far"""
+        observed = (np.array(self._rows, dtype=np.int64) if self._rows
+                    else np.zeros((0, len(self.factor_levels)), dtype=np.int64))
+        scores = np.array(self._scores)
+        mean = scores.mean() if len(scores) else 0.0
+        effects = [np.zeros(len(levels)) for levels in self.factor_levels]
+        counts = [np.bincount(observed[:, f], minlength=len(levels)) for f, levels in enumerate(self.factor_levels)]
+        if len(scores):
+            prediction = np.full(len(scores), mean)
+            for _ in range(5):
+                for f in range(len(effects)):
+                    level = observed[:, f]
+                    prediction -= effects[f][level]
+                    residual = scores - prediction
+                    effects[f] = (np.bincount(level, weights=residual, minlength=len(effects[f]))
+                                  / (counts[f] + self.shrinkage))
+                    prediction += effects[f][level]
+            spread = float(np.std(scores - prediction)) if len(scores) > 1 else 0.0
+        else:
+            spread = 0.0
+        spread = max(spread, float(np.std(scores)) if len(scores) > 1 else 0.0, 0.1)
+
+        for f, numeric in enumerate(self.factor_numeric):
+            seen = counts[f] > 0
+            if numeric is not None and seen.sum() >= 2 and not seen.all():
+                # Neighbouring lookbacks behave alike: interpolate untried values
+                effects[f][~seen] = np.interp(numeric[~seen], numeric[seen], effects[f][seen])
+        return mean, effects, counts, spread
+
+    def _prune(self):
+        """
+        Drop dominated factor levels.
+
+        A level is dominated once it has min_observations simulations and even its
+        optimistic effect (effect + 2 standard errors) trails the factor's best
+        effect by prune_margin. Effects come from the additive fit, so a level is
+        not blamed for having been tried alongside poor values of other factors.
+        """
+        _, effects, counts, spread = self._fit()
+        for f, levels in enumerate(self.factor_levels):
+            optimistic = effects[f] + 2 * spread / np.sqrt(np.maximum(counts[f], 1))
+            newly = ((counts[f] >= self.min_observations) & ~self.pruned[f]
+                     & (optimistic < effects[f][counts[f] > 0].max() - self.prune_margin))
+            for i in np.flatnonzero(newly):
+                self.result.pruned_levels.append(f"{self.factor_names[f]}={levels[i]}")
+            self.pruned[f] |= newly
+
+    def propose(self) -> List[Candidate]:
+        """Next batch of candidates"""
+        size = min(self.batch_size, self.budget - self.result.simulations)
+        if size <= 0:
+            return []
+
+        mean, effects, counts, spread = self._fit()
+        # Greedy batch: counts are bumped for each pick so the batch spreads out
+        counts = [c.astype(float) for c in counts]
+        chosen: List[Candidate] = []
+        taken: Set[Candidate] = set()
+        n_factors = max(len(effects), 1)
+
+        def take(candidate: Candidate):
+            chosen.append(candidate)
+            taken.add(candidate)
+            for f, level in enumerate(self._row(candidate)):
+                counts[f][level] += 1
+
+        if not self.evaluated and self._is_open(self._seed, taken):
+            take(self._seed)
+
+        if self._observed:
+            # Exploit: best-predicted candidates one factor away from the incumbent
+            incumbent = self._observed[int(np.argmax(self._scores))]
+            local = [c for c in self._neighbours(incumbent) if self._is_open(c, taken)]
+            self._neighbours_left = len(local)
+            prediction = np.array([mean + sum(effects[f][level] for f, level in enumerate(self._row(c)))
+                                   for c in local])
+            for pick in np.argsort(-prediction, kind='stable')[:int(size * self.local_share)]:
+                take(local[pick])
+
+        while len(chosen) < size:
+            level_scores = []
+            for f, effect in enumerate(effects):
+                score = effect + self.exploration * spread / np.sqrt(1.0 + counts[f]) / n_factors
+                score[self.pruned[f]] = -np.inf
+                level_scores.append(score)
+            pick = self._best_open(level_scores, taken)
+            if pick is None:
+                break
+            take(pick)
+        return chosen
+
+    # ------------------------------------------------------------ driver
+
+    def run(self, evaluate: Callable[[List[Tuple[str, Dict]]], List[Optional[float]]]) -> SearchResult:
+        """
+        Search until the budget is spent, the space is exhausted or patience runs out.
+
+        Args:
+            evaluate: Simulates (expression, config) pairs, returning the Sharpe of each
+                      (None when the simulation failed), in order
+
+        Returns:
+            SearchResult
+        """
+        logger.info(f"Adaptive search: {self.result.space_size} candidates "
+                    f"({self.result.grid_size} in the full grid), budget {self.budget} simulations")
+        best = -np.inf
+        stale = 0
+        while self.result.simulations < self.budget and stale < self.patience:
+            batch = self.propose()
+            if not batch:
+                break
+            self.result.rounds += 1
+            pairs = [self.candidate(candidate) for candidate in batch]
+            scores = evaluate(pairs)
+            self.evaluated.update(batch)
+            self.result.simulations += len(batch)
+
+            improved = False
+            for candidate, (expression, config), score in zip(batch, pairs, scores):
+                self.result.history.append((expression, config, score))
+                if score is None or not np.isfinite(score):
+                    self.result.failed += 1
+                    continue
+                self._observed.append(candidate)
+                self._rows.append(self._row(candidate))
+                self._scores.append(float(score))
+                if score > best:
+                    best = float(score)
+                    improved = True
+                    self.result.best_expression, self.result.best_config = expression, config
+                    self.result.best_sharpe = best
+            # Patience only runs down once the incumbent's neighbours have all been tried
+            stale = 0 if improved or self._neighbours_left > self.batch_size * self.local_share else stale + 1
+            if self._observed:
+                self._prune()
+            logger.info(f"Search round {self.result.rounds}: {self.result.simulations}/{self.budget} simulations, "
+                        f"best Sharpe {self.result.best_sharpe}, {len(self.result.pruned_levels)} levels pruned, "
+                        f"{self.result.duplicates_skipped} duplicates skipped")
+
+        if stale >= self.patience:
+            logger.info(f"Stopping: no improvement in {self.patience} rounds")
+        return self.result
@@ -28,7 +28,7 @@ if (-not (Test-Path "Dockerfile.prod")) {
 
 # Build the production image
 Write-Host "🔨 Building Docker production image..." -ForegroundColor Yellow
-docker build -f Dockerfile.prod -t consultant-naive-ollama:$Version .
+docker build --build-context brain_client=../../brain_client --build-context dashboard_indexer=../../dashboard_indexer -f Dockerfile.prod -t consultant-naive-ollama:$Version .
 
 if ($LASTEXITCODE -ne 0) {
     Write-Host "❌ Build failed!" -ForegroundColor Red
@@ -0,0 +1,283 @@
+"""
+Long-lived worker processes for the orchestrator.
+
+Each worker is a separate process that builds its expensive state once
+(imports, authenticated session, data-field caches) and then serves jobs from
+a job channel. A crashed or hung worker is killed and restarted on the next
+job, so a failure in one job cannot take down the orchestrator. A job that
+runs past its timeout is abandoned but the worker is kept: it finishes the job
+in the background and stays warm, and is only killed if it still has not come
+back from an abandoned job when the next one times out.
+"""
+
+import multiprocessing as mp
+import queue
+import statistics
+import threading
+import time
+import traceback
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WorkerResult:
+    """Outcome of one job"""
+    ok: bool
+    value: Any = None
+    error: Optional[str] = None
+    seconds: float = 0.0  # Time spent inside the job function
+    latency: float = 0.0  # Wall time seen by the caller, including any worker (re)start
+
+
+def _worker_main(init_fn: Callable, init_args: Tuple, job_fn: Callable, job_q, result_q):
+    """Worker process entry point: build state once, then serve jobs until a None job arrives"""
+    start = time.perf_counter()
+    try:
+        state = init_fn(*init_args)
+    except Exception:
+        result_q.put(('init_failed', None, traceback.format_exc()))
+        return
+    result_q.put(('ready', None, time.perf_counter() - start))
+
+    while True:
+        job = job_q.get()
+        if job is None:
+            break
+        job_id, kwargs = job
+        start = time.perf_counter()
+        try:
+            value = job_fn(state, **kwargs)
+            result_q.put(('done', job_id, WorkerResult(True, value, seconds=time.perf_counter() - start)))
+        except Exception:
+            result_q.put(('done', job_id, WorkerResult(False, error=traceback.format_exc(),
+                                                        seconds=time.perf_counter() - start)))
+
+
+class PersistentWorker:
+    """One long-lived worker process with restart-on-failure"""
+
+    def __init__(self, name: str, init_fn: Callable, job_fn: Callable, init_args: Tuple = (),
+                 start_timeout: float = 300, max_jobs: Optional[int] = None):
+        """
+        Args:
+            name: Worker name used in logs
+            init_fn: Module-level function building the worker state (runs in the worker)
+            job_fn: Module-level function job_fn(state, **kwargs) run for each job
+            init_args: Arguments for init_fn
+            start_timeout: Seconds to wait for init_fn to finish
+            max_jobs: Recycle the worker after this many jobs (None = never)
+        """
+        self.name = name
+        self.init_fn = init_fn
+        self.job_fn = job_fn
+        self.init_args = init_args
+        self.start_timeout = start_timeout
+        self.max_jobs = max_jobs
+        self._ctx = mp.get_context()
+        self.process = None
+        self._job_q = None
+        self._result_q = None
+        self._next_job_id = 0
+        self._jobs_since_start = 0
+        self._abandoned_job: Optional[int] = None  # Timed-out job the worker is still running
+        self._lock = threading.Lock()
+
+        self.jobs = 0
+        self.failures = 0
+        self.restarts = 0
+        self.init_seconds: Optional[float] = None
+        self.latencies: Deque[float] = deque(maxlen=200)
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def start(self):
+        """Start the worker process and wait until its state is built"""
+        if self.is_alive():
+            return
+        if self.process is not None:
+            self.restarts += 1
+        self._job_q = self._ctx.Queue()
+        self._result_q = self._ctx.Queue()
+        self.process = self._ctx.Process(
+            target=_worker_main,
+            args=(self.init_fn, self.init_args, self.job_fn, self._job_q, self._result_q),
+            name=f"worker-{self.name}",
+            daemon=True
+        )
+        self.process.start()
+        self._jobs_since_start = 0
+        self._abandoned_job = None
+        logger.info(f"Started {self.name} worker with PID: {self.process.pid}")
+
+        deadline = time.monotonic() + self.start_timeout
+        while True:
+            try:
+                kind, _, payload = self._result_q.get(timeout=1)
+            except queue.Empty:
+                if not self.process.is_alive():
+                    raise RuntimeError(f"{self.name} worker exited during startup (exit code {self.process.exitcode})")
+                if time.monotonic() > deadline:
+                    self.kill()
+                    raise RuntimeError(f"{self.name} worker did not start within {self.start_timeout}s")
+                continue
+            if kind == 'ready':
+                self.init_seconds = payload
+                logger.info(f"{self.name} worker ready in {payload:.1f}s")
+                return
+            if kind == 'init_failed':
+                self.kill()
+                raise RuntimeError(f"{self.name} worker failed to initialize:\n{payload}")
+
+    def run(self, timeout: Optional[float] = None, **kwargs) -> WorkerResult:
+        """
+        Run one job on the worker, (re)starting it if needed
+
+        Args:
+            timeout: Seconds before the job is abandoned (the worker is kept unless it is hung)
+            **kwargs: Passed to job_fn
+
+        Returns:
+            WorkerResult; failures (exceptions, crashes, timeouts) are reported, not raised
+        """
+        with self._lock:
+            return self._run(timeout, kwargs)
+
+    def _run(self, timeout: Optional[float], kwargs: Dict) -> WorkerResult:
+        start = time.perf_counter()
+        self.jobs += 1
+        try:
+            if self.max_jobs and self._jobs_since_start >= self.max_jobs:
+                logger.info(f"Recycling {self.name} worker after {self._jobs_since_start} jobs")
+                self.stop()
+            self.start()
+        except Exception as e:
+            self.failures += 1
+            return WorkerResult(False, error=str(e), latency=time.perf_counter() - start)
+
+        self._next_job_id += 1
+        job_id = self._next_job_id
+        self._jobs_since_start += 1
+        self._job_q.put((job_id, kwargs))
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        result = None
+        while result is None:
+            try:
+                kind, result_id, payload = self._result_q.get(timeout=1)
+                if kind == 'done' and result_id == job_id:
+                    result = payload
+                elif kind == 'done' and result_id == self._abandoned_job:
+                    logger.info(f"{self.name} worker finished abandoned job {result_id}")
+                    self._abandoned_job = None
+                continue
+            except queue.Empty:
+                pass
+            if not self.process.is_alive():
+                result = WorkerResult(False, error=f"{self.name} worker crashed (exit code {self.process.exitcode})")
+            elif deadline is not None and time.monotonic() > deadline:
+                if self._abandoned_job is not None:
+                    # Still stuck in the job abandoned last time: the worker is hung
+                    self.kill()
+                else:
+                    logger.warning(f"Abandoning {self.name} job {job_id} after {timeout}s; worker kept alive")
+                    self._abandoned_job = job_id
+                result = WorkerResult(False, error=f"{self.name} job timed out after {timeout}s")
+
+        result.latency = time.perf_counter() - start
+        self.latencies.append(result.latency)
+        if not result.ok:
+            self.failures += 1
+        return result
+
+    def stop(self, timeout: float = 10):
+        """Ask the worker to exit, killing it if it does not"""
+        if not self.is_alive():
+            return
+        try:
+            self._job_q.put(None)
+            self.process.join(timeout)
+        except Exception:
+            pass
+        if self.process.is_alive():
+            self.kill()
+
+    def kill(self):
+        if self.process is not None and self.process.is_alive():
+            logger.warning(f"Killing {self.name} worker (PID: {self.process.pid})")
+            self.process.terminate()
+            self.process.join(5)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join(5)
+
+    def stats(self) -> Dict:
+        latencies = list(self.latencies)
+        return {
+            'alive': self.is_alive(),
+            'jobs': self.jobs,
+            'failures': self.failures,
+            'restarts': self.restarts,
+            'init_seconds': round(self.init_seconds, 3) if self.init_seconds is not None else None,
+            'median_latency': round(statistics.median(latencies), 3) if latencies else None,
+            'last_latency': round(latencies[-1], 3) if latencies else None,
+        }
+
+
+class WorkerPool:
+    """Named set of persistent workers (one per role)"""
+
+    def __init__(self):
+        self.workers: Dict[str, PersistentWorker] = {}
+
+    def register(self, name: str, init_fn: Callable, job_fn: Callable, init_args: Tuple = (), **kwargs) -> PersistentWorker:
+        """Register a worker; it is started on its first job"""
+        if name not in self.workers:
+            self.workers[name] = PersistentWorker(name, init_fn, job_fn, init_args, **kwargs)
+        return self.workers[name]
+
+    def run(self, name: str, timeout: Optional[float] = None, **kwargs) -> WorkerResult:
+        return self.workers[name].run(timeout=timeout, **kwargs)
+
+    def stop_all(self):
+        for worker in self.workers.values():
+            worker.stop()
+
+    def stats(self) -> Dict[str, Dict]:
+        return {name: worker.stats() for name, worker in self.workers.items()}
+
+
+# Worker roles used by the orchestrator. These run inside the worker process,
+# so the heavy imports only happen there, once.
+
+def init_miner(credentials_path: Optional[str] = None):
+    """Build an authenticated AlphaExpressionMiner"""
+    from alpha_expression_miner import AlphaExpressionMiner
+    return AlphaExpressionMiner(credentials_path)
+
+
+def run_mine_job(miner, expression: str, output_file: str, max_concurrent: int = 10) -> int:
+    """Mine one expression with the warm miner; returns the number of results
+
+    The orchestrator holds the mine-queue lease and acks/nacks the job, so the
+    miner must not dequeue it.
+    """
+    from alpha_expression_miner import mine_expression
+    return len(mine_expression(miner, expression, output_file=output_file,
+                               max_concurrent=max_concurrent, auto_mode=True, dequeue=False))
+
+
+def init_submitter(credentials_path: Optional[str] = None):
+    """Build an authenticated ImprovedAlphaSubmitter"""
+    from improved_alpha_submitter import ImprovedAlphaSubmitter
+    return ImprovedAlphaSubmitter(credentials_path)
+
+
+def run_submit_job(submitter, batch_size: int = 10) -> None:
+    """Run one submission pass with the warm submitter"""
+    submitter.batch_submit(batch_size=batch_size)
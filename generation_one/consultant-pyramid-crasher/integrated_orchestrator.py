@@ -7,7 +7,6 @@ Integrated Orchestrator - Coordinates Pyramid Crasher with Templates API
 """
 
 import argparse
-import requests
 import json
 import os
 import random
@@ -30,6 +29,7 @@ from enum import Enum
 
 # Import from pyramid crasher
 from pyramid_crasher import PyramidCrasher, PyramidStrategy, PyramidResult
+from brain_client.brain_session import get_shared_session
 
 # Configure logging
 logging.basicConfig(
@@ -99,8 +99,8 @@ class IntegratedOrchestrator:
         
         self.regions = list(self.region_configs.keys())
         
-        # Setup session
-        self.sess = requests.Session()
+        # Setup session (the same pooled session as the pyramid crasher's)
+        self.sess = get_shared_session(self.credentials_path)
         
         # Setup authentication
         self.setup_auth()
@@ -111,25 +111,8 @@ class IntegratedOrchestrator:
     def setup_auth(self):
         """Setup authentication for WorldQuant Brain"""
         try:
-            with open(self.credentials_path, 'r') as f:
-                content = f.read().strip()
-                
-                # Try JSON format first (array format)
-                if content.startswith('[') and content.endswith(']'):
-                    credentials = json.loads(content)
-                    if len(credentials) != 2:
-                        raise ValueError("JSON credentials must have exactly 2 elements")
-                    username, password = credentials
-                else:
-                    # Try two-line format
-                    lines = content.split('\n')
-                    if len(lines) >= 2:
-                        username = lines[0].strip()
-                        password = lines[1].strip()
-                    else:
-                        raise ValueError("Credential file must have at least 2 lines")
-            
-            self.sess.auth = HTTPBasicAuth(username, password)
+            # The session reads the credential file (JSON array or two lines)
+            self.sess.auth = HTTPBasicAuth(*self.sess.credentials)
             logger.info("✅ Authentication setup complete")
             
         except Exception as e:
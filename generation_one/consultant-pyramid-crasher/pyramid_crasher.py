@@ -8,14 +8,13 @@ Pyramid Crasher - 3 Concurrent Simulations for Pyramid Cracking
 """
 
 import argparse
-import requests
 import json
 import os
 import random
 import time
 import logging
-from typing import List, Dict, Tuple, Optional
-from dataclasses import dataclass, asdict
+from typing import List, Dict, Tuple, Optional, Sequence
+from dataclasses import dataclass, asdict, field
 from requests.auth import HTTPBasicAuth
 import re
 from concurrent.futures import ThreadPoolExecutor, as_completed, Future
@@ -29,6 +28,9 @@ import queue
 import signal
 from enum import Enum
 
+from brain_client.field_registry import get_field_registry
+from brain_client.brain_session import get_shared_session
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -76,14 +78,73 @@ class RegionConfig:
         if self.neutralization_options is None:
             self.neutralization_options = ['INDUSTRY', 'SECTOR', 'SUBSECTOR']
 
+class AliasTable:
+    """Walker/Vose alias table: weighted sampling in O(1) after an O(n) build"""
+
+    def __init__(self, items: Sequence, weights: Sequence[float]):
+        if not items:
+            raise ValueError("AliasTable needs at least one item")
+        self.items = list(items)
+        n = len(self.items)
+        total = float(sum(weights))
+        if total <= 0:
+            weights, total = [1.0] * n, float(n)  # Same fallback as random.choice
+        scaled = [w * n / total for w in weights]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+
+    def sample(self, rng=random):
+        i = int(rng.random() * len(self.items))
+        return self.items[i] if rng.random() < self.prob[i] else self.items[self.alias[i]]
+
+
+@dataclass
+class StrategyMetrics:
+    """Live counters for one strategy"""
+    launched: int = 0
+    completed: int = 0
+    successful: int = 0
+    breakthroughs: int = 0
+    no_template: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    best_breakthrough: float = 0.0
+    first_launch: float = field(default=0.0, repr=False)
+
+    def snapshot(self, in_flight: int, now: float) -> Dict:
+        elapsed = now - self.first_launch if self.first_launch else 0.0
+        return {
+            'launched': self.launched,
+            'in_flight': in_flight,
+            'completed': self.completed,
+            'successful': self.successful,
+            'breakthroughs': self.breakthroughs,
+            'no_template': self.no_template,
+            'errors': self.errors,
+            'throughput_per_min': self.completed * 60.0 / elapsed if elapsed > 0 else 0.0,
+            'avg_task_seconds': self.busy_seconds / self.completed if self.completed else 0.0,
+            'breakthrough_rate': self.breakthroughs / self.successful if self.successful else 0.0,
+            'best_breakthrough': self.best_breakthrough,
+        }
+
+
 class PyramidCrasher:
     """Main pyramid crasher with 3 concurrent simulation strategies"""
     
     def __init__(self, credentials_path: str, max_concurrent: int = 3, 
                  progress_file: str = "pyramid_progress.json", results_file: str = "pyramid_results.json"):
         """Initialize the pyramid crasher with 3 concurrent strategies"""
-        self.sess = requests.Session()
         self.credentials_path = credentials_path
+        # Shared per credential file, so the integrated orchestrator reuses the same pool and login
+        self.sess = get_shared_session(credentials_path)
         self.max_concurrent = min(max_concurrent, 3)  # Limit to 3 concurrent strategies
         self.progress_file = progress_file
         self.results_file = results_file
@@ -98,6 +159,13 @@ class PyramidCrasher:
         # TRUE CONCURRENT execution using ThreadPoolExecutor
         self.executor = ThreadPoolExecutor(max_workers=self.max_concurrent)
         self.active_futures = {}  # Track active Future objects
+        self._state_lock = threading.RLock()  # Counters/results are updated from completion callbacks
+        self._task_ids = 0
+        self._remaining = 0
+        self._stopping = False
+        self._filling = False
+        self._all_done = threading.Event()
+        self.strategy_metrics = {s.value: StrategyMetrics() for s in self.strategies}
         self.completed_count = 0
         self.successful_count = 0
         self.failed_count = 0
@@ -138,38 +206,24 @@ class PyramidCrasher:
         
         # Load operators and data fields
         self.operators = self.load_operators()
-        self.data_fields = {}
+        self.field_registry = get_field_registry()  # parsed data-field caches, by region/delay
+        self._field_lists = {}  # (region, delay) -> (table, its record list)
         
         # Breakthrough tracking
         self.breakthrough_threshold = 2.0  # Minimum Sharpe for breakthrough
         self.best_breakthrough = 0.0
         self.breakthrough_count = 0
         
+        self.build_sampling_tables()
+        
         self.setup_auth()
         self.load_progress()
     
     def setup_auth(self):
         """Setup authentication for WorldQuant Brain"""
         try:
-            with open(self.credentials_path, 'r') as f:
-                content = f.read().strip()
-                
-                # Try JSON format first (array format)
-                if content.startswith('[') and content.endswith(']'):
-                    credentials = json.loads(content)
-                    if len(credentials) != 2:
-                        raise ValueError("JSON credentials must have exactly 2 elements")
-                    username, password = credentials
-                else:
-                    # Try two-line format
-                    lines = content.split('\n')
-                    if len(lines) >= 2:
-                        username = lines[0].strip()
-                        password = lines[1].strip()
-                    else:
-                        raise ValueError("Credential file must have at least 2 lines")
-            
-            self.sess.auth = HTTPBasicAuth(username, password)
+            # The session reads the credential file (JSON array or two lines)
+            self.sess.auth = HTTPBasicAuth(*self.sess.credentials)
             logger.info("✅ Authentication setup complete")
             
         except Exception as e:
@@ -192,16 +246,11 @@ class PyramidCrasher:
         """Get data fields for a specific region and delay"""
         cache_key = f"data_fields_cache_{region}_{delay}.json"
         
-        if cache_key in self.data_fields:
-            return self.data_fields[cache_key]
-        
         try:
-            if os.path.exists(cache_key):
-                with open(cache_key, 'r') as f:
-                    fields = json.load(f)
-                    self.data_fields[cache_key] = fields
-                    logger.info(f"Loaded {len(fields)} cached data fields for {region} delay={delay}")
-                    return fields
+            # The registry parses each cache file once and notices when it is rewritten
+            table = self.field_registry.table(region, delay)
+            if table is not None:
+                return table.dicts()
             
             # Fetch from API
             response = self.sess.get(f'https://platform.worldquantbrain.com/static/data-fields-{region.lower()}-{delay}.json')
@@ -212,64 +261,78 @@ class PyramidCrasher:
             with open(cache_key, 'w') as f:
                 json.dump(fields, f)
             
-            self.data_fields[cache_key] = fields
+            table = self.field_registry.register(region, delay, None, fields)
             logger.info(f"Fetched and cached {len(fields)} data fields for {region} delay={delay}")
-            return fields
+            return table.dicts()
             
         except Exception as e:
             logger.error(f"Failed to get data fields for {region} delay={delay}: {e}")
             return []
     
+    def get_warm_fields(self, region: str, delay: int) -> List[Dict]:
+        """Field list for region/delay, kept until the registry's table for it changes"""
+        table = self.field_registry.table(region, delay)
+        if table is None:
+            self.get_data_fields_for_region(region, delay)
+            table = self.field_registry.table(region, delay)
+            if table is None:
+                return []
+        cached = self._field_lists.get((region, delay))
+        if cached is None or cached[0] is not table:
+            # record_list is shared and read-only; the generators only sample from it
+            cached = (table, table.record_list)
+            self._field_lists[(region, delay)] = cached
+        return cached[1]
+    
+    def _delay_weights(self, region: str) -> Dict[int, float]:
+        """Delay -> selection weight for a region"""
+        # For ASI, CHN, and GLB, only delay=1 is available
+        if region in ["ASI", "CHN", "GLB"]:
+            return {1: 1.0}
+        multipliers = self.pyramid_multipliers.get(region, {"0": 1.0, "1": 1.0})
+        return {0: multipliers.get("0", 1.0), 1: multipliers.get("1", 1.0)}
+    
+    def build_sampling_tables(self, regions: List[str] = None):
+        """
+        Precompute alias tables for region, delay and joint (region, delay) picks
+        
+        Call again after changing pyramid_multipliers.
+        """
+        regions = regions or self.regions
+        # Regions are weighted by their higher pyramid multiplier
+        region_weights = {
+            region: max(self.pyramid_multipliers.get(region, {"0": 1.0, "1": 1.0}).values())
+            for region in self.regions
+        }
+        self._region_table = AliasTable(self.regions, [region_weights[r] for r in self.regions])
+        self._delay_tables = {}
+        targets, weights = [], []
+        for region in set(self.regions) | set(regions):
+            delay_weights = self._delay_weights(region)
+            self._delay_tables[region] = AliasTable(list(delay_weights), list(delay_weights.values()))
+            if region in regions:
+                total = sum(delay_weights.values()) or 1.0
+                for delay, weight in delay_weights.items():
+                    targets.append((region, delay))
+                    weights.append(region_weights.get(region, 1.0) * weight / total)
+        # Same distribution as select_region_by_pyramid() then select_optimal_delay(), in one draw
+        self._target_table = AliasTable(targets, weights)
+    
     def select_region_by_pyramid(self) -> str:
         """Select region based on pyramid multipliers"""
-        # Weight regions by their pyramid multipliers
-        weights = []
-        for region in self.regions:
-            multipliers = self.pyramid_multipliers.get(region, {"0": 1.0, "1": 1.0})
-            # Use the higher multiplier as weight
-            max_mult = max(multipliers.values())
-            weights.append(max_mult)
-        
-        # Weighted random selection
-        total_weight = sum(weights)
-        if total_weight == 0:
-            return random.choice(self.regions)
-        
-        rand_val = random.uniform(0, total_weight)
-        cumulative = 0
-        for i, weight in enumerate(weights):
-            cumulative += weight
-            if rand_val <= cumulative:
-                return self.regions[i]
-        
-        return random.choice(self.regions)
+        return self._region_table.sample()
     
     def select_optimal_delay(self, region: str) -> int:
         """Select delay based on pyramid multipliers and region constraints"""
-        multipliers = self.pyramid_multipliers.get(region, {"0": 1.0, "1": 1.0})
-        
-        # For ASI, CHN, and GLB, only delay=1 is available
-        if region in ["ASI", "CHN", "GLB"]:
-            return 1
-        
-        # For other regions, use weighted selection based on multipliers
-        delay_0_mult = multipliers.get("0", 1.0)
-        delay_1_mult = multipliers.get("1", 1.0)
-        
-        # Calculate probabilities based on multipliers
-        total_weight = delay_0_mult + delay_1_mult
-        prob_delay_0 = delay_0_mult / total_weight
-        prob_delay_1 = delay_1_mult / total_weight
-        
-        # Weighted random selection
-        if random.random() < prob_delay_0:
-            return 0
-        else:
-            return 1
+        table = self._delay_tables.get(region)
+        if table is None:
+            weights = self._delay_weights(region)
+            table = self._delay_tables[region] = AliasTable(list(weights), list(weights.values()))
+        return table.sample()
     
     def generate_pyramid_template(self, strategy: PyramidStrategy, region: str, delay: int) -> Dict:
         """Generate a pyramid-cracking template based on strategy"""
-        data_fields = self.get_data_fields_for_region(region, delay)
+        data_fields = self.get_warm_fields(region, delay)
         if not data_fields:
             return None
         
@@ -493,67 +556,107 @@ class PyramidCrasher:
         return level_map.get(region, 1)
     
     def run_concurrent_pyramid_cracking(self, regions: List[str] = None, iterations: int = 100):
-        """Run 3 concurrent pyramid cracking simulations"""
+        """
+        Run pyramid cracking simulations, max_concurrent at a time
+        
+        Event-driven: each completed simulation immediately frees its slot for
+        the next one (via a completion callback), until `iterations`
+        simulations have been launched.
+        """
         if regions is None:
             regions = self.regions
         
-        logger.info(f"🚀 Starting 3 concurrent pyramid cracking simulations...")
+        logger.info(f"🚀 Starting {self.max_concurrent} concurrent pyramid cracking simulations...")
         logger.info(f"🎯 Strategies: {[s.value for s in self.strategies]}")
         logger.info(f"🌍 Regions: {regions}")
         logger.info(f"🔄 Iterations: {iterations}")
         
+        # Sampling tables for the requested regions, and their field lists loaded up front
+        self.build_sampling_tables(regions)
+        for region, delay in self._target_table.items:
+            fields = self.get_warm_fields(region, delay)
+            logger.info(f"📚 {region} delay={delay}: {len(fields)} fields ready")
+        
         # Setup signal handler for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
         
+        with self._state_lock:
+            self._remaining = iterations
+            self._stopping = False
+            self._all_done.clear()
+            self._fill_available_slots_concurrent()
+        
         try:
-            iteration = 0
-            while iteration < iterations:
-                # Fill available slots with concurrent tasks
-                self._fill_available_slots_concurrent(regions)
-                
-                # Process completed futures
-                self._process_completed_futures()
-                
-                # Update progress
-                if iteration % 10 == 0:
-                    self._display_progress()
-                
-                iteration += 1
-                time.sleep(0.1)  # Small delay to prevent busy waiting
-            
-            # Wait for remaining futures to complete
-            self._wait_for_futures_completion()
-            
+            while not self._all_done.wait(timeout=5.0):
+                self._display_progress()
         except KeyboardInterrupt:
             logger.info("\n🛑 Received interrupt signal. Stopping gracefully...")
+            self._stopping = True
             self._wait_for_futures_completion()
         
         # Shutdown executor
         self.executor.shutdown(wait=True)
+        self._display_progress()
+        self.all_results['strategy_metrics'] = self.get_strategy_metrics()
         
         return self.all_results
     
-    def _fill_available_slots_concurrent(self, regions: List[str]):
-        """Fill available slots with concurrent pyramid cracking tasks"""
-        available_slots = self.max_concurrent - len(self.active_futures)
+    def _next_strategy(self) -> PyramidStrategy:
+        """Strategy with the fewest simulations in flight (then fewest launched)"""
+        in_flight = self._in_flight_by_strategy()
+        return min(self.strategies,
+                   key=lambda s: (in_flight.get(s.value, 0), self.strategy_metrics[s.value].launched))
+    
+    def _in_flight_by_strategy(self) -> Dict[str, int]:
+        counts = {}
+        for strategy_value, _ in self.active_futures.values():
+            counts[strategy_value] = counts.get(strategy_value, 0) + 1
+        return counts
+    
+    def _fill_available_slots_concurrent(self):
+        """Launch simulations into free slots while the iteration budget lasts"""
+        with self._state_lock:
+            if self._filling:
+                # A task finished inside _launch (callback ran inline); the outer loop refills
+                return
+            self._filling = True
+            try:
+                while (not self._stopping and self._remaining > 0
+                       and len(self.active_futures) < self.max_concurrent):
+                    self._launch(self._next_strategy())
+            finally:
+                self._filling = False
+            if not self.active_futures and (self._stopping or self._remaining <= 0):
+                self._all_done.set()
+    
+    def _launch(self, strategy: PyramidStrategy):
+        """Submit one simulation; its completion callback refills the slot"""
+        region, delay = self._target_table.sample()
+        self._task_ids += 1
+        future_id = f"{strategy.value}_{self._task_ids}"
+        metrics = self.strategy_metrics[strategy.value]
+        metrics.launched += 1
+        if not metrics.first_launch:
+            metrics.first_launch = time.time()
+        self._remaining -= 1
         
-        if available_slots > 0:
-            logger.info(f"🎯 Filling {available_slots} available slots with CONCURRENT pyramid tasks...")
-            
-            for i in range(available_slots):
-                strategy = self.strategies[i % len(self.strategies)]
-                region = random.choice(regions)
-                
-                # Submit concurrent task
-                future = self.executor.submit(self._crack_pyramid_concurrent, strategy, region)
-                future_id = f"{strategy.value}_{int(time.time() * 1000)}"
-                self.active_futures[future_id] = future
-                logger.info(f"🚀 Started CONCURRENT {strategy.value.upper()} task: {future_id}")
+        try:
+            future = self.executor.submit(self._crack_pyramid_concurrent, strategy, region, delay)
+        except RuntimeError as e:  # Executor already shut down
+            logger.error(f"Could not start {strategy.value} task: {e}")
+            self._stopping = True
+            return
+        self.active_futures[future_id] = (strategy.value, future)
+        logger.info(f"🚀 Started CONCURRENT {strategy.value.upper()} task: {future_id} ({region} delay={delay})")
+        started = time.time()
+        future.add_done_callback(lambda f: self._on_task_done(future_id, strategy.value, started, f))
     
-    def _crack_pyramid_concurrent(self, strategy: PyramidStrategy, region: str) -> Optional[PyramidResult]:
+    def _crack_pyramid_concurrent(self, strategy: PyramidStrategy, region: str,
+                                  delay: Optional[int] = None) -> Optional[PyramidResult]:
         """Concurrently crack a pyramid using the specified strategy"""
         try:
-            delay = self.select_optimal_delay(region)
+            if delay is None:
+                delay = self.select_optimal_delay(region)
             
             # Generate pyramid-cracking template
             template = self.generate_pyramid_template(strategy, region, delay)
@@ -564,72 +667,85 @@ class PyramidCrasher:
             logger.info(f"🔍 {strategy.value.upper()}: {template['template'][:50]}...")
             
             # Simulate the template
-            result = self.simulate_pyramid_template(template, region, delay)
+            return self.simulate_pyramid_template(template, region, delay)
             
+        except Exception as e:
+            logger.error(f"Error in {strategy.value} pyramid cracking: {e}")
+            raise
+    
+    def _on_task_done(self, future_id: str, strategy_value: str, started: float, future: Future):
+        """Completion callback: record the result and refill the slot at once"""
+        with self._state_lock:
+            self.active_futures.pop(future_id, None)
+            metrics = self.strategy_metrics[strategy_value]
+            metrics.completed += 1
+            metrics.busy_seconds += time.time() - started
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"Error processing future {future_id}: {e}")
+                metrics.errors += 1
+                self.failed_count += 1
+                self.completed_count += 1
+                result = None
+            else:
+                if result is None:
+                    metrics.no_template += 1
+                else:
+                    self._record_result(result, metrics)
+            self._fill_available_slots_concurrent()
+    
+    def _record_result(self, result: PyramidResult, metrics: StrategyMetrics):
+        """Store a result and update counters (caller holds _state_lock)"""
+        self.pyramid_results.append(result)
+        
+        # Add to results by region
+        self.all_results['pyramid_results'].setdefault(result.region, []).append(asdict(result))
+        
+        # Update counters
+        if result.success:
+            self.successful_count += 1
+            metrics.successful += 1
             # Check for breakthrough
-            if result.success and result.breakthrough_score >= self.breakthrough_threshold:
+            if result.breakthrough_score >= self.breakthrough_threshold:
                 self.breakthrough_count += 1
+                metrics.breakthroughs += 1
+                metrics.best_breakthrough = max(metrics.best_breakthrough, result.breakthrough_score)
                 if result.breakthrough_score > self.best_breakthrough:
                     self.best_breakthrough = result.breakthrough_score
-                logger.info(f"💥 BREAKTHROUGH! {strategy.value}: Sharpe={result.sharpe:.3f}, Score={result.breakthrough_score:.3f}")
-            
-            return result
-            
-        except Exception as e:
-            logger.error(f"Error in {strategy.value} pyramid cracking: {e}")
-            return None
-    
-    def _process_completed_futures(self):
-        """Process completed futures and update results"""
-        completed_futures = []
+                logger.info(f"💥 BREAKTHROUGH! {result.strategy}: Sharpe={result.sharpe:.3f}, Score={result.breakthrough_score:.3f}")
+        else:
+            self.failed_count += 1
         
-        for future_id, future in self.active_futures.items():
-            if future.done():
-                completed_futures.append(future_id)
-                
-                try:
-                    result = future.result()
-                    if result:
-                        self.pyramid_results.append(result)
-                        
-                        # Add to results by region
-                        region = result.region
-                        if region not in self.all_results['pyramid_results']:
-                            self.all_results['pyramid_results'][region] = []
-                        self.all_results['pyramid_results'][region].append(asdict(result))
-                        
-                        # Update counters
-                        if result.success:
-                            self.successful_count += 1
-                        else:
-                            self.failed_count += 1
-                        
-                        self.completed_count += 1
-                        
-                        # Save progress
-                        self.save_progress()
-                
-                except Exception as e:
-                    logger.error(f"Error processing future {future_id}: {e}")
-                    self.failed_count += 1
-                    self.completed_count += 1
+        self.completed_count += 1
         
-        # Remove completed futures
-        for future_id in completed_futures:
-            del self.active_futures[future_id]
+        # Save progress
+        self.save_progress()
+    
+    def get_strategy_metrics(self) -> Dict[str, Dict]:
+        """Live per-strategy throughput, latency and breakthrough rate"""
+        with self._state_lock:
+            in_flight = self._in_flight_by_strategy()
+            now = time.time()
+            return {name: metrics.snapshot(in_flight.get(name, 0), now)
+                    for name, metrics in self.strategy_metrics.items()}
     
     def _wait_for_futures_completion(self):
         """Wait for all active futures to complete"""
         logger.info("⏳ Waiting for active futures to complete...")
-        
-        while self.active_futures:
-            self._process_completed_futures()
-            time.sleep(0.1)
+        with self._state_lock:
+            futures = [future for _, future in self.active_futures.values()]
+        for future in futures:
+            try:
+                future.exception()
+            except Exception:
+                pass
     
     def _signal_handler(self, signum, frame):
-        """Handle interrupt signals gracefully"""
+        """Stop launching new simulations; in-flight ones finish"""
         logger.info("\n🛑 Received interrupt signal. Stopping gracefully...")
-        self._wait_for_futures_completion()
+        self._stopping = True
+        self._fill_available_slots_concurrent()
     
     def _display_progress(self):
         """Display current progress"""
@@ -643,6 +759,10 @@ class PyramidCrasher:
               f"💥 {self.breakthrough_count} breakthroughs | "
               f"🏆 Best: {self.best_breakthrough:.3f}", end="")
         sys.stdout.flush()
+        for name, stats in self.get_strategy_metrics().items():
+            logger.info(f"   {name}: {stats['completed']} done, {stats['in_flight']} running, "
+                        f"{stats['throughput_per_min']:.1f}/min, "
+                        f"breakthrough rate {stats['breakthrough_rate'] * 100:.1f}%")
     
     def save_progress(self):
         """Save current progress to file"""
@@ -653,6 +773,7 @@ class PyramidCrasher:
                 'failed_count': self.failed_count,
                 'breakthrough_count': self.breakthrough_count,
                 'best_breakthrough': self.best_breakthrough,
+                'strategy_metrics': self.get_strategy_metrics(),
                 'timestamp': time.time()
             }
             
@@ -55,7 +55,7 @@ Examples:
         '--iterations',
         type=int,
         default=100,
-        help='Number of iterations to run (default: 100)'
+        help='Number of simulations to run (default: 100)'
     )
     
     parser.add_argument(
@@ -178,6 +178,11 @@ def main():
             for region, perf in results['breakthrough_analysis']['region_performance'].items():
                 print(f"   {region}: {perf['count']} breakthroughs, avg score: {perf['avg_breakthrough_score']:.3f}")
         
+        # Display API latency
+        print(f"\n🌐 API Endpoints:")
+        for endpoint, stats in crasher.sess.get_endpoint_stats().items():
+            print(f"   {endpoint}: {stats['count']} calls, avg {stats['avg_ms']:.0f}ms, p95 {stats['p95_ms']:.0f}ms")
+        
         print(f"\n💡 Tip: Check {args.output} for detailed results and breakthrough analysis!")
         
         return 0
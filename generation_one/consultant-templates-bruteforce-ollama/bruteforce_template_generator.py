@@ -8,7 +8,6 @@ Bruteforce Template Generator for WorldQuant Brain
 """
 
 import argparse
-import requests
 import json
 import os
 import random
@@ -16,7 +15,6 @@ import time
 import logging
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass, asdict
-from requests.auth import HTTPBasicAuth
 import re
 from concurrent.futures import ThreadPoolExecutor, as_completed, Future
 import numpy as np
@@ -27,6 +25,10 @@ import math
 import subprocess
 import ollama
 
+from brain_client.field_registry import FieldTable, get_field_registry
+from brain_client.brain_session import BrainSession
+from brain_client.result_cache import ResultCache
+
 # Configure logging with UTF-8 encoding to handle Unicode characters
 import io
 import codecs
@@ -145,12 +147,19 @@ class BruteforceResult:
 class BruteforceTemplateGenerator:
     def __init__(self, credentials_path: str, ollama_model: str = "llama3.1", max_concurrent: int = 8, target_dataset: str = None):
         """Initialize the bruteforce template generator"""
-        self.sess = requests.Session()
         self.credentials_path = credentials_path
         self.ollama_model = ollama_model
         self.max_concurrent = min(max_concurrent, 8)  # WorldQuant Brain limit is 8
+        # Pool sized for every simulation thread plus monitoring; 401s trigger one shared re-login
+        self.sess = BrainSession(credentials_path, pool_size=self.max_concurrent * 2 + 4)
         self.target_dataset = target_dataset  # Specific dataset to test
         
+        # Parsed data-field caches, shared by every generator in this process
+        self.field_registry = get_field_registry()
+        
+        # Simulation results by canonical template + settings: repeats are not re-simulated
+        self.result_cache = ResultCache()
+        
         # Thread management similar to consultant-templates-ollama
         self.executor = ThreadPoolExecutor(max_workers=self.max_concurrent)
         self.active_futures = {}
@@ -418,31 +427,9 @@ class BruteforceTemplateGenerator:
     def setup_auth(self):
         """Setup authentication from credentials file"""
         try:
-            with open(self.credentials_path, 'r') as f:
-                credentials = json.load(f)
-            
-            # Handle both JSON format {"username": "...", "password": "..."} and array format ["username", "password"]
-            if isinstance(credentials, dict):
-                username = credentials['username']
-                password = credentials['password']
-            elif isinstance(credentials, list):
-                username = credentials[0]
-                password = credentials[1]
-            else:
-                raise ValueError("Invalid credentials format")
-            
-            # Authenticate with WorldQuant Brain using the same method as consultant-templates-ollama
-            auth_response = self.sess.post(
-                'https://api.worldquantbrain.com/authentication',
-                auth=HTTPBasicAuth(username, password)
-            )
-            
-            if auth_response.status_code == 201:
-                logger.info("✅ Authentication successful")
-            else:
-                logger.error(f"❌ Authentication failed: {auth_response.status_code}")
-                raise Exception("Authentication failed")
-                
+            # Credentials ({"username", "password"} or ["username", "password"]) are read by BrainSession
+            self.sess.login()
+            logger.info("✅ Authentication successful")
         except Exception as e:
             logger.error(f"❌ Failed to setup authentication: {e}")
             raise
@@ -455,18 +442,17 @@ class BruteforceTemplateGenerator:
             cache_file = f"data_fields_cache_{cache_key}.json"
             
             if os.path.exists(cache_file):
-                logger.info(f"📁 Loading cached data fields for {region} delay={delay}")
-                with open(cache_file, 'r') as f:
-                    cached_data = json.load(f)
-                    logger.info(f"📊 Loaded {len(cached_data)} cached fields for {region} delay={delay}")
-                    
-                    # Filter by target dataset if specified
-                    if self.target_dataset:
-                        filtered_data = [field for field in cached_data if self.target_dataset in field.get('id', '')]
-                        logger.info(f"🎯 Filtered to {len(filtered_data)} fields for dataset {self.target_dataset}")
-                        return filtered_data
-                    
-                    return cached_data
+                # The registry parses the cache file once per process
+                cached_table = self.field_registry.table(region, delay)
+                logger.debug(f"📊 Using {len(cached_table)} cached fields for {region} delay={delay}")
+                
+                # Filter by target dataset if specified
+                if self.target_dataset:
+                    filtered_data = [field.to_dict() for field in cached_table if self.target_dataset in field.id]
+                    logger.debug(f"🎯 Filtered to {len(filtered_data)} fields for dataset {self.target_dataset}")
+                    return filtered_data
+                
+                return cached_table.dicts()
             
             logger.info(f"🌐 No cache found for {region} delay={delay}, fetching from API...")
             config = self.regions[region]
@@ -566,7 +552,8 @@ class BruteforceTemplateGenerator:
             except Exception as e:
                 logger.warning(f"⚠️ Failed to cache data fields: {e}")
             
-            return field_list
+            # Same shape as the cached path
+            return FieldTable.from_fields(region, delay, config.universe, field_list).dicts()
             
         except Exception as e:
             logger.error(f"❌ Failed to get data fields for region {region}: {e}")
@@ -844,13 +831,16 @@ class BruteforceTemplateGenerator:
     def _validate_data_field_exists(self, data_field: str, region: str) -> bool:
         """Check if a data field exists in the region's available fields"""
         try:
-            # Get data fields for the region
-            region_fields = self.get_data_fields_for_region(region)
+            # O(1) registry lookup once the region's fields are cached on disk
+            cached_table = self.field_registry.table(region, 1)
+            if cached_table is not None:
+                exists = data_field in cached_table and (not self.target_dataset or self.target_dataset in data_field)
+            else:
+                region_fields = self.get_data_fields_for_region(region)
+                exists = any(field.get('id') == data_field for field in region_fields)
             
-            # Check if the data field exists
-            for field in region_fields:
-                if field.get('id') == data_field:
-                    return True
+            if exists:
+                return True
             
             logger.warning(f"⚠️ Data field '{data_field}' not found in region {region}")
             return False
@@ -1024,6 +1014,17 @@ Generate a new template:"""
                     'regular': processed_template
                 }
                 
+                cached = self.result_cache.get(processed_template, settings)
+                if cached is not None:
+                    logger.info(f"♻️ Result cache hit, not re-simulating: {processed_template[:60]}")
+                    result = BruteforceResult(**{**cached, 'template': current_template, 'simulation_time': 0.0})
+                    if not result.success and self.is_vector_field_error(result.error_message):
+                        self.templates_with_vector_issues.add(current_template)
+                    if not result.success and attempt < max_retries and use_ollama:
+                        current_template = self._regenerate_template_on_error(current_template, result.error_message, region, data_field)
+                        continue
+                    return result
+                
                 # Submit simulation using the correct API endpoint
                 submit_url = "https://api.worldquantbrain.com/simulations"
                 response = self.sess.post(submit_url, json=simulation_data)
@@ -1067,7 +1068,8 @@ Generate a new template:"""
                 logger.info(f"🚀 Started simulation for template: {current_template[:50]}... (Progress URL: {progress_url})")
                 
                 # Monitor simulation
-                result = self._monitor_simulation(progress_url, current_template, region, data_field, neutralization)
+                result = self._monitor_simulation(progress_url, current_template, region, data_field, neutralization,
+                                                  cache_as=(processed_template, settings))
                 result.simulation_time = time.time() - start_time
                 
                 # If simulation failed, try to regenerate template (only if Ollama is enabled)
@@ -1109,8 +1111,19 @@ Generate a new template:"""
             simulation_time=time.time() - start_time
         )
 
-    def _monitor_simulation(self, progress_url: str, template: str, region: str, data_field: str, neutralization: str) -> BruteforceResult:
-        """Monitor a simulation until completion using progress URL"""
+    def _monitor_simulation(self, progress_url: str, template: str, region: str, data_field: str, neutralization: str,
+                            cache_as: Optional[Tuple[str, SimulationSettings]] = None) -> BruteforceResult:
+        """Monitor a simulation until completion using progress URL
+        
+        Complete results, and failures the expression itself caused, are stored in
+        the result cache under cache_as = (submitted expression, settings).
+        """
+        def final(result: BruteforceResult, status: str = 'COMPLETE') -> BruteforceResult:
+            if cache_as is not None:
+                self.result_cache.put(cache_as[0], cache_as[1], asdict(result),
+                                      status=status, message=result.error_message)
+            return result
+        
         max_wait_time = 300  # 5 minutes
         check_interval = 5  # Check every 5 seconds
         start_time = time.time()
@@ -1203,7 +1216,7 @@ Generate a new template:"""
                                     error_message="Simulation completed but returned zero/invalid performance metrics"
                                 )
                             
-                            return BruteforceResult(
+                            return final(BruteforceResult(
                                 template=template,
                                 region=region,
                                 data_field=data_field,
@@ -1215,7 +1228,7 @@ Generate a new template:"""
                                 margin=margin,
                                 fitness=fitness,
                                 turnover=turnover
-                            )
+                            ))
                         else:
                             logger.error(f"Failed to fetch alpha data: {alpha_response.status_code}")
                             return BruteforceResult(
@@ -1266,14 +1279,14 @@ Generate a new template:"""
                             logger.error(f"❌ Simulation {status.lower()}: {full_error}")
                         logger.error(f"❌ Full error data: {data}")
                         
-                        return BruteforceResult(
+                        return final(BruteforceResult(
                             template=template,
                             region=region,
                             data_field=data_field,
                             neutralization=neutralization,
                             success=False,
                             error_message=full_error
-                        )
+                        ), status)
                     
                     # Still running, wait and check again
                     time.sleep(check_interval)
@@ -1859,6 +1872,8 @@ def main():
         max_batches=args.max_batches,
         resume=args.resume
     )
+    generator.sess.log_endpoint_stats()
+    generator.result_cache.log_stats()
 
 if __name__ == "__main__":
     main()
@@ -9,7 +9,6 @@ Enhanced Template Generator v2 with TRUE CONCURRENT Subprocess Execution
 """
 
 import argparse
-import requests
 import json
 import os
 import random
@@ -17,7 +16,6 @@ import time
 import logging
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass, asdict
-from requests.auth import HTTPBasicAuth
 import re
 from concurrent.futures import ThreadPoolExecutor, as_completed, Future
 import numpy as np
@@ -28,6 +26,12 @@ import math
 import subprocess
 import ollama
 
+from brain_client.bandit_engine import UCB1Bandit
+from pnl_store import PnLStore, parse_pnl_records, pnl_statistics, detect_flatline, flatline_pattern, screen_quality
+from brain_client.field_registry import FieldTable, get_field_registry
+from brain_client.brain_session import BrainSession
+from brain_client.result_cache import ResultCache, result_key
+
 # Configure logging with UTF-8 encoding to handle Unicode characters
 import io
 import codecs
@@ -187,6 +191,7 @@ class PersonaBandit:
         self.persona_stats = {}  # {persona_id: PersonaPerformance}
         self.total_persona_uses = 0
         self.successful_persona_uses = 0
+        self.engine = UCB1Bandit(exploration=math.sqrt(2))
         
     def add_persona(self, persona_id: str, name: str, style: str):
         """Add a new persona to the bandit"""
@@ -232,6 +237,11 @@ class PersonaBandit:
             
             # Calculate performance score
             stats.performance_score = self._calculate_performance_score(stats)
+        
+        # The engine arm tracks pulls; its mean is pinned to the latest performance score
+        idx = self.engine.add_arm(persona_id)
+        self.engine.update(persona_id, stats.performance_score)
+        self.engine.reward_sum[idx] = stats.performance_score * self.engine.pulls[idx]
     
     def _calculate_performance_score(self, stats: PersonaPerformance) -> float:
         """Calculate overall performance score for a persona"""
@@ -271,21 +281,9 @@ class PersonaBandit:
             if persona_id not in self.persona_stats:
                 self.add_persona(persona_id, f"Persona_{persona_id}", "Unknown")
         
-        # Calculate UCB1 values
-        ucb_values = {}
-        for persona_id in available_personas:
-            stats = self.persona_stats[persona_id]
-            
-            if stats.total_uses == 0:
-                ucb_values[persona_id] = float('inf')  # Prioritize unexplored personas
-            else:
-                # UCB1 formula
-                exploration_bonus = math.sqrt(2 * math.log(self.total_persona_uses) / stats.total_uses)
-                ucb_values[persona_id] = stats.performance_score + exploration_bonus
-        
-        # Choose best persona
-        best_persona = max(ucb_values.keys(), key=lambda x: ucb_values[x])
-        return best_persona
+        # UCB1 over all candidates at once (unexplored personas first)
+        self.engine.total_pulls = max(self.engine.total_pulls, self.total_persona_uses)
+        return self.engine.select_one(available_personas)
     
     def get_persona_performance(self, persona_id: str) -> PersonaPerformance:
         """Get performance statistics for a persona"""
@@ -303,26 +301,25 @@ class PersonaBandit:
         return sorted_personas[:n]
 
 class MultiArmBandit:
-    """Multi-arm bandit for explore vs exploit decisions with time decay"""
+    """Multi-arm bandit for explore vs exploit decisions with time decay (backed by bandit_engine)"""
     
     def __init__(self, exploration_rate: float = 0.3, confidence_level: float = 0.95, 
                  decay_rate: float = 0.001, decay_interval: int = 100):
         self.exploration_rate = exploration_rate
         self.confidence_level = confidence_level
-        self.arm_stats = {}  # {arm_id: {'pulls': int, 'rewards': list, 'avg_reward': float}}
+        self.engine = UCB1Bandit(exploration=math.sqrt(2))
         self.decay_rate = decay_rate  # How much to decay rewards per interval
         self.decay_interval = decay_interval  # Apply decay every N pulls
         self.total_pulls = 0  # Track total pulls for decay timing
     
+    @property
+    def arm_stats(self) -> Dict[str, Dict]:
+        """{arm_id: {'pulls', 'avg_reward', 'confidence_interval'}} view of the engine arrays"""
+        return {arm_id: self.get_arm_performance(arm_id) for arm_id in self.engine.keys}
+    
     def add_arm(self, arm_id: str):
         """Add a new arm to the bandit"""
-        if arm_id not in self.arm_stats:
-            self.arm_stats[arm_id] = {
-                'pulls': 0,
-                'rewards': [],
-                'avg_reward': 0.0,
-                'confidence_interval': (0.0, 1.0)
-            }
+        self.engine.add_arm(arm_id)
     
     def calculate_time_decay_factor(self) -> float:
         """Calculate time decay factor based on total pulls"""
@@ -334,9 +331,6 @@ class MultiArmBandit:
     
     def update_arm(self, arm_id: str, reward: float):
         """Update arm statistics with new reward and apply time decay"""
-        if arm_id not in self.arm_stats:
-            self.add_arm(arm_id)
-        
         # Increment total pulls for decay calculation
         self.total_pulls += 1
         
@@ -345,21 +339,7 @@ class MultiArmBandit:
         
         # Apply time decay to the reward
         decayed_reward = reward * time_decay_factor
-        
-        stats = self.arm_stats[arm_id]
-        stats['pulls'] += 1
-        stats['rewards'].append(decayed_reward)
-        stats['avg_reward'] = np.mean(stats['rewards'])
-        
-        # Calculate confidence interval
-        if len(stats['rewards']) > 1:
-            std_err = np.std(stats['rewards']) / math.sqrt(len(stats['rewards']))
-            z_score = 1.96  # 95% confidence
-            margin = z_score * std_err
-            stats['confidence_interval'] = (
-                max(0, stats['avg_reward'] - margin),
-                min(1, stats['avg_reward'] + margin)
-            )
+        self.engine.update(arm_id, decayed_reward)
         
         # Log decay information periodically
         if self.total_pulls % self.decay_interval == 0:
@@ -371,32 +351,28 @@ class MultiArmBandit:
         Choose between explore (new template) or exploit (existing template)
         Returns: (action, arm_id)
         """
+        return self.choose_actions(available_arms, 1)[0]
+    
+    def choose_actions(self, available_arms: List[str], k: int) -> List[Tuple[str, str]]:
+        """
+        Choose actions for k slots at once: the top-k arms by UCB, each of which
+        is exploited unless the explore roll (or too few pulls) says otherwise
+        Returns: [(action, arm_id), ...] of length k
+        """
         if not available_arms:
-            return "explore", "new_template"
-        
-        # Add any new arms
-        for arm in available_arms:
-            self.add_arm(arm)
-        
-        # Calculate upper confidence bounds
-        ucb_values = {}
-        for arm_id in available_arms:
-            stats = self.arm_stats[arm_id]
-            if stats['pulls'] == 0:
-                ucb_values[arm_id] = float('inf')  # Prioritize unexplored arms
+            return [("explore", "new_template")] * k
+        
+        best_arms = self.engine.select(k, available_arms)
+        pulls = self.engine.pulls[self.engine.indices(best_arms)]
+        actions = []
+        for slot in range(k):
+            arm_id = best_arms[slot % len(best_arms)]
+            # Decide explore vs exploit based on exploration rate and arm performance
+            if random.random() < self.exploration_rate or pulls[slot % len(best_arms)] < 3:
+                actions.append(("explore", "new_template"))
             else:
-                # UCB1 formula with confidence interval
-                exploration_bonus = math.sqrt(2 * math.log(sum(s['pulls'] for s in self.arm_stats.values())) / stats['pulls'])
-                ucb_values[arm_id] = stats['avg_reward'] + exploration_bonus
-        
-        # Choose best arm based on UCB
-        best_arm = max(ucb_values.keys(), key=lambda x: ucb_values[x])
-        
-        # Decide explore vs exploit based on exploration rate and arm performance
-        if random.random() < self.exploration_rate or self.arm_stats[best_arm]['pulls'] < 3:
-            return "explore", "new_template"
-        else:
-            return "exploit", best_arm
+                actions.append(("exploit", arm_id))
+        return actions
     
     def choose_action_weighted(self, available_arms: List[str], performance_weights: List[float] = None) -> Tuple[str, str]:
         """
@@ -406,28 +382,20 @@ class MultiArmBandit:
         if not available_arms:
             return "explore", "new_template"
         
-        # Add any new arms
-        for arm in available_arms:
-            self.add_arm(arm)
-        
         # If no performance weights provided, use average rewards as weights
         if performance_weights is None:
-            weights = []
-            for arm_id in available_arms:
-                stats = self.arm_stats[arm_id]
-                # Use average reward as weight, with minimum weight of 0.1
-                weight = max(stats['avg_reward'], 0.1)
-                weights.append(weight)
+            # Use average reward as weight, with minimum weight of 0.1
+            weights = np.maximum(self.engine.means(self.engine.indices(available_arms)), 0.1)
         else:
-            weights = performance_weights
+            weights = np.asarray(performance_weights, dtype=float)
         
         # Normalize weights to probabilities
-        total_weight = sum(weights)
+        total_weight = weights.sum()
         if total_weight == 0:
             # If all weights are 0, use uniform selection
-            probabilities = [1.0 / len(available_arms)] * len(available_arms)
+            probabilities = np.full(len(available_arms), 1.0 / len(available_arms))
         else:
-            probabilities = [w / total_weight for w in weights]
+            probabilities = weights / total_weight
         
         # Weighted random selection
         selected_idx = random.choices(range(len(available_arms)), weights=probabilities)[0]
@@ -441,9 +409,28 @@ class MultiArmBandit:
     
     def get_arm_performance(self, arm_id: str) -> Dict:
         """Get performance statistics for an arm"""
-        if arm_id not in self.arm_stats:
+        if arm_id not in self.engine:
             return {'pulls': 0, 'avg_reward': 0.0, 'confidence_interval': (0.0, 1.0)}
-        return self.arm_stats[arm_id].copy()
+        stats = self.engine.stats(arm_id)
+        interval = (0.0, 1.0)
+        if stats['pulls'] > 1:
+            # 95% confidence interval
+            margin = 1.96 * stats['std'] / math.sqrt(stats['pulls'])
+            interval = (max(0, stats['avg_reward'] - margin), min(1, stats['avg_reward'] + margin))
+        return {
+            'pulls': int(stats['pulls']),
+            'avg_reward': stats['avg_reward'],
+            'confidence_interval': interval
+        }
+    
+    def save_state(self, path: str):
+        """Snapshot arm statistics to a .npz file"""
+        self.engine.snapshot(path, metadata={'total_pulls': self.total_pulls})
+    
+    def load_state(self, path: str):
+        """Restore arm statistics saved by save_state()"""
+        metadata = self.engine.restore(path)
+        self.total_pulls = metadata.get('total_pulls', self.total_pulls)
 
 def calculate_enhanced_reward(result: TemplateResult, time_decay_factor: float = 1.0) -> float:
     """
@@ -575,11 +562,13 @@ class EnhancedTemplateGeneratorV2:
     def __init__(self, credentials_path: str, ollama_model: str = "qwen2.5-coder:latest", max_concurrent: int = 8, 
                  progress_file: str = "template_progress_v2.json", results_file: str = "enhanced_results_v2.json"):
         """Initialize the enhanced template generator with TRUE CONCURRENT subprocess execution"""
-        self.sess = requests.Session()
         self.credentials_path = credentials_path
         self.ollama_model = ollama_model
         self.ollama_url = "http://127.0.0.1:11434"  # Default Ollama URL
         self.max_concurrent = min(max_concurrent, 8)  # WorldQuant Brain limit is 8
+        # One keep-alive pool for the simulation threads plus monitoring/PnL calls;
+        # concurrent 401s share a single re-login
+        self.sess = BrainSession(credentials_path, pool_size=self.max_concurrent * 2 + 4)
         self.progress_file = progress_file
         self.results_file = results_file
         self.progress_tracker = ProgressTracker()
@@ -754,6 +743,15 @@ class EnhancedTemplateGeneratorV2:
             'suspicion_scores': []
         }
         
+        # Local PnL cache: each alpha's series is downloaded once and reused by every check
+        self.pnl_store = PnLStore()
+        
+        # Simulation results by canonical template + settings: repeats are not re-simulated
+        self.result_cache = ResultCache()
+        
+        # Parsed data-field caches, shared by every generator in this process
+        self.field_registry = get_field_registry()
+        
         # Periodic cleanup system - clean up every 30 minutes
         self.cleanup_interval = 30 * 60  # 30 minutes in seconds
         self.last_cleanup_time = time.time()
@@ -854,24 +852,8 @@ class EnhancedTemplateGeneratorV2:
     def setup_auth(self):
         """Setup authentication for WorldQuant Brain API"""
         try:
-            with open(self.credentials_path, 'r') as f:
-                credentials = json.load(f)
-            
-            username = credentials[0]
-            password = credentials[1]
-            
-            # Authenticate with WorldQuant Brain
-            auth_response = self.sess.post(
-                'https://api.worldquantbrain.com/authentication',
-                auth=HTTPBasicAuth(username, password)
-            )
-            
-            if auth_response.status_code == 201:
-                logger.info("Authentication successful")
-            else:
-                logger.error(f"Authentication failed: {auth_response.status_code}")
-                raise Exception("Authentication failed")
-                
+            self.sess.login()
+            logger.info("Authentication successful")
         except Exception as e:
             logger.error(f"Failed to setup authentication: {e}")
             raise
@@ -907,7 +889,7 @@ class EnhancedTemplateGeneratorV2:
                 else:
                     raise ValueError(f"Unsupported HTTP method: {method}")
                 
-                # Check for 401 error
+                # The session already re-logged in once; a 401 here means that failed
                 if response.status_code == 401:
                     if attempt < max_retries - 1:
                         logger.warning(f"🔐 401 Unauthorized - Re-authenticating (attempt {attempt + 1}/{max_retries})")
@@ -1742,57 +1724,43 @@ Generate 3 PROFITABLE optimized alpha expressions:"""
                 break
     
     def get_data_fields_for_region(self, region: str, delay: int = 1) -> List[Dict]:
-        """Get data fields for a specific region and delay with local caching"""
+        """
+        Get data fields for a specific region and delay with local caching
+
+        Cached and freshly fetched fields come back in the same shape: plain
+        dicts with the keys the field registry keeps.
+        """
         try:
             # Check if we have cached data fields
             cache_key = f"{region}_{delay}"
             cache_file = f"data_fields_cache_{cache_key}.json"
             
             if os.path.exists(cache_file):
-                logger.info(f"Loading cached data fields for {region} delay={delay}")
-                with open(cache_file, 'r') as f:
-                    cached_data = json.load(f)
-                    logger.info(f"Loaded {len(cached_data)} cached fields for {region} delay={delay}")
-                    
-                    # Validate that cached data matches the expected parameters
-                    if cached_data:
-                        config = self.region_configs[region]
-                        matching_fields = []
-                        
-                        for field in cached_data:
-                            field_region = field.get('region', '')
-                            field_universe = field.get('universe', '')
-                            field_delay = field.get('delay', -1)
-                            
-                            # Only include fields that match ALL parameters exactly
-                            if (field_region == region and 
-                                field_universe == config.universe and 
-                                field_delay == delay):
-                                matching_fields.append(field)
-                        
-                        if len(matching_fields) == 0:
-                            logger.warning(f"⚠️ Cached data doesn't match expected parameters!")
-                            logger.warning(f"   Expected: region={region}, universe={config.universe}, delay={delay}")
-                            
-                            # Show what we actually have in cache
-                            if cached_data:
-                                sample_field = cached_data[0]
-                                logger.warning(f"   Cached field region: {sample_field.get('region', 'UNKNOWN')}")
-                                logger.warning(f"   Cached field universe: {sample_field.get('universe', 'UNKNOWN')}")
-                                logger.warning(f"   Cached field delay: {sample_field.get('delay', 'UNKNOWN')}")
-                            
-                            logger.warning(f"⚠️ Cache mismatch detected, will refetch data...")
-                            # Don't return cached data, let it refetch
-                        else:
-                            logger.info(f"✅ Cached data validation: {len(matching_fields)} fields match exact parameters")
-                            return matching_fields
-                    
-                    # If we get here, either no cached data or validation failed
-                    logger.error(f"🚨 CACHE VALIDATION FAILED: Cannot use cached data due to region mismatch!")
-                    logger.error(f"   Expected: region={region}, universe={config.universe}, delay={delay}")
-                    logger.error(f"   This could cause 'unknown variable' errors - will refetch from API")
-                    # DO NOT return cached data - force refetch to prevent cross-region contamination
-                    return []
+                # The registry parses the cache file once and keeps only the fields that
+                # match region, universe and delay exactly
+                config = self.region_configs[region]
+                table = self.field_registry.table(region, delay, config.universe)
+                if table:
+                    logger.debug(f"Using {len(table)} cached fields for {region} delay={delay}")
+                    return table.dicts()
+                
+                logger.warning(f"⚠️ Cached data doesn't match expected parameters!")
+                logger.warning(f"   Expected: region={region}, universe={config.universe}, delay={delay}")
+                
+                # Show what we actually have in cache
+                cached_table = self.field_registry.table(region, delay)
+                if cached_table:
+                    sample_field = cached_table.record_list[0]
+                    logger.warning(f"   Cached field region: {sample_field.get('region', 'UNKNOWN')}")
+                    logger.warning(f"   Cached field universe: {sample_field.get('universe', 'UNKNOWN')}")
+                    logger.warning(f"   Cached field delay: {sample_field.get('delay', 'UNKNOWN')}")
+                
+                # If we get here, either no cached data or validation failed
+                logger.error(f"🚨 CACHE VALIDATION FAILED: Cannot use cached data due to region mismatch!")
+                logger.error(f"   Expected: region={region}, universe={config.universe}, delay={delay}")
+                logger.error(f"   This could cause 'unknown variable' errors - will refetch from API")
+                # DO NOT return cached data - force refetch to prevent cross-region contamination
+                return []
             
             logger.info(f"No cache found for {region} delay={delay}, fetching from API...")
             config = self.region_configs[region]
@@ -1915,7 +1883,7 @@ Generate 3 PROFITABLE optimized alpha expressions:"""
             except Exception as cache_error:
                 logger.warning(f"Failed to cache data fields: {cache_error}")
             
-            return field_list
+            return FieldTable.from_fields(region, delay, config.universe, field_list).dicts()
             
         except Exception as e:
             logger.error(f"Failed to get data fields for region {region}: {e}")
@@ -1940,6 +1908,19 @@ Generate 3 PROFITABLE optimized alpha expressions:"""
                 os.remove(cache_file)
                 logger.info(f"Cleared cache file: {cache_file}")
             logger.info(f"Cleared {len(cache_files)} cache files")
+        if region and delay is not None:
+            self.field_registry.invalidate(region, delay)
+        else:
+            self.field_registry.invalidate()
+    
+    def _cached_field_table(self, region: str, delay: int) -> FieldTable:
+        """Every field in data_fields_cache_{region}_{delay}.json, parsed once (empty if missing)"""
+        try:
+            table = self.field_registry.table(region, delay)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to load {region} cache: {e}")
+            table = None
+        return table if table is not None else FieldTable.from_fields(region, delay, None, [])
     
     def get_cache_info(self):
         """Get information about cached data fields"""
@@ -3334,25 +3315,11 @@ RESPONSE FORMAT (return only the expression, no prefixes):
         
         if region and delay is not None:
             # Use the specific region and delay
-            cache_file = f"data_fields_cache_{region}_{delay}.json"
-            if os.path.exists(cache_file):
-                try:
-                    with open(cache_file, 'r') as f:
-                        fields_data = json.load(f)
-                        for field in fields_data:
-                            if field.get('type') in ['REGULAR', 'MATRIX']:  # Only non-VECTOR fields
-                                available_fields.append(field)
-                    
-                    # Sort by usage (lowest usage first) - prioritize underused fields
-                    def get_usage_score(field):
-                        user_count = field.get('userCount', 0)
-                        alpha_count = field.get('alphaCount', 0)
-                        return user_count + alpha_count
-                    
-                    available_fields.sort(key=get_usage_score)
-                    logger.info(f"🔧 REGION-SPECIFIC FIX: Using {len(available_fields)} replacement fields from {region} delay={delay} (sorted by usage)")
-                except Exception as e:
-                    logger.warning(f"⚠️ Failed to load {region} cache: {e}")
+            field_table = self._cached_field_table(region, delay)
+            if field_table:
+                # Only non-VECTOR fields, lowest usage first - prioritize underused fields
+                available_fields = field_table.by_usage(type=['REGULAR', 'MATRIX'])
+                logger.info(f"🔧 REGION-SPECIFIC FIX: Using {len(available_fields)} replacement fields from {region} delay={delay} (sorted by usage)")
         else:
             logger.warning(f"⚠️ No region/delay specified, skipping field replacement")
             return template
@@ -3421,17 +3388,8 @@ RESPONSE FORMAT:
             if indices:
                 logger.info(f"🔧 OLLAMA SELECTED INDICES: {indices}")
                 
-                # Get field types to identify VECTOR fields
-                field_types = {}
-                cache_file = f"data_fields_cache_{region}_{delay}.json"
-                if os.path.exists(cache_file):
-                    try:
-                        with open(cache_file, 'r') as f:
-                            fields_data = json.load(f)
-                            for field in fields_data:
-                                field_types[field['id']] = field.get('type', 'REGULAR')
-                    except:
-                        pass
+                # Field types identify the VECTOR fields
+                field_table = self._cached_field_table(region, delay)
                 
                 # Replace VECTOR fields with selected MATRIX/REGULAR fields
                 field_pattern = r'\b([a-zA-Z_][a-zA-Z0-9_]*)\b'
@@ -3439,7 +3397,7 @@ RESPONSE FORMAT:
                 
                 replacement_count = 0
                 for word in all_words:
-                    if word in field_types and field_types[word] == 'VECTOR' and replacement_count < len(indices):
+                    if field_table.field_type(word) == 'VECTOR' and replacement_count < len(indices):
                         replacement_field = available_fields[indices[replacement_count]]['id']
                         template = template.replace(word, replacement_field)
                         logger.info(f"🔧 SMART REPLACEMENT: {word} -> {replacement_field} (index {indices[replacement_count]})")
@@ -3461,16 +3419,7 @@ RESPONSE FORMAT:
         import re
         
         # Get field types from the specific region cache
-        field_types = {}
-        cache_file = f"data_fields_cache_{region}_{delay}.json"
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'r') as f:
-                    fields_data = json.load(f)
-                    for field in fields_data:
-                        field_types[field['id']] = field.get('type', 'REGULAR')
-            except:
-                return False
+        field_table = self._cached_field_table(region, delay)
         
         # Extract all field references from template
         field_pattern = r'\b([a-zA-Z_][a-zA-Z0-9_]*)\b'
@@ -3481,8 +3430,8 @@ RESPONSE FORMAT:
         event_indicators = ['event', 'sentiment', 'news', 'novelty', 'relevance', 'confidence']
         
         for word in all_words:
-            if word in field_types:
-                field_type = field_types[word]
+            if word in field_table:
+                field_type = field_table.field_type(word, 'REGULAR')
                 if field_type == 'VECTOR':
                     # Check for incompatible operators
                     for op in incompatible_ops:
@@ -3498,17 +3447,8 @@ RESPONSE FORMAT:
     def _ollama_field_replacement(self, template: str, region: str, delay: int) -> str:
         """Send template back to Ollama for field replacement"""
         # Get available fields from the specific region
-        cache_file = f"data_fields_cache_{region}_{delay}.json"
-        available_fields = []
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'r') as f:
-                    fields_data = json.load(f)
-                    for field in fields_data:
-                        if field.get('type') in ['REGULAR', 'MATRIX']:  # Only non-VECTOR fields
-                            available_fields.append(field['id'])
-            except:
-                pass
+        field_table = self._cached_field_table(region, delay)
+        available_fields = field_table.ids(type=['REGULAR', 'MATRIX'])  # Only non-VECTOR fields
         
         if not available_fields:
             logger.warning(f"⚠️ No replacement fields available for {region}")
@@ -3556,21 +3496,9 @@ RESPONSE FORMAT: Answer with only "YES" or "NO"
                     field_pattern = r'\b([a-zA-Z_][a-zA-Z0-9_]*)\b'
                     all_words = re.findall(field_pattern, template)
                     
-                    # Get field types to identify VECTOR fields
-                    field_types = {}
-                    cache_file = f"data_fields_cache_{region}_{delay}.json"
-                    if os.path.exists(cache_file):
-                        try:
-                            with open(cache_file, 'r') as f:
-                                fields_data = json.load(f)
-                                for field in fields_data:
-                                    field_types[field['id']] = field.get('type', 'REGULAR')
-                        except:
-                            pass
-                    
                     # Replace first VECTOR field with first available MATRIX/REGULAR field
                     for word in all_words:
-                        if word in field_types and field_types[word] == 'VECTOR':
+                        if field_table.field_type(word) == 'VECTOR':
                             replacement_field = available_fields[0]
                             content = template.replace(word, replacement_field)
                             logger.info(f"🔧 AUTOMATIC REPLACEMENT: {word} -> {replacement_field}")
@@ -3619,16 +3547,9 @@ RESPONSE FORMAT: Answer with only "YES" or "NO"
     def _get_field_type(self, field_id: str) -> str:
         """Get field type from data fields cache"""
         for region in ['USA', 'GLB', 'EUR', 'ASI', 'CHN']:
-            try:
-                cache_file = f"data_fields_cache_{region}_0.json"
-                if os.path.exists(cache_file):
-                    with open(cache_file, 'r') as f:
-                        fields_data = json.load(f)
-                        for field in fields_data:
-                            if field['id'] == field_id:
-                                return field.get('type', 'REGULAR')
-            except:
-                continue
+            field_table = self._cached_field_table(region, 0)
+            if field_id in field_table:
+                return field_table.field_type(field_id, 'REGULAR')
         return 'REGULAR'  # Default to REGULAR if not found
     
     def _get_matrix_field_suggestions(self, vector_field_id: str) -> List[str]:
@@ -3637,20 +3558,12 @@ RESPONSE FORMAT: Answer with only "YES" or "NO"
         vector_prefix = vector_field_id.split('_')[0]  # Get prefix like 'anl4', 'anl10', etc.
         
         for region in ['USA', 'GLB', 'EUR', 'ASI', 'CHN']:
-            try:
-                cache_file = f"data_fields_cache_{region}_0.json"
-                if os.path.exists(cache_file):
-                    with open(cache_file, 'r') as f:
-                        fields_data = json.load(f)
-                        for field in fields_data:
-                            if field.get('type') == 'MATRIX':
-                                # Prefer fields with similar prefix or from same category
-                                if vector_prefix in field['id'] or field['id'].split('_')[0] in vector_prefix:
-                                    matrix_fields.append(field['id'])
-                                elif len(matrix_fields) < 10:  # Keep some general MATRIX fields as backup
-                                    matrix_fields.append(field['id'])
-            except:
-                continue
+            for field_id in self._cached_field_table(region, 0).ids(type='MATRIX'):
+                # Prefer fields with similar prefix or from same category
+                if vector_prefix in field_id or field_id.split('_')[0] in vector_prefix:
+                    matrix_fields.append(field_id)
+                elif len(matrix_fields) < 10:  # Keep some general MATRIX fields as backup
+                    matrix_fields.append(field_id)
         
         return matrix_fields[:5]  # Return top 5 suggestions
     
@@ -3825,45 +3738,16 @@ RESPONSE FORMAT: Answer with only "YES" or "NO"
         import re
         
         # Get available VECTOR fields from the specific region cache
-        vector_fields = []
-        cache_file = f"data_fields_cache_{region}_{delay}.json"
-        
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    fields_data = json.load(f)
-                    for field in fields_data:
-                        if field.get('type') == 'VECTOR':
-                            vector_fields.append(field)
-                
-                # Sort by usage (lowest usage first) - prioritize underused fields
-                def get_usage_score(field):
-                    user_count = field.get('userCount', 0)
-                    alpha_count = field.get('alphaCount', 0)
-                    return user_count + alpha_count
-                
-                vector_fields.sort(key=get_usage_score)
-                logger.info(f"🔧 VEC OPERATORS DETECTED: Found {len(vector_fields)} VECTOR fields for MATRIX replacement in {region}")
-                
-            except Exception as e:
-                logger.warning(f"⚠️ Failed to load {region} cache: {e}")
-                return template
+        field_table = self._cached_field_table(region, delay)
+        # Sort by usage (lowest usage first) - prioritize underused fields
+        vector_fields = field_table.by_usage(type='VECTOR')
+        if field_table:
+            logger.info(f"🔧 VEC OPERATORS DETECTED: Found {len(vector_fields)} VECTOR fields for MATRIX replacement in {region}")
         
         if not vector_fields:
             logger.warning(f"⚠️ No VECTOR fields available for {region}")
             return template
         
-        # Get field types to identify MATRIX fields
-        field_types = {}
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    fields_data = json.load(f)
-                    for field in fields_data:
-                        field_types[field['id']] = field.get('type', 'REGULAR')
-            except:
-                pass
-        
         # Find all fields in the template
         field_pattern = r'\b([a-zA-Z_][a-zA-Z0-9_]*)\b'
         all_words = re.findall(field_pattern, template)
@@ -3871,7 +3755,7 @@ RESPONSE FORMAT: Answer with only "YES" or "NO"
         # Replace only MATRIX fields with VECTOR fields
         replacement_count = 0
         for word in all_words:
-            if word in field_types and field_types[word] == 'MATRIX' and replacement_count < len(vector_fields):
+            if field_table.field_type(word) == 'MATRIX' and replacement_count < len(vector_fields):
                 replacement_field = vector_fields[replacement_count]['id']
                 template = template.replace(word, replacement_field)
                 logger.info(f"🔧 MATRIX->VECTOR REPLACEMENT: {word} -> {replacement_field} (due to vec_* operators)")
@@ -3890,24 +3774,12 @@ RESPONSE FORMAT: Answer with only "YES" or "NO"
         
         # Get available MATRIX fields from the specific region cache
         matrix_fields = []
-        cache_file = f"data_fields_cache_{region}_{delay}.json"
+        field_table = self._cached_field_table(region, delay)
         
-        if os.path.exists(cache_file):
+        if field_table:
             try:
-                with open(cache_file, 'r') as f:
-                    fields_data = json.load(f)
-                    for field in fields_data:
-                        if field.get('type') == 'MATRIX':
-                            matrix_fields.append(field)
-                
-                # Apply balanced selection for matrix fields
-                def get_usage_score(field):
-                    user_count = field.get('userCount', 0)
-                    alpha_count = field.get('alphaCount', 0)
-                    return user_count + alpha_count
-                
-                # Sort and categorize matrix fields by usage
-                matrix_fields.sort(key=get_usage_score)
+                # Sort and categorize matrix fields by usage, then apply balanced selection
+                matrix_fields = field_table.by_usage(type='MATRIX')
                 total_matrix_fields = len(matrix_fields)
                 
                 if total_matrix_fields > 0:
@@ -3949,17 +3821,6 @@ RESPONSE FORMAT: Answer with only "YES" or "NO"
             logger.warning(f"⚠️ No MATRIX fields available for {region}")
             return template
         
-        # Get field types to identify VECTOR fields
-        field_types = {}
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'r') as f:
-                    fields_data = json.load(f)
-                    for field in fields_data:
-                        field_types[field['id']] = field.get('type', 'REGULAR')
-            except:
-                pass
-        
         # Find all fields in the template
         field_pattern = r'\b([a-zA-Z_][a-zA-Z0-9_]*)\b'
         all_words = re.findall(field_pattern, template)
@@ -3967,7 +3828,7 @@ RESPONSE FORMAT: Answer with only "YES" or "NO"
         # Replace only VECTOR fields with MATRIX fields
         replacement_count = 0
         for word in all_words:
-            if word in field_types and field_types[word] == 'VECTOR' and replacement_count < len(matrix_fields):
+            if field_table.field_type(word) == 'VECTOR' and replacement_count < len(matrix_fields):
                 replacement_field = matrix_fields[replacement_count]['id']
                 template = template.replace(word, replacement_field)
                 logger.info(f"🔧 VECTOR->MATRIX REPLACEMENT: {word} -> {replacement_field} (due to non-vec_* operators)")
@@ -3986,24 +3847,12 @@ RESPONSE FORMAT: Answer with only "YES" or "NO"
         
         # Get available MATRIX fields from the specific region cache
         matrix_fields = []
-        cache_file = f"data_fields_cache_{region}_{delay}.json"
+        field_table = self._cached_field_table(region, delay)
         
-        if os.path.exists(cache_file):
+        if field_table:
             try:
-                with open(cache_file, 'r') as f:
-                    fields_data = json.load(f)
-                    for field in fields_data:
-                        if field.get('type') == 'MATRIX':
-                            matrix_fields.append(field)
-                
-                # Apply balanced selection for matrix fields
-                def get_usage_score(field):
-                    user_count = field.get('userCount', 0)
-                    alpha_count = field.get('alphaCount', 0)
-                    return user_count + alpha_count
-                
-                # Sort and categorize matrix fields by usage
-                matrix_fields.sort(key=get_usage_score)
+                # Sort and categorize matrix fields by usage, then apply balanced selection
+                matrix_fields = field_table.by_usage(type='MATRIX')
                 total_matrix_fields = len(matrix_fields)
                 
                 if total_matrix_fields > 0:
@@ -4045,17 +3894,6 @@ RESPONSE FORMAT: Answer with only "YES" or "NO"
             logger.warning(f"⚠️ No MATRIX fields available for {region}")
             return template
         
-        # Get field types to identify all data fields
-        field_types = {}
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'r') as f:
-                    fields_data = json.load(f)
-                    for field in fields_data:
-                        field_types[field['id']] = field.get('type', 'REGULAR')
-            except:
-                pass
-        
         # Find all data fields in the template
         field_pattern = r'\b([a-zA-Z_][a-zA-Z0-9_]*)\b'
         all_words = re.findall(field_pattern, template)
@@ -4063,7 +3901,7 @@ RESPONSE FORMAT: Answer with only "YES" or "NO"
         # Replace all data fields with MATRIX fields
         replacement_count = 0
         for word in all_words:
-            if word in field_types and field_types[word] in ['REGULAR', 'VECTOR'] and replacement_count < len(matrix_fields):
+            if word in field_table and field_table.field_type(word, 'REGULAR') in ['REGULAR', 'VECTOR'] and replacement_count < len(matrix_fields):
                 replacement_field = matrix_fields[replacement_count]['id']
                 template = template.replace(word, replacement_field)
                 logger.info(f"🔧 ARITHMETIC REPLACEMENT: {word} -> {replacement_field} (MATRIX field)")
@@ -4517,84 +4355,49 @@ RESPONSE FORMAT (return only the expression, no prefixes):
     def _is_pnl_flatline(self, alpha_details: dict) -> bool:
         """Detect if PnL is actually flatline based on PnL data analysis"""
         try:
-            # Get PnL data from alpha details
-            pnl_data = alpha_details.get('pnl', {})
-            if not pnl_data:
-                logger.warning("🔍 NO PnL DATA AVAILABLE - cannot check for flatline")
-                return False
-            
-            # Extract PnL values (assuming it's a time series of PnL values)
-            pnl_values = pnl_data.get('values', [])
-            if not pnl_values or len(pnl_values) < 10:  # Need sufficient data points
+            # PnL values embedded in the alpha details, else the series from the local PnL store
+            pnl_values = (alpha_details.get('pnl') or {}).get('values', [])
+            if pnl_values:
+                try:
+                    pnl_series = np.array([float(x) for x in pnl_values if x is not None], dtype=np.float32)
+                except (ValueError, TypeError):
+                    logger.warning("🔍 INVALID PnL DATA FORMAT - cannot check for flatline")
+                    return False
+            else:
+                alpha_id = alpha_details.get('id')
+                if not alpha_id:
+                    logger.warning("🔍 NO PnL DATA AVAILABLE - cannot check for flatline")
+                    return False
+                pnl_series, reason = self._fetch_pnl_series(alpha_id)
+                if pnl_series is None:
+                    logger.warning(f"🔍 NO PnL DATA AVAILABLE - cannot check for flatline: {reason}")
+                    return False
+            
+            if len(pnl_series) < 10:  # Need sufficient data points
                 logger.warning("🔍 INSUFFICIENT PnL DATA - cannot check for flatline")
                 return False
             
-            # Convert to float if needed
-            try:
-                pnl_float_values = [float(x) for x in pnl_values if x is not None]
-            except (ValueError, TypeError):
-                logger.warning("🔍 INVALID PnL DATA FORMAT - cannot check for flatline")
-                return False
-            
-            if len(pnl_float_values) < 10:
-                logger.warning("🔍 INSUFFICIENT VALID PnL DATA - cannot check for flatline")
-                return False
-            
             # Analyze PnL for flatline patterns
-            return self._analyze_pnl_flatline_pattern(pnl_float_values)
+            return self._analyze_pnl_flatline_pattern(pnl_series)
             
         except Exception as e:
             logger.error(f"❌ FAILED TO CHECK PnL FLATLINE: {e}")
             return False
     
-    def _analyze_pnl_flatline_pattern(self, pnl_values: list) -> bool:
+    def _analyze_pnl_flatline_pattern(self, pnl_values) -> bool:
         """Analyze PnL values for flatline patterns"""
         try:
             if len(pnl_values) < 10:
                 return False
             
-            # Calculate PnL statistics
-            pnl_min = min(pnl_values)
-            pnl_max = max(pnl_values)
-            pnl_range = pnl_max - pnl_min
-            pnl_mean = sum(pnl_values) / len(pnl_values)
-            pnl_std = (sum((x - pnl_mean) ** 2 for x in pnl_values) / len(pnl_values)) ** 0.5
-            
-            # FLATLINE DETECTION CRITERIA:
-            
-            # 1. Very small range (PnL barely changes)
-            if pnl_range < 0.001:  # Less than 0.1% range
-                logger.warning(f"🔴 PnL FLATLINE: Range={pnl_range:.6f} < 0.001")
-                return True
-            
-            # 2. Very low standard deviation (no volatility)
-            if pnl_std < 0.0001:  # Less than 0.01% std dev
-                logger.warning(f"🔴 PnL FLATLINE: StdDev={pnl_std:.6f} < 0.0001")
-                return True
-            
-            # 3. All values are essentially the same (within 0.01%)
-            pnl_variance = max(pnl_values) - min(pnl_values)
-            if pnl_variance < 0.0001:  # Less than 0.01% variance
-                logger.warning(f"🔴 PnL FLATLINE: Variance={pnl_variance:.6f} < 0.0001")
-                return True
-            
-            # 4. Check for constant PnL (all values within 0.001% of mean)
-            tolerance = abs(pnl_mean) * 0.00001  # 0.001% of mean
-            if tolerance < 0.000001:  # Minimum tolerance
-                tolerance = 0.000001
-            
-            constant_values = sum(1 for x in pnl_values if abs(x - pnl_mean) <= tolerance)
-            if constant_values >= len(pnl_values) * 0.95:  # 95% of values are constant
-                logger.warning(f"🔴 PnL FLATLINE: {constant_values}/{len(pnl_values)} values constant within {tolerance:.6f}")
+            stats = pnl_statistics([np.asarray(pnl_values, dtype=np.float32)])
+            flatlined, reasons = flatline_pattern(stats)
+            if flatlined[0]:
+                logger.warning(f"🔴 PnL FLATLINE: {reasons[0]}")
                 return True
             
-            # 5. Check for zero or near-zero PnL throughout
-            near_zero_count = sum(1 for x in pnl_values if abs(x) < 0.0001)
-            if near_zero_count >= len(pnl_values) * 0.9:  # 90% of values near zero
-                logger.warning(f"🔴 PnL FLATLINE: {near_zero_count}/{len(pnl_values)} values near zero")
-                return True
-            
-            logger.info(f"✅ PnL NOT FLATLINE: Range={pnl_range:.6f}, StdDev={pnl_std:.6f}, Variance={pnl_variance:.6f}")
+            logger.info(f"✅ PnL NOT FLATLINE: Range={stats['range'][0]:.6f}, StdDev={stats['population_std'][0]:.6f}, "
+                        f"MaxDrawdown={stats['max_drawdown'][0]:.6f}")
             return False
             
         except Exception as e:
@@ -6715,6 +6518,7 @@ These are actual submitted alphas with real performance metrics. Use them as ins
         logger.info(f"Created {len(template_pools)} pools of size {pool_size}")
         
         all_results = []
+        submitted_keys = set()  # Templates of this batch already submitted (canonical form + settings)
         
         for pool_idx, pool in enumerate(template_pools):
             logger.info(f"Processing pool {pool_idx + 1}/{len(template_pools)} with {len(pool)} templates")
@@ -6722,9 +6526,22 @@ These are actual submitted alphas with real performance metrics. Use them as ins
             # Submit all templates in this pool
             progress_urls = []
             template_mapping = {}  # Map progress URLs to templates
+            repeats = []  # Equivalent to a template submitted earlier in this batch
             
             for template_idx, template_data in enumerate(pool):
                 template = template_data['template']
+                
+                cached = self._cached_template_result(template, settings)
+                if cached is not None:
+                    logger.info(f"♻️ RESULT CACHE: Equivalent template already simulated, skipping: {template[:60]}")
+                    all_results.append(cached)
+                    continue
+                key = result_key(template, settings)
+                if key in submitted_keys:
+                    repeats.append(template_data)
+                    continue
+                submitted_keys.add(key)
+                
                 logger.info(f"Submitting template {template_idx + 1}/{len(pool)} in pool {pool_idx + 1}")
                 
                 # NO SIMULATION BLOCKING - Let WorldQuant Brain handle validation
@@ -6770,14 +6587,36 @@ These are actual submitted alphas with real performance metrics. Use them as ins
                 # Save progress after each pool
                 self.save_progress()
             
+            # Repeats share the result of the template they are equivalent to
+            for template_data in repeats:
+                cached = self._cached_template_result(template_data['template'], settings)
+                if cached is not None:
+                    all_results.append(cached)
+            
             # Wait between pools to avoid overwhelming the API
             if pool_idx + 1 < len(template_pools):
                 logger.info(f"Waiting 30 seconds before next pool...")
                 time.sleep(30)
         
         logger.info(f"Multi-simulation complete: {len(all_results)} results")
+        self.result_cache.log_stats()
         return all_results
     
+    def _cached_template_result(self, template: str, settings) -> Optional[TemplateResult]:
+        """Result of an equivalent template already simulated with these settings, or None"""
+        stored = self.result_cache.get(template, settings)
+        if stored is None:
+            return None
+        stored['settings'] = SimulationSettings(**stored['settings'])
+        stored['template'] = template
+        return TemplateResult(**stored)
+    
+    def _remember_result(self, settings, result: TemplateResult, status: str = 'COMPLETE') -> TemplateResult:
+        """Cache a result the platform reported with this status under its template and settings (see is_cacheable)"""
+        if settings is not None:
+            self.result_cache.put(result.template, settings, asdict(result), status=status, message=result.error_message)
+        return result
+    
     def _monitor_pool_progress(self, progress_urls: List[str], template_mapping: Dict[str, Dict], settings: SimulationSettings) -> List[TemplateResult]:
         """Monitor progress for a pool of simulations"""
         results = []
@@ -6788,6 +6627,7 @@ These are actual submitted alphas with real performance metrics. Use them as ins
             logger.info(f"Monitoring {len(progress_urls)} simulations in pool...")
             
             completed_urls = []
+            finished = []
             
             for progress_url in progress_urls:
                 try:
@@ -6858,75 +6698,21 @@ These are actual submitted alphas with real performance metrics. Use them as ins
                                 shortCount > 0  # Has short positions
                             )
                             
-                            # Check PnL data quality for successful simulations
-                            pnl_quality_ok = True
-                            if has_meaningful_metrics:
-                                pnl_quality_ok = self.track_template_quality(template_data['template'], alpha_id, sharpe, fitness, margin)
-                            
-                            # Only consider truly successful if both metrics and PnL quality are good
-                            is_truly_successful = has_meaningful_metrics and pnl_quality_ok
-                            
-                            result = TemplateResult(
-                                template=template_data['template'],
-                                region=template_data['region'],
-                                settings=settings,
-                                sharpe=sharpe,
-                                fitness=fitness if fitness is not None else 0,
-                                turnover=turnover,
-                                returns=returns,
-                                drawdown=drawdown,
-                                margin=margin,
-                                longCount=longCount,
-                                shortCount=shortCount,
-                                success=is_truly_successful,
-                                neutralization=settings.neutralization,
-                                timestamp=time.time()
-                            )
-                            results.append(result)
+                            # Screened together with the rest of this pass below
+                            finished.append((template_data, alpha_id, sharpe, fitness, turnover, returns,
+                                             drawdown, margin, longCount, shortCount, has_meaningful_metrics))
                             completed_urls.append(progress_url)
                             
-                            # Update progress tracker
-                            self.progress_tracker.update_simulation_progress(is_truly_successful, result.sharpe, result.template)
-                            
-                            # Check if this alpha qualifies for optimization
-                            if is_truly_successful:
-                                # Track operator usage for diversity
-                                self.track_operator_usage(template_data['template'])
-                                self.add_to_optimization_queue(result)
-                                logger.info(f"✅ Template simulation completed successfully: {template_data['template'][:50]}...")
-                                logger.info(f"📊 Alpha {alpha_id} Performance: Sharpe={sharpe}, Fitness={fitness}, Turnover={turnover}, Returns={returns}")
-                                logger.info(f"📊 Alpha {alpha_id} Positions: Long={longCount}, Short={shortCount}")
-                                logger.info(f"📊 Alpha {alpha_id} PnL Quality: Good")
-                                
-                                # Update exploitation bandit if in exploitation phase
-                                if self.exploitation_phase and template_data.get('exploitation', False):
-                                    original_sharpe = template_data.get('original_sharpe', 0)
-                                    self.update_exploitation_bandit(result, original_sharpe)
-                                    logger.info(f"🎯 Exploitation result: Original Sharpe={original_sharpe:.3f}, New Sharpe={result.sharpe:.3f}")
-                            
-                            # Update simulation count and check for phase switch
-                            self.update_simulation_count()
-                        else:
-                            if has_meaningful_metrics and not pnl_quality_ok:
-                                logger.info(f"⚠️ Template simulation completed with good metrics but poor PnL quality: {template_data['template'][:50]}...")
-                                logger.info(f"📊 Alpha {alpha_id} Values: Sharpe={sharpe}, Fitness={fitness}, Turnover={turnover}, Returns={returns}")
-                                logger.info(f"📊 Alpha {alpha_id} PnL Quality: Poor - No reward given")
-                            else:
-                                logger.info(f"⚠️ Template simulation completed but with zero/meaningless values: {template_data['template'][:50]}...")
-                                logger.info(f"📊 Alpha {alpha_id} Values: Sharpe={sharpe}, Fitness={fitness}, Turnover={turnover}, Returns={returns}")
-                                logger.info(f"📊 Alpha {alpha_id} Positions: Long={longCount}, Short={shortCount}")
-                                logger.info(f"📊 Alpha {alpha_id} Success criteria: has_meaningful_metrics={has_meaningful_metrics}")
-                            
                     elif status in ['FAILED', 'ERROR']:
                         template_data = template_mapping[progress_url]
-                        result = TemplateResult(
+                        result = self._remember_result(settings, TemplateResult(
                             template=template_data['template'],
                             region=template_data['region'],
                             settings=settings,
                             success=False,
                             error_message=data.get('message', 'Unknown error'),
                             timestamp=time.time()
-                        )
+                        ), status)
                         results.append(result)
                         completed_urls.append(progress_url)
                         
@@ -6941,6 +6727,77 @@ These are actual submitted alphas with real performance metrics. Use them as ins
                     logger.error(f"Error monitoring progress URL {progress_url}: {str(e)}")
                     continue
             
+            # One PnL screening pass for every alpha that completed with meaningful metrics
+            pnl_verdicts = self.check_pnl_data_quality_batch([
+                (alpha_id, sharpe, fitness, margin)
+                for _, alpha_id, sharpe, fitness, _, _, _, margin, _, _, has_meaningful_metrics in finished
+                if has_meaningful_metrics
+            ])
+            
+            for (template_data, alpha_id, sharpe, fitness, turnover, returns,
+                 drawdown, margin, longCount, shortCount, has_meaningful_metrics) in finished:
+                try:
+                    # Check PnL data quality for successful simulations
+                    pnl_quality_ok = True
+                    if has_meaningful_metrics:
+                        pnl_quality_ok = self.track_template_quality(template_data['template'], alpha_id, sharpe, fitness, margin,
+                                                                     pnl_quality=pnl_verdicts.get(alpha_id))
+                    
+                    # Only consider truly successful if both metrics and PnL quality are good
+                    is_truly_successful = has_meaningful_metrics and pnl_quality_ok
+                    
+                    result = self._remember_result(settings, TemplateResult(
+                        template=template_data['template'],
+                        region=template_data['region'],
+                        settings=settings,
+                        sharpe=sharpe,
+                        fitness=fitness if fitness is not None else 0,
+                        turnover=turnover,
+                        returns=returns,
+                        drawdown=drawdown,
+                        margin=margin,
+                        longCount=longCount,
+                        shortCount=shortCount,
+                        success=is_truly_successful,
+                        neutralization=settings.neutralization,
+                        alpha_id=alpha_id,
+                        timestamp=time.time()
+                    ))
+                    results.append(result)
+                    
+                    # Update progress tracker
+                    self.progress_tracker.update_simulation_progress(is_truly_successful, result.sharpe, result.template)
+                    
+                    # Check if this alpha qualifies for optimization
+                    if is_truly_successful:
+                        # Track operator usage for diversity
+                        self.track_operator_usage(template_data['template'])
+                        self.add_to_optimization_queue(result)
+                        logger.info(f"✅ Template simulation completed successfully: {template_data['template'][:50]}...")
+                        logger.info(f"📊 Alpha {alpha_id} Performance: Sharpe={sharpe}, Fitness={fitness}, Turnover={turnover}, Returns={returns}")
+                        logger.info(f"📊 Alpha {alpha_id} Positions: Long={longCount}, Short={shortCount}")
+                        logger.info(f"📊 Alpha {alpha_id} PnL Quality: Good")
+                    
+                        # Update exploitation bandit if in exploitation phase
+                        if self.exploitation_phase and template_data.get('exploitation', False):
+                            original_sharpe = template_data.get('original_sharpe', 0)
+                            self.update_exploitation_bandit(result, original_sharpe)
+                            logger.info(f"🎯 Exploitation result: Original Sharpe={original_sharpe:.3f}, New Sharpe={result.sharpe:.3f}")
+                    elif has_meaningful_metrics and not pnl_quality_ok:
+                        logger.info(f"⚠️ Template simulation completed with good metrics but poor PnL quality: {template_data['template'][:50]}...")
+                        logger.info(f"📊 Alpha {alpha_id} Values: Sharpe={sharpe}, Fitness={fitness}, Turnover={turnover}, Returns={returns}")
+                        logger.info(f"📊 Alpha {alpha_id} PnL Quality: Poor - No reward given")
+                    else:
+                        logger.info(f"⚠️ Template simulation completed but with zero/meaningless values: {template_data['template'][:50]}...")
+                        logger.info(f"📊 Alpha {alpha_id} Values: Sharpe={sharpe}, Fitness={fitness}, Turnover={turnover}, Returns={returns}")
+                        logger.info(f"📊 Alpha {alpha_id} Positions: Long={longCount}, Short={shortCount}")
+                        logger.info(f"📊 Alpha {alpha_id} Success criteria: has_meaningful_metrics={has_meaningful_metrics}")
+                    
+                    # Update simulation count and check for phase switch
+                    self.update_simulation_count()
+                except Exception as e:
+                    logger.error(f"Error recording pool result for alpha {alpha_id}: {str(e)}")
+            
             # Remove completed URLs safely
             for url in completed_urls:
                 if url in progress_urls:
@@ -7333,20 +7190,8 @@ These are actual submitted alphas with real performance metrics. Use them as ins
         Returns: (is_good_quality, reason)
         """
         try:
-            # Determine if we should check PnL based on suspicion score
-            should_check, check_reason = self._should_check_pnl(sharpe, fitness, margin)
-            
-            if not should_check:
-                # Skip PnL check for low suspicion alphas
-                self.pnl_check_stats['skipped_checks'] += 1
-                return True, f"Skipped PnL check - {check_reason}"
-            
-            # Track that we're doing a PnL check
-            self.pnl_check_stats['total_checks'] += 1
-            logger.info(f"🔍 Checking PnL for alpha {alpha_id}: {check_reason}")
-            
-            # Try to fetch PnL data with exponential backoff retry
-            return self._fetch_pnl_with_retry(alpha_id)
+            # Suspicion-based sampling, fetch (or cache hit) and screening for a pool of one
+            return self.check_pnl_data_quality_batch([(alpha_id, sharpe, fitness, margin)])[alpha_id]
             
         except Exception as e:
             logger.error(f"❌ PnL quality check failed: {str(e)}")
@@ -7358,6 +7203,17 @@ These are actual submitted alphas with real performance metrics. Use them as ins
         Fetch PnL data with exponential backoff retry
         Returns: (is_good_quality, reason)
         """
+        return self.screen_pnl_pool([alpha_id], max_retries=max_retries)[alpha_id]
+    
+    def _fetch_pnl_series(self, alpha_id: str, max_retries: int = 3) -> Tuple[Optional[np.ndarray], str]:
+        """
+        PnL series for an alpha from the local store, downloading it (with exponential backoff) on a miss
+        Returns: (float32 series or None, reason when unavailable)
+        """
+        series = self.pnl_store.get(alpha_id)
+        if series is not None:
+            return series, ""
+        
         pnl_url = f'https://api.worldquantbrain.com/alphas/{alpha_id}/recordsets/pnl'
         
         for attempt in range(max_retries):
@@ -7368,11 +7224,11 @@ These are actual submitted alphas with real performance metrics. Use them as ins
                 if response.status_code != 200:
                     logger.error(f"❌ Failed to fetch PnL data: {response.status_code} - {response.text}")
                     if response.status_code == 404:
-                        return False, f"Alpha {alpha_id} not found or no PnL data available"
+                        return None, f"Alpha {alpha_id} not found or no PnL data available"
                     elif response.status_code == 403:
-                        return False, f"Access denied to PnL data for alpha {alpha_id}"
+                        return None, f"Access denied to PnL data for alpha {alpha_id}"
                     elif response.status_code == 401:
-                        return False, f"Authentication failed for PnL data"
+                        return None, f"Authentication failed for PnL data"
                     else:
                         # For other errors, retry with exponential backoff
                         if attempt < max_retries - 1:
@@ -7381,7 +7237,7 @@ These are actual submitted alphas with real performance metrics. Use them as ins
                             time.sleep(wait_time)
                             continue
                         else:
-                            return False, f"Failed to fetch PnL data after {max_retries} attempts: {response.status_code}"
+                            return None, f"Failed to fetch PnL data after {max_retries} attempts: {response.status_code}"
                 
                 # Check if response has content before trying to parse JSON
                 if not response.text.strip():
@@ -7392,7 +7248,7 @@ These are actual submitted alphas with real performance metrics. Use them as ins
                         time.sleep(wait_time)
                         continue
                     else:
-                        return False, f"Empty PnL response from API after {max_retries} attempts - no data available"
+                        return None, f"Empty PnL response from API after {max_retries} attempts - no data available"
                 
                 # Check if response looks like JSON
                 if not response.text.strip().startswith('{') and not response.text.strip().startswith('['):
@@ -7403,7 +7259,7 @@ These are actual submitted alphas with real performance metrics. Use them as ins
                         time.sleep(wait_time)
                         continue
                     else:
-                        return False, f"Non-JSON PnL response after {max_retries} attempts: {response.text[:100]}"
+                        return None, f"Non-JSON PnL response after {max_retries} attempts: {response.text[:100]}"
                 
                 try:
                     pnl_data = response.json()
@@ -7417,71 +7273,20 @@ These are actual submitted alphas with real performance metrics. Use them as ins
                         continue
                     else:
                         logger.error(f"❌ Response content: {response.text[:200]}...")
-                        return False, f"Failed to parse PnL JSON after {max_retries} attempts: {str(json_error)}"
+                        return None, f"Failed to parse PnL JSON after {max_retries} attempts: {str(json_error)}"
                 
-                # If we get here, we have valid PnL data - process it
+                # If we get here, we have valid PnL data - keep it
                 records = pnl_data.get('records', [])
                 logger.info(f"📈 Found {len(records)} PnL records")
                 
                 if not records:
                     logger.warning(f"⚠️ No PnL records found for alpha {alpha_id}")
-                    return False, "No PnL records found"
-                
-                # Analyze PnL data quality
-                total_records = len(records)
-                zero_pnl_count = 0
-                non_zero_pnl_count = 0
-                total_pnl_sum = 0.0
-                pnl_values = []
-                
-                for i, record in enumerate(records):
-                    try:
-                        if len(record) >= 2:  # Ensure we have at least date and pnl
-                            pnl_value = record[1]  # PnL is the second element
-                            # Convert to float if it's a string
-                            if isinstance(pnl_value, str):
-                                pnl_value = float(pnl_value)
-                            pnl_values.append(pnl_value)
-                            if pnl_value == 0.0:
-                                zero_pnl_count += 1
-                            else:
-                                non_zero_pnl_count += 1
-                                total_pnl_sum += abs(pnl_value)
-                        else:
-                            logger.warning(f"⚠️ Skipping malformed record {i}: {record}")
-                    except (ValueError, TypeError) as parse_error:
-                        logger.warning(f"⚠️ Failed to parse PnL value in record {i}: {record} - {parse_error}")
-                        continue
-                
-                # Check if we have enough valid PnL values after parsing
-                if len(pnl_values) < 5:
-                    logger.warning(f"⚠️ Insufficient valid PnL values after parsing: {len(pnl_values)}")
-                    return False, f"Insufficient valid PnL values after parsing: {len(pnl_values)}"
-                
-                logger.info(f"📊 PnL analysis: {len(pnl_values)} valid values, {zero_pnl_count} zeros, {non_zero_pnl_count} non-zeros")
-                
-                # Calculate quality metrics
-                zero_pnl_ratio = zero_pnl_count / len(pnl_values) if len(pnl_values) > 0 else 1.0
-                avg_non_zero_pnl = total_pnl_sum / non_zero_pnl_count if non_zero_pnl_count > 0 else 0.0
-                
-                # Check for flatlined PnL curve (constant values over time)
-                is_flatlined = self._detect_flatlined_pnl(pnl_values)
-                if is_flatlined:
-                    self.pnl_check_stats['flatlined_detected'] += 1
-                    return False, f"FLATLINED PnL curve detected - constant values over time (too good to be true alpha)"
+                    return None, "No PnL records found"
                 
-                # Quality criteria
-                if zero_pnl_ratio > 0.8:  # More than 80% zeros
-                    return False, f"Too many zero PnL values: {zero_pnl_ratio:.1%} ({zero_pnl_count}/{total_records})"
-                
-                if non_zero_pnl_count < 10:  # Less than 10 non-zero values
-                    return False, f"Insufficient non-zero PnL data: {non_zero_pnl_count} values"
-                
-                if avg_non_zero_pnl < 0.001:  # Very small PnL values
-                    return False, f"PnL values too small: avg={avg_non_zero_pnl:.6f}"
-                
-                # Good quality
-                return True, f"Good PnL quality: {non_zero_pnl_count}/{total_records} non-zero values, avg={avg_non_zero_pnl:.4f}"
+                series = parse_pnl_records(records)
+                if len(series) < len(records):
+                    logger.warning(f"⚠️ Skipped {len(records) - len(series)} malformed PnL records for alpha {alpha_id}")
+                return self.pnl_store.put(alpha_id, series, total_records=len(records)), ""
             
             except Exception as e:
                 logger.warning(f"⚠️ Exception during PnL processing (attempt {attempt + 1}): {e}")
@@ -7491,10 +7296,72 @@ These are actual submitted alphas with real performance metrics. Use them as ins
                     time.sleep(wait_time)
                     continue
                 else:
-                    return False, f"PnL processing failed after {max_retries} attempts: {str(e)}"
+                    return None, f"PnL processing failed after {max_retries} attempts: {str(e)}"
         
         # If we get here, all retries failed
-        return False, f"PnL data unavailable after {max_retries} attempts - rejecting alpha"
+        return None, f"PnL data unavailable after {max_retries} attempts - rejecting alpha"
+    
+    def screen_pnl_pool(self, alpha_ids: List[str], max_retries: int = 3, max_workers: int = 4) -> Dict[str, Tuple[bool, str]]:
+        """
+        Screen the PnL quality of a whole pool of completed alphas in one call
+        Missing series are downloaded concurrently, then every check runs as one NumPy pass
+        Returns: {alpha_id: (is_good_quality, reason)}
+        """
+        verdicts = {}
+        series = {}
+        missing = [alpha_id for alpha_id in dict.fromkeys(alpha_ids) if alpha_id not in self.pnl_store]
+        if missing:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing)))) as executor:
+                fetched = dict(zip(missing, executor.map(lambda alpha_id: self._fetch_pnl_series(alpha_id, max_retries), missing)))
+        else:
+            fetched = {}
+        
+        for alpha_id in dict.fromkeys(alpha_ids):
+            values, reason = fetched.get(alpha_id) or self._fetch_pnl_series(alpha_id, max_retries)
+            if values is None:
+                verdicts[alpha_id] = (False, reason)
+            else:
+                series[alpha_id] = values
+        
+        if series:
+            ids = list(series)
+            results, flatlined, flat_reasons, stats = screen_quality(
+                [series[alpha_id] for alpha_id in ids],
+                [self.pnl_store.total_records(alpha_id) or len(series[alpha_id]) for alpha_id in ids])
+            for i, alpha_id in enumerate(ids):
+                logger.info(f"📊 PnL analysis {alpha_id}: {stats['count'][i]} valid values, {stats['zeros'][i]} zeros, "
+                            f"{stats['nonzero'][i]} non-zeros, max drawdown {stats['max_drawdown'][i]:.2f}")
+                if flatlined[i]:
+                    logger.warning(f"🚨 FLATLINED PnL detected for {alpha_id}: {flat_reasons[i]}")
+                    self.pnl_check_stats['flatlined_detected'] += 1
+                verdicts[alpha_id] = results[i]
+        return verdicts
+    
+    def check_pnl_data_quality_batch(self, candidates: List[Tuple[str, float, float, float]]) -> Dict[str, Tuple[bool, str]]:
+        """
+        check_pnl_data_quality for a pool of (alpha_id, sharpe, fitness, margin) in one screening pass
+        Returns: {alpha_id: (is_good_quality, reason)}
+        """
+        verdicts = {}
+        to_check = []
+        for alpha_id, sharpe, fitness, margin in candidates:
+            should_check, check_reason = self._should_check_pnl(sharpe, fitness, margin)
+            if not should_check:
+                self.pnl_check_stats['skipped_checks'] += 1
+                verdicts[alpha_id] = (True, f"Skipped PnL check - {check_reason}")
+            else:
+                self.pnl_check_stats['total_checks'] += 1
+                logger.info(f"🔍 Checking PnL for alpha {alpha_id}: {check_reason}")
+                to_check.append(alpha_id)
+        
+        if to_check:
+            try:
+                verdicts.update(self.screen_pnl_pool(to_check))
+            except Exception as e:
+                logger.error(f"❌ PnL quality check failed: {str(e)}")
+                for alpha_id in to_check:
+                    verdicts[alpha_id] = (False, f"PnL quality check failed: {str(e)} - rejecting alpha for safety")
+        return verdicts
     
     def _detect_flatlined_pnl(self, pnl_values: List[float]) -> bool:
         """
@@ -7505,88 +7372,10 @@ These are actual submitted alphas with real performance metrics. Use them as ins
         if len(pnl_values) < 10:  # Need at least 10 data points
             return False
         
-        # Check if all values are the same (including zero)
-        unique_values = set(pnl_values)
-        if len(unique_values) == 1:
-            return True
-        
-        # Check if values are very close to each other (within a small threshold)
-        # This catches cases where PnL is constant but not exactly zero
-        if len(unique_values) <= 3:  # Only 1-3 unique values in the entire series
-            return True
-        
-        # Check for very low variance (standard deviation close to zero)
-        import statistics
-        try:
-            std_dev = statistics.stdev(pnl_values)
-            mean_abs = statistics.mean([abs(x) for x in pnl_values])
-            
-            # If standard deviation is very small relative to mean absolute value
-            if mean_abs > 0 and std_dev / mean_abs < 0.01:  # Less than 1% variation
-                return True
-            
-            # If standard deviation is extremely small in absolute terms
-            if std_dev < 1e-6:  # Less than 0.000001
-                return True
-                
-        except statistics.StatisticsError:
-            # If we can't calculate statistics, assume it's flatlined
-            return True
-        
-        # STRICT CHECK: Any single value representing more than 5% of the data is suspicious
-        # Real alphas should have varied PnL throughout the entire time series
-        value_counts = {}
-        for value in pnl_values:
-            value_counts[value] = value_counts.get(value, 0) + 1
-        
-        # Check for any dominant value (even 5% is too much for a real alpha)
-        max_count = max(value_counts.values())
-        max_ratio = max_count / len(pnl_values)
-        
-        # If any single value represents more than 5% of the data, it's flatlined
-        if max_ratio > 0.05:  # Changed from 0.9 to 0.05 (5%)
-            logger.warning(f"🚨 FLATLINED PnL detected: {max_ratio*100:.1f}% of values are identical ({max_count}/{len(pnl_values)})")
-            return True
-        
-        # Additional check: Look for consecutive identical values (streaks)
-        # Real alphas shouldn't have long streaks of identical PnL
-        max_streak = 1
-        current_streak = 1
-        for i in range(1, len(pnl_values)):
-            if pnl_values[i] == pnl_values[i-1]:
-                current_streak += 1
-                max_streak = max(max_streak, current_streak)
-            else:
-                current_streak = 1
-        
-        # If there's a streak of more than 5% of the data, it's suspicious
-        if max_streak > len(pnl_values) * 0.05:  # More than 5% consecutive identical values
-            percentage = (max_streak/len(pnl_values)*100) if len(pnl_values) > 0 else 0
-            logger.warning(f"🚨 FLATLINED PnL detected: {max_streak} consecutive identical values ({percentage:.1f}% of data)")
-            return True
-        
-        # Additional strict check: Look for very small variations that might indicate flatlining
-        # Real alphas should have meaningful PnL variations, not just tiny fluctuations
-        try:
-            # Calculate the range of PnL values
-            pnl_range = max(pnl_values) - min(pnl_values)
-            mean_abs_pnl = statistics.mean([abs(x) for x in pnl_values])
-            
-            # If the range is very small relative to the mean absolute value, it's suspicious
-            if mean_abs_pnl > 0 and pnl_range / mean_abs_pnl < 0.1:  # Less than 10% range
-                logger.warning(f"🚨 FLATLINED PnL detected: Very small range {pnl_range:.6f} relative to mean {mean_abs_pnl:.6f}")
-                return True
-            
-            # If the range is extremely small in absolute terms
-            if pnl_range < 1e-5:  # Less than 0.00001
-                logger.warning(f"🚨 FLATLINED PnL detected: Extremely small range {pnl_range:.8f}")
-                return True
-                
-        except statistics.StatisticsError:
-            # If we can't calculate statistics, assume it's flatlined
-            return True
-        
-        return False
+        flatlined, reasons = detect_flatline(pnl_statistics([np.asarray(pnl_values, dtype=np.float32)]))
+        if flatlined[0]:
+            logger.warning(f"🚨 FLATLINED PnL detected: {reasons[0]}")
+        return bool(flatlined[0])
     
     def _calculate_suspicion_score(self, sharpe: float, fitness: float, margin: float) -> float:
         """
@@ -7676,16 +7465,20 @@ These are actual submitted alphas with real performance metrics. Use them as ins
                 self.pnl_check_stats['probability_checks'] += 1
             return should_check, f"Very low probability PnL check - suspicion {suspicion_score:.3f}, {check_probability*100:.0f}% chance"
     
-    def track_template_quality(self, template: str, alpha_id: str, sharpe: float = 0, fitness: float = 0, margin: float = 0) -> bool:
+    def track_template_quality(self, template: str, alpha_id: str, sharpe: float = 0, fitness: float = 0, margin: float = 0,
+                               pnl_quality: Optional[Tuple[bool, str]] = None) -> bool:
         """
         Track template quality based on PnL data
+        pnl_quality: (is_good_quality, reason) already screened by check_pnl_data_quality_batch
         Returns: True if template should be kept, False if it should be deleted
         """
         # Create template hash for tracking
         template_hash = hash(template)
         
         # Check PnL data quality with metrics for 'too good to be true' detection
-        is_good_quality, reason = self.check_pnl_data_quality(alpha_id, sharpe, fitness, margin)
+        if pnl_quality is None:
+            pnl_quality = self.check_pnl_data_quality(alpha_id, sharpe, fitness, margin)
+        is_good_quality, reason = pnl_quality
         
         # Initialize tracking if not exists
         if template_hash not in self.template_quality_tracker:
@@ -7823,6 +7616,7 @@ These are actual submitted alphas with real performance metrics. Use them as ins
         else:
             stats['flatlined_rate'] = 0.0
         
+        stats['pnl_cache'] = self.pnl_store.get_stats()
         return stats
     
     def test_pnl_api(self, alpha_id: str) -> Dict:
@@ -8548,6 +8342,12 @@ These are actual submitted alphas with real performance metrics. Use them as ins
                 'regular': template['template']
             }
             
+            cached = self._cached_template_result(template['template'], simulation_data)
+            if cached is not None:
+                logger.info(f"♻️ RESULT CACHE: Equivalent template already simulated with these settings, "
+                            f"skipping: {template['template'][:60]}")
+                return cached
+            
             logger.info(f"🎮 CONCURRENT SIMULATION: Submitting simulation to API...")
             # Submit simulation
             response = self.make_api_request('POST', 'https://api.worldquantbrain.com/simulations', json=simulation_data)
@@ -8589,7 +8389,7 @@ These are actual submitted alphas with real performance metrics. Use them as ins
             
             logger.info(f"🎮 CONCURRENT SIMULATION: Starting to monitor simulation progress...")
             # Monitor simulation progress CONCURRENTLY
-            result = self._monitor_simulation_concurrent(progress_url, template, region, delay)
+            result = self._monitor_simulation_concurrent(progress_url, template, region, delay, simulation_data)
             logger.info(f"🎮 CONCURRENT SIMULATION: Monitoring completed, result: {result is not None}")
             return result
             
@@ -8609,8 +8409,9 @@ These are actual submitted alphas with real performance metrics. Use them as ins
                 timestamp=time.time()
             )
     
-    def _monitor_simulation_concurrent(self, progress_url: str, template: Dict, region: str, delay: int) -> Optional[TemplateResult]:
-        """CONCURRENTLY monitor simulation progress"""
+    def _monitor_simulation_concurrent(self, progress_url: str, template: Dict, region: str, delay: int,
+                                       simulation_data: Optional[Dict] = None) -> Optional[TemplateResult]:
+        """CONCURRENTLY monitor simulation progress (final results are cached under simulation_data's settings)"""
         max_wait_time = 3600  # 1 hour maximum wait time
         start_time = time.time()
         check_count = 0
@@ -8733,7 +8534,7 @@ These are actual submitted alphas with real performance metrics. Use them as ins
                                 logger.error(f"❌ POST-SIMULATION ANALYSIS TRACEBACK: {traceback.format_exc()}")
                                 # Continue execution even if post-simulation analysis fails
                         
-                        return TemplateResult(
+                        return self._remember_result(simulation_data, TemplateResult(
                             template=template['template'],
                             region=region,
                             settings=SimulationSettings(region=region, universe=self.region_configs[region].universe, delay=delay, neutralization=template.get('neutralization', 'INDUSTRY')),
@@ -8748,7 +8549,7 @@ These are actual submitted alphas with real performance metrics. Use them as ins
                             success=is_truly_successful,
                             alpha_id=alpha_id,
                             timestamp=time.time()
-                        )
+                        ))
                     
                     elif status in ['FAILED', 'ERROR', 'FAIL']:
                         error_message = data.get('message', 'Unknown error')
@@ -8761,14 +8562,14 @@ These are actual submitted alphas with real performance metrics. Use them as ins
                         }
                         self.record_failure(region, template['template'], error_message, settings_info)
                         
-                        return TemplateResult(
+                        return self._remember_result(simulation_data, TemplateResult(
                             template=template['template'],
                             region=region,
                             settings=SimulationSettings(region=region, universe=self.region_configs[region].universe, delay=delay, neutralization=template.get('neutralization', 'INDUSTRY')),
                             success=False,
                             error_message=error_message,
                             timestamp=time.time()
-                        )
+                        ), status)
                     
                     elif status == 'WARNING':
                         # WARNING status should be treated as failed immediately
@@ -8782,14 +8583,14 @@ These are actual submitted alphas with real performance metrics. Use them as ins
                         }
                         self.record_failure(region, template['template'], error_message, settings_info)
                         
-                        return TemplateResult(
+                        return self._remember_result(simulation_data, TemplateResult(
                             template=template['template'],
                             region=region,
                             settings=SimulationSettings(region=region, universe=self.region_configs[region].universe, delay=delay, neutralization=template.get('neutralization', 'INDUSTRY')),
                             success=False,
                             error_message=error_message,
                             timestamp=time.time()
-                        )
+                        ), status)
                     
                     elif status is None:
                         # None status might mean simulation is still starting
@@ -9401,6 +9202,20 @@ def main():
         print(f"   Flatlined alphas detected: {pnl_stats['flatlined_detected']} ({pnl_stats['flatlined_rate']*100:.1f}% of checks)")
         print(f"   Avg suspicion score: {pnl_stats['avg_suspicion_score']:.3f}")
         print(f"   Max suspicion score: {pnl_stats['max_suspicion_score']:.3f}")
+        print(f"   PnL cache: {pnl_stats['pnl_cache']['series']} series, {pnl_stats['pnl_cache']['hits']} hits")
+        
+        # Simulations answered from the result cache this run
+        cache_stats = generator.result_cache.get_stats()
+        print(f"\n♻️ Result Cache:")
+        print(f"   Simulations skipped (cache hits): {cache_stats['hits']} of {cache_stats['hits'] + cache_stats['misses']} lookups "
+              f"({cache_stats['hit_rate']*100:.1f}%)")
+        print(f"   New results cached: {cache_stats['stores']} ({cache_stats['entries']} cached in total)")
+        
+        # API latency per endpoint
+        print(f"\n🌐 API Endpoints:")
+        for endpoint, stats in generator.sess.get_endpoint_stats().items():
+            print(f"   {endpoint}: {stats['count']} calls, {stats['errors']} errors, "
+                  f"avg {stats['avg_ms']:.0f}ms, p95 {stats['p95_ms']:.0f}ms")
         
     except Exception as e:
         logger.error(f"Enhanced template generation failed: {e}")
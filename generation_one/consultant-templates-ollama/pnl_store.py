@@ -0,0 +1,310 @@
+"""
+PnL Store and Vectorized Screening
+Local cache of alpha PnL series plus NumPy quality/flatline kernels
+
+An alpha's in-sample PnL never changes, so each series is downloaded once and
+kept as a compact float32 array keyed by alpha ID (in memory, and appended to
+pnl_cache/ so it survives restarts). The screening kernels take many series at
+once: they are padded into one matrix and every statistic (zero counts,
+variance, range, distinct values, longest streak, drawdown...) is a handful of
+array operations over all alphas instead of a Python loop per alpha.
+
+- PnLStore: thread-safe get/put of float32 series with an append-only disk cache
+- parse_pnl_records: recordset rows -> float32 array
+- pnl_statistics: per-alpha statistics for a batch of series
+- detect_flatline / flatline_pattern / screen_quality: the generator's checks
+"""
+
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def parse_pnl_records(records: Sequence) -> np.ndarray:
+    """PnL values (second column) of a recordset as float32; malformed rows are skipped"""
+    values = []
+    for record in records:
+        try:
+            if len(record) >= 2 and record[1] is not None:
+                values.append(float(record[1]))
+        except (ValueError, TypeError):
+            continue
+    return np.asarray(values, dtype=np.float32)
+
+
+class PnLStore:
+    """Float32 PnL series keyed by alpha ID, cached on disk"""
+
+    VALUES_FILE = 'pnl_values.f32'
+    INDEX_FILE = 'pnl_index.jsonl'
+
+    def __init__(self, cache_dir: Optional[str] = 'pnl_cache'):
+        """
+        Args:
+            cache_dir: Directory for the disk cache (None keeps everything in memory)
+        """
+        self.cache_dir = cache_dir
+        self._series: Dict[str, np.ndarray] = {}
+        self._totals: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._load()
+
+    def _load(self):
+        """Read the index and slice every cached series out of the values file"""
+        index_path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        values_path = os.path.join(self.cache_dir, self.VALUES_FILE)
+        if not os.path.exists(index_path) or not os.path.exists(values_path):
+            return
+        values = np.fromfile(values_path, dtype=np.float32)
+        with open(index_path, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line from an interrupted write
+                start, length = entry['offset'], entry['length']
+                if start + length <= len(values):
+                    self._series[entry['id']] = values[start:start + length]
+                    self._totals[entry['id']] = entry.get('total', length)
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def __contains__(self, alpha_id: str) -> bool:
+        return alpha_id in self._series
+
+    def get(self, alpha_id: str) -> Optional[np.ndarray]:
+        """Cached series for alpha_id, or None"""
+        series = self._series.get(alpha_id)
+        if series is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return series
+
+    def total_records(self, alpha_id: str) -> int:
+        """Number of recordset rows the series was parsed from (malformed rows included)"""
+        return self._totals.get(alpha_id, 0)
+
+    def put(self, alpha_id: str, values: Iterable[float], total_records: Optional[int] = None) -> np.ndarray:
+        """Store a series; returns the float32 array kept"""
+        series = np.ascontiguousarray(np.asarray(values, dtype=np.float32))
+        total = len(series) if total_records is None else int(total_records)
+        with self._lock:
+            if self.cache_dir:
+                values_path = os.path.join(self.cache_dir, self.VALUES_FILE)
+                with open(values_path, 'ab') as f:
+                    offset = f.tell() // 4
+                    f.write(series.tobytes())
+                with open(os.path.join(self.cache_dir, self.INDEX_FILE), 'a') as f:
+                    f.write(json.dumps({'id': alpha_id, 'offset': offset,
+                                        'length': len(series), 'total': total}) + '\n')
+            self._series[alpha_id] = series
+            self._totals[alpha_id] = total
+        return series
+
+    def get_stats(self) -> Dict:
+        """Cache size and hit counts"""
+        return {
+            'series': len(self._series),
+            'values': int(sum(len(s) for s in self._series.values())),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+def pad_series(series: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Stack ragged series into a NaN-padded float64 matrix; returns (matrix, lengths)"""
+    lengths = np.fromiter((len(s) for s in series), dtype=np.int64, count=len(series))
+    width = int(lengths.max()) if len(series) else 0
+    matrix = np.full((len(series), max(width, 1)), np.nan)
+    for row, values in enumerate(series):
+        matrix[row, :len(values)] = values
+    return matrix, lengths
+
+
+def _longest_true_run(flags: np.ndarray) -> np.ndarray:
+    """Length of the longest run of True in each row of a boolean matrix"""
+    rows, width = flags.shape
+    longest = np.zeros(rows, dtype=np.int64)
+    if rows == 0 or width == 0:
+        return longest
+    # Bracket every row with False; the gaps between consecutive Falses are the runs
+    padded = np.zeros((rows, width + 2), dtype=bool)
+    padded[:, 1:-1] = flags
+    breaks = np.flatnonzero(~padded.ravel())
+    runs = np.diff(breaks) - 1
+    nonempty = runs > 0
+    np.maximum.at(longest, breaks[:-1][nonempty] // (width + 2), runs[nonempty])
+    return longest
+
+
+def pnl_statistics(series: Sequence[np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Per-series statistics for a batch, one array entry per series
+
+    Values are treated as the cumulative PnL curve (as returned by the pnl
+    recordset); max_drawdown is the largest peak-to-trough fall of that curve.
+    """
+    matrix, n = pad_series(series)
+    valid = ~np.isnan(matrix)
+    safe_n = np.maximum(n, 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        zeros = np.sum(matrix == 0, axis=1)
+        abs_matrix = np.abs(matrix)
+        abs_sum = np.nansum(abs_matrix, axis=1)
+        mean = np.nansum(matrix, axis=1) / safe_n
+        deviation = matrix - mean[:, None]
+        squares = np.nansum(deviation ** 2, axis=1)
+        std = np.where(n > 1, np.sqrt(squares / np.maximum(n - 1, 1)), np.nan)
+        low = np.where(valid, matrix, np.inf).min(axis=1)
+        high = np.where(valid, matrix, -np.inf).max(axis=1)
+
+        # Distinct values and the most repeated one: equal neighbours after sorting (NaNs sort last)
+        ordered = np.sort(matrix, axis=1)
+        same_sorted = ordered[:, 1:] == ordered[:, :-1]
+        unique = n - same_sorted.sum(axis=1)
+        mode_count = np.where(n > 0, _longest_true_run(same_sorted) + 1, 0)
+
+        # Longest streak of identical consecutive values
+        max_streak = np.where(n > 0, _longest_true_run(matrix[:, 1:] == matrix[:, :-1]) + 1, 0)
+
+        peak = np.fmax.accumulate(np.where(valid, matrix, -np.inf), axis=1)
+        max_drawdown = np.where(valid, peak - matrix, 0.0).max(axis=1)
+
+        tolerance = np.maximum(np.abs(mean) * 0.00001, 0.000001)
+        near_mean = np.sum(np.abs(deviation) <= tolerance[:, None], axis=1)
+        near_zero = np.sum(abs_matrix < 0.0001, axis=1)
+
+    return {
+        'count': n,
+        'zeros': zeros,
+        'nonzero': n - zeros,
+        'abs_sum': abs_sum,
+        'mean': mean,
+        'mean_abs': abs_sum / safe_n,
+        'std': std,
+        'population_std': np.sqrt(squares / safe_n),
+        'min': low,
+        'max': high,
+        'range': high - low,
+        'unique': unique,
+        'mode_count': mode_count,
+        'max_streak': max_streak,
+        'max_drawdown': max_drawdown,
+        'near_mean': near_mean,
+        'tolerance': tolerance,
+        'near_zero': near_zero,
+    }
+
+
+def detect_flatline(stats: Dict[str, np.ndarray]) -> Tuple[np.ndarray, List[str]]:
+    """
+    Strict flatline screen (any flat stretch rejects the alpha)
+
+    Returns:
+        (flatlined flags, reason per series - '' when not flatlined)
+    """
+    n = stats['count']
+    size = len(n)
+    flagged = np.zeros(size, dtype=bool)
+    reasons = [''] * size
+    with np.errstate(invalid='ignore', divide='ignore'):
+        relative_std = stats['std'] / stats['mean_abs']
+        relative_range = stats['range'] / stats['mean_abs']
+    positive_mean = stats['mean_abs'] > 0
+    # In the order the checks are applied; the first that fires is reported
+    checks = [
+        (stats['unique'] == 1, lambda i: "all values identical"),
+        (stats['unique'] <= 3, lambda i: f"only {stats['unique'][i]} distinct values"),
+        (positive_mean & (relative_std < 0.01),
+         lambda i: f"std {stats['std'][i]:.6f} is under 1% of mean |PnL| {stats['mean_abs'][i]:.6f}"),
+        (stats['std'] < 1e-6, lambda i: f"std {stats['std'][i]:.8f} < 1e-6"),
+        (stats['mode_count'] > n * 0.05,
+         lambda i: f"{stats['mode_count'][i] / n[i] * 100:.1f}% of values are identical "
+                   f"({stats['mode_count'][i]}/{n[i]})"),
+        (stats['max_streak'] > n * 0.05,
+         lambda i: f"{stats['max_streak'][i]} consecutive identical values "
+                   f"({stats['max_streak'][i] / n[i] * 100:.1f}% of data)"),
+        (positive_mean & (relative_range < 0.1),
+         lambda i: f"Very small range {stats['range'][i]:.6f} relative to mean {stats['mean_abs'][i]:.6f}"),
+        (stats['range'] < 1e-5, lambda i: f"Extremely small range {stats['range'][i]:.8f}"),
+    ]
+    eligible = n >= 10
+    for condition, describe in checks:
+        hits = np.flatnonzero(condition & eligible & ~flagged)
+        for i in hits:
+            reasons[i] = describe(i)
+        flagged[hits] = True
+    return flagged, reasons
+
+
+def flatline_pattern(stats: Dict[str, np.ndarray]) -> Tuple[np.ndarray, List[str]]:
+    """
+    Looser flatline screen used when colouring analysed alphas
+
+    Returns:
+        (flatlined flags, reason per series - '' when not flatlined)
+    """
+    n = stats['count']
+    size = len(n)
+    flagged = np.zeros(size, dtype=bool)
+    reasons = [''] * size
+    checks = [
+        (stats['range'] < 0.001, lambda i: f"Range={stats['range'][i]:.6f} < 0.001"),
+        (stats['population_std'] < 0.0001, lambda i: f"StdDev={stats['population_std'][i]:.6f} < 0.0001"),
+        (stats['near_mean'] >= n * 0.95,
+         lambda i: f"{stats['near_mean'][i]}/{n[i]} values constant within {stats['tolerance'][i]:.6f}"),
+        (stats['near_zero'] >= n * 0.9, lambda i: f"{stats['near_zero'][i]}/{n[i]} values near zero"),
+    ]
+    eligible = n >= 10
+    for condition, describe in checks:
+        hits = np.flatnonzero(condition & eligible & ~flagged)
+        for i in hits:
+            reasons[i] = describe(i)
+        flagged[hits] = True
+    return flagged, reasons
+
+
+def screen_quality(series: Sequence[np.ndarray], total_records: Optional[Sequence[int]] = None
+                   ) -> Tuple[List[Tuple[bool, str]], np.ndarray, List[str], Dict[str, np.ndarray]]:
+    """
+    PnL data quality verdicts for a batch of series
+
+    Args:
+        series: Parsed PnL series
+        total_records: Recordset rows per series, malformed ones included (default: series lengths)
+
+    Returns:
+        ([(is_good_quality, reason)], flatlined flags, flatline reasons, statistics)
+    """
+    stats = pnl_statistics(series)
+    flagged, flat_reasons = detect_flatline(stats)
+    totals = stats['count'] if total_records is None else np.asarray(total_records)
+    n, zeros, nonzero = stats['count'], stats['zeros'], stats['nonzero']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        zero_ratio = np.where(n > 0, zeros / np.maximum(n, 1), 1.0)
+        avg_nonzero = np.where(nonzero > 0, stats['abs_sum'] / np.maximum(nonzero, 1), 0.0)
+
+    verdicts = []
+    for i in range(len(n)):
+        if n[i] < 5:
+            verdicts.append((False, f"Insufficient valid PnL values after parsing: {n[i]}"))
+        elif flagged[i]:
+            verdicts.append((False, "FLATLINED PnL curve detected - constant values over time (too good to be true alpha)"))
+        elif zero_ratio[i] > 0.8:
+            verdicts.append((False, f"Too many zero PnL values: {zero_ratio[i]:.1%} ({zeros[i]}/{totals[i]})"))
+        elif nonzero[i] < 10:
+            verdicts.append((False, f"Insufficient non-zero PnL data: {nonzero[i]} values"))
+        elif avg_nonzero[i] < 0.001:
+            verdicts.append((False, f"PnL values too small: avg={avg_nonzero[i]:.6f}"))
+        else:
+            verdicts.append((True, f"Good PnL quality: {nonzero[i]}/{totals[i]} non-zero values, avg={avg_nonzero[i]:.4f}"))
+    return verdicts, flagged, flat_reasons, stats
@@ -23,7 +23,7 @@ except ImportError:
 
 # Import vector database query tool
 try:
-    from query_vector_database import WorldQuantMinerQuery
+    from query_vector_database import create_query_client
     VECTOR_DB_AVAILABLE = True
 except ImportError:
     VECTOR_DB_AVAILABLE = False
@@ -78,7 +78,7 @@ class AlphaAnalyzer:
         self.vector_db = None
         if VECTOR_DB_AVAILABLE:
             try:
-                self.vector_db = WorldQuantMinerQuery()
+                self.vector_db = create_query_client()
                 print("Vector database connected for field suggestions")
             except Exception as e:
                 print(f"Warning: Could not connect to vector database: {e}")
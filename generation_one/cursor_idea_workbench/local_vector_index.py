@@ -0,0 +1,583 @@
+import glob
+import hashlib
+import json
+import operator
+import os
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# An embedding function maps a batch of texts to a (len(texts), dim) float array
+EmbeddingFunction = Callable[[Sequence[str]], np.ndarray]
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_RANGE_OPERATORS = {"$gt": operator.gt, "$gte": operator.ge, "$lt": operator.lt, "$lte": operator.le}
+
+
+def hashing_embedding(texts: Sequence[str], dim: int = 512) -> np.ndarray:
+    """
+    Default offline embedding: feature hashing of words and character trigrams.
+
+    Needs no model download, so the index works fully offline. Word tokens
+    catch exact operator/field names, trigrams catch partial matches such as
+    "rank" vs "ts_rank".
+
+    Args:
+        texts (Sequence[str]): Texts to embed
+        dim (int): Embedding dimensions
+
+    Returns:
+        L2-normalized float32 array of shape (len(texts), dim)
+    """
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        text = (text or "").lower()
+        features = _TOKEN_RE.findall(text)
+        padded = f" {text} "
+        features += [padded[i:i + 3] for i in range(len(padded) - 2)]
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % dim
+            sign = 1.0 if digest[4] & 1 else -1.0
+            vectors[row, bucket] += sign
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def sentence_transformer_embedding(model_name: str = "all-MiniLM-L6-v2") -> EmbeddingFunction:
+    """
+    Build an embedding function backed by a local sentence-transformers model.
+
+    Args:
+        model_name (str): sentence-transformers model name or path
+
+    Returns:
+        Embedding function usable with LocalWorldQuantMinerQuery
+    """
+    from sentence_transformers import SentenceTransformer
+    model = SentenceTransformer(model_name)
+
+    def embed(texts: Sequence[str]) -> np.ndarray:
+        vectors = model.encode(list(texts), convert_to_numpy=True, normalize_embeddings=True)
+        return vectors.astype(np.float32)
+
+    embed.__name__ = f"sentence_transformer:{model_name}"
+    return embed
+
+
+@dataclass
+class LocalMatch:
+    """Search hit in the same shape as a Pinecone query match (id, score, metadata)."""
+    id: str
+    score: float
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class LocalVectorIndex:
+    """
+    IVF-flat cosine index over a NumPy array of normalized vectors.
+
+    Small corpora are searched exhaustively with one matrix-vector product.
+    Larger corpora are clustered with k-means; vectors are stored sorted by
+    cluster so a query only scans the rows of the n_probe closest clusters.
+    Vectors are persisted as .npy files and memory-mapped on load.
+    """
+
+    def __init__(self, vectors: np.ndarray, records: List[Dict[str, Any]],
+                 centroids: Optional[np.ndarray] = None, list_offsets: Optional[np.ndarray] = None):
+        self.vectors = vectors
+        self.records = records
+        # Match ids are the Pinecone ids; a data field cached for several regions/delays has one row each
+        self.ids = [r["id"] for r in records]
+        self.id_to_row: Dict[str, int] = {}
+        for row, record_id in enumerate(self.ids):
+            self.id_to_row.setdefault(record_id, row)
+        self.max_rows_per_id = max(Counter(self.ids).values(), default=1)
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+        self._columns: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def build(cls, vectors: np.ndarray, records: List[Dict[str, Any]],
+              flat_threshold: int = 20000, n_lists: Optional[int] = None,
+              iterations: int = 10, seed: int = 0) -> "LocalVectorIndex":
+        """
+        Build an index from normalized vectors.
+
+        Args:
+            vectors (np.ndarray): (n, dim) normalized float32 vectors
+            records (List[Dict]): One metadata record (with an "id") per vector
+            flat_threshold (int): Below this many vectors, skip clustering
+            n_lists (int): Number of IVF clusters (default: sqrt(n))
+            iterations (int): k-means iterations
+            seed (int): Random seed for centroid initialization
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if len(vectors) < flat_threshold:
+            return cls(vectors, records)
+
+        n_lists = n_lists or int(np.sqrt(len(vectors)))
+        rng = np.random.default_rng(seed)
+        centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(vectors @ centroids.T, axis=1)
+            for c in range(n_lists):
+                members = vectors[assignments == c]
+                if len(members):
+                    centroid = members.mean(axis=0)
+                    centroids[c] = centroid / (np.linalg.norm(centroid) or 1.0)
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+
+        order = np.argsort(assignments, kind="stable")
+        list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=n_lists))])
+        return cls(vectors[order], [records[i] for i in order], centroids, list_offsets)
+
+    def _column(self, key: str) -> np.ndarray:
+        """Metadata values for one key as an array, for vectorized filtering."""
+        if key not in self._columns:
+            self._columns[key] = np.array([r.get(key) for r in self.records], dtype=object)
+        return self._columns[key]
+
+    def _filter_mask(self, filter_dict: Optional[Dict]) -> Optional[np.ndarray]:
+        """Translate a Pinecone-style metadata filter ({"key": {"$eq": value}}, $ne/$in/$gt/$gte/$lt/$lte) into a row mask."""
+        if not filter_dict:
+            return None
+        mask = np.ones(len(self.records), dtype=bool)
+        for key, condition in filter_dict.items():
+            column = self._column(key)
+            if isinstance(condition, dict):
+                if "$eq" in condition:
+                    mask &= column == condition["$eq"]
+                if "$ne" in condition:
+                    mask &= column != condition["$ne"]
+                if "$in" in condition:
+                    mask &= np.isin(column, list(condition["$in"]))
+                for op, compare in _RANGE_OPERATORS.items():
+                    if op in condition:
+                        bound = condition[op]
+                        mask &= np.array([v is not None and compare(v, bound) for v in column], dtype=bool)
+            else:
+                mask &= column == condition
+        return mask
+
+    def search(self, query_vector: np.ndarray, top_k: int = 10, n_probe: int = 8,
+               filter_dict: Optional[Dict] = None) -> List[LocalMatch]:
+        """
+        Return the top_k most similar records, one match per id.
+
+        Args:
+            query_vector (np.ndarray): Normalized query vector
+            top_k (int): Number of results to return
+            n_probe (int): Number of IVF clusters to scan (ignored for flat indexes)
+            filter_dict (dict): Optional Pinecone-style metadata filter
+        """
+        if len(self.records) == 0 or top_k <= 0:
+            return []
+
+        query_vector = np.asarray(query_vector, dtype=np.float32).reshape(-1)
+        mask = self._filter_mask(filter_dict)
+
+        if self.centroids is None or mask is not None:
+            rows = np.arange(len(self.records)) if mask is None else np.flatnonzero(mask)
+        else:
+            probes = np.argsort(-(self.centroids @ query_vector))[:n_probe]
+            rows = np.concatenate([np.arange(self.list_offsets[c], self.list_offsets[c + 1]) for c in probes])
+        if len(rows) == 0:
+            return []
+
+        scores = np.asarray(self.vectors[rows] @ query_vector)
+        # Enough candidates that top_k distinct ids survive when an id has several rows
+        k = min(top_k * self.max_rows_per_id, len(rows))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        matches: List[LocalMatch] = []
+        seen = set()
+        for i in best:
+            record_id = self.ids[rows[i]]
+            if record_id in seen:
+                continue
+            seen.add(record_id)
+            matches.append(LocalMatch(id=record_id, score=float(scores[i]), metadata=self.records[rows[i]]))
+            if len(matches) == top_k:
+                break
+        return matches
+
+    def save(self, directory: str, meta: Dict[str, Any]):
+        """Persist vectors, clusters and records to a directory."""
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "vectors.npy"), np.asarray(self.vectors, dtype=np.float32))
+        if self.centroids is not None:
+            np.save(os.path.join(directory, "centroids.npy"), self.centroids)
+            np.save(os.path.join(directory, "list_offsets.npy"), self.list_offsets)
+        with open(os.path.join(directory, "records.json"), "w", encoding="utf-8") as f:
+            json.dump(self.records, f)
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+    @classmethod
+    def load(cls, directory: str) -> "LocalVectorIndex":
+        """Load a persisted index; vectors are memory-mapped rather than read into RAM."""
+        vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode="r")
+        with open(os.path.join(directory, "records.json"), "r", encoding="utf-8") as f:
+            records = json.load(f)
+        centroids = list_offsets = None
+        if os.path.exists(os.path.join(directory, "centroids.npy")):
+            centroids = np.load(os.path.join(directory, "centroids.npy"))
+            list_offsets = np.load(os.path.join(directory, "list_offsets.npy"))
+        return cls(vectors, records, centroids, list_offsets)
+
+    @staticmethod
+    def read_meta(directory: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+
+def load_operator_records(operators_file: str) -> List[Dict[str, Any]]:
+    """
+    Load operator records from __operator__.json.
+
+    Args:
+        operators_file (str): Path to the operator definitions
+
+    Returns:
+        Records with id/name/category/definition/description metadata
+    """
+    with open(operators_file, "r", encoding="utf-8") as f:
+        operators = json.load(f)
+    records = []
+    for op in operators:
+        records.append({
+            "id": op["name"],
+            "name": op["name"],
+            "category": op.get("category", ""),
+            "definition": op.get("definition", ""),
+            "description": op.get("description", "") or "",
+            "level": op.get("level", ""),
+        })
+    return records
+
+
+def load_data_field_records(field_files: Sequence[str]) -> List[Dict[str, Any]]:
+    """
+    Load data-field records from cached field JSONs (data_fields_cache_{region}_{delay}.json).
+
+    Args:
+        field_files (Sequence[str]): Cached field JSON files
+
+    Returns:
+        Records with id/name/category/description metadata, one per (field, region, delay)
+    """
+    records = []
+    for path in field_files:
+        match = re.search(r"data_fields_cache_([A-Za-z]+)_(\d+)\.json$", os.path.basename(path))
+        region, delay = (match.group(1), int(match.group(2))) if match else ("", None)
+        with open(path, "r", encoding="utf-8") as f:
+            fields = json.load(f)
+        for field_data in fields:
+            field_id = field_data.get("id", "")
+            if not field_id:
+                continue
+            category = field_data.get("category") or {}
+            dataset = field_data.get("dataset") or {}
+            records.append({
+                "key": f"{field_id}:{region}:{delay}" if region else field_id,
+                "id": field_id,
+                "name": field_id,
+                "category": category.get("name", "") if isinstance(category, dict) else str(category),
+                "description": field_data.get("description", "") or "",
+                "dataset": dataset.get("name", "") if isinstance(dataset, dict) else str(dataset),
+                "type": field_data.get("type", ""),
+                "region": region,
+                "delay": delay,
+                "coverage": field_data.get("coverage"),
+                "userCount": field_data.get("userCount"),
+                "alphaCount": field_data.get("alphaCount"),
+            })
+    return records
+
+
+def _record_text(record: Dict[str, Any]) -> str:
+    """Text that gets embedded for a record."""
+    parts = [record.get("name", ""), record.get("name", "").replace("_", " "),
+             record.get("category", ""), record.get("dataset", ""),
+             record.get("definition", ""), record.get("description", "")]
+    return " ".join(p for p in parts if p)
+
+
+class LocalWorldQuantMinerQuery:
+    """
+    Offline drop-in for WorldQuantMinerQuery backed by local vector indexes.
+
+    Builds one index per namespace ("operators" from __operator__.json,
+    "data-fields" from cached field JSONs), persists them under index_dir and
+    reuses them until the source files or the embedding function change.
+    """
+
+    def __init__(self, operators_file: str = "__operator__.json",
+                 field_files: Optional[Sequence[str]] = None,
+                 index_dir: str = ".local_vector_index",
+                 embedding_function: Optional[EmbeddingFunction] = None,
+                 rebuild: bool = False):
+        """
+        Initialize the local indexes, building them if needed.
+
+        Args:
+            operators_file (str): Path to __operator__.json
+            field_files (Sequence[str]): Cached field JSONs (default: data_fields_cache_*.json in the working directory)
+            index_dir (str): Directory where indexes are persisted
+            embedding_function (callable): Batch text -> vectors function (default: hashing_embedding)
+            rebuild (bool): Force rebuilding the indexes
+        """
+        self.embed = embedding_function or hashing_embedding
+        self.embedding_name = getattr(self.embed, "__name__", type(self.embed).__name__)
+        self.index_dir = index_dir
+        if field_files is None:
+            field_files = sorted(glob.glob("data_fields_cache_*.json"))
+
+        sources = {
+            "operators": ([operators_file] if os.path.exists(operators_file) else [], load_operator_records),
+            "data-fields": (list(field_files), load_data_field_records),
+        }
+        self.indexes: Dict[str, LocalVectorIndex] = {}
+        for namespace, (files, loader) in sources.items():
+            self.indexes[namespace] = self._load_or_build(namespace, files, loader, rebuild)
+
+        self.dimensions = int(self.indexes["operators"].vectors.shape[1]) if len(self.indexes["operators"].records) else 0
+        self.metric = "cosine"
+        self.index_name = f"local:{index_dir}"
+        print(f"Loaded local vector index: {self.index_name}")
+        print(f"Index stats: { {ns: len(idx.records) for ns, idx in self.indexes.items()} }")
+
+    def _fingerprint(self, files: Sequence[str]) -> str:
+        digest = hashlib.sha1(self.embedding_name.encode("utf-8"))
+        for path in files:
+            st = os.stat(path)
+            digest.update(f"{os.path.abspath(path)}:{st.st_size}:{st.st_mtime_ns}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _load_or_build(self, namespace: str, files: Sequence[str],
+                       loader: Callable[[Sequence[str]], List[Dict[str, Any]]],
+                       rebuild: bool) -> LocalVectorIndex:
+        directory = os.path.join(self.index_dir, namespace)
+        fingerprint = self._fingerprint(files)
+        meta = LocalVectorIndex.read_meta(directory)
+        if not rebuild and meta and meta.get("fingerprint") == fingerprint:
+            return LocalVectorIndex.load(directory)
+
+        records: List[Dict[str, Any]] = []
+        if namespace == "operators":
+            for path in files:
+                records.extend(loader(path))
+        else:
+            records = loader(files)
+
+        start = time.time()
+        vectors = self.embed([_record_text(r) for r in records]) if records else np.zeros((0, 1), dtype=np.float32)
+        index = LocalVectorIndex.build(vectors, records)
+        index.save(directory, {"fingerprint": fingerprint, "embedding": self.embedding_name,
+                               "count": len(records), "built_at": time.time()})
+        print(f"Built local '{namespace}' index with {len(records)} records in {time.time() - start:.2f}s")
+        return LocalVectorIndex.load(directory)
+
+    def _search(self, namespace: str, query_text: str, top_k: int,
+                filter_dict: Optional[Dict] = None) -> List[LocalMatch]:
+        index = self.indexes[namespace]
+        if not index.records:
+            return []
+        query_vector = self.embed([query_text or ""])[0]
+        return index.search(query_vector, top_k=top_k, filter_dict=filter_dict)
+
+    def search_by_text(self, query_text: str, top_k: int = 10,
+                       filter_dict: Optional[Dict] = None) -> List[LocalMatch]:
+        """
+        Search for similar financial metrics by text query.
+
+        Args:
+            query_text (str): The text to search for
+            top_k (int): Number of results to return
+            filter_dict (dict): Optional metadata filters
+
+        Returns:
+            List of search results with scores and metadata
+        """
+        return self._search("data-fields", query_text, top_k, filter_dict)
+
+    def search_by_category(self, category: str, top_k: int = 50) -> List[LocalMatch]:
+        """
+        Search for metrics within a specific category.
+
+        Args:
+            category (str): Category to filter by (e.g., "Fundamental", "Analyst")
+            top_k (int): Number of results to return
+
+        Returns:
+            List of search results
+        """
+        return self._search("data-fields", category, top_k, {"category": {"$eq": category}})
+
+    def get_metric_by_id(self, metric_id: str) -> Optional[Dict]:
+        """
+        Retrieve a specific metric by its ID.
+
+        Args:
+            metric_id (str): The ID of the metric to retrieve
+
+        Returns:
+            Metric data if found, None otherwise
+        """
+        for index in self.indexes.values():
+            row = index.id_to_row.get(metric_id)
+            if row is not None:
+                return {"id": metric_id, "values": np.asarray(index.vectors[row]).tolist(),
+                        "metadata": index.records[row]}
+        return None
+
+    def get_all_categories(self) -> List[str]:
+        """
+        Get all unique categories in the database.
+
+        Returns:
+            List of unique category names
+        """
+        return sorted({r.get("category", "") for r in self.indexes["data-fields"].records if r.get("category")})
+
+    def search_similar_metrics(self, metric_name: str, top_k: int = 10) -> List[LocalMatch]:
+        """
+        Find metrics similar to a given metric name.
+
+        Args:
+            metric_name (str): Name of the metric to find similar ones for
+            top_k (int): Number of similar metrics to return
+
+        Returns:
+            List of similar metrics
+        """
+        return self.search_by_text(metric_name, top_k=top_k)
+
+    def search_operators(self, query_text: str, top_k: int = 10) -> List[LocalMatch]:
+        """
+        Search for operators in the operators namespace.
+
+        Args:
+            query_text (str): The text to search for
+            top_k (int): Number of results to return
+
+        Returns:
+            List of search results with scores and metadata
+        """
+        return self._search("operators", query_text, top_k)
+
+    def search_data_fields(self, query_text: str, top_k: int = 10) -> List[LocalMatch]:
+        """
+        Search for data fields in the data-fields namespace.
+
+        Args:
+            query_text (str): The text to search for
+            top_k (int): Number of results to return
+
+        Returns:
+            List of search results with scores and metadata
+        """
+        return self._search("data-fields", query_text, top_k)
+
+    def analyze_metric_trends(self, metric_pattern: str = None) -> pd.DataFrame:
+        """
+        Analyze metrics across the whole local corpus (no paging through a remote index).
+
+        Args:
+            metric_pattern (str): Optional pattern used to score metrics
+
+        Returns:
+            DataFrame with one row per metric, sorted by timestamp when available
+        """
+        index = self.indexes["data-fields"]
+        if not index.records:
+            return pd.DataFrame()
+
+        query_vector = self.embed([metric_pattern or "financial metrics"])[0]
+        scores = np.asarray(index.vectors @ query_vector)
+        df = pd.DataFrame({
+            'id': [r.get('id', '') for r in index.records],
+            'name': [r.get('name', '') for r in index.records],
+            'category': [r.get('category', '') for r in index.records],
+            'description': [r.get('description', '') for r in index.records],
+            'timestamp': [r.get('timestamp') for r in index.records],
+            'score': scores,
+        })
+        df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
+        return df.sort_values(['timestamp', 'score'], ascending=[True, False], na_position='last')
+
+    def export_metrics_to_csv(self, filename: str = "worldquant_metrics.csv"):
+        """
+        Export all metrics to a CSV file.
+
+        Args:
+            filename (str): Output filename
+        """
+        df = self.analyze_metric_trends()
+        df.to_csv(filename, index=False)
+        print(f"Exported {len(df)} metrics to {filename}")
+
+    def get_metrics_summary(self) -> Dict[str, Any]:
+        """
+        Get a summary of the metrics database.
+
+        Returns:
+            Dictionary with database statistics
+        """
+        records = self.indexes["data-fields"].records
+        categories: Dict[str, int] = {}
+        for record in records:
+            category = record.get('category') or 'Unknown'
+            categories[category] = categories.get(category, 0) + 1
+        return {
+            'total_records': sum(len(index.records) for index in self.indexes.values()),
+            'dimensions': self.dimensions,
+            'metric': self.metric,
+            'categories': categories,
+            'sample_size': len(records)
+        }
+
+
+def main():
+    """
+    Build the local index and run a few example queries.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Offline vector index for operators and data fields")
+    parser.add_argument("query", nargs="?", default="rank", help="Text to search for")
+    parser.add_argument("--fields-dir", default=".", help="Directory with data_fields_cache_*.json files")
+    parser.add_argument("--index-dir", default=".local_vector_index", help="Where to persist the index")
+    parser.add_argument("--top-k", type=int, default=5, help="Number of results")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the index")
+    args = parser.parse_args()
+
+    client = LocalWorldQuantMinerQuery(
+        field_files=sorted(glob.glob(os.path.join(args.fields_dir, "data_fields_cache_*.json"))),
+        index_dir=args.index_dir,
+        rebuild=args.rebuild
+    )
+
+    for label, search in (("operators", client.search_operators), ("data fields", client.search_data_fields)):
+        start = time.perf_counter()
+        results = search(args.query, top_k=args.top_k)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"\n=== {label} matching '{args.query}' ({elapsed_ms:.2f} ms) ===")
+        for i, result in enumerate(results, 1):
+            print(f"{i}. {result.metadata.get('name', 'N/A')} (Score: {result.score:.4f})")
+            print(f"   {result.metadata.get('description', '')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,3 @@
-import pinecone
 import os
 from typing import List, Dict, Any, Optional
 import json
@@ -13,6 +12,12 @@ except ImportError:
     # python-dotenv not installed, continue without it
     pass
 
+# Pinecone is only needed for the hosted backend; the local backend works without it
+try:
+    import pinecone
+except ImportError:
+    pinecone = None
+
 class WorldQuantMinerQuery:
     """
     A class to query the WorldQuant Miner Pinecone vector database
@@ -31,6 +36,9 @@ class WorldQuantMinerQuery:
             if api_key is None:
                 raise ValueError("Pinecone API key is required. Set PINECONE_API_KEY environment variable or pass api_key parameter.")
         
+        if pinecone is None:
+            raise ImportError("pinecone is not installed. Install it or set VECTOR_DB_BACKEND=local.")
+
         # Initialize Pinecone client
         self.pc = pinecone.Pinecone(api_key=api_key)
         
@@ -340,14 +348,41 @@ class WorldQuantMinerQuery:
         }
 
 
+def create_query_client(backend: str = None, **kwargs):
+    """
+    Create a vector database query client.
+
+    Args:
+        backend (str): "pinecone", "local" or "auto". If None, read from the
+            VECTOR_DB_BACKEND environment variable (default: "auto", which uses
+            Pinecone when PINECONE_API_KEY is set and the local index otherwise).
+        **kwargs: Passed to the client constructor
+
+    Returns:
+        WorldQuantMinerQuery or LocalWorldQuantMinerQuery
+    """
+    backend = (backend or os.getenv('VECTOR_DB_BACKEND', 'auto')).lower()
+    if backend == 'auto':
+        backend = 'pinecone' if pinecone is not None and os.getenv('PINECONE_API_KEY') else 'local'
+
+    if backend == 'pinecone':
+        return WorldQuantMinerQuery(**kwargs)
+    if backend == 'local':
+        from local_vector_index import LocalWorldQuantMinerQuery
+        if 'index_dir' not in kwargs and os.getenv('LOCAL_VECTOR_INDEX_DIR'):
+            kwargs['index_dir'] = os.getenv('LOCAL_VECTOR_INDEX_DIR')
+        return LocalWorldQuantMinerQuery(**kwargs)
+    raise ValueError(f"Unknown vector database backend: {backend}")
+
+
 def main():
     """
     Example usage of the WorldQuantMinerQuery class.
     """
     # Initialize the query client
-    # API key will be loaded from environment variable PINECONE_API_KEY
+    # Uses Pinecone if PINECONE_API_KEY is set, otherwise the local index (see VECTOR_DB_BACKEND)
     try:
-        query_client = WorldQuantMinerQuery()
+        query_client = create_query_client()
         
         # Example 1: Search for cash flow related metrics
         print("\n=== Searching for cash flow metrics ===")
@@ -28,7 +28,7 @@ if (-not (Test-Path "Dockerfile.prod")) {
 
 # Build the image
 Write-Host "🔨 Building Docker image..." -ForegroundColor Yellow
-docker build -f Dockerfile.prod -t naive-ollama:$Version .
+docker build --build-context dashboard_indexer=../../dashboard_indexer -f Dockerfile.prod -t naive-ollama:$Version .
 
 if ($LASTEXITCODE -ne 0) {
     Write-Host "❌ Build failed!" -ForegroundColor Red
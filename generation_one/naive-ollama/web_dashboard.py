@@ -1,4 +1,4 @@
-from flask import Flask, render_template, jsonify, request, redirect, url_for
+from flask import Flask, render_template, jsonify, request, redirect, url_for, Response, stream_with_context
 import json
 import os
 import time
@@ -9,6 +9,8 @@ import requests
 import logging
 from typing import Dict, List, Optional
 
+from dashboard_indexer.log_indexer import DashboardIndexer, in_serving_process
+
 app = Flask(__name__)
 
 # Configure logging
@@ -23,8 +25,32 @@ class AlphaDashboard:
         self.results_dir = "results"
         self.logs_dir = "logs"
         
-    def get_system_status(self) -> Dict:
-        """Get overall system status."""
+        # Tails the local log and indexes results in the background so API handlers serve from memory;
+        # started in __main__ (or on first use), never at import
+        self._indexer = DashboardIndexer({"orchestrator": self.log_file}, results_dir=self.results_dir)
+        
+        # System status involves nvidia-smi, Docker and Ollama calls; share one snapshot between clients
+        self.status_ttl = 10.0
+        self._status_cache: Optional[Dict] = None
+        self._status_cache_time = 0.0
+        self._status_lock = threading.Lock()
+        
+    @property
+    def indexer(self) -> DashboardIndexer:
+        """The log/results indexer, started on first use"""
+        self._indexer.start()
+        return self._indexer
+    
+    def get_system_status(self, force: bool = False) -> Dict:
+        """Get overall system status (cached for status_ttl seconds unless forced)."""
+        with self._status_lock:
+            if not force and self._status_cache and time.time() - self._status_cache_time < self.status_ttl:
+                return self._status_cache
+            self._status_cache = self._build_system_status()
+            self._status_cache_time = time.time()
+            return self._status_cache
+    
+    def _build_system_status(self) -> Dict:
         status = {
             "timestamp": datetime.now().isoformat(),
             "gpu": self.get_gpu_status(),
@@ -217,77 +243,45 @@ class AlphaDashboard:
                             })
             else:
                 # Fallback to local log file
-                if os.path.exists(self.log_file):
-                    with open(self.log_file, 'r') as f:
-                        lines = f.readlines()
-                        for line in lines[-20:]:
-                            line = line.strip()
-                            if line and not line.startswith('---'):
-                                try:
-                                    if ' - ' in line:
-                                        timestamp_str, message = line.split(' - ', 1)
-                                        timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                                        activities.append({
-                                            "timestamp": timestamp.isoformat(),
-                                            "message": message,
-                                            "type": "info" if "INFO" in message else "error" if "ERROR" in message else "warning" if "WARNING" in message else "debug"
-                                        })
-                                except:
+                recent_lines = self.indexer.tail("orchestrator", 20)
+                if recent_lines is not None:
+                    for line in recent_lines:
+                        line = line.strip()
+                        if line and not line.startswith('---'):
+                            try:
+                                if ' - ' in line:
+                                    timestamp_str, message = line.split(' - ', 1)
+                                    timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
                                     activities.append({
-                                        "timestamp": datetime.now().isoformat(),
-                                        "message": line,
-                                        "type": "unknown"
+                                        "timestamp": timestamp.isoformat(),
+                                        "message": message,
+                                        "type": "info" if "INFO" in message else "error" if "ERROR" in message else "warning" if "WARNING" in message else "debug"
                                     })
+                            except:
+                                activities.append({
+                                    "timestamp": datetime.now().isoformat(),
+                                    "message": line,
+                                    "type": "unknown"
+                                })
         except Exception as e:
             logger.warning(f"Could not read recent activity: {e}")
         
         return activities[-10:]  # Return last 10 activities
     
     def get_statistics(self) -> Dict:
-        """Get statistics about generated alphas and results."""
-        stats = {
+        """Get statistics about generated alphas and results (maintained incrementally by the indexer)."""
+        try:
+            return self.indexer.stats()
+        except Exception as e:
+            logger.warning(f"Could not get statistics: {e}")
+        
+        return {
             "total_alphas_generated": 0,
             "successful_alphas": 0,
             "failed_alphas": 0,
             "last_24h_generated": 0,
             "last_24h_successful": 0
         }
-        
-        try:
-            # Count files in results directory
-            if os.path.exists(self.results_dir):
-                result_files = [f for f in os.listdir(self.results_dir) if f.endswith('.json')]
-                stats["total_alphas_generated"] = len(result_files)
-                
-                # Count successful alphas (files with content)
-                for file in result_files:
-                    file_path = os.path.join(self.results_dir, file)
-                    try:
-                        with open(file_path, 'r') as f:
-                            data = json.load(f)
-                            if data and len(data) > 0:
-                                stats["successful_alphas"] += 1
-                    except:
-                        stats["failed_alphas"] += 1
-                
-                # Count last 24 hours
-                cutoff_time = datetime.now() - timedelta(hours=24)
-                for file in result_files:
-                    file_path = os.path.join(self.results_dir, file)
-                    if os.path.getmtime(file_path) > cutoff_time.timestamp():
-                        stats["last_24h_generated"] += 1
-                        try:
-                            with open(file_path, 'r') as f:
-                                data = json.load(f)
-                                if data and len(data) > 0:
-                                    stats["last_24h_successful"] += 1
-                        except:
-                            pass
-                            
-        except Exception as e:
-            logger.warning(f"Could not get statistics: {e}")
-        
-        return stats
     
     def get_logs(self, lines: int = 50) -> List[str]:
         """Get recent logs from Docker container."""
@@ -302,20 +296,11 @@ class AlphaDashboard:
                 logs = result.stdout.strip().split('\n')
             else:
                 # Fallback to local log file if Docker fails
-                if os.path.exists(self.log_file):
-                    with open(self.log_file, 'r') as f:
-                        lines_list = f.readlines()
-                        logs = lines_list[-lines:] if len(lines_list) > lines else lines_list
+                logs = self.indexer.tail("orchestrator", lines) or []
         except Exception as e:
             logger.warning(f"Could not read logs: {e}")
             # Fallback to local log file
-            try:
-                if os.path.exists(self.log_file):
-                    with open(self.log_file, 'r') as f:
-                        lines_list = f.readlines()
-                        logs = lines_list[-lines:] if len(lines_list) > lines else lines_list
-            except:
-                pass
+            logs = self.indexer.tail("orchestrator", lines) or []
         
         return [line.strip() for line in logs if line.strip()]
     
@@ -342,10 +327,7 @@ class AlphaDashboard:
                 logs = alpha_logs[-lines:] if len(alpha_logs) > lines else alpha_logs
             else:
                 # Fallback to local log file
-                if os.path.exists(self.log_file):
-                    with open(self.log_file, 'r') as f:
-                        lines_list = f.readlines()
-                        logs = lines_list[-lines:] if len(lines_list) > lines else lines_list
+                logs = self.indexer.tail("orchestrator", lines) or []
         except Exception as e:
             logger.warning(f"Could not read alpha generator logs: {e}")
         
@@ -450,7 +432,26 @@ def api_trigger_alpha_generation():
 @app.route('/api/refresh')
 def api_refresh():
     """API endpoint to refresh status."""
-    return jsonify(dashboard.get_system_status())
+    return jsonify(dashboard.get_system_status(force=True))
+
+@app.route('/api/stream')
+def api_stream():
+    """Server-sent events: a snapshot, then log lines, statistics and periodic status as they arrive."""
+    response = Response(
+        stream_with_context(dashboard.indexer.event_stream(
+            lambda: {
+                "status": dashboard.get_system_status(),
+                "logs": dashboard.get_logs(20),
+                "alpha_logs": dashboard.get_alpha_generator_logs(30)
+            },
+            status=dashboard.get_system_status,
+            status_interval=30.0
+        )),
+        mimetype='text/event-stream'
+    )
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 if __name__ == '__main__':
     # Create templates directory if it doesn't exist
@@ -461,4 +462,9 @@ if __name__ == '__main__':
     print("Ollama WebUI: http://localhost:3000")
     print("Ollama API: http://localhost:11434")
     
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    debug = True
+    # The debug reloader's watcher process never serves requests: only the child tails the logs
+    if in_serving_process(debug):
+        dashboard.indexer.start()
+    
+    app.run(host='0.0.0.0', port=5000, debug=debug, threaded=True)
@@ -3,89 +3,48 @@ Generation Two: Self-Optimization and Genetic Evolution
 Modular implementation with organized tool structure
 """
 
-# Core components
-from .core import (
-    TemplateGenerator,
-    SimulatorTester,
-    SimulationSettings,
-    SimulationResult,
-    EnhancedTemplateGeneratorV3
-)
+from ._lazy import lazy_exports
 
-# Evolution components
-from .evolution import (
-    SelfOptimizer,
-    AlphaQualityMonitor,
-    AlphaEvolutionEngine,
-    AlphaResult,
-    OnTheFlyTester
-)
+# Everything below is imported on first attribute access (PEP 562), so
+# `import generation_two` stays cheap for scripts that only need one module.
+_getattr, __dir__ = lazy_exports(__name__, {
+    # Core components
+    '.core': ['TemplateGenerator', 'SimulatorTester', 'SimulationSettings', 'SimulationResult',
+              'EnhancedTemplateGeneratorV3'],
+    # Evolution components
+    '.evolution': ['SelfOptimizer', 'AlphaQualityMonitor', 'AlphaEvolutionEngine', 'AlphaResult',
+                   'OnTheFlyTester'],
+    # Storage components
+    '.storage': ['BacktestStorage', 'BacktestRecord', 'AlphaRegrouper', 'AlphaRetrospect',
+                 'ClusterAnalyzer', 'Cluster'],
+    # Ollama components
+    '.ollama': ['OllamaManager', 'RegionThemeManager', 'DuplicateDetector', 'ExpressionSignature'],
+    # Core utilities
+    '.core.utils': ['RetryHandler', 'RetryConfig', 'RetryStrategy', 'RequestHandler', 'RequestConfig',
+                    'BrainSession', 'ResultCache'],
+    # Configuration system
+    '.core.config': ['ConfigManager', 'ConfigSection', 'load_config', 'save_config'],
+    # Recording system
+    '.core.recorder': ['DecisionRecorder', 'DecisionRecord', 'AuditLogger'],
+    # Self-evolution system
+    '.self_evolution': ['CodeGenerator', 'ModuleTemplate', 'CodeEvaluator', 'EvaluationResult',
+                        'EvolutionExecutor'],
+    # Data fetcher
+    '.data_fetcher': ['OperatorFetcher', 'DataFieldFetcher', 'SmartSearchEngine']
+})
 
-# Storage components
-from .storage import (
-    BacktestStorage,
-    BacktestRecord,
-    AlphaRegrouper,
-    AlphaRetrospect,
-    ClusterAnalyzer,
-    Cluster
-)
 
-# Ollama components
-from .ollama import (
-    OllamaManager,
-    RegionThemeManager,
-    DuplicateDetector,
-    ExpressionSignature
-)
+def __getattr__(name: str):
+    # GUI (optional, requires tkinter): resolved together on first access
+    if name in ('CyberpunkGUI', 'HAS_GUI'):
+        try:
+            from .gui import CyberpunkGUI
+        except ImportError:
+            CyberpunkGUI = None
+        globals().update(CyberpunkGUI=CyberpunkGUI, HAS_GUI=CyberpunkGUI is not None)
+        return globals()[name]
+    return _getattr(name)
 
-# Core utilities
-from .core.utils import (
-    RetryHandler,
-    RetryConfig,
-    RetryStrategy,
-    RequestHandler,
-    RequestConfig
-)
-
-# Configuration system
-from .core.config import (
-    ConfigManager,
-    ConfigSection,
-    load_config,
-    save_config
-)
-
-# Recording system
-from .core.recorder import (
-    DecisionRecorder,
-    DecisionRecord,
-    AuditLogger
-)
-
-# Self-evolution system
-from .self_evolution import (
-    CodeGenerator,
-    ModuleTemplate,
-    CodeEvaluator,
-    EvaluationResult,
-    EvolutionExecutor
-)
-
-# GUI (optional, requires tkinter)
-try:
-    from .gui import CyberpunkGUI
-    HAS_GUI = True
-except ImportError:
-    HAS_GUI = False
-    CyberpunkGUI = None
-
-# Data fetcher
-from .data_fetcher import (
-    OperatorFetcher,
-    DataFieldFetcher,
-    SmartSearchEngine
-)
 
 __all__ = [
     # Core
@@ -118,6 +77,8 @@ __all__ = [
     'RetryStrategy',
     'RequestHandler',
     'RequestConfig',
+    'BrainSession',
+    'ResultCache',
     # Configuration
     'ConfigManager',
     'ConfigSection',
@@ -0,0 +1,48 @@
+"""
+Lazy Package Exports
+PEP 562 module __getattr__/__dir__ so package __init__ files can re-export names
+without importing every submodule (and requests, sqlite, Ollama, tkinter) up front
+"""
+
+import importlib
+import sys
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, List[str]]) -> Tuple[Callable, Callable]:
+    """
+    Build __getattr__ and __dir__ for a package
+
+    Args:
+        package: The package's __name__
+        exports: {submodule: [exported names]}, e.g. {'.template_generator': ['TemplateGenerator']};
+            absolute names (e.g. 'brain_client.field_registry') re-export shared modules
+
+    Returns:
+        (__getattr__, __dir__) to assign at module level
+
+    Each name is imported on first access and then stored on the package, so later
+    lookups are plain attribute reads. Unknown names fall back to importing a
+    submodule of the same name (`generation_two.core.template_validator` style access).
+    """
+    owners = {name: module for module, names in exports.items() for name in names}
+
+    def __getattr__(name: str):
+        module_name = owners.get(name)
+        if module_name is not None:
+            value = getattr(importlib.import_module(module_name, package), name)
+            setattr(sys.modules[package], name, value)
+            return value
+        if name.startswith('__'):
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        try:
+            return importlib.import_module(f".{name}", package)
+        except ModuleNotFoundError as e:
+            if e.name != f"{package}.{name}":
+                raise
+            raise AttributeError(f"module {package!r} has no attribute {name!r}") from None
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(owners))
+
+    return __getattr__, __dir__
@@ -0,0 +1,31 @@
+"""
+Offline benchmark harness
+Record real simulation traffic, replay it from a local fake API and measure the mining stack
+"""
+
+from .traffic_recorder import TrafficRecorder, ReplayFixtures, SimulationTrace, RecordedResponse
+from .replay_api import ReplayBrainAPI, ReplaySession, replay_sessions
+from .harness import (
+    BenchmarkReport,
+    run_benchmark,
+    drive_simulator_tester,
+    drive_mining_coordinator,
+    drive_template_generator_v2,
+    drive_pyramid_crasher
+)
+
+__all__ = [
+    'TrafficRecorder',
+    'ReplayFixtures',
+    'SimulationTrace',
+    'RecordedResponse',
+    'ReplayBrainAPI',
+    'ReplaySession',
+    'replay_sessions',
+    'BenchmarkReport',
+    'run_benchmark',
+    'drive_simulator_tester',
+    'drive_mining_coordinator',
+    'drive_template_generator_v2',
+    'drive_pyramid_crasher'
+]
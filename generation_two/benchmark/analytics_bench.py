@@ -0,0 +1,237 @@
+"""
+Analytics Benchmark
+Regroup/retrospect over a synthetic backtest_results table: Python lists vs the columnar store
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict, field
+from typing import Callable, Dict, List, Optional
+
+from ..storage.backtest_storage import BacktestStorage
+from ..storage.backtest_columns import ANALYTICS_COLUMNS
+from ..storage.columnar_store import ColumnarBacktestStore
+from ..storage.regroup import AlphaRegrouper
+from ..storage.retrospect import AlphaRetrospect
+
+logger = logging.getLogger(__name__)
+
+OPERATORS = ['rank', 'ts_rank', 'zscore', 'group_neutralize', 'ts_delta', 'ts_mean', 'scale', 'winsorize']
+FIELDS = ['close', 'volume', 'returns', 'vwap', 'cap', 'high', 'low', 'open']
+REGIONS = ['USA', 'EUR', 'CHN', 'ASI', 'GLB', 'IND']
+
+# (name, call) pairs run against both the list and the columnar results
+QUERIES: List = [
+    ('regroup_by_region', lambda g, r, results: g.regroup_by_region(results)),
+    ('regroup_by_sharpe_tier', lambda g, r, results: g.regroup_by_sharpe_tier(results)),
+    ('regroup_by_operator', lambda g, r, results: g.regroup_by_operator(results)),
+    ('regroup_by_fitness', lambda g, r, results: g.regroup_by_performance_metric(results, 'fitness')),
+    ('regroup_by_time_period', lambda g, r, results: g.regroup_by_time_period(results, 30)),
+    ('generate_insights', lambda g, r, results: r.generate_insights(results)),
+]
+
+
+@dataclass
+class AnalyticsReport:
+    """Timings (seconds) and memory (MB) for one benchmark run"""
+    records: int
+    format: str
+    list_load: float = 0.0
+    list_queries: Dict[str, float] = field(default_factory=dict)
+    list_peak_mb: float = 0.0
+    initial_sync: float = 0.0
+    incremental_sync: float = 0.0
+    incremental_rows: int = 0
+    columnar_load: float = 0.0
+    columnar_queries: Dict[str, float] = field(default_factory=dict)
+    columnar_peak_mb: float = 0.0
+
+    def summary(self) -> str:
+        """Human-readable comparison"""
+        lines = [f"{self.records:,} records ({self.format})",
+                 f"  materialize: initial {self.initial_sync:.2f}s, "
+                 f"+{self.incremental_rows:,} rows incremental {self.incremental_sync:.3f}s"]
+        if self.list_queries:
+            lines.append(f"  load:   list {self.list_load:.2f}s   columnar {self.columnar_load:.2f}s")
+        else:
+            lines.append(f"  load:   columnar {self.columnar_load:.2f}s")
+        for name, seconds in self.columnar_queries.items():
+            before = self.list_queries.get(name)
+            if before is not None:
+                lines.append(f"  {name:<24} list {before:8.3f}s   columnar {seconds:8.3f}s   x{before / max(seconds, 1e-9):.0f}")
+            else:
+                lines.append(f"  {name:<24} columnar {seconds:8.3f}s")
+        if self.columnar_peak_mb:
+            lines.append(f"  peak memory: list {self.list_peak_mb:.0f}MB   columnar {self.columnar_peak_mb:.0f}MB")
+        return '\n'.join(lines)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def populate_backtests(db_path: str, records: int, templates: int = 20_000, seed: int = 0,
+                       start_id: int = 0, days: int = 180):
+    """
+    Fill backtest_results with synthetic results
+
+    Args:
+        db_path: SQLite path (tables are created if needed)
+        records: Rows to insert
+        templates: Distinct templates (each is re-tested many times, like real history)
+        seed: Random seed
+        start_id: Offset for the generated data, so appended batches differ
+        days: History span ending now
+    """
+    BacktestStorage(db_path)
+    rng = random.Random(seed + start_id)
+    now = time.time()
+    pool = [f"{OPERATORS[i % len(OPERATORS)]}(ts_delta({FIELDS[(i // 8) % len(FIELDS)]}, {i % 251 + 1}))"
+            for i in range(templates)]
+    conn = sqlite3.connect(db_path)
+    batch = []
+    for i in range(records):
+        template = pool[rng.randrange(templates)]
+        success = rng.random() < 0.8
+        sharpe = rng.gauss(1.0, 0.8) if success else 0.0
+        batch.append((template, REGIONS[rng.randrange(len(REGIONS))], sharpe, sharpe * 0.7 + rng.random() * 0.3,
+                      rng.random(), rng.gauss(0.1, 0.05), rng.random() * 0.002, 1 if success else 0,
+                      now - days * 86400 * (1 - (start_id + i) / max(start_id + records, 1))))
+        if len(batch) == 100_000:
+            _insert(conn, batch)
+            batch = []
+    if batch:
+        _insert(conn, batch)
+    conn.close()
+
+
+def _insert(conn: sqlite3.Connection, rows: List[tuple]):
+    conn.executemany(
+        "INSERT INTO backtest_results (template, region, sharpe, fitness, turnover, returns, margin, success, timestamp) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    conn.commit()
+
+
+def load_result_dicts(db_path: str) -> List[Dict]:
+    """The list path: every result as a dict, in id order"""
+    columns = list(ANALYTICS_COLUMNS)
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(f"SELECT {', '.join(columns)} FROM backtest_results ORDER BY id").fetchall()
+    finally:
+        conn.close()
+    results = []
+    for row in rows:
+        result = dict(zip(columns, row))
+        result['success'] = bool(result['success'])
+        results.append(result)
+    return results
+
+
+def _timed(call: Callable, measure_memory: bool):
+    """Run call, returning (result, seconds, peak MB)"""
+    if measure_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    result = call()
+    seconds = time.perf_counter() - started
+    peak = 0.0
+    if measure_memory:
+        peak = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    return result, seconds, peak
+
+
+def run_analytics_benchmark(db_path: str, store_dir: str, format: Optional[str] = None,
+                            include_list: bool = True, incremental_rows: int = 10_000,
+                            measure_memory: bool = False) -> AnalyticsReport:
+    """
+    Time materialization and the regroup/retrospect queries
+
+    Args:
+        db_path: Populated backtests database
+        store_dir: Directory for the columnar segments
+        format: 'parquet' or 'npz' (default: parquet if pyarrow is installed)
+        include_list: Also time the list-of-dicts path
+        incremental_rows: Rows appended before timing an incremental sync (0 = skip)
+        measure_memory: Record tracemalloc peaks (slows the list path noticeably)
+
+    Returns:
+        AnalyticsReport
+    """
+    regrouper, retrospect = AlphaRegrouper(), AlphaRetrospect()
+    store = ColumnarBacktestStore(db_path, store_dir, format=format)
+    conn = sqlite3.connect(db_path)
+    records = conn.execute("SELECT COUNT(*) FROM backtest_results").fetchone()[0]
+    conn.close()
+    report = AnalyticsReport(records=records, format=store.format)
+
+    if include_list:
+        def list_path():
+            results = load_result_dicts(db_path)
+            report.list_load = time.perf_counter() - started
+            for name, query in QUERIES:
+                began = time.perf_counter()
+                query(regrouper, retrospect, results)
+                report.list_queries[name] = time.perf_counter() - began
+        started = time.perf_counter()
+        _, _, report.list_peak_mb = _timed(list_path, measure_memory)
+
+    _, report.initial_sync, _ = _timed(store.sync, False)
+
+    def columnar_path():
+        frame = store.load(sync=False)
+        report.columnar_load = time.perf_counter() - started
+        for name, query in QUERIES:
+            began = time.perf_counter()
+            query(regrouper, retrospect, frame)
+            report.columnar_queries[name] = time.perf_counter() - began
+    started = time.perf_counter()
+    _, _, report.columnar_peak_mb = _timed(columnar_path, measure_memory)
+
+    if incremental_rows:
+        # New results since the last sync: only they are read and written
+        populate_backtests(db_path, incremental_rows, start_id=records)
+        report.incremental_rows = incremental_rows
+        _, report.incremental_sync, _ = _timed(store.sync, False)
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Regroup/retrospect analytics benchmark")
+    parser.add_argument('--records', type=int, default=1_000_000)
+    parser.add_argument('--templates', type=int, default=20_000)
+    parser.add_argument('--format', choices=('parquet', 'npz'), default=None)
+    parser.add_argument('--skip-list', action='store_true', help="Only time the columnar path")
+    parser.add_argument('--memory', action='store_true', help="Measure tracemalloc peaks")
+    parser.add_argument('--db', help="Use an existing backtests database instead of a synthetic one")
+    parser.add_argument('--json', help="Write the report to this file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = args.db or os.path.join(workdir, 'backtests.db')
+        if not args.db:
+            started = time.time()
+            populate_backtests(db_path, args.records, templates=args.templates)
+            logger.info(f"Generated {args.records:,} records in {time.time() - started:.1f}s")
+        report = run_analytics_benchmark(db_path, os.path.join(workdir, 'columns'), args.format,
+                                         include_list=not args.skip_list,
+                                         incremental_rows=0 if args.db else 10_000,
+                                         measure_memory=args.memory)
+    print(report.summary())
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report.to_dict(), f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
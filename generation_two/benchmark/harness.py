@@ -0,0 +1,337 @@
+"""
+Offline Benchmark Harness
+Drives the generate -> validate -> simulate loop against a replay server and
+reports throughput, slot utilization, simulation latency and CPU cost
+
+Usage:
+    python -m generation_two.benchmark.harness replay.json --driver simulator_tester
+    python -m generation_two.benchmark.harness replay.json --driver all --latency-scale 0.05 --json out.json
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from ..core.account_pool import default_region_configs
+from .replay_api import ReplayBrainAPI, replay_sessions
+from .traffic_recorder import ReplayFixtures
+
+logger = logging.getLogger(__name__)
+
+GENERATION_ONE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                              'generation_one')
+
+
+@dataclass
+class BenchmarkReport:
+    """Result of one benchmark run; compare these release over release"""
+    driver: str
+    templates: int
+    completed: int
+    failed: int
+    rate_limited: int
+    wall_seconds: float
+    templates_per_minute: float
+    slot_utilization: float
+    peak_slots: int
+    latency_p50: float
+    latency_p95: float
+    cpu_per_simulation_ms: float
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    def summary(self) -> str:
+        return (f"{self.driver}: {self.templates_per_minute:.1f} templates/min, "
+                f"slots {self.slot_utilization:.0%} (peak {self.peak_slots}), "
+                f"latency p50 {self.latency_p50:.2f}s p95 {self.latency_p95:.2f}s, "
+                f"{self.cpu_per_simulation_ms:.1f}ms CPU/sim "
+                f"[{self.completed} ok, {self.failed} failed, {self.rate_limited} x 429]")
+
+
+def run_benchmark(name: str, driver: Callable[[ReplayBrainAPI], int], fixtures: ReplayFixtures,
+                  **api_options) -> BenchmarkReport:
+    """
+    Run a driver against a fresh replay server
+
+    Args:
+        name: Driver name for the report
+        driver: Callable(api) that runs the workload and returns templates attempted
+        fixtures: Recorded traffic
+        **api_options: ReplayBrainAPI options (latency_scale, rate_limit_rate, failure_rate, ...)
+
+    Returns:
+        BenchmarkReport
+    """
+    with ReplayBrainAPI(fixtures, **api_options) as api:
+        api.reset_stats()
+        cpu_start = time.process_time()
+        templates = driver(api)
+        cpu = time.process_time() - cpu_start
+        stats = api.stats()
+
+    simulations = stats['completed'] + stats['failed']
+    latencies = np.asarray(stats['latencies']) if stats['latencies'] else np.zeros(1)
+    # The replay server runs in this process; its handler CPU is not the client's cost
+    client_cpu = max(0.0, cpu - stats['server_cpu'])
+    report = BenchmarkReport(
+        driver=name,
+        templates=templates,
+        completed=stats['completed'],
+        failed=stats['failed'],
+        rate_limited=stats['rate_limited'],
+        wall_seconds=round(stats['wall_seconds'], 3),
+        templates_per_minute=round(simulations / stats['wall_seconds'] * 60, 2),
+        slot_utilization=round(stats['slot_utilization'], 4),
+        peak_slots=stats['peak_running'],
+        latency_p50=round(float(np.percentile(latencies, 50)), 3),
+        latency_p95=round(float(np.percentile(latencies, 95)), 3),
+        cpu_per_simulation_ms=round(client_cpu / max(simulations, 1) * 1000, 2)
+    )
+    logger.info(report.summary())
+    return report
+
+
+# ----------------------------------------------------------------- drivers
+
+
+def drive_simulator_tester(templates: List[str], region: str = 'USA',
+                           poll_interval: float = 0.2) -> Callable[[ReplayBrainAPI], int]:
+    """SimulatorTester.simulate_batch + wait_for_results over the given templates"""
+    def driver(api: ReplayBrainAPI) -> int:
+        from ..core.simulator_tester import SimulatorTester, SimulationSettings
+
+        tester = SimulatorTester(api.session(), default_region_configs(), api_base=api.base_url,
+                                 poll_interval=poll_interval)
+        try:
+            futures = tester.simulate_batch(templates, region, SimulationSettings(region=region))
+            tester.wait_for_results(futures)
+        finally:
+            tester.executor.shutdown(wait=False)
+        return len(templates)
+    return driver
+
+
+class _ReplayTemplateSource:
+    """Stands in for the LLM: hands out recorded templates per region, each once"""
+
+    def __init__(self, fixtures: ReplayFixtures):
+        self.remaining: Dict[str, List[str]] = {}
+        for trace in fixtures.simulations:
+            pending = self.remaining.setdefault(trace.region or 'USA', [])
+            if trace.template and trace.template not in pending:
+                pending.append(trace.template)
+        self.ollama_manager = self
+        self.template_generator = self
+        self.operator_fetcher = None
+
+    def generate_template(self, prompt: str = '', region: str = 'USA', **kwargs) -> Optional[str]:
+        pending = self.remaining.get(region)
+        return pending.pop(0) if pending else None
+
+    def get_data_fields_for_region(self, region: str) -> List[Dict]:
+        return []
+
+    @property
+    def exhausted(self) -> bool:
+        return not any(self.remaining.values())
+
+
+def drive_mining_coordinator(fixtures: ReplayFixtures, db_path: str,
+                             poll_interval: float = 0.2) -> Callable[[ReplayBrainAPI], int]:
+    """
+    MiningCoordinator generate/dedupe/select cycles, with the pending queue drained
+    through SlotManager dispatch and SimulatorTester, results stored to BacktestStorage
+    """
+    def driver(api: ReplayBrainAPI) -> int:
+        from ..core.mining.mining_coordinator import MiningCoordinator
+        from ..core.simulator_tester import SimulatorTester, SimulationSettings
+        from ..storage.backtest_storage import BacktestStorage
+
+        source = _ReplayTemplateSource(fixtures)
+        regions = sorted(source.remaining)
+        coordinator = MiningCoordinator(db_path=db_path, max_simulations=10 ** 6)
+        coordinator.search_strategy.initialize(regions)
+        coordinator.slot_manager.reset_delay = 0.0
+        storage = BacktestStorage(db_path)
+        tester = SimulatorTester(api.session(), default_region_configs(), api_base=api.base_url,
+                                 poll_interval=poll_interval)
+        in_flight = {}
+        submitted = 0
+
+        def finished(future, slot_ids):
+            success = False
+            try:
+                result = future.result()
+                success = result.success
+                storage.store_result(result)
+                coordinator.stats['templates_simulated'] += 1
+                coordinator.stats['simulations_successful' if success else 'simulations_failed'] += 1
+            finally:
+                coordinator.slot_manager.release_slots(slot_ids, success=success)
+
+        try:
+            while True:
+                if len(coordinator.generated_templates_queue) < 10 and not source.exhausted:
+                    for _ in regions:
+                        coordinator._generate_templates_batch(source, batch_size=5)
+                coordinator._process_simulations(tester, storage)
+                while coordinator.pending_simulations:
+                    template, region = coordinator.pending_simulations.pop(0)
+                    coordinator.slot_manager.enqueue(template, region, submitted)
+                    submitted += 1
+                for job, slot_ids in coordinator.slot_manager.dispatch():
+                    template, region, _, _ = job.payload
+                    future = tester.simulate_template_concurrent(template, region,
+                                                                 SimulationSettings(region=region))
+                    future.add_done_callback(lambda f, s=slot_ids: finished(f, s))
+                    in_flight[future] = slot_ids
+                in_flight = {f: s for f, s in in_flight.items() if not f.done()}
+                if (source.exhausted and not coordinator.generated_templates_queue
+                        and not coordinator.slot_manager.get_queue_length() and not in_flight):
+                    break
+                if in_flight and not coordinator.slot_manager.get_queue_length():
+                    wait(list(in_flight), timeout=1.0, return_when=FIRST_COMPLETED)
+                else:
+                    coordinator.slot_manager.wait_for_slot(timeout=0.05)
+        finally:
+            tester.executor.shutdown(wait=True)
+        logger.info(f"Mining coordinator stats: {coordinator.get_stats()}")
+        return submitted
+    return driver
+
+
+@contextlib.contextmanager
+def _generation_one_script(directory: str, workdir: str):
+    """Import a generation_one script from its directory and run it inside workdir"""
+    previous = os.getcwd()
+    sys.path.insert(0, directory)
+    os.chdir(workdir)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+        sys.path.remove(directory)
+
+
+def _write_credentials(workdir: str) -> str:
+    path = os.path.join(workdir, 'credential.txt')
+    with open(path, 'w') as f:
+        json.dump(['replay@example.com', 'replay'], f)
+    return path
+
+
+def drive_template_generator_v2(templates: List[str], region: str = 'USA', delay: int = 1,
+                                script_dir: Optional[str] = None) -> Callable[[ReplayBrainAPI], int]:
+    """
+    EnhancedTemplateGeneratorV2.multi_simulate_templates over recorded templates
+    (generation is replayed rather than asking Ollama)
+    """
+    script_dir = script_dir or os.path.join(GENERATION_ONE, 'consultant-templates-ollama')
+
+    def driver(api: ReplayBrainAPI) -> int:
+        with tempfile.TemporaryDirectory() as workdir, _generation_one_script(script_dir, workdir), \
+                replay_sessions(api):
+            from enhanced_template_generator_v2 import EnhancedTemplateGeneratorV2
+
+            generator = EnhancedTemplateGeneratorV2(_write_credentials(workdir))
+            generator.api_call_interval = 0.0
+            generator.multi_simulate_templates([{'template': t, 'region': region} for t in templates],
+                                               region, delay)
+            generator.executor.shutdown(wait=False)
+        return len(templates)
+    return driver
+
+
+def drive_pyramid_crasher(templates: List[str], region: str = 'USA', delay: int = 1,
+                          script_dir: Optional[str] = None) -> Callable[[ReplayBrainAPI], int]:
+    """PyramidCrasher.simulate_pyramid_template on its own 3-worker executor"""
+    script_dir = script_dir or os.path.join(GENERATION_ONE, 'consultant-pyramid-crasher')
+
+    def driver(api: ReplayBrainAPI) -> int:
+        with tempfile.TemporaryDirectory() as workdir, _generation_one_script(script_dir, workdir), \
+                replay_sessions(api):
+            from pyramid_crasher import PyramidCrasher
+
+            crasher = PyramidCrasher(_write_credentials(workdir))
+            futures = [
+                crasher.executor.submit(crasher.simulate_pyramid_template,
+                                        {'template': t, 'strategy': crasher.strategies[i % len(crasher.strategies)]},
+                                        region, delay)
+                for i, t in enumerate(templates)
+            ]
+            wait(futures)
+            crasher.executor.shutdown(wait=False)
+        return len(templates)
+    return driver
+
+
+DRIVERS = ('simulator_tester', 'mining_coordinator', 'template_generator_v2', 'pyramid_crasher')
+
+
+def build_driver(name: str, fixtures: ReplayFixtures, region: str, workdir: str,
+                 poll_interval: float) -> Callable[[ReplayBrainAPI], int]:
+    templates = fixtures.templates(region) or fixtures.templates()
+    if name == 'simulator_tester':
+        return drive_simulator_tester(templates, region, poll_interval)
+    if name == 'mining_coordinator':
+        return drive_mining_coordinator(fixtures, os.path.join(workdir, 'benchmark_backtests.db'), poll_interval)
+    if name == 'template_generator_v2':
+        return drive_template_generator_v2(templates, region)
+    if name == 'pyramid_crasher':
+        return drive_pyramid_crasher(templates, region)
+    raise ValueError(f"Unknown driver: {name}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline replay benchmark for the mining stack")
+    parser.add_argument('fixtures', help="Replay fixture file recorded with TrafficRecorder")
+    parser.add_argument('--driver', choices=DRIVERS + ('all',), default='simulator_tester')
+    parser.add_argument('--region', default='USA')
+    parser.add_argument('--latency-scale', type=float, default=1.0,
+                        help="Multiplier on recorded simulation durations and round trips")
+    parser.add_argument('--request-latency', type=float, default=None,
+                        help="Fixed per-request delay in seconds (overrides recorded round trips)")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="Probability of an injected 429")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="Probability of an injected failure")
+    parser.add_argument('--max-concurrent', type=int, default=8)
+    parser.add_argument('--poll-interval', type=float, default=0.2)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--json', help="Write reports to this file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    fixtures = ReplayFixtures.load(args.fixtures)
+    api_options = {'latency_scale': args.latency_scale, 'request_latency': args.request_latency,
+                   'rate_limit_rate': args.rate_limit_rate, 'failure_rate': args.failure_rate,
+                   'max_concurrent': args.max_concurrent, 'seed': args.seed}
+
+    reports = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in (DRIVERS if args.driver == 'all' else (args.driver,)):
+            try:
+                driver = build_driver(name, fixtures, args.region, workdir, args.poll_interval)
+                reports.append(run_benchmark(name, driver, fixtures, **api_options))
+            except ImportError as e:
+                logger.error(f"Skipping {name}: {e}")
+
+    for report in reports:
+        print(report.summary())
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump([report.to_dict() for report in reports], f, indent=2)
+    return 0 if reports else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,367 @@
+"""
+Replay WorldQuant Brain API
+Local fake API that serves recorded simulation traces with configurable latency,
+429 injection and failure rates, so the mining stack can be benchmarked offline
+"""
+
+import contextlib
+import json
+import random
+import re
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import cycle
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+
+from .traffic_recorder import ReplayFixtures, RecordedResponse, SimulationTrace, extras_key
+
+REPLAY_HOSTS = ('api.worldquantbrain.com', 'platform.worldquantbrain.com')
+TERMINAL_STATUSES = ('COMPLETE', 'ERROR', 'FAILED', 'WARNING')
+
+
+def _median(values: List[float]) -> float:
+    return statistics.median(values) if values else 0.0
+
+
+class ReplaySession(requests.Session):
+    """
+    requests.Session that sends WorldQuant Brain traffic to a replay server
+
+    Hard-coded `https://api.worldquantbrain.com/...` URLs (generation_one scripts)
+    are rewritten to the replay server's base URL.
+    """
+
+    replay_base_url: Optional[str] = None
+
+    def __init__(self, replay_base_url: Optional[str] = None):
+        super().__init__()
+        if replay_base_url:
+            self.replay_base_url = replay_base_url
+
+    def request(self, method, url, *args, **kwargs):
+        return super().request(method, replay_url(url, self.replay_base_url), *args, **kwargs)
+
+
+def replay_url(url: str, replay_base_url: Optional[str]) -> str:
+    """url with a WorldQuant Brain host replaced by the replay server's"""
+    parts = urlsplit(url)
+    if replay_base_url and parts.hostname in REPLAY_HOSTS:
+        base = urlsplit(replay_base_url)
+        url = urlunsplit((base.scheme, base.netloc, parts.path, parts.query, parts.fragment))
+    return url
+
+
+@contextlib.contextmanager
+def replay_sessions(api: 'ReplayBrainAPI'):
+    """
+    Route every requests.Session created inside the block to the replay server
+
+    For scripts that build their own session in __init__ (EnhancedTemplateGeneratorV2,
+    PyramidCrasher). Session classes defined before the block (BrainSession from
+    brain_client) are routed too, through requests.Session.request.
+    """
+    original = requests.Session
+    original_request = original.request
+
+    def request(session, method, url, *args, **kwargs):
+        return original_request(session, method, replay_url(url, api.base_url), *args, **kwargs)
+
+    bound = type('BoundReplaySession', (ReplaySession,), {'replay_base_url': api.base_url})
+    requests.Session = bound
+    original.request = request
+    try:
+        yield bound
+    finally:
+        requests.Session = original
+        original.request = original_request
+
+
+class ReplayBrainAPI:
+    """
+    Threaded replay server (use as a context manager)
+
+    Each submitted simulation is bound to a recorded trace (same template if one was
+    recorded, otherwise round robin) and completes after the trace's recorded
+    duration times `latency_scale`. Every response is delayed by its recorded
+    round-trip time times `latency_scale` (or `request_latency` when given).
+    """
+
+    def __init__(self, fixtures: ReplayFixtures, latency_scale: float = 1.0,
+                 request_latency: Optional[float] = None, rate_limit_rate: float = 0.0,
+                 failure_rate: float = 0.0, max_concurrent: int = 8, seed: Optional[int] = None):
+        """
+        Args:
+            fixtures: Recorded traffic to serve
+            latency_scale: Multiplier on recorded durations and round-trip times
+            request_latency: Fixed per-request delay (overrides recorded round-trip times)
+            rate_limit_rate: Probability that a submission is answered with 429
+            failure_rate: Probability that a simulation ends in ERROR regardless of its trace
+            max_concurrent: Concurrent simulations before real 429s
+            seed: RNG seed for injected 429s and failures
+        """
+        if not fixtures.simulations:
+            raise ValueError("Replay fixtures contain no simulations")
+        self.fixtures = fixtures
+        self.latency_scale = latency_scale
+        self.request_latency = request_latency
+        self.rate_limit_rate = rate_limit_rate
+        self.failure_rate = failure_rate
+        self.max_concurrent = max_concurrent
+        self.rng = random.Random(seed)
+
+        self.lock = threading.Lock()
+        self._by_template: Dict[str, List[SimulationTrace]] = {}
+        for trace in fixtures.simulations:
+            self._by_template.setdefault(trace.template, []).append(trace)
+        self._round_robin = cycle(fixtures.simulations)
+        self.round_trip = {
+            'submit': _median([t.submit.elapsed for t in fixtures.simulations if t.submit]),
+            'progress': _median([p.elapsed for t in fixtures.simulations for p in t.progress]),
+            'alpha': _median([t.alpha.elapsed for t in fixtures.simulations if t.alpha])
+        }
+        self.simulations: Dict[int, Dict] = {}
+        self.alphas: Dict[str, int] = {}
+        self.next_id = 1
+        self.reset_stats()
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def session(self) -> ReplaySession:
+        """Session pointed at this server (already carrying the replay session cookie)"""
+        session = ReplaySession(self.base_url)
+        session.cookies.set('t', 'replay')
+        return session
+
+    # ------------------------------------------------------------------ stats
+
+    def reset_stats(self):
+        with self.lock:
+            self.started_at = time.time()
+            self.running = 0
+            self.peak_running = 0
+            self._busy_area = 0.0  # Integral of running simulations over time
+            self._last_change = self.started_at
+            self.counters = {'submitted': 0, 'accepted': 0, 'rate_limited': 0, 'injected_429': 0,
+                             'injected_failures': 0, 'completed': 0, 'failed': 0, 'requests': 0}
+            self.latencies: List[float] = []  # Submit -> terminal status observed by client
+            self.server_cpu = 0.0
+
+    def _set_running(self, delta: int):
+        """Adjust running count and accumulate busy slot-seconds (caller holds the lock)"""
+        now = time.time()
+        self._busy_area += self.running * (now - self._last_change)
+        self._last_change = now
+        self.running += delta
+        self.peak_running = max(self.peak_running, self.running)
+
+    def stats(self) -> Dict:
+        with self.lock:
+            self._set_running(0)
+            wall = max(self._last_change - self.started_at, 1e-9)
+            return {
+                **self.counters,
+                'wall_seconds': wall,
+                'slot_utilization': self._busy_area / (wall * self.max_concurrent),
+                'peak_running': self.peak_running,
+                'latencies': list(self.latencies),
+                'server_cpu': self.server_cpu
+            }
+
+    # ----------------------------------------------------------- simulations
+
+    def _trace_for(self, template: str) -> SimulationTrace:
+        traces = self._by_template.get(template)
+        return self.rng.choice(traces) if traces else next(self._round_robin)
+
+    def _submit(self, payload: Dict) -> tuple:
+        """Start a simulation; returns (status, body, headers) for the POST (caller holds the lock)"""
+        self.counters['submitted'] += 1
+        if self.rate_limit_rate and self.rng.random() < self.rate_limit_rate:
+            self.counters['rate_limited'] += 1
+            self.counters['injected_429'] += 1
+            return 429, {'detail': 'SIMULATION_LIMIT_EXCEEDED'}, {'Retry-After': '1'}
+        if self.running >= self.max_concurrent:
+            self.counters['rate_limited'] += 1
+            return 429, {'detail': 'CONCURRENT_SIMULATION_LIMIT_EXCEEDED'}, {'Retry-After': '1'}
+
+        trace = self._trace_for(payload.get('regular') or payload.get('expression', ''))
+        fail = bool(self.failure_rate) and self.rng.random() < self.failure_rate
+        if fail:
+            self.counters['injected_failures'] += 1
+        sim_id = self.next_id
+        self.next_id += 1
+        now = time.time()
+        self.simulations[sim_id] = {'trace': trace, 'submitted_at': now, 'fail': fail, 'finished': False,
+                                    'done_at': now + trace.duration * self.latency_scale}
+        self.counters['accepted'] += 1
+        self._set_running(1)
+        return 201, {}, {'Location': f"{self.base_url}/simulations/{sim_id}"}
+
+    def _finish(self, sim_id: int, sim: Dict, status: str):
+        """Record a terminal status the first time a client sees it (caller holds the lock)"""
+        if sim['finished']:
+            return
+        sim['finished'] = True
+        self._set_running(-1)
+        self.latencies.append(time.time() - sim['submitted_at'])
+        self.counters['completed' if status == 'COMPLETE' and not sim['fail'] else 'failed'] += 1
+
+    def _progress(self, sim_id: int) -> tuple:
+        with self.lock:
+            sim = self.simulations.get(sim_id)
+            if sim is None:
+                return 404, {'detail': 'Not found.'}, {}
+            trace = sim['trace']
+            if time.time() < sim['done_at']:
+                pending = [p for p in trace.progress
+                           if isinstance(p.body, dict) and p.body.get('status') not in TERMINAL_STATUSES]
+                body = pending[-1].body if pending else {'status': 'RUNNING'}
+                retry_after = pending[-1].headers.get('Retry-After') if pending else None
+                headers = {'Retry-After': f"{float(retry_after) * self.latency_scale:.3f}"} if retry_after else {}
+                return 200, body, headers
+            if sim['fail']:
+                self._finish(sim_id, sim, 'ERROR')
+                return 200, {'status': 'ERROR', 'message': 'Injected failure (replay)'}, {}
+            final = dict(trace.progress[-1].body) if trace.progress else {'status': 'COMPLETE'}
+            status = final.get('status', 'COMPLETE')
+            if status == 'COMPLETE':
+                alpha_id = f"R{sim_id}"
+                final['alpha'] = alpha_id
+                self.alphas[alpha_id] = sim_id
+            self._finish(sim_id, sim, status)
+            return 200, final, {}
+
+    def _alpha(self, alpha_id: str) -> tuple:
+        with self.lock:
+            sim_id = self.alphas.get(alpha_id)
+            trace = self.simulations[sim_id]['trace'] if sim_id is not None else None
+        if trace is None or trace.alpha is None:
+            return 404, {'detail': 'Not found.'}, {}
+        body = dict(trace.alpha.body) if isinstance(trace.alpha.body, dict) else trace.alpha.body
+        if isinstance(body, dict):
+            body['id'] = alpha_id
+        return trace.alpha.status, body, {}
+
+    def _simulate_sync(self, payload: Dict) -> tuple:
+        """Legacy blocking endpoint used by PyramidCrasher: wait out the trace, return flat metrics"""
+        with self.lock:
+            status, body, headers = self._submit(payload)
+            if status != 201:
+                return status, body, headers
+            sim_id = self.next_id - 1
+            sim = self.simulations[sim_id]
+        time.sleep(max(0.0, sim['done_at'] - time.time()))
+        status, final, _ = self._progress(sim_id)
+        metrics = {}
+        if final.get('status') == 'COMPLETE':
+            _, alpha, _ = self._alpha(final['alpha'])
+            metrics = alpha.get('is', {}) if isinstance(alpha, dict) else {}
+        return 200, {'success': final.get('status') == 'COMPLETE', 'sharpe': metrics.get('sharpe', 0.0),
+                     'fitness': metrics.get('fitness', 0.0), 'turnover': metrics.get('turnover', 0.0),
+                     'pnl': metrics.get('pnl', 0.0), 'message': final.get('message', '')}, {}
+
+    def _extra(self, url: str) -> Optional[RecordedResponse]:
+        recorded = self.fixtures.extras.get(extras_key('GET', url))
+        if recorded is None and '?' not in url:
+            prefix = extras_key('GET', url) + '?'
+            recorded = next((v for k, v in self.fixtures.extras.items() if k.startswith(prefix)), None)
+        return recorded
+
+    # ---------------------------------------------------------------- server
+
+    def _delay(self, recorded: Optional[RecordedResponse] = None, default: float = 0.0):
+        delay = self.request_latency
+        if delay is None:
+            delay = (recorded.elapsed if recorded else default) * self.latency_scale
+        if delay > 0:
+            time.sleep(delay)
+
+    def _handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body=None, headers: Optional[Dict] = None):
+                payload = json.dumps(body if body is not None else {}).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _timed(self, handler):
+                cpu_start = time.thread_time()
+                try:
+                    status, body, headers = handler()
+                finally:
+                    with api.lock:
+                        api.counters['requests'] += 1
+                        api.server_cpu += time.thread_time() - cpu_start
+                self._send(status, body, headers)
+
+            def do_GET(self):
+                self._timed(self._get)
+
+            def do_POST(self):
+                self._timed(self._post)
+
+            def _get(self):
+                path = urlsplit(self.path).path
+                match = re.match(r'^/simulations/(\d+)$', path)
+                if match:
+                    api._delay(default=api.round_trip['progress'])
+                    return api._progress(int(match.group(1)))
+                match = re.match(r'^/alphas/(\w+)$', path)
+                if match:
+                    api._delay(default=api.round_trip['alpha'])
+                    return api._alpha(match.group(1))
+                if path == '/users/self':
+                    return 200, {'id': 'replay'}, {}
+                recorded = api._extra(self.path)
+                if recorded is None:
+                    return 404, {'detail': 'Not recorded.'}, {}
+                api._delay(recorded)
+                return recorded.status, recorded.body, {}
+
+            def _post(self):
+                length = int(self.headers.get('Content-Length', 0))
+                raw = self.rfile.read(length) if length else b''
+                path = urlsplit(self.path).path
+                if path == '/authentication':
+                    return 201, {'user': {'id': 'replay'}}, {'Set-Cookie': 't=replay; Path=/'}
+                try:
+                    payload = json.loads(raw or b'{}')
+                except ValueError:
+                    return 400, {'detail': 'Invalid JSON'}, {}
+                if path in ('/simulations', '/simulations/'):
+                    api._delay(default=api.round_trip['submit'])
+                    with api.lock:
+                        return api._submit(payload)
+                if path == '/static/simulations.json':
+                    return api._simulate_sync(payload)
+                return 404, {'detail': 'Not recorded.'}, {}
+
+        return Handler
@@ -0,0 +1,218 @@
+"""
+Traffic Recorder
+Captures real simulation traffic (submit, progress polls, alpha details) with
+timings into replay fixtures for the offline benchmark harness
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_VERSION = 1
+
+_SIMULATIONS_PATH = re.compile(r'^/simulations/?$')
+_PROGRESS_PATH = re.compile(r'^/simulations/[^/]+$')
+_ALPHA_PATH = re.compile(r'^/alphas/([^/]+)$')
+
+
+@dataclass
+class RecordedResponse:
+    """One HTTP exchange: status, body, selected headers and server time"""
+    status: int
+    elapsed: float  # Seconds from request sent to response parsed
+    offset: float = 0.0  # Seconds since the simulation was submitted
+    body: Optional[object] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class SimulationTrace:
+    """Full lifecycle of one simulation"""
+    template: str
+    region: str
+    settings: Dict = field(default_factory=dict)
+    submit: Optional[RecordedResponse] = None
+    progress: List[RecordedResponse] = field(default_factory=list)
+    alpha: Optional[RecordedResponse] = None
+    duration: float = 0.0  # Submit -> terminal status, seconds
+
+    @property
+    def final_status(self) -> str:
+        if self.progress and isinstance(self.progress[-1].body, dict):
+            return self.progress[-1].body.get('status', 'UNKNOWN')
+        return 'UNKNOWN'
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SimulationTrace':
+        def response(value):
+            return RecordedResponse(**value) if value else None
+
+        return cls(
+            template=data.get('template', ''),
+            region=data.get('region', ''),
+            settings=data.get('settings', {}),
+            submit=response(data.get('submit')),
+            progress=[RecordedResponse(**p) for p in data.get('progress', [])],
+            alpha=response(data.get('alpha')),
+            duration=data.get('duration', 0.0)
+        )
+
+
+@dataclass
+class ReplayFixtures:
+    """Recorded simulations plus any other GET responses (data fields, operators, PnL)"""
+    simulations: List[SimulationTrace] = field(default_factory=list)
+    extras: Dict[str, RecordedResponse] = field(default_factory=dict)  # "GET /path?query" -> response
+    recorded_at: float = 0.0
+    version: int = FIXTURE_VERSION
+
+    def templates(self, region: Optional[str] = None) -> List[str]:
+        """Templates in recording order (optionally for one region)"""
+        return [trace.template for trace in self.simulations
+                if trace.template and (region is None or trace.region == region)]
+
+    def save(self, path: str):
+        data = {
+            'version': self.version,
+            'recorded_at': self.recorded_at or time.time(),
+            'simulations': [asdict(trace) for trace in self.simulations],
+            'extras': {key: asdict(value) for key, value in self.extras.items()}
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1)
+        logger.info(f"Saved {len(self.simulations)} simulation traces to {path}")
+
+    @classmethod
+    def load(cls, path: str) -> 'ReplayFixtures':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version', FIXTURE_VERSION) > FIXTURE_VERSION:
+            raise ValueError(f"Fixture version {data['version']} is newer than supported {FIXTURE_VERSION}")
+        return cls(
+            simulations=[SimulationTrace.from_dict(t) for t in data.get('simulations', [])],
+            extras={key: RecordedResponse(**value) for key, value in data.get('extras', {}).items()},
+            recorded_at=data.get('recorded_at', 0.0),
+            version=data.get('version', FIXTURE_VERSION)
+        )
+
+
+def extras_key(method: str, url: str) -> str:
+    """Fixture key for a non-simulation request"""
+    parts = urlsplit(url)
+    return f"{method.upper()} {parts.path}" + (f"?{parts.query}" if parts.query else "")
+
+
+class TrafficRecorder:
+    """
+    Records simulation traffic from any requests.Session through a response hook
+
+    Usage:
+        recorder = TrafficRecorder()
+        recorder.attach(session)      # authenticated session used by SimulatorTester etc.
+        ... run a normal mining session ...
+        recorder.fixtures().save('replay.json')
+    """
+
+    RECORDED_HEADERS = ('Location', 'Retry-After')
+
+    def __init__(self, record_extras: bool = True):
+        """
+        Args:
+            record_extras: Also keep other GET responses (data fields, operators, PnL)
+        """
+        self.record_extras = record_extras
+        self.lock = threading.Lock()
+        self.traces: List[SimulationTrace] = []
+        self._by_progress_url: Dict[str, SimulationTrace] = {}
+        self._by_alpha_id: Dict[str, SimulationTrace] = {}
+        self._submitted_at: Dict[int, float] = {}  # id(trace) -> submit time
+        self.extras: Dict[str, RecordedResponse] = {}
+
+    def attach(self, session: requests.Session) -> requests.Session:
+        session.hooks.setdefault('response', []).append(self.hook)
+        return session
+
+    def detach(self, session: requests.Session):
+        hooks = session.hooks.get('response', [])
+        if self.hook in hooks:
+            hooks.remove(self.hook)
+
+    def _recorded(self, response: requests.Response, offset: float = 0.0) -> RecordedResponse:
+        try:
+            body = response.json() if response.content else None
+        except ValueError:
+            body = response.text
+        headers = {name: response.headers[name] for name in self.RECORDED_HEADERS if name in response.headers}
+        return RecordedResponse(status=response.status_code, elapsed=response.elapsed.total_seconds(),
+                                offset=round(offset, 3), body=body, headers=headers)
+
+    def hook(self, response: requests.Response, *args, **kwargs):
+        """requests response hook; never raises into the caller"""
+        try:
+            self._record(response)
+        except Exception as e:
+            logger.debug(f"Traffic recorder skipped {response.url}: {e}")
+        return response
+
+    def _record(self, response: requests.Response):
+        request = response.request
+        path = urlsplit(request.url).path
+        now = time.time()
+
+        if request.method == 'POST' and _SIMULATIONS_PATH.match(path):
+            payload = json.loads(request.body or b'{}')
+            trace = SimulationTrace(
+                template=payload.get('regular', ''),
+                region=payload.get('settings', {}).get('region', ''),
+                settings=payload.get('settings', {}),
+                submit=self._recorded(response)
+            )
+            with self.lock:
+                self.traces.append(trace)
+                self._submitted_at[id(trace)] = now
+                location = response.headers.get('Location')
+                if location:
+                    self._by_progress_url[location] = trace
+            return
+
+        if request.method != 'GET':
+            return
+
+        with self.lock:
+            trace = self._by_progress_url.get(request.url)
+        if trace is not None and _PROGRESS_PATH.match(path):
+            offset = now - self._submitted_at[id(trace)]
+            recorded = self._recorded(response, offset)
+            with self.lock:
+                trace.progress.append(recorded)
+                status = recorded.body.get('status') if isinstance(recorded.body, dict) else None
+                if status and status not in ('RUNNING', 'PENDING', 'QUEUED', 'CREATED', 'SUBMITTED',
+                                             'IN_PROGRESS', 'PROCESSING'):
+                    trace.duration = round(offset, 3)
+                    if recorded.body.get('alpha'):
+                        self._by_alpha_id[str(recorded.body['alpha'])] = trace
+            return
+
+        match = _ALPHA_PATH.match(path)
+        with self.lock:
+            trace = self._by_alpha_id.get(match.group(1)) if match else None
+            if trace is not None and trace.alpha is None:
+                trace.alpha = self._recorded(response, now - self._submitted_at[id(trace)])
+                return
+            if self.record_extras and response.status_code == 200:
+                self.extras[extras_key('GET', request.url)] = self._recorded(response)
+
+    def fixtures(self) -> ReplayFixtures:
+        """Completed traces (submitted and reached a terminal status)"""
+        with self.lock:
+            complete = [t for t in self.traces if t.submit and t.submit.status == 201 and t.duration > 0]
+            return ReplayFixtures(simulations=list(complete), extras=dict(self.extras), recorded_at=time.time())
@@ -93,6 +93,7 @@ a = Analysis(
         'generation_two.ollama',
         'generation_two.data_fetcher',
         'generation_two.storage',
+        'brain_client',
     ],
     hookspath=[],
     hooksconfig={{}},
@@ -408,6 +409,7 @@ a = Analysis(
         'generation_two.ollama',
         'generation_two.data_fetcher',
         'generation_two.storage',
+        'brain_client',
     ],
     hookspath=[],
     hooksconfig={{}},
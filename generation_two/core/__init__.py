@@ -2,9 +2,13 @@
 Core generation components
 """
 
-from .template_generator import TemplateGenerator
-from .simulator_tester import SimulatorTester, SimulationSettings, SimulationResult
-from .enhanced_template_generator_v3 import EnhancedTemplateGeneratorV3
+from .._lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    '.template_generator': ['TemplateGenerator'],
+    '.simulator_tester': ['SimulatorTester', 'SimulationSettings', 'SimulationResult'],
+    '.enhanced_template_generator_v3': ['EnhancedTemplateGeneratorV3']
+})
 
 __all__ = [
     'TemplateGenerator',
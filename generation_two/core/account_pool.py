@@ -0,0 +1,532 @@
+"""
+Account Pool for Multi-Account Simulation
+Spreads simulations across several WorldQuant Brain accounts
+
+Each account has its own authenticated session, SlotManager and daily
+SimulationCounter. A simulation is routed to the account with the most
+headroom (free slots, capped by its remaining daily budget), and a background
+thread re-validates sessions and re-authenticates expired ones from their
+cookie files. One result cache is shared by all accounts, so a template
+equivalent to one already simulated costs no slot and no budget. A
+submission the API never accepted is refunded to the account's budget.
+
+PooledSimulator gives the GUI steps that call submit_simulation and
+monitor_simulation separately the same routing.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from .credential_manager import API_BASE, CredentialManager
+from .region_config import REGION_DEFAULT_UNIVERSE
+from .simulation_counter import SimulationCounter
+from .simulator_tester import (CACHED_PROGRESS_PREFIX, SimulationResult, SimulationSettings, SimulatorTester,
+                               cache_settings, lookup_cached_result)
+from brain_client.result_cache import ResultCache, result_key
+from .slot_manager import SlotManager
+
+logger = logging.getLogger(__name__)
+
+# Window used for the simulations/hour throughput figure
+THROUGHPUT_WINDOW = 900
+
+
+def default_region_configs() -> Dict:
+    """Region configs in the shape SimulatorTester expects"""
+    return {
+        region: type('RegionConfig', (), {'region': region, 'universe': universe, 'delay': 1})()
+        for region, universe in REGION_DEFAULT_UNIVERSE.items()
+    }
+
+
+@dataclass
+class Account:
+    """One WorldQuant Brain account in the pool"""
+    name: str
+    cookie_file: Optional[Path]
+    credential_manager: CredentialManager
+    slot_manager: SlotManager
+    counter: SimulationCounter
+    simulator: Optional[SimulatorTester] = None
+    remaining_today: int = 0
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    auth_failures: int = 0
+    last_validated: float = 0.0
+    needs_check: bool = False
+    completions: Deque[float] = field(default_factory=deque)
+
+    @property
+    def authenticated(self) -> bool:
+        return self.credential_manager.is_authenticated() and self.simulator is not None
+
+    def free_slots(self) -> int:
+        return self.slot_manager.get_available_slots_count()
+
+    def headroom(self) -> int:
+        """Simulations this account can start right now"""
+        if not self.authenticated:
+            return 0
+        return min(self.free_slots(), self.remaining_today)
+
+    def throughput(self, now: float) -> float:
+        """Completed simulations per hour over the throughput window"""
+        while self.completions and self.completions[0] < now - THROUGHPUT_WINDOW:
+            self.completions.popleft()
+        return len(self.completions) * 3600.0 / THROUGHPUT_WINDOW
+
+
+@dataclass
+class AccountLease:
+    """Slots held on one account for one simulation"""
+    account: Account
+    slot_ids: List[int]
+
+
+class AccountPool:
+    """
+    Routes simulations across N accounts
+
+    Usage:
+        pool = AccountPool.from_config("accounts.json")
+        pool.authenticate_all()
+        pool.start()
+        result = pool.simulate(template, "USA", settings)
+
+    Callers that submit and monitor in two steps use pool.simulator() instead.
+    """
+
+    def __init__(self, accounts: List[Account], api_base: str = API_BASE, region_configs: Optional[Dict] = None,
+                 reauth_interval: float = 1800, check_interval: float = 30, poll_interval: float = 5,
+                 result_cache: Optional[ResultCache] = None):
+        """
+        Initialize account pool
+
+        Args:
+            accounts: Accounts in the pool
+            api_base: API root (a local fake API in tests)
+            region_configs: Region configs for the simulators (default: REGION_DEFAULT_UNIVERSE)
+            reauth_interval: Seconds after which a session is re-validated even if it looks healthy
+            check_interval: Seconds between background health checks
+            poll_interval: Seconds between simulation progress checks
+            result_cache: Result cache shared by every account (default: in memory)
+        """
+        self.accounts = accounts
+        self.api_base = api_base.rstrip('/')
+        self.region_configs = region_configs or default_region_configs()
+        self.reauth_interval = reauth_interval
+        self.check_interval = check_interval
+        self.poll_interval = poll_interval
+        self.result_cache = result_cache if result_cache is not None else ResultCache(path=None)
+        self._lock = threading.Lock()
+        self._capacity = threading.Condition(self._lock)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, config_path: str, db_path: str = "generation_two_backtests.db", **kwargs) -> 'AccountPool':
+        """
+        Build a pool from a JSON config
+
+        Format:
+            {"accounts": [{"name": "alice", "cookie_file": "cookies/alice.txt",
+                           "max_slots": 8, "daily_limit": 5000}, ...]}
+
+        Relative cookie paths are resolved against the config file's directory.
+        """
+        config_path = Path(config_path)
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        api_base = kwargs.pop('api_base', config.get('api_base', API_BASE))
+        accounts = []
+        for entry in config.get('accounts', []):
+            cookie_file = Path(entry['cookie_file'])
+            if not cookie_file.is_absolute():
+                cookie_file = config_path.parent / cookie_file
+            accounts.append(cls.make_account(
+                entry['name'], cookie_file, db_path=db_path, api_base=api_base,
+                max_slots=entry.get('max_slots', 8),
+                daily_limit=entry.get('daily_limit', 5000),
+                region_costs=entry.get('region_costs'),
+            ))
+        return cls(accounts, api_base=api_base, **kwargs)
+
+    @staticmethod
+    def make_account(name: str, cookie_file: Optional[Path], db_path: str = "generation_two_backtests.db",
+                     api_base: str = API_BASE, max_slots: int = 8, daily_limit: int = 5000,
+                     region_costs: Optional[Dict[str, int]] = None, reset_delay: float = 2.0) -> Account:
+        """Create an (unauthenticated) account with its own slot manager and daily counter"""
+        cookie_file = Path(cookie_file) if cookie_file else None
+        return Account(
+            name=name,
+            cookie_file=cookie_file,
+            credential_manager=CredentialManager(
+                base_path=str(cookie_file.parent) if cookie_file else None, api_base=api_base),
+            slot_manager=SlotManager(max_slots=max_slots, region_costs=region_costs, reset_delay=reset_delay),
+            counter=SimulationCounter(db_path, account=name, daily_limit=daily_limit),
+        )
+
+    # ----- Authentication -----
+
+    def authenticate_all(self) -> int:
+        """Authenticate every account; returns the number that succeeded"""
+        return sum(1 for account in self.accounts if self._authenticate(account))
+
+    def _authenticate(self, account: Account) -> bool:
+        """(Re-)load the cookie file and validate it, swapping in the new session"""
+        manager = account.credential_manager
+        loaded = manager.load_from_file(account.cookie_file) if account.cookie_file else manager.credentials is not None
+        if loaded and manager.validate_credentials():
+            session = manager.get_session()
+            with self._lock:
+                if account.simulator is None:
+                    account.simulator = SimulatorTester(session, self.region_configs, api_base=self.api_base,
+                                                        poll_interval=self.poll_interval,
+                                                        result_cache=self.result_cache)
+                else:
+                    account.simulator.sess = session
+                account.remaining_today = account.counter.get_status()['remaining']
+                account.last_validated = time.time()
+                account.auth_failures = 0
+                account.needs_check = False
+                self._capacity.notify_all()
+            logger.info(f"Account {account.name} authenticated ({account.remaining_today} simulations left today)")
+            return True
+
+        account.auth_failures += 1
+        manager.authenticated = False
+        logger.warning(f"Account {account.name} failed to authenticate (attempt {account.auth_failures})")
+        return False
+
+    def _session_valid(self, account: Account) -> bool:
+        """Cheap check that the current session is still accepted"""
+        if not account.authenticated:
+            return False
+        try:
+            response = account.simulator.sess.get(f'{self.api_base}/users/self', timeout=10)
+            return response.status_code == 200
+        except Exception as e:
+            logger.warning(f"Session check failed for {account.name}: {e}")
+            return False
+
+    def mark_suspect(self, account: Account):
+        """Ask the background thread to check an account's session soon"""
+        account.needs_check = True
+        self._wake.set()
+
+    def start(self):
+        """Start the background session maintenance thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._maintain, daemon=True, name="AccountPoolAuth")
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _maintain(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.check_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            for account in self.accounts:
+                try:
+                    self._maintain_account(account)
+                except Exception as e:
+                    logger.error(f"Account maintenance error for {account.name}: {e}", exc_info=True)
+
+    def _maintain_account(self, account: Account):
+        now = time.time()
+        if account.authenticated:
+            stale = now - account.last_validated > self.reauth_interval
+            if not (account.needs_check or stale):
+                return
+            if self._session_valid(account):
+                account.last_validated = now
+                account.needs_check = False
+                with self._lock:
+                    account.remaining_today = account.counter.get_status()['remaining']
+                return
+            logger.warning(f"Session for {account.name} expired, re-authenticating")
+        elif account.auth_failures and now - account.last_validated < min(600, 30 * account.auth_failures):
+            return  # Back off between failed attempts
+        account.last_validated = now
+        self._authenticate(account)
+
+    # ----- Routing -----
+
+    def acquire(self, template: str, region: str, template_index: int = 0,
+                timeout: Optional[float] = None, exclude: Tuple[str, ...] = ()) -> Optional[AccountLease]:
+        """
+        Reserve slots on the account with the most headroom
+
+        Args:
+            template: Template expression
+            region: Region code (GLB needs 2 slots)
+            template_index: Index shown in the slot display
+            timeout: Seconds to wait for capacity (None = wait indefinitely)
+            exclude: Account names to skip (e.g. the one that just failed)
+
+        Returns:
+            AccountLease, or None on timeout or when no account can take the job
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._capacity:
+            while True:
+                candidates = [a for a in self.accounts
+                              if a.name not in exclude and a.headroom() > 0
+                              and a.free_slots() >= a.slot_manager.get_slots_required(region)]
+                candidates.sort(key=lambda a: (a.headroom(), -a.slot_manager.get_active_slots_count()), reverse=True)
+                for account in candidates:
+                    slot_ids = account.slot_manager.assign_slot(template, region, template_index)
+                    if slot_ids:
+                        account.counter.increment_count()
+                        account.remaining_today -= 1
+                        account.submitted += 1
+                        return AccountLease(account, slot_ids)
+
+                if not any(a.authenticated and a.remaining_today > 0 for a in self.accounts if a.name not in exclude):
+                    return None
+                if deadline is not None and time.monotonic() >= deadline:
+                    return None
+                # Slots are reset asynchronously by the slot managers, so re-check periodically
+                self._capacity.wait(0.2)
+
+    def refund(self, lease: AccountLease):
+        """Give back the daily budget a lease spent when its submission was never accepted"""
+        account = lease.account
+        account.counter.decrement_count()
+        with self._capacity:
+            account.remaining_today = min(account.remaining_today + 1, account.counter.daily_limit)
+            account.submitted -= 1
+            self._capacity.notify_all()
+
+    def release(self, lease: AccountLease, result: Optional[SimulationResult] = None, error: Optional[str] = None):
+        """Release a lease and record the outcome"""
+        success = bool(result and result.success)
+        account = lease.account
+        account.slot_manager.release_slots(
+            lease.slot_ids,
+            success=success,
+            result={'alpha_id': result.alpha_id, 'sharpe': result.sharpe, 'returns': result.returns} if success else None,
+            error=None if success else (error or (result.error_message if result else "Unknown error"))
+        )
+        with self._capacity:
+            if success:
+                account.completed += 1
+            else:
+                account.failed += 1
+            account.completions.append(time.time())
+            self._capacity.notify_all()
+
+    def cached_result(self, template: str, region: str, settings: SimulationSettings) -> Optional[SimulationResult]:
+        """Result of an equivalent template already simulated with these settings, or None"""
+        return lookup_cached_result(self.result_cache, self.region_configs, template, region, settings)
+
+    def submit(self, template: str, region: str, settings: SimulationSettings, template_index: int = 0,
+               acquire_timeout: Optional[float] = None) -> Tuple[Optional[AccountLease], Optional[str], str]:
+        """
+        Submit one simulation on the best available account
+
+        A submission that fails (e.g. an expired session) has its budget
+        refunded, the account is queued for a session check, and the next
+        account is tried.
+
+        Returns:
+            (lease, progress_url, last_error); lease and progress_url are None
+            when no account accepted the simulation
+        """
+        tried: Tuple[str, ...] = ()
+        last_error = "No account capacity"
+        while len(tried) < len(self.accounts):
+            lease = self.acquire(template, region, template_index, timeout=acquire_timeout, exclude=tried)
+            if lease is None:
+                break
+            account = lease.account
+            tried += (account.name,)
+            try:
+                progress_url = account.simulator.submit_simulation(template, region, settings, use_cache=False)
+                if progress_url:
+                    return lease, progress_url, ""
+                last_error = f"Submission failed on account {account.name}"
+            except Exception as e:
+                logger.error(f"Submission error on account {account.name}: {e}", exc_info=True)
+                last_error = str(e)
+            self.refund(lease)
+            self.mark_suspect(account)
+            self.release(lease, error=last_error)
+        return None, None, last_error
+
+    def monitor(self, lease: AccountLease, progress_url: str, template: str, region: str,
+                settings: SimulationSettings, max_wait_time: int = 300,
+                progress_callback: Optional[Callable[[float, str, str], None]] = None) -> SimulationResult:
+        """Wait for a submitted simulation on its account and release the lease"""
+        account = lease.account
+        try:
+            result = account.simulator.monitor_simulation(
+                progress_url, template, region, settings, max_wait_time=max_wait_time,
+                progress_callback=progress_callback)
+        except Exception as e:
+            logger.error(f"Simulation error on account {account.name}: {e}", exc_info=True)
+            self.release(lease, error=str(e))
+            return SimulationResult(template=template, region=region, settings=settings, success=False,
+                                    error_message=str(e), timestamp=time.time())
+        if result.error_message == "Authentication expired":
+            self.mark_suspect(account)
+        self.release(lease, result)
+        return result
+
+    def simulate(self, template: str, region: str, settings: SimulationSettings, template_index: int = 0,
+                 progress_callback: Optional[Callable[[float, str, str], None]] = None,
+                 acquire_timeout: Optional[float] = None) -> SimulationResult:
+        """
+        Run one simulation on the best available account
+
+        A template already answered by the result cache takes no account. A
+        submission that fails is retried once on each other account (see submit).
+        """
+        cached = self.cached_result(template, region, settings)
+        if cached is not None:
+            if progress_callback:
+                progress_callback(100.0, "♻️ Result from cache", "COMPLETE")
+            return cached
+
+        lease, progress_url, last_error = self.submit(template, region, settings, template_index, acquire_timeout)
+        if lease is None:
+            return SimulationResult(template=template, region=region, settings=settings, success=False,
+                                    error_message=last_error, timestamp=time.time())
+        return self.monitor(lease, progress_url, template, region, settings, progress_callback=progress_callback)
+
+    def simulator(self, acquire_timeout: Optional[float] = None) -> 'PooledSimulator':
+        """A SimulatorTester-shaped front for callers that submit and monitor separately"""
+        return PooledSimulator(self, acquire_timeout=acquire_timeout)
+
+    def simulate_batch(self, items: List[Tuple[str, str]], settings: SimulationSettings,
+                       max_workers: Optional[int] = None) -> List[SimulationResult]:
+        """
+        Simulate (template, region) pairs concurrently across all accounts
+
+        Args:
+            items: (template, region) pairs
+            settings: Simulation settings
+            max_workers: Concurrent simulations (default: total slots in the pool)
+
+        Returns:
+            Results in input order
+        """
+        workers = max_workers or max(1, sum(a.slot_manager.max_slots for a in self.accounts))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="AccountPoolSim") as executor:
+            futures = [executor.submit(self.simulate, template, region, settings, index)
+                       for index, (template, region) in enumerate(items)]
+            return [future.result() for future in futures]
+
+    # ----- Stats -----
+
+    def get_stats(self) -> Dict:
+        """Per-account and aggregate throughput for the dashboard"""
+        now = time.time()
+        accounts = []
+        with self._lock:
+            for account in self.accounts:
+                accounts.append({
+                    'name': account.name,
+                    'authenticated': account.authenticated,
+                    'active_slots': account.slot_manager.get_active_slots_count(),
+                    'max_slots': account.slot_manager.max_slots,
+                    'remaining_today': account.remaining_today,
+                    'submitted': account.submitted,
+                    'completed': account.completed,
+                    'failed': account.failed,
+                    'sims_per_hour': round(account.throughput(now), 1),
+                })
+        return {
+            'accounts': accounts,
+            'accounts_ready': sum(1 for a in accounts if a['authenticated']),
+            'accounts_total': len(accounts),
+            'active_slots': sum(a['active_slots'] for a in accounts),
+            'max_slots': sum(a['max_slots'] for a in accounts),
+            'remaining_today': sum(a['remaining_today'] for a in accounts),
+            'completed': sum(a['completed'] for a in accounts),
+            'failed': sum(a['failed'] for a in accounts),
+            'sims_per_hour': round(sum(a['sims_per_hour'] for a in accounts), 1),
+            'result_cache': self.result_cache.get_stats(),
+        }
+
+
+class PooledSimulator:
+    """
+    Drop-in for SimulatorTester.submit_simulation / monitor_simulation
+
+    Step 5 and the mining engine submit a simulation and monitor it in two
+    calls. Here submit_simulation takes a lease on the best account and
+    monitor_simulation finishes the simulation on that account and releases
+    it, so the daily budget and concurrency of every account are respected.
+    """
+
+    def __init__(self, pool: AccountPool, acquire_timeout: Optional[float] = None):
+        """
+        Args:
+            pool: Authenticated account pool
+            acquire_timeout: Seconds submit_simulation waits for capacity (None = wait indefinitely)
+        """
+        self.pool = pool
+        self.acquire_timeout = acquire_timeout
+        self.region_configs = pool.region_configs
+        self.result_cache = pool.result_cache
+        self._lock = threading.Lock()
+        self._pending: Dict[str, object] = {}  # progress URL -> AccountLease, or SimulationResult from the cache
+
+    def cached_result(self, template: str, region: str, settings: SimulationSettings) -> Optional[SimulationResult]:
+        return self.pool.cached_result(template, region, settings)
+
+    def submit_simulation(self, template: str, region: str, settings: SimulationSettings,
+                          use_cache: bool = True) -> Optional[str]:
+        """Submit on the best account; returns a progress URL, or None if no account accepted it"""
+        if use_cache:
+            cached = self.cached_result(template, region, settings)
+            if cached is not None:
+                progress_url = CACHED_PROGRESS_PREFIX + result_key(
+                    template, cache_settings(region, settings, self.region_configs))
+                with self._lock:
+                    self._pending[progress_url] = cached
+                return progress_url
+
+        lease, progress_url, last_error = self.pool.submit(template, region, settings,
+                                                           acquire_timeout=self.acquire_timeout)
+        if lease is None:
+            logger.error(f"No account accepted the simulation: {last_error}")
+            return None
+        with self._lock:
+            self._pending[progress_url] = lease
+        return progress_url
+
+    def monitor_simulation(self, progress_url: str, template: str, region: str, settings: SimulationSettings,
+                           max_wait_time: int = 300,
+                           progress_callback: Optional[Callable[[float, str, str], None]] = None) -> SimulationResult:
+        """Finish a simulation started by submit_simulation"""
+        with self._lock:
+            pending = self._pending.pop(progress_url, None)
+        if isinstance(pending, AccountLease):
+            return self.pool.monitor(pending, progress_url, template, region, settings,
+                                     max_wait_time=max_wait_time, progress_callback=progress_callback)
+        if pending is not None:
+            if progress_callback:
+                progress_callback(100.0, "♻️ Result from cache", "COMPLETE")
+            return pending
+        return SimulationResult(template=template, region=region, settings=settings, success=False,
+                                error_message=f"Unknown progress URL: {progress_url}", timestamp=time.time())
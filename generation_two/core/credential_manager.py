@@ -14,9 +14,21 @@ from pathlib import Path
 from typing import Optional, Tuple, Dict
 from dataclasses import dataclass
 from getpass import getpass
+from urllib.parse import urlparse
+
+from brain_client.brain_session import BrainSession
 
 logger = logging.getLogger(__name__)
 
+# WorldQuant Brain API root (overridable for a local fake API in tests)
+API_BASE = 'https://api.worldquantbrain.com'
+
+
+def cookie_domain_for(api_base: str) -> str:
+    """Cookie domain for an API root ('' lets requests send the cookie to any host, e.g. localhost)"""
+    host = urlparse(api_base).hostname or ''
+    return 'worldquantbrain.com' if host.endswith('worldquantbrain.com') else ''
+
 
 @dataclass
 class Credentials:
@@ -49,15 +61,17 @@ class CredentialManager:
     # Possible credential file names (checked in order)
     CREDENTIAL_FILE_NAMES = ['cookie.txt']
     
-    def __init__(self, base_path: Optional[str] = None):
+    def __init__(self, base_path: Optional[str] = None, api_base: str = API_BASE):
         """
         Initialize credential manager
         
         Args:
             base_path: Base directory to search for credential files
                       If None, searches current directory and parent directories
+            api_base: API root used to validate the cookie
         """
         self.base_path = Path(base_path) if base_path else Path.cwd()
+        self.api_base = api_base.rstrip('/')
         self.credentials: Optional[Credentials] = None
         self.authenticated = False
         self.session: Optional[requests.Session] = None
@@ -183,8 +197,8 @@ class CredentialManager:
             return False
 
         try:
-            # Create a temporary session for validation
-            test_session = requests.Session()
+            # Create a temporary session for validation (kept as the pooled session on success)
+            test_session = BrainSession(api_base=self.api_base)
 
             # Set cookie in session
             logger.info(f"Validating cookie ({len(self.credentials.cookie)} characters)")
@@ -199,12 +213,13 @@ class CredentialManager:
                     cookie_dict[key.strip()] = value.strip()
 
             # Set cookies for the WorldQuant Brain domain
+            domain = cookie_domain_for(self.api_base)
             for key, value in cookie_dict.items():
-                test_session.cookies.set(key, value, domain='worldquantbrain.com')
+                test_session.cookies.set(key, value, domain=domain)
 
             # Test the cookie by making a request to the API
             response = test_session.get(
-                'https://api.worldquantbrain.com/users/self',
+                f'{self.api_base}/users/self',
                 timeout=10
             )
 
@@ -12,6 +12,7 @@ import os
 from ..evolution import SelfOptimizer, AlphaQualityMonitor, AlphaEvolutionEngine, AlphaResult, OnTheFlyTester
 from .template_generator import TemplateGenerator
 from .simulator_tester import SimulatorTester, SimulationSettings, SimulationResult
+from brain_client.result_cache import ResultCache
 from ..storage import BacktestStorage, AlphaRegrouper, AlphaRetrospect
 from ..ollama import RegionThemeManager, OllamaManager
 from ..self_evolution import EvolutionExecutor, CodeGenerator, CodeEvaluator
@@ -72,8 +73,10 @@ class EnhancedTemplateGeneratorV3:
         
         # Region configurations
         self.region_configs = self._get_region_configs()
-        # Pass template_generator reference for re-authentication support
-        self.simulator_tester = SimulatorTester(self.session, self.region_configs, self.template_generator)
+        # Pass template_generator reference for re-authentication support; results are
+        # cached next to the backtest database so repeated templates are not re-simulated
+        self.simulator_tester = SimulatorTester(self.session, self.region_configs, self.template_generator,
+                                                result_cache=ResultCache(f"{db_path}.result_cache.jsonl"))
         
         # Generation Two components
         self.self_optimizer = SelfOptimizer()
@@ -233,14 +236,15 @@ class EnhancedTemplateGeneratorV3:
                 future = self.simulator_tester.simulate_template_concurrent(
                     template, region, settings
                 )
+                from_cache = future.done()  # result-cache hits come back already resolved
                 
                 # Wait for result (simplified - in production would be async)
                 try:
                     result = future.result(timeout=300)
                     new_results.append(result)
                     
-                    # Store result
-                    if result.success:
+                    # Store result (cached results were stored when first simulated)
+                    if result.success and not from_cache:
                         self.backtest_storage.store_result(result)
                 except Exception as e:
                     logger.error(f"Error getting result: {e}")
@@ -353,6 +357,7 @@ class EnhancedTemplateGeneratorV3:
             'tracked_alphas': len(self.quality_monitor.get_all_alpha_ids()),
             'storage_stats': self.backtest_storage.get_statistics(),
             'ollama_stats': self.template_generator.ollama_manager.get_stats(),
+            'result_cache': self.simulator_tester.result_cache.get_stats(),
             'active_themes': {
                 region: self.theme_manager.is_theme_active(region)
                 for region in ['IND', 'ATOM']
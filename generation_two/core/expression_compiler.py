@@ -42,7 +42,7 @@ class Token:
 @dataclass
 class IRNode:
     """Intermediate Representation Node"""
-    node_type: str  # 'operator_call', 'field_ref', 'literal', 'arithmetic'
+    node_type: str  # 'operator_call', 'field_ref', 'literal', 'arithmetic', 'keyword_arg'
     operator: Optional[str] = None
     field_id: Optional[str] = None
     literal_value: Optional[Any] = None
@@ -70,6 +70,9 @@ class IRNode:
                 return f"({self.arithmetic_op}{left_expr})"
             else:
                 return left_expr or right_expr or ""
+        elif self.node_type == 'keyword_arg':
+            value = self.arguments[0].to_expression() if self.arguments else ""
+            return f"{self.literal_value}={value}"
         else:
             return ""
 
@@ -341,6 +344,13 @@ class ExpressionCompiler:
                 left=left,
                 right=right
             )
+        elif ast.node_type == 'keyword':
+            # Keyword argument (e.g. rate=2)
+            return IRNode(
+                node_type='keyword_arg',
+                literal_value=ast.value,
+                arguments=[self._generate_ir(child) for child in ast.children]
+            )
         else:
             # Fallback
             return IRNode(node_type='unknown')
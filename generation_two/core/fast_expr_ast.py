@@ -24,11 +24,18 @@ from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Token patterns used by the parser (compiled once)
+_FUNCTION_CALL = re.compile(r'^([a-zA-Z_][a-zA-Z0-9_]*)\((.*)\)$')
+_IDENTIFIER = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_.]*$')
+_STRING_LITERAL = re.compile(r'^(".*"|\'.*\')$')
+_NUMBER_LITERAL = re.compile(r'^-?\d+\.?\d*$')
+_KEYWORD_ARGUMENT = re.compile(r'^\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*=(?!=)')
+
 
 @dataclass
 class ASTNode:
     """AST Node for FASTEXPR"""
-    node_type: str  # 'operator', 'field', 'literal', 'function', 'arithmetic'
+    node_type: str  # 'operator', 'field', 'literal', 'function', 'arithmetic', 'keyword'
     value: str
     children: List['ASTNode'] = field(default_factory=list)
     position: Tuple[int, int] = (0, 0)  # (start, end) character positions
@@ -46,6 +53,9 @@ class ASTNode:
             return f"{self.value}({args})"
         elif self.node_type in ['field', 'variable']:
             return self.value
+        elif self.node_type == 'keyword':
+            # Keyword argument, e.g. rate=2 in rank(x, rate=2)
+            return f"{self.value}={self.children[0].to_string()}" if self.children else self.value
         else:
             return self.value
 
@@ -73,6 +83,7 @@ class FASTEXPRParser:
         '>', '<', '>=', '<=', '==', '!=',
         '&&', '||', '!',
     }
+    ARITHMETIC_CHARS = frozenset(''.join(ARITHMETIC_OPERATORS))
     
     # Operator precedence (higher = evaluated first)
     OPERATOR_PRECEDENCE = {
@@ -203,6 +214,20 @@ class FASTEXPRParser:
             ))
             return None, errors
     
+    def parse_tree(self, template: str) -> Optional[ASTNode]:
+        """
+        Parse template into AST without operator/field validation (fast path for type checking)
+        
+        Returns:
+            AST node, or None if the template cannot be parsed
+        """
+        if not template or not template.strip() or self._check_balanced_parentheses(template):
+            return None
+        try:
+            return self._parse_expression(template, 0, len(template))
+        except Exception:
+            return None
+    
     def _check_balanced_parentheses(self, template: str) -> List[SyntaxError]:
         """Check if parentheses are balanced"""
         errors = []
@@ -265,13 +290,19 @@ class FASTEXPRParser:
         
         i = len(expr) - 1
         depth = 0
+        quote = None
         while i >= 0:
             char = expr[i]
-            if char == ')':
+            if quote:
+                if char == quote:
+                    quote = None
+            elif char in '"\'':
+                quote = char
+            elif char == ')':
                 depth += 1
             elif char == '(':
                 depth -= 1
-            elif depth == 0:
+            elif depth == 0 and char in self.ARITHMETIC_CHARS:
                 # Check for multi-character operators
                 for op_len in [2, 1]:
                     if i + op_len <= len(expr):
@@ -301,7 +332,7 @@ class FASTEXPRParser:
             )
         
         # Check for function call (operator)
-        func_match = re.match(r'^([a-zA-Z_][a-zA-Z0-9_]*)\((.*)\)$', expr)
+        func_match = _FUNCTION_CALL.match(expr)
         if func_match:
             func_name = func_match.group(1)
             args_str = func_match.group(2)
@@ -317,15 +348,23 @@ class FASTEXPRParser:
             )
         
         # Check for field/variable
-        if re.match(r'^[a-zA-Z_][a-zA-Z0-9_.]*$', expr):
+        if _IDENTIFIER.match(expr):
             return ASTNode(
                 node_type='field',
                 value=expr,
                 position=(start, end)
             )
         
+        # Literal (string, e.g. range="0, 1, 0.1")
+        if _STRING_LITERAL.match(expr):
+            return ASTNode(
+                node_type='literal',
+                value=expr,
+                position=(start, end)
+            )
+        
         # Literal (number)
-        if re.match(r'^-?\d+\.?\d*$', expr):
+        if _NUMBER_LITERAL.match(expr):
             return ASTNode(
                 node_type='literal',
                 value=expr,
@@ -335,37 +374,55 @@ class FASTEXPRParser:
         return None
     
     def _parse_arguments(self, args_str: str, start_pos: int) -> List[ASTNode]:
-        """Parse function arguments"""
+        """Parse function arguments (commas inside quotes or nested calls do not split)"""
         if not args_str.strip():
             return []
         
         args = []
         depth = 0
+        quote = None
         current_start = 0
         
         for i, char in enumerate(args_str):
-            if char == '(':
+            if quote:
+                if char == quote:
+                    quote = None
+            elif char in '"\'':
+                quote = char
+            elif char == '(':
                 depth += 1
             elif char == ')':
                 depth -= 1
             elif char == ',' and depth == 0:
-                arg_str = args_str[current_start:i].strip()
-                if arg_str:
-                    arg_node = self._parse_expression(args_str, current_start, i)
-                    if arg_node:
-                        args.append(arg_node)
+                arg_node = self._parse_argument(args_str, current_start, i)
+                if arg_node:
+                    args.append(arg_node)
                 current_start = i + 1
         
         # Last argument
         if current_start < len(args_str):
-            arg_str = args_str[current_start:].strip()
-            if arg_str:
-                arg_node = self._parse_expression(args_str, current_start, len(args_str))
-                if arg_node:
-                    args.append(arg_node)
+            arg_node = self._parse_argument(args_str, current_start, len(args_str))
+            if arg_node:
+                args.append(arg_node)
         
         return args
     
+    def _parse_argument(self, args_str: str, start: int, end: int) -> Optional[ASTNode]:
+        """Parse one argument: a keyword argument (name=value) or an expression"""
+        arg_str = args_str[start:end]
+        if not arg_str.strip():
+            return None
+        keyword_match = _KEYWORD_ARGUMENT.match(arg_str)
+        if keyword_match:
+            value_node = self._parse_expression(args_str, start + keyword_match.end(), end)
+            return ASTNode(
+                node_type='keyword',
+                value=keyword_match.group(1),
+                children=[value_node] if value_node else [],
+                position=(start, end)
+            )
+        return self._parse_expression(args_str, start, end)
+    
     def _validate_ast(self, ast: ASTNode, template: str) -> List[SyntaxError]:
         """Validate AST for operator-field compatibility"""
         errors = []
@@ -3,10 +3,14 @@ Mining Module for Continuous Alpha Mining
 Provides modular components for continuous simulation and mining
 """
 
-from .correlation_tracker import CorrelationTracker
-from .duplicate_detector import MiningDuplicateDetector
-from .search_strategy import SearchStrategyManager, SearchStrategy
-from .mining_coordinator import MiningCoordinator
+from ..._lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    '.correlation_tracker': ['CorrelationTracker'],
+    '.duplicate_detector': ['MiningDuplicateDetector'],
+    '.search_strategy': ['SearchStrategyManager', 'SearchStrategy'],
+    '.mining_coordinator': ['MiningCoordinator']
+})
 
 __all__ = [
     'CorrelationTracker',
@@ -48,7 +48,7 @@ class MiningCoordinator:
         self.log_callback = log_callback
         
         # Initialize components
-        self.sim_counter = SimulationCounter()
+        self.sim_counter = SimulationCounter(db_path)
         self.slot_manager = SlotManager(max_slots=8)
         self.correlation_tracker = CorrelationTracker(db_path)
         self.duplicate_detector = MiningDuplicateDetector(db_path)
@@ -1,6 +1,6 @@
 """
 Simulation Counter Module
-Tracks daily simulation count and enforces 5000/day limit
+Tracks daily simulation count and enforces the daily limit (5000/day by default)
 """
 
 import logging
@@ -21,20 +21,34 @@ class SimulationCounter:
     
     WorldQuant Brain limit: 5,000 simulations per 24-hour period (EST timezone)
     Warning at 4,000 simulations
+    
+    Each account in an AccountPool gets its own counter (keyed by account name);
+    the default account uses the original simulation_count table.
     """
     
-    def __init__(self, db_path: str = "generation_two_backtests.db"):
+    def __init__(self, db_path: str = "generation_two_backtests.db", account: Optional[str] = None,
+                 daily_limit: int = 5000):
         """
         Initialize simulation counter
         
         Args:
             db_path: Path to SQLite database
+            account: Account name (None = the single default account)
+            daily_limit: Simulations allowed per day (warning at 80%)
         """
         self.db_path = db_path
+        self.account = account
+        self.daily_limit = daily_limit
+        self.warning_threshold = int(daily_limit * 0.8)
+        if account is None:
+            self._table, self._key_columns, self._key = "simulation_count", "date_est", ()
+        else:
+            self._table, self._key_columns, self._key = "account_simulation_count", "account, date_est", (account,)
+        self._where = " AND ".join(f"{col.strip()} = ?" for col in self._key_columns.split(","))
         self.create_tables()
     
     def create_tables(self):
-        """Create simulation tracking table"""
+        """Create simulation tracking tables"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
@@ -50,6 +64,19 @@ class SimulationCounter:
             )
         ''')
         
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS account_simulation_count (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                account TEXT NOT NULL,
+                date_est TEXT NOT NULL,
+                count INTEGER DEFAULT 0,
+                last_warning_count INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(account, date_est)
+            )
+        ''')
+        
         conn.commit()
         conn.close()
         logger.info("Simulation counter table created")
@@ -65,10 +92,10 @@ class SimulationCounter:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT count FROM simulation_count 
-            WHERE date_est = ?
-        ''', (today,))
+        cursor.execute(f'''
+            SELECT count FROM {self._table} 
+            WHERE {self._where}
+        ''', (*self._key, today))
         
         row = cursor.fetchone()
         conn.close()
@@ -82,29 +109,30 @@ class SimulationCounter:
         Returns:
             Dict with:
                 - count: Current count
-                - limit_reached: True if >= 5000
-                - warning_needed: True if >= 4000 and not warned yet
-                - can_simulate: True if < 5000
+                - limit_reached: True if >= daily_limit
+                - warning_needed: True if >= warning threshold and not warned yet
+                - can_simulate: True if < daily_limit
         """
         today = self.get_est_date()
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
         # Insert or update count
-        cursor.execute('''
-            INSERT INTO simulation_count (date_est, count, updated_at)
-            VALUES (?, 1, CURRENT_TIMESTAMP)
-            ON CONFLICT(date_est) DO UPDATE SET
+        placeholders = ", ".join("?" for _ in range(len(self._key) + 1))
+        cursor.execute(f'''
+            INSERT INTO {self._table} ({self._key_columns}, count, updated_at)
+            VALUES ({placeholders}, 1, CURRENT_TIMESTAMP)
+            ON CONFLICT({self._key_columns}) DO UPDATE SET
                 count = count + 1,
                 updated_at = CURRENT_TIMESTAMP
-        ''', (today,))
+        ''', (*self._key, today))
         
         # Get updated count
-        cursor.execute('''
+        cursor.execute(f'''
             SELECT count, last_warning_count 
-            FROM simulation_count 
-            WHERE date_est = ?
-        ''', (today,))
+            FROM {self._table} 
+            WHERE {self._where}
+        ''', (*self._key, today))
         
         row = cursor.fetchone()
         conn.commit()
@@ -113,19 +141,19 @@ class SimulationCounter:
         count = row[0] if row else 0
         last_warning = row[1] if row and len(row) > 1 else 0
         
-        limit_reached = count >= 5000
-        warning_needed = count >= 4000 and last_warning < 4000
-        can_simulate = count < 5000
+        limit_reached = count >= self.daily_limit
+        warning_needed = count >= self.warning_threshold and last_warning < self.warning_threshold
+        can_simulate = count < self.daily_limit
         
         # Mark warning as sent if needed
         if warning_needed:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE simulation_count 
+            cursor.execute(f'''
+                UPDATE {self._table} 
                 SET last_warning_count = ?
-                WHERE date_est = ?
-            ''', (count, today))
+                WHERE {self._where}
+            ''', (count, *self._key, today))
             conn.commit()
             conn.close()
         
@@ -136,20 +164,39 @@ class SimulationCounter:
             'can_simulate': can_simulate
         }
     
+    def decrement_count(self) -> int:
+        """
+        Give back one simulation counted today (a submission the API never accepted)
+
+        Returns:
+            Today's count after the refund
+        """
+        today = self.get_est_date()
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            UPDATE {self._table}
+            SET count = MAX(count - 1, 0), updated_at = CURRENT_TIMESTAMP
+            WHERE {self._where}
+        ''', (*self._key, today))
+        conn.commit()
+        conn.close()
+        return self.get_today_count()
+
     def can_simulate(self) -> bool:
         """Check if we can submit more simulations today"""
         count = self.get_today_count()
-        return count < 5000
+        return count < self.daily_limit
     
     def get_status(self) -> Dict[str, any]:
         """Get current simulation status"""
         count = self.get_today_count()
         return {
             'count': count,
-            'limit': 5000,
-            'remaining': max(0, 5000 - count),
-            'warning_threshold': 4000,
-            'can_simulate': count < 5000,
-            'limit_reached': count >= 5000,
-            'warning_needed': count >= 4000
+            'limit': self.daily_limit,
+            'remaining': max(0, self.daily_limit - count),
+            'warning_threshold': self.warning_threshold,
+            'can_simulate': count < self.daily_limit,
+            'limit_reached': count >= self.daily_limit,
+            'warning_needed': count >= self.warning_threshold
         }
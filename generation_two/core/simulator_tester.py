@@ -7,9 +7,12 @@ import logging
 import requests
 import time
 from typing import Dict, Optional, List, Callable
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, fields, replace
 from concurrent.futures import Future, ThreadPoolExecutor
 
+from .credential_manager import API_BASE
+from brain_client.result_cache import ResultCache, result_key
+
 logger = logging.getLogger(__name__)
 
 
@@ -71,14 +74,57 @@ class SimulationResult:
     raw_data: str = ""  # JSON string of full API response
 
 
+# Progress URL handed out by submit_simulation when the result is already cached
+CACHED_PROGRESS_PREFIX = "cache://"
+
+
+def cache_settings(region: str, settings: SimulationSettings, region_configs: Dict) -> Dict:
+    """The settings a simulation of region is submitted with, as used for result-cache keys"""
+    settings_dict = asdict(settings)
+    settings_dict['region'] = region
+    region_config = region_configs.get(region)
+    if region_config is not None:
+        settings_dict['universe'] = region_config.universe
+    return settings_dict
+
+
+def _from_cache(stored: Dict, template: str, region: str, settings: SimulationSettings) -> SimulationResult:
+    known = {f.name for f in fields(SimulationResult)} - {'template', 'region', 'settings'}
+    return SimulationResult(template=template, region=region, settings=settings,
+                            **{name: value for name, value in stored.items() if name in known})
+
+
+def lookup_cached_result(cache: Optional[ResultCache], region_configs: Dict, template: str, region: str,
+                         settings: SimulationSettings) -> Optional[SimulationResult]:
+    """Stored result of an equivalent template with the same settings, or None"""
+    if cache is None:
+        return None
+    stored = cache.get(template, cache_settings(region, settings, region_configs))
+    return _from_cache(stored, template, region, settings) if stored is not None else None
+
+
+def remember_result(cache: Optional[ResultCache], region_configs: Dict, result: SimulationResult,
+                    status: str = 'COMPLETE'):
+    """Store a result the platform reported with this status, if it is worth caching (see is_cacheable)"""
+    if cache is None:
+        return
+    stored = {name: value for name, value in asdict(result).items() if name not in ('template', 'region', 'settings')}
+    cache.put(result.template, cache_settings(result.region, result.settings, region_configs), stored,
+              status=status, message=result.error_message)
+
+
 class SimulatorTester:
     """
     Handles simulation submission and monitoring
     
-    Separated from template generation for modularity.
+    Separated from template generation for modularity. Templates equivalent to
+    one already simulated with the same settings (see ResultCache) are answered
+    from the result cache instead of being submitted again.
     """
     
-    def __init__(self, session: requests.Session, region_configs: Dict, template_generator=None):
+    def __init__(self, session: requests.Session, region_configs: Dict, template_generator=None,
+                 api_base: str = API_BASE, poll_interval: float = 5,
+                 result_cache: Optional[ResultCache] = None):
         """
         Initialize simulator tester
         
@@ -86,18 +132,33 @@ class SimulatorTester:
             session: Authenticated requests session
             region_configs: Region configuration dictionary
             template_generator: Optional reference to template generator for re-authentication
+            api_base: API root for simulation and alpha endpoints
+            poll_interval: Seconds between progress checks while monitoring
+            result_cache: Shared result cache (default: an in-memory cache for this tester)
         """
         self.sess = session
+        self.api_base = api_base.rstrip('/')
+        self.poll_interval = poll_interval
         self.region_configs = region_configs
         self.template_generator = template_generator  # For re-authentication if needed
         self.executor = ThreadPoolExecutor(max_workers=8)
         self.active_simulations = {}  # {alpha_id: Future}
+        self.result_cache = result_cache if result_cache is not None else ResultCache(path=None)
+    
+    def cached_result(self, template: str, region: str, settings: SimulationSettings) -> Optional[SimulationResult]:
+        """Result of an equivalent template already simulated with these settings, or None"""
+        return lookup_cached_result(self.result_cache, self.region_configs, template, region, settings)
+    
+    def _remember(self, result: SimulationResult, status: str = 'COMPLETE') -> SimulationResult:
+        remember_result(self.result_cache, self.region_configs, result, status)
+        return result
     
     def submit_simulation(
         self, 
         template: str, 
         region: str, 
-        settings: SimulationSettings
+        settings: SimulationSettings,
+        use_cache: bool = True
     ) -> Optional[str]:
         """
         Submit a template for simulation
@@ -106,18 +167,22 @@ class SimulatorTester:
             template: Alpha expression
             region: Region code
             settings: Simulation settings
+            use_cache: Check the result cache before submitting
             
         Returns:
-            Progress URL if successful, None otherwise
+            Progress URL if successful, None otherwise. For a cached result this is
+            a cache:// URL that monitor_simulation answers without the API.
         """
         try:
-            from dataclasses import asdict
-            
             region_config = self.region_configs.get(region)
             if not region_config:
                 logger.error(f"Unknown region: {region}")
                 return None
             
+            if use_cache and self.cached_result(template, region, settings) is not None:
+                logger.info(f"♻️ Result cache hit, not submitting: {template[:60]}")
+                return CACHED_PROGRESS_PREFIX + result_key(template, cache_settings(region, settings, self.region_configs))
+            
             # Verify session has cookies before making request (for debugging)
             if not self.sess.cookies:
                 logger.warning("⚠️ Session has no cookies - authentication may have expired")
@@ -163,13 +228,13 @@ class SimulatorTester:
             if self.template_generator and hasattr(self.template_generator, 'make_api_request'):
                 response = self.template_generator.make_api_request(
                     'POST',
-                    'https://api.worldquantbrain.com/simulations',
+                    f'{self.api_base}/simulations',
                     json=simulation_data
                 )
             else:
                 # Fallback to direct session usage (maintains backward compatibility)
                 response = self.sess.post(
-                    'https://api.worldquantbrain.com/simulations',
+                    f'{self.api_base}/simulations',
                     json=simulation_data
                 )
             
@@ -215,6 +280,15 @@ class SimulatorTester:
         Returns:
             SimulationResult
         """
+        if progress_url.startswith(CACHED_PROGRESS_PREFIX):
+            stored = self.result_cache.lookup(progress_url[len(CACHED_PROGRESS_PREFIX):])
+            if stored is not None:
+                if progress_callback:
+                    progress_callback(100.0, "♻️ Result from cache", "COMPLETE")
+                return _from_cache(stored, template, region, settings)
+            return SimulationResult(template=template, region=region, settings=settings, success=False,
+                                    error_message="Cached result no longer available", timestamp=time.time())
+        
         start_time = time.time()
         alpha_id = ""
         last_status = ""
@@ -263,7 +337,7 @@ class SimulatorTester:
                     estimated_progress = min(90.0, (elapsed / max_wait_time) * 100)
                     if progress_callback:
                         progress_callback(estimated_progress, f"Waiting for response... (HTTP {response.status_code})", "WAITING")
-                    time.sleep(5)  # Reduced from 10s to 5s for more frequent updates
+                    time.sleep(self.poll_interval)
                     continue
                 
                 data = response.json()
@@ -355,10 +429,10 @@ class SimulatorTester:
                     if self.template_generator and hasattr(self.template_generator, 'make_api_request'):
                         alpha_response = self.template_generator.make_api_request(
                             'GET',
-                            f'https://api.worldquantbrain.com/alphas/{alpha_id}'
+                            f'{self.api_base}/alphas/{alpha_id}'
                         )
                     else:
-                        alpha_response = self.sess.get(f'https://api.worldquantbrain.com/alphas/{alpha_id}')
+                        alpha_response = self.sess.get(f'{self.api_base}/alphas/{alpha_id}')
                     
                     if alpha_response.status_code == 200:
                         import json
@@ -391,7 +465,7 @@ class SimulatorTester:
                         if has_warnings:
                             warning_message = "Alpha has warnings (marked as red per v2 behavior)"
                         
-                        return SimulationResult(
+                        return self._remember(SimulationResult(
                             template=template,
                             region=region,
                             settings=settings,
@@ -417,7 +491,7 @@ class SimulatorTester:
                             alpha_id=alpha_id,
                             timestamp=time.time(),
                             raw_data=raw_data_json
-                        )
+                        ))
                     else:
                         error_msg = f"Failed to get alpha details: {alpha_response.status_code}"
                         
@@ -445,7 +519,7 @@ class SimulatorTester:
                         if validator:
                             validator.learn_from_simulation_error(template, error_msg)
                     
-                    return SimulationResult(
+                    return self._remember(SimulationResult(
                         template=template,
                         region=region,
                         settings=settings,
@@ -453,10 +527,10 @@ class SimulatorTester:
                         error_message=error_msg,
                         alpha_id=alpha_id,
                         timestamp=time.time()
-                    )
+                    ), status)
                 
                 # Wait before checking again (shorter wait for better progress updates)
-                time.sleep(5)  # Check every 5 seconds for better progress tracking
+                time.sleep(self.poll_interval)  # Check every 5 seconds (default) for better progress tracking
                 
             except Exception as e:
                 logger.error(f"Error monitoring simulation {progress_url}: {e}")
@@ -531,10 +605,16 @@ class SimulatorTester:
             settings: Simulation settings
             
         Returns:
-            Future object for the simulation
+            Future object for the simulation (already resolved on a result-cache hit)
         """
+        cached = self.cached_result(template, region, settings)
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+            return future
+        
         def run_simulation():
-            progress_url = self.submit_simulation(template, region, settings)
+            progress_url = self.submit_simulation(template, region, settings, use_cache=False)
             if not progress_url:
                 return SimulationResult(
                     template=template,
@@ -559,6 +639,9 @@ class SimulatorTester:
         """
         Submit multiple simulations concurrently
         
+        Templates equivalent to an earlier one in the batch wait for its result
+        instead of being submitted as well.
+        
         Args:
             templates: List of alpha expressions
             region: Region code
@@ -568,14 +651,37 @@ class SimulatorTester:
             List of Future objects
         """
         futures = []
+        in_batch: Dict[str, Future] = {}
+        submitted = 0
         for template in templates:
+            key = result_key(template, cache_settings(region, settings, self.region_configs))
+            if key in in_batch:
+                futures.append(self._follow(in_batch[key], template))
+                continue
             future = self.simulate_template_concurrent(template, region, settings)
+            in_batch[key] = future
             futures.append(future)
-            time.sleep(0.5)  # Rate limiting
+            if not future.done():
+                submitted += 1
+                time.sleep(0.5)  # Rate limiting
         
-        logger.info(f"Submitted {len(futures)} simulations for region {region}")
+        logger.info(f"Submitted {submitted} simulations for region {region} "
+                    f"({len(futures) - submitted} answered from the result cache or the same batch)")
         return futures
     
+    @staticmethod
+    def _follow(source: Future, template: str) -> Future:
+        """Future resolving to source's result, relabelled with an equivalent template"""
+        future = Future()
+        
+        def copy_result(done: Future):
+            if done.exception() is not None:
+                future.set_exception(done.exception())
+            else:
+                future.set_result(replace(done.result(), template=template))
+        source.add_done_callback(copy_result)
+        return future
+    
     def wait_for_results(self, futures: List[Future], timeout: int = 600) -> List[SimulationResult]:
         """
         Wait for simulation results
@@ -1,6 +1,9 @@
 """
 Slot Manager for Concurrent Simulations
 Manages 8 simulation slots with GLB taking 2 slots, others taking 1 slot
+
+Waiting simulations can be queued with a priority class; `dispatch` hands
+free slots to them in SlotScheduler order (see slot_scheduler.py).
 """
 
 import logging
@@ -11,6 +14,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 from collections import deque
 
+from .slot_scheduler import SlotScheduler, ScheduledJob, JobPriority
+
 logger = logging.getLogger(__name__)
 
 
@@ -71,22 +76,29 @@ class SlotManager:
     Manages 8 concurrent simulation slots
     
     Rules:
-    - GLB region takes 2 slots
+    - GLB region takes 2 slots (configurable via region_costs)
     - Other regions take 1 slot
-    - Maximum 8 slots total
+    - Maximum 8 slots total; a simulation may use any idle slots
     """
     
-    def __init__(self, max_slots: int = 8):
+    def __init__(self, max_slots: int = 8, region_costs: Optional[Dict[str, int]] = None,
+                 aging_interval: float = 60.0, reset_delay: float = 2.0):
         """
         Initialize slot manager
         
         Args:
             max_slots: Maximum number of slots (default: 8)
+            region_costs: Slots consumed per region (default: GLB=2, others 1)
+            aging_interval: Seconds of waiting that promote a queued job by one priority class
+            reset_delay: Seconds a finished slot keeps showing its result before it is reused
         """
         self.max_slots = max_slots
         self.slots: List[Slot] = [Slot(slot_id=i) for i in range(max_slots)]
         self.lock = threading.Lock()
+        self.slot_freed = threading.Condition(self.lock)
         self.slot_assignments: Dict[int, int] = {}  # {template_index: slot_id}
+        self.scheduler = SlotScheduler(region_costs=region_costs, aging_interval=aging_interval)
+        self.reset_delay = reset_delay
         
     def get_slots_required(self, region: str) -> int:
         """
@@ -98,11 +110,15 @@ class SlotManager:
         Returns:
             Number of slots required (1 for most, 2 for GLB)
         """
-        return 2 if region == "GLB" else 1
+        return self.scheduler.cost_for(region)
+    
+    def _idle_slot_ids(self) -> List[int]:
+        """IDs of idle slots (caller holds the lock)"""
+        return [slot.slot_id for slot in self.slots if slot.status == SlotStatus.IDLE]
     
     def find_available_slots(self, num_slots: int) -> Optional[List[int]]:
         """
-        Find available consecutive slots
+        Find available slots (they do not need to be consecutive)
         
         Args:
             num_slots: Number of slots needed
@@ -111,11 +127,21 @@ class SlotManager:
             List of available slot IDs or None if not available
         """
         with self.lock:
-            # Try to find consecutive available slots
-            for start in range(self.max_slots - num_slots + 1):
-                if all(self.slots[start + i].status == SlotStatus.IDLE for i in range(num_slots)):
-                    return list(range(start, start + num_slots))
-            return None
+            idle = self._idle_slot_ids()
+            return idle[:num_slots] if len(idle) >= num_slots else None
+    
+    def _occupy(self, slot_ids: List[int], template: str, region: str, template_index: int):
+        """Mark slots as running (caller holds the lock)"""
+        for slot_id in slot_ids:
+            slot = self.slots[slot_id]
+            slot.status = SlotStatus.RUNNING
+            slot.template = template
+            slot.region = region
+            slot.start_time = time.time()
+            slot.add_log(f"🚀 Starting simulation: {template[:50]}...")
+            slot.add_log(f"Region: {region}, Slots: {len(slot_ids)}")
+        
+        self.slot_assignments[template_index] = slot_ids[0]  # Store primary slot
     
     def assign_slot(self, template: str, region: str, template_index: int) -> Optional[List[int]]:
         """
@@ -130,25 +156,71 @@ class SlotManager:
             List of assigned slot IDs or None if no slots available
         """
         num_slots = self.get_slots_required(region)
-        slot_ids = self.find_available_slots(num_slots)
-        
-        if not slot_ids:
-            return None
         
         with self.lock:
-            for slot_id in slot_ids:
-                slot = self.slots[slot_id]
-                slot.status = SlotStatus.RUNNING
-                slot.template = template
-                slot.region = region
-                slot.start_time = time.time()
-                slot.add_log(f"🚀 Starting simulation: {template[:50]}...")
-                slot.add_log(f"Region: {region}, Slots: {num_slots}")
-            
-            self.slot_assignments[template_index] = slot_ids[0]  # Store primary slot
+            idle = self._idle_slot_ids()
+            if len(idle) < num_slots:
+                return None
+            slot_ids = idle[:num_slots]
+            self._occupy(slot_ids, template, region, template_index)
         
         return slot_ids
     
+    def enqueue(self, template: str, region: str, template_index: int,
+                priority: JobPriority = JobPriority.EXPLORE, payload=None) -> ScheduledJob:
+        """
+        Queue a simulation to be started by `dispatch` when slots free up
+        
+        Args:
+            template: Template expression
+            region: Region code
+            template_index: Index of template in queue
+            priority: EXPLOIT, EXPLORE or REFEED
+            payload: Extra caller data returned with the job
+            
+        Returns:
+            The queued job
+        """
+        return self.scheduler.submit((template, region, template_index, payload), region, priority)
+    
+    def dispatch(self, max_jobs: Optional[int] = None) -> List[tuple]:
+        """
+        Assign free slots to queued simulations in priority order
+        
+        Args:
+            max_jobs: Optional cap on simulations started by this call
+            
+        Returns:
+            List of (job, slot_ids); job.payload is (template, region, template_index, payload)
+        """
+        started = []
+        with self.lock:
+            idle = self._idle_slot_ids()
+            for job in self.scheduler.pop_ready(len(idle), max_jobs=max_jobs):
+                slot_ids, idle = idle[:job.cost], idle[job.cost:]
+                template, region, template_index, _ = job.payload
+                self._occupy(slot_ids, template, region, template_index)
+                started.append((job, slot_ids))
+        return started
+    
+    def wait_for_slot(self, timeout: float = 1.0) -> bool:
+        """
+        Block until a slot becomes idle (or timeout)
+        
+        Returns:
+            True if woken by a released slot
+        """
+        with self.slot_freed:
+            return self.slot_freed.wait(timeout)
+    
+    def get_queue_length(self) -> int:
+        """Number of simulations waiting in the scheduler"""
+        return len(self.scheduler)
+    
+    def get_scheduler_stats(self) -> Dict:
+        """Queue depth and per-priority wait-time histograms"""
+        return self.scheduler.stats()
+    
     def release_slot(self, slot_id: int, success: bool = True, result: Optional[Dict] = None, error: Optional[str] = None):
         """
         Release a slot after simulation completes
@@ -193,7 +265,7 @@ class SlotManager:
             
             # Reset slot after a delay (to show results)
             def reset_slot():
-                time.sleep(2)  # Show result for 2 seconds
+                time.sleep(self.reset_delay)  # Show result before reusing the slot
                 with self.lock:
                     slot.status = SlotStatus.IDLE
                     slot.template = None
@@ -206,6 +278,7 @@ class SlotManager:
                     slot.error = None
                     slot.thread = None
                     slot.log_buffer.clear()
+                    self.slot_freed.notify_all()
             
             threading.Thread(target=reset_slot, daemon=True).start()
     
@@ -0,0 +1,336 @@
+"""
+Slot Scheduler for Concurrent Simulations
+Priority queue that decides which waiting simulation gets the next free slots
+
+Jobs are ordered by a virtual deadline (enqueue time + priority class offset),
+so a lower-priority job ages into the front of the queue after waiting
+`aging_interval` seconds per class. Jobs are kept in one heap per slot cost,
+which makes dispatch O(log n). A wide job (e.g. GLB) that has waited longer
+than `reserve_after` reserves capacity, so single-slot jobs can no longer
+backfill ahead of it.
+"""
+
+import bisect
+import heapq
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class JobPriority(IntEnum):
+    """Priority classes (lower value is dispatched first)"""
+    EXPLOIT = 0   # Refinements of templates that already scored well
+    EXPLORE = 1   # New templates
+    REFEED = 2    # Retries of failed simulations
+
+
+# Default slot cost per region (regions not listed cost `default_cost`)
+DEFAULT_REGION_COSTS = {"GLB": 2}
+
+
+@dataclass(order=True)
+class ScheduledJob:
+    """A simulation waiting for (or holding) slots"""
+    sort_key: float
+    seq: int
+    job_id: int = field(compare=False)
+    payload: Any = field(compare=False)
+    region: str = field(compare=False)
+    cost: int = field(compare=False)
+    priority: JobPriority = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    dispatched_at: Optional[float] = field(default=None, compare=False)
+
+    @property
+    def wait_time(self) -> Optional[float]:
+        if self.dispatched_at is None:
+            return None
+        return self.dispatched_at - self.enqueued_at
+
+
+class WaitTimeHistogram:
+    """Fixed-bucket histogram of queue wait times (seconds)"""
+
+    BUCKETS = (0.5, 1, 2, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket containing the q-th percentile"""
+        if not self.count:
+            return None
+        target = q * self.count
+        running = 0
+        for i, bucket_count in enumerate(self.counts):
+            running += bucket_count
+            if running >= target:
+                return self.BUCKETS[i] if i < len(self.BUCKETS) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict:
+        labels = [f"<={b}s" for b in self.BUCKETS] + [f">{self.BUCKETS[-1]}s"]
+        return {
+            'count': self.count,
+            'mean': round(self.total / self.count, 3) if self.count else None,
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'max': round(self.max, 3),
+            'buckets': dict(zip(labels, self.counts)),
+        }
+
+
+class SlotScheduler:
+    """
+    Weighted priority scheduler over a slot budget
+
+    The scheduler only orders work; the caller owns the slots and passes the
+    number of free slots to `pop_ready`.
+    """
+
+    def __init__(self, region_costs: Optional[Dict[str, int]] = None, default_cost: int = 1,
+                 aging_interval: float = 60.0, reserve_after: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize scheduler
+
+        Args:
+            region_costs: Slots consumed per region (default: GLB=2)
+            default_cost: Slots consumed by regions not in region_costs
+            aging_interval: Seconds of waiting that offset one priority class
+            reserve_after: Seconds after which a job that does not fit blocks backfill
+                (default: aging_interval)
+            clock: Time source (injectable for simulation)
+        """
+        self.region_costs = dict(DEFAULT_REGION_COSTS if region_costs is None else region_costs)
+        self.default_cost = default_cost
+        self.aging_interval = aging_interval
+        self.reserve_after = aging_interval if reserve_after is None else reserve_after
+        self.clock = clock
+        self._heaps: Dict[int, List[ScheduledJob]] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self.histograms: Dict[JobPriority, WaitTimeHistogram] = {p: WaitTimeHistogram() for p in JobPriority}
+        self.dispatched = 0
+
+    def cost_for(self, region: str) -> int:
+        """Number of slots a simulation in this region consumes"""
+        return self.region_costs.get(region, self.default_cost)
+
+    def submit(self, payload: Any, region: str, priority: JobPriority = JobPriority.EXPLORE,
+               cost: Optional[int] = None) -> ScheduledJob:
+        """
+        Queue a job
+
+        Args:
+            payload: Caller data returned with the job on dispatch
+            region: Region code (determines the slot cost)
+            priority: Priority class
+            cost: Override the slot cost
+
+        Returns:
+            The queued job
+        """
+        now = self.clock()
+        priority = JobPriority(priority)
+        seq = next(self._seq)
+        job = ScheduledJob(
+            sort_key=now + priority * self.aging_interval,
+            seq=seq,
+            job_id=seq,
+            payload=payload,
+            region=region,
+            cost=self.cost_for(region) if cost is None else cost,
+            priority=priority,
+            enqueued_at=now,
+        )
+        with self._lock:
+            heapq.heappush(self._heaps.setdefault(job.cost, []), job)
+        return job
+
+    def pop_ready(self, free_slots: int, max_jobs: Optional[int] = None) -> List[ScheduledJob]:
+        """
+        Dispatch as many queued jobs as fit in the free slots
+
+        Args:
+            free_slots: Slots currently available
+            max_jobs: Optional cap on jobs dispatched in this call
+
+        Returns:
+            Dispatched jobs in dispatch order
+        """
+        now = self.clock()
+        dispatched: List[ScheduledJob] = []
+        with self._lock:
+            while free_slots > 0 and (max_jobs is None or len(dispatched) < max_jobs):
+                heads = [heap[0] for heap in self._heaps.values() if heap]
+                if not heads:
+                    break
+                head = min(heads)
+                if head.cost > free_slots and now - head.enqueued_at >= self.reserve_after:
+                    # Hold the remaining capacity for a job that has waited too long
+                    break
+                fitting = [job for job in heads if job.cost <= free_slots]
+                if not fitting:
+                    break
+                job = min(fitting)
+                heapq.heappop(self._heaps[job.cost])
+                job.dispatched_at = now
+                self.histograms[job.priority].observe(now - job.enqueued_at)
+                self.dispatched += 1
+                free_slots -= job.cost
+                dispatched.append(job)
+        return dispatched
+
+    def remove(self, predicate: Callable[[ScheduledJob], bool]) -> int:
+        """Drop queued jobs matching a predicate (e.g. on stop); returns the number removed"""
+        removed = 0
+        with self._lock:
+            for cost, heap in self._heaps.items():
+                kept = [job for job in heap if not predicate(job)]
+                removed += len(heap) - len(kept)
+                heapq.heapify(kept)
+                self._heaps[cost] = kept
+        return removed
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(heap) for heap in self._heaps.values())
+
+    def pending_by_priority(self) -> Dict[str, int]:
+        counts = {p.name: 0 for p in JobPriority}
+        with self._lock:
+            for heap in self._heaps.values():
+                for job in heap:
+                    counts[job.priority.name] += 1
+        return counts
+
+    def stats(self) -> Dict:
+        """Queue depth and per-priority wait-time histograms"""
+        return {
+            'pending': len(self),
+            'pending_by_priority': self.pending_by_priority(),
+            'dispatched': self.dispatched,
+            'wait_times': {p.name: h.snapshot() for p, h in self.histograms.items()},
+        }
+
+
+def simulate_slot_load(scheduler_factory: Optional[Callable[..., SlotScheduler]] = None,
+                       slot_budget: int = 8, num_jobs: int = 2000, glb_fraction: float = 0.25,
+                       arrival_rate: float = 2.0, mean_duration: float = 4.0,
+                       legacy: bool = False, seed: int = 7) -> Dict:
+    """
+    Discrete-event simulation of mixed GLB/non-GLB load
+
+    Args:
+        scheduler_factory: Builds the scheduler (receives clock=...); default SlotScheduler
+        slot_budget: Number of slots
+        num_jobs: Jobs to simulate
+        glb_fraction: Fraction of jobs in GLB (2 slots)
+        arrival_rate: Mean job arrivals per time unit
+        mean_duration: Mean simulation duration
+        legacy: Use the previous policy instead (FIFO scan with consecutive first-fit slots)
+        seed: Random seed
+
+    Returns:
+        Utilization, makespan and per-region/priority wait statistics
+    """
+    import random
+
+    rng = random.Random(seed)
+    arrivals: List[Tuple[float, str, JobPriority, float]] = []
+    t = 0.0
+    for _ in range(num_jobs):
+        t += rng.expovariate(arrival_rate)
+        region = "GLB" if rng.random() < glb_fraction else rng.choice(["USA", "EUR", "ASI", "CHN"])
+        priority = rng.choices(list(JobPriority), weights=[2, 6, 2])[0]
+        arrivals.append((t, region, priority, rng.expovariate(1.0 / mean_duration)))
+
+    clock = {'now': 0.0}
+    scheduler = (scheduler_factory or SlotScheduler)(clock=lambda: clock['now'])
+    slots: List[Optional[int]] = [None] * slot_budget  # job index occupying each slot
+    running: List[Tuple[float, int, List[int]]] = []  # heap of (end_time, job index, slot ids)
+    legacy_queue: List[int] = []
+    waits: Dict[str, List[float]] = {}
+    busy_area = 0.0
+    last_time = 0.0
+    next_arrival = 0
+
+    def start(index: int, slot_ids: List[int]):
+        arrival_time, region, priority, duration = arrivals[index]
+        for slot_id in slot_ids:
+            slots[slot_id] = index
+        heapq.heappush(running, (clock['now'] + duration, index, slot_ids))
+        waits.setdefault(region, []).append(clock['now'] - arrival_time)
+        waits.setdefault(priority.name, []).append(clock['now'] - arrival_time)
+
+    def free_slot_ids() -> List[int]:
+        return [i for i, occupant in enumerate(slots) if occupant is None]
+
+    def legacy_find(num: int) -> Optional[List[int]]:
+        for first in range(slot_budget - num + 1):
+            if all(slots[first + i] is None for i in range(num)):
+                return list(range(first, first + num))
+        return None
+
+    while next_arrival < len(arrivals) or running or legacy_queue or len(scheduler):
+        next_end = running[0][0] if running else float('inf')
+        next_arr = arrivals[next_arrival][0] if next_arrival < len(arrivals) else float('inf')
+        now = min(next_end, next_arr)
+        if now == float('inf'):
+            break
+        busy_area += (slot_budget - len(free_slot_ids())) * (now - last_time)
+        last_time = clock['now'] = now
+
+        if next_end <= next_arr:
+            _, _, slot_ids = heapq.heappop(running)
+            for slot_id in slot_ids:
+                slots[slot_id] = None
+        else:
+            _, region, priority, _ = arrivals[next_arrival]
+            if legacy:
+                legacy_queue.append(next_arrival)
+            else:
+                scheduler.submit(next_arrival, region, priority)
+            next_arrival += 1
+
+        if legacy:
+            for index in list(legacy_queue):
+                slot_ids = legacy_find(2 if arrivals[index][1] == "GLB" else 1)
+                if slot_ids:
+                    legacy_queue.remove(index)
+                    start(index, slot_ids)
+        else:
+            free = free_slot_ids()
+            for job in scheduler.pop_ready(len(free)):
+                taken, free = free[:job.cost], free[job.cost:]
+                start(job.payload, taken)
+
+    def summarize(values: List[float]) -> Dict:
+        ordered = sorted(values)
+        return {
+            'count': len(ordered),
+            'mean': round(sum(ordered) / len(ordered), 3) if ordered else None,
+            'p95': round(ordered[int(0.95 * (len(ordered) - 1))], 3) if ordered else None,
+            'max': round(ordered[-1], 3) if ordered else None,
+        }
+
+    makespan = last_time
+    return {
+        'policy': 'legacy' if legacy else 'scheduler',
+        'utilization': round(busy_area / (slot_budget * makespan), 4) if makespan else 0.0,
+        'makespan': round(makespan, 2),
+        'waits': {key: summarize(values) for key, values in sorted(waits.items())},
+    }
@@ -13,6 +13,7 @@ from ..ollama import OllamaManager, RegionThemeManager
 from ..ollama.duplicate_detector import DuplicateDetector
 from ..data_fetcher import OperatorFetcher, DataFieldFetcher, SmartSearchEngine
 from .template_validator import TemplateValidator
+from brain_client.brain_session import BrainSession
 
 logger = logging.getLogger(__name__)
 
@@ -45,8 +46,8 @@ class TemplateGenerator:
         self.credentials_path = credentials_path
         self.deepseek_api_key = deepseek_api_key
         self.db_path = db_path
-        # Create session with cookie persistence enabled (default, but explicit)
-        self.sess = requests.Session()
+        # Pooled keep-alive session; cookies persist across requests
+        self.sess = BrainSession()
         # Ensure cookies are maintained across requests
         self.sess.cookies.clear()  # Start fresh
         
@@ -557,6 +558,8 @@ class TemplateGenerator:
         # Store field types (including event input detection) in database
         if fields:
             self._store_field_types(fields, region, delay)
+            if self.template_validator:
+                self.template_validator.refresh_type_checkers()
         
         # Update search engine with fetched fields
         if self.search_engine and fields:
@@ -567,7 +570,35 @@ class TemplateGenerator:
             self.search_engine._build_field_index_for_region(region, fields)
         
         return fields
-    
+
+    def warm_caches(self) -> Dict[str, int]:
+        """
+        Load operators and every locally cached data-field set into memory
+
+        Reads only the on-disk caches (no API calls), so it is safe to run in a
+        background thread once the GUI is on screen.
+
+        Returns:
+            {'operators': count, 'regions': data-field sets loaded, 'type_checkers': count}
+        """
+        warmed = {'operators': 0, 'regions': 0, 'type_checkers': 0}
+        if self.operator_fetcher:
+            warmed['operators'] = len(self.operator_fetcher.operators or self.operator_fetcher.fetch_operators())
+        if not self.data_field_fetcher:
+            return warmed
+
+        for cache_file in sorted(self.data_field_fetcher.cache_dir.glob('data_fields_cache_*.json')):
+            parts = cache_file.stem[len('data_fields_cache_'):].split('_', 2)
+            if len(parts) != 3 or not parts[1].isdigit():
+                continue
+            region, delay, universe = parts[0], int(parts[1]), parts[2]
+            if self.get_data_fields_for_region(region, delay, universe):
+                warmed['regions'] += 1
+                if self.template_validator:
+                    self.template_validator.get_type_checker(region, delay)
+                    warmed['type_checkers'] += 1
+        return warmed
+
     def _store_field_types(self, fields: List[Dict], region: str, delay: int):
         """Store field type information including event input detection"""
         try:
@@ -796,6 +827,15 @@ Generate a valid FASTEXPR expression that uses operator(data_field, parameters)
             # Validate and fix using self-correcting AST and compiler
             try:
                 if self.template_validator:
+                    # Pre-flight type check: coerce or drop ill-typed templates before they cost a simulation
+                    preflight = self.template_validator.preflight_check(template, region)
+                    if preflight.coerced:
+                        logger.info(f"🔧 Template {i+1} type-coerced: {preflight.error_message}")
+                        template = preflight.coerced
+                    elif preflight.rejected:
+                        logger.warning(f"⚠️ Template {i+1} rejected by type checker: {preflight.error_message}")
+                        continue
+                    
                     # Use compiler for full compilation pipeline
                     compile_result = self.template_validator.compile_template(template, optimize=False)
                     
@@ -10,6 +10,7 @@ import sqlite3
 from typing import List, Dict, Optional, Tuple, Set
 from .fast_expr_ast import FASTEXPRParser, SelfCorrectingAST, FASTEXPRValidator
 from .expression_compiler import ExpressionCompiler, CompilationResult
+from .type_checker import FASTEXPRTypeChecker, TypeCheckResult, load_field_types, load_compiler_knowledge
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +57,9 @@ class TemplateValidator:
         
         self.ollama_manager = ollama_manager
         
+        # Pre-flight type checkers, one per (region, delay) since field types differ
+        self._type_checkers: Dict[Tuple[str, int], FASTEXPRTypeChecker] = {}
+        
         # V2-style error patterns
         self.error_patterns = {
             'unknown_variable': [
@@ -166,6 +170,12 @@ class TemplateValidator:
             logger.info(f"🧹 Cleaned template: {template[:50]}... -> {cleaned_template[:50]}...")
             template = cleaned_template
         
+        # Pre-flight type check (vector/event/input-count errors) before anything else
+        if region:
+            preflight = self.preflight_check(template, region, delay or 1)
+            if not preflight.ok:
+                return False, preflight.error_message, preflight.coerced
+        
         # If AST is disabled, only do basic validation (parentheses, syntax)
         if not self.use_ast:
             # Basic syntax validation only
@@ -233,6 +243,43 @@ class TemplateValidator:
         # Return AST fix even if not perfect
         return fixed_ast, fixes_applied
     
+    def get_type_checker(self, region: str, delay: int = 1) -> FASTEXPRTypeChecker:
+        """Type checker loaded with the field types and event inputs of region/delay"""
+        key = (region, delay)
+        checker = self._type_checkers.get(key)
+        if checker is None:
+            if self.use_ast and self.parser:
+                operators = list(self.parser.operators.values())
+            else:
+                operators = self.operators
+            # API operator lists may lack definitions; the checker then falls back to operatorRAW.json
+            if not any(op.get('definition') for op in operators or []):
+                operators = None
+            field_types, event_fields = load_field_types(self.db_path, region, delay)
+            checker = FASTEXPRTypeChecker(
+                operators=operators,
+                field_types=field_types,
+                event_fields=event_fields,
+                event_incompatible={op.lower() for op in self._get_incompatible_operators()} | load_compiler_knowledge()[0]
+            )
+            self._type_checkers[key] = checker
+            logger.debug(f"Type checker for {region} delay={delay}: {len(field_types)} field types, "
+                         f"{len(event_fields)} event inputs")
+        return checker
+    
+    def preflight_check(self, template: str, region: str, delay: int = 1) -> TypeCheckResult:
+        """
+        Static type check before simulation
+        
+        Returns:
+            TypeCheckResult (ok, rejected, or coerced into a type-clean template)
+        """
+        return self.get_type_checker(region, delay).check(template)
+    
+    def refresh_type_checkers(self):
+        """Drop cached type checkers (e.g. after new field types were stored)"""
+        self._type_checkers.clear()
+    
     def _validate_basic_syntax(self, template: str, region: str = None, delay: int = None) -> List[str]:
         """Basic syntax validation without AST (parentheses, basic checks)"""
         errors = []
@@ -885,6 +932,15 @@ FIXED EXPRESSION:"""
         current_template = template
         all_fixes = []
         
+        # Type errors (vector/event/input count) have mechanical fixes - no LLM or retry loop needed
+        if region:
+            preflight = self.preflight_check(template, region)
+            if preflight.coerced:
+                fixes = [f"TypeCheck: {issue.message}" for issue in preflight.issues]
+                logger.info(f"🔧 Type checker coerced template: {template[:50]}... -> {preflight.coerced[:50]}...")
+                self.learn_from_simulation_error(template, error_message, preflight.coerced)
+                return preflight.coerced, fixes
+        
         # Check if this is an event input error - retry indefinitely
         is_event_input_error = 'does not support event inputs' in error_message.lower() or 'expects only event inputs' in error_message.lower()
         if is_event_input_error:
@@ -1627,18 +1683,24 @@ Return ONLY the fixed expression, no explanations:"""
     
     def get_validation_stats(self) -> Dict:
         """Get validation statistics"""
+        preflight = {}
+        for checker in self._type_checkers.values():
+            for key, value in checker.get_stats().items():
+                preflight[key] = preflight.get(key, 0) + value
         if not self.use_ast or not self.corrector:
             return {
                 'successful_templates': 0,
                 'failed_templates': 0,
                 'correction_rules': 0,
-                'error_history': 0
+                'error_history': 0,
+                'preflight': preflight
             }
         return {
             'successful_templates': len(self.corrector.successful_templates),
             'failed_templates': len(self.corrector.failed_templates),
             'correction_rules': sum(len(rules) for rules in self.corrector.correction_rules.values()),
-            'error_history': len(self.corrector.error_history)
+            'error_history': len(self.corrector.error_history),
+            'preflight': preflight
         }
     
     def _fix_missing_lookback(self, template: str, error_message: str) -> Tuple[str, List[str]]:
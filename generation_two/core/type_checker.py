@@ -0,0 +1,587 @@
+"""
+FASTEXPR Pre-flight Type Checker
+Static type inference over the FASTEXPRParser AST, run before a template is simulated
+
+Every sub-expression gets a kind (CONSTANT, MATRIX, VECTOR, GROUP, STRING) and an
+event-input flag. Operator signatures come from operatorRAW.json definitions,
+event-input rules from compiler_knowledge.json, and field kinds from the
+field_types table. The checker catches the errors that otherwise cost a
+simulation: VECTOR fields fed to non-vec_* operators, vec_* operators on
+MATRIX data, event inputs to incompatible operators, wrong input counts and
+non-constant lookbacks. Where the fix is mechanical (wrap in vec_avg, drop
+a redundant vec_*, trim or pad inputs, swap to the ts_* variant) the
+template is coerced instead of rejected.
+"""
+
+import json
+import logging
+import re
+import sqlite3
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .fast_expr_ast import ASTNode, FASTEXPRParser
+
+logger = logging.getLogger(__name__)
+
+CONSTANT = 'CONSTANT'
+MATRIX = 'MATRIX'
+VECTOR = 'VECTOR'
+GROUP = 'GROUP'
+STRING = 'STRING'
+
+# Built-in grouping fields available in every region
+BUILTIN_GROUPS = {'market', 'sector', 'industry', 'subindustry', 'exchange', 'country'}
+
+# Parameter names that must be numeric constants
+LOOKBACK_PARAMS = {'d', 'k', 'nth'}
+GROUP_PARAMS = {'group', 'g1', 'g2'}
+
+# Operators whose result is a grouping
+GROUP_OPERATORS = {'bucket', 'group_cartesian_product'}
+
+# Default value used when a missing lookback is padded in
+DEFAULT_LOOKBACK = 20
+
+ARITHMETIC_EVENT_INCOMPATIBLE = {'+', '-', '*', '/', '^'}
+
+
+@dataclass
+class OperatorSignature:
+    """Operator inputs parsed from an operatorRAW.json definition"""
+    name: str
+    params: List[str]  # Positional parameter names
+    required: int  # Number of positional parameters without default
+    keywords: Set[str] = field(default_factory=set)
+    variadic: bool = False
+    scope: Set[str] = field(default_factory=set)
+
+    @property
+    def max_inputs(self) -> Optional[int]:
+        return None if self.variadic else len(self.params)
+
+    def role(self, index: int) -> str:
+        """'lookback', 'group' or 'value' for the positional input at index"""
+        if index >= len(self.params):
+            return 'value'
+        name = self.params[index]
+        if name in LOOKBACK_PARAMS or name.isdigit():
+            return 'lookback'
+        if name in GROUP_PARAMS:
+            return 'group'
+        return 'value'
+
+    @classmethod
+    def from_definition(cls, name: str, definition: str, scope: Iterable[str] = ()) -> Optional['OperatorSignature']:
+        """
+        Parse e.g. "ts_regression(y, x, d, lag = 0, rettype = 0)"
+
+        Returns:
+            Signature, or None for infix-only definitions like "input1 > input2"
+        """
+        definition = re.sub(r'"[^"]*"|\'[^\']*\'', '""', definition or '')
+        match = re.match(r'\s*' + re.escape(name) + r'\s*\(', definition)
+        if not match:
+            return None
+        depth, end = 1, match.end()
+        while end < len(definition) and depth:
+            depth += {'(': 1, ')': -1}.get(definition[end], 0)
+            end += 1
+        inner = definition[match.end():end - 1]
+
+        params, keywords, variadic = [], set(), False
+        depth, current = 0, ''
+        for char in inner + ',':
+            if char == ',' and depth == 0:
+                part = current.strip()
+                current = ''
+                if not part:
+                    continue
+                if part.strip('. ') == '':
+                    variadic = True
+                elif '=' in part:
+                    keywords.add(part.split('=', 1)[0].strip())
+                else:
+                    # "rank(x)" in bucket's definition is just an input; "y .." marks variadic
+                    if '..' in part:
+                        variadic = True
+                        part = part.replace('.', '').strip()
+                    params.append(re.sub(r'\W', '', part.split('(')[-1]) or part)
+                continue
+            depth += {'(': 1, ')': -1}.get(char, 0)
+            current += char
+        return cls(name=name, params=params, required=len(params), keywords=keywords,
+                   variadic=variadic, scope=set(scope))
+
+
+@dataclass
+class ExprType:
+    """Inferred type of a sub-expression"""
+    kind: str
+    event: bool = False
+
+
+@dataclass
+class TypeIssue:
+    """A type error found before simulation"""
+    code: str  # 'vector_input', 'vector_operator', 'event_input', 'input_count', 'lookback', 'group_input', 'scope', 'unknown_operator', 'parse'
+    message: str
+    operator: Optional[str] = None
+    fixable: bool = False
+
+
+@dataclass
+class TypeCheckResult:
+    """Outcome of a pre-flight check"""
+    template: str
+    issues: List[TypeIssue] = field(default_factory=list)
+    coerced: Optional[str] = None  # Type-clean rewrite when every issue was fixable
+    elapsed_us: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+    @property
+    def rejected(self) -> bool:
+        """Ill-typed and not mechanically fixable"""
+        return bool(self.issues) and self.coerced is None
+
+    @property
+    def error_message(self) -> str:
+        return "; ".join(issue.message for issue in self.issues)
+
+
+def load_field_types(db_path: str, region: str, delay: int = 1) -> Tuple[Dict[str, str], Set[str]]:
+    """
+    Read field kinds and event-input flags from the field_types table
+
+    Returns:
+        ({field_id: field_type}, {event input field ids})
+    """
+    try:
+        conn = sqlite3.connect(db_path)
+        try:
+            rows = conn.execute(
+                'SELECT field_id, field_type, is_event_input FROM field_types WHERE region = ? AND delay = ?',
+                (region, delay)
+            ).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.debug(f"Failed to load field types for {region} delay={delay}: {e}")
+        return {}, set()
+    field_types = {row[0]: (row[1] or MATRIX) for row in rows}
+    event_fields = {row[0] for row in rows if row[2]}
+    return field_types, event_fields
+
+
+def load_compiler_knowledge(path: Optional[Path] = None) -> Tuple[Set[str], Dict[str, str]]:
+    """
+    Read event-input rules from compiler_knowledge.json
+
+    Returns:
+        (operators that reject event inputs, {operator: event-safe replacement})
+    """
+    path = path or Path(__file__).parent / "compiler_knowledge.json"
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f).get('event_input_compatibility', {})
+    except (OSError, ValueError) as e:
+        logger.debug(f"Failed to load compiler knowledge: {e}")
+        return set(), {}
+    replacements = {k.lower(): v for k, v in data.get('replacements', {}).items()}
+    incompatible = {op.lower() for op in data.get('incompatible_operators', [])} | set(replacements)
+    return incompatible, replacements
+
+
+def load_operators(path: Optional[Path] = None) -> List[Dict]:
+    """Load operator definitions from constants/operatorRAW.json"""
+    path = path or Path(__file__).parent.parent / "constants" / "operatorRAW.json"
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.debug(f"Failed to load operators: {e}")
+        return []
+
+
+class FASTEXPRTypeChecker:
+    """Rejects or coerces ill-typed templates before they are simulated"""
+
+    def __init__(
+        self,
+        operators: List[Dict] = None,
+        field_types: Dict[str, str] = None,
+        event_fields: Iterable[str] = None,
+        event_incompatible: Iterable[str] = None,
+        event_replacements: Dict[str, str] = None,
+        cache_size: int = 4096
+    ):
+        """
+        Args:
+            operators: Operator dicts from operatorRAW.json (default: constants/operatorRAW.json)
+            field_types: {field_id: MATRIX/VECTOR/GROUP/...} for the target region and delay
+            event_fields: Field ids that are event inputs
+            event_incompatible: Operators that reject event inputs (default: compiler_knowledge.json)
+            event_replacements: {operator: event-safe replacement} (default: compiler_knowledge.json)
+            cache_size: Number of recent results memoized by template string
+        """
+        operators = operators if operators is not None else load_operators()
+        self.parser = FASTEXPRParser(operators=operators)
+        self.signatures: Dict[str, OperatorSignature] = {}
+        for op in operators:
+            name = op.get('name', '')
+            scope = op.get('scope', [])
+            scope = scope if isinstance(scope, list) else [scope]
+            signature = OperatorSignature.from_definition(name, op.get('definition', ''), scope)
+            if signature:
+                self.signatures[name] = signature
+        self.known_operators = set(self.parser.operators)
+
+        self.field_types = {k: (MATRIX if v in ('REGULAR', 'MATRIX', None) else v)
+                            for k, v in (field_types or {}).items()}
+        self.event_fields = set(event_fields or ())
+
+        knowledge_incompatible, knowledge_replacements = load_compiler_knowledge()
+        self.event_incompatible = {op.lower() for op in event_incompatible} if event_incompatible is not None \
+            else knowledge_incompatible
+        self.event_replacements = event_replacements if event_replacements is not None else knowledge_replacements
+
+        self.cache_size = cache_size
+        self._cache: 'OrderedDict[str, TypeCheckResult]' = OrderedDict()
+        self.stats = Counter()
+
+    # ----- Public API -----
+
+    def check(self, template: str) -> TypeCheckResult:
+        """Type-check a template; returns issues and, when possible, a coerced rewrite"""
+        cached = self._cache.get(template)
+        if cached is not None:
+            self._cache.move_to_end(template)
+            self.stats['cache_hits'] += 1
+            return cached
+
+        start = time.perf_counter()
+        result = self._check_uncached(template)
+        result.elapsed_us = (time.perf_counter() - start) * 1e6
+
+        self.stats['checked'] += 1
+        if result.ok:
+            self.stats['ok'] += 1
+        elif result.coerced:
+            self.stats['coerced'] += 1
+        else:
+            self.stats['rejected'] += 1
+        for issue in result.issues:
+            self.stats[f"issue_{issue.code}"] += 1
+
+        self._cache[template] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats)
+
+    # ----- Inference -----
+
+    def _check_uncached(self, template: str) -> TypeCheckResult:
+        result = TypeCheckResult(template=template)
+        ast = self.parser.parse_tree(template)
+        if ast is None:
+            result.issues.append(TypeIssue('parse', 'Template could not be parsed'))
+            return result
+
+        ast, expr_type = self._infer(ast, result.issues)
+        if expr_type.kind == VECTOR:
+            ast = self._wrap_vector(ast, result.issues, 'alpha output')
+
+        if result.issues and all(issue.fixable for issue in result.issues):
+            coerced = ast.to_string()
+            # Accept the rewrite only if it is itself type-clean
+            verify: List[TypeIssue] = []
+            verify_ast = self.parser.parse_tree(coerced)
+            if verify_ast is not None:
+                _, verify_type = self._infer(verify_ast, verify)
+                if not verify and verify_type.kind != VECTOR:
+                    result.coerced = coerced
+        return result
+
+    def _infer(self, node: ASTNode, issues: List[TypeIssue]) -> Tuple[ASTNode, ExprType]:
+        """Infer the type of node, recording issues; returns the (possibly rewritten) node"""
+        if node.node_type == 'literal':
+            return node, ExprType(STRING if node.value[:1] in '"\'' else CONSTANT)
+        if node.node_type == 'field':
+            return node, self._field_type(node.value)
+        if node.node_type == 'keyword':
+            return node, ExprType(CONSTANT)
+        if node.node_type == 'arithmetic':
+            return self._infer_arithmetic(node, issues)
+        if node.node_type == 'function':
+            return self._infer_function(node, issues)
+        return node, ExprType(MATRIX)
+
+    def _field_type(self, name: str) -> ExprType:
+        kind = self.field_types.get(name)
+        if kind is None:
+            lowered = name.lower()
+            if lowered in BUILTIN_GROUPS:
+                kind = GROUP
+            elif lowered in ('true', 'false', 'nan'):
+                kind = CONSTANT
+            else:
+                kind = MATRIX  # Unknown fields are the validator's concern, not a type error
+        return ExprType(kind, event=name in self.event_fields)
+
+    def _infer_arithmetic(self, node: ASTNode, issues: List[TypeIssue]) -> Tuple[ASTNode, ExprType]:
+        kinds = []
+        for i, child in enumerate(node.children):
+            child, child_type = self._infer(child, issues)
+            if child_type.kind == VECTOR:
+                child = self._wrap_vector(child, issues, f"'{node.value}'")
+                child_type = ExprType(MATRIX, child_type.event)
+            if child_type.event and node.value in ARITHMETIC_EVENT_INCOMPATIBLE:
+                issues.append(TypeIssue(
+                    'event_input',
+                    f"Arithmetic '{node.value}' does not support event inputs ({child.to_string()})",
+                    operator=node.value
+                ))
+            node.children[i] = child
+            kinds.append(child_type.kind)
+        kind = CONSTANT if kinds and all(k == CONSTANT for k in kinds) else MATRIX
+        return node, ExprType(kind)
+
+    def _infer_function(self, node: ASTNode, issues: List[TypeIssue]) -> Tuple[ASTNode, ExprType]:
+        name = node.value
+        if self.known_operators and name not in self.known_operators:
+            issues.append(TypeIssue('unknown_operator', f"Unknown operator: {name}", operator=name))
+            return node, ExprType(MATRIX)
+
+        signature = self.signatures.get(name)
+        if signature and signature.scope and 'REGULAR' not in signature.scope:
+            issues.append(TypeIssue(
+                'scope',
+                f"Operator {name} is only available in {'/'.join(sorted(signature.scope))} expressions",
+                operator=name
+            ))
+
+        positional = [c for c in node.children if c.node_type != 'keyword']
+        keywords = [c for c in node.children if c.node_type == 'keyword']
+        if signature:
+            positional = self._check_input_count(node, signature, positional, issues)
+
+        # vec_* on something that is already a matrix: drop the vec_* (a no-op reduction)
+        if name.startswith('vec_') and len(positional) == 1:
+            arg, arg_type = self._infer(positional[0], issues)
+            if arg_type.kind != VECTOR:
+                issues.append(TypeIssue(
+                    'vector_operator',
+                    f"vec_ operator {name} requires VECTOR input, got {arg_type.kind} ({arg.to_string()})",
+                    operator=name,
+                    fixable=arg_type.kind in (MATRIX, CONSTANT)
+                ))
+                return arg, ExprType(arg_type.kind, arg_type.event)
+            node.children = [arg] + keywords
+            return node, ExprType(MATRIX)
+
+        event_inputs = []
+        group_kind = None
+        for i, arg in enumerate(positional):
+            role = signature.role(i) if signature else 'value'
+            arg, arg_type = self._infer(arg, issues)
+            if role == 'lookback':
+                if arg_type.kind != CONSTANT:
+                    issues.append(TypeIssue(
+                        'lookback',
+                        f"Operator {name} expects a constant for '{signature.params[i]}', got {arg.to_string()}",
+                        operator=name
+                    ))
+            elif role == 'group':
+                field_kind = self.field_types.get(arg.value) if arg.node_type == 'field' else None
+                if arg_type.kind in (MATRIX, VECTOR) and (field_kind or arg.node_type == 'function'):
+                    issues.append(TypeIssue(
+                        'group_input',
+                        f"Operator {name} expects a group for '{signature.params[i]}', got {arg_type.kind} ({arg.to_string()})",
+                        operator=name
+                    ))
+            else:
+                if arg_type.kind == VECTOR:
+                    arg = self._wrap_vector(arg, issues, name)
+                    arg_type = ExprType(MATRIX, arg_type.event)
+                if arg_type.event:
+                    event_inputs.append(arg.to_string())
+                if i == 0:
+                    group_kind = arg_type.kind
+            positional[i] = arg
+
+        node.children = positional + keywords
+        if event_inputs and name.lower() in self.event_incompatible:
+            self._coerce_event_operator(node, signature, event_inputs, issues)
+
+        if name in GROUP_OPERATORS or (name == 'densify' and group_kind == GROUP):
+            return node, ExprType(GROUP)
+        return node, ExprType(MATRIX)
+
+    # ----- Coercions -----
+
+    def _wrap_vector(self, node: ASTNode, issues: List[TypeIssue], consumer: str) -> ASTNode:
+        """VECTOR value where a MATRIX is needed: reduce it with vec_avg"""
+        can_fix = 'vec_avg' in self.known_operators or not self.known_operators
+        issues.append(TypeIssue(
+            'vector_input',
+            f"VECTOR input {node.to_string()} used by {consumer}; reduce it with a vec_* operator first",
+            operator=consumer,
+            fixable=can_fix
+        ))
+        if not can_fix:
+            return node
+        return ASTNode(node_type='function', value='vec_avg', children=[node], position=node.position)
+
+    def _check_input_count(self, node: ASTNode, signature: OperatorSignature, positional: List[ASTNode],
+                           issues: List[TypeIssue]) -> List[ASTNode]:
+        """Report wrong input counts; trims extra inputs or pads missing lookbacks"""
+        count = len(positional)
+        maximum = signature.max_inputs
+        if signature.required <= count and (maximum is None or count <= maximum):
+            return positional
+
+        if count < signature.required:
+            expectation = "exactly" if maximum == signature.required else "at least"
+            expected = signature.required
+            missing_roles = {signature.role(i) for i in range(count, signature.required)}
+            fixable = count > 0 and missing_roles == {'lookback'}
+            if fixable:
+                positional = positional + [ASTNode(node_type='literal', value=str(DEFAULT_LOOKBACK))
+                                           for _ in range(signature.required - count)]
+        else:
+            expectation = "exactly" if maximum == signature.required else "at most"
+            expected = maximum
+            extra = positional[maximum:]
+            # Trailing constants are almost always a stray lookback; dropping them is safe
+            fixable = all(arg.node_type == 'literal' for arg in extra)
+            if fixable:
+                positional = positional[:maximum]
+
+        issues.append(TypeIssue(
+            'input_count',
+            f"Invalid number of inputs for {node.value}: {count}, should be {expectation} {expected} input(s)",
+            operator=node.value,
+            fixable=fixable
+        ))
+        return positional
+
+    def _coerce_event_operator(self, node: ASTNode, signature: Optional[OperatorSignature],
+                               event_inputs: List[str], issues: List[TypeIssue]):
+        """Swap an event-incompatible operator for its ts_* replacement when one exists"""
+        name = node.value
+        replacement = self.event_replacements.get(name.lower())
+        replacement_signature = self.signatures.get(replacement) if replacement else None
+        fixable = replacement_signature is not None
+        if fixable:
+            positional = [c for c in node.children if c.node_type != 'keyword']
+            missing = replacement_signature.required - len(positional)
+            missing_roles = {replacement_signature.role(i) for i in range(len(positional), replacement_signature.required)}
+            if missing > 0 and missing_roles != {'lookback'}:
+                fixable = False
+            elif replacement_signature.max_inputs is not None and len(positional) > replacement_signature.max_inputs:
+                fixable = False
+            else:
+                node.value = replacement
+                # Keyword arguments of the original operator do not carry over
+                node.children = positional + [ASTNode(node_type='literal', value=str(DEFAULT_LOOKBACK))
+                                              for _ in range(max(0, missing))]
+        issues.append(TypeIssue(
+            'event_input',
+            f"Operator {name} does not support event inputs ({', '.join(event_inputs[:3])})",
+            operator=name,
+            fixable=fixable
+        ))
+
+
+def classify_simulation_error(error_message: str) -> str:
+    """Bucket a simulation error message into the classes the type checker targets"""
+    message = (error_message or '').lower()
+    if 'event input' in message:
+        return 'event_input'
+    if 'number of inputs' in message or 'should be exactly' in message or 'should be at least' in message:
+        return 'input_count'
+    if 'vector' in message:
+        return 'vector'
+    if 'lookback' in message:
+        return 'lookback'
+    return 'other'
+
+
+def replay_failures(
+    db_path: str,
+    checker_for: Callable[[str], FASTEXPRTypeChecker],
+    limit: Optional[int] = None
+) -> Dict:
+    """
+    Replay historical simulations from backtest_results through the type checker
+
+    A failed simulation whose template the checker rejects or coerces is a
+    simulation the pre-flight check would have saved; a successful one it
+    rejects is a false positive.
+
+    Args:
+        db_path: Backtest database
+        checker_for: region -> FASTEXPRTypeChecker (field types differ per region)
+        limit: Replay at most this many of the most recent rows
+
+    Returns:
+        Report dict with per-error-class counts and simulations saved
+    """
+    query = 'SELECT template, region, success, error_message FROM backtest_results ORDER BY id DESC'
+    params: Tuple = ()
+    if limit:
+        query += ' LIMIT ?'
+        params = (limit,)
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(query, params).fetchall()
+    finally:
+        conn.close()
+
+    checkers: Dict[str, FASTEXPRTypeChecker] = {}
+    by_class: Dict[str, Counter] = {}
+    false_positives = 0
+    succeeded = 0
+    total_us = 0.0
+    for template, region, success, error_message in rows:
+        checker = checkers.get(region)
+        if checker is None:
+            checker = checkers[region] = checker_for(region)
+        result = checker.check(template)
+        total_us += result.elapsed_us
+        if success:
+            succeeded += 1
+            false_positives += 1 if result.rejected else 0
+            continue
+        counts = by_class.setdefault(classify_simulation_error(error_message), Counter())
+        counts['failed'] += 1
+        if result.rejected:
+            counts['rejected'] += 1
+        elif result.coerced:
+            counts['coerced'] += 1
+
+    saved = sum(c['rejected'] + c['coerced'] for c in by_class.values())
+    failed = sum(c['failed'] for c in by_class.values())
+    report = {
+        'replayed': len(rows),
+        'failed': failed,
+        'succeeded': succeeded,
+        'simulations_saved': saved,
+        'saved_pct': 100.0 * saved / failed if failed else 0.0,
+        'false_positives': false_positives,
+        'mean_check_us': total_us / len(rows) if rows else 0.0,
+        'by_error_class': {name: dict(counts) for name, counts in by_class.items()},
+    }
+    logger.info(f"Type-check replay: {saved}/{failed} failed simulations caught pre-flight "
+                f"({report['saved_pct']:.1f}%), {false_positives} false positives, "
+                f"{report['mean_check_us']:.0f}us per template")
+    return report
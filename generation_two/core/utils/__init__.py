@@ -4,11 +4,20 @@ Reusable utility modules for core functionality
 
 from .retry_handler import RetryHandler, RetryConfig, RetryStrategy
 from .request_handler import RequestHandler, RequestConfig
+from brain_client.brain_session import BrainSession, get_shared_session, load_credentials
+from brain_client.result_cache import ResultCache, canonicalize_expression, is_cacheable, result_key
 
 __all__ = [
     'RetryHandler',
     'RetryConfig',
     'RetryStrategy',
     'RequestHandler',
-    'RequestConfig'
+    'RequestConfig',
+    'BrainSession',
+    'get_shared_session',
+    'load_credentials',
+    'ResultCache',
+    'canonicalize_expression',
+    'is_cacheable',
+    'result_key'
 ]
@@ -3,12 +3,21 @@ Data Fetcher Module
 Fetches operators and data fields from WorldQuant Brain API on cold start
 """
 
-from .operator_fetcher import OperatorFetcher
-from .data_field_fetcher import DataFieldFetcher
-from .smart_search import SmartSearchEngine
+from .._lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    '.operator_fetcher': ['OperatorFetcher'],
+    '.data_field_fetcher': ['DataFieldFetcher'],
+    'brain_client.field_registry': ['FieldRegistry', 'FieldTable', 'FieldRecord', 'get_field_registry'],
+    '.smart_search': ['SmartSearchEngine']
+})
 
 __all__ = [
     'OperatorFetcher',
     'DataFieldFetcher',
+    'FieldRegistry',
+    'FieldTable',
+    'FieldRecord',
+    'get_field_registry',
     'SmartSearchEngine'
 ]
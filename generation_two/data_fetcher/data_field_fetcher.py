@@ -7,9 +7,11 @@ import logging
 import json
 import os
 import requests
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 
+from brain_client.field_registry import FieldRecord, FieldTable, get_field_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,7 +19,8 @@ class DataFieldFetcher:
     """
     Fetches data fields from WorldQuant Brain API
     
-    Caches data fields by region for cold start
+    Caches data fields by region, delay and universe for cold start; each loaded
+    set is also indexed in the shared field registry for O(1) lookups
     """
     
     def __init__(self, session: requests.Session = None, cache_dir: str = "constants"):
@@ -31,7 +34,12 @@ class DataFieldFetcher:
         self.session = session
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
-        self.data_fields: Dict[str, List[Dict]] = {}  # {region: [fields]}
+        self.data_fields: Dict[str, List[Dict]] = {}  # {region: [fields]} (last set loaded per region)
+        self._field_sets: Dict[Tuple[str, int, str], List[Dict]] = {}
+        self._region_tables: Dict[str, FieldTable] = {}
+        self.registry = get_field_registry(
+            str(self.cache_dir), pattern='data_fields_cache_{region}_{delay}_{universe}.json'
+        )
     
     def fetch_data_fields(
         self,
@@ -105,9 +113,11 @@ class DataFieldFetcher:
         cache_file = self.cache_dir / f"data_fields_cache_{cache_key}.json"
         
         # Try cache first (OPTIMIZED: check if already loaded in memory)
-        if region in self.data_fields and self.data_fields[region]:
-            logger.debug(f"Using in-memory cache for {region} ({len(self.data_fields[region])} fields)")
-            return self.data_fields[region]
+        # Keyed by delay and universe too, so another delay/universe is never served this one's fields
+        loaded = self._field_sets.get((region, delay, universe))
+        if loaded and not force_refresh:
+            logger.debug(f"Using in-memory cache for {region} delay={delay} universe={universe} ({len(loaded)} fields)")
+            return loaded
         
         if not force_refresh and cache_file.exists():
             try:
@@ -154,11 +164,11 @@ class DataFieldFetcher:
                         # Don't return cached data, let it refetch
                     else:
                         logger.info(f"✅ Cached data validation: {len(matching_fields)} fields match exact parameters")
-                        self.data_fields[region] = matching_fields
+                        self._remember(region, delay, universe, matching_fields)
                         return matching_fields
                 else:
                     # No universe specified, return all cached data
-                    self.data_fields[region] = cached_data
+                    self._remember(region, delay, universe, cached_data)
                     return cached_data
                     
             except Exception as e:
@@ -325,6 +335,7 @@ class DataFieldFetcher:
             logger.info(f"[{region}] Caching {len(field_list)} fields...")
             self.data_fields[region] = field_list
             self._save_cache(region, cache_file)
+            self._remember(region, delay, universe, field_list)
             logger.info(f"[{region}] ✅ Successfully fetched and cached {len(field_list)} data fields")
             
             return field_list
@@ -336,6 +347,21 @@ class DataFieldFetcher:
             logger.error(f"[{region}] Traceback:\n{traceback.format_exc()}")
             return []
     
+    def _remember(self, region: str, delay: int, universe: str, fields: List[Dict]):
+        """Keep a loaded field set in memory and index it in the registry"""
+        self._field_sets[(region, delay, universe)] = fields
+        self.data_fields[region] = fields
+        self._region_tables[region] = self.registry.register(region, delay, universe, fields)
+
+    def field_table(self, region: str, delay: int = 1, universe: str = None) -> Optional[FieldTable]:
+        """
+        Indexed view of a loaded field set (membership, type/dataset/category
+        lookups, usage ordering and typed sampling); None until it is fetched
+        """
+        if (region, delay, universe) in self._field_sets:
+            return self.registry.table(region, delay, universe)
+        return None
+
     def _save_cache(self, region: str, cache_file: Path):
         """Save data fields to cache file"""
         try:
@@ -349,6 +375,11 @@ class DataFieldFetcher:
         """Clear cached data fields for a specific region/delay or all caches"""
         import glob
         
+        for key in list(self._field_sets):
+            if region is None or (key[0] == region and (delay is None or key[1] == delay)):
+                del self._field_sets[key]
+        self.registry.invalidate(region, delay)
+        
         if region and delay is not None:
             # Clear specific cache
             cache_file = self.cache_dir / f"data_fields_cache_{region}_{delay}.json"
@@ -365,30 +396,22 @@ class DataFieldFetcher:
                 logger.info(f"Cleared cache file: {cache_file}")
             logger.info(f"Cleared {len(cache_files)} cache files")
     
-    def get_fields_by_category(self, region: str, category: str) -> List[Dict]:
+    def get_fields_by_category(self, region: str, category: str) -> List[FieldRecord]:
         """Get data fields filtered by category"""
-        fields = self.data_fields.get(region, [])
-        return [f for f in fields if f.get('category', {}).get('id') == category]
+        table = self._region_tables.get(region)
+        return table.records(category=category) if table else []
     
-    def get_fields_by_dataset(self, region: str, dataset: str) -> List[Dict]:
+    def get_fields_by_dataset(self, region: str, dataset: str) -> List[FieldRecord]:
         """Get data fields filtered by dataset"""
-        fields = self.data_fields.get(region, [])
-        return [f for f in fields if f.get('dataset', {}).get('id') == dataset]
+        table = self._region_tables.get(region)
+        return table.records(dataset=dataset) if table else []
     
-    def get_field_by_id(self, region: str, field_id: str) -> Optional[Dict]:
+    def get_field_by_id(self, region: str, field_id: str) -> Optional[FieldRecord]:
         """Get data field by ID"""
-        fields = self.data_fields.get(region, [])
-        for field in fields:
-            if field.get('id') == field_id:
-                return field
-        return None
+        table = self._region_tables.get(region)
+        return table.get(field_id) if table else None
     
     def get_all_categories(self, region: str) -> List[str]:
         """Get all categories for a region"""
-        fields = self.data_fields.get(region, [])
-        categories = set()
-        for field in fields:
-            cat = field.get('category', {}).get('id')
-            if cat:
-                categories.add(cat)
-        return sorted(list(categories))
+        table = self._region_tables.get(region)
+        return sorted(table.categories()) if table else []
@@ -2,19 +2,23 @@
 Evolution and optimization components
 """
 
-from .self_optimizer import SelfOptimizer
-from .alpha_quality_monitor import AlphaQualityMonitor
-from .alpha_evolution_engine import AlphaEvolutionEngine, AlphaResult
-from .on_the_fly_tester import OnTheFlyTester
-from .advanced_bandits import (
-    AdvancedBanditSystem,
-    ThompsonSamplingBandit,
-    HierarchicalContextualBandit,
-    NeuralPersonaEvolution,
-    MetaLearningStrategySelector,
-    AdaptiveExplorationScheduler,
-    BanditContext
-)
+from .._lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    '.self_optimizer': ['SelfOptimizer'],
+    '.alpha_quality_monitor': ['AlphaQualityMonitor'],
+    '.alpha_evolution_engine': ['AlphaEvolutionEngine', 'AlphaResult'],
+    '.on_the_fly_tester': ['OnTheFlyTester'],
+    '.advanced_bandits': [
+        'AdvancedBanditSystem',
+        'ThompsonSamplingBandit',
+        'HierarchicalContextualBandit',
+        'NeuralPersonaEvolution',
+        'MetaLearningStrategySelector',
+        'AdaptiveExplorationScheduler',
+        'BanditContext'
+    ]
+})
 
 __all__ = [
     'SelfOptimizer',
@@ -18,9 +18,12 @@ from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass, field
 from collections import defaultdict
 import logging
-from datetime import datetime, timedelta
+import os
+from datetime import timedelta
 import json
 
+from brain_client.bandit_engine import ThompsonBandit, LinUCBBandit
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,119 +39,152 @@ class BanditContext:
     successful_simulations: int
     persona_diversity: float  # How diverse current personas are (0-1)
     operator_usage_distribution: Dict[str, float]  # Distribution of operator usage
-
-
-@dataclass
-class ThompsonSamplingArm:
-    """Arm for Thompson Sampling bandit"""
-    arm_id: str
-    alpha: float = 1.0  # Beta distribution parameter (successes)
-    beta: float = 1.0   # Beta distribution parameter (failures)
-    pulls: int = 0
-    total_reward: float = 0.0
-    avg_reward: float = 0.0
-    last_updated: float = 0.0
-    
-    def sample(self) -> float:
-        """Sample from Beta distribution"""
-        return np.random.beta(self.alpha, self.beta)
-    
-    def update(self, reward: float):
-        """Update arm with new reward"""
-        self.pulls += 1
-        self.total_reward += reward
-        self.avg_reward = self.total_reward / self.pulls
-        
-        # Update Beta parameters
-        # Normalize reward to [0, 1] for Beta distribution
-        normalized_reward = max(0.0, min(1.0, (reward + 1.0) / 2.0))  # Map [-1, 1] to [0, 1]
-        self.alpha += normalized_reward
-        self.beta += (1.0 - normalized_reward)
-        self.last_updated = datetime.now().timestamp()
-    
-    def get_confidence(self) -> float:
-        """Get confidence in arm (inverse of variance)"""
-        if self.alpha + self.beta <= 2:
-            return 0.0
-        variance = (self.alpha * self.beta) / ((self.alpha + self.beta) ** 2 * (self.alpha + self.beta + 1))
-        return 1.0 / (1.0 + variance)
+    
+    PHASES = ("early", "mid", "late")
+    TIMES_OF_DAY = ("morning", "afternoon", "evening", "night")
+    N_FEATURES = 5 + len(PHASES) + len(TIMES_OF_DAY)
+    
+    def to_features(self) -> np.ndarray:
+        """Feature vector for contextual bandits (bias, scalars, one-hot phase and time of day)"""
+        success_rate = self.successful_simulations / max(1, self.total_simulations)
+        features = [1.0, self.market_volatility, self.recent_performance, success_rate, self.persona_diversity]
+        features += [1.0 if self.exploration_phase == phase else 0.0 for phase in self.PHASES]
+        features += [1.0 if self.time_of_day == tod else 0.0 for tod in self.TIMES_OF_DAY]
+        return np.asarray(features, dtype=float)
 
 
 class ThompsonSamplingBandit:
-    """Thompson Sampling bandit - Bayesian approach superior to UCB"""
+    """Thompson Sampling bandit - Bayesian approach superior to UCB (backed by bandit_engine)"""
     
     def __init__(self, name: str = "ThompsonSampling", decay_factor: float = 0.99):
         self.name = name
-        self.arms: Dict[str, ThompsonSamplingArm] = {}
-        self.decay_factor = decay_factor  # For time-based decay
-        self.total_pulls = 0
+        # Rewards are sharpe-like values in [-1, 1], mapped onto [0, 1] for the Beta posterior
+        self.engine = ThompsonBandit(reward_range=(-1.0, 1.0))
+        self.decay_factor = decay_factor  # Applied by decay()
+    
+    @property
+    def total_pulls(self) -> int:
+        return int(round(self.engine.total_pulls))
+    
+    @property
+    def arm_ids(self) -> List[str]:
+        return self.engine.keys
     
     def add_arm(self, arm_id: str):
         """Add a new arm"""
-        if arm_id not in self.arms:
-            self.arms[arm_id] = ThompsonSamplingArm(arm_id=arm_id)
+        self.engine.add_arm(arm_id)
     
     def select_arm(self, available_arms: List[str], context: Optional[BanditContext] = None) -> str:
         """Select arm using Thompson Sampling"""
         if not available_arms:
             return None
-        
-        # Add any new arms
-        for arm_id in available_arms:
-            self.add_arm(arm_id)
-        
-        # Sample from each arm's Beta distribution
-        samples = {}
-        for arm_id in available_arms:
-            arm = self.arms[arm_id]
-            samples[arm_id] = arm.sample()
-        
-        # Select arm with highest sample
-        selected = max(samples.keys(), key=lambda x: samples[x])
-        return selected
+        return self.engine.select_one(available_arms)
     
-    def update(self, arm_id: str, reward: float):
+    def select_arms(self, available_arms: List[str], k: int, context: Optional[BanditContext] = None) -> List[str]:
+        """Select k distinct arms in one draw (e.g. to fill k free slots)"""
+        return self.engine.select(k, available_arms)
+    
+    def update(self, arm_id: str, reward: float, context: Optional[BanditContext] = None):
         """Update arm with reward"""
-        if arm_id not in self.arms:
-            self.add_arm(arm_id)
-        
-        self.arms[arm_id].update(reward)
-        self.total_pulls += 1
+        self.engine.update(arm_id, reward)
+    
+    def decay(self):
+        """Discount past rewards by decay_factor"""
+        self.engine.decay(self.decay_factor)
     
     def get_arm_stats(self, arm_id: str) -> Dict:
         """Get statistics for an arm"""
-        if arm_id not in self.arms:
+        if arm_id not in self.engine:
             return {'pulls': 0, 'avg_reward': 0.0, 'confidence': 0.0}
         
-        arm = self.arms[arm_id]
+        stats = self.engine.stats(arm_id)
+        has_evidence = stats['alpha'] + stats['beta'] > 2
         return {
-            'pulls': arm.pulls,
-            'avg_reward': arm.avg_reward,
-            'confidence': arm.get_confidence(),
-            'alpha': arm.alpha,
-            'beta': arm.beta,
-            'expected_value': arm.alpha / (arm.alpha + arm.beta) if (arm.alpha + arm.beta) > 0 else 0.5
+            'pulls': int(round(stats['pulls'])),
+            'avg_reward': stats['avg_reward'],
+            'confidence': 1.0 / (1.0 + stats['variance']) if has_evidence else 0.0,
+            'alpha': stats['alpha'],
+            'beta': stats['beta'],
+            'expected_value': stats['expected_value']
         }
+    
+    def save(self, path: str):
+        self.engine.snapshot(path, metadata={'name': self.name})
+    
+    def load(self, path: str):
+        self.engine.restore(path)
+
+
+class LinUCBLevelBandit:
+    """Contextual (LinUCB) bandit with the same interface as ThompsonSamplingBandit"""
+    
+    def __init__(self, name: str = "LinUCB", alpha: float = 1.0, decay_factor: float = 0.99):
+        self.name = name
+        self.engine = LinUCBBandit(n_features=BanditContext.N_FEATURES, alpha=alpha)
+        self.decay_factor = decay_factor
+    
+    @property
+    def total_pulls(self) -> int:
+        return int(round(self.engine.total_pulls))
+    
+    def add_arm(self, arm_id: str):
+        self.engine.add_arm(arm_id)
+    
+    def select_arm(self, available_arms: List[str], context: Optional[BanditContext] = None) -> str:
+        if not available_arms:
+            return None
+        return self.engine.select_one(available_arms, context=self._features(context))
+    
+    def select_arms(self, available_arms: List[str], k: int, context: Optional[BanditContext] = None) -> List[str]:
+        return self.engine.select(k, available_arms, context=self._features(context))
+    
+    def update(self, arm_id: str, reward: float, context: Optional[BanditContext] = None):
+        self.engine.update(arm_id, reward, contexts=self._features(context)[None, :])
+    
+    def decay(self):
+        self.engine.decay(self.decay_factor)
+    
+    def get_arm_stats(self, arm_id: str) -> Dict:
+        return self.engine.stats(arm_id)
+    
+    def save(self, path: str):
+        self.engine.snapshot(path, metadata={'name': self.name})
+    
+    def load(self, path: str):
+        self.engine.restore(path)
+    
+    @staticmethod
+    def _features(context: Optional[BanditContext]) -> np.ndarray:
+        if context is None:
+            features = np.zeros(BanditContext.N_FEATURES)
+            features[0] = 1.0
+            return features
+        return context.to_features()
 
 
 class HierarchicalContextualBandit:
     """Hierarchical bandit system with context awareness"""
     
-    def __init__(self, levels: List[str] = None):
+    def __init__(self, levels: List[str] = None, contextual: bool = False):
         """
         Initialize hierarchical bandit
         
         Args:
             levels: List of hierarchy levels, e.g., ['region', 'strategy', 'persona', 'operator']
+            contextual: Use LinUCB on BanditContext features instead of context-free Thompson Sampling
         """
         self.levels = levels or ['region', 'strategy', 'persona', 'operator']
-        self.bandits: Dict[str, ThompsonSamplingBandit] = {}
+        self.contextual = contextual
+        self.bandits: Dict[str, Any] = {}
         self.context_history: List[BanditContext] = []
         self.level_weights: Dict[str, float] = {level: 1.0 for level in self.levels}
         
         # Initialize bandit for each level
         for level in self.levels:
-            self.bandits[level] = ThompsonSamplingBandit(name=f"{level}_bandit")
+            if contextual:
+                self.bandits[level] = LinUCBLevelBandit(name=f"{level}_bandit")
+            else:
+                self.bandits[level] = ThompsonSamplingBandit(name=f"{level}_bandit")
     
     def select_path(self, context: BanditContext) -> Dict[str, str]:
         """Select a path through the hierarchy"""
@@ -174,13 +210,31 @@ class HierarchicalContextualBandit:
             if path.get(level):
                 # Weight reward by level importance
                 level_reward = reward * self.level_weights.get(level, 1.0)
-                self.bandits[level].update(path[level], level_reward)
+                self.bandits[level].update(path[level], level_reward, context)
         
         # Store context for learning
         self.context_history.append(context)
         if len(self.context_history) > 1000:
             self.context_history = self.context_history[-1000:]
     
+    def decay(self):
+        """Discount past rewards at every level"""
+        for bandit in self.bandits.values():
+            bandit.decay()
+    
+    def save(self, directory: str):
+        """Snapshot every level bandit to <directory>/<level>.npz"""
+        os.makedirs(directory, exist_ok=True)
+        for level, bandit in self.bandits.items():
+            bandit.save(os.path.join(directory, f"{level}.npz"))
+    
+    def load(self, directory: str):
+        """Restore level bandits saved by save() (missing levels are left as-is)"""
+        for level, bandit in self.bandits.items():
+            path = os.path.join(directory, f"{level}.npz")
+            if os.path.exists(path):
+                bandit.load(path)
+    
     def _get_available_options(self, level: str, current_path: Dict[str, str], context: BanditContext) -> List[str]:
         """Get available options for a level based on context and current path"""
         # This would be implemented based on actual system state
@@ -433,7 +487,11 @@ class AdvancedBanditSystem:
         self.config = config or {}
         
         # Initialize components
-        self.hierarchical_bandit = HierarchicalContextualBandit()
+        self.hierarchical_bandit = HierarchicalContextualBandit(
+            contextual=self.config.get('contextual_bandit', False)
+        )
+        # Persistent persona selector, so persona rewards accumulate across decisions
+        self.persona_bandit = ThompsonSamplingBandit(name='persona_selector')
         self.persona_evolution = NeuralPersonaEvolution(
             population_size=self.config.get('persona_population_size', 20),
             mutation_rate=self.config.get('persona_mutation_rate', 0.15),
@@ -489,6 +547,11 @@ class AdvancedBanditSystem:
         
         # Update meta selector
         self.meta_selector.update_strategy_performance(action['strategy'], reward)
+        
+        # Update persona selector
+        persona_id = action.get('persona', {}).get('id')
+        if persona_id and persona_id in self.persona_bandit.engine:
+            self.persona_bandit.update(persona_id, reward, context)
     
     def evolve_personas(self, fitness_scores: Dict[str, float]) -> List[Dict]:
         """Evolve persona population"""
@@ -502,11 +565,7 @@ class AdvancedBanditSystem:
         
         # Use Thompson Sampling to select from population
         persona_ids = [p.get('id', '') for p in population]
-        bandit = ThompsonSamplingBandit(name='persona_selector')
-        for pid in persona_ids:
-            bandit.add_arm(pid)
-        
-        selected_id = bandit.select_arm(persona_ids, context)
+        selected_id = self.persona_bandit.select_arm(persona_ids, context)
         selected = next((p for p in population if p.get('id') == selected_id), population[0])
         return self.persona_evolution._decode_persona(selected)
     
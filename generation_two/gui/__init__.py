@@ -3,11 +3,15 @@ Cyberpunk-themed GUI for Generation Two
 Modular components for monitoring and control
 """
 
-from .main_window import CyberpunkGUI
-from .components.dashboard import DashboardPanel
-from .components.evolution_panel import EvolutionPanel
-from .components.config_panel import ConfigPanel
-from .components.monitor_panel import MonitorPanel
+from .._lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    '.main_window': ['CyberpunkGUI'],
+    '.components.dashboard': ['DashboardPanel'],
+    '.components.evolution_panel': ['EvolutionPanel'],
+    '.components.config_panel': ['ConfigPanel'],
+    '.components.monitor_panel': ['MonitorPanel']
+})
 
 __all__ = [
     'CyberpunkGUI',
@@ -2,12 +2,17 @@
 GUI Components
 """
 
-from .dashboard import DashboardPanel
-from .evolution_panel import EvolutionPanel
-from .config_panel import ConfigPanel
-from .monitor_panel import MonitorPanel
-from .database_panel import DatabasePanel
-from .workflow_panel import WorkflowPanel
+from ..._lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    '.dashboard': ['DashboardPanel'],
+    '.evolution_panel': ['EvolutionPanel'],
+    '.config_panel': ['ConfigPanel'],
+    '.monitor_panel': ['MonitorPanel'],
+    '.database_panel': ['DatabasePanel'],
+    '.workflow_panel': ['WorkflowPanel'],
+    '.virtual_table': ['VirtualTable']
+})
 
 __all__ = [
     'DashboardPanel',
@@ -15,5 +20,6 @@ __all__ = [
     'ConfigPanel',
     'MonitorPanel',
     'DatabasePanel',
-    'WorkflowPanel'
+    'WorkflowPanel',
+    'VirtualTable'
 ]
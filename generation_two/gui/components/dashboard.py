@@ -57,6 +57,9 @@ class DashboardPanel:
             ('Active Modules', 'active_modules', COLORS['accent_yellow']),
             ('Success Rate', 'success_rate', COLORS['accent_green']),
             ('Avg Sharpe', 'avg_sharpe', COLORS['accent_cyan']),
+            ('Accounts Ready', 'accounts_ready', COLORS['accent_yellow']),
+            ('Pool Slots In Use', 'pool_slots', COLORS['accent_pink']),
+            ('Sims / Hour', 'sims_per_hour', COLORS['accent_green']),
         ]
         
         row = 0
@@ -93,6 +96,17 @@ class DashboardPanel:
         # Configure grid weights
         for i in range(3):
             self.stats_frame.columnconfigure(i, weight=1)
+        
+        # Per-account breakdown (multi-account pool only)
+        self.accounts_label = tk.Label(
+            self.frame,
+            text="",
+            font=FONTS['mono'],
+            fg=COLORS['text_secondary'],
+            bg=COLORS['bg_panel'],
+            justify=tk.LEFT
+        )
+        self.accounts_label.pack(fill=tk.X, padx=10, pady=5)
     
     def _start_updates(self):
         """Start periodic updates"""
@@ -134,3 +148,17 @@ class DashboardPanel:
         # Avg Sharpe
         if 'avg_sharpe' in stats:
             self.stat_labels['avg_sharpe'].config(text=f"{stats['avg_sharpe']:.3f}")
+        
+        # Multi-account pool throughput
+        pool = stats.get('account_pool')
+        if pool:
+            self.stat_labels['accounts_ready'].config(text=f"{pool['accounts_ready']}/{pool['accounts_total']}")
+            self.stat_labels['pool_slots'].config(text=f"{pool['active_slots']}/{pool['max_slots']}")
+            self.stat_labels['sims_per_hour'].config(text=f"{pool['sims_per_hour']:.0f}")
+            lines = [
+                f"{a['name']:<16} {'✓' if a['authenticated'] else '✗'}  slots {a['active_slots']}/{a['max_slots']}  "
+                f"left today {a['remaining_today']:<5} done {a['completed']:<5} failed {a['failed']:<4} "
+                f"{a['sims_per_hour']:.0f}/h"
+                for a in pool['accounts']
+            ]
+            self.accounts_label.config(text="\n".join(lines))
@@ -363,7 +363,10 @@ class DatabasePanel:
             messagebox.showinfo("Info", "Remote URL visualization not yet implemented")
     
     def _show_sqlite_visualization(self, db_path: str):
-        """Show SQLite database visualization"""
+        """Show SQLite database visualization (virtualized, paged from SQLite as you scroll)"""
+        from ...storage.paged_table import PagedTableModel
+        from .virtual_table import VirtualTable
+        
         viz_window = tk.Toplevel(self.frame)
         viz_window.title("Database Visualization")
         viz_window.geometry("1000x700")
@@ -393,165 +396,70 @@ class DatabasePanel:
         table_combo = ttk.Combobox(selector_frame, textvariable=table_var, values=tables, state="readonly")
         table_combo.pack(side=tk.LEFT, padx=5)
         
-        # Data display
-        data_frame = tk.Frame(viz_window, bg=COLORS['bg_panel'])
-        data_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        # Filter (pushed down to SQL): substring, or '>1.5' style comparison on one column
+        tk.Label(
+            selector_frame,
+            text="Filter:",
+            font=FONTS['default'],
+            fg=COLORS['text_primary'],
+            bg=COLORS['bg_panel']
+        ).pack(side=tk.LEFT, padx=(15, 5))
         
-        # Treeview for data
-        tree = ttk.Treeview(data_frame)
-        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        ALL_COLUMNS = "(all columns)"
+        filter_column_var = tk.StringVar(value=ALL_COLUMNS)
+        filter_column_combo = ttk.Combobox(selector_frame, textvariable=filter_column_var, state="readonly", width=18)
+        filter_column_combo.pack(side=tk.LEFT, padx=5)
         
-        scrollbar = ttk.Scrollbar(data_frame, orient=tk.VERTICAL, command=tree.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        tree.configure(yscrollcommand=scrollbar.set)
+        filter_var = tk.StringVar(value="")
+        filter_entry = tk.Entry(
+            selector_frame,
+            textvariable=filter_var,
+            bg=COLORS['bg_secondary'],
+            fg=COLORS['text_primary'],
+            insertbackground=COLORS['accent_cyan'],
+            font=FONTS['default'],
+            width=25
+        )
+        filter_entry.pack(side=tk.LEFT, padx=5)
+        
+        count_label = tk.Label(
+            selector_frame,
+            text="",
+            font=FONTS['small'],
+            fg=COLORS['text_secondary'],
+            bg=COLORS['bg_panel']
+        )
+        count_label.pack(side=tk.RIGHT, padx=5)
+        
+        # Data display: only the visible rows exist as Treeview items
+        column_widths = {
+            'id': 200, 'description': 300, 'region': 60, 'universe': 100,
+            'delay': 60, 'type': 80, 'dataset_name': 150, 'category_name': 100,
+            'subcategory_name': 150, 'coverage': 80, 'userCount': 80,
+            'alphaCount': 80, 'pyramidMultiplier': 100, 'themes': 150, 'template': 300
+        }
+        table_view = VirtualTable(viz_window, column_widths=column_widths)
+        table_view.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        state = {'model': None}
+        
+        def update_count():
+            model = state['model']
+            count_label.config(text=f"{model.row_count():,} rows" if model else "")
         
         def load_table_data():
-            """Load data from selected table"""
-            # Clear existing data
-            for item in tree.get_children():
-                tree.delete(item)
-            
+            """Open the selected table as a paged model"""
             table_name = table_var.get()
             if not table_name:
                 return
             
             try:
-                # First, get column names to check if we have JSON data
-                cursor.execute(f"PRAGMA table_info({table_name})")
-                table_info = cursor.fetchall()
-                column_names = [col[1] for col in table_info]
-                
-                # Check if this is a data_fields table with JSON field_data
-                has_json_data = 'field_data' in column_names or 'data' in column_names
-                
-                if has_json_data:
-                    # Parse JSON and extract all fields as columns
-                    json_column = 'field_data' if 'field_data' in column_names else 'data'
-                    cursor.execute(f"SELECT * FROM {table_name} LIMIT 100")
-                    rows = cursor.fetchall()
-                    
-                    if rows:
-                        # Parse first row to get all possible fields
-                        first_row_dict = dict(zip(column_names, rows[0]))
-                        json_data = first_row_dict.get(json_column)
-                        
-                        if json_data:
-                            try:
-                                if isinstance(json_data, str):
-                                    field_obj = json.loads(json_data)
-                                else:
-                                    field_obj = json_data
-                                
-                                # Flatten nested objects
-                                def flatten_field(field):
-                                    """Flatten a data field object into a dictionary"""
-                                    flat = {}
-                                    for key, value in field.items():
-                                        if key == 'dataset' and isinstance(value, dict):
-                                            flat['dataset_id'] = value.get('id', '')
-                                            flat['dataset_name'] = value.get('name', '')
-                                        elif key == 'category' and isinstance(value, dict):
-                                            flat['category_id'] = value.get('id', '')
-                                            flat['category_name'] = value.get('name', '')
-                                        elif key == 'subcategory' and isinstance(value, dict):
-                                            flat['subcategory_id'] = value.get('id', '')
-                                            flat['subcategory_name'] = value.get('name', '')
-                                        elif key == 'themes' and isinstance(value, list):
-                                            flat['themes'] = ', '.join(value) if value else ''
-                                        else:
-                                            flat[key] = value
-                                    return flat
-                                
-                                # Get all possible columns from all rows
-                                all_columns = set()
-                                flattened_rows = []
-                                
-                                for row in rows:
-                                    row_dict = dict(zip(column_names, row))
-                                    json_data = row_dict.get(json_column)
-                                    if json_data:
-                                        try:
-                                            if isinstance(json_data, str):
-                                                field_obj = json.loads(json_data)
-                                            else:
-                                                field_obj = json_data
-                                            
-                                            flat_field = flatten_field(field_obj)
-                                            all_columns.update(flat_field.keys())
-                                            flattened_rows.append((row, flat_field))
-                                        except:
-                                            pass
-                                
-                                # Define column order (important fields first)
-                                column_order = [
-                                    'id', 'description', 'region', 'universe', 'delay', 'type',
-                                    'dataset_name', 'category_name', 'subcategory_name',
-                                    'coverage', 'userCount', 'alphaCount', 'pyramidMultiplier',
-                                    'themes', 'dataset_id', 'category_id', 'subcategory_id'
-                                ]
-                                
-                                # Add any remaining columns
-                                for col in sorted(all_columns):
-                                    if col not in column_order:
-                                        column_order.append(col)
-                                
-                                # Filter to only columns that exist
-                                columns = [col for col in column_order if col in all_columns]
-                                
-                                # Configure treeview
-                                tree['columns'] = columns
-                                tree['show'] = 'headings'
-                                
-                                # Clear existing columns first
-                                for col in tree['columns']:
-                                    tree.heading(col, text="")
-                                    tree.column(col, width=0)
-                                
-                                # Set column widths based on content
-                                column_widths = {
-                                    'id': 200, 'description': 300, 'region': 60, 'universe': 100,
-                                    'delay': 60, 'type': 80, 'dataset_name': 150, 'category_name': 100,
-                                    'subcategory_name': 150, 'coverage': 80, 'userCount': 80,
-                                    'alphaCount': 80, 'pyramidMultiplier': 100, 'themes': 150
-                                }
-                                
-                                for col in columns:
-                                    tree.heading(col, text=col.replace('_', ' ').title())
-                                    tree.column(col, width=column_widths.get(col, 120))
-                                
-                                # Insert rows
-                                for row, flat_field in flattened_rows:
-                                    values = [str(flat_field.get(col, '')) for col in columns]
-                                    tree.insert('', tk.END, values=values)
-                                
-                            except Exception as e:
-                                logger.error(f"Error parsing JSON data: {e}", exc_info=True)
-                                # Fall back to regular display
-                                has_json_data = False
-                
-                if not has_json_data:
-                    # Regular table display
-                    cursor.execute(f"SELECT * FROM {table_name} LIMIT 100")
-                    columns = [description[0] for description in cursor.description]
-                    
-                    # Configure columns
-                    tree['columns'] = columns
-                    tree['show'] = 'headings'
-                    
-                    # Clear existing columns first
-                    for col in tree['columns']:
-                        tree.heading(col, text="")
-                        tree.column(col, width=0)
-                    
-                    for col in columns:
-                        tree.heading(col, text=col)
-                        tree.column(col, width=120)
-                    
-                    # Load data
-                    rows = cursor.fetchall()
-                    for row in rows:
-                        tree.insert('', tk.END, values=row)
-            
+                model = PagedTableModel(conn, table_name)
+                state['model'] = model
+                filter_var.set("")
+                filter_column_combo.config(values=[ALL_COLUMNS] + model.columns)
+                filter_column_var.set(ALL_COLUMNS)
+                table_view.set_model(model)
+                update_count()
             except sqlite3.OperationalError as e:
                 if "closed database" in str(e).lower():
                     messagebox.showerror("Error", "Database connection was closed. Please reopen the visualization.")
@@ -561,6 +469,42 @@ class DatabasePanel:
                 messagebox.showerror("Error", f"Error loading table: {e}")
                 logger.error(f"Error loading table data: {e}", exc_info=True)
         
+        def apply_filter(event=None):
+            """Re-query with the current filter"""
+            model = state['model']
+            if not model:
+                return
+            column = filter_column_var.get()
+            try:
+                model.set_filter(filter_var.get(), None if column == ALL_COLUMNS else column)
+                table_view.first = 0
+                table_view.refresh()
+                update_count()
+            except sqlite3.Error as e:
+                messagebox.showerror("Error", f"Invalid filter: {e}")
+        
+        def show_row(index: int):
+            """Show one row in full, JSON columns decoded"""
+            model = state['model']
+            if not model:
+                return
+            detail_window = tk.Toplevel(viz_window)
+            detail_window.title(f"{model.table} row {index + 1}")
+            detail_window.geometry("700x500")
+            detail_window.configure(bg=COLORS['bg_primary'])
+            text_widget = scrolledtext.ScrolledText(
+                detail_window,
+                bg=COLORS['bg_secondary'],
+                fg=COLORS['accent_cyan'],
+                font=FONTS['mono'],
+                wrap=tk.WORD
+            )
+            text_widget.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+            text_widget.insert('1.0', json.dumps(model.row_detail(index), indent=2, default=str))
+            text_widget.config(state=tk.DISABLED)
+        
+        table_view.on_open = show_row
+        
         def on_window_close():
             """Close database connection when window is closed"""
             try:
@@ -573,8 +517,10 @@ class DatabasePanel:
         # Bind window close event
         viz_window.protocol("WM_DELETE_WINDOW", on_window_close)
         
-        # Bind table selection change
+        # Bind table selection change and filter
         table_combo.bind('<<ComboboxSelected>>', lambda e: load_table_data())
+        filter_entry.bind('<Return>', apply_filter)
+        filter_column_combo.bind('<<ComboboxSelected>>', apply_filter)
         
         # Load initial table data
         if tables:
@@ -1,31 +1,202 @@
 """
 Log Terminal Component
 Omnipresent mini terminal for trace logs
+
+Log lines are queued from any thread and drained once per tick into a single
+batched widget insert. The widget only holds the newest lines; filtering and
+search run over an in-memory index, and the full log spills to a rotating file.
 """
 
 import tkinter as tk
-from tkinter import scrolledtext
+from tkinter import scrolledtext, ttk
+import datetime
 import logging
+import logging.handlers
+import os
 import queue
-import threading
-from typing import Optional
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+from ..theme import COLORS, FONTS, STYLES
+
+LEVELS = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
+LEVEL_RANKS = {level: rank for rank, level in enumerate(LEVELS)}
+
+# (timestamp, level, text)
+LogEntry = Tuple[str, str, str]
+
+# Spill file next to the package, independent of the working directory
+DEFAULT_SPILL_PATH = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'logs', 'gui_trace.log'))
+
+logger = logging.getLogger(__name__)
+
+
+def format_entry(entry: LogEntry) -> str:
+    """Render an entry as one (possibly multi-line) terminal record, newline included"""
+    timestamp, level, text = entry
+    return f"[{timestamp}] [{level}] {text}\n"
+
+
+def entry_lines(entry: LogEntry) -> int:
+    """Number of text lines an entry occupies (tracebacks span several)"""
+    return entry[2].count('\n') + 1
+
+
+class LogSink:
+    """
+    Tk-independent log buffer behind LogTerminal.
+
+    Keeps the newest `index_size` entries in a ring buffer for filtering and
+    search, and optionally writes every entry to a size-rotated log file.
+    """
+
+    def __init__(self, index_size: int = 20000, max_line_length: int = 500,
+                 spill_path: Optional[str] = None, spill_max_bytes: int = 10 * 1024 * 1024,
+                 spill_backup_count: int = 5):
+        """
+        Initialize log sink
+
+        Args:
+            index_size: Number of entries kept in memory for filtering/search
+            max_line_length: Longer messages are truncated in memory (not in the spill file)
+            spill_path: Rotating log file receiving every entry (None to disable)
+            spill_max_bytes: Size at which the spill file is rotated
+            spill_backup_count: Number of rotated spill files to keep
+        """
+        self.queue: queue.Queue = queue.Queue()
+        self.entries: Deque[LogEntry] = deque(maxlen=index_size)
+        self.max_line_length = max_line_length
+        self.total_entries = 0
+        self.spill_path = spill_path
+        self._spill: Optional[logging.Handler] = None
+        if spill_path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(spill_path)), exist_ok=True)
+                self._spill = logging.handlers.RotatingFileHandler(
+                    spill_path, maxBytes=spill_max_bytes, backupCount=spill_backup_count, encoding='utf-8'
+                )
+            except OSError as e:
+                logger.warning(f"Log spill file disabled: {e}")
+
+    def put(self, level: str, text: str):
+        """Queue a log line (thread-safe)"""
+        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
+        self.queue.put((timestamp, level, text))
+
+    def drain(self, max_items: int = 10000) -> List[LogEntry]:
+        """
+        Move pending lines into the index and spill file
+
+        Args:
+            max_items: Upper bound per call so one tick cannot stall the GUI
 
-from ..theme import COLORS, FONTS
+        Returns:
+            Entries drained in this call, oldest first
+        """
+        batch: List[LogEntry] = []
+        try:
+            while len(batch) < max_items:
+                batch.append(self.queue.get_nowait())
+        except queue.Empty:
+            pass
+        if not batch:
+            return batch
+
+        if self._spill is not None:
+            self._write_spill(batch)
+
+        truncated = []
+        for timestamp, level, text in batch:
+            if len(text) > self.max_line_length:
+                text = text[:self.max_line_length - 3] + "..."
+            truncated.append((timestamp, level, text))
+        self.entries.extend(truncated)
+        self.total_entries += len(truncated)
+        return truncated
+
+    def _write_spill(self, batch: List[LogEntry]):
+        """Write a batch to the spill file with one flush, rotating on size"""
+        handler = self._spill
+        handler.acquire()
+        try:
+            handler.stream.flush()
+            size = os.path.getsize(handler.baseFilename)
+            for entry in batch:
+                record = format_entry(entry)
+                record_bytes = len(record.encode('utf-8'))
+                if handler.maxBytes and size + record_bytes > handler.maxBytes and size > 0:
+                    handler.stream.flush()
+                    handler.doRollover()
+                    size = 0
+                handler.stream.write(record)
+                size += record_bytes
+            handler.stream.flush()
+        except Exception as e:
+            logger.warning(f"Log spill write failed: {e}")
+        finally:
+            handler.release()
+
+    @staticmethod
+    def matches(entry: LogEntry, min_level: str = 'DEBUG', search: str = '') -> bool:
+        """Check an entry against a minimum level and a case-insensitive search term"""
+        if LEVEL_RANKS.get(entry[1], 0) < LEVEL_RANKS.get(min_level, 0):
+            return False
+        return not search or search in entry[2].lower()
+
+    def query(self, min_level: str = 'DEBUG', search: str = '', limit: Optional[int] = None) -> List[LogEntry]:
+        """
+        Return the newest indexed entries matching a filter
+
+        Args:
+            min_level: Minimum level to include
+            search: Case-insensitive substring to match
+            limit: Maximum number of entries (newest kept)
+        """
+        search = search.lower()
+        matched: List[LogEntry] = []
+        for entry in reversed(self.entries):
+            if self.matches(entry, min_level, search):
+                matched.append(entry)
+                if limit is not None and len(matched) >= limit:
+                    break
+        matched.reverse()
+        return matched
+
+    def clear(self):
+        """Forget indexed entries (the spill file is kept)"""
+        self.entries.clear()
+
+    def close(self):
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
 
 
 class LogTerminal:
     """Floating mini terminal for trace logs"""
     
-    def __init__(self, parent):
+    def __init__(self, parent, max_lines: int = 1000, index_size: int = 20000,
+                 spill_path: Optional[str] = DEFAULT_SPILL_PATH,
+                 poll_interval_ms: int = 100):
         """
         Initialize log terminal
         
         Args:
             parent: Parent widget (main window)
+            max_lines: Maximum number of lines kept in the text widget
+            index_size: Number of entries kept in memory for filtering/search
+            spill_path: Rotating file receiving the full log (None to disable)
+            poll_interval_ms: Interval between batched widget updates
         """
         self.parent = parent
-        self.log_queue = queue.Queue()
-        self.max_lines = 500
+        self.max_lines = max_lines
+        self.poll_interval_ms = poll_interval_ms
+        self.sink = LogSink(index_size=index_size, spill_path=spill_path)
+        self.log_queue = self.sink.queue
+        self.min_level = 'DEBUG'
+        self.search_text = ''
+        self._widget_lines = 0
         
         # Create floating frame
         self.frame = tk.Frame(parent, bg=COLORS['bg_primary'], relief=tk.RAISED, bd=2)
@@ -74,6 +245,27 @@ class LogTerminal:
         )
         self.toggle_btn.pack(side=tk.RIGHT, padx=2)
         
+        # Search and level filter (run over the in-memory index, not the widget)
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add('write', lambda *_: self._on_filter_change())
+        tk.Entry(
+            title_frame,
+            textvariable=self.search_var,
+            width=20,
+            **STYLES['entry']
+        ).pack(side=tk.RIGHT, padx=2)
+        
+        self.level_var = tk.StringVar(value=self.min_level)
+        level_combo = ttk.Combobox(
+            title_frame,
+            textvariable=self.level_var,
+            values=LEVELS,
+            state="readonly",
+            width=9
+        )
+        level_combo.pack(side=tk.RIGHT, padx=2)
+        level_combo.bind('<<ComboboxSelected>>', lambda _: self._on_filter_change())
+        
         # Log text area
         self.log_text = scrolledtext.ScrolledText(
             self.frame,
@@ -85,7 +277,8 @@ class LogTerminal:
             relief=tk.FLAT,
             bd=0,
             padx=5,
-            pady=5
+            pady=5,
+            undo=False
         )
         self.log_text.pack(fill=tk.BOTH, expand=True)
         
@@ -110,45 +303,68 @@ class LogTerminal:
             self.toggle_btn.config(text="▼")
     
     def _clear_logs(self):
-        """Clear log display"""
+        """Clear log display and in-memory index (the spill file is kept)"""
+        self.sink.clear()
         self.log_text.delete('1.0', tk.END)
+        self._widget_lines = 0
     
     def _process_log_queue(self):
-        """Process log messages from queue (thread-safe)"""
+        """Drain all pending log messages into one widget update (thread-safe)"""
         try:
-            while True:
-                log_entry = self.log_queue.get_nowait()
-                self._add_log(log_entry['level'], log_entry['text'])
-        except queue.Empty:
-            pass
+            batch = self.sink.drain()
+            if batch:
+                search = self.search_text.lower()
+                visible = [entry for entry in batch if LogSink.matches(entry, self.min_level, search)]
+                self._append(visible)
+        except Exception as e:
+            # Never let a bad record stop the polling loop
+            logger.warning(f"Failed to process log queue: {e}")
         
         # Schedule next check
-        self.frame.after(100, self._process_log_queue)
+        self.frame.after(self.poll_interval_ms, self._process_log_queue)
     
-    def _add_log(self, level: str, text: str):
-        """Add log message to display"""
-        # Truncate if too long
-        if len(text) > 500:
-            text = text[:497] + "..."
-        
-        # Add timestamp
-        import datetime
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
+    def _append(self, entries: List[LogEntry]):
+        """Append entries with a single insert and trim the widget to max_lines"""
+        if not entries:
+            return
+        if len(entries) > self.max_lines:
+            entries = entries[-self.max_lines:]
         
-        # Insert log with appropriate tag
-        log_line = f"[{timestamp}] [{level}] {text}\n"
-        self.log_text.insert(tk.END, log_line, level)
-        self.log_text.see(tk.END)
+        # Only autoscroll if the user is already looking at the bottom
+        follow = self.log_text.yview()[1] >= 0.999
         
-        # Limit log size
-        lines = int(self.log_text.index('end-1c').split('.')[0])
-        if lines > self.max_lines:
-            # Remove oldest 100 lines
-            self.log_text.delete('1.0', f'{100}.0')
+        # Text.insert accepts alternating (chars, tags) pairs, so the whole batch is one call
+        args = []
+        for entry in entries:
+            args.extend((format_entry(entry), entry[1]))
+        self.log_text.insert(tk.END, *args)
+        # Count Text lines, not entries: the trim below deletes whole lines
+        self._widget_lines += sum(entry_lines(entry) for entry in entries)
+        
+        excess = self._widget_lines - self.max_lines
+        if excess > 0:
+            self.log_text.delete('1.0', f'{excess + 1}.0')
+            self._widget_lines = self.max_lines
+        
+        if follow:
+            self.log_text.see(tk.END)
+    
+    def _on_filter_change(self):
+        """Re-render the widget from the in-memory index with the current filter"""
+        self.min_level = self.level_var.get() or 'DEBUG'
+        self.search_text = self.search_var.get()
+        self.log_text.delete('1.0', tk.END)
+        self._widget_lines = 0
+        self._append(self.sink.query(self.min_level, self.search_text, limit=self.max_lines))
+        self.log_text.see(tk.END)
     
     def add_log(self, level: str, text: str):
         """Add log message (thread-safe)"""
-        self.log_queue.put({'level': level, 'text': text})
+        self.sink.put(level, text)
+    
+    def close(self):
+        """Close the spill file"""
+        self.sink.close()
     
     def pack(self, **kwargs):
         """Pack the terminal frame"""
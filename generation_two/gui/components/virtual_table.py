@@ -0,0 +1,186 @@
+"""
+Virtual Table
+Treeview that only holds the visible rows of a PagedTableModel and refills them on scroll
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Dict, Optional
+import logging
+
+from ..theme import COLORS
+
+logger = logging.getLogger(__name__)
+
+
+class VirtualTable:
+    """
+    Scrollable table over a row model of any size
+
+    The Treeview keeps one item per visible line; scrolling moves a window over
+    the model and rewrites those items' values, so the widget cost does not grow
+    with the table. Clicking a heading sorts through the model (in SQL).
+    """
+
+    def __init__(self, parent, model=None, column_widths: Optional[Dict[str, int]] = None,
+                 on_open: Optional[Callable[[int], None]] = None, follow_tail: bool = False):
+        """
+        Initialize virtual table
+
+        Args:
+            parent: Parent widget
+            model: PagedTableModel (or anything with columns/row_count/rows/set_sort)
+            column_widths: Optional {column: width}
+            on_open: Called with the row index on double-click / Return
+            follow_tail: Keep the view at the last row while it is scrolled to the end
+        """
+        self.model = None
+        self.column_widths = column_widths or {}
+        self.on_open = on_open
+        self.follow_tail = follow_tail
+        self.first = 0
+        self.visible = 20
+        self._count = 0
+
+        self.frame = tk.Frame(parent, bg=COLORS['bg_panel'])
+        self.tree = ttk.Treeview(self.frame, show='headings', selectmode='browse')
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        style = ttk.Style()
+        self.row_height = int(style.lookup('Treeview', 'rowheight') or 20)
+
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<MouseWheel>', lambda e: self.scroll(-3 if e.delta > 0 else 3))
+        self.tree.bind('<Button-4>', lambda e: self.scroll(-3))
+        self.tree.bind('<Button-5>', lambda e: self.scroll(3))
+        self.tree.bind('<Prior>', lambda e: self._key_scroll(-self.visible))
+        self.tree.bind('<Next>', lambda e: self._key_scroll(self.visible))
+        self.tree.bind('<Up>', lambda e: self._step(-1))
+        self.tree.bind('<Down>', lambda e: self._step(1))
+        self.tree.bind('<Home>', lambda e: self._key_scroll(-self._count))
+        self.tree.bind('<End>', lambda e: self._key_scroll(self._count))
+        self.tree.bind('<Double-1>', self._on_open)
+        self.tree.bind('<Return>', self._on_open)
+
+        if model is not None:
+            self.set_model(model)
+
+    def pack(self, **kwargs):
+        """Pack the table frame"""
+        self.frame.pack(**kwargs)
+
+    def set_model(self, model):
+        """Show a new model from the top"""
+        self.model = model
+        columns = list(model.columns)
+        self.tree.delete(*self.tree.get_children())
+        self.tree['columns'] = columns
+        for col in columns:
+            self.tree.heading(col, text=col.replace('_', ' ').title(), command=lambda c=col: self._on_heading(c))
+            self.tree.column(col, width=self.column_widths.get(col, 120), stretch=False)
+        self.first = 0
+        self.refresh()
+
+    def refresh(self):
+        """Re-read the row count and redraw the visible window"""
+        if self.model is None:
+            return
+        at_end = self.first + self.visible >= self._count
+        self._count = self.model.row_count()
+        if self.follow_tail and at_end:
+            self.first = self._count - self.visible
+        self._render()
+
+    def scroll(self, delta: int):
+        """Move the window by `delta` rows"""
+        self.first += delta
+        self._render()
+        return 'break'
+
+    def index_of(self, item: str) -> Optional[int]:
+        """Row index shown by a Treeview item"""
+        try:
+            return self.first + self.tree.index(item)
+        except tk.TclError:
+            return None
+
+    # ------------------------------------------------------------- internals
+
+    def _render(self):
+        """Fill the Treeview items with the rows in the current window"""
+        self.first = max(0, min(self.first, self._count - self.visible))
+        try:
+            rows = self.model.rows(self.first, self.visible) if self._count else []
+        except Exception as e:
+            logger.error(f"Error reading table rows: {e}", exc_info=True)
+            rows = []
+        items = self.tree.get_children()
+        for item, values in zip(items, rows):
+            self.tree.item(item, values=values)
+        for values in rows[len(items):]:
+            self.tree.insert('', tk.END, values=values)
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+        if self._count:
+            self.scrollbar.set(self.first / self._count, (self.first + len(rows)) / self._count)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _on_resize(self, event):
+        """Recompute how many rows fit"""
+        visible = max(1, event.height // self.row_height - 1)
+        if visible != self.visible:
+            self.visible = visible
+            self._render()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        """Scrollbar drag (moveto) and arrows/trough clicks (scroll)"""
+        if action == tk.MOVETO:
+            self.first = int(float(amount) * self._count)
+        elif action == tk.SCROLL:
+            step = self.visible if unit == tk.PAGES else 1
+            self.first += int(amount) * step
+        self._render()
+
+    def _key_scroll(self, delta: int):
+        """Keyboard paging"""
+        self.scroll(delta)
+        return 'break'
+
+    def _step(self, delta: int):
+        """Move the selection one row, scrolling at the window edges"""
+        items = self.tree.get_children()
+        if not items:
+            return 'break'
+        selection = self.tree.selection()
+        position = self.tree.index(selection[0]) + delta if selection else 0
+        if position < 0 or position >= len(items):
+            self.scroll(delta)
+            position = min(max(position, 0), len(self.tree.get_children()) - 1)
+        items = self.tree.get_children()
+        if items:
+            self.tree.selection_set(items[position])
+            self.tree.focus(items[position])
+        return 'break'
+
+    def _on_heading(self, column: str):
+        """Sort by a column; clicking it again flips the direction"""
+        descending = self.model.sort_column == column and not self.model.descending
+        self.model.set_sort(column, descending)
+        for col in self.model.columns:
+            title = col.replace('_', ' ').title()
+            if col == column:
+                title += ' ▼' if descending else ' ▲'
+            self.tree.heading(col, text=title)
+        self.first = 0
+        self.refresh()
+
+    def _on_open(self, event=None):
+        """Open the selected row"""
+        selection = self.tree.selection()
+        if self.on_open and selection:
+            index = self.index_of(selection[0])
+            if index is not None:
+                self.on_open(index)
@@ -31,6 +31,7 @@ class WorkflowPanel:
         """
         self.parent = parent
         self.generator = generator
+        self.account_pool = None  # Set by the main window once a multi-account pool is authenticated
         
         self.frame = tk.Frame(parent, **STYLES['frame'])
         self.frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -640,8 +641,9 @@ class WorkflowPanel:
                 messagebox.showinfo("Info", f"Please navigate to the ⚙️ CONFIG tab manually and select section: {section_key}")
                 return
             
-            # Switch to CONFIG tab
+            # Switch to CONFIG tab (and build it now if the main window creates tabs lazily)
             notebook.select(config_tab_index)
+            notebook.event_generate('<<NotebookTabChanged>>')
             
             # Get the config panel frame
             config_frame = notebook.nametowidget(notebook.tabs()[config_tab_index])
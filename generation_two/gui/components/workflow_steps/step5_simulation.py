@@ -7,10 +7,13 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 from typing import List, Dict
 import logging
+import sqlite3
 import time
 import threading
 
 from ...theme import COLORS, FONTS, STYLES
+from ....storage.paged_table import PagedTableModel
+from ..virtual_table import VirtualTable
 
 logger = logging.getLogger(__name__)
 
@@ -259,23 +262,50 @@ class Step5Simulation:
         results_frame = tk.Frame(self.frame, bg=COLORS['bg_panel'])
         results_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
+        results_header = tk.Frame(results_frame, bg=COLORS['bg_panel'])
+        results_header.pack(fill=tk.X)
+        
         tk.Label(
-            results_frame,
+            results_header,
             text="📋 Summary Log:",
             font=FONTS['heading'],
             fg=COLORS['accent_cyan'],
             bg=COLORS['bg_panel']
-        ).pack(anchor=tk.W, pady=5)
+        ).pack(side=tk.LEFT, anchor=tk.W, pady=5)
         
-        self.results_text = scrolledtext.ScrolledText(
-            results_frame,
-            height=10,
+        self.results_filter_var = tk.StringVar(value="")
+        results_filter = tk.Entry(
+            results_header,
+            textvariable=self.results_filter_var,
             bg=COLORS['bg_secondary'],
-            fg=COLORS['accent_green'],
-            font=FONTS['mono'],
-            wrap=tk.WORD
+            fg=COLORS['text_primary'],
+            insertbackground=COLORS['accent_cyan'],
+            font=FONTS['default'],
+            width=25
+        )
+        results_filter.pack(side=tk.RIGHT, padx=5)
+        results_filter.bind('<Return>', lambda e: self._filter_results())
+        tk.Label(
+            results_header,
+            text="Filter:",
+            font=FONTS['default'],
+            fg=COLORS['text_primary'],
+            bg=COLORS['bg_panel']
+        ).pack(side=tk.RIGHT)
+        
+        # Summary lines go to an in-memory SQLite table; the view pages through it,
+        # so long runs do not grow a Text widget
+        self.results_db = sqlite3.connect(':memory:')
+        self.results_db.execute("CREATE TABLE summary_log (id INTEGER PRIMARY KEY, time TEXT, message TEXT)")
+        self.results_model = PagedTableModel(self.results_db, 'summary_log')
+        self.results_table = VirtualTable(
+            results_frame,
+            self.results_model,
+            column_widths={'id': 60, 'time': 80, 'message': 900},
+            follow_tail=True
         )
-        self.results_text.pack(fill=tk.BOTH, expand=True)
+        self.results_table.pack(fill=tk.BOTH, expand=True)
+        self._results_refresh_pending = False
         
         # Ensure frame is properly configured
         self.frame.pack_propagate(True)
@@ -343,7 +373,7 @@ class Step5Simulation:
         self.stop_simulation_button.config(state=tk.NORMAL)
         
         # Clear results and slots
-        self.results_text.delete(1.0, tk.END)
+        self._clear_results()
         self._log_result("=" * 80 + "\n")
         self._log_result("🚀 STARTING CONCURRENT SIMULATIONS (8 slots)\n")
         self._log_result("=" * 80 + "\n\n")
@@ -366,6 +396,7 @@ class Step5Simulation:
             from generation_two.core.simulator_tester import SimulatorTester, SimulationSettings
             from generation_two.core.region_config import REGION_DEFAULT_UNIVERSE
             from generation_two.core.slot_manager import SlotManager, SlotStatus
+            from generation_two.core.slot_scheduler import JobPriority
             
             # Initialize slot manager
             self.slot_manager = SlotManager(max_slots=8)
@@ -380,11 +411,16 @@ class Step5Simulation:
                     'delay': 1
                 })()
             
-            simulator = SimulatorTester(
-                session=self.workflow.generator.template_generator.sess,
-                region_configs=region_configs,
-                template_generator=self.workflow.generator.template_generator
-            )
+            account_pool = getattr(self.workflow, 'account_pool', None)
+            if account_pool:
+                # Spread submissions over the configured accounts
+                simulator = account_pool.simulator()
+            else:
+                simulator = SimulatorTester(
+                    session=self.workflow.generator.template_generator.sess,
+                    region_configs=region_configs,
+                    template_generator=self.workflow.generator.template_generator
+                )
             
             # Queue for templates waiting for slots
             template_queue = list(enumerate(templates))
@@ -405,7 +441,10 @@ class Step5Simulation:
                     
                     # Update slot display
                     self._update_slot_display(primary_slot_id, "RUNNING", template[:40] + "...", f"Region: {template_region}", [f"Starting simulation..."])
-                    self._log_to_slot(primary_slot_id, f"[{template_index+1}/{len(templates)}] Starting: {template[:50]}...")
+                    if template_dict.get('refeed_attempt'):
+                        self._log_to_slot(primary_slot_id, f"[{template_index+1}/{len(templates)}] Retrying fixed template (refeed attempt {template_dict['refeed_attempt']}): {template[:50]}...")
+                    else:
+                        self._log_to_slot(primary_slot_id, f"[{template_index+1}/{len(templates)}] Starting: {template[:50]}...")
                     
                     # Create simulation settings
                     settings = SimulationSettings(
@@ -463,149 +502,74 @@ class Step5Simulation:
                                 'max_drawdown': result.max_drawdown
                             }
                             self.slot_manager.release_slots(slot_ids, success=True, result=result_dict)
+                            refed = " (REFED)" if template_dict.get('refeed_attempt') else ""
+                            success_label = "REFEED SUCCESS" if refed else "SUCCESS"
                             self._update_slot_display(primary_slot_id, "COMPLETED", template[:40] + "...", 
-                                                     f"✅ Alpha: {alpha_id}", 
-                                                     [f"✅ SUCCESS", f"Returns: {result.returns:.4f}", f"Sharpe: {result.sharpe:.4f}"])
-                            self._log_to_slot(primary_slot_id, f"✅ SUCCESS - Alpha ID: {alpha_id}")
+                                                     f"✅ Alpha: {alpha_id}{refed}", 
+                                                     [f"✅ SUCCESS{refed}", f"Returns: {result.returns:.4f}", f"Sharpe: {result.sharpe:.4f}"])
+                            self._log_to_slot(primary_slot_id, f"✅ {success_label} - Alpha ID: {alpha_id}")
                             self._log_to_slot(primary_slot_id, f"   Returns: {result.returns:.4f}, Sharpe: {result.sharpe:.4f}")
-                            self._log_result(f"✅ [{template_index+1}] SUCCESS - Alpha: {alpha_id}, Returns: {result.returns:.4f}, Sharpe: {result.sharpe:.4f}\n")
+                            self._log_result(f"✅ [{template_index+1}] {success_label} - Alpha: {alpha_id}, Returns: {result.returns:.4f}, Sharpe: {result.sharpe:.4f}\n")
                         else:
-                            # V2-style refeed: Try to fix and retry
+                            # V2-style refeed: fix the template and queue the retry as a REFEED job
                             error_msg = result.error_message or "Unknown error"
+                            refeed_attempt = template_dict.get('refeed_attempt', 0)
                             self._log_to_slot(primary_slot_id, f"❌ FAILED: {error_msg}")
-                            self._log_to_slot(primary_slot_id, "🔄 Attempting refeed correction...")
-                            self._update_slot_progress(primary_slot_id, 50.0, "Fixing template...", "")
                             
-                            # Use refeed mechanism with both AST and prompt engineering
-                            if self.workflow.generator.template_generator.template_validator:
-                                # Check if this is an event input error - use unlimited retries
-                                is_event_input_error = 'does not support event inputs' in error_msg.lower() or 'expects only event inputs' in error_msg.lower()
+                            validator = self.workflow.generator.template_generator.template_validator
+                            # Event input errors are refed until fixed (unlimited retries); other errors get one retry
+                            is_event_input_error = 'does not support event inputs' in error_msg.lower() or 'expects only event inputs' in error_msg.lower()
+                            max_refeed_retries = template_dict.get('max_refeed_retries', 999 if is_event_input_error else 1)
+                            
+                            # LEARN FROM ERROR
+                            if validator:
+                                validator.learn_from_simulation_error(template, error_msg, None)
+                            
+                            can_refeed = refeed_attempt == 0 or (is_event_input_error and refeed_attempt < max_refeed_retries)
+                            if validator and can_refeed and self.simulation_running:
+                                self._log_to_slot(primary_slot_id, "🔄 Attempting refeed correction...")
+                                self._update_slot_progress(primary_slot_id, 50.0, "Fixing template...", "")
                                 max_refeed_attempts = 999 if is_event_input_error else 3  # Unlimited for event inputs
-                                
-                                fixed_template, fixes = self.workflow.generator.template_generator.template_validator.refeed_with_correction(
+                                fixed_template, fixes = validator.refeed_with_correction(
                                     template, error_msg, template_region, max_attempts=max_refeed_attempts
                                 )
                                 
                                 if fixed_template and fixed_template != template:
-                                    # UNLIMITED RETRY LOOP for event input errors
-                                    current_template_for_retry = fixed_template
-                                    current_error_msg = error_msg
-                                    refeed_attempt = 0
-                                    max_refeed_retries = 999 if is_event_input_error else 1  # Unlimited for event inputs
-                                    
-                                    while refeed_attempt < max_refeed_retries:
-                                        refeed_attempt += 1
-                                        self._log_to_slot(primary_slot_id, f"✅ Fixed with {len(fixes)} corrections (refeed attempt {refeed_attempt})")
-                                        self._log_to_slot(primary_slot_id, f"Retrying with fixed template...")
-                                        self._update_slot_progress(primary_slot_id, 60.0, f"Retrying simulation (attempt {refeed_attempt})...", "")
-                                        
-                                        # Retry with fixed template
-                                        progress_url_retry = simulator.submit_simulation(current_template_for_retry, template_region, settings)
-                                        
-                                        if progress_url_retry:
-                                            self._log_to_slot(primary_slot_id, f"✅ Resubmitted: {progress_url_retry}")
-                                            result_retry = simulator.monitor_simulation(
-                                                progress_url_retry,
-                                                current_template_for_retry,
-                                                template_region,
-                                                settings,
-                                                max_wait_time=300,
-                                                progress_callback=progress_callback
-                                            )
-                                            
-                                            if result_retry.success:
-                                                completed_count['successful'] += 1
-                                                # Ensure alpha_id is a string, not a tuple or list
-                                                alpha_id_retry = result_retry.alpha_id
-                                                if isinstance(alpha_id_retry, (tuple, list)):
-                                                    alpha_id_retry = str(alpha_id_retry[0]) if alpha_id_retry and len(alpha_id_retry) > 0 else ''
-                                                elif alpha_id_retry is None:
-                                                    alpha_id_retry = ''
-                                                else:
-                                                    alpha_id_retry = str(alpha_id_retry)
-                                                result_dict = {
-                                                    'alpha_id': alpha_id_retry,
-                                                    'returns': result_retry.returns,
-                                                    'sharpe': result_retry.sharpe,
-                                                    'turnover': result_retry.turnover,
-                                                    'max_drawdown': result_retry.max_drawdown
-                                                }
-                                                self.slot_manager.release_slots(slot_ids, success=True, result=result_dict)
-                                                self._update_slot_display(primary_slot_id, "COMPLETED", current_template_for_retry[:40] + "...", 
-                                                                         f"✅ Alpha: {alpha_id_retry} (REFED)", 
-                                                                         [f"✅ SUCCESS (REFED)", f"Returns: {result_retry.returns:.4f}", f"Sharpe: {result_retry.sharpe:.4f}"])
-                                                self._log_to_slot(primary_slot_id, f"✅ REFEED SUCCESS - Alpha ID: {alpha_id_retry}")
-                                                self._log_result(f"✅ [{template_index+1}] REFEED SUCCESS - Alpha: {alpha_id_retry}, Returns: {result_retry.returns:.4f}, Sharpe: {result_retry.sharpe:.4f}\n")
-                                                return  # Success after refeed
-                                            else:
-                                                # Refeed retry failed - check if it's still an event input error
-                                                retry_error_msg = result_retry.error_message or "Unknown error"
-                                                is_still_event_input = 'does not support event inputs' in retry_error_msg.lower() or 'expects only event inputs' in retry_error_msg.lower()
-                                                
-                                                self._log_to_slot(primary_slot_id, f"❌ Refeed retry {refeed_attempt} failed: {retry_error_msg[:50]}")
-                                                
-                                                # Learn from error
-                                                if self.workflow.generator.template_generator.template_validator:
-                                                    self.workflow.generator.template_generator.template_validator.learn_from_simulation_error(
-                                                        current_template_for_retry, retry_error_msg, None
-                                                    )
-                                                
-                                                # If still event input error, retry refeed with new error
-                                                if is_still_event_input and refeed_attempt < max_refeed_retries:
-                                                    self._log_to_slot(primary_slot_id, f"🔄 Still event input error, fixing again...")
-                                                    self._update_slot_progress(primary_slot_id, 50.0, "Fixing template again...", "")
-                                                    
-                                                    # Fix again with new error message
-                                                    fixed_template_again, fixes_again = self.workflow.generator.template_generator.template_validator.refeed_with_correction(
-                                                        current_template_for_retry, retry_error_msg, template_region, max_attempts=max_refeed_attempts
-                                                    )
-                                                    
-                                                    if fixed_template_again and fixed_template_again != current_template_for_retry:
-                                                        current_template_for_retry = fixed_template_again
-                                                        current_error_msg = retry_error_msg
-                                                        fixes.extend(fixes_again)
-                                                        self._log_to_slot(primary_slot_id, f"✅ Fixed again with {len(fixes_again)} more corrections")
-                                                        continue  # Retry with new fixed template
-                                                    else:
-                                                        # Could not fix, try one more time with aggressive fix
-                                                        self._log_to_slot(primary_slot_id, f"⚠️ Could not fix, trying aggressive fix...")
-                                                        # The refeed_with_correction should have done aggressive fix, but if it didn't work, we'll continue
-                                                        break  # Exit loop and mark as failed
-                                                else:
-                                                    # Not an event input error anymore, or max retries reached
-                                                    break  # Exit loop
-                                        else:
-                                            # Failed to resubmit
-                                            self._log_to_slot(primary_slot_id, "❌ Failed to resubmit fixed template")
-                                            break  # Exit loop
-                                    
-                                    # If we get here, all refeed retries failed
-                                    completed_count['failed'] += 1
-                                    self.slot_manager.release_slots(slot_ids, success=False, error=current_error_msg)
-                                    self._update_slot_display(primary_slot_id, "FAILED", current_template_for_retry[:40] + "...", 
-                                                             f"❌ Failed (refeed)", 
-                                                             [f"❌ FAILED", f"After {refeed_attempt} refeed attempts", f"Last error: {current_error_msg[:30]}"])
-                                    self._log_result(f"❌ [{template_index+1}] FAILED (refeed after {refeed_attempt} attempts): {current_error_msg}\n")
+                                    # Queue the retry before freeing the slots, so the coordinator still sees work
+                                    self.slot_manager.enqueue(
+                                        fixed_template,
+                                        template_region,
+                                        template_index,
+                                        priority=JobPriority.REFEED,
+                                        payload={
+                                            'template': fixed_template,
+                                            'region': template_region,
+                                            'refeed_attempt': refeed_attempt + 1,
+                                            'max_refeed_retries': max_refeed_retries
+                                        }
+                                    )
+                                    self.slot_manager.release_slots(slot_ids, success=False, error=error_msg)
+                                    self._update_slot_display(primary_slot_id, "FAILED", template[:40] + "...", 
+                                                             f"🔄 Refeed queued", 
+                                                             [f"❌ FAILED", f"Fixed with {len(fixes)} corrections", f"🔄 Retry queued"])
+                                    self._log_to_slot(primary_slot_id, f"✅ Fixed with {len(fixes)} corrections, retry queued (refeed attempt {refeed_attempt + 1})")
+                                    self._log_result(f"🔄 [{template_index+1}] REFEED QUEUED (attempt {refeed_attempt + 1}): {fixed_template[:50]}...\n")
                                     return
-                                else:
-                                    # Could not fix template - LEARN FROM ERROR
-                                    self._log_to_slot(primary_slot_id, "❌ Could not fix template")
-                                    if self.workflow.generator.template_generator.template_validator:
-                                        self.workflow.generator.template_generator.template_validator.learn_from_simulation_error(
-                                            template, error_msg, None
-                                        )
+                                self._log_to_slot(primary_slot_id, "❌ Could not fix template")
                             
-                            # If refeed failed or not available, mark as failed - LEARN FROM ERROR
-                            if self.workflow.generator.template_generator.template_validator:
-                                self.workflow.generator.template_generator.template_validator.learn_from_simulation_error(
-                                    template, error_msg, None
-                                )
+                            # Refeed failed, exhausted or not available: mark as failed
                             completed_count['failed'] += 1
                             self.slot_manager.release_slots(slot_ids, success=False, error=error_msg)
-                            self._update_slot_display(primary_slot_id, "FAILED", template[:40] + "...", 
-                                                     f"❌ Failed", 
-                                                     [f"❌ FAILED", error_msg[:50]])
-                            self._log_result(f"❌ [{template_index+1}] FAILED: {error_msg}\n")
+                            if refeed_attempt:
+                                self._update_slot_display(primary_slot_id, "FAILED", template[:40] + "...", 
+                                                         f"❌ Failed (refeed)", 
+                                                         [f"❌ FAILED", f"After {refeed_attempt} refeed attempts", f"Last error: {error_msg[:30]}"])
+                                self._log_result(f"❌ [{template_index+1}] FAILED (refeed after {refeed_attempt} attempts): {error_msg}\n")
+                            else:
+                                self._update_slot_display(primary_slot_id, "FAILED", template[:40] + "...", 
+                                                         f"❌ Failed", 
+                                                         [f"❌ FAILED", error_msg[:50]])
+                                self._log_result(f"❌ [{template_index+1}] FAILED: {error_msg}\n")
                     else:
                         completed_count['failed'] += 1
                         error_msg = "Failed to submit"
@@ -630,51 +594,50 @@ class Step5Simulation:
             def simulation_coordinator():
                 """Coordinate concurrent simulations using slots"""
                 try:
-                    while template_queue and self.simulation_running:
-                        # Try to assign slots to queued templates
-                        assigned = False
-                        for template_index, template_dict in list(template_queue):
-                            if not self.simulation_running:
-                                break
-                            
-                            template_region = template_dict.get('region', region)
-                            num_slots = self.slot_manager.get_slots_required(template_region)
-                            
-                            # Try to find available slots
-                            slot_ids = self.slot_manager.find_available_slots(num_slots)
+                    # Queue every template once as EXPLORE; failed templates that are fixed come back
+                    # as REFEED jobs, so the scheduler decides the start order of both
+                    for template_index, template_dict in template_queue:
+                        self.slot_manager.enqueue(
+                            template_dict.get('template', ''),
+                            template_dict.get('region', region),
+                            template_index,
+                            priority=JobPriority.EXPLORE,
+                            payload=template_dict
+                        )
+                    
+                    # Keep dispatching while simulations run: a running one may still queue a refeed
+                    running = []
+                    while self.simulation_running:
+                        running = [t for t in running if t.is_alive()]
+                        if not self.slot_manager.get_queue_length() and not running:
+                            break
+                        for job, assigned_slots in self.slot_manager.dispatch():
+                            template_index = job.payload[2]
+                            template_dict = job.payload[3]
                             
-                            if slot_ids:
-                                # Assign slots and start simulation
-                                assigned_slots = self.slot_manager.assign_slot(
-                                    template_dict.get('template', ''),
-                                    template_region,
-                                    template_index
-                                )
-                                
-                                if assigned_slots:
-                                    # Remove from queue
-                                    template_queue.remove((template_index, template_dict))
-                                    
-                                    # Start simulation in thread
-                                    thread = threading.Thread(
-                                        target=run_simulation_in_slot,
-                                        args=(template_index, template_dict, assigned_slots),
-                                        daemon=True
-                                    )
-                                    thread.start()
-                                    self.simulation_threads.append(thread)
-                                    assigned = True
-                        
-                        if not assigned:
-                            # No slots available, wait a bit
-                            time.sleep(1)
+                            # Start simulation in thread
+                            thread = threading.Thread(
+                                target=run_simulation_in_slot,
+                                args=(template_index, template_dict, assigned_slots),
+                                daemon=True
+                            )
+                            thread.start()
+                            self.simulation_threads.append(thread)
+                            running.append(thread)
                         
                         # Update progress
-                        remaining = len(template_queue)
+                        remaining = self.slot_manager.get_queue_length()
                         completed = completed_count['successful'] + completed_count['failed']
                         self.workflow.frame.after(0, lambda: self.sim_progress_label.config(
                             text=f"Queue: {remaining}, Completed: {completed}/{completed_count['total']}"
                         ))
+                        
+                        if remaining or running:
+                            # Sleep until a slot is released instead of polling
+                            self.slot_manager.wait_for_slot(timeout=1.0)
+                    
+                    self.slot_manager.scheduler.remove(lambda job: True)
+                    self._log_scheduler_stats()
                     
                     # Wait for all simulations to complete (non-blocking check, avoid joining current thread)
                     import threading as threading_module
@@ -769,10 +732,47 @@ class Step5Simulation:
             self.simulate_all_button.config(state=tk.NORMAL)
             self.stop_simulation_button.config(state=tk.DISABLED)
     
+    def _log_scheduler_stats(self):
+        """Log per-priority queue wait times"""
+        if not self.slot_manager:
+            return
+        for name, snapshot in self.slot_manager.get_scheduler_stats()['wait_times'].items():
+            if snapshot['count']:
+                logger.info(f"Slot wait {name}: n={snapshot['count']}, mean={snapshot['mean']}s, "
+                            f"p95<={snapshot['p95']}s, max={snapshot['max']}s")
+    
     def _log_result(self, message: str):
-        """Log result to results text widget"""
-        self.workflow.frame.after(0, lambda: self.results_text.insert(tk.END, message))
-        self.workflow.frame.after(0, lambda: self.results_text.see(tk.END))
+        """Log result to the summary table (one row per non-blank line)"""
+        self.workflow.frame.after(0, lambda: self._append_result(message))
+    
+    def _append_result(self, message: str):
+        """Insert summary rows (GUI thread) and schedule one view refresh for a burst of lines"""
+        timestamp = time.strftime('%H:%M:%S')
+        lines = [line.strip() for line in message.splitlines()]
+        rows = [(timestamp, line) for line in lines if line.strip('=')]
+        if not rows:
+            return
+        self.results_db.executemany("INSERT INTO summary_log (time, message) VALUES (?, ?)", rows)
+        if not self._results_refresh_pending:
+            self._results_refresh_pending = True
+            self.workflow.frame.after(100, self._refresh_results)
+    
+    def _refresh_results(self):
+        """Redraw the summary table after new rows"""
+        self._results_refresh_pending = False
+        self.results_model.refresh()
+        self.results_table.refresh()
+    
+    def _clear_results(self):
+        """Empty the summary table"""
+        self.results_db.execute("DELETE FROM summary_log")
+        self._refresh_results()
+    
+    def _filter_results(self):
+        """Filter the summary table (SQL LIKE on every column)"""
+        self.results_model.set_filter(self.results_filter_var.get())
+        self.results_table.first = 0
+        self.results_table.refresh()
     
     def _log_to_slot(self, slot_id: int, message: str):
         """Log message to a specific slot"""
@@ -82,8 +82,12 @@ class Step6Mining:
         self._log_mining("🚀 STARTING CONTINUOUS MINING\n")
         self._log_mining("=" * 80 + "\n")
         
-        # Initialize core components
-        self.sim_counter = SimulationCounter()
+        # Initialize core components (a multi-account pool raises the daily cap to its combined budget)
+        account_pool = getattr(self.workflow, 'account_pool', None)
+        if account_pool:
+            self.sim_counter = SimulationCounter(daily_limit=sum(a.counter.daily_limit for a in account_pool.accounts))
+        else:
+            self.sim_counter = SimulationCounter()
         self.mining_slot_manager = SlotManager(max_slots=8)
         self.correlation_tracker = CorrelationTracker()
         self.duplicate_detector = MiningDuplicateDetector()
@@ -99,10 +103,10 @@ class Step6Mining:
         self._update_sim_counter_display()
         self.ui.mining_status_label.config(text="Status: Starting...", fg=COLORS['accent_yellow'])
         
-        # Initialize mining engine
+        # Initialize mining engine (through the account pool when one is configured)
         self.mining_engine = MiningEngine(
             generator=self.workflow.generator,
-            simulator_tester=self.workflow.generator.simulator_tester,
+            simulator_tester=account_pool.simulator() if account_pool else self.workflow.generator.simulator_tester,
             backtest_storage=self.workflow.generator.backtest_storage,
             slot_manager=self.mining_slot_manager,
             correlation_tracker=self.correlation_tracker,
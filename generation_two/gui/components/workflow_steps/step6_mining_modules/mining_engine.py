@@ -9,7 +9,7 @@ import threading
 from typing import Optional, Callable
 from generation_two.core.mining import MiningCoordinator, SearchStrategy
 from generation_two.core.slot_manager import SlotManager, SlotStatus
-from generation_two.core.simulator_tester import SimulatorTester, SimulationSettings
+from generation_two.core.simulator_tester import SimulatorTester, SimulationSettings, CACHED_PROGRESS_PREFIX
 from generation_two.core.region_config import REGION_DEFAULT_UNIVERSE, REGION_DEFAULT_NEUTRALIZATION
 
 logger = logging.getLogger(__name__)
@@ -205,14 +205,14 @@ class MiningEngine:
                 break
             
             # Assign slot (GLB uses 2 slots)
-            slot_count = 2 if region == 'GLB' else 1
+            slot_count = self.slot_manager.get_slots_required(region)
             slot_ids = self.slot_manager.find_available_slots(slot_count)
             
             if not slot_ids:
-                # Wait for slots
+                # Wait for slots (woken as soon as one is released)
                 wait_count = 0
                 while wait_count < 10 and not self.stop_flag:
-                    time.sleep(2)
+                    self.slot_manager.wait_for_slot(timeout=2)
                     wait_count += 1
                     slot_ids = self.slot_manager.find_available_slots(slot_count)
                     if slot_ids:
@@ -276,10 +276,10 @@ class MiningEngine:
             
             # Handle refeed if failed
             if not result.success:
-                result = self._handle_refeed(slot_id, template, region, result.error_message, settings)
+                result, progress_url = self._handle_refeed(slot_id, template, region, result.error_message, settings)
             
-            # Save result
-            if self.backtest_storage:
+            # Save result (a cached result is already stored from when it was simulated)
+            if self.backtest_storage and not progress_url.startswith(CACHED_PROGRESS_PREFIX):
                 self.backtest_storage.store_result(result)
             
             # Update correlation tracker
@@ -316,9 +316,9 @@ class MiningEngine:
             self._update_slot(slot_id, template, region, 0, str(e)[:30], "FAILED")
     
     def _handle_refeed(self, slot_id: int, template: str, region: str, error_message: str, settings: SimulationSettings):
-        """Handle refeed correction"""
+        """Handle refeed correction; returns (result, progress_url), or (None, None) if no fix was run"""
         if not self.generator.template_generator.template_validator:
-            return None
+            return None, None
         
         slot = self.slot_manager.get_slot_status(slot_id)
         if slot:
@@ -352,9 +352,9 @@ class MiningEngine:
                     progress_url, fixed_template, region, settings,
                     progress_callback=progress_callback
                 )
-                return result
+                return result, progress_url
         
-        return None
+        return None, None
     
     def _update_slot(self, slot_id: int, template: str, region: str, progress: float, message: str, status: str = "RUNNING"):
         """Update slot display"""
@@ -17,21 +17,14 @@ print("[main_window]   ✓ tkinter", flush=True)
 from tkinter import ttk, messagebox
 print("[main_window]   ✓ tkinter.ttk, messagebox", flush=True)
 import json
+import threading
+from collections import deque
 from pathlib import Path
 from typing import Optional
 print("[main_window]   ✓ Standard library imports", flush=True)
 
 print("[main_window] Importing GUI components...", flush=True)
-from .components.dashboard import DashboardPanel
-print("[main_window]   ✓ DashboardPanel", flush=True)
-from .components.evolution_panel import EvolutionPanel
-print("[main_window]   ✓ EvolutionPanel", flush=True)
-from .components.config_panel import ConfigPanel
-print("[main_window]   ✓ ConfigPanel", flush=True)
-from .components.monitor_panel import MonitorPanel
-print("[main_window]   ✓ MonitorPanel", flush=True)
-from .components.database_panel import DatabasePanel
-print("[main_window]   ✓ DatabasePanel", flush=True)
+# Panels other than the workflow tab are imported and built when their tab is first opened
 from .components.workflow_panel import WorkflowPanel
 print("[main_window]   ✓ WorkflowPanel", flush=True)
 from .components.log_terminal import LogTerminal
@@ -39,26 +32,10 @@ print("[main_window]   ✓ LogTerminal", flush=True)
 from .theme import COLORS, FONTS, STYLES
 print("[main_window]   ✓ Theme", flush=True)
 
-# Import generation_two components
+# generation_two components are imported where they are used (the package resolves them lazily)
 print("[main_window] Setting up paths for generation_two...", flush=True)
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-print("[main_window] Importing generation_two core components...", flush=True)
-try:
-    from generation_two import (
-        EnhancedTemplateGeneratorV3,
-        ConfigManager,
-        EvolutionExecutor,
-        CodeGenerator,
-        CodeEvaluator
-    )
-    print("[main_window]   ✓ generation_two core components", flush=True)
-except Exception as e:
-    print(f"[main_window]   ✗ ERROR importing generation_two: {e}", flush=True)
-    import traceback
-    traceback.print_exc()
-    raise
-
 print("[main_window] All imports completed!", flush=True)
 
 
@@ -79,12 +56,14 @@ class CyberpunkGUI:
         
         # Initialize credential manager
         from ..core.credential_manager import CredentialManager
+        from ..core.config import ConfigManager
         self.credential_manager = CredentialManager(base_path=credentials_path)
         
         # Initialize system (will be set after authentication)
         self.config_manager = ConfigManager()
         self.generator = None
         self.evolution_executor = None
+        self.account_pool = None
         self.authenticated = False
         
         # Authenticate before allowing access
@@ -95,6 +74,7 @@ class CyberpunkGUI:
         
         # Initialize evolution components
         if self.generator:
+            from ..self_evolution import CodeGenerator, CodeEvaluator, EvolutionExecutor
             code_gen = CodeGenerator(ollama_manager=self.generator.template_generator.ollama_manager)
             code_eval = CodeEvaluator()
             self.evolution_executor = EvolutionExecutor(
@@ -106,6 +86,9 @@ class CyberpunkGUI:
         self._create_widgets()
         # Setup logging after widgets are created (needs log_terminal)
         self._setup_logging()
+        self._start_account_pool(credentials_path)
+        # Load operator/field caches once the window is on screen
+        self.root.after_idle(self._start_cache_warmup)
     
     def _authenticate(self, credentials_path: str = None) -> bool:
         """
@@ -183,6 +166,7 @@ class CyberpunkGUI:
             temp_cookie_file.write(creds.cookie)
             temp_cookie_file.close()
 
+            from ..core.enhanced_template_generator_v3 import EnhancedTemplateGeneratorV3
             self.generator = EnhancedTemplateGeneratorV3(credentials_path=temp_cookie_file.name)
             
             # Clean up temp file after generator reads it
@@ -250,74 +234,141 @@ class CyberpunkGUI:
         )
         self.notebook.add(self.workflow_panel.frame, text="🚀 WORKFLOW")
         
-        # Dashboard tab
-        self.dashboard = DashboardPanel(
-            self.notebook,
-            update_callback=self._get_system_stats
-        )
-        self.notebook.add(self.dashboard.frame, text="📊 DASHBOARD")
-        
-        # Evolution tab
-        self.evolution_panel = EvolutionPanel(
-            self.notebook,
-            evolution_callback=self._run_evolution
-        )
-        self.notebook.add(self.evolution_panel.frame, text="🧬 EVOLUTION")
-        
-        # Config tab
-        self.config_panel = ConfigPanel(
-            self.notebook,
-            config_manager=self.config_manager,
-            update_callback=self._on_config_change
-        )
-        self.notebook.add(self.config_panel.frame, text="⚙️ CONFIG")
-        
-        # Monitor tab
-        self.monitor_panel = MonitorPanel(self.notebook)
-        self.notebook.add(self.monitor_panel.frame, text="📡 MONITOR")
-        
-        # Database tab
-        self.database_panel = DatabasePanel(
-            self.notebook,
-            db_config_callback=self._on_db_config_change
-        )
-        self.notebook.add(self.database_panel.frame, text="💾 DATABASE")
+        # Remaining tabs are placeholders until first opened
+        self._lazy_tabs = {}
+        self._add_lazy_tab("📊 DASHBOARD", 'dashboard', self._build_dashboard)
+        self._add_lazy_tab("🧬 EVOLUTION", 'evolution_panel', self._build_evolution_panel)
+        self._add_lazy_tab("⚙️ CONFIG", 'config_panel', self._build_config_panel)
+        self._add_lazy_tab("📡 MONITOR", 'monitor_panel', self._build_monitor_panel)
+        self._add_lazy_tab("💾 DATABASE", 'database_panel', self._build_database_panel)
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
         
         # Create omnipresent log terminal (at bottom of window)
         self.log_terminal = LogTerminal(self.root)
         self.log_terminal.pack(side=tk.BOTTOM, fill=tk.X, padx=5, pady=2)
     
+    def _add_lazy_tab(self, text: str, attr: str, builder):
+        """Add a tab whose panel is constructed the first time it is selected"""
+        container = tk.Frame(self.notebook, bg=COLORS['bg_primary'])
+        self.notebook.add(container, text=text)
+        self._lazy_tabs[str(container)] = (attr, builder, container)
+        setattr(self, attr, None)
+    
+    def _on_tab_changed(self, event=None):
+        """Build the selected tab's panel if it has not been built yet"""
+        entry = self._lazy_tabs.pop(self.notebook.select(), None)
+        if entry:
+            attr, builder, container = entry
+            logger.debug(f"Building {attr} on first open")
+            setattr(self, attr, builder(container))
+    
+    def _build_dashboard(self, parent):
+        from .components.dashboard import DashboardPanel
+        return DashboardPanel(parent, update_callback=self._get_system_stats)
+    
+    def _build_evolution_panel(self, parent):
+        from .components.evolution_panel import EvolutionPanel
+        return EvolutionPanel(parent, evolution_callback=self._run_evolution)
+    
+    def _build_config_panel(self, parent):
+        from .components.config_panel import ConfigPanel
+        return ConfigPanel(parent, config_manager=self.config_manager, update_callback=self._on_config_change)
+    
+    def _build_monitor_panel(self, parent):
+        from .components.monitor_panel import MonitorPanel
+        panel = self.monitor_panel = MonitorPanel(parent)
+        # Replay what was logged before the tab was opened
+        while self._early_logs:
+            panel.add_log(*self._early_logs.popleft())
+        return panel
+    
+    def _build_database_panel(self, parent):
+        from .components.database_panel import DatabasePanel
+        return DatabasePanel(parent, db_config_callback=self._on_db_config_change)
+    
     def _setup_logging(self):
         """Setup logging to GUI (both monitor panel and log terminal)"""
+        self._early_logs = deque(maxlen=1000)  # Held for the monitor panel until it is built
+        
         class GUILogHandler(logging.Handler):
-            def __init__(self, monitor_panel, log_terminal):
+            def __init__(self, gui):
                 super().__init__()
-                self.monitor_panel = monitor_panel
-                self.log_terminal = log_terminal
+                self.gui = gui
             
             def emit(self, record):
                 level = record.levelname
                 message = self.format(record)
                 # Send to both monitor panel and log terminal
-                if self.monitor_panel:
-                    self.monitor_panel.add_log(level, message)
-                if self.log_terminal:
-                    self.log_terminal.add_log(level, message)
+                if self.gui.monitor_panel:
+                    self.gui.monitor_panel.add_log(level, message)
+                else:
+                    self.gui._early_logs.append((level, message))
+                if self.gui.log_terminal:
+                    self.gui.log_terminal.add_log(level, message)
         
-        handler = GUILogHandler(self.monitor_panel, self.log_terminal)
+        handler = GUILogHandler(self)
         handler.setFormatter(logging.Formatter('%(name)s - %(message)s'))
         logging.getLogger().addHandler(handler)
         logging.getLogger().setLevel(logging.DEBUG)  # Changed to DEBUG for more trace logs
     
+    def _start_cache_warmup(self):
+        """Warm operator and data-field caches in the background after first paint"""
+        if not self.generator:
+            return
+        
+        def warm():
+            try:
+                warmed = self.generator.template_generator.warm_caches()
+                logger.info(f"Cache warm-up done: {warmed}")
+            except Exception as e:
+                logger.warning(f"Cache warm-up failed: {e}")
+        
+        threading.Thread(target=warm, daemon=True, name="CacheWarmup").start()
+    
+    def _start_account_pool(self, credentials_path: str = None):
+        """
+        Start the multi-account pool if an accounts file is configured
+        
+        Looks for GEN2_ACCOUNTS_FILE, then accounts.json next to the credentials
+        file or in the working directory. Once at least one account is
+        authenticated, the workflow's simulation steps are routed through it.
+        """
+        candidates = [os.environ.get('GEN2_ACCOUNTS_FILE')]
+        if credentials_path:
+            candidates.append(os.path.join(os.path.dirname(os.path.abspath(credentials_path)), 'accounts.json'))
+        candidates.append(os.path.join(os.getcwd(), 'accounts.json'))
+        config_path = next((path for path in candidates if path and os.path.exists(path)), None)
+        if not config_path:
+            return
+        
+        try:
+            from ..core.account_pool import AccountPool
+            self.account_pool = AccountPool.from_config(config_path)
+        except Exception as e:
+            logger.error(f"Failed to load account pool from {config_path}: {e}", exc_info=True)
+            return
+        
+        def authenticate():
+            ready = self.account_pool.authenticate_all()
+            logger.info(f"Account pool: {ready}/{len(self.account_pool.accounts)} accounts authenticated")
+            self.account_pool.start()
+            if ready and hasattr(self, 'workflow_panel'):
+                # Step 5 and step 6 simulations now go through the pool
+                self.workflow_panel.account_pool = self.account_pool
+        
+        threading.Thread(target=authenticate, daemon=True, name="AccountPoolStartup").start()
+    
     def _get_system_stats(self) -> dict:
         """Get system statistics"""
+        stats = {}
         if self.generator:
             stats = self.generator.get_system_stats()
             if self.evolution_executor:
                 evo_stats = self.evolution_executor.get_evolution_stats()
                 stats.update(evo_stats)
-            return stats
-        return {}
+        if self.account_pool:
+            stats['account_pool'] = self.account_pool.get_stats()
+        return stats
     
     def _run_evolution(self, objectives: list, num_modules: int) -> Optional:
         """Run evolution cycle"""
@@ -342,7 +393,12 @@ class CyberpunkGUI:
     
     def run(self):
         """Start GUI main loop"""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            if self.account_pool:
+                self.account_pool.stop()
+            self.log_terminal.close()
 
 
 def main():
@@ -6,6 +6,7 @@ Launch Generation Two Cyberpunk GUI
 import sys
 import os
 import logging
+import multiprocessing
 from pathlib import Path
 
 # Configure logging for terminal trace
@@ -49,6 +50,8 @@ except Exception as e:
     sys.exit(1)
 
 if __name__ == "__main__":
+    # Sandbox workers (self_evolution.SandboxPool) re-enter the frozen executable
+    multiprocessing.freeze_support()
     logger.info("=" * 60)
     logger.info("Starting GUI initialization...")
     
@@ -2,9 +2,13 @@
 Ollama-related tools and utilities
 """
 
-from .ollama_manager import OllamaManager
-from .region_theme_manager import RegionThemeManager
-from .duplicate_detector import DuplicateDetector, ExpressionSignature
+from .._lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    '.ollama_manager': ['OllamaManager'],
+    '.region_theme_manager': ['RegionThemeManager'],
+    '.duplicate_detector': ['DuplicateDetector', 'ExpressionSignature']
+})
 
 __all__ = [
     'OllamaManager',
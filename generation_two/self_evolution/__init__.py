@@ -3,14 +3,21 @@ Self-Evolution Engine
 Dynamically writes, evaluates, and executes modular code for self-improvement
 """
 
-from .code_generator import CodeGenerator, ModuleTemplate
-from .code_evaluator import CodeEvaluator, EvaluationResult
-from .evolution_executor import EvolutionExecutor
+from .._lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    '.code_generator': ['CodeGenerator', 'ModuleTemplate'],
+    '.code_evaluator': ['CodeEvaluator', 'EvaluationResult'],
+    '.evolution_executor': ['EvolutionExecutor'],
+    '.sandbox_pool': ['SandboxPool', 'SandboxLimits']
+})
 
 __all__ = [
     'CodeGenerator',
     'ModuleTemplate',
     'CodeEvaluator',
     'EvaluationResult',
-    'EvolutionExecutor'
+    'EvolutionExecutor',
+    'SandboxPool',
+    'SandboxLimits'
 ]
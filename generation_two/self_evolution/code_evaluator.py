@@ -5,12 +5,11 @@ Evaluates dynamically generated code for safety and performance
 
 import logging
 import importlib.util
-import sys
 import os
 import time
-from typing import Dict, Optional, Any, List
+import tracemalloc
+from typing import Dict, Optional, Any, List, Tuple
 from dataclasses import dataclass
-import traceback
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +26,8 @@ class EvaluationResult:
     safety_score: float = 0.0
     error_message: str = ""
     execution_time: float = 0.0
-    memory_usage: float = 0.0
+    memory_usage: float = 0.0  # Peak RSS in MB (sandbox) or peak traced allocations (in-process)
+    cpu_time: float = 0.0
 
 
 class CodeEvaluator:
@@ -41,10 +41,40 @@ class CodeEvaluator:
     - Performance
     """
     
-    def __init__(self):
-        """Initialize code evaluator"""
+    def __init__(self, sandbox: bool = True, workers: Optional[int] = None, limits=None):
+        """
+        Initialize code evaluator
+        
+        Args:
+            sandbox: Run candidates in a SandboxPool of worker processes; False
+                execs them in this process (no limits, for trusted code only)
+            workers: Sandbox worker processes (default: min(4, CPU count))
+            limits: SandboxLimits for each candidate (default: SandboxLimits())
+        """
         self.evaluation_history = []
-        self.sandbox_modules = {}  # Track loaded modules
+        self.sandbox = sandbox
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.limits = limits
+        self._pool = None
+    
+    @property
+    def pool(self):
+        """The SandboxPool, created on first use"""
+        if self._pool is None:
+            from .sandbox_pool import SandboxPool
+            self._pool = SandboxPool(workers=self.workers, limits=self.limits)
+        return self._pool
+    
+    def start(self):
+        """Start the sandbox workers ahead of the first evaluation"""
+        if self.sandbox:
+            self.pool.start()
+    
+    def close(self):
+        """Stop the sandbox workers"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
     
     def evaluate_module(
         self,
@@ -63,74 +93,64 @@ class CodeEvaluator:
         Returns:
             EvaluationResult
         """
-        result = EvaluationResult(
-            module_name=module_name,
-            success=False,
-            syntax_valid=False,
-            import_success=False,
-            execution_success=False
-        )
-        
-        start_time = time.time()
-        
-        # 1. Syntax validation
-        try:
-            compile(code, module_name, 'exec')
-            result.syntax_valid = True
-        except SyntaxError as e:
-            result.error_message = f"Syntax error: {e}"
-            result.execution_time = time.time() - start_time
-            return result
+        return self.evaluate_modules([(code, module_name, test_cases)])[0]
+    
+    def evaluate_modules(self, candidates: List[Tuple]) -> List[EvaluationResult]:
+        """
+        Evaluate several generated modules, in parallel when sandboxed
         
-        # 2. Import validation
-        try:
-            spec = importlib.util.spec_from_loader(module_name, loader=None)
-            module = importlib.util.module_from_spec(spec)
-            
-            # Execute in isolated namespace
-            exec_globals = {
-                '__name__': module_name,
-                '__file__': f'<generated:{module_name}>',
-                '__package__': None
-            }
-            
-            exec(code, exec_globals)
-            result.import_success = True
-            self.sandbox_modules[module_name] = exec_globals
+        Args:
+            candidates: (code, module_name[, test_cases]) tuples
             
-        except Exception as e:
-            result.error_message = f"Import error: {e}"
-            result.execution_time = time.time() - start_time
-            return result
-        
-        # 3. Execution validation (if test cases provided)
-        if test_cases:
-            try:
-                for test_case in test_cases:
-                    # Run test case in sandbox
-                    test_func = exec_globals.get(test_case.get('function'))
-                    if test_func:
-                        test_func(*test_case.get('args', []), **test_case.get('kwargs', {}))
-                
-                result.execution_success = True
-            except Exception as e:
-                result.error_message = f"Execution error: {e}"
-                result.execution_time = time.time() - start_time
-                return result
+        Returns:
+            EvaluationResults in the order of candidates
+        """
+        if self.sandbox:
+            results = self.pool.evaluate_many(candidates)
         else:
-            result.execution_success = True
-        
-        # 4. Safety checks
-        result.safety_score = self._check_safety(code)
-        
-        # 5. Performance estimation
-        result.performance_score = self._estimate_performance(code)
-        
-        result.execution_time = time.time() - start_time
-        result.success = result.syntax_valid and result.import_success and result.execution_success
-        
-        self.evaluation_history.append(result)
+            results = [self._evaluate_in_process(*candidate) for candidate in candidates]
+        
+        for candidate, result in zip(candidates, results):
+            if result.success:
+                result.safety_score = self._check_safety(candidate[0])
+                result.performance_score = self._estimate_performance(candidate[0])
+                self.evaluation_history.append(result)
+        return results
+    
+    def _evaluate_in_process(
+        self,
+        code: str,
+        module_name: str,
+        test_cases: Optional[List[Dict]] = None
+    ) -> EvaluationResult:
+        """Syntax, import and test-case checks in this process (sandbox=False)"""
+        from .sandbox_pool import run_candidate
+        
+        outcome: Dict[str, Any] = {}
+        tracing = not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        start_time = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            run_candidate(code, module_name, test_cases, outcome)
+        finally:
+            _, peak = tracemalloc.get_traced_memory()
+            if tracing:
+                tracemalloc.stop()
         
+        result = EvaluationResult(
+            module_name=module_name,
+            success=outcome['syntax_valid'] and outcome['import_success'] and outcome['execution_success'],
+            syntax_valid=outcome['syntax_valid'],
+            import_success=outcome['import_success'],
+            execution_success=outcome['execution_success'],
+            error_message=outcome['error_message'],
+            execution_time=time.perf_counter() - start_time,
+            memory_usage=peak / (1024 * 1024),
+            cpu_time=time.process_time() - cpu_start
+        )
         return result
     
     def _check_safety(self, code: str) -> float:
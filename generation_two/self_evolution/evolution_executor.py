@@ -4,8 +4,9 @@ Executes and manages self-evolution cycles
 """
 
 import logging
+import os
 import time
-from typing import Dict, List, Optional, Callable
+from typing import Any, Dict, List, Optional, Callable
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -84,6 +85,9 @@ class EvolutionExecutor:
         
         logger.info(f"Starting evolution cycle {self.cycle_count}")
         
+        # Workers start while the modules are being generated
+        self.code_evaluator.start()
+        
         # 1. Generate modules
         for i, objective in enumerate(objectives[:num_modules]):
             logger.info(f"Generating module {i+1}/{num_modules} for: {objective}")
@@ -107,20 +111,22 @@ class EvolutionExecutor:
                 module_path = self.code_generator.save_module(code, module_name)
                 cycle.generated_modules.append(module_path)
         
-        # 2. Evaluate modules
+        # 2. Evaluate modules (concurrently in the evaluator's sandbox pool)
+        candidates = []
+        module_paths = {}
         for module_path in cycle.generated_modules:
             with open(module_path, 'r') as f:
                 code = f.read()
-            
-            result = self.code_evaluator.evaluate_module(
-                code,
-                os.path.basename(module_path).replace('.py', '')
-            )
-            
+            module_name = os.path.basename(module_path).replace('.py', '')
+            module_paths[module_name] = module_path
+            candidates.append((code, module_name))
+        
+        for result in self.code_evaluator.evaluate_modules(candidates):
             cycle.evaluated_modules.append(result)
-            
+            module_path = module_paths[result.module_name]
             if result.success:
-                logger.info(f"Module {module_path} evaluated successfully")
+                logger.info(f"Module {module_path} evaluated successfully "
+                            f"({result.execution_time:.2f}s, {result.memory_usage:.1f}MB)")
             else:
                 logger.warning(f"Module {module_path} failed: {result.error_message}")
         
@@ -136,9 +142,7 @@ class EvolutionExecutor:
             # 4. Integrate best module
             if self.integration_callback and best.success:
                 try:
-                    module = self.code_evaluator.load_module(
-                        cycle.generated_modules[successful.index(best)]
-                    )
+                    module = self.code_evaluator.load_module(module_paths[best.module_name])
                     if module:
                         self.integration_callback(module, best.module_name)
                         self.active_modules[best.module_name] = module
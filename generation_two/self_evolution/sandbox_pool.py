@@ -0,0 +1,519 @@
+"""
+Sandbox Pool
+Pre-started worker processes that evaluate generated modules under CPU-time,
+memory and wall-clock limits
+
+Each worker execs one candidate at a time in a fresh namespace and reports
+its own CPU time and peak RSS. A supervisor thread in the host process
+watches the busy workers: one that runs past the wall-clock limit, grows past
+the RSS limit or dies is killed and replaced, and its candidate fails with the
+reason. A bad module can therefore only take down a disposable worker, never
+the mining process.
+"""
+
+import gc
+import itertools
+import logging
+import math
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from multiprocessing.connection import wait
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from collections import deque
+
+try:
+    import resource  # POSIX only
+except ImportError:
+    resource = None
+
+from .code_evaluator import EvaluationResult
+
+logger = logging.getLogger(__name__)
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+@dataclass
+class SandboxLimits:
+    """Per-candidate limits enforced by the sandbox"""
+    cpu_seconds: float = 10.0          # CPU time (RLIMIT_CPU in the worker)
+    wall_seconds: float = 30.0         # Wall-clock time (enforced by the supervisor)
+    memory_mb: float = 512.0           # Resident set size (enforced by the supervisor)
+    address_space_mb: Optional[float] = None  # Optional hard RLIMIT_AS cap in the worker
+
+
+class CPUTimeExceeded(BaseException):
+    """Raised inside a worker on SIGXCPU (BaseException so generated code cannot swallow it with except Exception)"""
+
+
+def run_candidate(code: str, module_name: str, test_cases: Optional[List[Dict]], outcome: Dict) -> Dict:
+    """
+    Syntax check, exec and run test cases for one module, filling outcome as
+    each stage passes (so a stage killed by a limit still reports the ones before it)
+    """
+    outcome.update(syntax_valid=False, import_success=False, execution_success=False, error_message="")
+
+    # 1. Syntax validation
+    try:
+        compiled = compile(code, module_name, 'exec')
+        outcome['syntax_valid'] = True
+    except SyntaxError as e:
+        outcome['error_message'] = f"Syntax error: {e}"
+        return outcome
+
+    # 2. Import validation, in a namespace that is dropped afterwards
+    exec_globals = {
+        '__name__': module_name,
+        '__file__': f'<generated:{module_name}>',
+        '__package__': None
+    }
+    try:
+        exec(compiled, exec_globals)
+        outcome['import_success'] = True
+    except Exception as e:
+        outcome['error_message'] = f"Import error: {e}"
+        return outcome
+
+    # 3. Execution validation (if test cases provided)
+    try:
+        for test_case in test_cases or []:
+            test_func = exec_globals.get(test_case.get('function'))
+            if test_func:
+                test_func(*test_case.get('args', []), **test_case.get('kwargs', {}))
+        outcome['execution_success'] = True
+    except Exception as e:
+        outcome['error_message'] = f"Execution error: {e}"
+    return outcome
+
+
+# --- worker process ---------------------------------------------------------
+
+def _read_status_kb(field: str, pid: str = 'self') -> Optional[int]:
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith(field):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _reset_peak_rss():
+    """Reset VmHWM so the next reading is this candidate's peak (Linux)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def _peak_rss_mb() -> float:
+    peak_kb = _read_status_kb('VmHWM:')
+    if peak_kb is not None:
+        return peak_kb / 1024
+    if resource is not None:
+        # Lifetime peak: kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if peak > 1 << 32 else peak / 1024
+    return 0.0
+
+
+def _on_sigxcpu(signum, frame):
+    raise CPUTimeExceeded()
+
+
+def _arm_cpu_limit(seconds: float):
+    """Allow `seconds` more CPU time from now (soft limit only, so it can be re-armed)"""
+    if resource is None:
+        return
+    used = resource.getrusage(resource.RUSAGE_SELF)
+    soft = math.ceil(used.ru_utime + used.ru_stime + seconds)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _disarm_cpu_limit():
+    if resource is None:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+
+
+def _worker_main(conn, limits: SandboxLimits):
+    """Worker loop: receive (task_id, code, module_name, test_cases), send (task_id, outcome)"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C is the host's business
+    if resource is not None:
+        signal.signal(signal.SIGXCPU, _on_sigxcpu)
+        if limits.address_space_mb:
+            cap = int(limits.address_space_mb * 1024 * 1024)
+            resource.setrlimit(resource.RLIMIT_AS, (cap, cap))
+    conn.send('ready')
+
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            break
+        if task is None:
+            break
+        task_id, code, module_name, test_cases = task
+
+        outcome: Dict[str, Any] = {}
+        _reset_peak_rss()
+        started = time.perf_counter()
+        cpu_started = time.process_time()
+        try:
+            _arm_cpu_limit(limits.cpu_seconds)
+            run_candidate(code, module_name, test_cases, outcome)
+        except CPUTimeExceeded:
+            outcome['error_message'] = f"CPU time limit exceeded ({limits.cpu_seconds:g}s)"
+        except MemoryError:
+            outcome['error_message'] = "Memory limit exceeded"
+        except BaseException as e:  # SystemExit / KeyboardInterrupt from generated code
+            outcome['error_message'] = f"Execution error: {type(e).__name__}: {e}"
+        finally:
+            _disarm_cpu_limit()
+        outcome['execution_time'] = time.perf_counter() - started
+        outcome['cpu_time'] = time.process_time() - cpu_started
+        outcome['memory_usage'] = _peak_rss_mb()
+
+        try:
+            conn.send((task_id, outcome))
+        except (OSError, ValueError):
+            break
+        del outcome, code, test_cases, task
+        gc.collect()
+
+
+# --- host side ----------------------------------------------------------------
+
+class _Worker:
+    """Host-side handle for one worker process"""
+
+    __slots__ = ('process', 'conn', 'ready', 'task', 'started', 'peak_rss_mb', 'tasks_done')
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.ready = False
+        self.task: Optional[Tuple[int, str, Future]] = None
+        self.started = 0.0
+        self.peak_rss_mb = 0.0
+        self.tasks_done = 0
+
+
+class SandboxPool:
+    """
+    Pool of sandbox worker processes for evaluating generated modules
+
+    submit() returns a Future resolving to an EvaluationResult with the stage
+    flags, error message, wall time, CPU time and peak RSS of the candidate.
+    Safety/performance scores are left to the caller (CodeEvaluator).
+    """
+
+    def __init__(self, workers: int = 4, limits: Optional[SandboxLimits] = None,
+                 max_tasks_per_worker: int = 50, poll_interval: float = 0.05,
+                 start_method: Optional[str] = None):
+        """
+        Args:
+            workers: Number of worker processes
+            limits: SandboxLimits applied to every candidate
+            max_tasks_per_worker: Replace a worker after this many candidates
+            poll_interval: Supervisor check interval (seconds) for wall-clock/RSS limits
+            start_method: multiprocessing start method (default: forkserver where
+                available, otherwise spawn; fork is avoided because the host is threaded)
+        """
+        self.workers = max(1, workers)
+        self.limits = limits or SandboxLimits()
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.poll_interval = poll_interval
+        if start_method is None:
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        self._ctx = multiprocessing.get_context(start_method)
+
+        self._lock = threading.Lock()
+        self._pending: Deque[Tuple[int, str, str, Optional[List[Dict]], Future]] = deque()
+        self._workers: List[_Worker] = []
+        self._task_ids = itertools.count(1)
+        self._wake_recv, self._wake_send = multiprocessing.Pipe(duplex=False)
+        self._supervisor: Optional[threading.Thread] = None
+        self._running = False
+        self._startup_failures = 0
+        self._broken: Optional[str] = None
+        self.stats = {
+            'submitted': 0, 'completed': 0, 'succeeded': 0,
+            'wall_timeouts': 0, 'memory_kills': 0, 'cpu_limit_hits': 0, 'crashes': 0,
+            'workers_started': 0, 'total_execution_time': 0.0, 'peak_memory_mb': 0.0,
+        }
+
+    def __enter__(self) -> 'SandboxPool':
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self):
+        """Start the workers and the supervisor (no-op if already running)"""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            for _ in range(self.workers):
+                self._workers.append(self._spawn())
+        self._supervisor = threading.Thread(target=self._supervise, name="sandbox-supervisor", daemon=True)
+        self._supervisor.start()
+        logger.info(f"Sandbox pool started: {self.workers} workers, cpu={self.limits.cpu_seconds:g}s, "
+                    f"wall={self.limits.wall_seconds:g}s, rss={self.limits.memory_mb:g}MB")
+
+    def _spawn(self) -> _Worker:
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(target=_worker_main, args=(child_conn, self.limits),
+                                    name="sandbox-worker", daemon=True)
+        process.start()
+        child_conn.close()
+        self.stats['workers_started'] += 1
+        return _Worker(process, parent_conn)
+
+    def submit(self, code: str, module_name: str, test_cases: Optional[List[Dict]] = None) -> Future:
+        """Queue a candidate; the pool is started on first use"""
+        if not self._running:
+            self.start()
+        future: Future = Future()
+        if self._broken:
+            self.stats['submitted'] += 1
+            self._finish(future, self._failure(module_name, self._broken))
+            return future
+        with self._lock:
+            self._pending.append((next(self._task_ids), code, module_name, test_cases, future))
+            self.stats['submitted'] += 1
+        self._wake_send.send_bytes(b'')
+        return future
+
+    def evaluate_many(self, candidates: List[Tuple]) -> List[EvaluationResult]:
+        """Evaluate (code, module_name[, test_cases]) candidates in parallel, results in input order"""
+        futures = [self.submit(*candidate) for candidate in candidates]
+        return [future.result() for future in futures]
+
+    def shutdown(self, timeout: float = 5.0):
+        """Stop the workers; candidates still queued fail"""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            pending = list(self._pending)
+            self._pending.clear()
+        self._wake_send.send_bytes(b'')
+        if self._supervisor is not None:
+            self._supervisor.join(timeout)
+        for _, _, module_name, _, future in pending:
+            self._finish(future, self._failure(module_name, "Sandbox pool shut down"))
+        for worker in self._workers:
+            if worker.task is not None:
+                self._finish(worker.task[2], self._failure(worker.task[1], "Sandbox pool shut down"))
+            try:
+                worker.conn.send(None)
+            except (OSError, ValueError):
+                pass
+        deadline = time.time() + timeout
+        for worker in self._workers:
+            worker.process.join(max(0.0, deadline - time.time()))
+            if worker.process.is_alive():
+                worker.process.kill()
+                worker.process.join(1.0)
+            worker.conn.close()
+        self._workers.clear()
+
+    # --- supervisor -----------------------------------------------------------
+
+    def _supervise(self):
+        while self._running:
+            self._dispatch()
+            watched = {worker.conn: worker for worker in self._workers
+                       if worker.task is not None or not worker.ready}
+            for conn in wait(list(watched) + [self._wake_recv], timeout=self.poll_interval):
+                if conn is self._wake_recv:
+                    while self._wake_recv.poll():
+                        self._wake_recv.recv_bytes()
+                    continue
+                self._collect(watched[conn])
+            self._enforce_limits()
+
+    def _dispatch(self):
+        with self._lock:
+            for worker in self._workers:
+                if not self._pending:
+                    return
+                if worker.task is not None or not worker.ready:
+                    continue
+                task_id, code, module_name, test_cases, future = self._pending.popleft()
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    worker.conn.send((task_id, code, module_name, test_cases))
+                except Exception as e:
+                    # Unpicklable test case arguments, or a worker that already died
+                    self._finish(future, self._failure(module_name, f"Could not send candidate to sandbox: {e}"))
+                    continue
+                worker.task = (task_id, module_name, future)
+                worker.started = time.perf_counter()
+                worker.peak_rss_mb = 0.0
+
+    def _collect(self, worker: _Worker):
+        try:
+            message = worker.conn.recv()
+        except (EOFError, OSError):
+            # Died; _enforce_limits reports it once the exit code is in
+            return
+        if message == 'ready':
+            worker.ready = True
+            self._startup_failures = 0
+            return
+        task_id, outcome = message
+        _, module_name, future = worker.task
+        outcome['memory_usage'] = max(outcome.get('memory_usage', 0.0), worker.peak_rss_mb)
+        result = self._result(module_name, outcome)
+        if result.error_message.startswith("CPU time limit"):
+            self.stats['cpu_limit_hits'] += 1
+        worker.task = None
+        worker.tasks_done += 1
+        self._finish(future, result)
+        if worker.tasks_done >= self.max_tasks_per_worker:
+            self._replace(worker, graceful=True)
+
+    def _enforce_limits(self):
+        now = time.perf_counter()
+        for worker in list(self._workers):
+            if worker.task is None:
+                if not worker.process.is_alive():
+                    if not worker.ready:
+                        self._startup_failed(worker)
+                    self._replace(worker)
+                continue
+            _, module_name, future = worker.task
+            elapsed = now - worker.started
+            rss_mb = self._rss_mb(worker.process.pid)
+            if rss_mb is not None:
+                worker.peak_rss_mb = max(worker.peak_rss_mb, rss_mb)
+
+            reason = None
+            if not worker.process.is_alive():
+                code = worker.process.exitcode
+                if resource is not None and code == -signal.SIGXCPU:
+                    reason = f"CPU time limit exceeded ({self.limits.cpu_seconds:g}s)"
+                    self.stats['cpu_limit_hits'] += 1
+                elif code == -signal.SIGKILL and rss_mb is None:
+                    reason = "Sandbox worker killed (out of memory?)"
+                    self.stats['crashes'] += 1
+                else:
+                    reason = f"Sandbox worker exited unexpectedly (exit code {code})"
+                    self.stats['crashes'] += 1
+            elif elapsed > self.limits.wall_seconds:
+                reason = f"Wall-clock limit exceeded ({self.limits.wall_seconds:g}s)"
+                self.stats['wall_timeouts'] += 1
+            elif rss_mb is not None and rss_mb > self.limits.memory_mb:
+                reason = f"Memory limit exceeded ({rss_mb:.0f}MB > {self.limits.memory_mb:g}MB)"
+                self.stats['memory_kills'] += 1
+            if reason is None:
+                continue
+
+            logger.warning(f"Sandbox: {module_name}: {reason}; replacing worker")
+            self._finish(future, self._failure(module_name, reason, execution_time=elapsed,
+                                               memory_usage=worker.peak_rss_mb))
+            worker.task = None
+            self._replace(worker)
+
+    def _startup_failed(self, worker: _Worker):
+        """Stop respawning after repeated start-up crashes instead of looping forever"""
+        self._startup_failures += 1
+        self.stats['crashes'] += 1
+        if self._startup_failures < 3 or self._broken:
+            return
+        self._broken = (f"Sandbox workers fail to start (exit code {worker.process.exitcode}); "
+                        f"if the entry script starts evaluations at import time, "
+                        f"guard it with if __name__ == '__main__'")
+        logger.error(self._broken)
+        with self._lock:
+            pending = list(self._pending)
+            self._pending.clear()
+        for _, _, module_name, _, future in pending:
+            self._finish(future, self._failure(module_name, self._broken))
+
+    def _replace(self, worker: _Worker, graceful: bool = False):
+        if graceful:
+            try:
+                worker.conn.send(None)
+            except (OSError, ValueError):
+                pass
+            worker.process.join(1.0)
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join(1.0)
+        worker.conn.close()
+        index = self._workers.index(worker)
+        if self._running and not self._broken:
+            self._workers[index] = self._spawn()
+        else:
+            del self._workers[index]
+
+    @staticmethod
+    def _rss_mb(pid: int) -> Optional[float]:
+        try:
+            with open(f'/proc/{pid}/statm') as f:
+                return int(f.read().split()[1]) * _PAGE_SIZE / (1024 * 1024)
+        except (OSError, ValueError, IndexError):
+            return None
+
+    # --- results --------------------------------------------------------------
+
+    @staticmethod
+    def _result(module_name: str, outcome: Dict) -> EvaluationResult:
+        result = EvaluationResult(
+            module_name=module_name,
+            success=False,
+            syntax_valid=outcome.get('syntax_valid', False),
+            import_success=outcome.get('import_success', False),
+            execution_success=outcome.get('execution_success', False),
+            error_message=outcome.get('error_message', ""),
+            execution_time=outcome.get('execution_time', 0.0),
+            memory_usage=outcome.get('memory_usage', 0.0),
+            cpu_time=outcome.get('cpu_time', 0.0),
+        )
+        result.success = result.syntax_valid and result.import_success and result.execution_success
+        return result
+
+    def _failure(self, module_name: str, reason: str, **measured) -> EvaluationResult:
+        return self._result(module_name, {'error_message': reason, **measured})
+
+    def _finish(self, future: Future, result: EvaluationResult):
+        self.stats['completed'] += 1
+        self.stats['succeeded'] += int(result.success)
+        self.stats['total_execution_time'] += result.execution_time
+        self.stats['peak_memory_mb'] = max(self.stats['peak_memory_mb'], result.memory_usage)
+        if not future.done():
+            future.set_result(result)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            queued = len(self._pending)
+        busy = sum(worker.task is not None for worker in self._workers)
+        completed = self.stats['completed']
+        return {
+            **self.stats,
+            'workers': len(self._workers),
+            'busy_workers': busy,
+            'queued': queued,
+            'avg_execution_time': self.stats['total_execution_time'] / completed if completed else 0.0,
+        }
@@ -2,10 +2,17 @@
 Storage and analysis components
 """
 
-from .backtest_storage import BacktestStorage, BacktestRecord
-from .regroup import AlphaRegrouper
-from .retrospect import AlphaRetrospect
-from .cluster_analysis import ClusterAnalyzer, Cluster
+from .._lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    '.backtest_storage': ['BacktestStorage', 'BacktestRecord'],
+    '.regroup': ['AlphaRegrouper'],
+    '.retrospect': ['AlphaRetrospect'],
+    '.cluster_analysis': ['ClusterAnalyzer', 'Cluster'],
+    '.paged_table': ['PagedTableModel'],
+    '.backtest_columns': ['BacktestColumns'],
+    '.columnar_store': ['ColumnarBacktestStore']
+})
 
 __all__ = [
     'BacktestStorage',
@@ -13,5 +20,8 @@ __all__ = [
     'AlphaRegrouper',
     'AlphaRetrospect',
     'ClusterAnalyzer',
-    'Cluster'
+    'Cluster',
+    'PagedTableModel',
+    'BacktestColumns',
+    'ColumnarBacktestStore'
 ]
@@ -0,0 +1,247 @@
+"""
+Backtest Columns
+In-memory columnar frame of backtest results for vectorized analytics
+"""
+
+import logging
+from collections.abc import Sequence
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Columns materialized for analytics, with their NumPy dtypes ('str' = dictionary-encoded)
+ANALYTICS_COLUMNS = {
+    'id': np.int64,
+    'template': 'str',
+    'region': 'str',
+    'sharpe': np.float64,
+    'fitness': np.float64,
+    'turnover': np.float64,
+    'returns': np.float64,
+    'margin': np.float64,
+    'success': np.bool_,
+    'timestamp': np.float64,
+}
+STRING_COLUMNS = tuple(name for name, dtype in ANALYTICS_COLUMNS.items() if dtype == 'str')
+
+
+class BacktestColumns:
+    """
+    Backtest results as one NumPy array per column
+
+    String columns are dictionary-encoded: `codes[name]` holds int32 indices into
+    `categories[name]`, so grouping by template or region is integer work. Rows are
+    in id order. AlphaRegrouper and AlphaRetrospect accept this in place of a list
+    of results and answer with vectorized group-bys.
+    """
+
+    def __init__(self, numeric: Dict[str, np.ndarray], codes: Dict[str, np.ndarray],
+                 categories: Dict[str, List[str]]):
+        """
+        Initialize frame
+
+        Args:
+            numeric: {column: array} for numeric and boolean columns
+            codes: {column: int32 codes} for string columns
+            categories: {column: list of distinct strings} for string columns
+        """
+        self.numeric = numeric
+        self.codes = codes
+        self.categories = categories
+        self._length = len(next(iter(numeric.values()))) if numeric else 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    @classmethod
+    def from_records(cls, records: Iterable) -> 'BacktestColumns':
+        """
+        Build a frame from dicts or BacktestRecord-like objects
+
+        Args:
+            records: Results with the analytics columns as keys or attributes
+
+        Returns:
+            BacktestColumns
+        """
+        records = list(records)
+        encoder = StringEncoder()
+        numeric, codes, categories = {}, {}, {}
+        for name, dtype in ANALYTICS_COLUMNS.items():
+            values = [r.get(name) if isinstance(r, dict) else getattr(r, name, None) for r in records]
+            if dtype == 'str':
+                codes[name], categories[name] = encoder.encode(values)
+            else:
+                numeric[name] = to_array(values, dtype)
+        return cls(numeric, codes, categories)
+
+    @classmethod
+    def concat(cls, frames: List['BacktestColumns']) -> 'BacktestColumns':
+        """
+        Concatenate frames, merging their string dictionaries
+
+        Args:
+            frames: Frames in row order
+
+        Returns:
+            BacktestColumns
+        """
+        frames = [f for f in frames if len(f)]
+        if not frames:
+            return cls.from_records([])
+        numeric = {name: np.concatenate([f.numeric[name] for f in frames])
+                   for name in frames[0].numeric}
+        codes, categories = {}, {}
+        for name in frames[0].codes:
+            merged: Dict[str, int] = {}
+            parts = []
+            for frame in frames:
+                remap = np.fromiter((merged.setdefault(value, len(merged)) for value in frame.categories[name]),
+                                    dtype=np.int32, count=len(frame.categories[name]))
+                parts.append(remap[frame.codes[name]] if len(remap) else frame.codes[name])
+            codes[name] = np.concatenate(parts).astype(np.int32, copy=False)
+            categories[name] = list(merged)
+        return cls(numeric, codes, categories)
+
+    def column(self, name: str) -> np.ndarray:
+        """Numeric column, or decoded string column as an object array"""
+        if name in self.numeric:
+            return self.numeric[name]
+        return np.asarray(self.categories[name], dtype=object)[self.codes[name]]
+
+    def select(self, mask: np.ndarray) -> 'BacktestColumns':
+        """Rows where mask is True (string dictionaries are shared, not copied)"""
+        return BacktestColumns({name: values[mask] for name, values in self.numeric.items()},
+                               {name: values[mask] for name, values in self.codes.items()},
+                               self.categories)
+
+    def record(self, index: int) -> Dict:
+        """One row as a dict with the analytics columns"""
+        record = {}
+        for name, dtype in ANALYTICS_COLUMNS.items():
+            if dtype == 'str':
+                record[name] = self.categories[name][self.codes[name][index]]
+            else:
+                record[name] = self.numeric[name][index].item()
+        return record
+
+    def view(self, indices: np.ndarray) -> 'ResultView':
+        """Lazy sequence of rows at the given indices"""
+        return ResultView(self, indices)
+
+    def group(self, keys: np.ndarray, labels: List[str]) -> Dict[str, 'ResultView']:
+        """
+        Split rows by integer group key
+
+        Args:
+            keys: Group key per row (index into labels)
+            labels: Group names
+
+        Returns:
+            {label: ResultView}, in order of each group's first row (like a dict built in a loop)
+        """
+        grouped = {}
+        for key, indices in group_indices(keys):
+            label = labels[key]
+            if label in grouped:
+                # Distinct keys with the same label (e.g. two thresholds printing alike)
+                grouped[label] = ResultView(self, np.sort(np.concatenate([grouped[label].indices, indices])))
+            else:
+                grouped[label] = ResultView(self, indices)
+        return grouped
+
+
+class ResultView(Sequence):
+    """Read-only list of result dicts backed by a BacktestColumns frame"""
+
+    def __init__(self, frame: BacktestColumns, indices: np.ndarray):
+        self.frame = frame
+        self.indices = indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self.frame.record(i) for i in self.indices[item]]
+        return self.frame.record(self.indices[item])
+
+    def __repr__(self) -> str:
+        return f"ResultView({len(self)} results)"
+
+
+class StringEncoder:
+    """Dictionary-encodes string columns"""
+
+    def encode(self, values: List[Optional[str]]) -> Tuple[np.ndarray, List[str]]:
+        """
+        Encode strings as int32 codes
+
+        Args:
+            values: Strings (None becomes '')
+
+        Returns:
+            (codes, categories)
+        """
+        lookup: Dict[str, int] = {}
+        codes = np.fromiter((lookup.setdefault(value or '', len(lookup)) for value in values),
+                            dtype=np.int32, count=len(values))
+        return codes, list(lookup)
+
+
+def to_array(values: List, dtype) -> np.ndarray:
+    """Numeric column from Python values; None becomes 0 (as BacktestStorage.get_results does)"""
+    if dtype is np.bool_:
+        return np.fromiter((bool(v) for v in values), dtype=np.bool_, count=len(values))
+    return np.fromiter((v or 0 for v in values), dtype=dtype, count=len(values))
+
+
+def group_indices(keys: np.ndarray) -> List[Tuple[int, np.ndarray]]:
+    """
+    Row indices per distinct key, groups ordered by first occurrence
+
+    Args:
+        keys: Integer key per row
+
+    Returns:
+        [(key, ascending row indices)]
+    """
+    if not len(keys):
+        return []
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    groups = np.split(order, starts[1:])
+    firsts = order[starts]
+    return [(int(sorted_keys[starts[g]]), groups[g]) for g in np.argsort(firsts, kind='stable')]
+
+
+def group_reduce(keys: np.ndarray, values: np.ndarray, groups: int) -> Dict[str, np.ndarray]:
+    """
+    Count, mean, min, max and population std of values per key
+
+    Args:
+        keys: Integer key per value (0 <= key < groups)
+        values: Float values
+        groups: Number of keys
+
+    Returns:
+        {'count', 'mean', 'min', 'max', 'std'} arrays of length groups (NaN where empty)
+    """
+    count = np.bincount(keys, minlength=groups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.bincount(keys, weights=values, minlength=groups) / count
+        deviation = values - mean[keys]
+        std = np.sqrt(np.bincount(keys, weights=deviation * deviation, minlength=groups) / count)
+    minimum = np.full(groups, np.nan)
+    maximum = np.full(groups, np.nan)
+    if len(values):
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        present = sorted_keys[starts]
+        minimum[present] = np.minimum.reduceat(values[order], starts)
+        maximum[present] = np.maximum.reduceat(values[order], starts)
+    return {'count': count, 'mean': mean, 'min': minimum, 'max': maximum, 'std': std}
@@ -585,6 +585,19 @@ class BacktestStorage:
             'min_sharpe': min_sharpe or 0.0
         }
     
+    def columnar_store(self, store_dir: Optional[str] = None):
+        """
+        Columnar copy of backtest_results for regroup/retrospect analytics
+        
+        Args:
+            store_dir: Segment directory (defaults to "<db_path>.columns")
+            
+        Returns:
+            ColumnarBacktestStore; call load() for a BacktestColumns frame
+        """
+        from .columnar_store import ColumnarBacktestStore
+        return ColumnarBacktestStore(self.db_path, store_dir)
+    
     def clear_old_results(self, days: int = 30):
         """
         Clear results older than specified days
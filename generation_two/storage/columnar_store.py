@@ -0,0 +1,263 @@
+"""
+Columnar Backtest Store
+Incrementally materializes backtest_results into columnar segments (Parquet, or NumPy .npz without pyarrow)
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .backtest_columns import ANALYTICS_COLUMNS, BacktestColumns, StringEncoder
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+logger = logging.getLogger(__name__)
+
+
+class ColumnarBacktestStore:
+    """
+    Columnar copy of backtest_results for analytics
+
+    sync() appends only rows with an id above the last materialized one, as a new
+    segment file; deletions (clear_old_results) are detected by count and trigger
+    a rebuild. load() concatenates the segments into a BacktestColumns frame that
+    AlphaRegrouper / AlphaRetrospect accept in place of a list of results.
+    """
+
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, db_path: str = "generation_two_backtests.db", store_dir: Optional[str] = None,
+                 format: Optional[str] = None, chunk_rows: int = 250_000, max_segments: int = 16):
+        """
+        Initialize columnar store
+
+        Args:
+            db_path: SQLite database with backtest_results
+            store_dir: Directory for segments (defaults to "<db_path>.columns")
+            format: 'parquet' or 'npz' (defaults to parquet when pyarrow is installed)
+            chunk_rows: Rows read from SQLite per segment
+            max_segments: Segments kept before they are compacted into one
+        """
+        self.db_path = db_path
+        self.store_dir = store_dir or f"{db_path}.columns"
+        if format is None:
+            format = 'parquet' if HAS_PYARROW else 'npz'
+        if format == 'parquet' and not HAS_PYARROW:
+            raise ImportError("pyarrow is required for the parquet format (pip install pyarrow)")
+        if format not in ('parquet', 'npz'):
+            raise ValueError(f"Unknown format: {format}")
+        self.format = format
+        self.chunk_rows = chunk_rows
+        self.max_segments = max_segments
+        os.makedirs(self.store_dir, exist_ok=True)
+        self.manifest = self._load_manifest()
+
+    # ------------------------------------------------------------- manifest
+
+    def _load_manifest(self) -> Dict:
+        """Read the manifest, starting over if it is missing or from another format"""
+        path = os.path.join(self.store_dir, self.MANIFEST)
+        try:
+            with open(path, 'r') as f:
+                manifest = json.load(f)
+            if manifest.get('format') == self.format:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {'format': self.format, 'last_id': 0, 'rows': 0, 'segments': []}
+
+    def _save_manifest(self):
+        """Write the manifest atomically"""
+        path = os.path.join(self.store_dir, self.MANIFEST)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, path)
+
+    # ------------------------------------------------------------- sync
+
+    def sync(self) -> int:
+        """
+        Materialize rows added since the last sync
+
+        Returns:
+            Number of rows appended
+        """
+        started = time.time()
+        conn = sqlite3.connect(self.db_path)
+        try:
+            last_id = self.manifest['last_id']
+            if last_id:
+                existing = conn.execute("SELECT COUNT(*) FROM backtest_results WHERE id <= ?",
+                                        (last_id,)).fetchone()[0]
+                if existing != self.manifest['rows']:
+                    logger.info(f"backtest_results changed below id {last_id} "
+                                f"({existing} rows, {self.manifest['rows']} materialized); rebuilding")
+                    self.clear()
+                    last_id = 0
+
+            appended = 0
+            # NULL metrics read as 0 (as BacktestStorage.get_results does) so columns convert in C
+            columns = ', '.join(name if dtype == 'str' or name == 'id' else f"IFNULL({name}, 0)"
+                                for name, dtype in ANALYTICS_COLUMNS.items())
+            while True:
+                rows = conn.execute(
+                    f"SELECT {columns} FROM backtest_results WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, self.chunk_rows)).fetchall()
+                if not rows:
+                    break
+                frame = self._frame_from_rows(rows)
+                last_id = int(frame.numeric['id'][-1])
+                self._append_segment(frame)
+                appended += len(rows)
+        finally:
+            conn.close()
+
+        if len(self.manifest['segments']) > self.max_segments:
+            self.compact()
+        if appended:
+            logger.info(f"Materialized {appended} backtest results in {time.time() - started:.2f}s "
+                        f"({self.manifest['rows']} total, {len(self.manifest['segments'])} segments)")
+        return appended
+
+    def _frame_from_rows(self, rows: List[tuple]) -> BacktestColumns:
+        """Columns from SQLite row tuples"""
+        encoder = StringEncoder()
+        numeric, codes, categories = {}, {}, {}
+        for (name, dtype), values in zip(ANALYTICS_COLUMNS.items(), zip(*rows)):
+            if dtype == 'str':
+                codes[name], categories[name] = encoder.encode(values)
+            else:
+                numeric[name] = np.array(values, dtype=dtype)
+        return BacktestColumns(numeric, codes, categories)
+
+    def _append_segment(self, frame: BacktestColumns):
+        """Write one segment and record it in the manifest"""
+        first_id, last_id = int(frame.numeric['id'][0]), int(frame.numeric['id'][-1])
+        name = f"segment-{first_id:012d}-{last_id:012d}.{self.format}"
+        self._write_segment(os.path.join(self.store_dir, name), frame)
+        self.manifest['segments'].append({'file': name, 'first_id': first_id, 'last_id': last_id, 'rows': len(frame)})
+        self.manifest['last_id'] = last_id
+        self.manifest['rows'] += len(frame)
+        self._save_manifest()
+
+    def compact(self):
+        """Rewrite all segments as one"""
+        frame = self._read_all()
+        old_files = [segment['file'] for segment in self.manifest['segments']]
+        self.manifest.update(last_id=0, rows=0, segments=[])
+        if len(frame):
+            self._append_segment(frame)
+        else:
+            self._save_manifest()
+        keep = {segment['file'] for segment in self.manifest['segments']}
+        for name in old_files:
+            if name not in keep:
+                os.remove(os.path.join(self.store_dir, name))
+
+    def clear(self):
+        """Delete every segment"""
+        for segment in self.manifest['segments']:
+            try:
+                os.remove(os.path.join(self.store_dir, segment['file']))
+            except OSError:
+                pass
+        self.manifest = {'format': self.format, 'last_id': 0, 'rows': 0, 'segments': []}
+        self._save_manifest()
+
+    # ------------------------------------------------------------- load
+
+    def load(self, sync: bool = True, region: Optional[str] = None,
+             since: Optional[float] = None) -> BacktestColumns:
+        """
+        Load the materialized results
+
+        Args:
+            sync: Pick up new rows from SQLite first
+            region: Keep only this region
+            since: Keep only rows with timestamp >= since
+
+        Returns:
+            BacktestColumns in id order
+        """
+        if sync:
+            self.sync()
+        frame = self._read_all()
+        if region is not None or since is not None:
+            mask = np.ones(len(frame), dtype=bool)
+            if region is not None:
+                categories = frame.categories['region']
+                mask &= frame.codes['region'] == (categories.index(region) if region in categories else -1)
+            if since is not None:
+                mask &= frame.numeric['timestamp'] >= since
+            frame = frame.select(mask)
+        return frame
+
+    def _read_all(self) -> BacktestColumns:
+        """Concatenate every segment"""
+        return BacktestColumns.concat([self._read_segment(os.path.join(self.store_dir, segment['file']))
+                                       for segment in self.manifest['segments']])
+
+    # ------------------------------------------------------------- segment I/O
+
+    def _write_segment(self, path: str, frame: BacktestColumns):
+        """Write a frame as Parquet (dictionary-encoded strings) or .npz"""
+        if self.format == 'parquet':
+            arrays = {}
+            for name in ANALYTICS_COLUMNS:
+                if name in frame.codes:
+                    arrays[name] = pa.DictionaryArray.from_arrays(
+                        pa.array(frame.codes[name], type=pa.int32()), pa.array(frame.categories[name], type=pa.string()))
+                else:
+                    arrays[name] = pa.array(frame.numeric[name])
+            pq.write_table(pa.table(arrays), path)
+            return
+
+        arrays = dict(frame.numeric)
+        for name, codes in frame.codes.items():
+            # Categories as one UTF-8 buffer plus offsets (no pickled object arrays)
+            encoded = [value.encode('utf-8') for value in frame.categories[name]]
+            arrays[f'{name}__codes'] = codes
+            arrays[f'{name}__offsets'] = np.cumsum([0] + [len(value) for value in encoded], dtype=np.int64)
+            arrays[f'{name}__bytes'] = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        tmp_path = path + '.tmp.npz'
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+    def _read_segment(self, path: str) -> BacktestColumns:
+        """Read a segment written by _write_segment"""
+        numeric, codes, categories = {}, {}, {}
+        if self.format == 'parquet':
+            table = pq.read_table(path)
+            for name, dtype in ANALYTICS_COLUMNS.items():
+                column = table.column(name).combine_chunks()
+                if dtype == 'str':
+                    if not pa.types.is_dictionary(column.type):
+                        column = column.dictionary_encode()
+                    codes[name] = column.indices.to_numpy(zero_copy_only=False).astype(np.int32, copy=False)
+                    categories[name] = column.dictionary.to_pylist()
+                else:
+                    numeric[name] = column.to_numpy(zero_copy_only=False).astype(dtype, copy=False)
+            return BacktestColumns(numeric, codes, categories)
+
+        with np.load(path) as arrays:
+            for name, dtype in ANALYTICS_COLUMNS.items():
+                if dtype == 'str':
+                    offsets = arrays[f'{name}__offsets']
+                    buffer = arrays[f'{name}__bytes'].tobytes()
+                    codes[name] = arrays[f'{name}__codes']
+                    categories[name] = [buffer[start:end].decode('utf-8')
+                                        for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+                else:
+                    numeric[name] = arrays[name]
+        return BacktestColumns(numeric, codes, categories)
@@ -0,0 +1,413 @@
+"""
+Paged Table Model
+Keyset-paginated, sortable and filterable view over a SQLite table for virtualized GUI tables
+"""
+
+import json
+import logging
+import re
+import sqlite3
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Columns holding a JSON object that is shown flattened (data_fields.field_data etc.)
+JSON_OBJECT_COLUMNS = ('field_data', 'data')
+
+# Flattened field -> JSON path, for nested objects in data field records
+NESTED_PATHS = {
+    'dataset_id': '$.dataset.id', 'dataset_name': '$.dataset.name',
+    'category_id': '$.category.id', 'category_name': '$.category.name',
+    'subcategory_id': '$.subcategory.id', 'subcategory_name': '$.subcategory.name',
+}
+
+# Important data field columns first
+FIELD_COLUMN_ORDER = [
+    'id', 'description', 'region', 'universe', 'delay', 'type',
+    'dataset_name', 'category_name', 'subcategory_name',
+    'coverage', 'userCount', 'alphaCount', 'pyramidMultiplier',
+    'themes', 'dataset_id', 'category_id', 'subcategory_id'
+]
+
+# Long text cells are cut to this many characters in pages (row_detail returns the full row)
+CELL_CHARS = 256
+
+_COMPARISON = re.compile(r'^\s*(>=|<=|!=|>|<|=)\s*(.+?)\s*$')
+
+
+def flatten_field(field: Dict) -> Dict:
+    """Flatten a data field object into a dictionary"""
+    flat = {}
+    for key, value in field.items():
+        if key in ('dataset', 'category', 'subcategory') and isinstance(value, dict):
+            flat[f'{key}_id'] = value.get('id', '')
+            flat[f'{key}_name'] = value.get('name', '')
+        elif key == 'themes' and isinstance(value, list):
+            flat['themes'] = ', '.join(str(theme) for theme in value) if value else ''
+        else:
+            flat[key] = value
+    return flat
+
+
+def quote_identifier(name: str) -> str:
+    """Quote a SQLite identifier"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+class PagedTableModel:
+    """
+    Row source for a virtualized table backed by one SQLite table
+
+    Rows are addressed by index but fetched a page at a time with keyset
+    pagination on (sort key, rowid), so reading page N costs the same as page 0
+    once the page before it is known. Sorting and filtering become ORDER BY and
+    WHERE clauses; only a few pages are kept in memory. JSON object columns are
+    flattened into display columns, decoded only for the rows actually requested.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, table: str, page_size: int = 200,
+                 max_pages: int = 8, json_column: Optional[str] = None):
+        """
+        Initialize the model
+
+        Args:
+            conn: Open SQLite connection (owned by the caller)
+            table: Table name
+            page_size: Rows per fetched page
+            max_pages: Pages kept in the LRU page cache
+            json_column: JSON object column to flatten (auto-detects field_data/data)
+        """
+        self.conn = conn
+        self.table = table
+        self.page_size = page_size
+        self.max_pages = max_pages
+
+        info = conn.execute(f"PRAGMA table_info({quote_identifier(table)})").fetchall()
+        if not info:
+            raise ValueError(f"Unknown table: {table}")
+        self.raw_columns = [row[1] for row in info]
+        self._text_columns = {row[1] for row in info
+                              if any(t in (row[2] or '').upper() for t in ('TEXT', 'CHAR', 'CLOB'))}
+
+        if json_column is None:
+            json_column = next((c for c in JSON_OBJECT_COLUMNS if c in self.raw_columns), None)
+        self.json_column = json_column
+        self._json_paths: Dict[str, str] = {}
+        self.columns = self._flattened_columns() if json_column else list(self.raw_columns)
+        if not self.columns:
+            # JSON column present but empty or unparseable: show the table as stored
+            self.json_column = None
+            self.columns = list(self.raw_columns)
+
+        self.sort_column: Optional[str] = None
+        self.descending = False
+        self._where = ''
+        self._params: List[Any] = []
+        self._reset()
+
+    # ------------------------------------------------------------------ setup
+
+    def _flattened_columns(self) -> List[str]:
+        """Display columns from flattening the JSON column of the first page"""
+        column = quote_identifier(self.json_column)
+        rows = self.conn.execute(
+            f"SELECT {column} FROM {quote_identifier(self.table)} ORDER BY rowid LIMIT ?",
+            (self.page_size,)).fetchall()
+        seen = set()
+        for (value,) in rows:
+            record = self._decode(value)
+            if isinstance(record, dict):
+                seen.update(flatten_field(record))
+        ordered = [c for c in FIELD_COLUMN_ORDER if c in seen] + sorted(seen - set(FIELD_COLUMN_ORDER))
+        for name in ordered:
+            path = NESTED_PATHS.get(name, '$.' + json.dumps(name))
+            self._json_paths[name] = path.replace("'", "''")
+        return ordered
+
+    def _expression(self, name: str) -> str:
+        """SQL expression for a display column"""
+        if self.json_column and name in self._json_paths:
+            column = quote_identifier(self.json_column)
+            return f"(CASE WHEN json_valid({column}) THEN json_extract({column}, '{self._json_paths[name]}') END)"
+        return quote_identifier(name)
+
+    def _select_list(self) -> str:
+        """Columns fetched for a page (JSON column whole, long text columns cut)"""
+        if self.json_column:
+            return quote_identifier(self.json_column)
+        parts = []
+        for name in self.raw_columns:
+            quoted = quote_identifier(name)
+            parts.append(f"substr({quoted}, 1, {CELL_CHARS})" if name in self._text_columns else quoted)
+        return ', '.join(parts)
+
+    def _reset(self):
+        """Drop cached pages, anchors and counts"""
+        self._pages: 'OrderedDict[int, List[Tuple]]' = OrderedDict()
+        # Page number -> key of the last row before it; page 0 starts before everything
+        self._anchors: Dict[int, Optional[Tuple]] = {0: None}
+        self._count: Optional[int] = None
+        self._null_count: Optional[int] = None
+        self.queries = 0
+
+    # ------------------------------------------------------------- public API
+
+    def set_sort(self, column: Optional[str], descending: bool = False):
+        """
+        Sort by a display column (None = table order)
+
+        Args:
+            column: Display column name
+            descending: Sort descending (NULLs last) instead of ascending (NULLs first)
+        """
+        if column is not None and column not in self.columns:
+            raise ValueError(f"Unknown column: {column}")
+        self.sort_column = column
+        self.descending = descending
+        self._reset()
+
+    def set_filter(self, text: str = '', column: Optional[str] = None):
+        """
+        Filter rows in SQL
+
+        Args:
+            text: Substring to match; with a column, '>1.5', '<=0', '=USA' or '!=x' compare instead
+            column: Display column to filter on (None = any column)
+        """
+        text = (text or '').strip()
+        self._where, self._params = '', []
+        if text:
+            comparison = _COMPARISON.match(text) if column else None
+            if comparison:
+                operator, value = comparison.groups()
+                self._where = f"{self._expression(column)} {operator} ?"
+                self._params = [self._coerce(value)]
+            else:
+                pattern = '%' + text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+                if column:
+                    targets = [self._expression(column)]
+                elif self.json_column:
+                    targets = [quote_identifier(self.json_column)]
+                else:
+                    targets = [quote_identifier(c) for c in self.raw_columns]
+                self._where = '(' + ' OR '.join(f"{t} LIKE ? ESCAPE '\\'" for t in targets) + ')'
+                self._params = [pattern] * len(targets)
+        self._reset()
+
+    def refresh(self):
+        """Forget cached pages and counts after the table changed"""
+        self._reset()
+
+    def row_count(self) -> int:
+        """Number of rows matching the filter"""
+        if self._count is None:
+            self._count = self._scalar(f"SELECT COUNT(*) FROM {quote_identifier(self.table)}{self._clause()}",
+                                       self._params)
+        return self._count
+
+    def rows(self, start: int, count: int) -> List[List[str]]:
+        """
+        Display values for rows [start, start + count)
+
+        Args:
+            start: First row index
+            count: Number of rows
+
+        Returns:
+            One list of strings per row, in column order
+        """
+        start = max(0, start)
+        end = min(start + count, self.row_count())
+        result = []
+        index = start
+        while index < end:
+            page_no, offset = divmod(index, self.page_size)
+            page = self._page(page_no)
+            chunk = page[offset:offset + end - index]
+            if not chunk:
+                break
+            result.extend(self._display(row) for row in chunk)
+            index += len(chunk)
+        return result
+
+    def row_detail(self, index: int) -> Dict[str, Any]:
+        """
+        Full row at an index with JSON text columns decoded
+
+        Args:
+            index: Row index
+
+        Returns:
+            {column: value} for every stored column
+        """
+        page_no, offset = divmod(index, self.page_size)
+        page = self._page(page_no)
+        if offset >= len(page):
+            raise IndexError(index)
+        rowid = page[offset][0]
+        values = self.conn.execute(f"SELECT * FROM {quote_identifier(self.table)} WHERE rowid = ?",
+                                   (rowid,)).fetchone()
+        detail = {}
+        for name, value in zip(self.raw_columns, values or ()):
+            decoded = self._decode(value) if isinstance(value, str) and value[:1] in '{[' else None
+            detail[name] = decoded if decoded is not None else value
+        return detail
+
+    # ------------------------------------------------------------- paging
+
+    def _page(self, page_no: int) -> List[Tuple]:
+        """Rows (rowid, key, *selected) of a page, from cache or SQLite"""
+        page = self._pages.get(page_no)
+        if page is not None:
+            self._pages.move_to_end(page_no)
+            return page
+        if page_no not in self._anchors:
+            known = max(p for p in self._anchors if p < page_no)
+            if page_no - known <= 2:
+                # Close to a known page: walk forward through keyset pages
+                for p in range(known, page_no):
+                    self._page(p)
+                if page_no not in self._anchors:
+                    return []
+            else:
+                self._anchors[page_no] = self._seek(page_no * self.page_size - 1)
+        page = self._fetch_after(self._anchors[page_no], self.page_size)
+        if page:
+            self._anchors[page_no + 1] = self._key(page[-1])
+        self._pages[page_no] = page
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+        return page
+
+    def _key(self, row: Tuple) -> Tuple:
+        """Keyset position of a fetched row: (segment, sort value, rowid)"""
+        if self.sort_column is None:
+            return ('value', None, row[0])
+        return ('null' if row[1] is None else 'value', row[1], row[0])
+
+    def _segments(self) -> List[str]:
+        """Segments in sort order; NULL sort values come first ascending, last descending"""
+        if self.sort_column is None:
+            return ['value']
+        return ['value', 'null'] if self.descending else ['null', 'value']
+
+    def _fetch_after(self, key: Optional[Tuple], limit: int) -> List[Tuple]:
+        """Next `limit` rows after a keyset position (None = from the start)"""
+        segments = self._segments()
+        if key is not None:
+            segments = segments[segments.index(key[0]):]
+        rows: List[Tuple] = []
+        for segment in segments:
+            bound = key if key is not None and key[0] == segment else None
+            rows.extend(self._query_segment(segment, bound, limit - len(rows)))
+            if len(rows) >= limit:
+                break
+        return rows
+
+    def _query_segment(self, segment: str, bound: Optional[Tuple], limit: int) -> List[Tuple]:
+        """One keyset query inside a segment"""
+        direction, comparison = ('DESC', '<') if self.descending else ('ASC', '>')
+        conditions, params = self._conditions(segment)
+        if segment == 'null' or self.sort_column is None:
+            if bound is not None:
+                conditions.append(f"rowid {comparison} ?")
+                params.append(bound[2])
+            order = f"rowid {direction}"
+        else:
+            expression = self._expression(self.sort_column)
+            if bound is not None:
+                conditions.append(f"({expression}, rowid) {comparison} (?, ?)")
+                params.extend(bound[1:])
+            order = f"{expression} {direction}, rowid {direction}"
+        sql = (f"SELECT rowid, {self._sort_select()}, {self._select_list()} "
+               f"FROM {quote_identifier(self.table)}{self._clause(conditions)} ORDER BY {order} LIMIT ?")
+        self.queries += 1
+        return self.conn.execute(sql, params + [limit]).fetchall()
+
+    def _seek(self, index: int) -> Tuple:
+        """
+        Key of the row at an index, for jumps far from any known page
+
+        Uses OFFSET over the sort key and rowid only, so SQLite can walk an index
+        without reading rows; the pages after it are keyset-paged again.
+        """
+        for segment in self._segments():
+            size = self._segment_size(segment)
+            if index < size:
+                conditions, params = self._conditions(segment)
+                if segment == 'null' or self.sort_column is None:
+                    order = 'rowid DESC' if self.descending else 'rowid ASC'
+                else:
+                    direction = 'DESC' if self.descending else 'ASC'
+                    order = f"{self._expression(self.sort_column)} {direction}, rowid {direction}"
+                sql = (f"SELECT rowid, {self._sort_select()} FROM {quote_identifier(self.table)}"
+                       f"{self._clause(conditions)} ORDER BY {order} LIMIT 1 OFFSET ?")
+                self.queries += 1
+                row = self.conn.execute(sql, params + [index]).fetchone()
+                return self._key(row)
+            index -= size
+        raise IndexError(index)
+
+    def _segment_size(self, segment: str) -> int:
+        """Rows in a segment under the current filter"""
+        if self.sort_column is None:
+            return self.row_count()
+        if self._null_count is None:
+            conditions, params = self._conditions('null')
+            self._null_count = self._scalar(
+                f"SELECT COUNT(*) FROM {quote_identifier(self.table)}{self._clause(conditions)}", params)
+        return self._null_count if segment == 'null' else self.row_count() - self._null_count
+
+    # ------------------------------------------------------------- helpers
+
+    def _conditions(self, segment: str) -> Tuple[List[str], List[Any]]:
+        """Filter plus segment conditions"""
+        conditions = [self._where] if self._where else []
+        if self.sort_column is not None:
+            conditions.append(f"{self._expression(self.sort_column)} IS {'' if segment == 'null' else 'NOT '}NULL")
+        return conditions, list(self._params)
+
+    def _clause(self, conditions: Optional[List[str]] = None) -> str:
+        """WHERE clause for conditions (default: the filter alone)"""
+        if conditions is None:
+            conditions = [self._where] if self._where else []
+        return ' WHERE ' + ' AND '.join(conditions) if conditions else ''
+
+    def _sort_select(self) -> str:
+        """Sort key selected next to rowid"""
+        return self._expression(self.sort_column) if self.sort_column is not None else 'NULL'
+
+    def _scalar(self, sql: str, params: List[Any]) -> int:
+        """Run a single-value query"""
+        self.queries += 1
+        return self.conn.execute(sql, params).fetchone()[0]
+
+    def _display(self, row: Tuple) -> List[str]:
+        """Display strings for a fetched row, decoding JSON only here"""
+        values = row[2:]
+        if self.json_column:
+            record = self._decode(values[0])
+            flat = flatten_field(record) if isinstance(record, dict) else {}
+            values = [flat.get(name, '') for name in self.columns]
+        return ['' if value is None else str(value) for value in values]
+
+    @staticmethod
+    def _decode(value: Any) -> Any:
+        """Parse a JSON text value, None if it is not JSON"""
+        if not isinstance(value, str):
+            return value if isinstance(value, (dict, list)) else None
+        try:
+            return json.loads(value)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _coerce(value: str) -> Any:
+        """Number for numeric comparison values, otherwise the text"""
+        for cast in (int, float):
+            try:
+                return cast(value)
+            except ValueError:
+                pass
+        return value
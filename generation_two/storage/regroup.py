@@ -7,6 +7,10 @@ import logging
 from typing import List, Dict, Optional
 from collections import defaultdict
 
+import numpy as np
+
+from .backtest_columns import BacktestColumns
+
 logger = logging.getLogger(__name__)
 
 
@@ -14,7 +18,9 @@ class AlphaRegrouper:
     """
     Regroups alphas by various criteria
     
-    Separated for modularity and reusability.
+    Separated for modularity and reusability. Every method also accepts a
+    BacktestColumns frame (see ColumnarBacktestStore) and then groups with
+    NumPy, returning ResultView sequences instead of lists.
     """
     
     def __init__(self):
@@ -31,6 +37,11 @@ class AlphaRegrouper:
         Returns:
             Dictionary mapping region to list of results
         """
+        if isinstance(results, BacktestColumns):
+            grouped = results.group(results.codes['region'], results.categories['region'])
+            logger.info(f"Regrouped {len(results)} results into {len(grouped)} regions")
+            return grouped
+        
         grouped = defaultdict(list)
         
         for result in results:
@@ -63,6 +74,15 @@ class AlphaRegrouper:
                 'poor': 0.0
             }
         
+        if isinstance(results, BacktestColumns):
+            ranked = sorted(tiers.items(), key=lambda x: x[1], reverse=True)
+            sharpe = results.numeric['sharpe']
+            keys = np.select([sharpe >= min_sharpe for _, min_sharpe in ranked],
+                             list(range(len(ranked))), default=len(ranked))
+            grouped = results.group(keys, [name for name, _ in ranked] + ['poor'])
+            logger.info(f"Regrouped {len(results)} results into {len(grouped)} Sharpe tiers")
+            return grouped
+        
         grouped = defaultdict(list)
         
         for result in results:
@@ -90,6 +110,18 @@ class AlphaRegrouper:
         Returns:
             Dictionary mapping operator to list of results
         """
+        if isinstance(results, BacktestColumns):
+            # Parse each distinct template once, then map codes
+            operators: Dict[str, int] = {}
+            template_operator = np.array([
+                operators.setdefault(self._extract_main_operator(template), len(operators))
+                for template in results.categories['template']
+            ], dtype=np.int32)
+            keys = template_operator[results.codes['template']] if len(template_operator) else results.codes['template']
+            grouped = results.group(keys, list(operators))
+            logger.info(f"Regrouped {len(results)} results into {len(grouped)} operators")
+            return grouped
+        
         grouped = defaultdict(list)
         
         for result in results:
@@ -125,6 +157,19 @@ class AlphaRegrouper:
             else:
                 thresholds = [0.0, 0.5, 1.0, 1.5]
         
+        if isinstance(results, BacktestColumns):
+            if metric not in results.numeric:
+                raise ValueError(f"Metric not materialized: {metric}")
+            values = results.numeric[metric]
+            keys = np.searchsorted(thresholds, values, side='right')
+            keys[np.isnan(values)] = 0
+            labels = ([f"<{thresholds[0]}"] +
+                      [f"{thresholds[i]}-{thresholds[i+1]}" for i in range(len(thresholds) - 1)] +
+                      [f">={thresholds[-1]}"])
+            grouped = results.group(keys, labels)
+            logger.info(f"Regrouped {len(results)} results by {metric} into {len(grouped)} ranges")
+            return grouped
+        
         grouped = defaultdict(list)
         
         for result in results:
@@ -165,6 +210,14 @@ class AlphaRegrouper:
         grouped = defaultdict(list)
         current_time = time.time()
         
+        if isinstance(results, BacktestColumns):
+            days_ago = (current_time - results.numeric['timestamp']) / (24 * 3600)
+            periods, keys = np.unique(np.trunc(days_ago / period_days).astype(np.int64), return_inverse=True)
+            labels = [f"{period * period_days}-{(period + 1) * period_days} days ago" for period in periods.tolist()]
+            grouped = results.group(keys.ravel(), labels)
+            logger.info(f"Regrouped {len(results)} results into {len(grouped)} time periods")
+            return grouped
+        
         for result in results:
             timestamp = getattr(result, 'timestamp', result.get('timestamp', current_time))
             days_ago = (current_time - timestamp) / (24 * 3600)
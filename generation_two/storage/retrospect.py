@@ -9,6 +9,8 @@ import numpy as np
 from datetime import datetime
 import time
 
+from .backtest_columns import BacktestColumns, group_reduce
+
 logger = logging.getLogger(__name__)
 
 
@@ -16,7 +18,8 @@ class AlphaRetrospect:
     """
     Retrospective analysis of alpha performance
     
-    Separated for modularity and focused analysis.
+    Separated for modularity and focused analysis. Every method also accepts a
+    BacktestColumns frame (rows in id order) and then runs as NumPy group-bys.
     """
     
     def __init__(self):
@@ -41,6 +44,9 @@ class AlphaRetrospect:
         current_time = time.time()
         cutoff_time = current_time - (time_window_days * 24 * 3600)
         
+        if isinstance(results, BacktestColumns):
+            return self._performance_trends_columnar(results, cutoff_time, time_window_days)
+        
         # Filter recent results
         recent_results = [
             r for r in results
@@ -103,6 +109,9 @@ class AlphaRetrospect:
         Returns:
             List of top performer dictionaries
         """
+        if isinstance(results, BacktestColumns):
+            return self._top_performers_columnar(results, top_n, metric)
+        
         # Filter successful results
         successful = [
             r for r in results
@@ -141,6 +150,9 @@ class AlphaRetrospect:
         Returns:
             Dictionary mapping region to performance metrics
         """
+        if isinstance(results, BacktestColumns):
+            return self._region_performance_columnar(results)
+        
         from collections import defaultdict
         
         region_results = defaultdict(list)
@@ -197,6 +209,9 @@ class AlphaRetrospect:
         Returns:
             List of degrading alpha dictionaries
         """
+        if isinstance(results, BacktestColumns):
+            return self._degrading_alphas_columnar(results, degradation_threshold)
+        
         # Group by template
         from collections import defaultdict
         template_results = defaultdict(list)
@@ -259,9 +274,28 @@ class AlphaRetrospect:
         Returns:
             Dictionary with insights
         """
-        if not results:
+        if not len(results):
             return {'error': 'No results to analyze'}
         
+        if isinstance(results, BacktestColumns):
+            success = results.numeric['success']
+            sharpe_values = results.numeric['sharpe'][success]
+            successful_count = int(success.sum())
+            insights = {
+                'total_results': len(results),
+                'successful_count': successful_count,
+                'success_rate': successful_count / len(results),
+                'avg_sharpe': np.mean(sharpe_values) if len(sharpe_values) else 0.0,
+                'max_sharpe': np.max(sharpe_values) if len(sharpe_values) else 0.0,
+                'min_sharpe': np.min(sharpe_values) if len(sharpe_values) else 0.0,
+                'top_performers': self.identify_top_performers(results, top_n=5),
+                'region_performance': self.analyze_region_performance(results),
+                'performance_trends': self.analyze_performance_trends(results),
+                'degrading_alphas': self.identify_degrading_alphas(results)
+            }
+            logger.info("Generated comprehensive insights")
+            return insights
+        
         # Overall statistics
         successful = [
             r for r in results
@@ -288,4 +322,143 @@ class AlphaRetrospect:
         
         logger.info("Generated comprehensive insights")
         return insights
-
+    
+    # Vectorized versions for BacktestColumns frames
+    
+    def _performance_trends_columnar(self, frame: BacktestColumns, cutoff_time: float,
+                                     time_window_days: int) -> Dict:
+        """analyze_performance_trends over a columnar frame"""
+        recent = frame.numeric['timestamp'] >= cutoff_time
+        count = int(recent.sum())
+        if count < 2:
+            return {'error': 'Insufficient data for trend analysis'}
+        
+        sharpe_values = frame.numeric['sharpe'][recent]
+        fitness_values = frame.numeric['fitness'][recent]
+        
+        # Least-squares slope against row position (what polyfit(..., 1) returns)
+        x = np.arange(count, dtype=np.float64)
+        x -= x.mean()
+        denominator = np.dot(x, x)
+        sharpe_trend = np.dot(x, sharpe_values - sharpe_values.mean()) / denominator
+        fitness_trend = np.dot(x, fitness_values - fitness_values.mean()) / denominator
+        
+        return {
+            'time_window_days': time_window_days,
+            'total_results': count,
+            'success_rate': int(frame.numeric['success'][recent].sum()) / count,
+            'avg_sharpe': np.mean(sharpe_values),
+            'avg_fitness': np.mean(fitness_values),
+            'sharpe_trend': sharpe_trend,
+            'fitness_trend': fitness_trend,
+            'trend_direction': 'improving' if sharpe_trend > 0 else 'declining'
+        }
+    
+    def _top_performers_columnar(self, frame: BacktestColumns, top_n: int, metric: str) -> List[Dict]:
+        """identify_top_performers over a columnar frame (ties keep row order, like sorted())"""
+        candidates = np.flatnonzero(frame.numeric['success'])
+        values = frame.numeric[metric][candidates]
+        if top_n < len(values):
+            # O(n) cut to the top_n values (and ties with the last) before sorting
+            cutoff = -np.partition(-values, top_n - 1)[top_n - 1]
+            keep = values >= cutoff
+            candidates, values = candidates[keep], values[keep]
+        chosen = candidates[np.argsort(-values, kind='stable')[:max(top_n, 0)]]
+        
+        top_performers = []
+        for i, index in enumerate(chosen):
+            record = frame.record(index)
+            top_performers.append({
+                'rank': i + 1,
+                'template': record['template'][:100],
+                'region': record['region'],
+                'sharpe': record['sharpe'],
+                'fitness': record['fitness'],
+                'returns': record['returns'],
+                'margin': record['margin']
+            })
+        
+        logger.info(f"Identified {len(top_performers)} top performers by {metric}")
+        return top_performers
+    
+    def _region_performance_columnar(self, frame: BacktestColumns) -> Dict[str, Dict]:
+        """analyze_region_performance over a columnar frame"""
+        codes = frame.codes['region']
+        regions = len(frame.categories['region'])
+        totals = np.bincount(codes, minlength=regions)
+        success = frame.numeric['success']
+        stats = group_reduce(codes[success], frame.numeric['sharpe'][success], regions)
+        
+        present, first_rows = np.unique(codes, return_index=True)
+        region_analysis = {}
+        for code in present[np.argsort(first_rows)]:
+            total = int(totals[code])
+            successful = int(stats['count'][code])
+            if successful:
+                region_analysis[frame.categories['region'][code]] = {
+                    'total': total,
+                    'successful': successful,
+                    'success_rate': successful / total,
+                    'avg_sharpe': stats['mean'][code],
+                    'max_sharpe': stats['max'][code],
+                    'min_sharpe': stats['min'][code],
+                    'std_sharpe': stats['std'][code]
+                }
+            else:
+                region_analysis[frame.categories['region'][code]] = {
+                    'total': total,
+                    'successful': 0,
+                    'success_rate': 0.0,
+                    'avg_sharpe': 0.0,
+                    'max_sharpe': 0.0,
+                    'min_sharpe': 0.0,
+                    'std_sharpe': 0.0
+                }
+        
+        logger.info(f"Analyzed performance for {len(region_analysis)} regions")
+        return region_analysis
+    
+    def _degrading_alphas_columnar(self, frame: BacktestColumns, degradation_threshold: float) -> List[Dict]:
+        """identify_degrading_alphas over a columnar frame"""
+        codes = frame.codes['template']
+        templates = len(frame.categories['template'])
+        counts = np.bincount(codes, minlength=templates)
+        
+        # Rows by (template, timestamp); position from the end marks the 5 most recent
+        order = np.lexsort((frame.numeric['timestamp'], codes))
+        sorted_codes = codes[order]
+        group_start = np.cumsum(counts) - counts
+        from_end = counts[sorted_codes] - (np.arange(len(order)) - group_start[sorted_codes])
+        recent = from_end <= 5
+        success = frame.numeric['success'][order]
+        sharpe = frame.numeric['sharpe'][order]
+        
+        def mean_where(mask):
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return (np.bincount(sorted_codes, weights=np.where(mask, sharpe, 0.0), minlength=templates) /
+                        np.bincount(sorted_codes, weights=mask, minlength=templates))
+        
+        recent_sharpe = mean_where(recent & success)
+        older_sharpe = mean_where(~recent & success)
+        with np.errstate(invalid='ignore'):
+            flagged = ((counts > 5) & (older_sharpe > 0) &
+                       (recent_sharpe < older_sharpe * (1 - degradation_threshold)))
+        
+        # Report in order of each template's first row, as the loop over a dict does
+        present, first_rows = np.unique(codes, return_index=True)
+        first_row = np.zeros(templates, dtype=np.int64)
+        first_row[present] = first_rows
+        flagged_codes = np.flatnonzero(flagged)
+        degrading = []
+        for code in flagged_codes[np.argsort(first_row[flagged_codes])]:
+            degrading.append({
+                'template': frame.categories['template'][code][:100],
+                'recent_sharpe': recent_sharpe[code],
+                'older_sharpe': older_sharpe[code],
+                'degradation': (older_sharpe[code] - recent_sharpe[code]) / older_sharpe[code],
+                'num_recent': 5,
+                'num_older': int(counts[code]) - 5
+            })
+        
+        logger.info(f"Identified {len(degrading)} degrading alphas")
+        return degrading
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Local Fake WorldQuant Brain API
+Minimal in-process server implementing the endpoints used by SimulatorTester and
+CredentialManager, for tests that must not touch the real API.
+
+Accounts are identified by the `t` cookie. Each account has a concurrency
+limit; simulations complete after `duration` seconds.
+"""
+
+import base64
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+
+class FakeBrainAPI:
+    """Threaded fake API server (use as a context manager)"""
+
+    def __init__(self, duration: float = 0.2):
+        self.duration = duration
+        self.lock = threading.Lock()
+        self.tokens: Dict[str, str] = {}  # token -> account
+        self.limits: Dict[str, int] = {}  # account -> max concurrent simulations
+        self.running: Dict[str, int] = {}
+        self.peak: Dict[str, int] = {}
+        self.completed: Dict[str, int] = {}
+        self.simulations: Dict[int, Dict] = {}
+        self.logins: Dict[str, tuple] = {}  # username -> (password, account)
+        self.login_count = 0
+        self.connections = 0  # TCP connections accepted (keep-alive reuse shows as fewer)
+        self.next_id = 1
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def add_account(self, account: str, token: str, max_concurrent: int = 8):
+        with self.lock:
+            self.tokens[token] = account
+            self.limits[account] = max_concurrent
+            self.running.setdefault(account, 0)
+            self.peak.setdefault(account, 0)
+            self.completed.setdefault(account, 0)
+
+    def add_login(self, username: str, password: str, account: str, max_concurrent: int = 8):
+        """Allow POST /authentication with basic auth; each login issues a fresh `t` cookie"""
+        with self.lock:
+            self.logins[username] = (password, account)
+            self.limits[account] = max_concurrent
+            self.running.setdefault(account, 0)
+            self.peak.setdefault(account, 0)
+            self.completed.setdefault(account, 0)
+
+    def revoke(self, token: str):
+        """Expire a session cookie"""
+        with self.lock:
+            self.tokens.pop(token, None)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _account_for(self, cookie_header: str) -> Optional[str]:
+        match = re.search(r'(?:^|;\s*)t=([^;]+)', cookie_header or '')
+        return self.tokens.get(match.group(1)) if match else None
+
+    def _handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive, like the real API
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                with api.lock:
+                    api.connections += 1
+
+            def _send(self, status: int, body: Optional[Dict] = None, headers: Optional[Dict] = None):
+                payload = json.dumps(body or {}).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                account = api._account_for(self.headers.get('Cookie'))
+                if account is None:
+                    return self._send(401, {'detail': 'Incorrect authentication credentials.'})
+                if self.path == '/users/self':
+                    return self._send(200, {'id': account})
+
+                match = re.match(r'^/simulations/(\d+)$', self.path)
+                if match:
+                    with api.lock:
+                        sim = api.simulations.get(int(match.group(1)))
+                        if sim is None:
+                            return self._send(404)
+                        if time.time() < sim['done_at']:
+                            return self._send(200, {'status': 'RUNNING'}, {'Retry-After': '0.05'})
+                        if not sim['finished']:
+                            sim['finished'] = True
+                            api.running[sim['account']] -= 1
+                            api.completed[sim['account']] += 1
+                    return self._send(200, {'status': 'COMPLETE', 'alpha': f"A{match.group(1)}"})
+
+                match = re.match(r'^/alphas/(\w+)$', self.path)
+                if match:
+                    return self._send(200, {'id': match.group(1), 'is': {
+                        'sharpe': 1.5, 'fitness': 1.1, 'turnover': 0.3, 'returns': 0.12, 'checks': []}})
+                return self._send(404)
+
+            def _login(self):
+                match = re.match(r'Basic (.+)$', self.headers.get('Authorization', ''))
+                username, _, password = base64.b64decode(match.group(1)).decode().partition(':') \
+                    if match else ('', '', '')
+                with api.lock:
+                    password_ok, account = api.logins.get(username, (None, None))
+                    if account is None or password != password_ok:
+                        return self._send(401, {'detail': 'Invalid credentials.'})
+                    api.login_count += 1
+                    token = f"{account}-{api.login_count}"
+                    api.tokens[token] = account
+                self._send(201, {'user': {'id': account}, 'token': {'expiry': 14400.0}},
+                           {'Set-Cookie': f"t={token}; Path=/"})
+
+            def do_POST(self):
+                account = api._account_for(self.headers.get('Cookie'))
+                length = int(self.headers.get('Content-Length', 0))
+                self.rfile.read(length)
+                if self.path == '/authentication':
+                    return self._login()
+                if account is None:
+                    return self._send(401, {'detail': 'Incorrect authentication credentials.'})
+                if self.path != '/simulations':
+                    return self._send(404)
+                with api.lock:
+                    if api.running[account] >= api.limits[account]:
+                        return self._send(429, {'detail': 'CONCURRENT_SIMULATION_LIMIT_EXCEEDED'})
+                    sim_id = api.next_id
+                    api.next_id += 1
+                    api.running[account] += 1
+                    api.peak[account] = max(api.peak[account], api.running[account])
+                    api.simulations[sim_id] = {'account': account, 'done_at': time.time() + api.duration,
+                                               'finished': False}
+                self._send(201, {}, {'Location': f"{api.base_url}/simulations/{sim_id}"})
+
+        return Handler
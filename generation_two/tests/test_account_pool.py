@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Test Account Pool
+Runs simulations across several accounts against the local fake API
+"""
+
+import sys
+import os
+import time
+import logging
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from generation_two.core.account_pool import AccountPool
+from generation_two.core.simulator_tester import SimulationSettings, CACHED_PROGRESS_PREFIX
+from tests.fake_brain_api import FakeBrainAPI
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def make_pool(api: FakeBrainAPI, workdir: Path, specs):
+    """specs: (name, max_slots, daily_limit) per account"""
+    accounts = []
+    for name, max_slots, daily_limit in specs:
+        api.add_account(name, f"{name}-token", max_concurrent=max_slots)
+        cookie_file = workdir / f"{name}.txt"
+        cookie_file.write_text(f"t={name}-token")
+        accounts.append(AccountPool.make_account(
+            name, cookie_file, db_path=str(workdir / "counts.db"), api_base=api.base_url,
+            max_slots=max_slots, daily_limit=daily_limit, reset_delay=0))
+    pool = AccountPool(accounts, api_base=api.base_url, check_interval=0.1, poll_interval=0.05)
+    assert pool.authenticate_all() == len(specs)
+    return pool
+
+
+def test_routes_across_accounts():
+    """Work spreads over all accounts without exceeding any account's concurrency"""
+    settings = SimulationSettings()
+    with FakeBrainAPI(duration=0.2) as api, tempfile.TemporaryDirectory() as tmp:
+        pool = make_pool(api, Path(tmp), [("alice", 2, 5000), ("bob", 2, 5000), ("carol", 4, 5000)])
+        items = [(f"rank(close) * {i}", "GLB" if i % 4 == 0 else "USA") for i in range(24)]
+
+        start = time.time()
+        results = pool.simulate_batch(items, settings)
+        elapsed = time.time() - start
+
+        assert all(r.success for r in results), [r.error_message for r in results if not r.success]
+        stats = pool.get_stats()
+        logger.info(f"24 simulations on 3 accounts in {elapsed:.2f}s, per account: "
+                    f"{[(a['name'], a['completed']) for a in stats['accounts']]}")
+        assert stats['completed'] == 24
+        assert all(a['completed'] > 0 for a in stats['accounts'])
+        assert all(api.peak[name] <= limit for name, limit in api.limits.items())
+        assert stats['max_slots'] == 8
+
+
+def test_daily_budget_headroom():
+    """An account with little daily budget left stops receiving work"""
+    settings = SimulationSettings()
+    with FakeBrainAPI(duration=0.05) as api, tempfile.TemporaryDirectory() as tmp:
+        pool = make_pool(api, Path(tmp), [("small", 4, 2), ("large", 4, 5000)])
+        results = pool.simulate_batch([(f"ts_rank(volume, {i})", "USA") for i in range(10)], settings)
+
+        assert all(r.success for r in results)
+        assert api.completed["small"] == 2
+        assert api.completed["large"] == 8
+        assert pool.get_stats()['accounts'][0]['remaining_today'] == 0
+
+
+def test_reauthenticates_expired_session():
+    """An expired session is re-authenticated in the background from its refreshed cookie file"""
+    settings = SimulationSettings()
+    with FakeBrainAPI(duration=0.05) as api, tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        pool = make_pool(api, workdir, [("alice", 2, 5000)])
+        pool.start()
+        try:
+            # Expire the session and drop a fresh cookie in place
+            api.revoke("alice-token")
+            api.add_account("alice", "alice-token-2", max_concurrent=2)
+            (workdir / "alice.txt").write_text("t=alice-token-2")
+
+            failed = pool.simulate("rank(close)", "USA", settings)
+            assert not failed.success
+
+            deadline = time.time() + 5
+            while time.time() < deadline and not pool._session_valid(pool.accounts[0]):
+                time.sleep(0.05)
+
+            result = pool.simulate("rank(open)", "USA", settings)
+            assert result.success, result.error_message
+        finally:
+            pool.stop()
+
+
+def test_failed_submission_refunded():
+    """A submission the API rejects gives its daily budget back and moves to the next account"""
+    settings = SimulationSettings()
+    with FakeBrainAPI(duration=0.05) as api, tempfile.TemporaryDirectory() as tmp:
+        pool = make_pool(api, Path(tmp), [("alice", 4, 10), ("bob", 4, 10)])
+        api.revoke("alice-token")
+        alice, bob = pool.accounts
+
+        results = [pool.simulate(f"rank(close) * {i}", "USA", settings) for i in range(3)]
+        assert all(r.success for r in results), [r.error_message for r in results]
+        assert api.completed.get("alice", 0) == 0 and api.completed["bob"] == 3
+        assert alice.counter.get_today_count() == 0 and alice.remaining_today == 10
+        assert bob.counter.get_today_count() == 3 and bob.remaining_today == 7
+
+
+def test_pooled_simulator_two_step():
+    """submit_simulation / monitor_simulation run on one account and answer repeats from the cache"""
+    settings = SimulationSettings()
+    with FakeBrainAPI(duration=0.05) as api, tempfile.TemporaryDirectory() as tmp:
+        pool = make_pool(api, Path(tmp), [("alice", 2, 5000), ("bob", 2, 5000)])
+        simulator = pool.simulator()
+
+        urls = [simulator.submit_simulation(f"ts_rank(volume, {i})", "USA", settings) for i in range(4)]
+        assert all(urls)
+        assert sum(a.slot_manager.get_active_slots_count() for a in pool.accounts) == 4
+        results = [simulator.monitor_simulation(url, f"ts_rank(volume, {i})", "USA", settings)
+                   for i, url in enumerate(urls)]
+        assert all(r.success for r in results), [r.error_message for r in results]
+        assert api.completed["alice"] == 2 and api.completed["bob"] == 2
+
+        url = simulator.submit_simulation("ts_rank(volume,0)", "USA", settings)
+        assert url.startswith(CACHED_PROGRESS_PREFIX)
+        assert simulator.monitor_simulation(url, "ts_rank(volume,0)", "USA", settings).alpha_id == results[0].alpha_id
+        assert sum(a.submitted for a in pool.accounts) == 4
+
+
+def main():
+    tests = [
+        ("Routing Across Accounts", test_routes_across_accounts),
+        ("Daily Budget Headroom", test_daily_budget_headroom),
+        ("Re-authentication", test_reauthenticates_expired_session),
+        ("Failed Submission Refunded", test_failed_submission_refunded),
+        ("Pooled Simulator Two-Step", test_pooled_simulator_two_step),
+    ]
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            logger.info(f"✅ PASS: {name}")
+        except AssertionError as e:
+            failed += 1
+            logger.error(f"❌ FAIL: {name} {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test Alpha Work Queue
+Leases, redelivery, delayed nacks, key acks and lease renewal of the
+consultant-naive-ollama mine/submit queue
+"""
+
+import sys
+import os
+import time
+import logging
+import tempfile
+
+# Add parent directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, os.path.join(os.path.dirname(parent_dir), 'generation_one', 'consultant-naive-ollama'))
+
+from alpha_queue import AlphaWorkQueue, MINE_QUEUE
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def _queues(tmp: str, max_attempts: int = 5):
+    """Two consumers (as two processes would have) on one database"""
+    db_path = os.path.join(tmp, 'queue.db')
+    return AlphaWorkQueue(db_path, max_attempts=max_attempts), AlphaWorkQueue(db_path, max_attempts=max_attempts)
+
+
+def test_lease_expiry_redelivers():
+    """A job whose lease expires is delivered again; the first consumer's ack then fails"""
+    with tempfile.TemporaryDirectory() as tmp:
+        first, second = _queues(tmp, max_attempts=2)
+        first.enqueue(MINE_QUEUE, {'expression': 'rank(close)'}, dedupe_key='rank(close)')
+
+        job = first.dequeue(MINE_QUEUE, visibility_timeout=0.2)[0]
+        assert second.dequeue(MINE_QUEUE) == []
+        time.sleep(0.3)
+        again = second.dequeue(MINE_QUEUE, visibility_timeout=0.2)[0]
+        assert again.id == job.id and again.attempts == 2
+        assert not first.ack(job)
+        stats = second.stats(MINE_QUEUE)[MINE_QUEUE]
+        assert stats['redelivered'] == 1 and stats['delivered'] == 2
+
+        # Out of attempts: the next expiry moves it to the dead letters
+        time.sleep(0.3)
+        assert second.dequeue(MINE_QUEUE) == []
+        assert second.stats(MINE_QUEUE)[MINE_QUEUE]['dead'] == 1
+        first.close()
+        second.close()
+
+
+def test_nack_with_delay():
+    """A nacked job stays hidden for its delay, then comes back under a new lease"""
+    with tempfile.TemporaryDirectory() as tmp:
+        queue, _ = _queues(tmp)
+        queue.enqueue(MINE_QUEUE, {'expression': 'ts_rank(volume, 5)'})
+        job = queue.dequeue(MINE_QUEUE)[0]
+        assert queue.nack(job, delay=0.3, error='timed out')
+        assert queue.dequeue(MINE_QUEUE) == []
+        assert queue.size(MINE_QUEUE) == 1 and queue.size(MINE_QUEUE, ready_only=True) == 0
+        time.sleep(0.4)
+        retry = queue.dequeue(MINE_QUEUE)[0]
+        assert retry.id == job.id and retry.attempts == 2
+        assert not queue.nack(job)  # the old lease token is no longer valid
+        assert queue.ack(retry)
+        assert queue.size(MINE_QUEUE) == 0
+
+
+def test_ack_key_skips_leased():
+    """ack_key removes ready jobs only; a leased job still belongs to its consumer"""
+    with tempfile.TemporaryDirectory() as tmp:
+        orchestrator, miner = _queues(tmp)
+        orchestrator.enqueue(MINE_QUEUE, {'expression': 'a'}, dedupe_key='a')
+        orchestrator.enqueue(MINE_QUEUE, {'expression': 'b'}, dedupe_key='b')
+
+        job = orchestrator.dequeue(MINE_QUEUE)[0]
+        assert job.dedupe_key == 'a'
+        assert miner.ack_key(MINE_QUEUE, 'a') == 0
+        assert miner.ack_key(MINE_QUEUE, 'b') == 1
+        assert orchestrator.nack(job, delay=0)  # the retry is still there to be made
+        leased_again = orchestrator.dequeue(MINE_QUEUE)[0]
+        assert leased_again.dedupe_key == 'a' and orchestrator.ack(leased_again)
+        assert orchestrator.size(MINE_QUEUE) == 0
+
+
+def test_keep_leased_renews():
+    """keep_leased holds a short lease well past its timeout, and stops renewing after the block"""
+    with tempfile.TemporaryDirectory() as tmp:
+        owner, other = _queues(tmp)
+        owner.enqueue(MINE_QUEUE, {'expression': 'zscore(close)'})
+        job = owner.dequeue(MINE_QUEUE, visibility_timeout=0.3)[0]
+
+        with owner.keep_leased(job, visibility_timeout=0.3, interval=0.05):
+            for _ in range(6):
+                time.sleep(0.1)
+                assert other.dequeue(MINE_QUEUE) == []
+        assert owner.ack(job)
+
+        # Without renewal the same lease would have lapsed
+        owner.enqueue(MINE_QUEUE, {'expression': 'zscore(open)'})
+        job = owner.dequeue(MINE_QUEUE, visibility_timeout=0.3)[0]
+        with owner.keep_leased(job, visibility_timeout=0.3, interval=0.05):
+            pass
+        time.sleep(0.4)
+        assert other.dequeue(MINE_QUEUE)[0].id == job.id
+
+
+def main():
+    tests = [
+        ("Lease Expiry Redelivers", test_lease_expiry_redelivers),
+        ("Nack With Delay", test_nack_with_delay),
+        ("Ack Key Skips Leased", test_ack_key_skips_leased),
+        ("Keep Leased Renews", test_keep_leased_renews),
+    ]
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            logger.info(f"✅ PASS: {name}")
+        except AssertionError as e:
+            failed += 1
+            logger.error(f"❌ FAIL: {name} {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test Alpha Store
+Incremental alpha sync around the high-water mark, and timestamp normalization
+in the alpha-icu local alpha mirror
+"""
+
+import sys
+import os
+import logging
+import tempfile
+
+# Add parent directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, os.path.join(os.path.dirname(parent_dir), 'generation_one', 'alpha-icu'))
+
+from alpha_store import AlphaStore, normalize_timestamp
+from alpha_fetcher import AlphaFetcher
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+MARK = "2025-09-13T21:32:26-04:00"       # 2025-09-14T01:32:26 UTC
+BEFORE = "2025-09-13T21:00:00-04:00"
+AFTER = "2025-09-14T02:00:00+00:00"
+
+
+def alpha(alpha_id, modified):
+    return {'id': alpha_id, 'dateCreated': modified, 'dateModified': modified,
+            'status': 'UNSUBMITTED', 'settings': {'region': 'USA'}, 'is': {'sharpe': 1.0}}
+
+
+def fetcher_for(pages):
+    """An AlphaFetcher whose pages (newest-modified first) come from a list instead of the API"""
+    fetcher = AlphaFetcher.__new__(AlphaFetcher)
+
+    def fetch_page(offset, limit, **filters):
+        index = offset // limit
+        return {'results': pages[index], 'next': index + 1 < len(pages)}
+
+    fetcher._fetch_page_with_retry = fetch_page
+    return fetcher
+
+
+def test_sync_boundary():
+    """Alphas sharing the high-water timestamp that arrive later are still synced, once each"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AlphaStore(os.path.join(tmp, 'alphas.db'))
+        store.upsert_alphas([alpha('a', MARK), alpha('old', BEFORE)])
+        assert store.get_high_water_mark() == normalize_timestamp(MARK)
+
+        # 'b' was modified in the same second as 'a' but only shows up now
+        fetcher = fetcher_for([[alpha('b', MARK), alpha('a', MARK), alpha('old', BEFORE)]])
+        assert fetcher.sync_alphas(store) == 1
+        assert store.count() == 3
+
+        # A newer alpha shifts the pages while they are walked: 'c' is seen twice, stored once
+        fetcher = fetcher_for([[alpha('c', AFTER), alpha('d', MARK)] * 50,
+                               [alpha('c', AFTER), alpha('b', MARK), alpha('old', BEFORE)]])
+        assert fetcher.sync_alphas(store) == 2
+        assert store.count() == 5
+        assert store.get_high_water_mark() == normalize_timestamp(AFTER)
+
+        # Nothing new: the walk stops at the mark and writes nothing
+        assert fetcher_for([[alpha('c', AFTER), alpha('d', MARK)]]).sync_alphas(store) == 0
+        store.close()
+
+
+def test_malformed_timestamps():
+    """An unparseable timestamp normalizes to '' and never becomes the high-water mark"""
+    assert normalize_timestamp("not a date") == ""
+    assert normalize_timestamp(None) == "" and normalize_timestamp("") == ""
+    assert normalize_timestamp("2025-09-14T01:32:26Z") == normalize_timestamp(MARK) == "2025-09-14T01:32:26+00:00"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AlphaStore(os.path.join(tmp, 'alphas.db'))
+        store.upsert_alphas([alpha('good', MARK), alpha('bad', "13/09/2025 9pm")])
+        assert store.get_high_water_mark() == normalize_timestamp(MARK)
+
+        # A malformed alpha inside the new range does not end the walk early
+        fetcher = fetcher_for([[alpha('new', AFTER), alpha('bad2', "yesterday"), alpha('newer', AFTER)],
+                               [alpha('good', MARK), alpha('old', BEFORE)]])
+        assert fetcher.sync_alphas(store) == 3
+        assert {a['id'] for a in store.query_alphas()} == {'good', 'bad', 'new', 'bad2', 'newer'}
+        assert store.get_high_water_mark() == normalize_timestamp(AFTER)
+        store.close()
+
+
+def main():
+    tests = [
+        ("Sync Boundary", test_sync_boundary),
+        ("Malformed Timestamps", test_malformed_timestamps),
+    ]
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            logger.info(f"✅ PASS: {name}")
+        except AssertionError as e:
+            failed += 1
+            logger.error(f"❌ FAIL: {name} {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
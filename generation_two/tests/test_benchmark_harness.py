@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test Offline Benchmark Harness
+Records traffic from the fake API, replays it and checks the benchmark reports
+"""
+
+import sys
+import os
+import logging
+import tempfile
+
+import requests
+
+# Add parent directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from generation_two.benchmark import (
+    TrafficRecorder, ReplayFixtures, ReplayBrainAPI, run_benchmark,
+    drive_simulator_tester, drive_mining_coordinator, drive_pyramid_crasher
+)
+from generation_two.core.simulator_tester import SimulatorTester, SimulationSettings
+from generation_two.core.account_pool import default_region_configs
+from generation_two.tests.fake_brain_api import FakeBrainAPI
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+TEMPLATES = ['rank(ts_delta(close, 5))', 'ts_rank(volume, 20)', 'group_neutralize(rank(returns), sector)',
+             '-ts_corr(close, volume, 10)', 'zscore(ts_mean(vwap, 15))', 'ts_std_dev(high - low, 30)']
+
+
+def record_fixtures() -> ReplayFixtures:
+    """Run a normal SimulatorTester batch against the fake API with the recorder attached"""
+    with FakeBrainAPI(duration=0.3) as api:
+        api.add_account('main', 'tok')
+        session = requests.Session()
+        session.cookies.set('t', 'tok')
+        recorder = TrafficRecorder()
+        recorder.attach(session)
+        tester = SimulatorTester(session, default_region_configs(), api_base=api.base_url, poll_interval=0.05)
+        for template in TEMPLATES:
+            progress_url = tester.submit_simulation(template, 'USA', SimulationSettings())
+            assert progress_url
+            tester.monitor_simulation(progress_url, template, 'USA', SimulationSettings())
+        return recorder.fixtures()
+
+
+def test_record_and_reload():
+    """Recorded traces hold submit, polls, alpha details and duration; they survive save/load"""
+    fixtures = record_fixtures()
+    assert fixtures.templates() == TEMPLATES
+    trace = fixtures.simulations[0]
+    assert trace.submit.status == 201 and trace.final_status == 'COMPLETE'
+    assert trace.alpha.body['is']['sharpe'] == 1.5
+    assert trace.duration >= 0.3
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'replay.json')
+        fixtures.save(path)
+        loaded = ReplayFixtures.load(path)
+    assert loaded.templates() == TEMPLATES and loaded.simulations[0].duration == trace.duration
+
+
+def test_replay_serves_recorded_responses():
+    """A client talking to the replay server gets the recorded alpha details back for each template"""
+    fixtures = record_fixtures()
+    recorded = {trace.template: trace.alpha.body for trace in fixtures.simulations}
+    with ReplayBrainAPI(fixtures, latency_scale=0.2) as api:
+        tester = SimulatorTester(api.session(), default_region_configs(), api_base=api.base_url, poll_interval=0.05)
+        for template in TEMPLATES[:3]:
+            progress_url = tester.submit_simulation(template, 'USA', SimulationSettings())
+            assert progress_url and progress_url.startswith(api.base_url)
+            result = tester.monitor_simulation(progress_url, template, 'USA', SimulationSettings())
+            assert result.success and result.alpha_id
+            assert result.sharpe == recorded[template]['is']['sharpe']
+            assert result.fitness == recorded[template]['is']['fitness']
+        stats = api.stats()
+    assert stats['submitted'] == stats['completed'] == 3 and stats['failed'] == 0
+
+
+def test_replay_simulator_tester():
+    """Replayed batch reports throughput, latency percentiles, slot use and CPU"""
+    fixtures = record_fixtures()
+    report = run_benchmark('simulator_tester', drive_simulator_tester(TEMPLATES, poll_interval=0.05),
+                           fixtures, latency_scale=0.5)
+    logger.info(report.summary())
+    assert report.completed == len(TEMPLATES) and report.failed == 0
+    assert report.templates_per_minute > 0 and 0 < report.slot_utilization <= 1
+    assert report.latency_p50 >= 0.15 and report.latency_p95 >= report.latency_p50
+    assert report.cpu_per_simulation_ms > 0
+
+
+def test_injected_failures_and_rate_limits():
+    """Failure and 429 injection show up in the report"""
+    fixtures = record_fixtures()
+    report = run_benchmark('simulator_tester', drive_simulator_tester(TEMPLATES, poll_interval=0.05),
+                           fixtures, latency_scale=0.2, failure_rate=1.0, seed=0)
+    assert report.completed == 0 and report.failed == len(TEMPLATES)
+
+    report = run_benchmark('simulator_tester', drive_simulator_tester(TEMPLATES, poll_interval=0.05),
+                           fixtures, latency_scale=0.2, rate_limit_rate=0.5, seed=0)
+    assert report.rate_limited > 0
+    assert report.completed + report.rate_limited == len(TEMPLATES)
+
+
+def test_replay_mining_coordinator():
+    """Coordinator cycles dedupe, dispatch through slots and store every replayed template"""
+    fixtures = record_fixtures()
+    with tempfile.TemporaryDirectory() as tmp:
+        report = run_benchmark('mining_coordinator',
+                               drive_mining_coordinator(fixtures, os.path.join(tmp, 'bench.db'), poll_interval=0.05),
+                               fixtures, latency_scale=0.5)
+    assert report.templates == len(TEMPLATES) and report.completed == len(TEMPLATES)
+    assert report.peak_slots > 1
+
+
+def test_replay_pyramid_crasher():
+    """generation_one PyramidCrasher runs unchanged with its hard-coded URLs redirected"""
+    fixtures = record_fixtures()
+    report = run_benchmark('pyramid_crasher', drive_pyramid_crasher(TEMPLATES[:3]), fixtures, latency_scale=0.5)
+    assert report.completed == 3
+    assert report.peak_slots <= 3
+
+
+def main():
+    tests = [
+        ("Record and Reload", test_record_and_reload),
+        ("Replay Serves Recorded Responses", test_replay_serves_recorded_responses),
+        ("Replay SimulatorTester", test_replay_simulator_tester),
+        ("Injected Failures and 429s", test_injected_failures_and_rate_limits),
+        ("Replay MiningCoordinator", test_replay_mining_coordinator),
+        ("Replay PyramidCrasher", test_replay_pyramid_crasher),
+    ]
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            logger.info(f"✅ PASS: {name}")
+        except AssertionError as e:
+            failed += 1
+            logger.error(f"❌ FAIL: {name} {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test Brain Session
+Pooled connections are reused across threads, and a burst of 401s costs one re-login
+"""
+
+import sys
+import os
+import json
+import logging
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from brain_client.brain_session import BrainSession, endpoint_key, load_credentials
+from tests.fake_brain_api import FakeBrainAPI
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def test_credentials_and_endpoint_keys():
+    """Every credential format the scripts used loads; ids collapse in endpoint keys"""
+    with tempfile.TemporaryDirectory() as tmp:
+        formats = ['["user@x.com", "pw"]', '{"username": "user@x.com", "password": "pw"}', 'user@x.com\npw\n']
+        for i, content in enumerate(formats):
+            path = os.path.join(tmp, f'credential{i}.txt')
+            with open(path, 'w') as f:
+                f.write(content)
+            assert load_credentials(path) == ('user@x.com', 'pw')
+
+    assert endpoint_key('get', 'https://api.worldquantbrain.com/simulations/3JqZ9e4Yx5?x=1') == 'GET /simulations/:id'
+    assert endpoint_key('GET', 'https://api.worldquantbrain.com/alphas/kqOZX8e/recordsets/pnl') == \
+        'GET /alphas/:id/recordsets/pnl'
+    assert endpoint_key('GET', 'https://api.worldquantbrain.com/users/self/alphas') == 'GET /users/self/alphas'
+    assert endpoint_key('POST', 'https://api.worldquantbrain.com/data-sets') == 'POST /data-sets'
+
+
+def test_pool_reuses_connections():
+    """Eight threads share a handful of kept-alive connections"""
+    with FakeBrainAPI() as api:
+        api.add_login('user', 'pw', 'acct')
+        sess = BrainSession(credentials=('user', 'pw'), api_base=api.base_url, pool_size=8)
+        sess.login()
+
+        def work(_):
+            return [sess.get(f"{api.base_url}/users/self").status_code for _ in range(20)]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            codes = [code for batch in pool.map(work, range(8)) for code in batch]
+        assert codes == [200] * 160
+        assert api.connections <= 9, api.connections  # One per thread (+ the login), not per request
+
+        stats = sess.get_endpoint_stats()
+        assert list(stats) == ['GET /users/self', 'POST /authentication']
+        assert stats['GET /users/self']['count'] == 160 and stats['GET /users/self']['errors'] == 0
+        assert stats['GET /users/self']['p95_ms'] >= stats['GET /users/self']['p50_ms'] > 0
+
+
+def test_concurrent_401s_share_one_login():
+    """An expired session is renewed once, and every request is replayed successfully"""
+    with FakeBrainAPI() as api:
+        api.add_login('user', 'pw', 'acct')
+        sess = BrainSession(credentials=('user', 'pw'), api_base=api.base_url)
+        sess.login()
+        api.revoke('acct-1')
+
+        barrier = threading.Barrier(8)
+
+        def work(_):
+            barrier.wait()
+            return sess.get(f"{api.base_url}/users/self").status_code
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            codes = list(pool.map(work, range(8)))
+        assert codes == [200] * 8
+        assert api.login_count == sess.login_count == 2
+
+        # Bad credentials: the caller gets the 401 back instead of an exception
+        api.revoke('acct-2')
+        sess.credentials = ('user', 'wrong')
+        assert sess.get(f"{api.base_url}/users/self").status_code == 401
+        assert api.login_count == 2
+
+
+def test_login_expiry_refreshes_early():
+    """The token expiry returned at login triggers a re-login before requests start failing"""
+    with FakeBrainAPI() as api:
+        api.add_login('user', 'pw', 'acct')
+        sess = BrainSession(credentials=('user', 'pw'), api_base=api.base_url, refresh_margin=14400 - 1)
+        response = sess.login()
+        assert json.loads(response.text)['token']['expiry'] == 14400.0
+        assert sess.get(f"{api.base_url}/users/self").status_code == 200
+        assert sess.login_count == 1
+        sess._expires_at -= 2  # Now inside the refresh margin
+        assert sess.get(f"{api.base_url}/users/self").status_code == 200
+        assert sess.login_count == api.login_count == 2
+
+
+def main():
+    tests = [
+        ("Credentials / Endpoint Keys", test_credentials_and_endpoint_keys),
+        ("Pool Reuses Connections", test_pool_reuses_connections),
+        ("Concurrent 401s Share One Login", test_concurrent_401s_share_one_login),
+        ("Login Expiry Refreshes Early", test_login_expiry_refreshes_early),
+    ]
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            logger.info(f"✅ PASS: {name}")
+        except AssertionError as e:
+            failed += 1
+            logger.error(f"❌ FAIL: {name} {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test Columnar Analytics
+Regroup/retrospect over the columnar store must match the list-of-results path
+"""
+
+import sys
+import os
+import logging
+import math
+import sqlite3
+import tempfile
+import time
+from unittest import mock
+
+import numpy as np
+
+# Add parent directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from generation_two.storage.columnar_store import ColumnarBacktestStore, HAS_PYARROW
+from generation_two.storage.regroup import AlphaRegrouper
+from generation_two.storage.retrospect import AlphaRetrospect
+from generation_two.benchmark.analytics_bench import (
+    QUERIES, populate_backtests, load_result_dicts, run_analytics_benchmark
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+FORMATS = ['npz', 'parquet'] if HAS_PYARROW else ['npz']
+
+
+def same(a, b) -> bool:
+    """Deep equality with float tolerance"""
+    if isinstance(a, dict):
+        return isinstance(b, dict) and list(a) == list(b) and all(same(a[k], b[k]) for k in a)
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    if isinstance(a, (float, np.floating)):
+        return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-12)
+    return a == b
+
+
+def assert_queries_match(results, frame, label: str):
+    """Every benchmark query returns the same answer from the list of results and the columnar frame"""
+    regrouper, retrospect = AlphaRegrouper(), AlphaRetrospect()
+    with mock.patch('time.time', return_value=time.time()):
+        for name, query in QUERIES:
+            expected = query(regrouper, retrospect, results)
+            actual = query(regrouper, retrospect, frame)
+            if name.startswith('regroup'):
+                # Groups hold the very same rows, so compare exactly
+                actual = {group: list(view) for group, view in actual.items()}
+                assert list(actual) == list(expected) and actual == expected, f"{label} {name}"
+            else:
+                assert same(expected, actual), f"{label} {name}"
+
+
+def test_results_match_list_path():
+    """Every regroup/retrospect query returns the same groups, order and values from the columnar frame"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'backtests.db')
+        populate_backtests(db_path, 20_000, templates=400)
+        results = load_result_dicts(db_path)
+        for format in FORMATS:
+            frame = ColumnarBacktestStore(db_path, os.path.join(tmp, format), format=format,
+                                          chunk_rows=7_000).load()
+            assert len(frame) == len(results)
+            assert_queries_match(results, frame, format)
+            insights = AlphaRetrospect().generate_insights(frame)
+            assert insights['degrading_alphas'] and insights['top_performers'][0]['rank'] == 1
+
+
+def test_incremental_sync():
+    """Only new rows are materialized; deletions rebuild; many segments compact into one"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'backtests.db')
+        populate_backtests(db_path, 5_000, templates=100)
+        store = ColumnarBacktestStore(db_path, os.path.join(tmp, 'columns'), format='npz', max_segments=3)
+        assert store.sync() == 5_000 and store.sync() == 0
+
+        populate_backtests(db_path, 1_000, templates=100, start_id=5_000)
+        assert store.sync() == 1_000
+        assert len(store.manifest['segments']) == 2
+        reopened = ColumnarBacktestStore(db_path, os.path.join(tmp, 'columns'), format='npz')
+        assert len(reopened.load()) == 6_000
+
+        for batch in range(3):
+            populate_backtests(db_path, 10, templates=100, start_id=6_000 + batch * 10)
+            store.sync()
+        assert len(store.manifest['segments']) <= 3 and store.manifest['rows'] == 6_030
+        assert store.manifest['segments'][0]['first_id'] == 1 and store.manifest['segments'][0]['rows'] > 6_000
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("DELETE FROM backtest_results WHERE id <= 100")
+        conn.commit()
+        conn.close()
+        frame = store.load()
+        assert len(frame) == 5_930 and frame.numeric['id'][0] == 101
+        assert len(store.load(region='USA')) == int(np.sum(frame.column('region') == 'USA'))
+
+
+def test_benchmark_runs():
+    """The 1M-record benchmark runs end to end (small here) and both paths it times agree
+
+    Timings are only logged; the speed comparison belongs to the benchmark script.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'backtests.db')
+        populate_backtests(db_path, 30_000, templates=2_000)
+        report = run_analytics_benchmark(db_path, os.path.join(tmp, 'columns'), incremental_rows=1_000)
+        logger.info("\n" + report.summary())
+        assert report.records == 30_000 and report.incremental_rows == 1_000
+        assert set(report.columnar_queries) == set(report.list_queries)
+
+        # The benchmark's store, after its incremental sync, answers like the list path
+        frame = ColumnarBacktestStore(db_path, os.path.join(tmp, 'columns')).load()
+        results = load_result_dicts(db_path)
+        assert len(frame) == len(results) == 31_000
+        assert_queries_match(results, frame, 'benchmark')
+
+
+def main():
+    tests = [
+        ("Results Match List Path", test_results_match_list_path),
+        ("Incremental Sync", test_incremental_sync),
+        ("Benchmark Runs", test_benchmark_runs),
+    ]
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            logger.info(f"✅ PASS: {name}")
+        except AssertionError as e:
+            failed += 1
+            logger.error(f"❌ FAIL: {name} {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
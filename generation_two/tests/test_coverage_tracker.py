@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Test Coverage Tracker
+Completion bitmap containers, coverage remapping when the space changes, and
+snapshot/journal persistence of the consultant-atom-up coverage tracker
+"""
+
+import sys
+import os
+import logging
+import tempfile
+
+import numpy as np
+
+# Add parent directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, os.path.join(os.path.dirname(parent_dir), 'generation_one', 'consultant-atom-up'))
+
+from coverage_tracker import (CompletionBitmap, CombinationSpace, CoverageTracker,
+                              CHUNK_SIZE, ARRAY_LIMIT)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def test_bitmap_chunk_boundaries():
+    """Indices either side of a chunk edge land in different chunks and are found again"""
+    bitmap = CompletionBitmap()
+    edges = [0, CHUNK_SIZE - 1, CHUNK_SIZE, 2 * CHUNK_SIZE - 1, 5 * CHUNK_SIZE + 7]
+    for index in edges:
+        assert bitmap.add(index)
+    assert not bitmap.add(CHUNK_SIZE)
+    assert len(bitmap) == len(edges)
+    for index in edges:
+        assert index in bitmap
+    for index in [1, CHUNK_SIZE - 2, CHUNK_SIZE + 1, 2 * CHUNK_SIZE, 3 * CHUNK_SIZE]:
+        assert index not in bitmap
+    assert bitmap.to_array().tolist() == edges
+
+    missing = np.concatenate(list(bitmap.missing(CHUNK_SIZE - 3, CHUNK_SIZE + 3))).tolist()
+    assert missing == [CHUNK_SIZE - 3, CHUNK_SIZE - 2, CHUNK_SIZE + 1, CHUNK_SIZE + 2]
+
+    try:
+        bitmap.add(-1)
+        assert False, "negative index accepted"
+    except ValueError:
+        pass
+
+
+def test_bitmap_container_switch():
+    """A chunk becomes a bitmap past ARRAY_LIMIT members and a full chunk is skipped by missing()"""
+    bitmap = CompletionBitmap()
+    sparse = np.arange(0, 2 * ARRAY_LIMIT, 2)[:ARRAY_LIMIT]
+    assert bitmap.update(sparse) == ARRAY_LIMIT
+    assert bitmap._chunks[0].dtype == np.uint16
+    assert bitmap.add(2 * ARRAY_LIMIT + 1)
+    assert bitmap._chunks[0].dtype == np.uint8
+    assert len(bitmap) == ARRAY_LIMIT + 1
+    assert all(int(i) in bitmap for i in sparse) and 1 not in bitmap and 2 * ARRAY_LIMIT + 1 in bitmap
+
+    assert bitmap.update(range(CHUNK_SIZE, 2 * CHUNK_SIZE)) == CHUNK_SIZE
+    blocks = list(bitmap.missing(CHUNK_SIZE - 1, 2 * CHUNK_SIZE + 2))
+    assert np.concatenate(blocks).tolist() == [CHUNK_SIZE - 1, 2 * CHUNK_SIZE, 2 * CHUNK_SIZE + 1]
+
+
+def test_bitmap_bytes_round_trip():
+    """Array, bitmap and full chunks survive serialization"""
+    bitmap = CompletionBitmap()
+    bitmap.update([3, 9, 65000])                                   # array chunk
+    bitmap.update(np.arange(CHUNK_SIZE, CHUNK_SIZE + ARRAY_LIMIT + 10))  # bitmap chunk
+    bitmap.update(np.arange(3 * CHUNK_SIZE, 4 * CHUNK_SIZE))       # full chunk
+    restored = CompletionBitmap.from_bytes(bitmap.to_bytes())
+    assert len(restored) == len(bitmap)
+    assert np.array_equal(restored.to_array(), bitmap.to_array())
+    assert 4 * CHUNK_SIZE - 1 in restored and 4 * CHUNK_SIZE not in restored
+    assert restored.add(4) and len(restored) == len(bitmap) + 1
+
+    try:
+        CompletionBitmap.from_bytes(b'junk')
+        assert False, "bad magic accepted"
+    except ValueError:
+        pass
+
+
+def test_remap_on_space_change():
+    """completed counts only the combinations that still exist after fields and operators change"""
+    old = CombinationSpace({'USA': ['close', 'volume', 'returns'], 'EUR': ['close']}, ['rank', 'zscore'])
+    new = CombinationSpace({'USA': ['returns', 'close', 'vwap']}, ['zscore', 'rank', 'ts_mean'])
+    done = [('USA', 'close', 'rank'), ('USA', 'volume', 'zscore'), ('USA', 'returns', 'zscore'),
+            ('EUR', 'close', 'rank')]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tracker = CoverageTracker(tmp, old)
+        tracker.load()
+        for key in done:
+            tracker.mark_completed(old.index(*key))
+        tracker.flush()
+        assert tracker.completed == 4
+
+        # volume and the EUR region are gone: two of the four completions survive
+        remapped = CoverageTracker(tmp, new)
+        assert remapped.load() == 2 and remapped.completed == 2
+        assert remapped.is_completed(new.index('USA', 'close', 'rank'))
+        assert remapped.is_completed(new.index('USA', 'returns', 'zscore'))
+        assert not remapped.is_completed(new.index('USA', 'close', 'zscore'))
+        untested = [new.key(i) for i in remapped.iter_untested()]
+        assert len(untested) == new.total - 2 and ('USA', 'vwap', 'ts_mean') in untested
+
+        # The remap was checkpointed against the new space, so reloading changes nothing
+        again = CoverageTracker(tmp, new)
+        assert again.load() == 2
+        assert np.array_equal(again.bitmap.to_array(), remapped.bitmap.to_array())
+
+
+def test_persistence_round_trip():
+    """Completions come back from snapshot + journal, a torn journal tail is ignored"""
+    space = CombinationSpace({'USA': [f'field_{i}' for i in range(400)]}, [f'op_{i}' for i in range(300)])
+    assert space.total == 120_000
+    with tempfile.TemporaryDirectory() as tmp:
+        tracker = CoverageTracker(tmp, space, snapshot_every=1000)
+        tracker.load()
+        rng = np.random.default_rng(0)
+        first = rng.choice(space.total, size=1500, replace=False)
+        for index in first:
+            tracker.mark_completed(int(index))
+        tracker.flush()  # journal passes snapshot_every: snapshot written, journal emptied
+        assert os.path.getsize(os.path.join(tmp, 'coverage.journal')) == 0
+
+        second = [CHUNK_SIZE - 1, CHUNK_SIZE, space.total - 1]
+        for index in second:
+            tracker.mark_completed(index)
+        tracker.flush()
+        with open(os.path.join(tmp, 'coverage.journal'), 'ab') as f:
+            f.write(b'\x01\x02\x03')  # interrupted append
+
+        reloaded = CoverageTracker(tmp, space, snapshot_every=1000)
+        assert reloaded.load() == tracker.completed
+        assert np.array_equal(reloaded.bitmap.to_array(), tracker.bitmap.to_array())
+        assert all(reloaded.is_completed(i) for i in second)
+
+        reloaded.clear()
+        assert CoverageTracker(tmp, space).load() == 0
+
+
+def main():
+    tests = [
+        ("Bitmap Chunk Boundaries", test_bitmap_chunk_boundaries),
+        ("Bitmap Container Switch", test_bitmap_container_switch),
+        ("Bitmap Bytes Round Trip", test_bitmap_bytes_round_trip),
+        ("Remap On Space Change", test_remap_on_space_change),
+        ("Persistence Round Trip", test_persistence_round_trip),
+    ]
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            logger.info(f"✅ PASS: {name}")
+        except AssertionError as e:
+            failed += 1
+            logger.error(f"❌ FAIL: {name} {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
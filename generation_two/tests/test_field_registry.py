@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Test Field Registry
+Indexed field tables must answer the same questions as scanning the JSON field cache
+"""
+
+import sys
+import os
+import json
+import logging
+import random
+import tempfile
+
+# Add parent directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+TEMPLATES_V2_DIR = os.path.join(os.path.dirname(parent_dir), 'generation_one', 'consultant-templates-ollama')
+
+from brain_client.field_registry import FieldRegistry, FieldTable
+from generation_two.data_fetcher.data_field_fetcher import DataFieldFetcher
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def make_fields(region='USA', delay=1, count=2000, seed=0):
+    """API-shaped field dicts, some with missing counts or coverage"""
+    rng = random.Random(seed)
+    fields = []
+    for i in range(count):
+        field = {
+            'id': f"{region.lower()}_fld{i}",
+            'type': rng.choice(['MATRIX', 'VECTOR', 'REGULAR', 'GROUP']),
+            'region': region,
+            'universe': rng.choice(['TOP3000', 'TOP3000', 'TOP1000']),
+            'delay': delay,
+            'description': f"Field {i}",
+            'dataset': {'id': f"ds{i % 11}", 'name': f"Dataset {i % 11}"},
+            'category': {'id': f"cat{i % 4}", 'name': f"Category {i % 4}"},
+            'userCount': rng.randint(0, 40),
+            'alphaCount': rng.randint(0, 40),
+            'coverage': round(rng.random(), 4),
+        }
+        if i % 9 == 0:
+            del field['userCount']
+        if i % 13 == 0:
+            del field['coverage']
+        fields.append(field)
+    return fields
+
+
+def usage(field):
+    return field.get('userCount', 0) + field.get('alphaCount', 0)
+
+
+def test_table_matches_field_dicts():
+    """Records read like the API dicts, and every index agrees with a scan"""
+    fields = make_fields()
+    table = FieldTable.from_fields('USA', 1, None, fields)
+    assert len(table) == len(fields)
+    for field, record in zip(fields, table):
+        for key in ('id', 'type', 'region', 'universe', 'delay', 'description', 'userCount',
+                    'alphaCount', 'dataset', 'category', 'pyramidMultiplier'):
+            assert record.get(key, 0) == field.get(key, 0), key
+        assert abs(record.get('coverage', 0) - field.get('coverage', 0)) < 1e-6
+
+    assert [r['id'] for r in table.by_usage()] == [f['id'] for f in sorted(fields, key=usage)]
+    assert [r['id'] for r in table.by_usage(descending=True)] == \
+        [f['id'] for f in sorted(fields, key=usage, reverse=True)]
+    non_vector = [f for f in fields if f['type'] in ('REGULAR', 'MATRIX')]
+    assert [r['id'] for r in table.by_usage(type=['REGULAR', 'MATRIX'])] == \
+        [f['id'] for f in sorted(non_vector, key=usage)]
+    assert table.ids(type='VECTOR', dataset='ds3') == \
+        [f['id'] for f in fields if f['type'] == 'VECTOR' and f['dataset']['id'] == 'ds3']
+    assert table.ids(category='cat2') == [f['id'] for f in fields if f['category']['id'] == 'cat2']
+    covered = table.by_coverage(0.8)
+    assert len(covered) == sum(f.get('coverage', -1) >= 0.8 for f in fields)
+    assert all(a['coverage'] >= b['coverage'] for a, b in zip(covered, covered[1:]))
+
+    assert 'usa_fld5' in table and 'usa_fld99999' not in table
+    assert table.field_type('usa_fld5') == fields[5]['type']
+    sample = table.sample(25, type='MATRIX', rng=random.Random(1))
+    assert len(sample) == len({r.id for r in sample}) == 25
+    assert all(r.type == 'MATRIX' for r in sample)
+
+
+def test_registry_loads_once_and_shares_snapshot():
+    """One JSON parse per file; a second registry maps the snapshot instead"""
+    fields = make_fields()
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, 'data_fields_cache_USA_1.json'), 'w') as f:
+            json.dump(fields, f)
+
+        registry = FieldRegistry(tmp)
+        everything = registry.table('USA', 1)
+        top3000 = registry.table('USA', 1, 'TOP3000')
+        assert registry.table('USA', 1) is everything
+        assert registry.stats['json_loads'] == 1
+        assert top3000.ids() == [f['id'] for f in fields if f['universe'] == 'TOP3000']
+        assert registry.table('EUR', 1) is None
+
+        other_process = FieldRegistry(tmp)
+        mapped = other_process.table('USA', 1, 'TOP3000')
+        assert other_process.stats['json_loads'] == 0 and other_process.stats['snapshot_loads'] == 1
+        assert list(mapped) == list(top3000)
+        assert mapped.by_usage(type='VECTOR') == top3000.by_usage(type='VECTOR')
+
+        # Rewriting the cache file invalidates both the loaded table and the snapshot
+        with open(os.path.join(tmp, 'data_fields_cache_USA_1.json'), 'w') as f:
+            json.dump(fields[:10], f)
+        assert len(registry.table('USA', 1)) == 10
+        assert len(FieldRegistry(tmp).table('USA', 1)) == 10
+
+
+def test_fetcher_keys_by_delay_and_universe():
+    """The fetcher no longer serves one delay's fields for another"""
+    with tempfile.TemporaryDirectory() as tmp:
+        for delay in (0, 1):
+            fields = [dict(f, universe='TOP3000') for f in make_fields(delay=delay, count=50 + delay, seed=delay)]
+            with open(os.path.join(tmp, f'data_fields_cache_USA_{delay}_TOP3000.json'), 'w') as f:
+                json.dump(fields, f)
+
+        fetcher = DataFieldFetcher(session=None, cache_dir=tmp)
+        assert len(fetcher.fetch_data_fields('USA', delay=0, universe='TOP3000')) == 50
+        assert len(fetcher.fetch_data_fields('USA', delay=1, universe='TOP3000')) == 51
+        assert fetcher.fetch_data_fields('USA', delay=0, universe='TOP3000') is \
+            fetcher.fetch_data_fields('USA', delay=0, universe='TOP3000')
+        table = fetcher.field_table('USA', 0, 'TOP3000')
+        assert len(table) == 50 and 'usa_fld49' in table
+        assert fetcher.get_field_by_id('USA', 'usa_fld50')['delay'] == 1
+
+
+class _FieldsResponse:
+    status_code = 200
+
+    def __init__(self, results):
+        self._results = results
+
+    def json(self):
+        return {'results': self._results}
+
+
+def test_v2_fields_same_shape_cached_or_fetched():
+    """The v2 generator returns equal plain dicts from the API and from its cache"""
+    # generation_two/ollama would shadow the ollama client the generator imports
+    saved_path = sys.path[:]
+    sys.path[:] = [TEMPLATES_V2_DIR] + [p for p in saved_path if os.path.abspath(p) != parent_dir]
+    try:
+        from enhanced_template_generator_v2 import EnhancedTemplateGeneratorV2, RegionConfig
+    except ImportError as e:
+        logger.warning(f"⚠️  {e}, skipping v2 generator field test")
+        return
+    finally:
+        sys.path[:] = saved_path
+
+    fields = [dict(f, universe='TOP3000') for f in make_fields(count=120)]
+    for field in fields:
+        field['themes'] = []  # an API key the registry does not keep
+
+    def make_api_request(method, url, params=None, **kwargs):
+        if url.endswith('/data-fields') and params.get('page') == 1 and params.get('dataset.id') == 'fundamental6':
+            return _FieldsResponse(fields)
+        return _FieldsResponse([])
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            generator = EnhancedTemplateGeneratorV2.__new__(EnhancedTemplateGeneratorV2)
+            generator.region_configs = {'USA': RegionConfig('USA', 'TOP3000', 1)}
+            generator.field_registry = FieldRegistry(cache_dir=tmp)
+            generator.make_api_request = make_api_request
+
+            fetched = generator.get_data_fields_for_region('USA', 1)
+            assert os.path.exists('data_fields_cache_USA_1.json')
+            cached = generator.get_data_fields_for_region('USA', 1)
+        finally:
+            os.chdir(cwd)
+
+    assert len(fetched) == 120
+    assert all(type(field) is dict for field in fetched + cached)
+    assert cached == fetched
+    assert json.loads(json.dumps(cached)) == fetched
+    assert fetched[1]['dataset'] == {'id': 'ds1', 'name': 'Dataset 1'} and 'themes' not in fetched[1]
+
+
+def main():
+    tests = [
+        ("Table Matches Field Dicts", test_table_matches_field_dicts),
+        ("Registry Load Once / Snapshot", test_registry_loads_once_and_shares_snapshot),
+        ("Fetcher Delay/Universe Keys", test_fetcher_keys_by_delay_and_universe),
+        ("V2 Fields Cached Or Fetched", test_v2_fields_same_shape_cached_or_fetched),
+    ]
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            logger.info(f"✅ PASS: {name}")
+        except AssertionError as e:
+            failed += 1
+            logger.error(f"❌ FAIL: {name} {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
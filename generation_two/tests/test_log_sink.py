@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test Log Sink
+The Tk-independent buffer behind LogTerminal: ring-buffer index, filtering and the rotating spill file
+"""
+
+import sys
+import os
+import glob
+import logging
+import tempfile
+
+# Add parent directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from generation_two.gui.components.log_terminal import DEFAULT_SPILL_PATH, LogSink, entry_lines, format_entry
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def test_index_and_query():
+    """The index keeps the newest entries; queries filter by level and search term"""
+    sink = LogSink(index_size=5, max_line_length=20)
+    for i in range(8):
+        sink.put('ERROR' if i % 3 == 0 else 'INFO', f"message {i}")
+    sink.put('DEBUG', "x" * 50)
+    drained = sink.drain()
+    assert len(drained) == 9 and sink.total_entries == 9
+    assert len(sink.entries) == 5
+    assert sink.entries[-1][2] == "x" * 17 + "..."
+
+    assert [e[2] for e in sink.query('ERROR')] == ["message 6"]
+    assert [e[2] for e in sink.query(search='MESSAGE', limit=2)] == ["message 6", "message 7"]
+    assert sink.drain() == []
+    sink.clear()
+    assert sink.query() == []
+
+
+def test_multiline_entries_count_lines():
+    """Tracebacks occupy several widget lines, which is what the widget trim counts"""
+    entry = ('12:00:00', 'ERROR', "Traceback (most recent call last):\n  File \"x.py\"\nValueError")
+    assert entry_lines(entry) == 3
+    assert format_entry(entry).count('\n') == 3
+    assert entry_lines(('12:00:00', 'INFO', "one line")) == 1
+
+
+def test_spill_rotates_on_bytes():
+    """The spill file receives full messages and rotates by encoded size, not characters"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'logs', 'trace.log')
+        sink = LogSink(max_line_length=10, spill_path=path, spill_max_bytes=1000, spill_backup_count=10)
+        text = "é" * 100  # 100 characters, 200 bytes
+        for _ in range(20):
+            sink.put('INFO', text)
+        sink.drain()
+        sink.close()
+
+        files = glob.glob(path + '*')
+        assert len(files) > 1, files
+        assert all(os.path.getsize(f) <= 1000 for f in files), [os.path.getsize(f) for f in files]
+        with open(path, encoding='utf-8') as f:
+            assert text in f.read()
+
+    assert os.path.isabs(DEFAULT_SPILL_PATH)
+
+
+def main():
+    tests = [
+        ("Index And Query", test_index_and_query),
+        ("Multi-line Entries Count Lines", test_multiline_entries_count_lines),
+        ("Spill Rotates On Bytes", test_spill_rotates_on_bytes),
+    ]
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            logger.info(f"✅ PASS: {name}")
+        except AssertionError as e:
+            failed += 1
+            logger.error(f"❌ FAIL: {name} {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test Adaptive Parameter Search
+Convergence, budget and parameter bounds of the consultant-naive-ollama
+parameter x settings search, against a seeded stub simulator
+"""
+
+import sys
+import os
+import re
+import logging
+
+import numpy as np
+
+# Add parent directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, os.path.join(os.path.dirname(parent_dir), 'generation_one', 'consultant-naive-ollama'))
+
+from parameter_search import AdaptiveParameterSearch, NUMBER_PATTERN
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+EXPRESSION = "ts_rank(ts_delta(close, 10), 20)"
+RANGES = [(2, 30, 1), (5, 60, 5)]  # (min, max, step) of each parameter
+OPTIMUM = ("ts_rank(ts_delta(close, 7), 40)", {'region': 'USA', 'decay': 0, 'neutralization': 'INDUSTRY'})
+
+
+def parameters():
+    """Parameters as AlphaExpressionMiner.parse_expression + get_parameter_ranges return them"""
+    params = []
+    for match, (low, high, step) in zip(NUMBER_PATTERN.finditer(EXPRESSION), RANGES):
+        value = float(match.group())
+        params.append({'value': value, 'start': match.start(), 'end': match.end(),
+                       'is_integer': value.is_integer(), 'min': low, 'max': high, 'step': step})
+    return params
+
+
+def configs():
+    """Nine distinct configurations plus a repeat of the first"""
+    configs = [{'settings': {'region': 'USA', 'decay': decay, 'neutralization': neutralization}}
+               for decay in (0, 4, 8) for neutralization in ('MARKET', 'INDUSTRY', 'SUBINDUSTRY')]
+    configs.append({'settings': dict(configs[0]['settings'])})
+    return configs
+
+
+class StubSimulator:
+    """Smooth Sharpe surface peaking at OPTIMUM, plus seeded noise; records every proposal"""
+
+    def __init__(self, seed: int = 7, noise: float = 0.01):
+        self.rng = np.random.default_rng(seed)
+        self.noise = noise
+        self.proposed = []
+
+    def sharpe(self, expression: str, config: dict) -> float:
+        delta, window = map(int, re.findall(r'\d+', expression))
+        settings = config['settings']
+        return (2.0 - ((delta - 7) / 5) ** 2 - ((window - 40) / 30) ** 2
+                + 0.3 * (settings['neutralization'] == 'INDUSTRY') - 0.02 * settings['decay']
+                + self.rng.normal(0, self.noise))
+
+    def __call__(self, pairs):
+        self.proposed.extend(pairs)
+        return [self.sharpe(expression, config) for expression, config in pairs]
+
+
+def test_converges_to_optimum():
+    """The best candidate found within the budget is the surface's optimum"""
+    simulator = StubSimulator()
+    search = AdaptiveParameterSearch(EXPRESSION, parameters(), configs(), budget=100)
+    result = search.run(simulator)
+    assert result.grid_size == 29 * 12 * 10 and result.space_size == 29 * 12 * 9
+    assert result.simulations <= 100 and len(simulator.proposed) == result.simulations
+    assert (result.best_expression, result.best_config['settings']) == OPTIMUM, \
+        f"{result.best_expression} {result.best_config}"
+
+
+def test_proposals_stay_in_range():
+    """Every proposal uses swept parameter values and a given configuration, and none repeats"""
+    simulator = StubSimulator(seed=11, noise=0.2)
+    given = [config['settings'] for config in configs()]
+    search = AdaptiveParameterSearch(EXPRESSION, parameters(), configs(), budget=250, batch_size=8)
+    search.run(simulator)
+
+    seen = set()
+    for expression, config in simulator.proposed:
+        values = [int(v) for v in re.findall(r'\d+', expression)]
+        assert len(values) == len(RANGES)
+        for value, (low, high, _) in zip(values, RANGES):
+            assert low <= value <= high, f"{expression} out of range"
+        assert config['settings'] in given
+        key = (expression, repr(sorted(config['settings'].items())))
+        assert key not in seen, f"{expression} {config} simulated twice"
+        seen.add(key)
+
+
+def test_deterministic_and_budgeted():
+    """The same seed gives the same search; a tiny budget is never exceeded"""
+    first = AdaptiveParameterSearch(EXPRESSION, parameters(), configs(), budget=60).run(StubSimulator(seed=3))
+    second = AdaptiveParameterSearch(EXPRESSION, parameters(), configs(), budget=60).run(StubSimulator(seed=3))
+    assert first.history == second.history
+
+    simulator = StubSimulator()
+    result = AdaptiveParameterSearch(EXPRESSION, parameters(), configs(), budget=7, batch_size=5).run(simulator)
+    assert result.simulations == len(simulator.proposed) == 7
+
+
+def main():
+    tests = [
+        ("Converges To Optimum", test_converges_to_optimum),
+        ("Proposals Stay In Range", test_proposals_stay_in_range),
+        ("Deterministic And Budgeted", test_deterministic_and_budgeted),
+    ]
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            logger.info(f"✅ PASS: {name}")
+        except AssertionError as e:
+            failed += 1
+            logger.error(f"❌ FAIL: {name} {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
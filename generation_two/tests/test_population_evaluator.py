@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test Population Evaluator
+The batched genetic-loop evaluator of the stone_age AlphaMiner against its
+per-alpha reference, evaluate_fitness
+"""
+
+import sys
+import os
+import logging
+
+import numpy as np
+
+# Add parent directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, os.path.join(os.path.dirname(parent_dir), 'stone_age', 'python', 'gui'))
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def _load():
+    """alpha_mining and pandas, or None when pandas is not installed"""
+    try:
+        import pandas as pd
+        import alpha_mining
+    except ImportError as e:
+        logger.warning(f"⚠️  {e}, skipping population evaluator tests")
+        return None
+    return alpha_mining, pd
+
+
+def _reference(miner, population, data):
+    """Fitness and metrics from evaluate_fitness, one alpha at a time"""
+    fitness, metrics = [], []
+    for alpha in population:
+        alpha = {'parameters': alpha['parameters'], 'metrics': {}}
+        fitness.append(miner.evaluate_fitness(alpha, data))
+        metrics.append(alpha['metrics'])
+    return np.array(fitness), metrics
+
+
+def _assert_matches(batched, reference, label):
+    mismatched = ~np.isclose(batched, reference, rtol=1e-9, atol=1e-9, equal_nan=True)
+    assert not mismatched.any(), \
+        f"{label}: {mismatched.sum()} mismatches, first at {np.flatnonzero(mismatched)[:5].tolist()}"
+
+
+def test_fitness_matches_reference():
+    """Batched fitness and metrics equal evaluate_fitness element-wise on a seeded population"""
+    loaded = _load()
+    if loaded is None:
+        return
+    alpha_mining, pd = loaded
+
+    np.random.seed(42)
+    miner = alpha_mining.AlphaMiner({'population_size': 200})
+    population = miner.initialize_population(200)
+    # Rounded prices so rolling ranks see ties
+    data = pd.DataFrame({'close': np.round(np.random.random(500), 2) + 0.01,
+                         'returns': np.random.random(500)},
+                        index=pd.date_range(start='2020-01-01', periods=500))
+    assert {alpha['parameters']['operator'] for alpha in population} == {'rank', 'decay', 'scale', 'delta'}
+
+    reference, reference_metrics = _reference(miner, population, data)
+    miner.evaluate_population(population, alpha_mining.PopulationEvaluator.from_data(data))
+
+    _assert_matches(np.array([alpha['fitness'] for alpha in population]), reference, 'fitness')
+    for name in ('sharpe_ratio', 'turnover', 'ic'):
+        _assert_matches(np.array([alpha['metrics'][name] for alpha in population]),
+                        np.array([m[name] for m in reference_metrics]), name)
+
+
+def test_edge_individuals_match_reference():
+    """Windows longer than the data and unknown operators score as evaluate_fitness does"""
+    loaded = _load()
+    if loaded is None:
+        return
+    alpha_mining, pd = loaded
+
+    rng = np.random.default_rng(7)
+    data = pd.DataFrame({'close': rng.random(40) + 0.5, 'returns': rng.random(40)})
+    base = {'weight': -0.7, 'decay_rate': 0.2, 'scale_factor': 1.5}
+    population = [{'parameters': dict(base, operator=operator, window=window)}
+                  for operator, window in [('rank', 60), ('decay', 40), ('scale', 1), ('delta', 39),
+                                           ('rank', 3), ('ts_zscore', 5)]]
+    miner = alpha_mining.AlphaMiner({})
+    reference, _ = _reference(miner, population, data)
+    batched = alpha_mining.PopulationEvaluator.from_data(data).evaluate([a['parameters'] for a in population])
+    _assert_matches(batched['fitness'], reference, 'fitness')
+    assert np.isneginf(batched['fitness'][-1])
+
+
+def main():
+    tests = [
+        ("Fitness Matches Reference", test_fitness_matches_reference),
+        ("Edge Individuals Match Reference", test_edge_individuals_match_reference),
+    ]
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            logger.info(f"✅ PASS: {name}")
+        except AssertionError as e:
+            failed += 1
+            logger.error(f"❌ FAIL: {name} {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test Result Cache
+Equivalent expressions share one cache key, and repeats are answered without
+another simulation
+"""
+
+import sys
+import os
+import logging
+import tempfile
+
+import requests
+
+# Add parent directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from generation_two.core.account_pool import default_region_configs
+from generation_two.core.simulator_tester import SimulationSettings, SimulatorTester, CACHED_PROGRESS_PREFIX
+from brain_client.result_cache import ResultCache, canonicalize_expression, is_cacheable, result_key
+from tests.fake_brain_api import FakeBrainAPI
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def test_canonical_forms():
+    """Spacing, number formatting and commutative order do not change the key; anything else does"""
+    equivalent = [
+        ("add(b, a) * 2.0", "2*add(a,b)"),
+        ("rank( ts_mean(close, 20.0) )", "rank(ts_mean(close,20))"),
+        ("c + (a - b)", "a - b + c"),
+        ("max(volume, close, filter=true)", "max(close,volume,filter = true)"),
+        ("x + -5.0", "-5 + x"),
+        ("winsorize(x, std=4.0)", "winsorize(x,std=4)"),
+        ("a = ts_delta(x, 5); rank(a)", "a=ts_delta(x,5);rank(a)"),
+        (".50 * x", "x * 0.5"),
+    ]
+    for left, right in equivalent:
+        assert canonicalize_expression(left) == canonicalize_expression(right), (left, right)
+
+    different = [
+        ("ts_max(b, a)", "ts_max(a, b)"),
+        ("a - b", "b - a"),
+        ("a / b * c", "a * c / b"),
+        ("ts_mean(close, 20)", "ts_mean(close, 21)"),
+        ("group_rank(x, \"sector\")", "group_rank(x, \"industry\")"),
+    ]
+    for left, right in different:
+        assert canonicalize_expression(left) != canonicalize_expression(right), (left, right)
+
+    # Display-only settings are ignored, result-relevant ones are not
+    settings = SimulationSettings()
+    assert result_key("a+b", settings) == result_key("b + a", {'settings': {**settings.__dict__, 'visualization': True}})
+    assert result_key("a+b", settings) != result_key("a+b", SimulationSettings(neutralization="SECTOR"))
+    assert result_key("a+b", settings) != result_key("a+b", SimulationSettings(truncation=0.05))
+
+
+def test_cache_persists_and_counts():
+    """Stored results survive a restart; hits and misses are counted per run"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'cache.jsonl')
+        cache = ResultCache(path)
+        assert cache.get("rank(close)", SimulationSettings()) is None
+        cache.put("rank(close)", SimulationSettings(), {'sharpe': 1.2, 'success': True})
+
+        reloaded = ResultCache(path)
+        assert reloaded.get_stats()['loaded'] == 1
+        assert reloaded.get(" rank( close ) ", SimulationSettings()) == {'sharpe': 1.2, 'success': True}
+        assert reloaded.get("rank(close)", SimulationSettings(delay=0)) is None
+        stats = reloaded.get_stats()
+        assert (stats['hits'], stats['misses'], stats['stores']) == (1, 1, 0)
+        assert stats['hit_rate'] == 0.5
+
+
+def test_only_deterministic_outcomes_cached():
+    """COMPLETE and expression-caused FAILED results are stored; ERROR and transient failures are not"""
+    assert is_cacheable('COMPLETE')
+    assert is_cacheable('FAILED', 'Unknown variable "clsoe"')
+    assert is_cacheable('FAILED', 'Invalid number of inputs : 1, should be exactly 2 input(s)')
+    assert not is_cacheable('FAILED', 'Simulation timed out')
+    assert not is_cacheable('FAILED', 'An unexpected error occurred')
+    assert not is_cacheable('ERROR', 'Unknown variable "clsoe"')
+    assert not is_cacheable('WARNING')
+
+    cache = ResultCache(path=None)
+    assert cache.put("rank(close)", SimulationSettings(), {'success': False}, status='ERROR', message='internal') is None
+    assert cache.put("rank(clsoe)", SimulationSettings(), {'success': False},
+                     status='FAILED', message='Unknown variable "clsoe"') is not None
+    assert len(cache) == 1 and cache.get_stats()['stores'] == 1
+
+
+def test_simulator_skips_repeats():
+    """Equivalent templates in a batch are simulated once; later submissions come from the cache"""
+    with FakeBrainAPI(duration=0.05) as api:
+        api.add_account("acct", "acct-token")
+        session = requests.Session()
+        session.cookies.set('t', 'acct-token')
+        tester = SimulatorTester(session, default_region_configs(), api_base=api.base_url, poll_interval=0.02)
+        settings = SimulationSettings()
+
+        templates = ["rank(close) + rank(volume)", "rank(volume)+rank(close)", "ts_rank(close, 5.0)"]
+        results = tester.wait_for_results(tester.simulate_batch(templates, "USA", settings))
+        assert all(r.success for r in results), [r.error_message for r in results]
+        assert [r.template for r in results] == templates
+        assert results[0].alpha_id == results[1].alpha_id
+        assert sum(api.completed.values()) == 2
+
+        # Single submissions: a cache:// progress URL, answered without the API
+        progress_url = tester.submit_simulation("ts_rank(close,5)", "USA", settings)
+        assert progress_url.startswith(CACHED_PROGRESS_PREFIX)
+        cached = tester.monitor_simulation(progress_url, "ts_rank(close,5)", "USA", settings)
+        assert cached.success and cached.alpha_id == results[2].alpha_id and cached.sharpe == 1.5
+        assert tester.simulate_template_concurrent("ts_rank(close, 5)", "USA", settings).done()
+        assert sum(api.completed.values()) == 2
+
+        # Different settings are a different simulation
+        other = tester.wait_for_results([tester.simulate_template_concurrent(
+            "ts_rank(close, 5)", "USA", SimulationSettings(neutralization="SECTOR"))])
+        assert other[0].success and sum(api.completed.values()) == 3
+        stats = tester.result_cache.get_stats()
+        assert stats['hits'] == 2 and stats['stores'] == 3
+
+
+def main():
+    tests = [
+        ("Canonical Forms", test_canonical_forms),
+        ("Cache Persists And Counts", test_cache_persists_and_counts),
+        ("Only Deterministic Outcomes Cached", test_only_deterministic_outcomes_cached),
+        ("Simulator Skips Repeats", test_simulator_skips_repeats),
+    ]
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            logger.info(f"✅ PASS: {name}")
+        except AssertionError as e:
+            failed += 1
+            logger.error(f"❌ FAIL: {name} {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
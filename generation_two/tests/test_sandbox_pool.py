@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test Sandbox Pool
+Generated modules are evaluated in parallel worker processes, and a runaway
+module costs a worker, not the host
+"""
+
+import sys
+import os
+import logging
+import time
+
+# Add parent directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from generation_two.self_evolution.code_evaluator import CodeEvaluator
+from generation_two.self_evolution.sandbox_pool import SandboxPool, SandboxLimits
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+GOOD_MODULE = '''
+def score(x, scale=1):
+    return x * scale
+'''
+
+SLEEPY_MODULE = '''
+import time
+time.sleep(0.5)
+'''
+
+
+def test_parallel_results_match_in_process():
+    """Sandboxed and in-process evaluation agree, and candidates run side by side"""
+    candidates = [
+        (GOOD_MODULE, 'good', [{'function': 'score', 'args': [2], 'kwargs': {'scale': 3}}]),
+        ('def broken(:\n    pass\n', 'bad_syntax'),
+        ('raise ValueError("boom")\n', 'bad_import'),
+        (GOOD_MODULE, 'bad_call', [{'function': 'score', 'args': []}]),
+    ]
+    evaluator = CodeEvaluator(sandbox=True, workers=2)
+    try:
+        sandboxed = evaluator.evaluate_modules(candidates)
+        in_process = CodeEvaluator(sandbox=False).evaluate_modules(candidates)
+        for a, b in zip(sandboxed, in_process):
+            assert (a.module_name, a.success, a.syntax_valid, a.import_success, a.execution_success) == \
+                (b.module_name, b.success, b.syntax_valid, b.import_success, b.execution_success)
+            assert a.error_message.split(':')[0] == b.error_message.split(':')[0]
+            assert (a.safety_score, a.performance_score) == (b.safety_score, b.performance_score)
+        assert [r.module_name for r in sandboxed] == ['good', 'bad_syntax', 'bad_import', 'bad_call']
+        assert sandboxed[0].success and sandboxed[0].safety_score > 0
+        assert sandboxed[2].error_message == "Import error: boom"
+        assert sandboxed[0].memory_usage > 0
+        assert len(evaluator.evaluation_history) == 1
+
+        started = time.perf_counter()
+        results = evaluator.evaluate_modules([(SLEEPY_MODULE, f'sleepy_{i}') for i in range(4)])
+        assert all(r.success for r in results)
+        assert all(r.execution_time >= 0.5 and r.cpu_time < 0.4 for r in results)
+        assert time.perf_counter() - started < 1.8
+    finally:
+        evaluator.close()
+
+
+def test_limits_kill_worker_not_host():
+    """CPU, wall-clock and memory hogs fail with a reason; the pool keeps serving"""
+    limits = SandboxLimits(cpu_seconds=1, wall_seconds=3, memory_mb=200)
+    with SandboxPool(workers=2, limits=limits, poll_interval=0.02) as pool:
+        spin = pool.submit('while True:\n    pass\n', 'spin')
+        stuck = pool.submit('import time\ntime.sleep(60)\n', 'stuck')
+        hog = pool.submit('blocks = []\nwhile True:\n    blocks.append(bytearray(16 * 1024 * 1024))\n', 'hog')
+        swallow = pool.submit('import sys\nsys.exit(3)\n', 'exits')
+
+        spin, stuck, hog, swallow = [f.result(timeout=20) for f in (spin, stuck, hog, swallow)]
+        assert not spin.success and spin.error_message.startswith("CPU time limit exceeded"), spin
+        assert spin.import_success is False and spin.syntax_valid
+        assert not stuck.success and stuck.error_message.startswith("Wall-clock limit exceeded"), stuck
+        assert not hog.success and hog.error_message.startswith("Memory limit exceeded"), hog
+        assert hog.memory_usage > 150
+        assert not swallow.success and 'SystemExit' in swallow.error_message
+
+        after = pool.evaluate_many([(GOOD_MODULE, 'after', [{'function': 'score', 'args': [1]}])])
+        assert after[0].success
+        stats = pool.get_stats()
+        assert stats['wall_timeouts'] == 1 and stats['memory_kills'] == 1 and stats['cpu_limit_hits'] == 1
+        assert stats['workers'] == 2 and stats['workers_started'] >= 4
+    assert pool.get_stats()['workers'] == 0
+
+
+def main():
+    tests = [
+        ("Parallel Results Match In-Process", test_parallel_results_match_in_process),
+        ("Limits Kill Worker Not Host", test_limits_kill_worker_not_host),
+    ]
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            logger.info(f"✅ PASS: {name}")
+        except AssertionError as e:
+            failed += 1
+            logger.error(f"❌ FAIL: {name} {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
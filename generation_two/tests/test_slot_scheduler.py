@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test Slot Scheduler
+Tests priority dispatch, aging, GLB reservation and slot utilization under mixed load
+"""
+
+import sys
+import os
+import logging
+from functools import partial
+
+# Add parent directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from generation_two.core.slot_scheduler import SlotScheduler, JobPriority, simulate_slot_load
+from generation_two.core.slot_manager import SlotManager, SlotStatus
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_priority_order():
+    """Exploit jobs go first, refeed retries last"""
+    clock = FakeClock()
+    scheduler = SlotScheduler(aging_interval=60, clock=clock)
+    scheduler.submit("refeed", "USA", JobPriority.REFEED)
+    scheduler.submit("explore", "USA", JobPriority.EXPLORE)
+    scheduler.submit("exploit", "USA", JobPriority.EXPLOIT)
+
+    order = [job.payload for job in scheduler.pop_ready(8)]
+    assert order == ["exploit", "explore", "refeed"]
+
+
+def test_aging():
+    """A refeed job that has waited two aging intervals beats a fresh exploit job"""
+    clock = FakeClock()
+    scheduler = SlotScheduler(aging_interval=60, clock=clock)
+    scheduler.submit("old refeed", "USA", JobPriority.REFEED)
+    clock.now = 121
+    scheduler.submit("new exploit", "USA", JobPriority.EXPLOIT)
+
+    assert [job.payload for job in scheduler.pop_ready(1)] == ["old refeed"]
+    stats = scheduler.stats()
+    assert stats['wait_times']['REFEED']['count'] == 1
+    assert stats['wait_times']['REFEED']['max'] == 121
+
+
+def test_glb_reservation():
+    """A GLB job that has waited too long stops single-slot jobs from backfilling"""
+    clock = FakeClock()
+    scheduler = SlotScheduler(aging_interval=60, reserve_after=30, clock=clock)
+    scheduler.submit("glb", "GLB", JobPriority.EXPLORE)
+    scheduler.submit("usa", "USA", JobPriority.EXPLORE)
+
+    # Only one slot free and GLB has not waited long: backfill the USA job
+    assert [job.payload for job in scheduler.pop_ready(1)] == ["usa"]
+
+    scheduler.submit("usa 2", "USA", JobPriority.EXPLORE)
+    clock.now = 31
+    assert scheduler.pop_ready(1) == []
+    assert [job.payload for job in scheduler.pop_ready(2)] == ["glb"]
+
+
+def test_slot_manager_non_consecutive():
+    """GLB can use any two idle slots"""
+    manager = SlotManager(max_slots=4)
+    for index, region in enumerate(["USA", "USA", "USA", "USA"]):
+        manager.enqueue(f"t{index}", region, index)
+    assert len(manager.dispatch()) == 4
+
+    # Free slots 0 and 2 (not adjacent)
+    with manager.lock:
+        for slot_id in (0, 2):
+            manager.slots[slot_id].status = SlotStatus.IDLE
+
+    manager.enqueue("glb", "GLB", 4, priority=JobPriority.EXPLOIT)
+    started = manager.dispatch()
+    assert [slot_ids for _, slot_ids in started] == [[0, 2]]
+    assert manager.get_queue_length() == 0
+
+
+def test_mixed_load_utilization():
+    """Simulated mixed GLB/non-GLB load: utilization holds and GLB waits are bounded"""
+    # Simulated jobs average 4 time units, so scale aging to a few job durations
+    factory = partial(SlotScheduler, aging_interval=10)
+    results = {}
+    for legacy in (True, False):
+        result = simulate_slot_load(factory, legacy=legacy, arrival_rate=1.4)
+        results[result['policy']] = result
+        logger.info(f"{result['policy']:>9}: utilization={result['utilization']:.3f}, "
+                    f"makespan={result['makespan']}, GLB wait={result['waits']['GLB']}, "
+                    f"EXPLOIT wait={result['waits']['EXPLOIT']}")
+
+    legacy, scheduled = results['legacy'], results['scheduler']
+    assert scheduled['utilization'] >= legacy['utilization'] - 0.01
+    assert scheduled['waits']['GLB']['max'] < legacy['waits']['GLB']['max']
+    assert scheduled['waits']['EXPLOIT']['mean'] < legacy['waits']['EXPLOIT']['mean']
+
+
+def main():
+    tests = [
+        ("Priority Order", test_priority_order),
+        ("Aging", test_aging),
+        ("GLB Reservation", test_glb_reservation),
+        ("Non-consecutive Slots", test_slot_manager_non_consecutive),
+        ("Mixed Load Utilization", test_mixed_load_utilization),
+    ]
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            logger.info(f"✅ PASS: {name}")
+        except AssertionError as e:
+            failed += 1
+            logger.error(f"❌ FAIL: {name} {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
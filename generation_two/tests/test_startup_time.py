@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test Startup Time
+`-X importtime` benchmark of the package and GUI cold start; checks that heavy
+modules stay unloaded until they are used
+"""
+
+import sys
+import os
+import logging
+import subprocess
+
+# Add parent directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+HEAVY_MODULES = ['requests', 'sqlite3', 'numpy', 'tkinter',
+                 'generation_two.core.template_generator', 'generation_two.ollama.ollama_manager']
+
+
+def import_profile(statement: str) -> tuple:
+    """
+    Run `statement` in a fresh interpreter under -X importtime
+
+    Returns:
+        ({module: cumulative microseconds}, set of modules loaded afterwards)
+
+    importtime only reports `import` statements, so modules loaded through
+    importlib (the lazy package attributes) are taken from sys.modules instead.
+    """
+    code = f"{statement}\nimport sys\nprint('\\n'.join(sys.modules))"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=os.path.dirname(parent_dir), capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr[-2000:]
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if cumulative.strip().isdigit():
+            timings[name.strip()] = int(cumulative)
+    return timings, set(result.stdout.split())
+
+
+def test_package_import_is_lazy():
+    """`import generation_two` loads none of the heavy dependencies"""
+    timings, modules = import_profile('import generation_two')
+    logger.info(f"import generation_two: {timings['generation_two'] / 1000:.1f}ms")
+    loaded = [name for name in HEAVY_MODULES if name in modules]
+    assert not loaded, loaded
+    assert timings['generation_two'] < 100_000
+
+
+def test_attributes_resolve_on_demand():
+    """Re-exported names still work and only pull in what they need"""
+    _, modules = import_profile(
+        'import generation_two as g; g.load_config; g.BacktestStorage; '
+        'from generation_two import SimulationSettings; assert "SimulationSettings" in dir(g)')
+    assert 'generation_two.core.config.config_loader' in modules
+    assert 'generation_two.storage.backtest_storage' in modules
+    assert 'generation_two.ollama.ollama_manager' not in modules
+
+
+def test_submodule_import_skips_siblings():
+    """Importing one core module does not drag in the template generators"""
+    _, modules = import_profile('import generation_two.core.type_checker')
+    assert 'generation_two.core.type_checker' in modules
+    assert 'generation_two.core.template_generator' not in modules
+    assert 'generation_two.core.enhanced_template_generator_v3' not in modules
+
+
+def test_gui_defers_panels():
+    """The main window module imports the workflow tab only; other panels load on first open"""
+    timings, modules = import_profile('import generation_two.gui.main_window')
+    logger.info(f"import generation_two.gui.main_window: {timings['generation_two.gui.main_window'] / 1000:.1f}ms")
+    assert 'generation_two.gui.components.workflow_panel' in modules
+    for panel in ('dashboard', 'evolution_panel', 'config_panel', 'monitor_panel', 'database_panel'):
+        assert f'generation_two.gui.components.{panel}' not in modules, panel
+    assert 'generation_two.core.enhanced_template_generator_v3' not in modules
+
+
+def main():
+    tests = [
+        ("Package Import Is Lazy", test_package_import_is_lazy),
+        ("Attributes Resolve On Demand", test_attributes_resolve_on_demand),
+        ("Submodule Import Skips Siblings", test_submodule_import_skips_siblings),
+        ("GUI Defers Panels", test_gui_defers_panels),
+    ]
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            logger.info(f"✅ PASS: {name}")
+        except AssertionError as e:
+            failed += 1
+            logger.error(f"❌ FAIL: {name} {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
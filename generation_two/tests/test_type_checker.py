@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test Pre-flight Type Checker
+Tests vector/event/input-count checks, coercion, and the replay of historical failures
+"""
+
+import sys
+import os
+import logging
+import sqlite3
+import tempfile
+import time
+
+# Add parent directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from generation_two.core.type_checker import FASTEXPRTypeChecker, load_field_types, replay_failures
+from generation_two.core.template_validator import TemplateValidator
+from generation_two.storage.backtest_storage import BacktestStorage
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+FIELD_TYPES = {'close': 'MATRIX', 'volume': 'MATRIX', 'anl4_eps_vec': 'VECTOR',
+               'nws12_event_score': 'MATRIX', 'sector': 'GROUP'}
+EVENT_FIELDS = {'nws12_event_score'}
+
+
+def make_checker() -> FASTEXPRTypeChecker:
+    return FASTEXPRTypeChecker(field_types=FIELD_TYPES, event_fields=EVENT_FIELDS)
+
+
+def test_accepts_well_typed():
+    checker = make_checker()
+    for template in ['group_neutralize(ts_rank(ts_delta(close, 5), 60), sector)',
+                     'rank(vec_avg(anl4_eps_vec)) * -1',
+                     'bucket(rank(close), range="0, 1, 0.1")',
+                     'ts_rank(nws12_event_score, 20)',
+                     'rank(close, rate=2)']:
+        result = checker.check(template)
+        assert result.ok, (template, result.error_message)
+
+
+def test_coerces_fixable():
+    checker = make_checker()
+    cases = {
+        'rank(anl4_eps_vec)': 'rank(vec_avg(anl4_eps_vec))',
+        'vec_sum(close)': 'close',
+        'ts_mean(close)': 'ts_mean(close, 20)',
+        'ts_delta(close, 5, 3)': 'ts_delta(close, 5)',
+        'rank(nws12_event_score)': 'ts_rank(nws12_event_score, 20)',
+    }
+    for template, expected in cases.items():
+        result = checker.check(template)
+        assert not result.ok and result.coerced == expected, (template, result.coerced, result.error_message)
+
+
+def test_rejects_unfixable():
+    checker = make_checker()
+    for template, code in [('nws12_event_score + close', 'event_input'),
+                           ('group_neutralize(close, volume)', 'group_input'),
+                           ('ts_mean(close, ts_mean(volume, 5))', 'lookback'),
+                           ('reduce_sum(close)', 'scope')]:
+        result = checker.check(template)
+        assert result.rejected, template
+        assert any(issue.code == code for issue in result.issues), (template, result.issues)
+
+
+def test_check_speed():
+    checker = make_checker()
+    templates = [f'group_neutralize(ts_rank(ts_delta(close, {d}) / ts_std_dev(volume, 20), 60), sector)'
+                 for d in range(1, 201)]
+    start = time.perf_counter()
+    for template in templates:
+        checker.check(template)
+    per_template_us = (time.perf_counter() - start) / len(templates) * 1e6
+    logger.info(f"Type check: {per_template_us:.0f}us per template (uncached)")
+    assert per_template_us < 5000
+
+
+def _make_history(db_path: str):
+    """Backtest history with the failure classes seen in production plus successes"""
+    BacktestStorage(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        'INSERT INTO field_types (field_id, region, delay, field_type, is_event_input) VALUES (?, ?, 1, ?, ?)',
+        [(field_id, 'USA', kind, 1 if field_id in EVENT_FIELDS else 0) for field_id, kind in FIELD_TYPES.items()]
+    )
+    rows = [
+        ('rank(anl4_eps_vec)', 0, 'Operator rank does not support vector inputs'),
+        ('ts_zscore(anl4_eps_vec, 20)', 0, 'Vector field anl4_eps_vec used outside vec_ operator'),
+        ('rank(nws12_event_score)', 0, 'Operator rank does not support event inputs'),
+        ('nws12_event_score * volume', 0, 'Operator multiply does not support event inputs'),
+        ('ts_mean(close)', 0, 'Invalid number of inputs : 1, should be exactly 2 input(s)'),
+        ('ts_corr(close, volume)', 0, 'Invalid number of inputs : 2, should be exactly 3 input(s)'),
+        ('rank(close) / ts_std_dev(volume, 20)', 0, 'Simulation timed out'),
+        ('rank(close)', 1, None),
+        ('group_neutralize(ts_delta(close, 5), sector)', 1, None),
+        ('ts_rank(vec_avg(anl4_eps_vec), 60)', 1, None),
+    ]
+    conn.executemany(
+        'INSERT INTO backtest_results (template, region, success, error_message) VALUES (?, ?, ?, ?)',
+        [(template, 'USA', success, error) for template, success, error in rows]
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_replay_historical_failures():
+    """Replaying history reports the simulations the pre-flight check would have saved"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'backtests.db')
+        _make_history(db_path)
+
+        def checker_for(region):
+            field_types, event_fields = load_field_types(db_path, region, 1)
+            return FASTEXPRTypeChecker(field_types=field_types, event_fields=event_fields)
+
+        report = replay_failures(db_path, checker_for)
+        assert report['replayed'] == 10 and report['failed'] == 7
+        # Every type-class failure is caught; the timeout is not a type error
+        assert report['simulations_saved'] == 6
+        assert report['by_error_class']['event_input'] == {'failed': 2, 'coerced': 1, 'rejected': 1}
+        assert report['by_error_class']['other'] == {'failed': 1}
+        assert report['false_positives'] == 0
+
+
+def test_validator_refeed_uses_type_checker():
+    """refeed_with_correction coerces type errors without the LLM"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'backtests.db')
+        _make_history(db_path)
+        validator = TemplateValidator(db_path=db_path)
+        fixed, fixes = validator.refeed_with_correction(
+            'rank(anl4_eps_vec)', 'Operator rank does not support vector inputs', region='USA')
+        assert fixed == 'rank(vec_avg(anl4_eps_vec))' and fixes
+        is_valid, error, suggestion = validator.validate_template('ts_mean(close)', region='USA')
+        assert not is_valid and suggestion == 'ts_mean(close, 20)'
+        assert validator.get_validation_stats()['preflight']['coerced'] == 2
+
+
+def main():
+    tests = [
+        ("Accepts Well-typed", test_accepts_well_typed),
+        ("Coerces Fixable", test_coerces_fixable),
+        ("Rejects Unfixable", test_rejects_unfixable),
+        ("Check Speed", test_check_speed),
+        ("Replay Historical Failures", test_replay_historical_failures),
+        ("Validator Refeed", test_validator_refeed_uses_type_checker),
+    ]
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            logger.info(f"✅ PASS: {name}")
+        except AssertionError as e:
+            failed += 1
+            logger.error(f"❌ FAIL: {name} {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,13 @@
 from dataclasses import dataclass
-from typing import List, Dict, Any, Generator
+from typing import List, Dict, Any, Generator, Optional
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 from datetime import datetime
 import json
 import os
+import warnings
 
 @dataclass
 class AlphaMiningParams:
@@ -15,6 +18,125 @@ class AlphaMiningParams:
     data_window: int = 252
     min_samples: int = 1000
 
+class PopulationEvaluator:
+    """Scores a whole population at once (same results as AlphaMiner.evaluate_fitness per alpha)
+
+    Individuals are grouped by (operator, window). Rolling ranks, means and diffs
+    depend only on the data and the window, so they are computed once and cached
+    across generations; decays for a group are one matrix product of the shared
+    sliding windows with each individual's normalized weights. Sharpe, turnover
+    and IC are then column-wise operations on the (time x population) matrix.
+    """
+
+    def __init__(self, close: np.ndarray, returns: np.ndarray):
+        self.close = np.asarray(close, dtype=float)
+        self.returns = np.asarray(returns, dtype=float)
+        self._base_cache = {}
+        self._window_cache = {}
+
+    @classmethod
+    def from_data(cls, data: pd.DataFrame) -> 'PopulationEvaluator':
+        return cls(data['close'].to_numpy(dtype=float), data['returns'].to_numpy(dtype=float))
+
+    def evaluate(self, params_list: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """Return fitness, sharpe_ratio, turnover and ic arrays, one entry per parameter set"""
+        n, length = len(params_list), len(self.close)
+        series = np.full((length, n), np.nan)
+        usable = np.ones(n, dtype=bool)
+
+        groups = {}
+        for i, params in enumerate(params_list):
+            try:
+                key = (str(params['operator']), int(params['window']))
+            except (KeyError, TypeError, ValueError):
+                usable[i] = False
+                continue
+            groups.setdefault(key, []).append(i)
+
+        for (operator, window), members in groups.items():
+            members = np.asarray(members)
+            if operator not in ('rank', 'decay', 'scale', 'delta') or window < 1:
+                usable[members] = False
+                continue
+            if window > length:
+                continue  # too short for one window: all NaN, as pandas gives
+            if operator == 'decay':
+                rates = np.array([float(params_list[i]['decay_rate']) for i in members])
+                weights = np.exp(-rates[:, None] * np.arange(window))
+                weights /= weights.sum(axis=1, keepdims=True)
+                series[window - 1:, members] = self._windows(window) @ weights.T
+            elif operator == 'scale':
+                factors = np.array([float(params_list[i]['scale_factor']) for i in members])
+                series[:, members] = self._base(operator, window)[:, None] * factors
+            else:
+                series[:, members] = self._base(operator, window)[:, None]
+
+        series *= np.array([float(p.get('weight', 1.0)) if usable[i] else np.nan
+                            for i, p in enumerate(params_list)])
+        scores = self.score(series)
+        scores['fitness'][~usable] = float('-inf')
+        return scores
+
+    def score(self, series: np.ndarray) -> Dict[str, np.ndarray]:
+        """Sharpe, turnover, IC and fitness for each column of a (time x population) matrix"""
+        with np.errstate(all='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            pct_change = series[1:] / series[:-1] - 1
+            sharpe = np.sqrt(252) * np.nanmean(pct_change, axis=0) / np.nanstd(pct_change, axis=0, ddof=1)
+            turnover = np.nanmean(np.abs(np.diff(series, axis=0)), axis=0)
+
+            # Pearson correlation with returns over rows where both are present
+            returns = self.returns[:, None]
+            present = ~np.isnan(series) & ~np.isnan(returns)
+            count = present.sum(axis=0)
+            series_dev = np.where(present, series - np.where(present, series, 0).sum(axis=0) / count, 0)
+            returns_dev = np.where(present, returns - np.where(present, returns, 0).sum(axis=0) / count, 0)
+            ic = (series_dev * returns_dev).sum(axis=0) / np.sqrt(
+                (series_dev ** 2).sum(axis=0) * (returns_dev ** 2).sum(axis=0))
+            ic[count < 2] = np.nan
+
+        fitness = sharpe * 0.4 + ic * 0.4 - turnover * 0.2
+        return {'fitness': fitness, 'sharpe_ratio': sharpe, 'turnover': turnover, 'ic': ic}
+
+    def _windows(self, window: int) -> np.ndarray:
+        """Sliding windows of close, oldest value first (a strided view, no copy)"""
+        if window not in self._window_cache:
+            self._window_cache[window] = sliding_window_view(self.close, window)
+        return self._window_cache[window]
+
+    def _base(self, operator: str, window: int) -> np.ndarray:
+        """Unweighted operator output for rank, scale (rolling mean) and delta"""
+        key = (operator, window)
+        if key not in self._base_cache:
+            base = np.full(len(self.close), np.nan)
+            if operator == 'rank':
+                # Rolling rank of the newest value, ties averaged (pandas rolling().rank())
+                windows = self._windows(window)
+                newest = windows[:, -1:]
+                below = (windows < newest).sum(axis=1)
+                equal = (windows == newest).sum(axis=1)
+                base[window - 1:] = below + (equal + 1) / 2
+            elif operator == 'scale':
+                cumsum = np.concatenate(([0.0], np.cumsum(self.close)))
+                base[window - 1:] = (cumsum[window:] - cumsum[:-window]) / window
+            elif operator == 'delta':
+                base[window:] = self.close[window:] - self.close[:-window]
+            self._base_cache[key] = base
+        return self._base_cache[key]
+
+
+_worker_evaluator: Optional[PopulationEvaluator] = None
+
+
+def _init_evaluator_worker(close: np.ndarray, returns: np.ndarray) -> None:
+    global _worker_evaluator
+    _worker_evaluator = PopulationEvaluator(close, returns)
+
+
+def _evaluate_in_worker(params_list: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    return _worker_evaluator.evaluate(params_list)
+
+
 class AlphaMiner:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
@@ -22,6 +144,8 @@ class AlphaMiner:
             max_iterations=config.get('max_iterations', 1000),
             population_size=config.get('population_size', 100)
         )
+        # Processes used to score each generation's offspring (0/1 = in this process)
+        self.eval_workers = int(config.get('eval_workers', 0))
         self.best_solution = None
         self.best_fitness = float('-inf')
         self.history = []
@@ -79,6 +203,27 @@ class AlphaMiner:
             print(f"Error evaluating alpha: {str(e)}")
             return float('-inf')
 
+    def evaluate_population(self, population: List[Dict[str, Any]], evaluator: PopulationEvaluator,
+                            executor: Optional[ProcessPoolExecutor] = None) -> None:
+        """Evaluate every alpha in one batch, setting 'fitness' and 'metrics' like evaluate_fitness"""
+        params_list = [alpha['parameters'] for alpha in population]
+        if executor is not None and len(params_list) >= 2 * self.eval_workers:
+            chunks = np.array_split(np.arange(len(params_list)), self.eval_workers)
+            parts = list(executor.map(_evaluate_in_worker, [[params_list[i] for i in chunk] for chunk in chunks]))
+            scores = {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+        else:
+            scores = evaluator.evaluate(params_list)
+
+        for i, alpha in enumerate(population):
+            alpha['fitness'] = float(scores['fitness'][i])
+            if np.isneginf(alpha['fitness']):
+                continue
+            alpha['metrics'] = {
+                'sharpe_ratio': float(scores['sharpe_ratio'][i]),
+                'turnover': float(scores['turnover'][i]),
+                'ic': float(scores['ic'][i])
+            }
+
     def _apply_alpha_strategy(self, data: pd.DataFrame, params: Dict[str, Any]) -> pd.Series:
         """Apply alpha strategy to data using parameters"""
         operator = params['operator']
@@ -131,14 +276,32 @@ class AlphaMiner:
             'returns': np.random.random(1000)
         }, index=dates)
         
+        evaluator = PopulationEvaluator.from_data(data)
+        executor = None
+        if self.eval_workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=self.eval_workers,
+                initializer=_init_evaluator_worker,
+                initargs=(evaluator.close, evaluator.returns)
+            )
+        
+        try:
+            yield from self._evolve(population, evaluator, executor)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+    def _evolve(self, population: List[Dict[str, Any]], evaluator: PopulationEvaluator,
+                executor: Optional[ProcessPoolExecutor]) -> Generator[Dict[str, Any], None, None]:
+        """Genetic loop: batch-evaluate each generation, then breed the next"""
         for iteration in range(self.params.max_iterations):
             if not self.is_running:
                 break
                 
             # Evaluate population
+            self.evaluate_population(population, evaluator, executor)
             for alpha in population:
-                fitness = self.evaluate_fitness(alpha, data)
-                alpha['fitness'] = fitness
+                fitness = alpha['fitness']
                 
                 if fitness > self.best_fitness:
                     self.best_fitness = fitness
@@ -13,6 +13,8 @@ import pickle
 import logging
 import re
 
+from brain_client.brain_session import BrainSession  # pip install ../../../brain_client
+
 arsenal = ["ts_moment", "ts_entropy", "ts_min_max_cps", "ts_min_max_diff", "inst_tvr", 'sigmoid', 
            "ts_decay_exp_window", "ts_percentage", "vector_neut", "vector_proj", "signed_power"]
 
@@ -39,17 +41,19 @@ class WorldQuantBrain:
     def login(self):
         """Initialize or refresh session with WorldQuant Brain."""
         logging.info("Authenticating with WorldQuant Brain...")
-        self.session = requests.Session()
-        self.session.auth = (self.username, self.password)
-        response = self.session.post('https://api.worldquantbrain.com/authentication')
-        
-        if response.status_code != 201:
-            raise Exception(f"Authentication failed: {response.text}")
-            
-        self.session.headers.update({
-            'Content-Type': 'application/json',
-            'Accept': 'application/json'
-        })
+        if self.session is None:
+            # One pooled session for the whole run: re-logins keep its open connections,
+            # and a 401 in any request triggers a single shared re-login
+            self.session = BrainSession(credentials=(self.username, self.password))
+            self.session.auth = (self.username, self.password)
+            self.session.headers.update({
+                'Content-Type': 'application/json',
+                'Accept': 'application/json'
+            })
+        try:
+            self.session.login()
+        except requests.exceptions.HTTPError as e:
+            raise Exception(str(e))
         logging.info("Authentication successful")
         return self.session
 